@@ -15,6 +15,10 @@ from dataclasses import dataclass
 import threading
 from queue import Queue, Empty
 
+from app.database.streaming_bar_builder import (
+    StreamingBarBuilder, BarRow, BAR_INSERT_SQL, BAR_BACKFILL_SQL, DEFAULT_TIMEFRAMES
+)
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -27,6 +31,8 @@ class DatabaseConfig:
     flush_interval: float = 1.0
     enable_wal: bool = True
     enable_optimization: bool = True
+    bar_timeframes: Tuple[str, ...] = DEFAULT_TIMEFRAMES
+    backfill_chunk_size: int = 5000
 
 class MTFDatabaseManager:
     """Multi-timeframe database manager with async operations"""
@@ -44,6 +50,13 @@ class MTFDatabaseManager:
         self.read_count = 0
         self.error_count = 0
         
+        # Streaming tick -> bar aggregation (replaces per-tick GROUP BY over raw_ticks)
+        self.bar_builder = StreamingBarBuilder(config.bar_timeframes)
+        self._pending_bars: List[BarRow] = []
+        self._dirty_bar_symbols = set()
+        self._bar_lock = asyncio.Lock()
+        self.bars_written = 0
+        
         # Initialize database
         self._initialize_database()
     
@@ -249,12 +262,13 @@ class MTFDatabaseManager:
     async def _flush_batch(self, batch: List[Dict[str, Any]]):
         """Flush batch of operations to database"""
         try:
-            async with aiosqlite.connect(self.config.db_path) as conn:
+            async with self._bar_lock, aiosqlite.connect(self.config.db_path) as conn:
                 cursor = await conn.cursor()
                 
                 for operation in batch:
                     await self._execute_operation(cursor, operation)
                 
+                await self._write_bars(cursor)
                 await conn.commit()
                 self.write_count += len(batch)
                 
@@ -282,8 +296,17 @@ class MTFDatabaseManager:
                     operation['source']
                 ))
                 
-                # Trigger bar formation for M1 timeframe
-                await self._form_bars(cursor, operation['symbol'], 'M1')
+                # Feed the streaming bar builder; finished bars are written once per batch
+                if self.bar_builder.needs_seed(operation['symbol']):
+                    await self._seed_bar_builder(cursor, operation['symbol'], operation['timestamp_ms'])
+                self._pending_bars.extend(self.bar_builder.add_tick(
+                    operation['symbol'],
+                    operation['timestamp_ms'],
+                    operation['bid'],
+                    operation['ask'],
+                    operation.get('volume')
+                ))
+                self._dirty_bar_symbols.add(operation['symbol'])
             
             elif op_type == 'insert_ohlcv':
                 await cursor.execute("""
@@ -372,88 +395,98 @@ class MTFDatabaseManager:
             logger.error(f"Error executing operation {operation.get('type', 'unknown')}: {e}")
             self.error_count += 1
     
-    async def _form_bars(self, cursor, symbol: str, timeframe: str):
-        """Form OHLCV bars from raw ticks"""
+    async def _write_bars(self, cursor):
+        """Write finished bars plus forming-bar snapshots for symbols touched in this batch"""
+        rows = self._pending_bars
+        for symbol in self._dirty_bar_symbols:
+            rows.extend(self.bar_builder.forming_bars(symbol))
+        self._pending_bars = []
+        self._dirty_bar_symbols = set()
+        
+        if not rows:
+            return
+        
+        try:
+            await cursor.executemany(BAR_INSERT_SQL, rows)
+            self.bars_written += len(rows)
+        except Exception as e:
+            logger.error(f"Error writing bars: {e}")
+            self.error_count += 1
+    
+    async def backfill_bars(self, symbol: Optional[str] = None) -> int:
+        """
+        Rebuild OHLCV bars from stored raw ticks in a single ordered pass.
+        Only periods with no stored bar are written (INSERT OR IGNORE), so bars already
+        stored - including complete bars whose ticks were pruned from raw_ticks - are kept.
+        Uses its own builder, so the live streaming state is not touched.
+        Returns the number of bar rows written.
+        """
+        chunk_size = self.config.backfill_chunk_size
+        builder = StreamingBarBuilder(self.config.bar_timeframes)
+        written = 0
+        
         try:
-            # Group ticks by minute for M1 bars
-            if timeframe == 'M1':
-                # Get all ticks for the symbol, grouped by minute
-                await cursor.execute("""
-                    SELECT 
-                        (timestamp_ms / 60000) * 60000 as minute_start,
-                        MIN(timestamp_ms) as first_tick,
-                        MAX(timestamp_ms) as last_tick,
-                        COUNT(*) as tick_count,
-                        MIN((bid + ask) / 2) as min_price,
-                        MAX((bid + ask) / 2) as max_price,
-                        AVG((bid + ask) / 2) as avg_price,
-                        SUM(volume) as total_volume,
-                        AVG(ask - bid) as avg_spread
-                    FROM raw_ticks 
-                    WHERE symbol = ? 
-                    GROUP BY (timestamp_ms / 60000) * 60000
-                    HAVING tick_count >= 2
-                    ORDER BY minute_start DESC
-                """, (symbol,))
-                
-                minute_groups = await cursor.fetchall()
+            async with self._bar_lock, aiosqlite.connect(self.config.db_path) as conn:
+                read_cursor = await conn.cursor()
+                write_cursor = await conn.cursor()
                 
-                for group in minute_groups:
-                    minute_start = group[0]
-                    
-                    # Check if we already have a bar for this minute
-                    await cursor.execute("""
-                        SELECT COUNT(*) FROM ohlcv_bars 
-                        WHERE symbol = ? AND timeframe = ? AND timestamp_open_ms = ?
-                    """, (symbol, timeframe, minute_start))
-                    
-                    count_result = await cursor.fetchone()
-                    if count_result[0] > 0:
-                        continue  # Bar already exists
-                    
-                    # Get the first and last tick for this minute to get proper OHLC
-                    await cursor.execute("""
-                        SELECT timestamp_ms, bid, ask, last, volume
-                        FROM raw_ticks 
-                        WHERE symbol = ? AND timestamp_ms >= ? AND timestamp_ms < ?
+                if symbol is None:
+                    await read_cursor.execute("""
+                        SELECT symbol, timestamp_ms, bid, ask, volume
+                        FROM raw_ticks
+                        ORDER BY symbol, timestamp_ms ASC
+                    """)
+                else:
+                    await read_cursor.execute("""
+                        SELECT symbol, timestamp_ms, bid, ask, volume
+                        FROM raw_ticks
+                        WHERE symbol = ?
                         ORDER BY timestamp_ms ASC
-                    """, (symbol, minute_start, minute_start + 60000))
-                    
-                    minute_ticks = await cursor.fetchall()
-                    if len(minute_ticks) < 2:
-                        continue
-                    
-                    # Calculate OHLCV
-                    prices = []
-                    volumes = []
-                    spreads = []
-                    
-                    for tick in minute_ticks:
-                        mid_price = (tick[1] + tick[2]) / 2  # (bid + ask) / 2
-                        prices.append(mid_price)
-                        volumes.append(tick[4] or 0)
-                        spreads.append(tick[2] - tick[1])  # ask - bid
-                    
-                    open_price = prices[0]
-                    high_price = max(prices)
-                    low_price = min(prices)
-                    close_price = prices[-1]
-                    total_volume = sum(volumes)
-                    avg_spread = sum(spreads) / len(spreads) if spreads else 0
-                    
-                    # Insert the bar
-                    await cursor.execute("""
-                        INSERT OR IGNORE INTO ohlcv_bars 
-                        (symbol, timeframe, timestamp_open_ms, open, high, low, close, volume, tick_volume, spread)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        symbol, timeframe, minute_start, open_price, high_price, 
-                        low_price, close_price, total_volume, len(minute_ticks), avg_spread
-                    ))
+                    """, (symbol,))
+                
+                pending: List[BarRow] = []
+                while True:
+                    ticks = await read_cursor.fetchmany(chunk_size)
+                    if not ticks:
+                        break
+                    for tick_symbol, timestamp_ms, bid, ask, volume in ticks:
+                        pending.extend(builder.add_tick(tick_symbol, timestamp_ms, bid, ask, volume))
+                    if len(pending) >= chunk_size:
+                        await write_cursor.executemany(BAR_BACKFILL_SQL, pending)
+                        written += write_cursor.rowcount
+                        pending = []
+                
+                pending.extend(builder.forming_bars(symbol))
+                if pending:
+                    await write_cursor.executemany(BAR_BACKFILL_SQL, pending)
+                    written += write_cursor.rowcount
+                
+                await conn.commit()
+                self.bars_written += written
+                logger.info(f"Backfilled {written} missing bars for {symbol or 'all symbols'}")
+                return written
                 
         except Exception as e:
-            logger.error(f"Error forming bars: {e}")
+            logger.error(f"Error backfilling bars: {e}")
             self.error_count += 1
+            return written
+    
+    async def _seed_bar_builder(self, cursor, symbol: str, timestamp_ms: int):
+        """Resume the symbol's forming bars from stored rows (e.g. after a restart)"""
+        stored: List[BarRow] = []
+        try:
+            for timeframe, open_ms in self.bar_builder.period_starts(timestamp_ms).items():
+                await cursor.execute("""
+                    SELECT symbol, timeframe, timestamp_open_ms, open, high, low, close, volume, tick_volume, spread
+                    FROM ohlcv_bars
+                    WHERE symbol = ? AND timeframe = ? AND timestamp_open_ms = ?
+                """, (symbol, timeframe, open_ms))
+                row = await cursor.fetchone()
+                if row is not None:
+                    stored.append(tuple(row))
+        except Exception as e:
+            logger.warning(f"Could not load stored bars to seed {symbol}: {e}")
+        self.bar_builder.seed(symbol, timestamp_ms, stored)
     
     def queue_operation(self, operation: Dict[str, Any]):
         """Queue a database operation for async processing"""
@@ -638,7 +671,9 @@ class MTFDatabaseManager:
             'read_count': self.read_count,
             'error_count': self.error_count,
             'queue_size': self.write_queue.qsize(),
-            'running': self.running
+            'running': self.running,
+            'bars_written': self.bars_written,
+            'bar_builder': self.bar_builder.get_stats()
         }
 
 # Example usage and testing
@@ -0,0 +1,275 @@
+"""
+Streaming Bar Builder
+Incremental tick -> OHLCV bar aggregation for the multi-timeframe database
+
+- Keeps one open M1 bar per symbol, fed tick by tick (mid price = (bid + ask) / 2)
+- Finished M1 bars are rolled up into M5/M15/H1/H4 incrementally (no re-scan of raw_ticks)
+- Emits finished bars as ohlcv_bars rows for batched executemany inserts
+- Forming bars can be snapshotted so readers see the current bar before it closes
+- After a restart, forming bars are seeded from the stored rows of the current period,
+  so the first partial bucket extends the stored bar instead of overwriting it
+- Backfill passes rebuild missing bars from raw_ticks with their own builder (BAR_BACKFILL_SQL)
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Timeframe -> bar length in milliseconds
+TIMEFRAME_MS: Dict[str, int] = {
+    'M1': 60_000,
+    'M5': 300_000,
+    'M15': 900_000,
+    'M30': 1_800_000,
+    'H1': 3_600_000,
+    'H4': 14_400_000,
+    'D1': 86_400_000,
+}
+
+DEFAULT_TIMEFRAMES: Tuple[str, ...] = ('M1', 'M5', 'M15', 'H1', 'H4')
+
+# Row layout matching ohlcv_bars insert order:
+# (symbol, timeframe, timestamp_open_ms, open, high, low, close, volume, tick_volume, spread)
+BarRow = Tuple[str, str, int, float, float, float, float, float, int, float]
+
+BAR_INSERT_SQL = """
+    INSERT OR REPLACE INTO ohlcv_bars
+    (symbol, timeframe, timestamp_open_ms, open, high, low, close, volume, tick_volume, spread)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Backfill only fills periods with no stored bar: after raw_ticks retention pruning the
+# oldest rebuilt bars can be partial, and must not replace complete stored bars
+BAR_BACKFILL_SQL = """
+    INSERT OR IGNORE INTO ohlcv_bars
+    (symbol, timeframe, timestamp_open_ms, open, high, low, close, volume, tick_volume, spread)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class _OpenBar:
+    """Mutable accumulator for a bar that has not closed yet"""
+
+    __slots__ = ('open_ms', 'open', 'high', 'low', 'close', 'volume', 'ticks', 'spread_sum')
+
+    def __init__(self, open_ms: int, price: float, volume: float, ticks: int, spread_sum: float):
+        self.open_ms = open_ms
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+        self.volume = volume
+        self.ticks = ticks
+        self.spread_sum = spread_sum
+
+    @classmethod
+    def from_row(cls, row: BarRow) -> '_OpenBar':
+        """Resume a bar from a stored ohlcv_bars row"""
+        _, _, open_ms, open_, high, low, close, volume, ticks, spread = row
+        ticks = int(ticks or 0)
+        new = cls(int(open_ms), open_, volume or 0.0, ticks, (spread or 0.0) * ticks)
+        new.high = high
+        new.low = low
+        new.close = close
+        return new
+
+    @classmethod
+    def from_bar(cls, open_ms: int, bar: '_OpenBar') -> '_OpenBar':
+        """Start a higher-timeframe bar from a (finished or forming) lower-timeframe bar"""
+        new = cls(open_ms, bar.open, bar.volume, bar.ticks, bar.spread_sum)
+        new.high = bar.high
+        new.low = bar.low
+        new.close = bar.close
+        return new
+
+    def add_tick(self, price: float, volume: float, spread: float):
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+        self.ticks += 1
+        self.spread_sum += spread
+
+    def merge(self, bar: '_OpenBar'):
+        if bar.high > self.high:
+            self.high = bar.high
+        if bar.low < self.low:
+            self.low = bar.low
+        self.close = bar.close
+        self.volume += bar.volume
+        self.ticks += bar.ticks
+        self.spread_sum += bar.spread_sum
+
+    def to_row(self, symbol: str, timeframe: str) -> BarRow:
+        spread = self.spread_sum / self.ticks if self.ticks else 0.0
+        return (symbol, timeframe, self.open_ms, self.open, self.high, self.low,
+                self.close, self.volume, self.ticks, spread)
+
+
+class StreamingBarBuilder:
+    """
+    Per-symbol streaming OHLCV aggregator.
+
+    Ticks must arrive in timestamp order per symbol; ticks older than the open M1
+    bar are counted as late and ignored (backfill_bars() rebuilds bars missing from storage).
+    Higher timeframes are built only from finished M1 bars, so their tick_volume
+    and average spread are tick-weighted exactly as if built from raw ticks.
+    """
+
+    def __init__(self, timeframes: Sequence[str] = DEFAULT_TIMEFRAMES):
+        unknown = [tf for tf in timeframes if tf not in TIMEFRAME_MS]
+        if unknown:
+            raise ValueError(f"Unsupported timeframes: {unknown}")
+        if 'M1' not in timeframes:
+            raise ValueError("StreamingBarBuilder requires the M1 timeframe")
+
+        self.timeframes = tuple(timeframes)
+        # Rollup targets sorted by period (M1 is the base)
+        self._rollups = sorted(
+            ((tf, TIMEFRAME_MS[tf]) for tf in self.timeframes if tf != 'M1'),
+            key=lambda item: item[1]
+        )
+        self._m1: Dict[str, _OpenBar] = {}
+        self._open: Dict[Tuple[str, str], _OpenBar] = {}
+        self._seeded = set()
+
+        # Stats
+        self.ticks_processed = 0
+        self.late_ticks = 0
+        self.bars_emitted = 0
+
+    def needs_seed(self, symbol: str) -> bool:
+        """True until seed() ran for the symbol (once per builder lifetime)"""
+        return symbol not in self._seeded
+
+    def period_starts(self, timestamp_ms: int) -> Dict[str, int]:
+        """Open time of the bar containing timestamp_ms, per timeframe"""
+        timestamp_ms = int(timestamp_ms)
+        return {tf: timestamp_ms - timestamp_ms % TIMEFRAME_MS[tf] for tf in self.timeframes}
+
+    def seed(self, symbol: str, timestamp_ms: int, stored_rows: Sequence[BarRow]):
+        """
+        Resume forming bars from stored ohlcv_bars rows before the first tick of a symbol.
+        Rows whose open time matches the period containing timestamp_ms become the open
+        bars, so the next writes extend complete stored bars instead of replacing them.
+        """
+        self._seeded.add(symbol)
+        if symbol in self._m1:
+            return
+        starts = self.period_starts(timestamp_ms)
+        current = {row[1]: row for row in stored_rows if starts.get(row[1]) == int(row[2])}
+
+        m1 = None
+        if 'M1' in current:
+            m1 = self._m1[symbol] = _OpenBar.from_row(current['M1'])
+
+        for timeframe, _ in self._rollups:
+            row = current.get(timeframe)
+            if row is None:
+                continue
+            bar = _OpenBar.from_row(row)
+            if m1 is not None:
+                # The stored rollup already contains the forming M1 snapshot, which is
+                # merged again when that M1 bar finishes - keep only the finished part
+                bar.volume -= m1.volume
+                bar.ticks -= m1.ticks
+                bar.spread_sum -= m1.spread_sum
+            self._open[(symbol, timeframe)] = bar
+
+    def add_tick(self, symbol: str, timestamp_ms: int, bid: float, ask: float,
+                 volume: Optional[float] = None) -> List[BarRow]:
+        """Feed one tick; returns bars finished by it (usually empty)"""
+        timestamp_ms = int(timestamp_ms)
+        price = (bid + ask) / 2
+        spread = ask - bid
+        volume = volume or 0.0
+        minute_start = timestamp_ms - timestamp_ms % 60_000
+        self.ticks_processed += 1
+
+        bar = self._m1.get(symbol)
+        if bar is None:
+            self._m1[symbol] = _OpenBar(minute_start, price, volume, 1, spread)
+            return []
+
+        if minute_start == bar.open_ms:
+            bar.add_tick(price, volume, spread)
+            return []
+
+        if minute_start < bar.open_ms:
+            self.late_ticks += 1
+            return []
+
+        # New minute: close the open M1 bar and roll it up
+        finished = self._finish_m1(symbol, bar)
+        self._m1[symbol] = _OpenBar(minute_start, price, volume, 1, spread)
+        return finished
+
+    def _finish_m1(self, symbol: str, bar: _OpenBar) -> List[BarRow]:
+        finished = [bar.to_row(symbol, 'M1')]
+
+        for timeframe, period_ms in self._rollups:
+            bucket = bar.open_ms - bar.open_ms % period_ms
+            key = (symbol, timeframe)
+            open_bar = self._open.get(key)
+
+            if open_bar is None or bucket > open_bar.open_ms:
+                if open_bar is not None:
+                    finished.append(open_bar.to_row(symbol, timeframe))
+                self._open[key] = _OpenBar.from_bar(bucket, bar)
+            elif bucket == open_bar.open_ms:
+                open_bar.merge(bar)
+
+        self.bars_emitted += len(finished)
+        return finished
+
+    def forming_bars(self, symbol: Optional[str] = None) -> List[BarRow]:
+        """
+        Snapshot of bars that are still open (M1 plus rollups including the open M1 bar).
+        Written with INSERT OR REPLACE so the final bar overwrites the snapshot.
+        """
+        rows: List[BarRow] = []
+        symbols = [symbol] if symbol is not None else list(self._m1)
+
+        for sym in symbols:
+            m1 = self._m1.get(sym)
+            if m1 is None:
+                continue
+            rows.append(m1.to_row(sym, 'M1'))
+
+            for timeframe, period_ms in self._rollups:
+                bucket = m1.open_ms - m1.open_ms % period_ms
+                open_bar = self._open.get((sym, timeframe))
+                if open_bar is not None and open_bar.open_ms == bucket:
+                    snapshot = _OpenBar.from_bar(bucket, open_bar)
+                    snapshot.merge(m1)
+                else:
+                    snapshot = _OpenBar.from_bar(bucket, m1)
+                rows.append(snapshot.to_row(sym, timeframe))
+
+        return rows
+
+    def reset(self, symbol: Optional[str] = None):
+        """Drop open bars (all symbols, or one symbol); the next tick re-seeds from storage"""
+        if symbol is None:
+            self._m1.clear()
+            self._open.clear()
+            self._seeded.clear()
+            return
+        self._m1.pop(symbol, None)
+        self._seeded.discard(symbol)
+        for key in [k for k in self._open if k[0] == symbol]:
+            del self._open[key]
+
+    def symbols(self) -> List[str]:
+        return list(self._m1)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'ticks_processed': self.ticks_processed,
+            'late_ticks': self.late_ticks,
+            'bars_emitted': self.bars_emitted,
+            'open_symbols': len(self._m1),
+        }
@@ -2,12 +2,17 @@
 MT5 Ingestion Manager
 Dedicated ingestion threads per symbol with non-blocking polling
 High-performance MT5 data ingestion system
+
+Each symbol keeps a time_msc cursor and pulls only new ticks with copy_ticks_from
+in batches; ticks re-read at the cursor boundary are dropped, and every new tick is
+published once to a shared TickRing that all consumers read.
 """
 
 import threading
 import time
 import logging
 import queue
+import itertools
 from typing import Dict, Any, List, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from collections import deque
@@ -15,6 +20,10 @@ from enum import Enum
 import weakref
 import json
 
+import numpy as np
+
+from infra.mt5_gateway import mt5
+
 logger = logging.getLogger(__name__)
 
 class IngestionState(Enum):
@@ -45,6 +54,18 @@ class TickData:
     spread: float = 0.0
     source: str = "mt5"
     quality: DataQuality = DataQuality.GOOD
+    flags: int = 0
+    volume_real: float = 0.0
+    
+    @property
+    def time(self) -> int:
+        """Tick time in epoch seconds (MT5 tick field name)"""
+        return self.timestamp_ms // 1000
+    
+    @property
+    def time_msc(self) -> int:
+        """Tick time in epoch milliseconds (MT5 tick field name)"""
+        return self.timestamp_ms
 
 @dataclass
 class IngestionStats:
@@ -58,6 +79,13 @@ class IngestionStats:
     last_tick_time: float = 0.0
     consecutive_failures: int = 0
     reconnection_count: int = 0
+    duplicate_ticks: int = 0
+    dropped_ticks: int = 0
+    gap_count: int = 0
+    max_gap_ms: int = 0
+    last_gap_ms: int = 0
+    last_batch_size: int = 0
+    backlog: bool = False
 
 @dataclass
 class IngestionConfig:
@@ -70,6 +98,96 @@ class IngestionConfig:
     max_queue_size: int = 1000
     enable_quality_monitoring: bool = True
     enable_reconnection: bool = True
+    tick_batch_size: int = 1000
+    max_tick_batch_size: int = 100000
+    initial_lookback_ms: int = 0
+    gap_threshold_ms: int = 5000
+    rate_window_s: float = 10.0
+
+class TickRing:
+    """
+    Shared in-memory tick ring, one bounded buffer per symbol.
+    
+    Ingestion threads publish each new tick exactly once; consumers keep their own
+    sequence number and read only what they have not seen yet (read_since), or
+    query a time range (range) instead of re-reading MT5.
+    """
+    
+    def __init__(self, capacity_per_symbol: int = 20000):
+        self.capacity = capacity_per_symbol
+        self._buffers: Dict[str, deque] = {}
+        self._next_seq: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.overruns = 0
+    
+    def publish(self, symbol: str, ticks: List[TickData]) -> int:
+        """Append ticks (time-ordered) for a symbol; returns the last sequence number"""
+        with self._lock:
+            buf = self._buffers.get(symbol)
+            if buf is None:
+                buf = self._buffers[symbol] = deque(maxlen=self.capacity)
+                self._next_seq[symbol] = 1
+            buf.extend(ticks)
+            self._next_seq[symbol] += len(ticks)
+            return self._next_seq[symbol] - 1
+    
+    def read_since(self, symbol: str, after_seq: int = 0,
+                   limit: Optional[int] = None) -> Tuple[List[TickData], int]:
+        """
+        Ticks published after ``after_seq``; returns (ticks, last_seq).
+        A reader that fell behind the ring capacity gets the oldest retained ticks.
+        """
+        with self._lock:
+            buf = self._buffers.get(symbol)
+            if not buf:
+                return [], after_seq
+            next_seq = self._next_seq[symbol]
+            oldest_seq = next_seq - len(buf)
+            start_seq = after_seq + 1
+            if start_seq < oldest_seq:
+                if after_seq > 0:
+                    self.overruns += 1
+                start_seq = oldest_seq
+            if start_seq >= next_seq:
+                return [], next_seq - 1
+            stop = len(buf) if limit is None else min(len(buf), start_seq - oldest_seq + limit)
+            ticks = list(itertools.islice(buf, start_seq - oldest_seq, stop))
+            return ticks, start_seq + len(ticks) - 1
+    
+    def latest(self, symbol: str) -> Optional[TickData]:
+        with self._lock:
+            buf = self._buffers.get(symbol)
+            return buf[-1] if buf else None
+    
+    def last_seq(self, symbol: str) -> int:
+        with self._lock:
+            return self._next_seq.get(symbol, 1) - 1
+    
+    def covers(self, symbol: str, start_ms: int) -> bool:
+        """True if the retained ticks reach back to start_ms"""
+        with self._lock:
+            buf = self._buffers.get(symbol)
+            return bool(buf) and buf[0].timestamp_ms <= start_ms
+    
+    def range(self, symbol: str, start_ms: int, end_ms: int) -> List[TickData]:
+        """Ticks with start_ms <= time_msc <= end_ms"""
+        with self._lock:
+            buf = self._buffers.get(symbol)
+            if not buf:
+                return []
+            return [t for t in buf if start_ms <= t.timestamp_ms <= end_ms]
+    
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._buffers)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'capacity_per_symbol': self.capacity,
+                'symbols': {symbol: len(buf) for symbol, buf in self._buffers.items()},
+                'overruns': self.overruns
+            }
 
 class MT5IngestionThread:
     """
@@ -77,7 +195,8 @@ class MT5IngestionThread:
     Non-blocking polling with quality monitoring
     """
     
-    def __init__(self, symbol: str, config: Optional[IngestionConfig] = None):
+    def __init__(self, symbol: str, config: Optional[IngestionConfig] = None,
+                 tick_ring: Optional[TickRing] = None):
         self.symbol = symbol
         self.config = config or IngestionConfig()
         
@@ -102,9 +221,19 @@ class MT5IngestionThread:
         self.last_quality_check = 0.0
         self.quality_history = deque(maxlen=100)
         
-        # MT5 connection (would be injected in real implementation)
+        # MT5 connection (defaults to the shared MT5 gateway; inject a backend for tests)
         self.mt5_connection = None
         
+        # Shared tick ring new ticks are published to
+        self.tick_ring = tick_ring
+        
+        # Cursor state: last ingested time_msc and how many ticks at that ms were already seen
+        self._cursor_msc: Optional[int] = None
+        self._boundary_count = 0
+        self._request_size = self.config.tick_batch_size
+        self._last_tick_msc: Optional[int] = None
+        self._rate_window: deque = deque()
+        
         logger.info(f"MT5IngestionThread initialized for {symbol}")
     
     def start(self):
@@ -147,11 +276,14 @@ class MT5IngestionThread:
             while self.running:
                 try:
                     # Poll for new tick data
-                    tick_data = self._poll_tick_data()
+                    ticks = self._poll_tick_data()
                     
-                    if tick_data:
-                        # Process tick data
-                        self._process_tick(tick_data)
+                    if ticks:
+                        # Publish once to the shared ring, then per-tick queue/callbacks
+                        if self.tick_ring is not None:
+                            self.tick_ring.publish(self.symbol, ticks)
+                        for tick_data in ticks:
+                            self._process_tick(tick_data)
                     else:
                         # No new data, check for timeouts
                         self._check_data_timeout()
@@ -159,8 +291,9 @@ class MT5IngestionThread:
                     # Quality monitoring
                     self._monitor_data_quality()
                     
-                    # Brief pause to prevent CPU spinning
-                    time.sleep(self.config.polling_interval_ms / 1000.0)
+                    # Brief pause to prevent CPU spinning (drain immediately while backlogged)
+                    if not self.stats.backlog:
+                        time.sleep(self.config.polling_interval_ms / 1000.0)
                     
                 except Exception as e:
                     logger.error(f"Error in ingestion loop for {self.symbol}: {e}")
@@ -172,38 +305,124 @@ class MT5IngestionThread:
             self.state = IngestionState.ERROR
             self._handle_error(e)
     
-    def _poll_tick_data(self) -> Optional[TickData]:
-        """Poll MT5 for new tick data (non-blocking)"""
+    def _poll_tick_data(self) -> Optional[List[TickData]]:
+        """Pull ticks newer than the cursor with copy_ticks_from (non-blocking, batched)"""
         try:
-            # This would be the actual MT5 polling logic
-            # For now, simulate with mock data
-            current_time = time.time()
+            backend = self.mt5_connection or mt5
             
-            # Simulate tick data (in real implementation, this would call MT5 API)
-            if hasattr(self, '_last_poll_time'):
-                if current_time - self._last_poll_time < 0.1:  # 100ms minimum between polls
+            if self._cursor_msc is None:
+                self._cursor_msc = self._initial_cursor(backend)
+                if self._cursor_msc is None:
                     return None
-            self._last_poll_time = current_time
             
-            # Mock tick data (replace with actual MT5 call)
-            mock_tick = TickData(
-                symbol=self.symbol,
-                timestamp_ms=int(current_time * 1000),
-                bid=50000.0 + (current_time % 100),  # Mock price
-                ask=50000.5 + (current_time % 100),
-                last=50000.25 + (current_time % 100),
-                volume=100.0,
-                spread=0.5,
-                source="mt5",
-                quality=DataQuality.GOOD
+            raw = backend.copy_ticks_from(
+                self.symbol, self._cursor_msc // 1000, self._request_size, backend.COPY_TICKS_ALL
             )
+            if raw is None:
+                logger.debug(f"copy_ticks_from failed for {self.symbol}: {backend.last_error()}")
+                return None
+            
+            full_batch = len(raw) >= self._request_size
+            self.stats.last_batch_size = len(raw)
+            self.stats.backlog = full_batch
+            if len(raw) == 0:
+                return None
+            
+            times = raw['time_msc'].astype(np.int64)
+            new_mask = self._dedupe_mask(times)
+            self.stats.duplicate_ticks += int(len(raw) - new_mask.sum())
             
-            return mock_tick
+            if not new_mask.any():
+                # A full batch inside already-seen ticks (very busy second): widen the request
+                if full_batch:
+                    self._request_size = min(self._request_size * 2, self.config.max_tick_batch_size)
+                return None
+            self._request_size = self.config.tick_batch_size
+            
+            # New ticks are the tail of the batch; every tick at the new cursor ms has now been seen
+            self._cursor_msc = int(times[-1])
+            self._boundary_count = int((times == self._cursor_msc).sum())
+            
+            fresh = raw[new_mask]
+            self._update_gap_stats(times[new_mask])
+            self._update_rate(len(fresh))
+            return self._to_tick_data(fresh)
             
         except Exception as e:
             logger.error(f"Error polling tick data for {self.symbol}: {e}")
             return None
     
+    def _initial_cursor(self, backend) -> Optional[int]:
+        """Start the cursor at the latest broker tick (minus the configured lookback)"""
+        tick = backend.symbol_info_tick(self.symbol)
+        if tick is None:
+            logger.debug(f"No current tick for {self.symbol}: {backend.last_error()}")
+            return None
+        self._boundary_count = 0
+        self._last_tick_msc = None
+        return int(tick.time_msc) - self.config.initial_lookback_ms
+    
+    def _dedupe_mask(self, times: np.ndarray) -> np.ndarray:
+        """
+        Keep ticks after the cursor. copy_ticks_from works at second resolution, so
+        ticks at exactly the cursor ms are re-read: the first ``_boundary_count`` of
+        them (MT5 returns ticks in order) were ingested by the previous poll.
+        """
+        mask = times > self._cursor_msc
+        at_cursor = np.nonzero(times == self._cursor_msc)[0]
+        if len(at_cursor) > self._boundary_count:
+            mask[at_cursor[self._boundary_count:]] = True
+        return mask
+    
+    def _update_gap_stats(self, times: np.ndarray):
+        """Count gaps between consecutive ticks longer than gap_threshold_ms"""
+        previous = self._last_tick_msc
+        if previous is not None:
+            times = np.concatenate(([previous], times))
+        if len(times) > 1:
+            deltas = np.diff(times)
+            gaps = deltas[deltas > self.config.gap_threshold_ms]
+            if len(gaps):
+                self.stats.gap_count += len(gaps)
+                self.stats.last_gap_ms = int(gaps[-1])
+                self.stats.max_gap_ms = max(self.stats.max_gap_ms, int(gaps.max()))
+        self._last_tick_msc = int(times[-1])
+    
+    def _update_rate(self, count: int):
+        now = time.time()
+        self._rate_window.append((now, count))
+        while self._rate_window and now - self._rate_window[0][0] > self.config.rate_window_s:
+            self._rate_window.popleft()
+    
+    def ticks_per_second(self) -> float:
+        """Ingested ticks per second over the rate window"""
+        now = time.time()
+        count = sum(n for t, n in self._rate_window if now - t <= self.config.rate_window_s)
+        return count / self.config.rate_window_s
+    
+    def _to_tick_data(self, raw) -> List[TickData]:
+        names = raw.dtype.names
+        has_real = 'volume_real' in names
+        ticks = []
+        for row in raw:
+            bid = float(row['bid'])
+            ask = float(row['ask'])
+            volume_real = float(row['volume_real']) if has_real else 0.0
+            ticks.append(TickData(
+                symbol=self.symbol,
+                timestamp_ms=int(row['time_msc']),
+                bid=bid,
+                ask=ask,
+                last=float(row['last']),
+                volume=volume_real or float(row['volume']),
+                spread=ask - bid,
+                source="mt5",
+                quality=DataQuality.GOOD,
+                flags=int(row['flags']),
+                volume_real=volume_real
+            ))
+        return ticks
+    
     def _process_tick(self, tick_data: TickData):
         """Process incoming tick data"""
         start_time = time.perf_counter_ns()
@@ -218,7 +437,9 @@ class MT5IngestionThread:
             try:
                 self.data_queue.put_nowait(tick_data)
             except queue.Full:
-                logger.warning(f"Data queue full for {self.symbol}, dropping tick")
+                if self.stats.dropped_ticks == 0:
+                    logger.warning(f"Data queue full for {self.symbol}, dropping ticks (read the tick ring instead)")
+                self.stats.dropped_ticks += 1
                 return
             
             # Notify callbacks
@@ -391,8 +612,10 @@ class MT5IngestionThread:
                 'data_quality_score': self.stats.data_quality_score,
                 'consecutive_failures': self.stats.consecutive_failures,
                 'reconnection_count': self.stats.reconnection_count,
-                'queue_size': self.data_queue.qsize()
+                'queue_size': self.data_queue.qsize(),
+                'dropped_ticks': self.stats.dropped_ticks
             },
+            'ingestion': self.get_ingestion_stats(),
             'config': {
                 'polling_interval_ms': self.config.polling_interval_ms,
                 'data_timeout_ms': self.config.data_timeout_ms,
@@ -400,6 +623,20 @@ class MT5IngestionThread:
             }
         }
 
+    def get_ingestion_stats(self) -> Dict[str, Any]:
+        """Cursor, backlog, throughput, dedup and gap statistics"""
+        return {
+            'cursor_msc': self._cursor_msc,
+            'backlog': self.stats.backlog,
+            'last_batch_size': self.stats.last_batch_size,
+            'request_size': self._request_size,
+            'ticks_per_sec': round(self.ticks_per_second(), 2),
+            'duplicate_ticks': self.stats.duplicate_ticks,
+            'gap_count': self.stats.gap_count,
+            'max_gap_ms': self.stats.max_gap_ms,
+            'last_gap_ms': self.stats.last_gap_ms
+        }
+
 class MT5IngestionManager:
     """
     Manages multiple MT5 ingestion threads
@@ -412,6 +649,9 @@ class MT5IngestionManager:
         # Ingestion threads per symbol
         self.ingestion_threads: Dict[str, MT5IngestionThread] = {}
         
+        # Shared tick ring all consumers read from
+        self.tick_ring = TickRing(self.config.get('tick_ring_capacity', 20000))
+        
         # Global callbacks
         self.global_tick_callbacks: List[Callable[[TickData], None]] = []
         self.global_error_callbacks: List[Callable[[str, Exception], None]] = []
@@ -432,7 +672,7 @@ class MT5IngestionManager:
             
             try:
                 # Create ingestion thread
-                thread = MT5IngestionThread(symbol, config)
+                thread = MT5IngestionThread(symbol, config, tick_ring=self.tick_ring)
                 
                 # Add global callbacks
                 for callback in self.global_tick_callbacks:
@@ -551,18 +791,31 @@ class MT5IngestionManager:
         with self.manager_lock:
             healthy_symbols = 0
             total_symbols = len(self.ingestion_threads)
+            ingestion = {}
             
-            for thread in self.ingestion_threads.values():
+            for symbol, thread in self.ingestion_threads.items():
                 if (thread.state == IngestionState.RUNNING and 
                     thread.stats.data_quality_score > 0.5):
                     healthy_symbols += 1
+                ingestion[symbol] = thread.get_ingestion_stats()
             
             return {
                 'healthy': healthy_symbols == total_symbols and total_symbols > 0,
                 'healthy_symbols': healthy_symbols,
                 'total_symbols': total_symbols,
-                'health_percentage': (healthy_symbols / max(total_symbols, 1)) * 100
+                'health_percentage': (healthy_symbols / max(total_symbols, 1)) * 100,
+                'backlogged_symbols': [s for s, stats in ingestion.items() if stats['backlog']],
+                'ticks_per_sec': round(sum(stats['ticks_per_sec'] for stats in ingestion.values()), 2),
+                'gap_count': sum(stats['gap_count'] for stats in ingestion.values()),
+                'duplicate_ticks': sum(stats['duplicate_ticks'] for stats in ingestion.values()),
+                'ingestion': ingestion,
+                'tick_ring': self.tick_ring.get_stats()
             }
+    
+    def is_ingesting(self, symbol: str) -> bool:
+        """True if a running ingestion thread publishes this symbol to the tick ring"""
+        thread = self.ingestion_threads.get(symbol)
+        return thread is not None and thread.state == IngestionState.RUNNING
 
 # Global ingestion manager instance
 _ingestion_manager: Optional[MT5IngestionManager] = None
@@ -571,12 +824,29 @@ def get_ingestion_manager() -> Optional[MT5IngestionManager]:
     """Get the global ingestion manager instance"""
     return _ingestion_manager
 
+def get_tick_ring() -> Optional[TickRing]:
+    """Get the shared tick ring of the global ingestion manager (None if not initialized)"""
+    return _ingestion_manager.tick_ring if _ingestion_manager else None
+
 def initialize_ingestion_manager(config: Optional[Dict[str, Any]] = None) -> MT5IngestionManager:
     """Initialize the global ingestion manager"""
     global _ingestion_manager
     _ingestion_manager = MT5IngestionManager(config)
     return _ingestion_manager
 
+def start_ingestion_manager(symbols: List[str], config: Optional[Dict[str, Any]] = None) -> MT5IngestionManager:
+    """
+    Start cursor ingestion for symbols on the global manager (created if needed).
+    Consumers (TickDataFetcher, unified pipeline MT5 bridge) read its tick ring.
+    """
+    manager = _ingestion_manager or initialize_ingestion_manager(config)
+    for symbol in symbols:
+        if symbol not in manager.ingestion_threads:
+            manager.add_symbol(symbol)
+    if not manager.running:
+        manager.start_all()
+    return manager
+
 def shutdown_ingestion_manager():
     """Shutdown the global ingestion manager"""
     global _ingestion_manager
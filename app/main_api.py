@@ -11,9 +11,9 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta, timezone
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Request, Header, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request, Response, Header, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from pydantic import BaseModel, Field
 from enum import Enum
 import logging
@@ -77,6 +77,10 @@ from dtms_integration import get_dtms_system_status, get_dtms_trade_status, get_
 from infra.indicator_bridge import IndicatorBridge
 from infra.multi_timeframe_streamer import MultiTimeframeStreamer, StreamerConfig
 from infra.tick_metrics import set_tick_metrics_instance, get_tick_metrics_instance
+from infra.candle_encoding import (
+    JSON_MEDIA_TYPE, candles_etag, candles_to_columns, encode_payload, etag_matches,
+    filter_since, negotiate_media_type,
+)
 from config import settings
 from app.services import oco_tracker
 
@@ -286,12 +290,45 @@ async def reload_configs() -> Dict[str, Any]:
 # STREAMER API ENDPOINTS
 # ============================================================================
 
+def _candle_response_mode(
+    request: Request,
+    symbol: str,
+    timeframe: str,
+    candles: List[Any],
+    format: str,
+    since: Optional[int],
+    if_none_match: Optional[str]
+) -> tuple:
+    """
+    Content negotiation and conditional-fetch handling shared by the candle endpoints.
+    
+    Returns:
+        (media_type, columnar, headers, not_modified)
+    """
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    # Binary encodings are always columnar
+    columnar = format.lower() == "columnar" or media_type != JSON_MEDIA_TYPE
+    etag = candles_etag(symbol, timeframe, candles, variant=f"{media_type}|{columnar}|{since}")
+    headers = {"ETag": etag, "Vary": "Accept"}
+    return media_type, columnar, headers, etag_matches(if_none_match, etag)
+
+
+def _columnar_candle_response(payload: Dict[str, Any], candles: List[Any], media_type: str, headers: Dict[str, str]) -> Response:
+    """Encode a columnar candle payload (one array per OHLCV field) in the negotiated media type"""
+    payload = dict(payload, layout="columnar", columns=candles_to_columns(candles))
+    return Response(content=encode_payload(payload, media_type), media_type=media_type, headers=headers)
+
+
 @app.get("/streamer/candles/{symbol}/{timeframe}", tags=["streamer"])
 async def get_streamer_candles(
     symbol: str,
     timeframe: str,
+    request: Request,
+    response: Response,
     limit: int = 50,
-    format: str = "dict"
+    format: str = "dict",
+    since: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None)
 ) -> Dict[str, Any]:
     """
     Get candles from MultiTimeframeStreamer buffer.
@@ -300,7 +337,12 @@ async def get_streamer_candles(
         symbol: Trading symbol (e.g., 'BTCUSDc')
         timeframe: Timeframe ('M1', 'M5', 'M15', 'M30', 'H1', 'H4')
         limit: Number of candles to return (default: 50, max: 500)
-        format: Response format ('dict' or 'raw') - currently only 'dict' supported
+        format: Response layout ('dict' = one object per bar, 'columnar' = one array per field)
+        since: Only return bars with time >= since (epoch seconds)
+        if_none_match: ETag from a previous response - 304 if the candles have not changed
+    
+    Accept: application/x-msgpack or application/vnd.apache.arrow.stream selects a
+    binary columnar encoding; JSON otherwise.
     
     Returns:
         JSON response with candles or error
@@ -359,6 +401,25 @@ async def get_streamer_candles(
                 "timeframe": timeframe.upper()
             }
         
+        candles = filter_since(candles, since)
+        media_type, columnar, headers, not_modified = _candle_response_mode(
+            request, symbol_norm, timeframe.upper(), candles, format, since, if_none_match
+        )
+        if not_modified:
+            return Response(status_code=304, headers=headers)
+        
+        payload = {
+            "success": True,
+            "symbol": symbol_norm,
+            "timeframe": timeframe.upper(),
+            "count": len(candles),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "source": "streamer_buffer"
+        }
+        if columnar:
+            return _columnar_candle_response(payload, candles, media_type, headers)
+        response.headers.update(headers)
+        
         # Convert Candle objects to dicts
         candle_dicts = []
         for candle in candles:
@@ -387,15 +448,8 @@ async def get_streamer_candles(
                 # Already a dict
                 candle_dicts.append(candle)
         
-        return {
-            "success": True,
-            "symbol": symbol_norm,
-            "timeframe": timeframe.upper(),
-            "count": len(candle_dicts),
-            "candles": candle_dicts,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "source": "streamer_buffer"
-        }
+        payload["candles"] = candle_dicts
+        return payload
         
     except Exception as e:
         logger.error(f"Error getting candles from streamer: {e}", exc_info=True)
@@ -1280,6 +1334,20 @@ async def startup_event():
             logger.warning(f"⚠️ Liquidity Sweep Reversal Engine initialization failed: {e}")
             logger.info("   → Main API will continue without autonomous sweep trading")
         
+        tick_symbols = ["BTCUSDc", "XAUUSDc", "EURUSDc", "USDJPYc", "GBPUSDc"]
+        
+        # ========== MT5 TICK INGESTION ==========
+        # One cursor poller per symbol fills the shared tick ring; tick consumers
+        # (Tick Metrics Generator via TickDataFetcher) read it instead of re-copying tick windows
+        if connected:
+            try:
+                from app.io.mt5_ingestion_manager import start_ingestion_manager
+                start_ingestion_manager(tick_symbols)
+                logger.info(f"✅ MT5 tick ingestion started for {len(tick_symbols)} symbols")
+            except Exception as e:
+                logger.warning(f"⚠️ MT5 tick ingestion failed to start: {e}", exc_info=True)
+                logger.info("   → Tick consumers will fall back to direct MT5 tick copies")
+        
         # ========== TICK METRICS GENERATOR ==========
         global tick_metrics_generator
         try:
@@ -1287,7 +1355,7 @@ async def startup_event():
             from infra.tick_metrics.tick_snapshot_generator import TickSnapshotGenerator
             
             tick_metrics_generator = TickSnapshotGenerator(
-                symbols=["BTCUSDc", "XAUUSDc", "EURUSDc", "USDJPYc", "GBPUSDc"],
+                symbols=tick_symbols,
                 update_interval_seconds=60
                 # Note: Uses direct MT5 calls internally, not mt5_service
             )
@@ -1551,6 +1619,13 @@ async def shutdown_event():
         if 'tick_metrics_generator' in globals() and tick_metrics_generator:
             await stop_with_timeout(tick_metrics_generator.stop(), timeout=3.0, name="Tick Metrics Generator")
         
+        # Stop MT5 tick ingestion
+        try:
+            from app.io.mt5_ingestion_manager import shutdown_ingestion_manager
+            shutdown_ingestion_manager()
+        except Exception as e:
+            logger.debug(f"Error stopping MT5 tick ingestion: {e}")
+        
         # Stop OCO monitor
         oco_monitor_running = False
         if oco_monitor_task:
@@ -1846,6 +1921,33 @@ async def detailed_health_status() -> Dict[str, Any]:
         "pending_signals": 0  # TODO: Implement signal tracking
     }
 
+@app.get("/health/perf")
+async def performance_spans(top: int = 50, traces: int = 10) -> Dict[str, Any]:
+    """Span timings (count, total/self time, p50/p95/p99) for the auto-execution pipeline"""
+    from infra.span_tracer import get_span_tracer
+    tracer = get_span_tracer()
+    report = tracer.get_perf_report(top=top)
+    report["slowest_traces"] = tracer.get_recent_traces(limit=traces, slowest=True)
+    return report
+
+@app.get("/health/perf/flamegraph", response_class=PlainTextResponse)
+async def performance_flamegraph() -> str:
+    """Span self-time as folded stacks (feed to flamegraph.pl or speedscope)"""
+    from infra.span_tracer import get_span_tracer
+    return get_span_tracer().export_folded()
+
+@app.post("/health/perf/profile", response_class=PlainTextResponse, dependencies=[Depends(verify_api_key)])
+async def performance_profile(seconds: float = 5.0, interval_ms: float = 5.0, thread: Optional[str] = None) -> str:
+    """Run the sampling profiler over all threads and return folded stacks"""
+    from infra.span_tracer import get_sampling_profiler
+    seconds = max(0.1, min(seconds, 60.0))
+    interval_s = max(0.001, interval_ms / 1000.0)
+    try:
+        result = await asyncio.to_thread(get_sampling_profiler().profile, seconds, interval_s, thread)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return result["folded"]
+
 # ============================================================================
 # TRADING ENDPOINTS
 # ============================================================================
@@ -5047,7 +5149,12 @@ async def get_multi_timeframe_analysis(symbol: str):
 async def get_streamer_candles(
     symbol: str,
     timeframe: str,
-    limit: Optional[int] = None
+    request: Request,
+    response: Response,
+    limit: Optional[int] = None,
+    format: str = "dict",
+    since: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None)
 ) -> Dict[str, Any]:
     """
     Get candlestick data from Multi-Timeframe Streamer.
@@ -5060,6 +5167,10 @@ async def get_streamer_candles(
     - symbol: Trading symbol (e.g., BTCUSDc, XAUUSDc)
     - timeframe: One of M1, M5, M15, M30, H1, H4
     - limit: Maximum number of candles to return (default: all in buffer)
+    - format: 'dict' (one object per bar) or 'columnar' (one array per field, time as epoch seconds)
+    - since: Only return bars with time >= since (epoch seconds)
+    - If-None-Match header: ETag from a previous response - 304 if unchanged
+    - Accept header: application/x-msgpack or application/vnd.apache.arrow.stream for binary columnar
     
     Returns:
     - List of candles with OHLCV data
@@ -5128,25 +5239,35 @@ async def get_streamer_candles(
         # Get latest candle
         latest = multi_tf_streamer.get_latest_candle(symbol, timeframe)
         
-        # Convert candles to dict format
-        candles_data = [candle.to_dict() for candle in candles]
+        candles = filter_since(candles, since)
+        media_type, columnar, headers, not_modified = _candle_response_mode(
+            request, symbol, timeframe, candles, format, since, if_none_match
+        )
+        if not_modified:
+            return Response(status_code=304, headers=headers)
         
         # Get streamer metrics for context
         metrics = multi_tf_streamer.get_metrics()
         
-        return {
+        payload = {
             "symbol": symbol,
             "timeframe": timeframe,
-            "candles": candles_data,
-            "count": len(candles_data),
+            "count": len(candles),
             "latest": latest.to_dict() if latest else None,
-            "buffer_size": len(candles_data),
+            "buffer_size": len(candles),
             "streamer_status": {
                 "running": multi_tf_streamer.is_running,
                 "memory_usage_mb": metrics.get("memory_usage_mb", 0.0),
                 "total_candles_fetched": metrics.get("total_candles_fetched", 0)
             }
         }
+        if columnar:
+            return _columnar_candle_response(payload, candles, media_type, headers)
+        response.headers.update(headers)
+        
+        # Convert candles to dict format
+        payload["candles"] = [candle.to_dict() for candle in candles]
+        return payload
         
     except HTTPException:
         raise
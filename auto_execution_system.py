@@ -19,6 +19,8 @@ import os  # Phase 4.1: For os.cpu_count()
 import MetaTrader5 as mt5
 import requests
 from dataclasses import dataclass, asdict
+from infra.span_tracer import get_span_tracer, traced
+from infra.session_calendar import get_session_calendar, is_weekend
 
 logger = logging.getLogger(__name__)
 
@@ -89,9 +91,6 @@ class AutoExecutionSystem:
         3. Check creation time if weekend was active at that time
         """
         try:
-            from infra.weekend_profile_manager import WeekendProfileManager
-            weekend_manager = WeekendProfileManager()
-            
             # Method 1: Check session attribute in conditions
             if plan.conditions and plan.conditions.get("session") == "Weekend":
                 return True
@@ -100,24 +99,12 @@ class AutoExecutionSystem:
             if plan.notes and "weekend" in plan.notes.lower():
                 return True
             
-            # Method 3: Check if creation time was during weekend
+            # Method 3: Check if creation time was during weekend (session calendar lookup)
             try:
                 created_at_dt = datetime.fromisoformat(plan.created_at.replace('Z', '+00:00'))
                 if created_at_dt.tzinfo is None:
                     created_at_dt = created_at_dt.replace(tzinfo=timezone.utc)
-                
-                if hasattr(weekend_manager, 'is_weekend_active_at_time'):
-                    return weekend_manager.is_weekend_active_at_time(created_at_dt)
-                else:
-                    # Fallback: check weekday and hour
-                    weekday = created_at_dt.weekday()
-                    hour = created_at_dt.hour
-                    return (
-                        (weekday == 4 and hour >= 23) or  # Fri 23:00+
-                        weekday == 5 or  # Saturday
-                        weekday == 6 or  # Sunday
-                        (weekday == 0 and hour < 3)  # Mon < 03:00
-                    )
+                return is_weekend(created_at_dt)
             except Exception as e:
                 logger.debug(f"Could not check creation time for plan {plan.plan_id}: {e}")
                 return False
@@ -677,6 +664,8 @@ class AutoExecutionSystem:
         self.max_thread_restarts = 10  # Maximum restarts before giving up (increased from 5)
         # Event to allow immediate wake-up when stopping (prevents 30s delay)
         self._stop_event = threading.Event()
+        # Wake-up for the monitor loop's sleep (stop() or notify_plans_changed()); only the loop clears it
+        self._wake_event = threading.Event()
         
         # Initialize MT5 service (use provided or create new)
         if mt5_service is None:
@@ -946,6 +935,8 @@ class AutoExecutionSystem:
         self._plan_types: Dict[str, str] = {}  # plan_id -> plan_type
         self._plan_last_check: Dict[str, datetime] = {}  # plan_id -> last check time (UTC datetime)
         self._plan_last_price: Dict[str, float] = {}  # plan_id -> last known price
+        # Time-gated plans: plan_id -> (epoch when the gate opens, conditions it was derived from)
+        self._time_gates: Dict[str, tuple] = {}
         
         # M1 cache invalidation tracking (for candle-close detection)
         # CRITICAL: Initialize here, not in method (avoids hasattr check every time)
@@ -1086,6 +1077,12 @@ class AutoExecutionSystem:
         except Exception as e:
             logger.warning(f"Could not initialize volatility tolerance calculator: {e}")
         
+        # Plan-load fast path: row versions (updated_seq) of loaded plans and the highest
+        # sequence seen, so reloads only fetch and parse rows changed since then
+        self._plan_versions: Dict[str, int] = {}  # plan_id -> updated_seq
+        self._plan_seq_cursor: int = 0
+        self._plan_reload_event = threading.Event()  # Set by notify_plans_changed()
+        
         # Load existing plans
         self.plans = self._load_plans()
         
@@ -1098,7 +1095,9 @@ class AutoExecutionSystem:
         
         # Track last plan reload time for periodic reloading
         self.last_plan_reload = datetime.now(timezone.utc)
-        self.plan_reload_interval = 300  # Reload plans every 5 minutes
+        self.plan_reload_interval = 300  # Full reconcile against the database every 5 minutes
+        self.last_incremental_reload = time.time()
+        self.plan_incremental_reload_interval = 30  # Fetch changed rows (by updated_seq) every 30 seconds
         
         # Thread safety: Lock for plans dictionary access
         self.plans_lock = threading.Lock()
@@ -1265,7 +1264,48 @@ class AutoExecutionSystem:
             except sqlite3.OperationalError:
                 # Column already exists, skip
                 pass
-            
+
+            # Plan-load fast path: monotonically increasing change sequence
+            # Every INSERT/UPDATE (from any process) bumps updated_seq, so the monitor
+            # can reload only rows changed since the last sequence it has seen.
+            try:
+                conn.execute("ALTER TABLE trade_plans ADD COLUMN updated_seq INTEGER DEFAULT 0")
+                # Backfill existing rows so they have distinct, ordered sequence numbers
+                conn.execute("UPDATE trade_plans SET updated_seq = rowid")
+                conn.commit()
+                logger.info("Added updated_seq column to trade_plans table")
+            except sqlite3.OperationalError:
+                # Column already exists, skip
+                pass
+
+            try:
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_trade_plans_updated_seq ON trade_plans(updated_seq)"
+                )
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS trg_trade_plans_seq_insert
+                    AFTER INSERT ON trade_plans
+                    BEGIN
+                        UPDATE trade_plans
+                        SET updated_seq = (SELECT COALESCE(MAX(updated_seq), 0) + 1 FROM trade_plans)
+                        WHERE plan_id = NEW.plan_id;
+                    END
+                """)
+                # WHEN guard: skip updates that already set updated_seq (incl. the insert trigger)
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS trg_trade_plans_seq_update
+                    AFTER UPDATE ON trade_plans
+                    WHEN NEW.updated_seq IS OLD.updated_seq
+                    BEGIN
+                        UPDATE trade_plans
+                        SET updated_seq = (SELECT COALESCE(MAX(updated_seq), 0) + 1 FROM trade_plans)
+                        WHERE plan_id = NEW.plan_id;
+                    END
+                """)
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Could not create updated_seq index/triggers (incremental reload disabled): {e}")
+
     def _validate_plan_data(self, plan_id: str, symbol: str, direction: str, entry_price: float, 
                             stop_loss: float, take_profit: float, volume: float, expires_at: Optional[str]) -> tuple[bool, Optional[str]]:
         """
@@ -1330,248 +1370,180 @@ class AutoExecutionSystem:
         Auto-returns connection on exit.
         """
         conn = None
+        # Spans cover acquiring/releasing the connection only - the caller's work
+        # inside the with-block is timed by its own spans, not attributed to sqlite
         try:
-            if self._db_manager:
-                conn = self._db_manager.get_connection()
-            else:
-                # Fallback to direct connection
-                conn = sqlite3.connect(self.db_path, timeout=10.0)
+            with get_span_tracer().span("sqlite.connect"):
+                if self._db_manager:
+                    conn = self._db_manager.get_connection()
+                else:
+                    # Fallback to direct connection
+                    conn = sqlite3.connect(self.db_path, timeout=10.0)
             yield conn
         except Exception as e:
             logger.error(f"Error in database context manager: {e}")
             raise
         finally:
             if conn:
-                if self._db_manager:
-                    self._db_manager.return_connection(conn)
-                else:
-                    conn.close()
+                with get_span_tracer().span("sqlite.close"):
+                    if self._db_manager:
+                        self._db_manager.return_connection(conn)
+                    else:
+                        conn.close()
+    
+    # Statuses the monitor keeps in memory
+    _MONITORED_PLAN_STATUSES = ("pending", "pending_order_placed")
     
+    # Fields edited outside the monitor (update_plan, API, direct DB edits). A newer row
+    # that changes one of these replaces the in-memory plan; rows that only echo the
+    # monitor's own tracking writes (zone, cancellation, re-evaluation) do not.
+    _EDITABLE_PLAN_FIELDS = (
+        "entry_price", "stop_loss", "take_profit", "volume",
+        "conditions", "expires_at", "notes", "entry_levels"
+    )
+
+    @staticmethod
+    def _rows_to_dicts(cursor) -> List[Dict[str, Any]]:
+        """Fetch all rows from a cursor as {column: value} dicts (independent of column order)"""
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def _fetch_monitored_plan_rows(self, direct: bool = False) -> tuple:
+        """
+        Fetch all monitored (pending / pending_order_placed, non-expired) plan rows.
+
+        Returns:
+            (rows, max_seq) where max_seq is the highest updated_seq in the table at read time
+        """
+        now_utc = datetime.now(timezone.utc).isoformat()
+        placeholders = ", ".join("?" for _ in self._MONITORED_PLAN_STATUSES)
+        query = f"""
+            SELECT * FROM trade_plans 
+            WHERE status IN ({placeholders})
+            AND (expires_at IS NULL OR expires_at > ?)
+        """
+        params = (*self._MONITORED_PLAN_STATUSES, now_utc)
+
+        def _fetch(conn):
+            # Read the sequence high-water mark first: anything written after it is
+            # picked up by the next incremental reload.
+            max_seq = 0
+            try:
+                max_seq = conn.execute("SELECT COALESCE(MAX(updated_seq), 0) FROM trade_plans").fetchone()[0] or 0
+            except sqlite3.OperationalError:
+                pass  # updated_seq column not available - incremental reload falls back to full
+            return self._rows_to_dicts(conn.execute(query, params)), max_seq
+
+        if direct:
+            with sqlite3.connect(self.db_path, timeout=15.0) as conn:
+                return _fetch(conn)
+        # Phase 3.4: Use OptimizedSQLiteManager if available
+        with self._get_db_connection() as conn:
+            return _fetch(conn)
+
+    def _plan_from_row(self, row: Dict[str, Any]) -> Optional[TradePlan]:
+        """Build a TradePlan from a trade_plans row dict. Returns None if the row is invalid."""
+        plan_id = row.get("plan_id")
+        volume = row.get("volume")
+        volume = volume if volume and volume > 0 else 0.01
+
+        # Validate plan data
+        is_valid, error_msg = self._validate_plan_data(
+            plan_id, row.get("symbol"), row.get("direction"), row.get("entry_price"),
+            row.get("stop_loss"), row.get("take_profit"), volume, row.get("expires_at")
+        )
+        if not is_valid:
+            logger.warning(f"Skipping invalid plan {plan_id}: {error_msg}")
+            return None
+
+        # Parse JSON conditions with error handling
+        conditions_json = row.get("conditions")
+        try:
+            conditions = json.loads(conditions_json) if conditions_json else {}
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping plan {plan_id}: Invalid JSON in conditions: {e}")
+            return None
+
+        # Phase 2: Entry levels
+        entry_levels = None
+        entry_levels_json = row.get("entry_levels")
+        if entry_levels_json:
+            try:
+                entry_levels = json.loads(entry_levels_json)
+            except json.JSONDecodeError:
+                pass
+
+        zone_entry_tracked = row.get("zone_entry_tracked")
+        re_evaluation_count_today = row.get("re_evaluation_count_today")
+
+        return TradePlan(
+            plan_id=plan_id,
+            symbol=row.get("symbol"),
+            direction=row.get("direction"),
+            entry_price=row.get("entry_price"),
+            stop_loss=row.get("stop_loss"),
+            take_profit=row.get("take_profit"),
+            volume=volume,
+            conditions=conditions,
+            created_at=row.get("created_at"),
+            created_by=row.get("created_by"),
+            status=row.get("status"),
+            expires_at=row.get("expires_at"),
+            executed_at=row.get("executed_at"),
+            ticket=row.get("ticket"),
+            notes=row.get("notes"),
+            profit_loss=row.get("profit_loss"),
+            exit_price=row.get("exit_price"),
+            close_time=row.get("close_time"),
+            close_reason=row.get("close_reason"),
+            zone_entry_tracked=bool(zone_entry_tracked) if zone_entry_tracked is not None else False,
+            zone_entry_time=row.get("zone_entry_time"),
+            zone_exit_time=row.get("zone_exit_time"),
+            entry_levels=entry_levels,
+            cancellation_reason=row.get("cancellation_reason"),
+            last_cancellation_check=row.get("last_cancellation_check"),
+            last_re_evaluation=row.get("last_re_evaluation"),
+            re_evaluation_count_today=re_evaluation_count_today if re_evaluation_count_today is not None else 0,
+            re_evaluation_count_date=row.get("re_evaluation_count_date"),
+            kill_switch_triggered=bool(row.get("kill_switch_triggered")),
+            pending_order_ticket=row.get("pending_order_ticket")  # Phase 3: Pending order ticket
+        )
+
     def _load_plans(self) -> Dict[str, TradePlan]:
         """Load all pending trade plans from database"""
         plans = {}
+        rows = []
+        max_seq = 0
         
         try:
-            # Phase 3.4: Use OptimizedSQLiteManager if available
-            with self._get_db_connection() as conn:
-                # Use UTC for consistent timezone comparison
-                now_utc = datetime.now(timezone.utc).isoformat()
-                # Phase 3.4: Include pending_order_placed status in query
-                cursor = conn.execute("""
-                    SELECT * FROM trade_plans 
-                    WHERE status IN ('pending', 'pending_order_placed')
-                    AND (expires_at IS NULL OR expires_at > ?)
-                """, (now_utc,))
-                
-                # Fetch all rows while connection is still open
-                rows = cursor.fetchall()
-            
-            # Process rows after connection is closed (data is already fetched)
-            for row in rows:
-                try:
-                    plan_id = row[0]
-                    symbol = row[1]
-                    direction = row[2]
-                    entry_price = row[3]
-                    stop_loss = row[4]
-                    take_profit = row[5]
-                    volume = row[6] if row[6] and row[6] > 0 else 0.01
-                    conditions_json = row[7]
-                    created_at = row[8]
-                    created_by = row[9]
-                    status = row[10]
-                    expires_at = row[11]
-                    executed_at = row[12]
-                    ticket = row[13]
-                    notes = row[14]
-                    
-                    # Validate plan data
-                    is_valid, error_msg = self._validate_plan_data(
-                        plan_id, symbol, direction, entry_price, stop_loss, 
-                        take_profit, volume, expires_at
-                    )
-                    if not is_valid:
-                        logger.warning(f"Skipping invalid plan {plan_id}: {error_msg}")
-                        continue
-                    
-                    # Parse JSON conditions with error handling
-                    try:
-                        conditions = json.loads(conditions_json) if conditions_json else {}
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Skipping plan {plan_id}: Invalid JSON in conditions: {e}")
-                        continue
-                    
-                    # Handle new columns (profit_loss, exit_price, close_time, close_reason) - indices 15-18
-                    profit_loss = row[15] if len(row) > 15 else None
-                    exit_price = row[16] if len(row) > 16 else None
-                    close_time = row[17] if len(row) > 17 else None
-                    close_reason = row[18] if len(row) > 18 else None
-                    # Phase 1: Zone tracking fields - indices 19-21
-                    zone_entry_tracked = row[19] if len(row) > 19 else False
-                    zone_entry_time = row[20] if len(row) > 20 else None
-                    zone_exit_time = row[21] if len(row) > 21 else None
-                    # Phase 2: Entry levels - index 22
-                    entry_levels_json = row[22] if len(row) > 22 else None
-                    entry_levels = None
-                    if entry_levels_json:
-                        try:
-                            entry_levels = json.loads(entry_levels_json)
-                        except json.JSONDecodeError:
-                            pass
-                    # Phase 3: Cancellation tracking - indices 23-24
-                    cancellation_reason_retry = row[23] if len(row) > 23 else None
-                    last_cancellation_check_retry = row[24] if len(row) > 24 else None
-                    # Phase 4: Re-evaluation tracking - indices 25-27
-                    last_re_evaluation_retry = row[25] if len(row) > 25 else None
-                    re_evaluation_count_today_retry = row[26] if len(row) > 26 else 0
-                    re_evaluation_count_date_retry = row[27] if len(row) > 27 else None
-                    # Phase 2.4: Kill-switch flag - index 28
-                    kill_switch_triggered_retry = bool(row[28]) if len(row) > 28 else False
-                    # Phase 3: Pending order ticket - index 29
-                    pending_order_ticket_retry = row[29] if len(row) > 29 else None
-                    
-                    plan = TradePlan(
-                        plan_id=plan_id,
-                        symbol=symbol,
-                        direction=direction,
-                        entry_price=entry_price,
-                        stop_loss=stop_loss,
-                        take_profit=take_profit,
-                        volume=volume,
-                        conditions=conditions,
-                        created_at=created_at,
-                        created_by=created_by,
-                        status=status,
-                        expires_at=expires_at,
-                        executed_at=executed_at,
-                        ticket=ticket,
-                        notes=notes,
-                        zone_entry_tracked=bool(zone_entry_tracked) if zone_entry_tracked is not None else False,
-                        zone_entry_time=zone_entry_time,
-                        zone_exit_time=zone_exit_time,
-                        entry_levels=entry_levels,
-                        cancellation_reason=cancellation_reason_retry,
-                        last_cancellation_check=last_cancellation_check_retry,
-                        last_re_evaluation=last_re_evaluation_retry,
-                        re_evaluation_count_today=re_evaluation_count_today_retry if re_evaluation_count_today_retry is not None else 0,
-                        re_evaluation_count_date=re_evaluation_count_date_retry,
-                        kill_switch_triggered=kill_switch_triggered_retry,
-                        pending_order_ticket=pending_order_ticket_retry  # Phase 3: Pending order ticket
-                    )
-                    plans[plan.plan_id] = plan
-                    
-                    # Check if this plan has order flow conditions (for logging)
-                    order_flow_conditions = [
-                        "delta_positive", "delta_negative",
-                        "cvd_rising", "cvd_falling",
-                        "cvd_div_bear", "cvd_div_bull",
-                        "delta_divergence_bull", "delta_divergence_bear",
-                        "absorption_zone_detected"
-                    ]
-                    has_of = any(plan.conditions.get(cond) for cond in order_flow_conditions)
-                    if has_of:
-                        matching = [cond for cond in order_flow_conditions if plan.conditions.get(cond)]
-                        logger.debug(
-                            f"Loaded order flow plan: {plan.plan_id} ({plan.symbol} {plan.direction}) - "
-                            f"Conditions: {matching}"
-                        )
-                except Exception as e:
-                    logger.warning(f"Error loading plan {row[0] if row else 'unknown'}: {e}", exc_info=True)
-                    continue
+            rows, max_seq = self._fetch_monitored_plan_rows()
         except sqlite3.OperationalError as e:
             if "locked" in str(e).lower():
                 logger.warning(f"Database locked, retrying plan load in 1 second...")
                 time.sleep(1)
                 # Retry once
                 try:
-                    with sqlite3.connect(self.db_path, timeout=15.0) as conn:
-                        now_utc = datetime.now(timezone.utc).isoformat()
-                        cursor = conn.execute("""
-                            SELECT * FROM trade_plans 
-                            WHERE status = 'pending' 
-                            AND (expires_at IS NULL OR expires_at > ?)
-                        """, (now_utc,))
-                        rows = cursor.fetchall()
-                    
-                    # Process rows after connection is closed
-                    for row in rows:
-                        try:
-                            plan_id = row[0]
-                            symbol = row[1]
-                            direction = row[2]
-                            entry_price = row[3]
-                            stop_loss = row[4]
-                            take_profit = row[5]
-                            volume = row[6] if row[6] and row[6] > 0 else 0.01
-                            conditions_json = row[7]
-                            
-                            # Validate plan data
-                            is_valid, error_msg = self._validate_plan_data(
-                                plan_id, symbol, direction, entry_price, stop_loss, 
-                                take_profit, volume, row[11]
-                            )
-                            if not is_valid:
-                                logger.warning(f"Skipping invalid plan {plan_id}: {error_msg}")
-                                continue
-                            
-                            # Parse JSON with error handling
-                            try:
-                                conditions = json.loads(conditions_json) if conditions_json else {}
-                            except json.JSONDecodeError as e:
-                                logger.warning(f"Skipping plan {plan_id}: Invalid JSON: {e}")
-                                continue
-                            
-                            # Handle new columns (profit_loss, exit_price, close_time, close_reason) - indices 15-18
-                            profit_loss = row[15] if len(row) > 15 else None
-                            exit_price = row[16] if len(row) > 16 else None
-                            close_time = row[17] if len(row) > 17 else None
-                            close_reason = row[18] if len(row) > 18 else None
-                            # Phase 1: Zone tracking fields - indices 19-21
-                            zone_entry_tracked_retry = row[19] if len(row) > 19 else False
-                            zone_entry_time_retry = row[20] if len(row) > 20 else None
-                            zone_exit_time_retry = row[21] if len(row) > 21 else None
-                            # Phase 2: Entry levels - index 22
-                            entry_levels_json_retry = row[22] if len(row) > 22 else None
-                            entry_levels_retry = None
-                            if entry_levels_json_retry:
-                                try:
-                                    entry_levels_retry = json.loads(entry_levels_json_retry)
-                                except json.JSONDecodeError:
-                                    pass
-                            # Phase 3: Cancellation tracking - indices 23-24
-                            cancellation_reason_retry = row[23] if len(row) > 23 else None
-                            last_cancellation_check_retry = row[24] if len(row) > 24 else None
-                            # Phase 4: Re-evaluation tracking - indices 25-27
-                            last_re_evaluation_retry = row[25] if len(row) > 25 else None
-                            re_evaluation_count_today_retry = row[26] if len(row) > 26 else 0
-                            re_evaluation_count_date_retry = row[27] if len(row) > 27 else None
-                            
-                            plan = TradePlan(
-                                plan_id=plan_id, symbol=symbol, direction=direction,
-                                entry_price=entry_price, stop_loss=stop_loss, take_profit=take_profit,
-                                volume=volume, conditions=conditions,
-                                created_at=row[8], created_by=row[9], status=row[10],
-                                expires_at=row[11], executed_at=row[12], ticket=row[13],
-                                notes=row[14],
-                                zone_entry_tracked=bool(zone_entry_tracked_retry) if zone_entry_tracked_retry is not None else False,
-                                zone_entry_time=zone_entry_time_retry,
-                                zone_exit_time=zone_exit_time_retry,
-                                entry_levels=entry_levels_retry,
-                                cancellation_reason=cancellation_reason_retry,
-                                last_cancellation_check=last_cancellation_check_retry,
-                                last_re_evaluation=last_re_evaluation_retry,
-                                re_evaluation_count_today=re_evaluation_count_today_retry if re_evaluation_count_today_retry is not None else 0,
-                                re_evaluation_count_date=re_evaluation_count_date_retry
-                            )
-                            plans[plan.plan_id] = plan
-                        except Exception as e:
-                            logger.warning(f"Error loading plan {row[0] if row else 'unknown'}: {e}")
-                            continue
+                    rows, max_seq = self._fetch_monitored_plan_rows(direct=True)
                 except Exception as retry_error:
                     logger.error(f"Failed to reload plans after retry: {retry_error}")
+            else:
+                logger.error(f"Error loading plans from database: {e}", exc_info=True)
         except Exception as e:
             logger.error(f"Error loading plans from database: {e}", exc_info=True)
         
+        # Process rows after connection is closed (data is already fetched)
+        for row in rows:
+            try:
+                plan = self._plan_from_row(row)
+                if plan is None:
+                    continue
+                plans[plan.plan_id] = plan
+                self._plan_versions[plan.plan_id] = row.get("updated_seq") or 0
+            except Exception as e:
+                logger.warning(f"Error loading plan {row.get('plan_id', 'unknown')}: {e}", exc_info=True)
+                continue
+        self._plan_seq_cursor = max(self._plan_seq_cursor, max_seq)
+        
         # Log summary of loaded plans including order flow plans
         if plans:
             order_flow_conditions = [
@@ -1598,7 +1570,197 @@ class AutoExecutionSystem:
             logger.info("No plans loaded from database")
                 
         return plans
+
+    def _reload_plans_incremental(self) -> int:
+        """
+        Apply trade_plans rows changed since the last seen updated_seq.
+
+        Only new/changed rows are fetched and parsed. A plan already in memory is
+        replaced when its row is newer and edits a field in _EDITABLE_PLAN_FIELDS
+        (as update_plan() does in-process); otherwise the in-memory version is kept
+        (it may have been updated but not yet saved). Plans that are no longer pending
+        in the database are removed.
+
+        Returns:
+            Number of changed rows applied
+        """
+        with self._get_db_connection() as conn:
+            cursor = conn.execute(
+                "SELECT * FROM trade_plans WHERE updated_seq > ? ORDER BY updated_seq",
+                (self._plan_seq_cursor,)
+            )
+            rows = self._rows_to_dicts(cursor)
+        
+        if not rows:
+            return 0
+        
+        now_iso = datetime.now(timezone.utc).isoformat()
+        added = 0
+        updated = 0
+        removed = 0
+        with self.plans_lock:
+            for row in rows:
+                plan_id = row.get("plan_id")
+                seq = row.get("updated_seq") or 0
+                self._plan_seq_cursor = max(self._plan_seq_cursor, seq)
+                
+                expires_at = row.get("expires_at")
+                monitored = (
+                    row.get("status") in self._MONITORED_PLAN_STATUSES
+                    and (expires_at is None or expires_at > now_iso)
+                )
+                if not monitored:
+                    self._plan_versions.pop(plan_id, None)
+                    existing = self.plans.get(plan_id)
+                    if existing is not None and existing.status == "pending":
+                        logger.debug(f"Plan {plan_id} no longer pending in database, removing from memory")
+                        del self.plans[plan_id]
+                        self._cleanup_plan_resources(plan_id, getattr(existing, 'symbol', 'unknown'))
+                        removed += 1
+                    continue
+                
+                if plan_id in self.plans:
+                    if seq > self._plan_versions.get(plan_id, 0) and self._apply_plan_edit(plan_id, row):
+                        updated += 1
+                    self._plan_versions[plan_id] = seq
+                    continue
+                if plan_id in self._plan_versions:
+                    # Previously loaded and since dropped in-process (e.g. executed while the
+                    # status write is still queued) - don't resurrect; the full reconcile
+                    # flushes the write queue and decides.
+                    continue
+                
+                try:
+                    plan = self._plan_from_row(row)
+                except Exception as e:
+                    logger.warning(f"Error loading plan {plan_id}: {e}", exc_info=True)
+                    continue
+                if plan is None:
+                    continue
+                self.plans[plan_id] = plan
+                self._plan_versions[plan_id] = seq
+                added += 1
+                logger.debug(f"Loaded new plan {plan_id} from database")
+        
+        if added or updated or removed:
+            logger.info(
+                f"Incremental plan reload: {len(rows)} changed row(s), "
+                f"{added} added, {updated} updated, {removed} removed (seq={self._plan_seq_cursor})"
+            )
+        return len(rows)
+
+    def _apply_plan_edit(self, plan_id: str, row: Dict[str, Any]) -> bool:
+        """
+        Replace an in-memory plan with its database row if the row edits it.
+
+        Called with plans_lock held for rows newer than the loaded version.
+
+        Returns:
+            True if the in-memory plan was replaced
+        """
+        try:
+            plan = self._plan_from_row(row)
+        except Exception as e:
+            logger.warning(f"Error reloading plan {plan_id}: {e}", exc_info=True)
+            return False
+        if plan is None:
+            return False
+        current = self.plans[plan_id]
+        changed = [
+            field for field in self._EDITABLE_PLAN_FIELDS
+            if getattr(plan, field, None) != getattr(current, field, None)
+        ]
+        if not changed:
+            return False
+        self.plans[plan_id] = plan
+        logger.info(f"Reloaded edited plan {plan_id} from database ({', '.join(changed)})")
+        return True
+
+    def _reconcile_plans(self) -> None:
+        """
+        Periodic full reconcile against the database.
+
+        Reads only (plan_id, updated_seq) for monitored rows, drops in-memory pending
+        plans that are gone from the database (deleted/expired), and fetches the full
+        row only for plans that are missing from memory.
+        """
+        now_iso = datetime.now(timezone.utc).isoformat()
+        placeholders = ", ".join("?" for _ in self._MONITORED_PLAN_STATUSES)
+        with self._get_db_connection() as conn:
+            cursor = conn.execute(f"""
+                SELECT plan_id, updated_seq FROM trade_plans
+                WHERE status IN ({placeholders})
+                AND (expires_at IS NULL OR expires_at > ?)
+            """, (*self._MONITORED_PLAN_STATUSES, now_iso))
+            db_versions = {plan_id: seq or 0 for plan_id, seq in cursor.fetchall()}
+        
+        with self.plans_lock:
+            # Remove plans that are no longer in database (cancelled/executed elsewhere)
+            for plan_id in list(self.plans.keys()):
+                if plan_id not in db_versions and self.plans[plan_id].status == "pending":
+                    logger.debug(f"Plan {plan_id} no longer in database, removing from memory")
+                    plan_obj = self.plans.get(plan_id)
+                    plan_symbol = getattr(plan_obj, 'symbol', 'unknown') if plan_obj else 'unknown'
+                    del self.plans[plan_id]
+                    self._plan_versions.pop(plan_id, None)
+                    # Clean up execution locks and other resources
+                    self._cleanup_plan_resources(plan_id, plan_symbol)
+            missing = [plan_id for plan_id in db_versions if plan_id not in self.plans]
+            # Forget versions of plans that are neither in memory nor pending in the database
+            for plan_id in list(self._plan_versions.keys()):
+                if plan_id not in db_versions and plan_id not in self.plans:
+                    del self._plan_versions[plan_id]
+        
+        if not missing:
+            return
+        
+        rows = []
+        with self._get_db_connection() as conn:
+            # Chunk to stay under SQLite's host parameter limit
+            for i in range(0, len(missing), 500):
+                chunk = missing[i:i + 500]
+                cursor = conn.execute(
+                    f"SELECT * FROM trade_plans WHERE plan_id IN ({', '.join('?' for _ in chunk)})",
+                    chunk
+                )
+                rows.extend(self._rows_to_dicts(cursor))
+        
+        with self.plans_lock:
+            for row in rows:
+                plan_id = row.get("plan_id")
+                if plan_id in self.plans:
+                    continue
+                try:
+                    plan = self._plan_from_row(row)
+                except Exception as e:
+                    logger.warning(f"Error loading plan {plan_id}: {e}", exc_info=True)
+                    continue
+                if plan is None:
+                    continue
+                self.plans[plan_id] = plan
+                self._plan_versions[plan_id] = row.get("updated_seq") or 0
+                logger.debug(f"Loaded new plan {plan_id} from database")
+
+    def _wait_for_wake(self, timeout: float) -> None:
+        """
+        Sleep the monitor loop for up to `timeout` seconds, returning early on stop()
+        or notify_plans_changed(). Only the wake-up flag is consumed, never _stop_event.
+        """
+        if self._stop_event.is_set():
+            return
+        self._wake_event.wait(timeout=timeout)
+        self._wake_event.clear()
+
+    def notify_plans_changed(self) -> None:
+        """
+        In-process notification that trade_plans changed (e.g. a plan was created).
+        Wakes the monitor loop so the change is applied without waiting for the reload interval.
+        """
+        self._plan_reload_event.set()
+        # Wake the monitor loop from its sleep; _stop_event stays reserved for stop()
+        self._wake_event.set()
     
+
     def add_plan(self, plan: TradePlan) -> bool:
         """Add a new trade plan to monitor"""
         max_retries = 3
@@ -1633,11 +1795,13 @@ class AutoExecutionSystem:
                                 self.plans[plan.plan_id] = plan
                                 logger.info(f"Added trade plan {plan.plan_id} for {plan.symbol}")
                             else:
-                                # Lock timeout - plan is in database, will be picked up on next reload
+                                # Lock timeout - plan is in database; wake the monitor so the
+                                # incremental reload picks it up on its next iteration
                                 logger.warning(
                                     f"Could not acquire plans_lock for plan {plan.plan_id} within 2s. "
                                     f"Plan is saved to database and will be picked up on next reload."
                                 )
+                                self.notify_plans_changed()
                         finally:
                             if lock_acquired:
                                 self.plans_lock.release()
@@ -1968,6 +2132,8 @@ class AutoExecutionSystem:
                     del self._plan_last_check[plan_id]
                 if hasattr(self, '_plan_last_price') and plan_id in self._plan_last_price:
                     del self._plan_last_price[plan_id]
+                if hasattr(self, '_time_gates'):
+                    self._time_gates.pop(plan_id, None)
             except Exception as e:
                 logger.debug(f"Error cleaning up tracking dicts for {plan_id}: {e}")
             
@@ -2318,7 +2484,7 @@ class AutoExecutionSystem:
                 # Get metrics once for all plans of this symbol
                 metrics = None
                 if symbol_norm.startswith('BTC'):
-                    # Get metrics for first plan (will be cached for others)
+                    # Get metrics once and pass them to every plan of this symbol
                     if symbol_plans:
                         logger.debug(f"Fetching BTC order flow metrics for {symbol_norm} (affects {len(symbol_plans)} plan(s))")
                         metrics = self._get_btc_order_flow_metrics(symbol_plans[0], window_seconds=300)
@@ -2332,7 +2498,7 @@ class AutoExecutionSystem:
                     try:
                         logger.debug(f"Checking order flow conditions for {plan.plan_id} ({plan.symbol} {plan.direction})")
                         # Only check order flow conditions (skip other validations for speed)
-                        of_conditions_met = self._check_order_flow_conditions_only(plan)
+                        of_conditions_met = self._check_order_flow_conditions_only(plan, metrics=metrics)
                         if of_conditions_met:
                             logger.info(
                                 f"Order flow conditions met for {plan.plan_id} - triggering full check"
@@ -2350,7 +2516,7 @@ class AutoExecutionSystem:
             except Exception as e:
                 logger.debug(f"Error processing symbol {symbol_norm} plans: {e}")
     
-    def _check_order_flow_conditions_only(self, plan: TradePlan) -> bool:
+    def _check_order_flow_conditions_only(self, plan: TradePlan, metrics=None) -> bool:
         """
         Check only order flow conditions (faster than full check).
         
@@ -2359,6 +2525,7 @@ class AutoExecutionSystem:
         
         Args:
             plan: TradePlan to check
+            metrics: BTC OrderFlowMetrics already fetched for this symbol (fetched if None)
         
         Returns:
             True if all order-flow conditions are met, False otherwise
@@ -2367,7 +2534,7 @@ class AutoExecutionSystem:
         
         # Check BTC order flow conditions
         if symbol_norm.startswith('BTC'):
-            return self._check_btc_order_flow_conditions_only(plan, symbol_norm)
+            return self._check_btc_order_flow_conditions_only(plan, symbol_norm, metrics=metrics)
         
         # Check proxy order flow conditions (XAUUSD, EURUSD)
         elif symbol_norm in ["XAUUSD", "EURUSD"]:
@@ -2376,20 +2543,22 @@ class AutoExecutionSystem:
         # No order flow conditions for this symbol
         return True  # Default: allow if no order-flow conditions specified
     
-    def _check_btc_order_flow_conditions_only(self, plan: TradePlan, symbol_norm: str) -> bool:
+    def _check_btc_order_flow_conditions_only(self, plan: TradePlan, symbol_norm: str, metrics=None) -> bool:
         """
         Check BTC order flow conditions only.
         
         Args:
             plan: TradePlan to check
             symbol_norm: Normalized symbol (e.g., "BTCUSDT")
+            metrics: OrderFlowMetrics already fetched for this symbol (fetched if None)
         
         Returns:
             True if all BTC order-flow conditions are met
         """
         try:
-            # Get order flow metrics
-            metrics = self._get_btc_order_flow_metrics(plan, window_seconds=300)
+            # Get order flow metrics (the quick check fetches them once per symbol)
+            if metrics is None:
+                metrics = self._get_btc_order_flow_metrics(plan, window_seconds=300)
             
             if not metrics:
                 logger.warning(
@@ -3326,6 +3495,7 @@ class AutoExecutionSystem:
         except Exception as e:
             logger.debug(f"Error updating volatility tracking for {symbol}: {e}")
     
+    @traced("mt5.prices_batch")
     def _get_current_prices_batch(self) -> Dict[str, float]:
         """
         Get current prices for all active symbols in one batch.
@@ -3497,6 +3667,10 @@ class AutoExecutionSystem:
             if plan.status != "pending":
                 return True
             
+            # Skip until a registered time boundary (time_after / session start)
+            if self._is_time_gated(plan):
+                return True
+            
             # Check adaptive interval (skip if checked recently)
             last_check = self._plan_last_check.get(plan.plan_id)
             if last_check:
@@ -3522,6 +3696,39 @@ class AutoExecutionSystem:
             logger.warning(f"Error in skip logic for plan {plan.plan_id}: {e}")
             return False  # Don't skip on error
     
+    def _gate_plan_until(self, plan: TradePlan, until: datetime) -> None:
+        """
+        Register a wake-up for a plan that cannot pass before ``until`` (time_after, session start).
+        The monitor loop skips the plan until then and shortens its sleep to wake at that boundary.
+        """
+        self._time_gates[plan.plan_id] = (until.timestamp(), plan.conditions)
+    
+    def _gate_until_session(self, plan: TradePlan, required_session: Any) -> None:
+        """Gate a plan until the next start of ``required_session`` (calendar sessions only)"""
+        try:
+            start = get_session_calendar(plan.symbol).next_start("session", str(required_session).upper())
+            if start is not None:
+                self._gate_plan_until(plan, start)
+        except Exception as e:
+            logger.debug(f"Could not register session wake-up for {plan.plan_id}: {e}")
+    
+    def _is_time_gated(self, plan: TradePlan) -> bool:
+        """True while a plan's time gate is closed; gates from since-edited conditions are dropped"""
+        gate = self._time_gates.get(plan.plan_id)
+        if gate is None:
+            return False
+        until, conditions = gate
+        if conditions is plan.conditions and time.time() < until:
+            return True
+        self._time_gates.pop(plan.plan_id, None)
+        return False
+    
+    def _next_time_gate_delay(self) -> Optional[float]:
+        """Seconds until the earliest pending time gate opens (None if there is none)"""
+        now = time.time()
+        pending = [until for until, _ in list(self._time_gates.values()) if until > now]
+        return min(pending) - now if pending else None
+    
     def _fetch_price_chunk(self, symbols: List[str], prices: Dict[str, float], max_retries: int = 3) -> None:
         """
         Fetch prices for a chunk of symbols with retry logic.
@@ -3955,6 +4162,13 @@ class AutoExecutionSystem:
                 if self._parallel_checks_batches > 0 else 0.0
             )
             
+            # Span breakdown: where condition-check and execution time actually goes
+            top_spans = get_span_tracer().get_perf_report(top=8)["spans"]
+            span_summary = ", ".join(
+                f"{path}={stats['total_ms']:.0f}/{stats.get('p50_ms', 0.0):.1f}/{stats.get('p99_ms', 0.0):.1f} (n={stats['count']})"
+                for path, stats in top_spans.items()
+            )
+            
             logger.info(
                 f"Performance Metrics (uptime: {uptime_hours:.1f}h): "
                 f"Condition checks: {self._condition_checks_total} total "
@@ -3968,6 +4182,7 @@ class AutoExecutionSystem:
                 f"Parallel checks: {self._parallel_checks_total} plans in {self._parallel_checks_batches} batches "
                 f"(avg {avg_batch_size:.1f}/batch), "
                 f"Cache cleanups: {self._cache_cleanup_count}"
+                + (f", Span timings (total/p50/p99 ms): {span_summary}" if span_summary else "")
             )
         except Exception as e:
             logger.warning(f"Error logging performance metrics: {e}")
@@ -4088,6 +4303,7 @@ class AutoExecutionSystem:
                 "error": str(e)
             }
     
+    @traced("binance.order_flow")
     def _get_btc_order_flow_metrics(self, plan: TradePlan, window_seconds: int = 300):
         """
         Get BTC order flow metrics (cached per plan check).
@@ -4170,6 +4386,7 @@ class AutoExecutionSystem:
             logger.warning(f"Error getting order flow metrics for {plan.plan_id}: {e}", exc_info=True)
             return None
     
+    @traced("check_conditions", tags=lambda self, plan, *a, **k: {"plan_id": plan.plan_id, "symbol": plan.symbol})
     def _check_conditions(self, plan: TradePlan) -> bool:
         """Check if conditions for a trade plan are met"""
         try:
@@ -4197,7 +4414,9 @@ class AutoExecutionSystem:
             
             # Ensure MT5 is connected
             try:
-                if not self.mt5_service.connect():
+                with get_span_tracer().span("mt5.connect"):
+                    connected = self.mt5_service.connect()
+                if not connected:
                     # Phase 4.1: Thread-safe MT5 state updates
                     with self._mt5_state_lock:
                         self.mt5_connection_failures += 1
@@ -4250,7 +4469,8 @@ class AutoExecutionSystem:
             symbol_norm_actual = None
             for sym_var in symbol_variations:
                 try:
-                    quote = self.mt5_service.get_quote(sym_var)
+                    with get_span_tracer().span("mt5.get_quote"):
+                        quote = self.mt5_service.get_quote(sym_var)
                     symbol_norm_actual = sym_var
                     if sym_var != symbol_variations[0]:
                         logger.debug(f"Symbol found as '{sym_var}' instead of '{symbol_variations[0]}'")
@@ -4288,7 +4508,8 @@ class AutoExecutionSystem:
             
             # Get current price using MT5Service
             try:
-                quote = self.mt5_service.get_quote(symbol_norm)
+                with get_span_tracer().span("mt5.get_quote"):
+                    quote = self.mt5_service.get_quote(symbol_norm)
                 current_bid = quote.bid
                 current_ask = quote.ask
             except Exception as e:
@@ -4614,7 +4835,8 @@ class AutoExecutionSystem:
                     "D1": mt5.TIMEFRAME_D1,
                 }
                 tf = tf_map.get(timeframe.upper(), mt5.TIMEFRAME_M5)
-                rates = mt5.copy_rates_from_pos(symbol, tf, 0, max(10, count))
+                with get_span_tracer().span("mt5.copy_rates", timeframe=timeframe):
+                    rates = mt5.copy_rates_from_pos(symbol, tf, 0, max(10, count))
                 return _normalize_candles(rates)
 
             # Helper: Calculate ATR for normalization
@@ -7621,6 +7843,8 @@ class AutoExecutionSystem:
                 if target_time.tzinfo is None:
                     target_time = target_time.replace(tzinfo=timezone.utc)
                 if datetime.now(timezone.utc) < target_time:
+                    # Not due yet - the monitor loop wakes for it instead of re-polling
+                    self._gate_plan_until(plan, target_time)
                     return False
                     
             if "time_before" in plan.conditions:
@@ -7640,6 +7864,7 @@ class AutoExecutionSystem:
                         current_session = SessionHelpers.get_current_session()
                         if current_session != required_session:
                             logger.debug(f"Plan {plan.plan_id}: volatility_decay requires session '{required_session}', current is '{current_session}'")
+                            self._gate_until_session(plan, required_session)
                             return False
                     
                     # Get parameters
@@ -7747,6 +7972,7 @@ class AutoExecutionSystem:
                         current_session = SessionHelpers.get_current_session()
                         if current_session != required_session:
                             logger.debug(f"Plan {plan.plan_id}: momentum_follow requires session '{required_session}', current is '{current_session}'")
+                            self._gate_until_session(plan, required_session)
                             return False
                     
                     # Get parameters
@@ -7834,6 +8060,7 @@ class AutoExecutionSystem:
                         current_session = SessionHelpers.get_current_session()
                         if current_session != required_session:
                             logger.debug(f"Plan {plan.plan_id}: fakeout_sweep requires session '{required_session}', current is '{current_session}'")
+                            self._gate_until_session(plan, required_session)
                             return False
                     
                     # Get parameters
@@ -7964,6 +8191,7 @@ class AutoExecutionSystem:
                         current_session = SessionHelpers.get_current_session()
                         if current_session != required_session:
                             logger.debug(f"Plan {plan.plan_id}: flat_vol_hours requires session '{required_session}', current is '{current_session}'")
+                            self._gate_until_session(plan, required_session)
                             return False
                     
                     # Get parameters
@@ -8986,6 +9214,7 @@ class AutoExecutionSystem:
             logger.error(f"Error checking conditions for plan {plan.plan_id}: {e}")
             return False
     
+    @traced("m1_validation")
     def _validate_m1_conditions(self, plan: TradePlan, symbol_norm: str) -> bool:
         """
         Validate M1 microstructure conditions for a trade plan.
@@ -9210,6 +9439,7 @@ class AutoExecutionSystem:
             logger.warning(f"Error in M1 validation for plan {plan.plan_id}: {e}")
             return True  # Don't block execution on M1 validation errors
     
+    @traced("mtf_analysis")
     def _get_mtf_analysis(self, symbol: str):
         """Get multi-timeframe analysis for symbol"""
         try:
@@ -9253,6 +9483,7 @@ class AutoExecutionSystem:
             logger.debug(f"Error extracting ATR for {symbol_norm}: {e}")
             return 0.0
     
+    @traced("confluence")
     def _get_confluence_score(self, symbol: str) -> int:
         """
         Get confluence score with caching to avoid frequent API calls.
@@ -9376,6 +9607,7 @@ class AutoExecutionSystem:
                 self._confluence_cache.clear()
                 logger.debug("Invalidated all confluence cache")
     
+    @traced("liquidity_context")
     def _get_liquidity_context(self, symbol: str, entry_price: float):
         """Get liquidity context (VWAP position, PDH/PDL proximity)"""
         try:
@@ -9702,6 +9934,7 @@ class AutoExecutionSystem:
             logger.warning(f"Error validating rejection wick: {e}")
             return True  # Don't block on validation errors
     
+    @traced("liquidity_sweep")
     def _detect_liquidity_sweep(self, plan: TradePlan, m1_data: Dict[str, Any], current_price: float) -> bool:
         """
         Detect liquidity sweep using M1 liquidity zones.
@@ -10360,6 +10593,7 @@ class AutoExecutionSystem:
         
         logger.info(f"Post-execution steps completed for plan {plan.plan_id}, ticket: {ticket}")
     
+    @traced("execute_trade", tags=lambda self, plan, *a, **k: {"plan_id": plan.plan_id, "symbol": plan.symbol})
     def _execute_trade(self, plan: TradePlan) -> bool:
         """Execute a trade plan using MT5Service"""
         try:
@@ -11237,11 +11471,12 @@ class AutoExecutionSystem:
 
 ✅ **Trade successfully executed!**"""
             
+            # Non-blocking: queued for the notification gateway, delivered off the monitor thread
             success = discord_notifier.send_system_alert("AUTO_EXECUTION", message)
             if success:
-                logger.info("Discord notification sent successfully")
+                logger.info("Discord notification queued")
             else:
-                logger.error("Failed to send Discord notification")
+                logger.error("Failed to queue Discord notification")
                 
         except Exception as e:
             logger.error(f"Error sending Discord notification: {e}")
@@ -11561,30 +11796,24 @@ class AutoExecutionSystem:
                                 except Exception as e:
                                     logger.warning(f"Error flushing write queue before reload: {e} - proceeding anyway")
                             try:
-                                new_plans = self._load_plans()
-                                # Merge new plans into existing plans (don't overwrite in-memory updates)
-                                with self.plans_lock:
-                                    for plan_id, new_plan in new_plans.items():
-                                        if plan_id not in self.plans:
-                                            # New plan - add it
-                                            self.plans[plan_id] = new_plan
-                                            logger.debug(f"Loaded new plan {plan_id} from database")
-                                        # If plan already exists in memory, keep the in-memory version
-                                        # (it may have been updated but not yet saved)
-                                    # Remove plans that are no longer in database (cancelled/executed elsewhere)
-                                    db_plan_ids = set(new_plans.keys())
-                                    for plan_id in list(self.plans.keys()):
-                                        if plan_id not in db_plan_ids and self.plans[plan_id].status == "pending":
-                                            logger.debug(f"Plan {plan_id} no longer in database, removing from memory")
-                                            plan_obj = self.plans.get(plan_id)
-                                            plan_symbol = getattr(plan_obj, 'symbol', 'unknown') if plan_obj else 'unknown'
-                                            del self.plans[plan_id]
-                                            # Clean up execution locks and other resources
-                                            self._cleanup_plan_resources(plan_id, plan_symbol)
+                                self._reconcile_plans()
                                 self.last_plan_reload = now_utc
                             except Exception as e:
                                 logger.error(f"Error reloading plans from database: {e}", exc_info=True)
                     
+                    # Plan-load fast path: apply only rows changed since the last updated_seq,
+                    # immediately when notified (notify_plans_changed) or every incremental interval
+                    if (self._plan_reload_event.is_set() or
+                            current_time - self.last_incremental_reload >= self.plan_incremental_reload_interval):
+                        self._plan_reload_event.clear()
+                        try:
+                            self._reload_plans_incremental()
+                        except sqlite3.OperationalError as e:
+                            logger.debug(f"Incremental plan reload unavailable ({e}) - relying on full reconcile")
+                        except Exception as e:
+                            logger.error(f"Error in incremental plan reload: {e}", exc_info=True)
+                        self.last_incremental_reload = current_time
+                    
                     # Check each pending plan (use lock for thread-safe access)
                     try:
                         with self.plans_lock:
@@ -11916,6 +12145,10 @@ class AutoExecutionSystem:
                             logger.warning(f"Error checking cancellation conditions for {plan_id}: {e}", exc_info=True)
                             # Continue - cancellation check failure shouldn't block monitoring
                         
+                        # Time-gated until a known boundary (time_after / session start)
+                        if self._is_time_gated(plan):
+                            continue
+                        
                         # Phase 2.2: Adaptive interval check - AFTER expiration/cancellation checks
                         # CRITICAL: Must happen AFTER expiration/cancellation but BEFORE expensive checks
                         should_skip_due_to_interval = False
@@ -12135,21 +12368,21 @@ class AutoExecutionSystem:
                     try:
                         # Defensive check: ensure check_interval is valid
                         sleep_duration = self.check_interval if self.check_interval is not None and self.check_interval > 0 else 30.0
+                        # Wake at the next plan time boundary (time_after / session start) if sooner
+                        gate_delay = self._next_time_gate_delay()
+                        if gate_delay is not None:
+                            sleep_duration = min(sleep_duration, gate_delay)
                         # Use Event.wait instead of time.sleep to allow immediate wake-up when stopping
                         # This prevents the thread from waiting the full 30s if stop() is called
-                        self._stop_event.wait(timeout=sleep_duration)
-                        # Clear the event for next iteration
-                        self._stop_event.clear()
+                        self._wait_for_wake(sleep_duration)
                     except (TypeError, ValueError) as e:
                         logger.error(f"Error in sleep operation (critical): {e}")
                         # If sleep fails, use default duration to avoid tight loop
-                        self._stop_event.wait(timeout=30.0)
-                        self._stop_event.clear()
+                        self._wait_for_wake(30.0)
                     except Exception as e:
                         logger.error(f"Unexpected error in sleep operation: {e}")
                         # Fallback to default sleep
-                        self._stop_event.wait(timeout=30.0)
-                        self._stop_event.clear()
+                        self._wait_for_wake(30.0)
                 
                 except KeyboardInterrupt:
                     logger.info("Monitor loop received KeyboardInterrupt, stopping...")
@@ -12336,6 +12569,7 @@ class AutoExecutionSystem:
         # Signal stop event to wake up monitor thread immediately (if it's sleeping)
         try:
             self._stop_event.set()
+            self._wake_event.set()
         except Exception as e:
             logger.debug(f"Error setting stop event: {e}")
         
@@ -12509,6 +12743,7 @@ class AutoExecutionSystem:
                 # Signal stop event to wake up old thread immediately
                 try:
                     self._stop_event.set()
+                    self._wake_event.set()
                 except Exception as e:
                     logger.debug(f"Error setting stop event for old thread: {e}")
                 try:
@@ -12829,6 +13064,11 @@ def get_auto_execution_system() -> AutoExecutionSystem:
         )
     return auto_execution_system
 
+def notify_plans_changed():
+    """Notify the in-process auto execution system (if running) that trade plans changed"""
+    if auto_execution_system is not None:
+        auto_execution_system.notify_plans_changed()
+
 def start_auto_execution_system():
     """Start the auto execution system"""
     system = get_auto_execution_system()
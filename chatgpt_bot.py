@@ -1582,6 +1582,68 @@ async def check_positions():
         logger.error(f"Error checking positions: {e}", exc_info=True)
 
 
+def _publish_signal_alerts(candidates):
+    """Scan engine consumer: Discord alerts for high-confidence candidates"""
+    try:
+        from config import settings as bot_settings
+        min_confidence = getattr(bot_settings, "SIGNAL_SCANNER_MIN_CONFIDENCE", 75)
+    except Exception:
+        min_confidence = 75
+    
+    for candidate in candidates:
+        symbol = candidate.symbol
+        try:
+            rec = candidate.rec
+            m5_enriched = candidate.timeframes.get("M5", {})
+            
+            direction = rec.get("direction", "HOLD")
+            confidence = rec.get("confidence", 0)
+            
+            # Only alert on high-confidence signals
+            if direction != "HOLD" and confidence >= min_confidence:
+                emoji = "🟢" if direction == "BUY" else "🔴"
+                entry = rec.get("entry", 0)
+                sl = rec.get("sl", 0)
+                tp = rec.get("tp", 0)
+                reason = rec.get("reasoning", "Technical setup")
+                
+                # Extract key Binance enrichment fields
+                price_structure = m5_enriched.get("price_structure", "N/A")
+                volatility_state = m5_enriched.get("volatility_state", "N/A")
+                momentum_quality = m5_enriched.get("momentum_quality", "N/A")
+                order_flow_signal = m5_enriched.get("order_flow_signal", "NEUTRAL")
+                whale_count = m5_enriched.get("whale_count", 0)
+                
+                logger.info(f"📡 Signal found: {direction} {symbol} @ {confidence}% confidence")
+                logger.info(f"   Binance: {price_structure}, {volatility_state}, {momentum_quality}, Whales: {whale_count}")
+                
+                # Enhanced alert with Binance data
+                alert_text = (
+                    f"🔔 *Signal Alert!*\n\n"
+                    f"{emoji} **{direction} {symbol}**\n"
+                    f"📊 Entry: ${entry:.2f}\n"
+                    f"🛑 SL: ${sl:.2f}\n"
+                    f"🎯 TP: ${tp:.2f}\n"
+                    f"💡 {reason}\n"
+                    f"📈 Confidence: {confidence}%\n\n"
+                    f"🎯 *Setup Quality:*\n"
+                    f"  Structure: {price_structure}\n"
+                    f"  Volatility: {volatility_state}\n"
+                    f"  Momentum: {momentum_quality}\n"
+                    f"  Order Flow: {order_flow_signal}\n"
+                )
+                
+                if whale_count > 0:
+                    alert_text += f"  🐋 Whales: {whale_count} detected\n"
+                
+                if DISCORD_ENABLED:
+                    discord_notifier.send_system_alert("Trade Alert", alert_text)
+                
+        except Exception as e:
+            logger.error(f"Error publishing signal for {symbol}: {e}")
+            continue
+
+
 async def scan_for_signals():
     """Background task: Scan markets for trade signals with Binance enrichment"""
     global binance_service, order_flow_service
@@ -1607,81 +1669,17 @@ async def scan_for_signals():
         
         # Use direct analysis with Binance enrichment if available
         if binance_service and order_flow_service:
-            from infra.mt5_service import MT5Service
-            from infra.indicator_bridge import IndicatorBridge
-            from infra.binance_enrichment import BinanceEnrichment
-            from decision_engine import decide_trade
+            from infra.scan_engine import get_scan_engine
             
-            mt5_svc = MT5Service()
-            if not mt5_svc.connect():
-                logger.warning("MT5 connection failed in signal scanner")
-                return
+            # This process's scan engine: one fetch + enrichment per symbol per bar close,
+            # candidates published to its consumers (trade_bot's Telegram scanner has its own)
+            engine = get_scan_engine()
+            if engine.enrichment is None:
+                from infra.binance_enrichment import BinanceEnrichment
+                engine.set_enrichment(BinanceEnrichment(binance_service, order_flow_service=order_flow_service))
+            engine.subscribe("discord", _publish_signal_alerts)
             
-            bridge = IndicatorBridge()
-            enrichment = BinanceEnrichment(binance_service, order_flow_service)
-            
-            for symbol in symbols:
-                try:
-                    # Get MT5 data
-                    multi = bridge.get_multi(symbol)
-                    if not multi or 'M5' not in multi:
-                        continue
-                    
-                    # Enrich with Binance data (37 fields)
-                    m5_enriched = enrichment.enrich_timeframe(symbol, multi.get('M5', {}), 'M5')
-                    m15_enriched = enrichment.enrich_timeframe(symbol, multi.get('M15', {}), 'M15')
-                    m30_enriched = enrichment.enrich_timeframe(symbol, multi.get('M30', {}), 'M30')
-                    h1_enriched = enrichment.enrich_timeframe(symbol, multi.get('H1', {}), 'H1')
-                    
-                    # Run decision engine
-                    rec = decide_trade(symbol, m5_enriched, m15_enriched, m30_enriched, h1_enriched)
-                    
-                    direction = rec.get("direction", "HOLD")
-                    confidence = rec.get("confidence", 0)
-                    
-                    # Only alert on high-confidence signals
-                    if direction != "HOLD" and confidence >= min_confidence:
-                        emoji = "🟢" if direction == "BUY" else "🔴"
-                        entry = rec.get("entry", 0)
-                        sl = rec.get("sl", 0)
-                        tp = rec.get("tp", 0)
-                        reason = rec.get("reasoning", "Technical setup")
-                        
-                        # Extract key Binance enrichment fields
-                        price_structure = m5_enriched.get("price_structure", "N/A")
-                        volatility_state = m5_enriched.get("volatility_state", "N/A")
-                        momentum_quality = m5_enriched.get("momentum_quality", "N/A")
-                        order_flow_signal = m5_enriched.get("order_flow_signal", "NEUTRAL")
-                        whale_count = m5_enriched.get("whale_count", 0)
-                        
-                        logger.info(f"📡 Signal found: {direction} {symbol} @ {confidence}% confidence")
-                        logger.info(f"   Binance: {price_structure}, {volatility_state}, {momentum_quality}, Whales: {whale_count}")
-                        
-                        # Enhanced alert with Binance data
-                        alert_text = (
-                            f"🔔 *Signal Alert!*\n\n"
-                            f"{emoji} **{direction} {symbol}**\n"
-                            f"📊 Entry: ${entry:.2f}\n"
-                            f"🛑 SL: ${sl:.2f}\n"
-                            f"🎯 TP: ${tp:.2f}\n"
-                            f"💡 {reason}\n"
-                            f"📈 Confidence: {confidence}%\n\n"
-                            f"🎯 *Setup Quality:*\n"
-                            f"  Structure: {price_structure}\n"
-                            f"  Volatility: {volatility_state}\n"
-                            f"  Momentum: {momentum_quality}\n"
-                            f"  Order Flow: {order_flow_signal}\n"
-                        )
-                        
-                        if whale_count > 0:
-                            alert_text += f"  🐋 Whales: {whale_count} detected\n"
-                        
-                        if DISCORD_ENABLED:
-                            discord_notifier.send_system_alert("Trade Alert", alert_text)
-                        
-                except Exception as e:
-                    logger.error(f"Error scanning {symbol}: {e}")
-                    continue
+            await engine.ascan(symbols)
         else:
             # Fallback to API endpoint if Binance not available
             async with httpx.AsyncClient(timeout=15.0) as client:
@@ -2415,8 +2413,9 @@ def main():
     
     scheduler.add_job(
         lambda: run_async_job(scan_for_signals),
-        'interval',
-        seconds=300,
+        'cron',
+        minute='*/5',
+        second=5,  # M5 bar close + scan engine grace period
         id='signal_scan'
     )
     
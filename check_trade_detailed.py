@@ -101,16 +101,21 @@ print("[2/4] Checking Intelligent Exit Manager Storage...")
 print("-" * 80)
 
 storage_path = project_root / "data" / "intelligent_exits.json"
+journal_path = storage_path.with_suffix(".journal")
 
-if storage_path.exists():
+if storage_path.exists() or journal_path.exists():
     print(f"  [OK] Storage file exists: {storage_path}")
-    print(f"  Size: {storage_path.stat().st_size} bytes")
+    if storage_path.exists():
+        print(f"  Size: {storage_path.stat().st_size} bytes")
+    if journal_path.exists():
+        print(f"  Journal size: {journal_path.stat().st_size} bytes")
     
     try:
-        with open(storage_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Snapshot plus the change journal written since the last compaction
+        sys.path.insert(0, str(project_root))
+        from infra.intelligent_exit_manager import load_exit_rules
         
-        rules = data.get("rules", {})
+        rules = load_exit_rules(storage_path)
         print(f"  Total rules in storage: {len(rules)}")
         
         rule = rules.get(str(ticket))
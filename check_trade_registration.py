@@ -132,14 +132,12 @@ print("-" * 80)
 
 storage_path = project_root / "data" / "intelligent_exits.json"
 
-if storage_path.exists():
+if storage_path.exists() or storage_path.with_suffix(".journal").exists():
     try:
-        import json
+        # Snapshot plus the change journal written since the last compaction
+        from infra.intelligent_exit_manager import load_exit_rules
         
-        with open(storage_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        rules = data.get("rules", {})
+        rules = load_exit_rules(storage_path)
         rule = rules.get(str(ticket))
         
         if rule:
@@ -673,3 +673,10 @@ POS_CLOSE_BACKOFF_MS = "300,600,900"  # Backoff delays in milliseconds (comma-se
 # ===== OCO BRACKET SETTINGS =====
 # Enable/disable OCO (One-Cancels-Other) bracket orders
 USE_OCO_BRACKETS = False  # Disabled by default (experimental feature)
+
+# ===== STRUCTURE DETECTION SETTINGS =====
+# Report live CHOCH/BOS flags from DetectionSystemManager.get_choch_bos().
+# The previous detector never set these flags, so turning this on ACTIVATES the MSS,
+# mitigation-block and breaker-block conditions in auto_execution_system that read them
+# (they have never fired before). Review those plans before enabling.
+CHOCH_BOS_LIVE_FLAGS = False  # Disabled by default (flags stay False, as before)
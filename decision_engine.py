@@ -343,6 +343,24 @@ def _atr_series(df: Optional[pd.DataFrame], period: int = 14) -> np.ndarray:
     return atr
 
 
+def _rsi_series(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    RSI for every bar, matching _calc_rsi evaluated on each prefix of the series
+    (simple-average gains/losses, 100 when there are no losses, NaN before warm-up).
+    """
+    close = np.asarray(close, dtype=float)
+    out = np.full(close.shape, np.nan)
+    if close.size < period + 1:
+        return out
+    diffs = np.diff(close)
+    avg_gain = pd.Series(np.clip(diffs, 0.0, None)).rolling(period).mean().to_numpy()
+    avg_loss = pd.Series(np.clip(-diffs, 0.0, None)).rolling(period).mean().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss > 1e-12, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss), 100.0)
+    out[1:] = np.where(np.isnan(avg_gain), np.nan, rsi)
+    return out
+
+
 def _calc_rsi(df: Optional[pd.DataFrame], period: int = 14) -> Optional[float]:
     """
     Compute the classic RSI (14) for the provided pandas DataFrame of OHLCV data.
@@ -1520,3 +1538,454 @@ def decide_trade(
     # === ANCHOR: PA20_ATTACH ===
     return _finalize(rec)
     # === ANCHOR: PA20_ATTACH_END ===
+
+
+# ---------------- batched ----------------
+# decide_trades() evaluates the dict-only decide_trade() path (no m5_df/m15_df, no
+# range_state, no advanced_features - how the scanners call it) for many rows at once:
+# many symbols at one moment, or many historical bars of one symbol.
+#
+# frames: {"M5": {field: array[N]}, "M15": {...}, "M30": {...}, "H1": {...}}
+# Fields are the same keys decide_trade reads from its dict payloads (close, ema_200,
+# atr_14, adx_14, rsi_14, bb_width, ...). Missing columns / NaN entries behave like
+# missing dict keys.
+
+BATCH_TIMEFRAMES = ("M5", "M15", "M30", "H1")
+
+
+def _as_float_array(values, n: int) -> np.ndarray:
+    """Column as float64 (None / non-numeric -> NaN, bool -> 0/1), broadcast to n rows"""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "biuf":
+        arr = arr.astype(float)
+    else:
+        arr = pd.to_numeric(pd.Series(arr.ravel(), dtype=object), errors="coerce").to_numpy(dtype=float)
+    if arr.ndim == 0 or arr.size == 1:
+        return np.full(n, float(arr.ravel()[0]) if arr.size else np.nan)
+    return arr
+
+
+def _bcol(frames: Dict[str, Dict[str, Any]], n: int, *sources, default=np.nan) -> np.ndarray:
+    """Vectorized _safe(): first non-missing value over (timeframe, key) sources, else default"""
+    out = np.full(n, np.nan)
+    for tf, key in sources:
+        col = (frames.get(tf) or {}).get(key)
+        if col is None:
+            continue
+        out = np.where(np.isnan(out), _as_float_array(col, n), out)
+    return np.where(np.isnan(out), default, out)
+
+
+def _bor(frames: Dict[str, Dict[str, Any]], n: int, *sources) -> np.ndarray:
+    """Vectorized ``a or b or 0.0`` over (timeframe, key) sources (0 and missing fall through)"""
+    out = np.zeros(n)
+    for tf, key in sources:
+        vals = np.nan_to_num(_bcol(frames, n, (tf, key), default=0.0), nan=0.0)
+        out = np.where(out == 0.0, vals, out)
+    return out
+
+
+def _batch_len(frames: Dict[str, Dict[str, Any]]) -> int:
+    for tf in BATCH_TIMEFRAMES:
+        for values in (frames.get(tf) or {}).values():
+            arr = np.asarray(values)
+            if arr.ndim == 1:
+                return int(arr.shape[0])
+    return 0
+
+
+def _row_payloads(frames: Dict[str, Dict[str, Any]], i: int) -> Tuple[Dict, Dict, Dict, Dict]:
+    """Rebuild the per-timeframe dict payloads of one batch row (for scalar fallbacks)"""
+    out = []
+    for tf in BATCH_TIMEFRAMES:
+        row = {}
+        for key, values in (frames.get(tf) or {}).items():
+            arr = np.asarray(values)
+            v = arr[i] if arr.ndim == 1 else arr
+            if isinstance(v, np.generic):
+                v = v.item()
+            if v is None or (isinstance(v, float) and np.isnan(v)):
+                continue
+            row[key] = v
+        out.append(row)
+    return tuple(out)
+
+
+def frames_from_payloads(payloads) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Columnar frames from per-row dict payloads.
+    payloads: iterable of (m5, m15, m30, h1) dicts, or of {"M5": ..., "M15": ..., ...} dicts.
+    """
+    rows = []
+    for p in payloads:
+        if isinstance(p, dict):
+            rows.append(tuple(p.get(tf) or {} for tf in BATCH_TIMEFRAMES))
+        else:
+            rows.append(tuple(d or {} for d in p))
+    frames: Dict[str, Dict[str, np.ndarray]] = {}
+    for idx, tf in enumerate(BATCH_TIMEFRAMES):
+        keys = []
+        for r in rows:
+            for k, v in r[idx].items():
+                if k not in keys and (v is None or isinstance(v, (int, float, bool, np.number, np.bool_))):
+                    keys.append(k)
+        frames[tf] = {
+            k: _as_float_array([r[idx].get(k) for r in rows], len(rows)) for k in keys
+        }
+    return frames
+
+
+def _batch_mtf_confluence(frames, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized domain.confluence.compute_mtf_confluence -> (score, bias)"""
+    aligns = []
+    trends = []
+    for tf in BATCH_TIMEFRAMES:
+        close = _bor(frames, n, (tf, "close"))
+        ema = _bor(frames, n, (tf, "ema_200"))
+        aligns.append(np.where(close >= ema, 1, -1))
+        adx = _bor(frames, n, (tf, "adx_14"), (tf, "adx"))
+        trends.append(np.clip((adx - 22.0) / (35.0 - 22.0), 0.0, 1.0))
+    slope = _bor(frames, n, ("H1", "ema_200_slope"), ("H1", "ema_slope"))
+    slope_bias = np.where(slope > 2e-4, 1, np.where(slope < -2e-4, -1, 0))
+
+    bias = np.sign(sum(aligns) + slope_bias).astype(int)
+    agree = np.where(bias != 0, sum((a == bias).astype(float) for a in aligns) / 4.0, 0.0)
+    trend = np.maximum(np.maximum(trends[0], trends[1]), trends[2]) * 0.4 + trends[3] * 0.6
+    score = np.clip(0.6 * agree + 0.4 * trend, 0.0, 1.0)
+    return score, bias
+
+
+def _mtf_label(score: float) -> str:
+    if score >= 0.7:
+        return "STRONG_CONFLUENCE"
+    if score >= 0.45:
+        return "MODERATE_CONFLUENCE"
+    if score >= 0.25:
+        return "WEAK_CONFLUENCE"
+    return "NO_CONFLUENCE"
+
+
+def _batch_rsi_dir(rsi: np.ndarray) -> np.ndarray:
+    return np.where(rsi >= RSI_BULL, 1, np.where(rsi <= RSI_BEAR, -1, 0))
+
+
+def _batch_trend_direction(frames, n, price, ema200, mtf_bias, rsi5, rsi15, rsi30) -> np.ndarray:
+    """Vectorized _determine_trend_direction -> +1 (BUY) / -1 (SELL)"""
+    adx_h1 = _bcol(frames, n, ("H1", "adx_14"), ("H1", "adx"), default=0.0)
+    adx_m15 = _bcol(frames, n, ("M15", "adx_14"), ("M15", "adx"), default=0.0)
+    slope_h1 = _bcol(frames, n, ("H1", "ema_200_slope"), ("H1", "ema_slope_h1"), default=0.0)
+    slope_m15 = _bcol(frames, n, ("M15", "ema_200_slope"), ("M15", "ema_slope_m15"), default=0.0)
+    slope_m5 = _bcol(frames, n, ("M5", "ema_200_slope"), ("M5", "ema_slope_m5"), default=0.0)
+
+    weighted = 0.5 * np.sign(slope_h1) + 0.3 * np.sign(slope_m15) + 0.2 * np.sign(slope_m5)
+    rsi_bullish = (rsi5 > 50) & (rsi15 > 50) & (rsi30 > 50)
+    rsi_bearish = (rsi5 < 50) & (rsi15 < 50) & (rsi30 < 50)
+    rsi_neutral = ~(rsi_bullish | rsi_bearish)
+    adx_strong = (adx_h1 > 25) | (adx_m15 > 25)
+
+    fallback = np.where(mtf_bias != 0, mtf_bias, np.where(price >= ema200, 1, -1))
+    return np.where(
+        (weighted > 0.2) & (rsi_bullish | rsi_neutral) & adx_strong, 1,
+        np.where(
+            (weighted < -0.2) & (rsi_bearish | rsi_neutral) & adx_strong, -1,
+            np.where(fallback >= 0, 1, -1),
+        ),
+    )
+
+
+def _adx_series(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder ADX for every bar"""
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    up = np.diff(high, prepend=high[:1])
+    down = -np.diff(low, prepend=low[:1])
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    prev_c = np.roll(close, 1)
+    prev_c[0] = close[0]
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_c), np.abs(low - prev_c)))
+
+    def wilder(x):
+        return pd.Series(x).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy(copy=True)
+
+    atr = wilder(tr)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100.0 * wilder(plus_dm) / atr
+        minus_di = 100.0 * wilder(minus_dm) / atr
+        dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    adx = wilder(np.nan_to_num(dx, nan=0.0))
+    adx[: period * 2 - 1] = np.nan
+    return adx
+
+
+def _bar_epochs(df: pd.DataFrame) -> np.ndarray:
+    t = df["time"]
+    if pd.api.types.is_numeric_dtype(t):
+        return t.to_numpy(dtype=np.int64)
+    return ((pd.to_datetime(t, utc=True) - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+
+
+def _timeframe_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Per-bar indicator columns for one timeframe (the fields decide_trade reads)"""
+    close = df["close"].astype(float)
+    ema_200 = close.ewm(span=200).mean()
+    mid = close.rolling(20).mean()
+    std = close.rolling(20).std()
+    bb_width = ((mid + 2 * std) - (mid - 2 * std)) / mid
+    return {
+        "close": close.to_numpy(),
+        "open": df["open"].astype(float).to_numpy(),
+        "high": df["high"].astype(float).to_numpy(),
+        "low": df["low"].astype(float).to_numpy(),
+        "ema_200": ema_200.to_numpy(),
+        "ema_200_slope": (ema_200.diff() / close).to_numpy(),
+        "atr_14": _atr_series(df, 14),
+        "rsi_14": _rsi_series(close.to_numpy(), 14),
+        "adx_14": _adx_series(df["high"], df["low"], close, 14),
+        "bb_width": bb_width.to_numpy(),
+        "bb_width_change": bb_width.diff().to_numpy(),
+    }
+
+
+_TF_SECONDS = {"M5": 300, "M15": 900, "M30": 1800, "H1": 3600}
+
+
+def history_frames(bars: Dict[str, pd.DataFrame], range_lookback: int = 20) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Columnar decide_trades() frames for every M5 bar of a history.
+
+    bars: {"M5": df, "M15": df, "M30": df, "H1": df} with time/open/high/low/close
+    (higher timeframes are resampled from M5 when missing). Indicators are computed once
+    per series; each M5 row sees only higher-timeframe bars that had closed by the end of
+    that M5 bar (no look-ahead). range_high_m5/range_low_m5 are the prior
+    ``range_lookback`` M5 bars' high/low.
+    """
+    m5 = bars["M5"].reset_index(drop=True)
+    m5_time = _bar_epochs(m5)
+    m5_close_time = m5_time + _TF_SECONDS["M5"]
+
+    frames: Dict[str, Dict[str, np.ndarray]] = {}
+    m5_cols = _timeframe_columns(m5)
+    m5_cols["time"] = m5_time
+    m5_cols["micro_roc5"] = m5["close"].astype(float).pct_change(5).to_numpy()
+    m5_cols["range_high_m5"] = m5["high"].astype(float).rolling(range_lookback).max().shift(1).to_numpy()
+    m5_cols["range_low_m5"] = m5["low"].astype(float).rolling(range_lookback).min().shift(1).to_numpy()
+    frames["M5"] = m5_cols
+
+    for tf in ("M15", "M30", "H1"):
+        df = bars.get(tf)
+        if df is None:
+            rule = {"M15": "15min", "M30": "30min", "H1": "1h"}[tf]
+            idx = pd.to_datetime(m5_time, unit="s", utc=True)
+            df = (
+                m5.set_index(idx)[["open", "high", "low", "close"]]
+                .resample(rule, label="left", closed="left")
+                .agg({"open": "first", "high": "max", "low": "min", "close": "last"})
+                .dropna()
+                .reset_index(names="time")
+            )
+        df = df.reset_index(drop=True)
+        cols = _timeframe_columns(df)
+        closed_at = _bar_epochs(df) + _TF_SECONDS[tf]
+        pos = np.searchsorted(closed_at, m5_close_time, side="right") - 1
+        valid = pos >= 0
+        frames[tf] = {
+            key: np.where(valid, values[np.clip(pos, 0, None)], np.nan) if len(values) else np.full(len(m5), np.nan)
+            for key, values in cols.items()
+        }
+    return frames
+
+
+# Outcome codes of the batched decision tree
+_B_SIDEWAYS, _B_RANGE_INVALID, _B_RANGE_NO_CONFIRM, _B_TREND_WEAK, _B_TREND, _B_SCALAR, _B_BREAKOUT, _B_NO_SETUP = range(8)
+
+
+def decide_trades(
+    frames: Dict[str, Dict[str, Any]],
+    symbols=None,
+    *,
+    as_records: bool = True,
+):
+    """
+    Batched decide_trade() over columnar multi-timeframe payloads.
+
+    Args:
+        frames: {"M5"|"M15"|"M30"|"H1": {field: array[N]}} (see frames_from_payloads / history_frames)
+        symbols: one symbol for all rows (history sweep) or a sequence of N symbols
+        as_records: True -> list of recommendation dicts (same keys/values as decide_trade);
+                    False -> dict of column arrays (cheap for calibration sweeps)
+
+    Rows that would reach the OCO bracket stage (settings.USE_OCO_BRACKETS) are
+    evaluated with the scalar decide_trade so results stay identical.
+    """
+    n = _batch_len(frames)
+    if isinstance(symbols, str) or symbols is None:
+        symbol_list = [symbols or ""] * n
+    else:
+        symbol_list = list(symbols)
+
+    price = _bcol(frames, n, ("M5", "close"), ("H1", "close"), default=0.0)
+    atr = _bcol(frames, n, ("M5", "atr_14"), default=2.0)
+    ema200 = _bcol(frames, n, ("M5", "ema_200"), ("H1", "ema_200"), default=price)
+    adx = _bcol(frames, n, ("M5", "adx_14"), ("M5", "adx"), default=0.0)
+    bbw = _bcol(frames, n, ("M5", "bb_width"), default=0.0)
+    ema_slope_h1 = _bcol(
+        frames, n, ("H1", "ema_200_slope"), ("H1", "ema_slope_h1"), ("M5", "ema_slope_h1"), default=0.0
+    )
+
+    # regime: 0 TREND, 1 RANGE, 2 VOLATILE (same precedence as _compute_regime)
+    regime = np.where(
+        (adx >= ADX_TREND) & (np.abs(ema_slope_h1) >= EMA_SLOPE), 0,
+        np.where((bbw <= BB_SQUEEZE) & (adx < 25), 1, 2),
+    )
+    is_trend = regime == 0
+
+    in_range = _bcol(frames, n, ("M5", "in_range"), default=0.0) != 0
+    rng_hi = _bcol(frames, n, ("M5", "range_high_m5"), default=price * (1 + RANGE_FRAC))
+    rng_lo = _bcol(frames, n, ("M5", "range_low_m5"), default=price * (1 - RANGE_FRAC))
+    micro_roc = _bcol(frames, n, ("M5", "micro_roc5"), default=0.0)
+    squeeze = _bcol(frames, n, ("M5", "squeeze"), default=0.0) != 0
+    bb_change = _bcol(frames, n, ("M5", "bb_width_change"), default=0.0)
+
+    if callable(compute_mtf_confluence):
+        mtf_score, mtf_bias = _batch_mtf_confluence(frames, n)
+    else:
+        conf = [_mtf_confluence(*_row_payloads(frames, i)) for i in range(n)]
+        mtf_score = np.array([c[0] for c in conf], dtype=float)
+        mtf_bias = np.array([c[2] for c in conf], dtype=int)
+
+    rsi5 = _bcol(frames, n, ("M5", "rsi_14"), ("M5", "rsi"))
+    rsi15 = _bcol(frames, n, ("M15", "rsi_14"), ("M15", "rsi"))
+    rsi30 = _bcol(frames, n, ("M30", "rsi_14"), ("M30", "rsi"))
+    r5, r15, r30 = _batch_rsi_dir(rsi5), _batch_rsi_dir(rsi15), _batch_rsi_dir(rsi30)
+
+    # Decision tree (no candle patterns without dataframes -> pattern bias is 0,
+    # and ranges cannot be validated without M5 closes -> in-range rows hold)
+    sideways = (in_range | squeeze) & (bb_change <= 0) & (adx < ADX_SIDEWAYS_CUTOFF)
+    trend_weak = (mtf_score < 0.45) | (np.abs(micro_roc) < MICRO_ROC)
+    breakout_up = price > rng_hi + 0.1 * atr
+    breakout_down = price < rng_lo - 0.1 * atr
+    bo_dir = np.where(breakout_up, 1, -1)
+    ok_rsi = (r5 == bo_dir) & ((r15 == r5) | (r30 == r5))
+    breakout = (breakout_up | breakout_down) & (ok_rsi | (mtf_score >= 0.45))
+
+    oco_enabled = bool(getattr(settings, "USE_OCO_BRACKETS", False))
+    outcome = np.select(
+        [
+            sideways,
+            in_range & ~is_trend,
+            in_range,
+            is_trend & trend_weak,
+            is_trend,
+            np.full(n, oco_enabled),
+            breakout,
+        ],
+        [_B_SIDEWAYS, _B_RANGE_INVALID, _B_RANGE_NO_CONFIRM, _B_TREND_WEAK, _B_TREND, _B_SCALAR, _B_BREAKOUT],
+        default=_B_NO_SETUP,
+    )
+
+    trend_dir = _batch_trend_direction(frames, n, price, ema200, mtf_bias, rsi5, rsi15, rsi30)
+    trade_dir = np.where(outcome == _B_TREND, trend_dir, np.where(outcome == _B_BREAKOUT, bo_dir, 0))
+    sl_mult = np.where(outcome == _B_TREND, TREND_SL_MULT, VOL_SL_MULT)
+    tp_mult = np.where(outcome == _B_TREND, TREND_TP_MULT, VOL_TP_MULT)
+
+    is_trade = trade_dir != 0
+    sl = np.where(is_trade, price - trade_dir * sl_mult * atr, np.maximum(0.0, price - atr))
+    tp = np.where(is_trade, price + trade_dir * tp_mult * atr, price + atr)
+    rr = np.where(is_trade, np.abs(tp - price) / np.maximum(1e-9, np.abs(price - sl)), 1.0)
+
+    conf_base = np.array([35, 38, 40, 40, 55, 0, 52, 35], dtype=float)[outcome]
+    conf_mult = np.array([30, 25, 25, 40, 35, 0, 30, 30], dtype=float)[outcome]
+    confidence = (conf_base + conf_mult * mtf_score).astype(int)
+
+    regime_names = np.array(["TREND", "RANGE", "VOLATILE"], dtype=object)[regime]
+    direction = np.array(["SELL", "HOLD", "BUY"], dtype=object)[trade_dir + 1]
+    regime_out = np.select(
+        [outcome == _B_SIDEWAYS, np.isin(outcome, (_B_RANGE_INVALID, _B_RANGE_NO_CONFIRM)),
+         np.isin(outcome, (_B_TREND_WEAK, _B_TREND)), outcome == _B_BREAKOUT],
+        [np.where(is_trend, "TREND", "RANGE").astype(object), "RANGE", "TREND", "VOLATILE"],
+        default=regime_names,
+    ).astype(object)
+    strategy = np.array(
+        ["idle", "idle", "mean_reversion", "trend_pullback", "trend_pullback", "", "breakout", "idle"],
+        dtype=object,
+    )[outcome]
+
+    scalar_rows = np.nonzero(outcome == _B_SCALAR)[0]
+
+    if not as_records:
+        result = {
+            "direction": direction,
+            "entry": price,
+            "sl": sl,
+            "tp": tp,
+            "rr": rr,
+            "regime": regime_out,
+            "strategy": strategy,
+            "confidence": confidence,
+            "mtf_score": mtf_score,
+            "outcome": outcome,
+        }
+        for i in scalar_rows:
+            rec = decide_trade(symbol_list[i], *_row_payloads(frames, i))
+            for key in ("direction", "entry", "sl", "tp", "rr", "regime", "strategy", "confidence"):
+                result[key][i] = rec.get(key)
+        return result
+
+    def _nan_none(v):
+        return None if np.isnan(v) else float(v)
+
+    records = []
+    for i in range(n):
+        o = int(outcome[i])
+        if o == _B_SCALAR:
+            records.append(decide_trade(symbol_list[i], *_row_payloads(frames, i)))
+            continue
+
+        guards: list[str] = []
+        triggers: list[str] = []
+        label = _mtf_label(float(mtf_score[i]))
+        if o == _B_SIDEWAYS:
+            guards.append("sideways_block(BB↓, ADX<28, no_candle)")
+            reasoning = "Strict sideways block."
+        elif o == _B_RANGE_INVALID:
+            guards.append("range_not_validated(touches<2)")
+            reasoning = "Range not validated (need ≥2 tests of both boundaries)."
+        elif o == _B_RANGE_NO_CONFIRM:
+            guards.append("range_lower_no_confirm")
+            reasoning = "Lower range edge but no strong bullish confirmation + RSI alignment."
+        elif o == _B_TREND_WEAK:
+            guards.append("trend_weak_confirmation")
+            reasoning = "Trend regime but confirmation weak (MTF or micro momentum)."
+        elif o == _B_TREND:
+            triggers.append("trend_ok")
+            reasoning = f"Trend with MTF={label}, microROC={micro_roc[i]:.4f}."
+        elif o == _B_BREAKOUT:
+            triggers.append("breakout_confirmed")
+            reasoning = f"Breakout {'up' if breakout_up[i] else 'down'} with RSI/MTF support."
+        else:
+            guards.append("no_setup")
+            reasoning = "No high-quality setup after strict filters."
+
+        rec = Recommendation(
+            direction[i], price[i], sl[i], tp[i], rr[i], regime_out[i],
+            reasoning, strategy[i], int(confidence[i]),
+        ).as_dict()
+        rec.update(
+            {
+                "mtf_label": label,
+                "mtf_score": float(mtf_score[i]),
+                "pattern_m5": "",
+                "pattern_m15": "",
+                "rsi5": _nan_none(rsi5[i]),
+                "rsi15": _nan_none(rsi15[i]),
+                "rsi30": _nan_none(rsi30[i]),
+                "touches_hi": 0,
+                "touches_lo": 0,
+                "near_edge": "",
+                "guards": guards,
+                "triggers": triggers,
+                "range_state": {},
+            }
+        )
+        records.append(rec)
+    return records
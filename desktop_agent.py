@@ -2823,12 +2823,14 @@ async def tool_analyse_symbol_full(args: Dict[str, Any]) -> Dict[str, Any]:
                 logger.warning(f"   ⚠️ BTC order flow metrics error: {e}", exc_info=True)
                 btc_order_flow_metrics = None
         
-        # Build Advanced features
+        # Build Advanced features (reusing the bars fetched above; shared indicators
+        # come from the feature store)
         advanced_features = build_features_advanced(
             symbol=symbol_normalized,
             mt5svc=mt5_service,
             bridge=bridge,
-            timeframes=["M5", "M15", "H1"]
+            timeframes=["M5", "M15", "H1"],
+            multi=all_timeframe_data
         )
         
         # ========== VOLATILITY REGIME DETECTION (Phase 1) ==========
@@ -8158,9 +8160,10 @@ async def tool_analyse_range_scalp_opportunity(args: Dict[str, Any]) -> Dict[str
         symbol: Trading symbol (e.g., BTCUSD, XAUUSD)
         strategy_filter: Optional strategy name to focus on
         check_risk_filters: Whether to apply risk mitigation (default: true)
+        early_exit: Stop risk filters at the first hard reject (default: true)
     
     Returns:
-        Analysis with range structure, risk checks, top strategy, warnings
+        Analysis with range structure, risk checks (incl. per-filter timings), top strategy, warnings
     """
     symbol = args.get("symbol")
     if not symbol:
@@ -8168,6 +8171,7 @@ async def tool_analyse_range_scalp_opportunity(args: Dict[str, Any]) -> Dict[str
     
     strategy_filter = args.get("strategy_filter")
     check_risk_filters = args.get("check_risk_filters", True)
+    early_exit = args.get("early_exit", True)
     
     logger.info(f"📊 Analysing range scalping opportunity for {symbol}...")
     
@@ -8643,9 +8647,18 @@ async def tool_analyse_range_scalp_opportunity(args: Dict[str, Any]) -> Dict[str
             strategy_filter=strategy_filter,
             check_risk_filters=check_risk_filters,
             market_data=market_data,
-            indicators=indicators
+            indicators=indicators,
+            early_exit=early_exit
         )
         
+        filter_timings = result.get("risk_checks", {}).get("filter_timings_ms")
+        if filter_timings:
+            skipped = result["risk_checks"].get("skipped_filters") or []
+            logger.info(
+                f"   Range filter timings (ms): "
+                f"{', '.join(f'{name}={ms:.1f}' for name, ms in filter_timings.items())}"
+                f"{f' | skipped: {skipped}' if skipped else ''}"
+            )
         logger.info(f"✅ Range scalping analysis complete for {symbol_normalized}")
         
         return {
@@ -11188,9 +11201,11 @@ async def tool_macro_context(args: Dict[str, Any]) -> Dict[str, Any]:
             raise RuntimeError("Failed to connect to MT5")
     
     try:
-        # Get current macro data from Yahoo Finance (not MT5)
-        import yfinance as yf
+        # Get current macro data from Yahoo Finance (not MT5) via the shared macro store:
+        # each series is fetched once per refresh interval and shared across analyses
         import requests
+        from infra.market_indices_service import create_market_indices_service
+        indices = create_market_indices_service()
         
         # Try multiple sources for DXY as it's sometimes unreliable on Yahoo Finance
         dxy = None
@@ -11198,10 +11213,9 @@ async def tool_macro_context(args: Dict[str, Any]) -> Dict[str, Any]:
         
         for ticker in dxy_sources:
             try:
-                dxy_data = yf.Ticker(ticker)
-                dxy_hist = dxy_data.history(period="5d")
-                if not dxy_hist.empty:
-                    dxy = float(dxy_hist['Close'].iloc[-1])
+                dxy_closes = await indices.aget_recent_closes(ticker)
+                if dxy_closes:
+                    dxy = dxy_closes[-1]
                     logger.info(f"   ✅ DXY fetched from {ticker}: {dxy:.2f}")
                     break
             except Exception as e:
@@ -11214,46 +11228,51 @@ async def tool_macro_context(args: Dict[str, Any]) -> Dict[str, Any]:
             logger.warning(f"   ⚠️ Using fallback DXY value: {dxy}")
         
         # Fetch US10Y
-        us10y_data = yf.Ticker("^TNX")
-        us10y_hist = us10y_data.history(period="5d")
-        if us10y_hist.empty:
+        us10y_closes = await indices.aget_recent_closes("^TNX")
+        if not us10y_closes:
             us10y = 4.2  # Fallback reasonable value
             logger.warning(f"   ⚠️ Using fallback US10Y value: {us10y}%")
         else:
-            us10y = float(us10y_hist['Close'].iloc[-1])
+            us10y = us10y_closes[-1]
             logger.info(f"   ✅ US10Y fetched: {us10y:.3f}%")
         
         # Fetch VIX
-        vix_data = yf.Ticker("^VIX")
-        vix_hist = vix_data.history(period="5d")
-        if vix_hist.empty:
+        vix_closes = await indices.aget_recent_closes("^VIX")
+        if not vix_closes:
             vix = 16.0  # Fallback reasonable value
             logger.warning(f"   ⚠️ Using fallback VIX value: {vix}")
         else:
-            vix = float(vix_hist['Close'].iloc[-1])
+            vix = vix_closes[-1]
             logger.info(f"   ✅ VIX fetched: {vix:.2f}")
         
         # Fetch S&P 500 (NEW - for Bitcoin correlation)
-        sp500_data = yf.Ticker("^GSPC")
-        sp500_hist = sp500_data.history(period="5d")
-        if sp500_hist.empty or len(sp500_hist) < 2:
+        sp500_closes = await indices.aget_recent_closes("^GSPC")
+        if len(sp500_closes) < 2:
             sp500 = 5800.0  # Fallback reasonable value
             sp500_change = 0.0
             logger.warning(f"   ⚠️ Using fallback S&P 500 value: {sp500}")
         else:
-            sp500 = float(sp500_hist['Close'].iloc[-1])
-            sp500_prev = float(sp500_hist['Close'].iloc[-2])
+            sp500 = sp500_closes[-1]
+            sp500_prev = sp500_closes[-2]
             sp500_change = ((sp500 - sp500_prev) / sp500_prev) * 100
             logger.info(f"   ✅ S&P 500 fetched: {sp500:.2f} ({sp500_change:+.2f}%)")
         
+        def _fetch_json(url: str) -> Optional[Dict[str, Any]]:
+            response = requests.get(url, timeout=5)
+            if response.status_code != 200:
+                logger.warning(f"   ⚠️ {url} returned status {response.status_code}")
+                return None
+            return response.json()
+        
         # Fetch Bitcoin Dominance (NEW - from CoinGecko)
         btc_dominance = None
         btc_dom_status = "Unknown"
         try:
-            cg_url = "https://api.coingecko.com/api/v3/global"
-            cg_response = requests.get(cg_url, timeout=5)
-            if cg_response.status_code == 200:
-                cg_data = cg_response.json()
+            cg_data = await indices.store.aget(
+                "coingecko_global", lambda: _fetch_json("https://api.coingecko.com/api/v3/global"),
+                ttl=indices.cache_ttl_seconds, cache_if=bool
+            )
+            if cg_data:
                 btc_dominance = float(cg_data["data"]["market_cap_percentage"]["btc"])
                 
                 # Classify dominance
@@ -11265,8 +11284,6 @@ async def tool_macro_context(args: Dict[str, Any]) -> Dict[str, Any]:
                     btc_dom_status = "NEUTRAL"
                 
                 logger.info(f"   ✅ BTC Dominance fetched: {btc_dominance:.1f}% ({btc_dom_status})")
-            else:
-                logger.warning(f"   ⚠️ CoinGecko returned status {cg_response.status_code}")
         except Exception as e:
             logger.warning(f"   ⚠️ Failed to fetch BTC Dominance: {e}")
         
@@ -11274,15 +11291,14 @@ async def tool_macro_context(args: Dict[str, Any]) -> Dict[str, Any]:
         crypto_fear_greed = None
         crypto_sentiment = "Unknown"
         try:
-            fng_url = "https://api.alternative.me/fng/"
-            fng_response = requests.get(fng_url, timeout=5)
-            if fng_response.status_code == 200:
-                fng_data = fng_response.json()
+            fng_data = await indices.store.aget(
+                "crypto_fear_greed", lambda: _fetch_json("https://api.alternative.me/fng/"),
+                ttl=indices.cache_ttl_seconds, cache_if=bool
+            )
+            if fng_data:
                 crypto_fear_greed = int(fng_data["data"][0]["value"])
                 crypto_sentiment = fng_data["data"][0]["value_classification"]
                 logger.info(f"   ✅ Crypto Fear & Greed fetched: {crypto_fear_greed}/100 ({crypto_sentiment})")
-            else:
-                logger.warning(f"   ⚠️ Alternative.me returned status {fng_response.status_code}")
         except Exception as e:
             logger.warning(f"   ⚠️ Failed to fetch Crypto Fear & Greed: {e}")
         
@@ -11594,6 +11610,15 @@ async def agent_main():
     except Exception as e:
         logger.warning(f"⚠️ MT5Service initialization failed: {e}")
     
+    # ========== MACRO CONTEXT STORE ==========
+    # Keep DXY/VIX/US10Y/S&P/NASDAQ snapshots and correlation bars warm in the background
+    try:
+        from infra.market_indices_service import create_market_indices_service
+        create_market_indices_service().register_background_refresh()
+        logger.info("✅ Macro context background refresh started")
+    except Exception as e:
+        logger.warning(f"⚠️ Macro context background refresh failed to start: {e}")
+
     # ========== TICK METRICS GENERATOR ==========
     # Initialize tick metrics generator for direct calls (ChatGPT analysis)
     try:
@@ -6,11 +6,12 @@ Send trading alerts via Discord webhooks
 
 import os
 import re
-import requests
 import json
 from datetime import datetime
 from dotenv import load_dotenv
 
+from infra.notification_gateway import get_notification_gateway
+
 # Load environment variables
 load_dotenv()
 
@@ -148,21 +149,17 @@ class DiscordNotifier:
                     }
                     embeds.append(embed)
             
-            # Send to Discord (can send up to 10 embeds per message)
-            data = {
-                "username": self.bot_name,
-                "embeds": embeds[:10]  # Discord limit: max 10 embeds per message
-            }
-            
-            response = requests.post(webhook_url, json=data, timeout=10)
+            # Queue for the notification gateway (can send up to 10 embeds per message).
+            # Delivery is async: batched with other alerts, rate-limited and retried.
+            queued = get_notification_gateway().submit_discord(
+                webhook_url, embeds[:10], username=self.bot_name  # Discord limit: max 10 embeds per message
+            )
             
-            if response.status_code == 204:
-                print(f"SUCCESS: Discord message sent to {channel_name} channel ({message_type}, {len(embeds)} embed(s))")
+            if queued:
+                print(f"SUCCESS: Discord message queued for {channel_name} channel ({message_type}, {len(embeds)} embed(s))")
                 return True
             else:
-                print(f"FAILED: Discord message failed to {channel_name} channel: {response.status_code}")
-                if response.status_code != 204:
-                    print(f"Response: {response.text}")
+                print(f"FAILED: Discord notification queue full, message to {channel_name} channel dropped")
                 return False
                 
         except Exception as e:
@@ -0,0 +1,132 @@
+"""
+Level Clustering - sort-and-sweep grouping of price levels (swings, pivots, touches).
+
+One O(n log n) primitive behind equal highs/lows, stop clusters, S/R bands and zone building.
+
+- Levels are sorted once (stable) and swept left to right; a level joins the open cluster
+  if it is within tolerance of the cluster's reference, otherwise it starts a new cluster
+- Reference ("link"): "chain" = previous level in the cluster, "anchor" = lowest level of the
+  cluster (clusters never span more than the tolerance), "median" = running median
+- Tolerance in price units, as a fraction of the reference price (relative=True),
+  or in ATR units (atr=...)
+- densest_window: the +/- tolerance window holding the most levels (strongest cluster)
+- LevelClusterer keeps levels sorted as they arrive (bisect insertion) for callers that
+  add swings one at a time
+"""
+
+import bisect
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+LINKS = ("chain", "anchor", "median")
+
+
+def cluster_prices(
+    prices: Sequence[float],
+    tolerance: float,
+    link: str = "chain",
+    relative: bool = False,
+    atr: Optional[float] = None,
+) -> List[np.ndarray]:
+    """
+    Cluster levels by price.
+
+    Args:
+        prices: Level prices (any order)
+        tolerance: Max distance to the cluster reference (price units, fraction of the
+            reference price if relative, ATR multiples if atr is given)
+        link: "chain", "anchor" or "median" (see module docstring)
+        relative: Tolerance is a fraction of the reference price
+        atr: ATR to scale the tolerance by
+
+    Returns:
+        Indices into ``prices`` per cluster; clusters in ascending price order, members by
+        ascending price (input order on ties)
+    """
+    if link not in LINKS:
+        raise ValueError(f"Unknown cluster link: {link}")
+    xs = np.asarray(prices, dtype=float)
+    if xs.size == 0:
+        return []
+    if atr is not None:
+        tolerance = tolerance * atr
+    order = np.argsort(xs, kind="stable")
+    xs = xs[order]
+
+    if link == "chain":
+        gaps = np.diff(xs)
+        if relative:
+            gaps = gaps / xs[:-1]
+        breaks = np.flatnonzero(gaps > tolerance) + 1
+        return np.split(order, breaks)
+
+    if link == "anchor":
+        clusters = []
+        start = 0
+        while start < len(xs):
+            limit = xs[start] * (1 + tolerance) if relative else xs[start] + tolerance
+            end = max(int(np.searchsorted(xs, limit, side="right")), start + 1)
+            clusters.append(order[start:end])
+            start = end
+        return clusters
+
+    # median: members are sorted, so the running median is the middle element(s)
+    clusters = []
+    start = 0
+    for i in range(1, len(xs) + 1):
+        if i < len(xs):
+            n = i - start
+            mid = start + n // 2
+            ref = xs[mid] if n % 2 else 0.5 * (xs[mid - 1] + xs[mid])
+            tol = tolerance * ref if relative else tolerance
+            if abs(xs[i] - ref) <= tol:
+                continue
+        clusters.append(order[start:i])
+        start = i
+    return clusters
+
+
+def densest_window(prices: Sequence[float], tolerance: float) -> Optional[Tuple[np.ndarray, float]]:
+    """
+    Densest +/- tolerance window centred on one of the levels: (levels in the window,
+    ascending; centre level). The lowest centre wins ties. None if there are no levels.
+    """
+    xs = np.sort(np.asarray(prices, dtype=float))
+    if xs.size == 0:
+        return None
+    lo = np.searchsorted(xs, xs - tolerance, side="left")
+    hi = np.searchsorted(xs, xs + tolerance, side="right")
+    best = int(np.argmax(hi - lo))
+    return xs[lo[best]:hi[best]], float(xs[best])
+
+
+class LevelClusterer:
+    """Levels added one at a time, kept sorted; clusters are re-swept only when asked for"""
+
+    def __init__(self, tolerance: float, link: str = "chain", relative: bool = False):
+        if link not in LINKS:
+            raise ValueError(f"Unknown cluster link: {link}")
+        self.tolerance = tolerance
+        self.link = link
+        self.relative = relative
+        self._prices: List[float] = []
+        self._items: List[Any] = []
+        self._clusters: Optional[List[List[Any]]] = None
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def add(self, price: float, item: Any = None) -> None:
+        """Insert a level (``item`` defaults to the price); ties keep insertion order"""
+        pos = bisect.bisect_right(self._prices, price)
+        self._prices.insert(pos, price)
+        self._items.insert(pos, price if item is None else item)
+        self._clusters = None
+
+    def clusters(self) -> List[List[Any]]:
+        """Items per cluster, ascending price"""
+        if self._clusters is None:
+            groups = cluster_prices(self._prices, self.tolerance, link=self.link, relative=self.relative)
+            self._clusters = [[self._items[i] for i in group] for group in groups]
+        return self._clusters
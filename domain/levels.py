@@ -9,6 +9,9 @@ import math
 import numpy as np
 import pandas as pd
 
+from domain.level_clusters import cluster_prices
+from domain.volume_profile import bar_times, get_volume_profile, grid_step
+
 
 def _np(x) -> np.ndarray:
     if isinstance(x, np.ndarray):
@@ -38,7 +41,7 @@ def _session_label(session: Optional[str]) -> str:
 
 
 def _vap_histogram(
-    df: Optional[pd.DataFrame], bins: int = 100
+    df: Optional[pd.DataFrame], bins: int = 100, symbol: Optional[str] = None, timeframe: str = "M5"
 ) -> Tuple[np.ndarray, np.ndarray]:
     if (
         df is None
@@ -48,25 +51,16 @@ def _vap_histogram(
         return np.array([]), np.array([])
     hi = df["high"].astype(float).to_numpy()
     lo = df["low"].astype(float).to_numpy()
-    vol = df["tick_volume"].astype(float).to_numpy()
     pmin, pmax = float(np.nanmin(lo)), float(np.nanmax(hi))
     if not np.isfinite(pmin) or not np.isfinite(pmax) or pmax <= pmin:
         return np.array([]), np.array([])
-    edges = np.linspace(pmin, pmax, bins + 1)
-    hist = np.zeros(bins, dtype=float)
-    # distribute each bar’s volume across the overlapping bins
-    for L, H, V in zip(lo, hi, vol):
-        if not np.isfinite(L) or not np.isfinite(H) or H <= L:
-            continue
-        # find bins spanned by [L,H]
-        i0 = np.searchsorted(edges, L, side="right") - 1
-        i1 = np.searchsorted(edges, H, side="right") - 1
-        i0 = max(0, min(i0, bins - 1))
-        i1 = max(0, min(i1, bins - 1))
-        span = max(1, i1 - i0 + 1)
-        hist[i0 : i1 + 1] += V / span
-    centers = 0.5 * (edges[:-1] + edges[1:])
-    return centers, hist
+    # each bar's volume spread over a fine price grid (shared per symbol/timeframe/window),
+    # then summed into the coarse bins
+    if bar_times(df) is None:
+        symbol = None
+    profile = get_volume_profile(symbol, timeframe, len(df), grid_step(pmax - pmin, precision=8))
+    profile.update_df(df, volume_col="tick_volume")
+    return profile.histogram(bins, price_range=(pmin, pmax))
 
 
 def _valid_df(df: Optional[pd.DataFrame]) -> bool:
@@ -104,18 +98,8 @@ def _find_swings(df: pd.DataFrame, window: int = 3) -> Tuple[np.ndarray, np.ndar
 def _cluster_levels(levels: np.ndarray, tol: float) -> List[np.ndarray]:
     if levels.size == 0:
         return []
-    idx = np.argsort(levels)
-    levels = levels[idx]
-    bands = []
-    cur = [levels[0]]
-    for x in levels[1:]:
-        if abs(x - cur[-1]) <= tol:
-            cur.append(x)
-        else:
-            bands.append(np.array(cur))
-            cur = [x]
-    bands.append(np.array(cur))
-    return bands
+    # chain neighbouring levels (sorted) that are within tol of each other
+    return [levels[band] for band in cluster_prices(levels, tol)]
 
 
 # ---- swing clustering -------------------------------------------------------
@@ -209,7 +193,7 @@ def compute_sr_snapshot(
     lo_bands = _cluster_levels(piv_lo, tol)
 
     # volume-at-price proxy (M5 preferred)
-    centers, vap = _vap_histogram(m5_df, bins=120)
+    centers, vap = _vap_histogram(m5_df, bins=120, symbol=symbol)
     vap_norm = vap / vap.max() if vap.size and vap.max() > 0 else vap
 
     zones: List[Dict[str, object]] = []
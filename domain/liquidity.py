@@ -7,6 +7,8 @@ import pandas as pd
 from typing import Dict, Any, List, Tuple, Optional
 import logging
 
+from domain.level_clusters import cluster_prices, densest_window
+
 logger = logging.getLogger(__name__)
 
 
@@ -506,49 +508,28 @@ def _find_price_clusters(
     min_touches: int
 ) -> List[Dict[str, Any]]:
     """
-    Find clusters of prices within tolerance.
+    Find clusters of prices within tolerance (each cluster spans at most the tolerance).
     
-    Returns list of cluster dicts with price, count, bars_ago.
+    Returns list of cluster dicts with price, count, bars_ago, ordered by each
+    cluster's earliest swing.
     """
     if not swings:
         return []
     
+    prices = np.array([price for _, price in swings], dtype=float)
     clusters = []
-    used_indices = set()
-    
-    for i, (idx_i, price_i) in enumerate(swings):
-        if i in used_indices:
+    for members in cluster_prices(prices, tolerance, link="anchor"):
+        if len(members) < min_touches:
             continue
-        
-        # Find all swings within tolerance of this price
-        cluster_indices = [i]
-        cluster_prices = [price_i]
-        
-        for j, (idx_j, price_j) in enumerate(swings):
-            if j != i and j not in used_indices:
-                if abs(price_j - price_i) <= tolerance:
-                    cluster_indices.append(j)
-                    cluster_prices.append(price_j)
-                    used_indices.add(j)
-        
-        # Check if cluster meets minimum size
-        if len(cluster_indices) >= min_touches:
-            avg_price = np.mean(cluster_prices)
-            # FIXED: most_recent_idx is the bar index from original data
-            # We need to track how far back this cluster is from current
-            most_recent_bar_idx = max([swings[k][0] for k in cluster_indices])
-            # If we have the total data length, bars_ago should be: total_len - most_recent_bar_idx - 1
-            # For now, use the swing index as a proxy
-            bars_ago = max(cluster_indices)  # Most recent swing in the cluster
-            
-            clusters.append({
-                "price": avg_price,
-                "count": len(cluster_indices),
-                "bars_ago": bars_ago
-            })
-            
-            used_indices.add(i)
+        clusters.append({
+            "price": np.mean(prices[members]),
+            "count": len(members),
+            # Swing index as a proxy for recency: most recent swing in the cluster
+            "bars_ago": int(members.max()),
+            "_first": int(members.min())
+        })
     
+    clusters.sort(key=lambda c: c.pop("_first"))
     return clusters
 
 
@@ -720,32 +701,18 @@ def _find_wick_clusters(
     if len(wick_prices) < min_wicks:
         return None
     
-    # Sort prices for easier clustering
-    sorted_prices = np.sort(wick_prices)
-    
-    best_cluster = None
-    best_count = 0
-    
-    # Try each price as a potential cluster center
-    for i in range(len(sorted_prices)):
-        center_price = sorted_prices[i]
-        
-        # Find all prices within tolerance
-        in_cluster = sorted_prices[
-            (sorted_prices >= center_price - tolerance) &
-            (sorted_prices <= center_price + tolerance)
-        ]
-        
-        if len(in_cluster) >= min_wicks and len(in_cluster) > best_count:
-            best_cluster = {
-                'price': float(np.mean(in_cluster)),  # Average price of cluster
-                'count': len(in_cluster),
-                'center': float(center_price),
-                'tolerance': tolerance
-            }
-            best_count = len(in_cluster)
+    # Most prices within +/- tolerance of any one price (first such price on ties)
+    window = densest_window(wick_prices, tolerance)
+    if window is None or len(window[0]) < min_wicks:
+        return None
     
-    return best_cluster
+    in_cluster, center_price = window
+    return {
+        'price': float(np.mean(in_cluster)),  # Average price of cluster
+        'count': len(in_cluster),
+        'center': float(center_price),
+        'tolerance': tolerance
+    }
 
 
 def _empty_stop_clusters() -> Dict[str, Any]:
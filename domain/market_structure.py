@@ -14,6 +14,9 @@ Public API:
     - label_swings(swings: List[PivotLike]) -> List[StructurePoint]
     - structure_bias(labels: List[StructurePoint], lookback: int = 6) -> Literal['up','down','range']
 
+Incremental per-(symbol, timeframe) tracking of the same structure lives in
+domain/structure_tracker.py.
+
 Anchors:
     # === ANCHOR: IMPORTS ===
     # === ANCHOR: TYPES ===
@@ -219,6 +222,15 @@ def _symmetric_swings(
     return swings
 
 
+def _trend_from_pivots(last_high: float, prev_high: float, last_low: float, prev_low: float) -> str:
+    """'UP' on a higher high and higher low, 'DOWN' on a lower high and lower low, else 'RANGE'."""
+    if last_high > prev_high and last_low > prev_low:
+        return "UP"
+    if last_high < prev_high and last_low < prev_low:
+        return "DOWN"
+    return "RANGE"
+
+
 def _get_field(obj: PivotLike, name: str, default: Any = None) -> Any:
     """Read `name` from dict or attribute; fall back to default."""
     try:
@@ -349,13 +361,7 @@ def label_structure(
             ph = float(piv["prev_high"])
             ll = float(piv["last_low"])
             pl = float(piv["prev_low"])
-
-            if lh > ph and ll > pl:
-                trend = "UP"
-            elif lh < ph and ll < pl:
-                trend = "DOWN"
-            else:
-                trend = "RANGE"
+            trend = _trend_from_pivots(lh, ph, ll, pl)
         else:
             # symmetric mode uses more robust windowed swings
             swings = _symmetric_swings(df, left=3, right=3, lookback=max(lookback, 20))
@@ -365,26 +371,15 @@ def label_structure(
             if len(highs) >= 2 and len(lows) >= 2:
                 lh, ph = highs[-1]["price"], highs[-2]["price"]
                 ll, pl = lows[-1]["price"], lows[-2]["price"]
-                if lh > ph and ll > pl:
-                    trend = "UP"
-                elif lh < ph and ll < pl:
-                    trend = "DOWN"
-                else:
-                    trend = "RANGE"
+                trend = _trend_from_pivots(lh, ph, ll, pl)
             else:
                 # Fallback: try legacy pivots on short or choppy samples
                 piv = _find_pivots(df, lookback)
                 if piv:
-                    lh = float(piv["last_high"])
-                    ph = float(piv["prev_high"])
-                    ll = float(piv["last_low"])
-                    pl = float(piv["prev_low"])
-                    if lh > ph and ll > pl:
-                        trend = "UP"
-                    elif lh < ph and ll < pl:
-                        trend = "DOWN"
-                    else:
-                        trend = "RANGE"
+                    trend = _trend_from_pivots(
+                        float(piv["last_high"]), float(piv["prev_high"]),
+                        float(piv["last_low"]), float(piv["prev_low"]),
+                    )
                 else:
                     trend = "RANGE"
 
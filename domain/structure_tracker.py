@@ -0,0 +1,346 @@
+"""
+Structure Tracker - incremental swing structure and BOS/CHOCH per (symbol, timeframe).
+
+Keeps the state that label_structure() and detect_bos_choch() rebuild from a DataFrame on
+every call, and advances it one closed bar at a time.
+
+- The last row of each update is the forming bar; every earlier row is a closed bar
+- A closed bar confirms the symmetric swing ``right`` bars back (same rule as
+  _symmetric_swings: strictly above the ``left`` bars before it, not below the ``right``
+  bars after it); the swing that depends on the forming bar is evaluated at read time only
+- Confirmed swings are labeled HH/HL/LH/LL as they arrive (each high against the previous
+  high, each low against the previous low, as label_swings does)
+- Each closed bar runs detect_bos_choch over the last labeled swings with an incremental
+  ATR; a new break (direction or level) is recorded as an event, so bars_since_bos is exact
+- state() returns label_structure's trend/break/micro_bias plus the live BOS/CHOCH flags
+- Repeated updates with overlapping bars only apply the newly closed ones; bars that do
+  not line up with the held ones (gap, reload, no times) rebuild the tracker
+- Between bar fetches, update_price() moves the forming bar's close to the latest tick
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from domain.market_structure import (
+    _find_pivots,
+    _safe_array,
+    _trend_from_pivots,
+    detect_bos_choch,
+    label_swings,
+    structure_bias,
+)
+from domain.volume_profile import bar_times
+
+logger = logging.getLogger(__name__)
+
+MAX_TRACKERS = 256
+
+
+def _epoch_seconds(t: int) -> int:
+    """bar_times() values (epoch seconds or nanoseconds) as epoch seconds"""
+    return int(t // 1_000_000_000) if abs(t) > 10**12 else int(t)
+
+
+def _tail(values: Deque, n: int) -> list:
+    """Last n items of a deque, oldest first, without walking the whole deque"""
+    return list(islice(reversed(values), n))[::-1]
+
+
+class StructureTracker:
+    """Swing structure and BOS/CHOCH of one symbol/timeframe, advanced bar by bar"""
+
+    def __init__(
+        self,
+        left: int = 3,
+        right: int = 3,
+        atr_period: int = 14,
+        bos_threshold: float = 0.2,
+        sustained_bars: int = 1,
+        max_bars: int = 500,
+        max_swings: int = 200,
+    ):
+        self.left = left
+        self.right = right
+        self.atr_period = atr_period
+        self.bos_threshold = bos_threshold
+        self.sustained_bars = sustained_bars
+        self.max_bars = max(max_bars, left + right + 1)
+        self.max_swings = max_swings
+        self.rebuilds = 0
+        self.updated_at = 0.0
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        # Closed bars, oldest first (absolute index of the first held bar = closed - len)
+        self._times: Deque[int] = deque(maxlen=self.max_bars)
+        self._highs: Deque[float] = deque(maxlen=self.max_bars)
+        self._lows: Deque[float] = deque(maxlen=self.max_bars)
+        self._closes: Deque[float] = deque(maxlen=self.max_bars)
+        self.closed = 0
+        self._forming: Optional[Tuple[int, float, float, float]] = None
+        # Epoch seconds at which the forming bar closes, if the feeder knows it
+        self.forming_closes_at: Optional[float] = None
+        # Confirmed swings {idx, ts, price, kind H/L} and their HH/HL/LH/LL labels
+        self.swings: Deque[Dict[str, Any]] = deque(maxlen=self.max_swings)
+        self.labels: Deque[Dict[str, Any]] = deque(maxlen=self.max_swings)
+        self._last_swing: Dict[str, Optional[float]] = {"H": None, "L": None}
+        # ATR of closed bars
+        self._tr: Deque[float] = deque(maxlen=self.atr_period)
+        self._tr_sum = 0.0
+        self._prev_close: Optional[float] = None
+        # BOS/CHOCH events on closed bars
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=50)
+        self._last_break: Optional[Tuple[str, float]] = None
+
+    @property
+    def bars(self) -> int:
+        """Bars seen, including the forming bar"""
+        return self.closed + (1 if self._forming is not None else 0)
+
+    @property
+    def warm(self) -> bool:
+        """Enough bars for the full left/right swing window (label_structure narrows it below this)"""
+        return self.bars >= (self.left + self.right + 1) * 2
+
+    @property
+    def atr(self) -> float:
+        return self._tr_sum / len(self._tr) if self._tr else 0.0
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def update(self, times: Optional[np.ndarray], highs, lows, closes) -> int:
+        """
+        Sync with the latest bars (oldest first, last one forming). Returns the number of
+        closed bars applied.
+        """
+        highs = np.asarray(highs, dtype=np.float64)
+        lows = np.asarray(lows, dtype=np.float64)
+        closes = np.asarray(closes, dtype=np.float64)
+        n = len(closes)
+        with self._lock:
+            if n == 0:
+                return 0
+            start = None
+            if times is not None:
+                times = np.asarray(times, dtype=np.int64)
+                if self._times:
+                    pos = int(np.searchsorted(times[:-1], self._times[-1]))
+                    if pos < n - 1 and times[pos] == self._times[-1]:
+                        start = pos + 1
+            else:
+                times = np.arange(n, dtype=np.int64)
+            if start is None:
+                self._reset()
+                self.rebuilds += 1
+                start = 0
+            for k in range(start, n - 1):
+                self._close_bar(int(times[k]), float(highs[k]), float(lows[k]), float(closes[k]))
+            self._forming = (int(times[-1]), float(highs[-1]), float(lows[-1]), float(closes[-1]))
+            self.updated_at = time.time()
+            return n - 1 - start
+
+    def update_df(self, df: pd.DataFrame) -> int:
+        """update() from a DataFrame with high/low/close (times from 'time' or the index)"""
+        if df is None or df.empty:
+            return 0
+        return self.update(bar_times(df), _safe_array(df["high"]), _safe_array(df["low"]), _safe_array(df["close"]))
+
+    def update_price(self, price: float) -> bool:
+        """
+        Move the forming bar to the latest tick price (close, and high/low if exceeded).
+        Closed bars are untouched. Returns True if the forming bar changed.
+        """
+        with self._lock:
+            if self._forming is None or not np.isfinite(price):
+                return False
+            t, high, low, close = self._forming
+            if price == close:
+                return False
+            self._forming = (t, max(high, price), min(low, price), float(price))
+            return True
+
+    def _close_bar(self, t: int, high: float, low: float, close: float):
+        if self._prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        if len(self._tr) == self._tr.maxlen:
+            self._tr_sum -= self._tr[0]
+        self._tr.append(tr)
+        self._tr_sum += tr
+        self._prev_close = close
+
+        self._times.append(t)
+        self._highs.append(high)
+        self._lows.append(low)
+        self._closes.append(close)
+        self.closed += 1
+
+        # The swing `right` bars back now has its whole window closed
+        span = self.left + self.right + 1
+        if len(self._times) >= span:
+            for swing in self._swings_in(
+                self.closed - 1 - self.right,
+                self._times[-1 - self.right],
+                _tail(self._highs, span),
+                _tail(self._lows, span),
+            ):
+                self._confirm(swing)
+
+        if self.labels:
+            result = self._bos_choch(close)
+            direction = "bull" if result["bos_bull"] else "bear" if result["bos_bear"] else None
+            if direction and self._last_break != (direction, result["break_level"]):
+                self._last_break = (direction, result["break_level"])
+                self.events.append({
+                    "idx": self.closed - 1,
+                    "ts": _epoch_seconds(t),
+                    "direction": direction,
+                    "choch": result[f"choch_{direction}"],
+                    "break_level": result["break_level"],
+                })
+
+    def _swings_in(self, i: int, t: int, highs: List[float], lows: List[float]) -> List[Dict[str, Any]]:
+        """Swings at absolute bar i from its left + 1 + right window of highs/lows"""
+        L = self.left
+        swings = []
+        h = highs[L]
+        if all(x < h for x in highs[:L]) and all(x <= h for x in highs[L + 1:]):
+            swings.append({"idx": i, "ts": _epoch_seconds(t), "price": h, "kind": "H"})
+        lo = lows[L]
+        if all(x > lo for x in lows[:L]) and all(x >= lo for x in lows[L + 1:]):
+            swings.append({"idx": i, "ts": _epoch_seconds(t), "price": lo, "kind": "L"})
+        return swings
+
+    def _confirm(self, swing: Dict[str, Any]):
+        self.swings.append(swing)
+        kind = swing["kind"]
+        prev = self._last_swing[kind]
+        self._last_swing[kind] = swing["price"]
+        if prev is None:
+            return
+        if kind == "H":
+            label = "HH" if swing["price"] > prev else "LH"
+        else:
+            label = "HL" if swing["price"] > prev else "LL"
+        self.labels.append({"idx": swing["idx"], "price": swing["price"], "kind": label})
+
+    def _bos_choch(self, close: float) -> Dict[str, Any]:
+        recent = _tail(self.labels, 5)
+        return detect_bos_choch(recent, close, self.atr, self.bos_threshold, self.sustained_bars)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def _provisional_swings(self) -> List[Dict[str, Any]]:
+        """The swing whose right window ends on the forming bar"""
+        held = self.left + self.right
+        if self._forming is None or len(self._times) < held:
+            return []
+        t, high, low, _ = self._forming
+        return self._swings_in(
+            self.closed - self.right,
+            self._times[-self.right] if self.right else t,
+            _tail(self._highs, held) + [high],
+            _tail(self._lows, held) + [low],
+        )
+
+    def recent_swings(self, lookback: int = 20) -> List[Dict[str, Any]]:
+        """Swings (confirmed + provisional) inside label_structure's symmetric window"""
+        with self._lock:
+            total = self.bars
+            start = max(0, total - int(lookback) - (self.left + self.right + 2))
+            first = start + self.left
+            swings = [s for s in self.swings if s["idx"] >= first]
+            return swings + [s for s in self._provisional_swings() if s["idx"] >= first]
+
+    def state(self, lookback: int = 10) -> Dict[str, Any]:
+        """
+        label_structure(df, lookback) keys (trend, break, micro_bias) for the tracked bars, plus
+        bos_bull/bos_bear/choch_bull/choch_bear and break_level at the forming bar's close,
+        bars_since_bos and the last BOS/CHOCH event.
+        """
+        with self._lock:
+            if self._forming is None:
+                return {"trend": "UNKNOWN", "break": False, "micro_bias": "range"}
+            close = self._forming[3]
+            swings = self.recent_swings(max(lookback, 20))
+            highs = [s for s in swings if s["kind"] == "H"]
+            lows = [s for s in swings if s["kind"] == "L"]
+
+            if len(highs) >= 2 and len(lows) >= 2:
+                trend = _trend_from_pivots(highs[-1]["price"], highs[-2]["price"], lows[-1]["price"], lows[-2]["price"])
+            else:
+                held = min(self.closed, max(int(lookback), 5) - 1)
+                tail = pd.DataFrame({
+                    "high": _tail(self._highs, held) + [self._forming[1]],
+                    "low": _tail(self._lows, held) + [self._forming[2]],
+                })
+                piv = _find_pivots(tail, lookback)
+                trend = (
+                    _trend_from_pivots(piv["last_high"], piv["prev_high"], piv["last_low"], piv["prev_low"])
+                    if piv else "RANGE"
+                )
+
+            brk = False
+            if highs and lows:
+                if trend == "UP" and close > highs[-1]["price"]:
+                    brk = True
+                if trend == "DOWN" and close < lows[-1]["price"]:
+                    brk = True
+
+            labels = label_swings(swings) if swings else []
+            state: Dict[str, Any] = {"trend": trend, "break": brk, "micro_bias": structure_bias(labels, lookback=6)}
+
+            bos = self._bos_choch(close) if self.labels else detect_bos_choch([], close, 0.0)
+            last_event = self.events[-1] if self.events else None
+            if not (bos["bos_bull"] or bos["bos_bear"]) and last_event:
+                bos["break_level"] = last_event["break_level"]
+            bos["bars_since_bos"] = (self.closed - 1 - last_event["idx"]) if last_event else -1
+            state.update(bos)
+            state["last_event"] = dict(last_event) if last_event else None
+            state["atr"] = self.atr
+            return state
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "bars": self.bars,
+            "swings": len(self.swings),
+            "labels": len(self.labels),
+            "events": len(self.events),
+            "rebuilds": self.rebuilds,
+            "updated_at": self.updated_at,
+        }
+
+
+# Shared trackers per (symbol, timeframe)
+_trackers: "OrderedDict[Tuple[str, str], StructureTracker]" = OrderedDict()
+_trackers_lock = threading.Lock()
+
+
+def get_structure_tracker(symbol: str, timeframe: str) -> StructureTracker:
+    """Shared tracker for (symbol, timeframe); least recently used beyond MAX_TRACKERS are dropped"""
+    key = (symbol, timeframe)
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = _trackers[key] = StructureTracker()
+            while len(_trackers) > MAX_TRACKERS:
+                _trackers.popitem(last=False)
+        else:
+            _trackers.move_to_end(key)
+        return tracker
+
+
+def clear_structure_trackers():
+    with _trackers_lock:
+        _trackers.clear()
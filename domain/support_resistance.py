@@ -7,6 +7,8 @@ from typing import List, Tuple, Dict, Any
 import numpy as np
 import pandas as pd
 
+from domain.level_clusters import cluster_prices
+
 
 @dataclass
 class SRZone:
@@ -36,14 +38,8 @@ def _pivots(df: pd.DataFrame, left: int, right: int) -> Tuple[np.ndarray, np.nda
 def _cluster_levels(level_prices: np.ndarray, tol: float) -> List[List[float]]:
     if len(level_prices) == 0:
         return []
-    xs = np.sort(level_prices)
-    clusters: List[List[float]] = [[xs[0]]]
-    for p in xs[1:]:
-        if abs(p - clusters[-1][-1]) <= tol:
-            clusters[-1].append(p)
-        else:
-            clusters.append([p])
-    return clusters
+    xs = np.asarray(level_prices, dtype=float)
+    return [list(xs[group]) for group in cluster_prices(xs, tol)]
 
 
 def detect_sr_zones(
@@ -0,0 +1,353 @@
+"""
+Volume Profile Engine - volume-at-price over a rolling bar window on a fixed price grid.
+
+One engine per (symbol, timeframe, window, bin size), shared by the rolling volume footprint,
+the advanced feature builder's HVN/LVN distances and the S/R snapshot's VAP weights.
+
+- Each bar spreads its volume evenly over the grid levels between its low and high
+  (levels are multiples of ``bin_size``, i.e. rounded prices)
+- Adding and evicting bars are single vectorized ``np.add.at`` passes over a batch
+- Repeated calls with the same bars only apply the new bars (and a revised forming bar);
+  bars that fall out of the window are evicted
+- POC is kept up to date as bars roll; value area, HVN/LVN and rebinned histograms are
+  computed from the occupied levels once per profile change and cached
+"""
+
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on grid levels spanned by one window (see grid_step)
+MAX_LEVELS = 2000
+MAX_PROFILES = 256
+
+
+def grid_step(price_range: float, precision: int = 4, max_levels: int = MAX_LEVELS) -> float:
+    """
+    Grid step for a window spanning ``price_range``: 10**-precision, coarsened by powers of
+    ten until the range fits in ``max_levels`` levels (so the step only changes per decade).
+    """
+    step = 10.0 ** (-precision)
+    if price_range > 0 and price_range / step > max_levels:
+        step *= 10.0 ** math.ceil(math.log10(price_range / step / max_levels))
+    return step
+
+
+def bar_times(df: pd.DataFrame) -> Optional[np.ndarray]:
+    """Bar open times as int64 (from a 'time' column or a DatetimeIndex), None if unavailable"""
+    if "time" in df.columns:
+        times = df["time"]
+    elif isinstance(df.index, pd.DatetimeIndex):
+        times = pd.Series(df.index)
+    else:
+        return None
+    if pd.api.types.is_numeric_dtype(times):
+        return times.to_numpy(dtype=np.int64)
+    stamps = pd.to_datetime(times, utc=True, errors="coerce")
+    if stamps.isna().any():
+        return None
+    return stamps.astype("int64").to_numpy()
+
+
+class VolumeProfile:
+    """Volume-at-price of the last ``window`` bars on a grid of ``bin_size`` levels"""
+
+    def __init__(self, window: int, bin_size: float, value_area_pct: float = 0.70):
+        self.window = window
+        self.bin_size = float(bin_size)
+        self.value_area_pct = value_area_pct
+        self.origin = 0                       # grid index of hist[0]
+        self.hist = np.zeros(0, dtype=np.float64)
+        # Held bars, oldest first: open time, low level, high level, volume
+        self._times = np.zeros(0, dtype=np.int64)
+        self._lo = np.zeros(0, dtype=np.int64)
+        self._hi = np.zeros(0, dtype=np.int64)
+        self._vol = np.zeros(0, dtype=np.float64)
+        self._poc: Optional[int] = None       # grid index
+        self._version = 0
+        self._derived: Dict[Any, Any] = {}
+        self._lock = threading.RLock()
+        self.rebuilds = 0
+
+    # ------------------------------------------------------------------ ingest
+
+    def update(self, times: Optional[np.ndarray], lows, highs, volumes) -> int:
+        """
+        Sync the profile with the latest bars (oldest first). Only bars after the last held
+        one are added; the last held bar is replaced if it was revised. Bars without times,
+        or bars that no longer line up with the held ones, rebuild the window.
+        Returns the number of bars applied.
+        """
+        lows = np.asarray(lows, dtype=np.float64)
+        highs = np.asarray(highs, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        n = len(lows)
+        with self._lock:
+            if n == 0:
+                return 0
+            if times is None:
+                return self._rebuild(np.arange(n, dtype=np.int64), lows, highs, volumes)
+            times = np.asarray(times, dtype=np.int64)
+            held = len(self._times)
+            if held == 0:
+                return self._rebuild(times, lows, highs, volumes)
+
+            last = self._times[-1]
+            pos = int(np.searchsorted(times, last))
+            if pos >= n or times[pos] != last:
+                return self._rebuild(times, lows, highs, volumes)
+
+            lo, hi, vol = self._levels(lows[pos:], highs[pos:], volumes[pos:])
+            applied = 0
+            if (lo[0], hi[0], vol[0]) != (self._lo[-1], self._hi[-1], self._vol[-1]):
+                self._apply(self._lo[-1:], self._hi[-1:], self._vol[-1:], -1.0)
+                self._drop_last()
+                self._append(times[pos:pos + 1], lo[:1], hi[:1], vol[:1])
+                applied += 1
+            if len(lo) > 1:
+                self._append(times[pos + 1:], lo[1:], hi[1:], vol[1:])
+                applied += len(lo) - 1
+            self._evict()
+            if len(self._times) != min(self.window, n):
+                # Held window does not match the bars given (history was extended or trimmed)
+                return self._rebuild(times, lows, highs, volumes)
+            if applied:
+                self._version += 1
+            return applied
+
+    def update_df(self, df: pd.DataFrame, volume_col: str = "volume") -> int:
+        """update() from a DataFrame with low/high/<volume_col> (times from 'time' or the index)"""
+        return self.update(bar_times(df), df["low"].to_numpy(), df["high"].to_numpy(), df[volume_col].to_numpy())
+
+    def _levels(self, lows: np.ndarray, highs: np.ndarray, volumes: np.ndarray) -> Tuple[np.ndarray, ...]:
+        vol = np.where(np.isfinite(volumes) & (volumes > 0), volumes, 0.0)
+        lows = np.where(np.isfinite(lows), lows, highs)
+        highs = np.where(np.isfinite(highs), highs, lows)
+        valid = np.isfinite(lows) & np.isfinite(highs)
+        if not valid.all():
+            # Bars without a finite price carry no volume; park them on a level the window
+            # already spans so the int64 cast cannot overflow or stretch the grid
+            if valid.any():
+                fill = lows[valid][0]
+            else:
+                fill = self._lo[-1] * self.bin_size if len(self._lo) else 0.0
+            lows = np.where(valid, lows, fill)
+            highs = np.where(valid, highs, fill)
+            vol = np.where(valid, vol, 0.0)
+        lo = np.rint(np.minimum(lows, highs) / self.bin_size).astype(np.int64)
+        hi = np.rint(np.maximum(lows, highs) / self.bin_size).astype(np.int64)
+        return lo, hi, vol
+
+    def _rebuild(self, times, lows, highs, volumes) -> int:
+        times, lows, highs, volumes = times[-self.window:], lows[-self.window:], highs[-self.window:], volumes[-self.window:]
+        lo, hi, vol = self._levels(lows, highs, volumes)
+        self.hist = np.zeros(0, dtype=np.float64)
+        self.origin = 0
+        self._times, self._lo, self._hi, self._vol = times[:0], lo[:0], hi[:0], vol[:0]
+        self._poc = None
+        self._append(times, lo, hi, vol)
+        self._version += 1
+        self.rebuilds += 1
+        return len(times)
+
+    def _append(self, times, lo, hi, vol):
+        self._times = np.concatenate([self._times, times])
+        self._lo = np.concatenate([self._lo, lo])
+        self._hi = np.concatenate([self._hi, hi])
+        self._vol = np.concatenate([self._vol, vol])
+        self._apply(lo, hi, vol, 1.0)
+
+    def _drop_last(self):
+        self._times, self._lo, self._hi, self._vol = self._times[:-1], self._lo[:-1], self._hi[:-1], self._vol[:-1]
+
+    def _evict(self):
+        extra = len(self._times) - self.window
+        if extra > 0:
+            self._apply(self._lo[:extra], self._hi[:extra], self._vol[:extra], -1.0)
+            self._times, self._lo, self._hi, self._vol = (
+                self._times[extra:], self._lo[extra:], self._hi[extra:], self._vol[extra:]
+            )
+
+    def _ensure_range(self, lo_min: int, hi_max: int):
+        """Grow (and re-centre) the grid array so it covers [lo_min, hi_max] and the held bars"""
+        end = self.origin + len(self.hist)
+        if len(self.hist) and lo_min >= self.origin and hi_max < end:
+            return
+        if len(self._lo):
+            lo_min = min(lo_min, int(self._lo.min()))
+            hi_max = max(hi_max, int(self._hi.max()))
+        pad = max(16, (hi_max - lo_min + 1) // 4)
+        origin = lo_min - pad
+        hist = np.zeros(hi_max - lo_min + 1 + 2 * pad, dtype=np.float64)
+        if len(self.hist):
+            # Copy the overlap (the held bars' levels are always inside it)
+            a, b = max(origin, self.origin), min(origin + len(hist), end)
+            if b > a:
+                hist[a - origin:b - origin] = self.hist[a - self.origin:b - self.origin]
+        self.hist, self.origin = hist, origin
+
+    def _apply(self, lo: np.ndarray, hi: np.ndarray, vol: np.ndarray, sign: float):
+        """Add (sign=1) or remove (sign=-1) bars: each level in [lo, hi] gets vol / levels"""
+        if len(lo) == 0:
+            return
+        if sign > 0:
+            self._ensure_range(int(lo.min()), int(hi.max()))
+        counts = hi - lo + 1
+        starts = np.cumsum(counts) - counts
+        offsets = np.arange(int(counts.sum()), dtype=np.int64) - np.repeat(starts, counts)
+        idx = np.repeat(lo - self.origin, counts) + offsets
+        np.add.at(self.hist, idx, np.repeat(sign * vol / counts, counts))
+
+        touched_lo, touched_hi = int(lo.min()) - self.origin, int(hi.max()) - self.origin + 1
+        if sign < 0:
+            # Clear float residue of fully evicted levels
+            segment = self.hist[touched_lo:touched_hi]
+            segment[segment <= 1e-9 * max(1.0, float(self._vol.sum()))] = 0.0
+        self._update_poc(touched_lo, touched_hi, sign)
+        self._derived = {}
+
+    def _update_poc(self, touched_lo: int, touched_hi: int, sign: float):
+        poc = None if self._poc is None else self._poc - self.origin
+        if sign > 0 and poc is not None and not (touched_lo <= poc < touched_hi):
+            # Levels only grew: the POC moves only if a touched level overtook it
+            best = touched_lo + int(np.argmax(self.hist[touched_lo:touched_hi]))
+            if self.hist[best] > self.hist[poc] or (self.hist[best] == self.hist[poc] and best < poc):
+                self._poc = best + self.origin
+            return
+        if sign < 0 and poc is not None and not (touched_lo <= poc < touched_hi):
+            return  # POC level untouched and every other touched level shrank
+        self._poc = int(np.argmax(self.hist)) + self.origin if len(self.hist) and self.hist.max() > 0 else None
+
+    # ----------------------------------------------------------------- lookups
+
+    @property
+    def bars(self) -> int:
+        return len(self._times)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def total_volume(self) -> float:
+        return float(self._vol.sum())
+
+    @property
+    def poc(self) -> Optional[float]:
+        """Price level with the most volume (lowest price on ties)"""
+        return None if self._poc is None else self._poc * self.bin_size
+
+    def _cached(self, key, compute):
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = compute()
+            return self._derived[key]
+
+    def levels(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(prices, volumes) of every level with volume, ascending price"""
+        def compute():
+            nz = np.flatnonzero(self.hist > 0)
+            return (nz + self.origin) * self.bin_size, self.hist[nz].copy()
+        return self._cached("levels", compute)
+
+    def value_area(self, pct: Optional[float] = None) -> Tuple[Optional[float], Optional[float]]:
+        """
+        (low, high) of the highest-volume levels that together hold ``pct`` of the volume
+        (default value_area_pct)
+        """
+        pct = self.value_area_pct if pct is None else pct
+
+        def compute():
+            prices, volumes = self.levels()
+            if len(prices) == 0:
+                return None, None
+            order = np.argsort(-volumes, kind="stable")
+            cum = np.cumsum(volumes[order])
+            k = min(int(np.searchsorted(cum, cum[-1] * pct)) + 1, len(order))
+            chosen = prices[order[:k]]
+            return float(chosen.min()), float(chosen.max())
+        return self._cached(("value_area", pct), compute)
+
+    def volume_at(self, price: float) -> float:
+        """Volume at the grid level of ``price``"""
+        with self._lock:
+            i = int(np.rint(price / self.bin_size)) - self.origin
+            return float(self.hist[i]) if 0 <= i < len(self.hist) else 0.0
+
+    def nodes(self, top: int = 2, bottom: int = 1, bins: int = 20,
+              price_range: Optional[Tuple[float, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        High / low volume nodes on a coarse histogram (``bins`` equal bins over the window's
+        price range): (centres of the ``top`` fullest bins, centres of the ``bottom`` emptiest)
+        """
+        def compute():
+            centres, hist = self.histogram(bins, price_range)
+            if len(hist) == 0:
+                return np.array([]), np.array([])
+            order = np.argsort(-hist, kind="stable")
+            return centres[order[:top]], centres[order[::-1][:bottom]]
+        return self._cached(("nodes", top, bottom, bins, price_range), compute)
+
+    def histogram(self, bins: int, price_range: Optional[Tuple[float, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Profile rebinned to ``bins`` equal bins over ``price_range`` (default: held lows..highs)"""
+        def compute():
+            prices, volumes = self.levels()
+            if price_range is None:
+                if len(self._lo) == 0:
+                    return np.array([]), np.array([])
+                pmin, pmax = self._lo.min() * self.bin_size, self._hi.max() * self.bin_size
+            else:
+                pmin, pmax = price_range
+            if not pmax > pmin:
+                return np.array([]), np.array([])
+            edges = np.linspace(pmin, pmax, bins + 1)
+            idx = np.clip(np.searchsorted(edges, prices, side="right") - 1, 0, bins - 1)
+            hist = np.bincount(idx, weights=volumes, minlength=bins)
+            return 0.5 * (edges[:-1] + edges[1:]), hist
+        return self._cached(("histogram", bins, price_range), compute)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "window": self.window,
+            "bars": self.bars,
+            "bin_size": self.bin_size,
+            "grid_levels": len(self.hist),
+            "version": self._version,
+            "rebuilds": self.rebuilds,
+        }
+
+
+# Shared profiles per (symbol, timeframe, window, bin size)
+_profiles: "OrderedDict[Tuple[str, str, int, float], VolumeProfile]" = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def get_volume_profile(symbol: Optional[str], timeframe: Optional[str], window: int, bin_size: float) -> VolumeProfile:
+    """
+    Shared profile for (symbol, timeframe, window, bin size); a private one if symbol or
+    timeframe is unknown. Least recently used profiles beyond MAX_PROFILES are dropped.
+    """
+    if not symbol or not timeframe:
+        return VolumeProfile(window, bin_size)
+    key = (symbol, timeframe, int(window), float(bin_size))
+    with _profiles_lock:
+        profile = _profiles.get(key)
+        if profile is None:
+            profile = _profiles[key] = VolumeProfile(window, bin_size)
+            while len(_profiles) > MAX_PROFILES:
+                _profiles.popitem(last=False)
+        else:
+            _profiles.move_to_end(key)
+        return profile
+
+
+def clear_volume_profiles():
+    with _profiles_lock:
+        _profiles.clear()
@@ -11,6 +11,8 @@ from typing import List, Optional, Tuple, Literal
 import numpy as np
 import pandas as pd
 
+from domain.level_clusters import cluster_prices
+
 try:
     # Your project style: centralised settings (safe if missing)
     from config import settings  # type: ignore
@@ -133,24 +135,13 @@ def cluster_levels(
         return []
 
     tol_bps = price_tol_bps or getattr(settings, "PRICE_TOL_BPS", 15)
-    # Sort pivots by price to cluster close prices, but we’ll keep kinds
-    piv_sorted = sorted(pivots, key=lambda p: p.price)
-    clusters: List[List[Pivot]] = []
-
-    def within(p: float, q: float) -> bool:
-        tol = _basis_points((p + q) / 2.0, tol_bps)
-        return abs(p - q) <= tol
-
-    current: List[Pivot] = [piv_sorted[0]]
-    for pv in piv_sorted[1:]:
-        ref = np.median([x.price for x in current])
-        if within(pv.price, ref):
-            current.append(pv)
-        else:
-            clusters.append(current)
-            current = [pv]
-    clusters.append(current)
-    return clusters
+    # Sweep pivots by price against the cluster's running median; a pivot joins when
+    # |p - ref| <= bps of the midpoint (p + ref) / 2, i.e. p - ref <= k / (1 - k/2) * ref
+    k = tol_bps / 10_000.0
+    groups = cluster_prices(
+        [p.price for p in pivots], k / (1.0 - k / 2.0), link="median", relative=True
+    )
+    return [[pivots[i] for i in group] for group in groups]
 
 
 def _cluster_to_zone(
@@ -8,6 +8,7 @@ import time
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 from dtms_config import get_config
+from infra.notification_gateway import get_notification_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -615,10 +616,10 @@ class DTMSActionExecutor:
         )
     
     def _send_notification(self, message: str):
-        """Send notification via Telegram"""
+        """Send notification via Telegram (queued on the notification gateway, non-blocking)"""
         try:
             if self.telegram_service:
-                self.telegram_service.send_message(message)
+                get_notification_gateway().submit_text("dtms-telegram", self.telegram_service.send_message, message)
             else:
                 logger.info(f"DTMS Notification: {message}")
         except Exception as e:
@@ -15,6 +15,7 @@ from dtms_core.signal_scorer import DTMSSignalScorer
 from dtms_core.state_machine import DTMSStateMachine, TradeState
 from dtms_core.action_executor import DTMSActionExecutor
 from dtms_config import get_config
+from infra.notification_gateway import get_notification_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -571,10 +572,10 @@ class DTMSEngine:
         return symbol.lower()
     
     def _send_notification(self, message: str):
-        """Send notification via Telegram"""
+        """Send notification via Telegram (queued on the notification gateway, non-blocking)"""
         try:
             if self.telegram_service:
-                self.telegram_service.send_message(message)
+                get_notification_gateway().submit_text("dtms-telegram", self.telegram_service.send_message, message)
             else:
                 logger.info(f"DTMS: {message}")
         except Exception as e:
@@ -9,6 +9,7 @@ import pandas as pd
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, time
 from dtms_config import get_config
+from infra.session_calendar import session_at
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,15 @@ class DTMSRegimeClassifier:
     - Structure: Range, Trend (based on BB width)
     """
     
+    # Session calendar names -> DTMS session names
+    CALENDAR_SESSIONS = {
+        'ASIAN': 'Asian',
+        'LONDON': 'London',
+        'OVERLAP': 'Overlap',
+        'NY': 'NY',
+        'POST_NY': 'Asian',
+    }
+    
     def __init__(self):
         self.config = get_config()
         
@@ -72,24 +82,8 @@ class DTMSRegimeClassifier:
     def _classify_session(self) -> str:
         """Classify current trading session"""
         try:
-            # Get current UTC time
-            utc_now = datetime.utcnow().time()
-            
-            # Check for overlap first (highest priority)
-            if self._time_in_range(utc_now, self.session_times['Overlap']):
-                return 'Overlap'
-            
-            # Check other sessions
-            for session, (start_time, end_time) in self.session_times.items():
-                if session == 'Overlap':  # Skip, already checked
-                    continue
-                
-                if self._time_in_range(utc_now, (start_time, end_time)):
-                    return session
-            
-            # Default to Asian if no match (weekend/off-hours)
-            return 'Asian'
-            
+            # Precomputed session calendar; after the NY close counts as Asian
+            return self.CALENDAR_SESSIONS.get(session_at(), 'Asian')
         except Exception as e:
             logger.error(f"Failed to classify session: {e}")
             return 'Unknown'
@@ -32,6 +32,14 @@ async def signal_status_command(update: Update, context: ContextTypes.DEFAULT_TY
         
         status_emoji = "🟢" if enabled and scanner_running else "🔴"
         
+        # Shared scan engine metrics (latency per symbol, duplicate fetches)
+        from infra.scan_engine import get_scan_engine
+        engine_stats = get_scan_engine().get_stats()
+        latency_lines = "".join(
+            f"• {sym}: {lat['last_ms']:.0f}ms (avg {lat['avg_ms']:.0f}ms)\n"
+            for sym, lat in engine_stats["latency_ms"].items()
+        )
+        
         message = (
             f"{status_emoji} **Signal Scanner Status**\n\n"
             f"**Status:** {'Active' if enabled and scanner_running else 'Inactive'}\n"
@@ -47,6 +55,11 @@ async def signal_status_command(update: Update, context: ContextTypes.DEFAULT_TY
             f"• Filters out low R:R ratios (<{min_rr})\n"
             f"• Rate limits to {max_per_hour} signals per hour\n"
             f"• Respects {cooldown}-minute cooldown between signals\n\n"
+            f"**Scan Engine:**\n"
+            f"• Scans: {engine_stats['scans']} (last {engine_stats['last_scan_ms']:.0f}ms)\n"
+            f"• Fetches: {engine_stats['fetches']} (shared: {engine_stats['shared_hits']}, "
+            f"duplicate: {engine_stats['duplicate_fetches']})\n"
+            f"{latency_lines}\n"
             f"**Commands:**\n"
             f"• `/signal_test` - Test scanner on current symbols\n"
             f"• `/signal_config` - Modify scanner settings\n"
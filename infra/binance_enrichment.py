@@ -13,11 +13,17 @@ Usage:
     enriched_m5 = enricher.enrich_timeframe("BTCUSDT", mt5_m5_data, "M5")
 """
 
+import copy
 import logging
-from typing import Dict, Optional, Any
+from threading import Lock
+from typing import Dict, Optional, Any, Tuple
 from datetime import datetime
 import numpy as np
 
+from infra.binance_tick_features import HISTORY_TICKS, compute_tick_features
+
+TICK_FIELDS = ("price", "volume", "timestamp", "open", "high", "low", "close")
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +42,9 @@ class BinanceEnrichment:
         self.binance_service = binance_service
         self.mt5_service = mt5_service
         self.order_flow_service = order_flow_service
+        # symbol -> (tick id, tick features); every timeframe of a scan reuses the same pass
+        self._feature_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._feature_lock = Lock()
         
     def enrich_timeframe(
         self,
@@ -83,50 +92,13 @@ class BinanceEnrichment:
             health = self.binance_service.get_feed_health(symbol)
             enriched['feed_health'] = health.get('overall_status', 'unknown')
             
-            # Calculate price velocity (last 5 ticks)
-            history = self.binance_service.get_history(symbol, count=5)
-            if len(history) >= 2:
-                prices = [t['price'] for t in history]
-                velocity = (prices[-1] - prices[0]) / len(prices)
-                enriched['price_velocity'] = velocity
-            else:
-                enriched['price_velocity'] = 0.0
-                
-            # Add micro momentum (last 10 ticks)
-            history = self.binance_service.get_history(symbol, count=10)
-            if len(history) >= 10:
-                prices = [t['price'] for t in history]
-                enriched['micro_momentum'] = self._calculate_micro_momentum(prices)
-            else:
-                enriched['micro_momentum'] = 0.0
-                
-            # Add real-time volume trend (last 20 ticks)
-            history = self.binance_service.get_history(symbol, count=20)
-            if len(history) >= 20:
-                volumes = [t['volume'] for t in history]
-                enriched['volume_acceleration'] = self._calculate_volume_accel(volumes)
-            else:
-                enriched['volume_acceleration'] = 0.0
+            # Tick-derived features: one vectorized pass, cached per (symbol, last tick id).
+            # Deep-copied so callers can mutate nested values (pivot_data, key_level, ...)
+            # without touching the cached pass other timeframes are served from
+            features = self._get_tick_features(symbol)
+            enriched.update(copy.deepcopy(features))
             
-            # NEW: Add more contextual data for better analysis
-            history = self.binance_service.get_history(symbol, count=30)
-            if len(history) >= 30:
-                prices = [t['price'] for t in history]
-                
-                # Price trend analysis (last 10s)
-                recent_prices = prices[-10:]
-                enriched['price_trend_10s'] = self._get_price_trend(recent_prices)
-                
-                # Price volatility
-                enriched['price_volatility'] = self._calculate_volatility(prices)
-                
-                # Volume surge detection
-                volumes = [t['volume'] for t in history]
-                enriched['volume_surge'] = self._detect_volume_surge(volumes)
-                
-                # Momentum acceleration (is momentum increasing or decreasing?)
-                enriched['momentum_acceleration'] = self._calculate_momentum_acceleration(prices)
-                
+            if 'price_trend_10s' in features:
                 # Divergence vs MT5 (if MT5 price available)
                 if 'close' in mt5_data:
                     mt5_price = mt5_data['close']
@@ -138,157 +110,22 @@ class BinanceEnrichment:
                     enriched['divergence_vs_mt5'] = False
                     enriched['divergence_pct'] = 0.0
                 
-                # Candle context (last completed candle)
-                if len(history) >= 2:
-                    last_candle = history[-2]  # Use previous candle (completed)
-                    open_price = last_candle.get('open', last_candle['price'])
-                    close_price = last_candle.get('close', last_candle['price'])
-                    high_price = last_candle.get('high', last_candle['price'])
-                    low_price = last_candle.get('low', last_candle['price'])
-                    
-                    enriched['last_candle_color'] = "GREEN" if close_price > open_price else "RED"
-                    
-                    body = abs(close_price - open_price)
-                    total_range = high_price - low_price
-                    
-                    if total_range > 0:
-                        body_pct = (body / total_range) * 100
-                        enriched['last_candle_size'] = "LARGE" if body_pct > 60 else "MEDIUM" if body_pct > 30 else "SMALL"
-                        
-                        # Wick analysis
-                        upper_wick = high_price - max(open_price, close_price)
-                        lower_wick = min(open_price, close_price) - low_price
-                        
-                        enriched['wicks'] = {
-                            'upper_wick_ratio': (upper_wick / total_range) if total_range > 0 else 0,
-                            'lower_wick_ratio': (lower_wick / total_range) if total_range > 0 else 0
-                        }
-                    else:
-                        enriched['last_candle_size'] = "DOJI"
-                        enriched['wicks'] = {'upper_wick_ratio': 0, 'lower_wick_ratio': 0}
-            
-            # 🔥 TOP 5 HIGH-VALUE ENRICHMENTS
-            if len(history) >= 30:
-                prices = [t['price'] for t in history]
-                volumes = [t['volume'] for t in history]
-                
-                # 1. Higher High / Lower Low Detection
-                hh_ll_data = self._detect_price_structure(prices)
-                enriched['price_structure'] = hh_ll_data['structure']
-                enriched['structure_strength'] = hh_ll_data['strength']
-                enriched['consecutive_structures'] = hh_ll_data['consecutive_count']
-                
-                # 2. Volatility Expansion/Contraction
-                vol_state = self._detect_volatility_state(prices)
-                enriched['volatility_state'] = vol_state['state']
-                enriched['volatility_change_pct'] = vol_state['change_pct']
-                enriched['squeeze_duration'] = vol_state.get('squeeze_duration', 0)
-                
-                # 3. Momentum Consistency
-                momentum_quality = self._calculate_momentum_consistency(prices)
-                enriched['momentum_consistency'] = momentum_quality['consistency_score']
-                enriched['consecutive_moves'] = momentum_quality['consecutive_moves']
-                enriched['momentum_quality'] = momentum_quality['quality_label']
-                
-                # 4. Spread Trend (if tick data available with bid/ask)
-                # Note: Binance kline data doesn't have bid/ask, so we'll estimate from price movement
-                spread_analysis = self._analyze_spread_proxy(prices)
-                enriched['spread_trend'] = spread_analysis['trend']
-                enriched['price_choppiness'] = spread_analysis['choppiness']
-                
-                # 5. Micro Timeframe Alignment
-                mtf_alignment = self._calculate_micro_alignment(prices)
-                enriched['micro_alignment'] = mtf_alignment['alignment']
-                enriched['micro_alignment_score'] = mtf_alignment['score']
-                enriched['alignment_strength'] = mtf_alignment['strength']
-                
-                # 🔥 PHASE 2A: 6 MORE HIGH-VALUE ENRICHMENTS
-                
-                # 6. Support/Resistance Touch Count
-                key_level = self._detect_key_level(prices)
-                if key_level:
-                    enriched['key_level'] = key_level
-                
-                # 7. Momentum Divergence (Price vs Volume)
-                divergence = self._detect_momentum_divergence(prices, volumes)
-                enriched['momentum_divergence'] = divergence['type']
-                enriched['divergence_strength'] = divergence['strength']
-                
-                # 8. Real-Time ATR
-                rt_atr = self._calculate_realtime_atr(prices)
-                enriched['binance_atr'] = rt_atr['atr']
+                # Real-Time ATR vs MT5 ATR
                 if 'atr_14' in mt5_data:
                     mt5_atr = mt5_data['atr_14']
-                    divergence_pct = ((rt_atr['atr'] - mt5_atr) / mt5_atr) * 100 if mt5_atr > 0 else 0
+                    rt_atr = features['binance_atr']
+                    divergence_pct = ((rt_atr - mt5_atr) / mt5_atr) * 100 if mt5_atr > 0 else 0
                     enriched['atr_divergence_pct'] = divergence_pct
                     enriched['atr_state'] = "HIGHER" if divergence_pct > 10 else "LOWER" if divergence_pct < -10 else "ALIGNED"
                 else:
                     enriched['atr_divergence_pct'] = 0
                     enriched['atr_state'] = "UNKNOWN"
                 
-                # 9. Bollinger Band Position
-                bb_data = self._calculate_bollinger_bands(prices)
-                enriched['bb_position'] = bb_data['position']
-                enriched['bb_width_pct'] = bb_data['width_pct']
-                enriched['bb_squeeze'] = bb_data['squeeze']
-                
-                # 10. Speed of Move
-                speed_data = self._calculate_move_speed(prices)
-                enriched['move_speed'] = speed_data['speed']
-                enriched['speed_percentile'] = speed_data['percentile']
-                enriched['speed_warning'] = speed_data['warning']
-                
-                # 11. Momentum-Volume Alignment
-                mv_alignment = self._calculate_momentum_volume_alignment(prices, volumes)
-                enriched['momentum_volume_alignment'] = mv_alignment['score']
-                enriched['mv_alignment_quality'] = mv_alignment['quality']
-                enriched['volume_confirmation'] = mv_alignment['confirmed']
-                
-                # 🔥 PHASE 2B: 7 MORE ADVANCED ENRICHMENTS
-                
-                # 12. Tick Frequency (Activity Level)
-                tick_freq = self._calculate_tick_frequency(history)
-                enriched['tick_frequency'] = tick_freq['ticks_per_sec']
-                enriched['tick_activity'] = tick_freq['activity_level']
-                enriched['tick_percentile'] = tick_freq['percentile']
-                
-                # 13. Price Z-Score (Mean Reversion)
-                z_score_data = self._calculate_price_zscore(prices)
-                enriched['price_zscore'] = z_score_data['zscore']
-                enriched['zscore_extremity'] = z_score_data['extremity']
-                enriched['mean_reversion_signal'] = z_score_data['signal']
-                
-                # 14. Pivot Points (Intraday Targets)
-                pivots = self._calculate_pivot_points(prices)
-                enriched['pivot_data'] = pivots
-                enriched['price_vs_pivot'] = pivots['position']
-                
-                # 15. Tape Reading (Aggressor Side)
-                # Note: Requires trade data with buyer_maker flag
-                # For now, we'll infer from price movement and volume
-                tape_data = self._analyze_tape_reading(prices, volumes)
-                enriched['aggressor_side'] = tape_data['aggressor']
-                enriched['aggressor_strength'] = tape_data['strength']
-                enriched['tape_dominance'] = tape_data['dominance']
-                
-                # 16. Liquidity Depth Score
-                # Uses price volatility as proxy for liquidity
-                liquidity_score = self._calculate_liquidity_score(prices, volumes)
-                enriched['liquidity_score'] = liquidity_score['score']
-                enriched['liquidity_quality'] = liquidity_score['quality']
-                enriched['execution_confidence'] = liquidity_score['exec_confidence']
-                
                 # 17. Time-of-Day Context
                 tod_context = self._get_time_of_day_context(symbol)
                 enriched['hour_of_day'] = tod_context['hour']
                 enriched['session'] = tod_context['session']
                 enriched['volatility_vs_typical'] = tod_context['vol_comparison']
-                
-                # 18. Candle Pattern Recognition
-                pattern = self._detect_candle_pattern(prices, volumes)
-                enriched['candle_pattern'] = pattern['pattern']
-                enriched['pattern_confidence'] = pattern['confidence']
-                enriched['pattern_direction'] = pattern['direction']
             
             # Add order flow data (if available)
             if self.order_flow_service and self.order_flow_service.running:
@@ -331,9 +168,91 @@ class BinanceEnrichment:
             logger.warning(f"Failed to enrich {symbol} with Binance data: {e}")
             return mt5_data.copy()
             
+    def _get_tick_features(self, symbol: str) -> Dict[str, Any]:
+        """
+        Tick-derived enrichment fields for the latest Binance ticks.
+        
+        Computed from one snapshot of the tick history in a single vectorized pass and
+        cached until a new tick arrives for the symbol. The returned dict is the cached
+        one - copy before mutating.
+        """
+        arrays = self.binance_service.get_history_arrays(symbol, count=HISTORY_TICKS, fields=TICK_FIELDS)
+        if not isinstance(arrays, dict):
+            logger.debug(f"No tick history arrays for {symbol} - skipping tick features")
+            return {}
+        
+        tick_id = arrays.get('tick_id')
+        with self._feature_lock:
+            cached = self._feature_cache.get(symbol)
+        if tick_id is not None and cached is not None and cached[0] == tick_id:
+            return cached[1]
+        
+        features = compute_tick_features(
+            arrays['price'], arrays['volume'], arrays['timestamp'],
+            arrays['open'], arrays['high'], arrays['low'], arrays['close']
+        )
+        if tick_id is not None:
+            with self._feature_lock:
+                self._feature_cache[symbol] = (tick_id, features)
+        return features
+    
+    def _get_time_of_day_context(self, symbol: str) -> dict:
+        """
+        Get time-of-day context for volatility expectations.
+        
+        Returns:
+            {
+                'hour': int,
+                'session': "ASIAN" | "LONDON" | "NY" | "OFF_HOURS",
+                'vol_comparison': "HIGHER" | "NORMAL" | "LOWER"
+            }
+        """
+        from datetime import datetime
+        
+        now = datetime.utcnow()
+        hour = now.hour
+        
+        # Determine session (UTC times)
+        # Asian: 00:00-08:00, London: 08:00-16:00, NY: 13:00-21:00, Off: 21:00-00:00
+        if 0 <= hour < 8:
+            session = "ASIAN"
+        elif 8 <= hour < 13:
+            session = "LONDON"
+        elif 13 <= hour < 21:
+            session = "NY"
+        else:
+            session = "OFF_HOURS"
+        
+        # For simplicity, assume NY session has highest volatility
+        # In production, this would reference historical data
+        if session == "NY":
+            vol_comparison = "HIGHER"
+        elif session == "LONDON":
+            vol_comparison = "NORMAL"
+        elif session == "ASIAN":
+            vol_comparison = "LOWER"
+        else:
+            vol_comparison = "LOWER"
+        
+        return {
+            'hour': hour,
+            'session': session,
+            'vol_comparison': vol_comparison
+        }
+    
+    # ------------------------------------------------------------------
+    # Reference implementations (test oracles only)
+    #
+    # Production reads every tick-derived field from _get_tick_features()
+    # (infra/binance_tick_features.py). The per-feature list helpers below are
+    # the original, straightforward computations; tests compare the vectorized
+    # features against them. Do not call them from production code - change
+    # compute_tick_features() and keep these in step instead.
+    # ------------------------------------------------------------------
+    
     def _calculate_micro_momentum(self, prices: list) -> float:
         """
-        Calculate micro-momentum from recent price history.
+        Calculate micro-momentum from recent price history (test oracle).
         
         Returns:
             Positive = bullish momentum, Negative = bearish momentum
@@ -1315,50 +1234,6 @@ class BinanceEnrichment:
             'exec_confidence': exec_confidence
         }
     
-    def _get_time_of_day_context(self, symbol: str) -> dict:
-        """
-        Get time-of-day context for volatility expectations.
-        
-        Returns:
-            {
-                'hour': int,
-                'session': "ASIAN" | "LONDON" | "NY" | "OFF_HOURS",
-                'vol_comparison': "HIGHER" | "NORMAL" | "LOWER"
-            }
-        """
-        from datetime import datetime
-        
-        now = datetime.utcnow()
-        hour = now.hour
-        
-        # Determine session (UTC times)
-        # Asian: 00:00-08:00, London: 08:00-16:00, NY: 13:00-21:00, Off: 21:00-00:00
-        if 0 <= hour < 8:
-            session = "ASIAN"
-        elif 8 <= hour < 13:
-            session = "LONDON"
-        elif 13 <= hour < 21:
-            session = "NY"
-        else:
-            session = "OFF_HOURS"
-        
-        # For simplicity, assume NY session has highest volatility
-        # In production, this would reference historical data
-        if session == "NY":
-            vol_comparison = "HIGHER"
-        elif session == "LONDON":
-            vol_comparison = "NORMAL"
-        elif session == "ASIAN":
-            vol_comparison = "LOWER"
-        else:
-            vol_comparison = "LOWER"
-        
-        return {
-            'hour': hour,
-            'session': session,
-            'vol_comparison': vol_comparison
-        }
-    
     def _detect_candle_pattern(self, prices: list, volumes: list) -> dict:
         """
         Detect classic candle patterns.
@@ -1439,14 +1314,12 @@ class BinanceEnrichment:
             return True, "Binance not available - using MT5 only"
             
         try:
-            # Get recent price history
-            history = self.binance_service.get_history(symbol, count=10)
-            
-            if len(history) < 10:
+            # Micro momentum over the last 10 ticks, from the cached tick features
+            arrays = self.binance_service.get_history_arrays(symbol, count=10, fields=("price",))
+            if not isinstance(arrays, dict) or len(arrays['price']) < 10:
                 return True, "Insufficient Binance data"
                 
-            prices = [t['price'] for t in history]
-            momentum = self._calculate_micro_momentum(prices)
+            momentum = self._get_tick_features(symbol)['micro_momentum']
             
             if mt5_signal == "BUY":
                 if momentum > threshold:
@@ -1487,26 +1360,15 @@ class BinanceEnrichment:
                 
             health = self.binance_service.get_feed_health(symbol)
             
-            # Get recent history for advanced metrics
-            history = self.binance_service.get_history(symbol, count=30)
-            momentum = 0.0
-            trend = "UNKNOWN"
-            volatility = 0.0
-            volume_surge = False
-            momentum_accel = 0.0
-            
-            if len(history) >= 10:
-                prices = [t['price'] for t in history]
-                momentum = self._calculate_micro_momentum(prices)
-                
-                if len(history) >= 30:
-                    trend = self._get_price_trend(prices[-10:])
-                    volatility = self._calculate_volatility(prices)
-                    momentum_accel = self._calculate_momentum_acceleration(prices)
-                    
-                    volumes = [t['volume'] for t in history]
-                    volume_surge = self._detect_volume_surge(volumes)
-                
+            # Advanced metrics come from the same cached tick features as enrich_timeframe
+            features = self._get_tick_features(symbol)
+            full_history = 'price_trend_10s' in features  # Main block needs HISTORY_TICKS ticks
+            momentum = features.get('micro_momentum', 0.0)
+            trend = features.get('price_trend_10s', "UNKNOWN")
+            volatility = features.get('price_volatility', 0.0)
+            volume_surge = features.get('volume_surge', False)
+            momentum_accel = features.get('momentum_acceleration', 0.0)
+
             status_emoji = {
                 "healthy": "✅",
                 "warning": "⚠️",
@@ -1534,12 +1396,9 @@ class BinanceEnrichment:
                 summary += f"\n  🔥 Volume Surge Detected"
             
             # 🔥 NEW: Add Top 5 enrichment fields
-            if len(history) >= 30:
-                prices = [t['price'] for t in history]
-                
+            if full_history:
                 # 1. Price Structure
-                structure_data = self._detect_price_structure(prices)
-                structure = structure_data['structure']
+                structure = features['price_structure']
                 structure_emoji = {
                     "HIGHER_HIGH": "📈⬆️",
                     "HIGHER_LOW": "📈🔼",
@@ -1550,52 +1409,47 @@ class BinanceEnrichment:
                 }.get(structure, "❓")
                 
                 if structure not in ["UNKNOWN", "CHOPPY"]:
-                    consecutive = structure_data['consecutive_count']
+                    consecutive = features['consecutive_structures']
                     summary += f"\n\n🎯 Market Structure:\n"
                     summary += f"  {structure_emoji} {structure.replace('_', ' ')} ({consecutive}x)"
                 
                 # 2. Volatility State
-                vol_state_data = self._detect_volatility_state(prices)
-                vol_state = vol_state_data['state']
+                vol_state = features['volatility_state']
                 if vol_state != "UNKNOWN":
                     vol_emoji = "💥" if vol_state == "EXPANDING" else "🔐" if vol_state == "CONTRACTING" else "⚖️"
-                    vol_change = vol_state_data['change_pct']
+                    vol_change = features['volatility_change_pct']
                     summary += f"\n  {vol_emoji} Volatility: {vol_state} ({vol_change:+.1f}%)"
                     
-                    if vol_state == "CONTRACTING" and vol_state_data.get('squeeze_duration', 0) > 20:
-                        summary += f" 🔥 {vol_state_data['squeeze_duration']}s squeeze!"
+                    if vol_state == "CONTRACTING" and features.get('squeeze_duration', 0) > 20:
+                        summary += f" 🔥 {features['squeeze_duration']}s squeeze!"
                 
                 # 3. Momentum Quality
-                mom_quality = self._calculate_momentum_consistency(prices)
-                quality_label = mom_quality['quality_label']
+                quality_label = features['momentum_quality']
                 if quality_label != "UNKNOWN":
                     quality_emoji = "✅" if quality_label == "EXCELLENT" else "🟢" if quality_label == "GOOD" else "🟡" if quality_label == "FAIR" else "🔴"
-                    summary += f"\n  {quality_emoji} Momentum: {quality_label} ({mom_quality['consistency_score']}%)"
-                    if mom_quality['consecutive_moves'] >= 5:
-                        summary += f" 🔥 {mom_quality['consecutive_moves']} consecutive!"
+                    summary += f"\n  {quality_emoji} Momentum: {quality_label} ({features['momentum_consistency']}%)"
+                    if features['consecutive_moves'] >= 5:
+                        summary += f" 🔥 {features['consecutive_moves']} consecutive!"
                 
                 # 4. Spread Proxy (Choppiness)
-                spread_data = self._analyze_spread_proxy(prices)
-                if spread_data['choppiness'] > 70:
-                    summary += f"\n  🌀 High Choppiness: {spread_data['choppiness']}/100 (Spread: {spread_data['trend']})"
-                elif spread_data['trend'] == "NARROWING":
+                if features['price_choppiness'] > 70:
+                    summary += f"\n  🌀 High Choppiness: {features['price_choppiness']}/100 (Spread: {features['spread_trend']})"
+                elif features['spread_trend'] == "NARROWING":
                     summary += f"\n  ✅ Spread Narrowing (Good liquidity)"
                 
                 # 5. Micro Alignment
-                alignment_data = self._calculate_micro_alignment(prices)
-                if alignment_data['score'] >= 67:
-                    strength = alignment_data['strength']
-                    score = alignment_data['score']
-                    alignment = alignment_data['alignment']
+                if features['micro_alignment_score'] >= 67:
+                    strength = features['alignment_strength']
+                    score = features['micro_alignment_score']
+                    alignment = features['micro_alignment']
                     
                     summary += f"\n  🎯 Micro Alignment: {strength} ({score}%)"
                     summary += f"\n     3s:{alignment['3s'][0]} 10s:{alignment['10s'][0]} 30s:{alignment['30s'][0]}"
                 
                 # 🔥 PHASE 2A: Show key advanced signals
-                volumes = [t['volume'] for t in history]
                 
                 # 6. Key Level (if detected)
-                key_level = self._detect_key_level(prices)
+                key_level = features.get('key_level')
                 if key_level:
                     level_emoji = "🎯" if key_level['type'] == 'resistance' else "🛡️"
                     strength_emoji = "💪" if key_level['strength'] == 'strong' else "🤏"
@@ -1606,71 +1460,70 @@ class BinanceEnrichment:
                         summary += f" 🔥 Fresh!"
                 
                 # 7. Momentum Divergence (if detected)
-                divergence = self._detect_momentum_divergence(prices, volumes)
-                if divergence['type'] != "NONE":
-                    div_emoji = "🟢⬆️" if divergence['type'] == "BULLISH" else "🔴⬇️"
-                    summary += f"\n  {div_emoji} {divergence['type']} Divergence ({divergence['strength']}%)"
+                divergence_type = features['momentum_divergence']
+                if divergence_type != "NONE":
+                    div_emoji = "🟢⬆️" if divergence_type == "BULLISH" else "🔴⬇️"
+                    summary += f"\n  {div_emoji} {divergence_type} Divergence ({features['divergence_strength']}%)"
                 
                 # 8. Real-Time ATR comparison
-                rt_atr = self._calculate_realtime_atr(prices)
                 # Will show ATR divergence in main analysis if MT5 data available
                 
                 # 9. Bollinger Bands (if extreme)
-                bb_data = self._calculate_bollinger_bands(prices)
-                if bb_data['position'] in ["OUTSIDE_UPPER", "OUTSIDE_LOWER"]:
-                    bb_emoji = "🔴" if bb_data['position'] == "OUTSIDE_UPPER" else "🟢"
-                    summary += f"\n  {bb_emoji} Bollinger: {bb_data['position'].replace('_', ' ')}"
-                elif bb_data['squeeze']:
-                    summary += f"\n  🔐 Bollinger Squeeze ({bb_data['width_pct']:.2f}% width) 🔥"
+                bb_position = features['bb_position']
+                if bb_position in ["OUTSIDE_UPPER", "OUTSIDE_LOWER"]:
+                    bb_emoji = "🔴" if bb_position == "OUTSIDE_UPPER" else "🟢"
+                    summary += f"\n  {bb_emoji} Bollinger: {bb_position.replace('_', ' ')}"
+                elif features['bb_squeeze']:
+                    summary += f"\n  🔐 Bollinger Squeeze ({features['bb_width_pct']:.2f}% width) 🔥"
                 
                 # 10. Speed Warning (if parabolic)
-                speed_data = self._calculate_move_speed(prices)
-                if speed_data['warning']:
-                    summary += f"\n  ⚠️ PARABOLIC Move ({speed_data['percentile']}th percentile) - Don't chase!"
-                elif speed_data['speed'] == "FAST":
-                    summary += f"\n  🚀 Fast Move ({speed_data['percentile']}th percentile)"
+                if features['speed_warning']:
+                    summary += f"\n  ⚠️ PARABOLIC Move ({features['speed_percentile']}th percentile) - Don't chase!"
+                elif features['move_speed'] == "FAST":
+                    summary += f"\n  🚀 Fast Move ({features['speed_percentile']}th percentile)"
                 
                 # 11. Volume Confirmation
-                mv_alignment = self._calculate_momentum_volume_alignment(prices, volumes)
-                if mv_alignment['quality'] in ["STRONG", "WEAK"]:
-                    mv_emoji = "✅" if mv_alignment['quality'] == "STRONG" else "⚠️"
-                    summary += f"\n  {mv_emoji} Volume Confirmation: {mv_alignment['quality']} ({mv_alignment['score']}%)"
+                mv_quality = features['mv_alignment_quality']
+                if mv_quality in ["STRONG", "WEAK"]:
+                    mv_emoji = "✅" if mv_quality == "STRONG" else "⚠️"
+                    summary += f"\n  {mv_emoji} Volume Confirmation: {mv_quality} ({features['momentum_volume_alignment']}%)"
                 
                 # 🔥 PHASE 2B: Show advanced enrichments
                 
                 # 12. Tick Frequency (if unusual)
-                tick_freq = self._calculate_tick_frequency(history)
-                if tick_freq['activity_level'] in ["VERY_HIGH", "LOW"]:
-                    freq_emoji = "🔥" if tick_freq['activity_level'] == "VERY_HIGH" else "🐌"
-                    summary += f"\n  {freq_emoji} Activity: {tick_freq['activity_level']} ({tick_freq['ticks_per_sec']}/s)"
+                activity = features['tick_activity']
+                if activity in ["VERY_HIGH", "LOW"]:
+                    freq_emoji = "🔥" if activity == "VERY_HIGH" else "🐌"
+                    summary += f"\n  {freq_emoji} Activity: {activity} ({features['tick_frequency']}/s)"
                 
                 # 13. Price Z-Score (if extreme)
-                z_score_data = self._calculate_price_zscore(prices)
-                if z_score_data['signal'] != "NEUTRAL":
-                    zscore_emoji = "🔴" if z_score_data['signal'] == "OVERBOUGHT" else "🟢"
-                    summary += f"\n  {zscore_emoji} Z-Score: {z_score_data['extremity']} ({z_score_data['zscore']}σ) - {z_score_data['signal']}"
+                zscore_signal = features['mean_reversion_signal']
+                if zscore_signal != "NEUTRAL":
+                    zscore_emoji = "🔴" if zscore_signal == "OVERBOUGHT" else "🟢"
+                    summary += f"\n  {zscore_emoji} Z-Score: {features['zscore_extremity']} ({features['price_zscore']}σ) - {zscore_signal}"
                 
                 # 14. Pivot Points (if near extremes)
-                pivots = self._calculate_pivot_points(prices)
-                if pivots['position'] in ["ABOVE_R2", "BELOW_S2"]:
+                pivots = features['pivot_data']
+                pivot_position = features['price_vs_pivot']
+                if pivot_position in ["ABOVE_R2", "BELOW_S2"]:
                     pivot_emoji = "🎯"
-                    summary += f"\n  {pivot_emoji} Pivot: {pivots['position'].replace('_', ' ')}"
-                    if pivots['position'] == "ABOVE_R2":
+                    summary += f"\n  {pivot_emoji} Pivot: {pivot_position.replace('_', ' ')}"
+                    if pivot_position == "ABOVE_R2":
                         summary += f" (Resistance 2: ${pivots['r2']:,.2f})"
                     else:
                         summary += f" (Support 2: ${pivots['s2']:,.2f})"
                 
                 # 15. Tape Reading (if strong dominance)
-                tape_data = self._analyze_tape_reading(prices, volumes)
-                if tape_data['dominance'] == "STRONG":
-                    tape_emoji = "🟢💪" if tape_data['aggressor'] == "BUYERS" else "🔴💪"
-                    summary += f"\n  {tape_emoji} Tape: {tape_data['aggressor']} DOMINATING ({tape_data['strength']}%)"
+                if features['tape_dominance'] == "STRONG":
+                    aggressor = features['aggressor_side']
+                    tape_emoji = "🟢💪" if aggressor == "BUYERS" else "🔴💪"
+                    summary += f"\n  {tape_emoji} Tape: {aggressor} DOMINATING ({features['aggressor_strength']}%)"
                 
                 # 16. Liquidity Score (if poor)
-                liquidity_score = self._calculate_liquidity_score(prices, volumes)
-                if liquidity_score['quality'] in ["EXCELLENT", "POOR"]:
-                    liq_emoji = "✅" if liquidity_score['quality'] == "EXCELLENT" else "⚠️"
-                    summary += f"\n  {liq_emoji} Liquidity: {liquidity_score['quality']} ({liquidity_score['score']}/100) - Execution: {liquidity_score['exec_confidence']}"
+                liq_quality = features['liquidity_quality']
+                if liq_quality in ["EXCELLENT", "POOR"]:
+                    liq_emoji = "✅" if liq_quality == "EXCELLENT" else "⚠️"
+                    summary += f"\n  {liq_emoji} Liquidity: {liq_quality} ({features['liquidity_score']}/100) - Execution: {features['execution_confidence']}"
                 
                 # 17. Time-of-Day Context (show session)
                 tod_context = self._get_time_of_day_context(symbol)
@@ -1683,10 +1536,11 @@ class BinanceEnrichment:
                 summary += f"\n  {session_emoji} Session: {tod_context['session']} ({tod_context['hour']:02d}:00 UTC)"
                 
                 # 18. Candle Pattern (if detected)
-                pattern = self._detect_candle_pattern(prices, volumes)
-                if pattern['pattern'] != "NONE":
-                    pattern_emoji = "🟢" if pattern['direction'] == "BULLISH" else "🔴" if pattern['direction'] == "BEARISH" else "⚪"
-                    summary += f"\n  {pattern_emoji} Pattern: {pattern['pattern'].replace('_', ' ')} ({pattern['confidence']}% confidence)"
+                pattern = features['candle_pattern']
+                if pattern != "NONE":
+                    direction = features['pattern_direction']
+                    pattern_emoji = "🟢" if direction == "BULLISH" else "🔴" if direction == "BEARISH" else "⚪"
+                    summary += f"\n  {pattern_emoji} Pattern: {pattern.replace('_', ' ')} ({features['pattern_confidence']}% confidence)"
             
             summary += f"\n\n  ⏱️ Age: {health.get('cache', {}).get('age_seconds', 0):.1f}s"
             summary += f"\n  🔄 Offset: {health.get('sync', {}).get('offset', 'N/A')}"
@@ -25,7 +25,7 @@ Usage:
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import sys
 import codecs
 
@@ -269,6 +269,22 @@ class BinanceService:
             
         return self.cache.get_history(symbol, count)
         
+    def get_history_arrays(self, symbol: str, count: int = 200,
+                           fields=("price", "volume", "timestamp")) -> Dict[str, Any]:
+        """
+        Recent history as NumPy arrays (read-only views into the cache) plus the id
+        of the latest tick.
+        
+        Returns:
+            {field: np.ndarray, ..., "tick_id": int | None}
+        """
+        if symbol.endswith(('c', 'C')):
+            symbol = self._convert_to_binance_symbol(symbol)
+        else:
+            symbol = symbol.upper()
+            
+        return self.cache.get_arrays(symbol, count, fields)
+        
     def validate_execution(
         self,
         symbol: str,
@@ -11,6 +11,10 @@ Calculates advanced order flow metrics from Binance WebSocket data:
 
 All calculations use in-memory data only (no database writes).
 Resource efficient - uses existing Binance streaming data.
+
+While aggTrades are flowing (OrderFlowService trade listener -> process_aggtrade), an
+OrderFlowBarEngine per symbol keeps bars, CVD, slope, divergence and pressure windows up
+to date, and get_metrics() reads them instead of re-bucketing the trade history.
 """
 
 import logging
@@ -31,6 +35,14 @@ except ImportError:
     TICK_ENGINE_AVAILABLE = False
     logger.debug("TickByTickDeltaEngine not available (will use fallback)")
 
+# Incremental bar engine (fed per aggTrade)
+try:
+    from infra.order_flow_bar_engine import T_BUY, T_CVD, T_SELL, OrderFlowBarEngine, divergence_strength
+    BAR_ENGINE_AVAILABLE = True
+except ImportError:
+    BAR_ENGINE_AVAILABLE = False
+    logger.debug("OrderFlowBarEngine not available (will recompute from trade history)")
+
 # Phase 1.3: Import delta divergence detector
 try:
     from infra.delta_divergence_detector import DeltaDivergenceDetector
@@ -120,10 +132,16 @@ class BTCOrderFlowMetrics:
         
         # Bar aggregation settings
         self.bar_interval_seconds = 60  # 1-minute bars for aggregation
+        self.volume_bar_size = 10.0  # Traded quantity per volume (delta) bar
         
         # Phase 1.1: Tick-by-tick delta engines (one per symbol)
         self.tick_engines: Dict[str, 'TickByTickDeltaEngine'] = {}  # symbol -> engine
         
+        # Incremental bar engines (one per symbol), fed by the order flow service's trade stream
+        self.bar_engines: Dict[str, 'OrderFlowBarEngine'] = {}  # symbol -> engine
+        self._trade_feed_service = None
+        self._attach_trade_feed()
+        
         # Phase 4.1: Metrics caching for performance optimization
         self._metrics_cache: Dict[str, tuple] = {}  # cache_key -> (metrics, timestamp)
         self._cache_ttl = 5  # 5 seconds cache TTL
@@ -143,6 +161,51 @@ class BTCOrderFlowMetrics:
         if TICK_ENGINE_AVAILABLE:
             logger.info("   Phase 1.1: Tick-by-tick delta engine available")
     
+    def _attach_trade_feed(self) -> bool:
+        """
+        Subscribe process_aggtrade() to the order flow service's trade stream.
+        
+        Safe to call repeatedly (e.g. after the service is attached lazily); subscribes once
+        per service instance.
+        
+        Returns:
+            True if trades are being fed, False otherwise
+        """
+        service = self.order_flow_service
+        if service is None or not hasattr(service, 'add_trade_listener'):
+            return False
+        if self._trade_feed_service is service:
+            return True
+        try:
+            service.add_trade_listener(self.process_aggtrade)
+            self._trade_feed_service = service
+            logger.debug("BTCOrderFlowMetrics subscribed to aggTrade stream")
+            return True
+        except Exception as e:
+            logger.debug(f"Could not subscribe to aggTrade stream: {e}")
+            return False
+    
+    def _get_bar_engine(self, symbol: str) -> Optional['OrderFlowBarEngine']:
+        """Bar engine for a symbol, created on its first trade"""
+        if not BAR_ENGINE_AVAILABLE:
+            return None
+        engine = self.bar_engines.get(symbol)
+        if engine is None:
+            engine = OrderFlowBarEngine(
+                symbol=symbol,
+                bar_interval_seconds=self.bar_interval_seconds,
+                volume_bar_size=self.volume_bar_size
+            )
+            self.bar_engines[symbol] = engine
+        return engine
+    
+    def _live_bar_engine(self, symbol: str) -> Optional['OrderFlowBarEngine']:
+        """Bar engine for a symbol if it is receiving trades, else None (fall back to trade history)"""
+        engine = self.bar_engines.get(symbol)
+        if engine is not None and engine.is_live():
+            return engine
+        return None
+    
     def initialize_tick_engine(self, symbol: str) -> bool:
         """
         Initialize tick-by-tick delta engine for a symbol.
@@ -155,6 +218,9 @@ class BTCOrderFlowMetrics:
         Returns:
             True if initialized successfully, False otherwise
         """
+        # Order flow service may have been attached after __init__
+        self._attach_trade_feed()
+        
         if not TICK_ENGINE_AVAILABLE:
             logger.debug(f"Tick engine not available for {symbol}")
             return False
@@ -197,6 +263,10 @@ class BTCOrderFlowMetrics:
         Returns:
             DeltaMetrics dict or None
         """
+        bar_engine = self._get_bar_engine(symbol)
+        if bar_engine is not None:
+            bar_engine.process_aggtrade(trade_data)
+        
         if not TICK_ENGINE_AVAILABLE:
             return None
         
@@ -259,6 +329,11 @@ class BTCOrderFlowMetrics:
             return None
         
         try:
+            # Live bar engine: pressure, CVD and divergence are kept up to date per trade
+            bar_engine = self._live_bar_engine(symbol)
+            if bar_engine is not None:
+                return self._metrics_from_bar_engine(symbol, bar_engine, window_seconds)
+            
             # 1. Get buy/sell pressure (already implemented)
             pressure_data = self.order_flow_service.get_buy_sell_pressure(symbol, window_seconds)
             if not pressure_data:
@@ -351,6 +426,39 @@ class BTCOrderFlowMetrics:
             logger.error(f"Error calculating order flow metrics for {symbol}: {e}", exc_info=True)
             return None
     
+    def _metrics_from_bar_engine(self, symbol: str, engine: 'OrderFlowBarEngine',
+                                 window_seconds: int) -> Optional[OrderFlowMetrics]:
+        """
+        Build OrderFlowMetrics from a live bar engine.
+        
+        Pressure comes from the engine's sub-second buckets, CVD/slope from its time bars and
+        divergence from the state updated at each bar close - no trade history is scanned.
+        """
+        pressure_data = engine.pressure(window_seconds)
+        if not pressure_data:
+            logger.debug(f"No trades for {symbol} in the last {window_seconds}s")
+            return None
+        
+        cvd_state = engine.cvd_state(self.cvd_slope_period)
+        divergence = engine.divergence()
+        
+        return OrderFlowMetrics(
+            symbol=symbol,
+            timestamp=time.time(),
+            delta_volume=pressure_data["net_volume"],
+            buy_volume=pressure_data["buy_volume"],
+            sell_volume=pressure_data["sell_volume"],
+            cvd=cvd_state["cvd"],
+            cvd_slope=cvd_state["slope"],
+            cvd_divergence_strength=divergence["strength"],
+            cvd_divergence_type=divergence["type"],
+            absorption_zones=self._detect_absorption_zones(symbol),
+            buy_sell_pressure=pressure_data["pressure"],
+            dominant_side=pressure_data["dominant_side"],
+            window_seconds=window_seconds,
+            bar_count=engine.bar_count()
+        )
+    
     def _calculate_cvd(self, symbol: str) -> Optional[Dict]:
         """
         Calculate CVD (Cumulative Volume Delta) from aggregated bars.
@@ -363,6 +471,19 @@ class BTCOrderFlowMetrics:
         Returns:
             {"cvd": float, "slope": float, "bar_count": int} or None
         """
+        bar_engine = self._live_bar_engine(symbol)
+        if bar_engine is not None:
+            bars = bar_engine.bars()
+            cvd_state = bar_engine.cvd_state(self.cvd_slope_period)
+            bar_deltas = bars[:, T_BUY] - bars[:, T_SELL]
+            return {
+                "cvd": cvd_state["cvd"],
+                "slope": cvd_state["slope"],
+                "bar_count": len(bars),
+                "bar_deltas": bar_deltas.tolist(),
+                "cvd_values": bars[:, T_CVD].tolist()
+            }
+        
         if not self.order_flow_service:
             return None
         
@@ -510,6 +631,11 @@ class BTCOrderFlowMetrics:
             {"strength": float (0-1), "type": "bearish"/"bullish"/None} or None
         """
         try:
+            # Live bar engine: divergence of its own price/CVD bars, updated at each bar close
+            bar_engine = self._live_bar_engine(symbol)
+            if bar_engine is not None:
+                return bar_engine.divergence()
+            
             # Phase 1.2: Try to use tick engine CVD history first (more accurate)
             tick_engine = self.tick_engines.get(symbol)
             if tick_engine and hasattr(tick_engine, 'get_cvd_history'):
@@ -665,18 +791,14 @@ class BTCOrderFlowMetrics:
             return 0.0
         
         try:
-            # Calculate how opposite the trends are
+            # Higher strength when both price and CVD have significant opposite movements
+            if BAR_ENGINE_AVAILABLE:
+                return divergence_strength(price_points, cvd_points)
             price_change = abs(price_points[-1][1] - price_points[-2][1])
             cvd_change = abs(cvd_points[-1][1] - cvd_points[-2][1])
-            
-            # Normalize to 0-1
             if price_change == 0:
                 return 0.0
-            
-            # Strength based on relative change
-            # Higher strength when both price and CVD have significant opposite movements
-            strength = min(1.0, (price_change + cvd_change) / (price_change * 2))
-            return strength
+            return min(1.0, (price_change + cvd_change) / (price_change * 2))
             
         except Exception as e:
             logger.debug(f"Error calculating divergence strength: {e}")
@@ -731,17 +853,24 @@ class BTCOrderFlowMetrics:
             return zones
         
         try:
-            # Get order book data
-            signal = self.order_flow_service.get_order_flow_signal(symbol)
-            if not signal or not signal.get("order_book"):
+            bar_engine = self._live_bar_engine(symbol)
+            if bar_engine is not None:
+                # Only the book imbalance is needed - skip the full signal (whales, pressure scans)
+                order_book = self._get_order_book_imbalance(symbol)
+            else:
+                signal = self.order_flow_service.get_order_flow_signal(symbol)
+                order_book = signal.get("order_book") if signal else None
+            if not order_book:
                 return zones
             
-            order_book = signal["order_book"]
             imbalance = order_book.get("imbalance", 1.0)
             imbalance_pct = order_book.get("imbalance_pct", 0.0)
             
             # Get recent trade volume
-            pressure_data = self.order_flow_service.get_buy_sell_pressure(symbol, window=60)
+            if bar_engine is not None:
+                pressure_data = bar_engine.pressure(60)
+            else:
+                pressure_data = self.order_flow_service.get_buy_sell_pressure(symbol, window=60)
             if not pressure_data:
                 return zones
             
@@ -787,6 +916,15 @@ class BTCOrderFlowMetrics:
             logger.error(f"Error detecting absorption zones for {symbol}: {e}", exc_info=True)
             return zones
     
+    def _get_order_book_imbalance(self, symbol: str) -> Optional[Dict]:
+        """Order book imbalance as in OrderFlowAnalyzer.get_order_flow_signal()['order_book']"""
+        depth_analyzer = self.order_flow_service.analyzer.depth_analyzer
+        imbalance = depth_analyzer.calculate_imbalance(symbol, levels=5)
+        liquidity = depth_analyzer.get_total_liquidity(symbol, levels=10)
+        if not imbalance or not liquidity:
+            return None
+        return {"imbalance": imbalance, "imbalance_pct": (imbalance - 1) * 100}
+    
     def _calculate_delta_divergence(self, symbol: str, current_delta: float) -> Optional[Dict]:
         """
         Calculate delta divergence (price trend vs delta trend).
@@ -803,6 +941,11 @@ class BTCOrderFlowMetrics:
         if not DELTA_DIVERGENCE_DETECTOR_AVAILABLE:
             return None
         
+        # Live bar engine: price and delta come from the same bars, checked at each bar close
+        bar_engine = self._live_bar_engine(symbol)
+        if bar_engine is not None:
+            return bar_engine.delta_divergence()
+        
         try:
             # Get price bars from MT5
             if not self.mt5_service:
@@ -854,14 +997,18 @@ class BTCOrderFlowMetrics:
         Returns:
             Price movement (absolute change) or None if unavailable
         """
+        # Get M1 bars covering the window (window/60 bars, minimum 10)
+        bars_needed = max(10, int(window / 60) + 1)
+        bar_engine = self._live_bar_engine(symbol)
+        if bar_engine is not None and bar_engine.bar_count() >= bars_needed:
+            return bar_engine.price_range(bars_needed)
+        
         try:
             # Get price bars from MT5
             if not self.mt5_service:
                 return None
             
             mt5_symbol = symbol.replace("USDT", "USDc")
-            # Get M1 bars covering the window (window/60 bars, minimum 10)
-            bars_needed = max(10, int(window / 60) + 1)
             m1_bars_df = self.mt5_service.get_bars(mt5_symbol, "M1", bars_needed)
             
             if m1_bars_df is None or len(m1_bars_df) < 2:
@@ -932,6 +1079,13 @@ class BTCOrderFlowMetrics:
         Returns:
             ATR value or None if unavailable
         """
+        # Live bar engine: same high-low average over its own 1-minute bars
+        bar_engine = self._live_bar_engine(symbol)
+        if bar_engine is not None:
+            atr = bar_engine.average_range(14)
+            if atr is not None:
+                return atr
+        
         try:
             if not self.mt5_service:
                 return None
@@ -0,0 +1,181 @@
+"""
+Candle Encoding
+Columnar OHLCV payloads, compact binary encodings and conditional-fetch helpers for
+the candle endpoints (/streamer/candles, /api/v1/candles) and their HTTP clients.
+
+- Columnar layout: one array per field instead of one JSON object per bar
+- Content negotiation: application/json (default), application/x-msgpack,
+  application/vnd.apache.arrow.stream (columns only)
+- ETag / If-None-Match and ``since`` filtering so pollers only fetch new or changed bars
+
+msgpack and pyarrow are optional; unsupported media types fall back to JSON.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    _msgpack_available = True
+except ImportError:
+    msgpack = None
+    _msgpack_available = False
+
+try:
+    import pyarrow as pa
+    _arrow_available = True
+except ImportError:
+    pa = None
+    _arrow_available = False
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Columnar field order; time is epoch seconds (int) in every columnar encoding
+CANDLE_COLUMNS = ("time", "open", "high", "low", "close", "volume", "spread", "real_volume")
+
+_INT_COLUMNS = {"time", "volume", "real_volume"}
+
+
+def candle_epoch(value: Any) -> int:
+    """Candle time (datetime, ISO string or epoch number) as epoch seconds"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, str):
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return candle_epoch(dt)
+    return int(value)
+
+
+def _field(candle: Any, name: str, default: Any = 0) -> Any:
+    if isinstance(candle, dict):
+        return candle.get(name, default)
+    return getattr(candle, name, default)
+
+
+def candles_to_columns(candles: Iterable[Any]) -> Dict[str, list]:
+    """Convert Candle objects or candle dicts to {field: [values...]} (order preserved)"""
+    columns: Dict[str, list] = {name: [] for name in CANDLE_COLUMNS}
+    for candle in candles:
+        columns["time"].append(candle_epoch(_field(candle, "time")))
+        for name in CANDLE_COLUMNS[1:]:
+            value = _field(candle, name) or 0
+            columns[name].append(int(value) if name in _INT_COLUMNS else float(value))
+    return columns
+
+
+def columns_to_candles(columns: Dict[str, list], as_datetime: bool = True) -> List[Dict[str, Any]]:
+    """Convert a columnar payload back to per-bar dicts (time as UTC datetime or epoch seconds)"""
+    names = [name for name in columns if isinstance(columns[name], list)]
+    count = len(columns.get("time", []))
+    candles = []
+    for i in range(count):
+        candle = {name: columns[name][i] for name in names}
+        if as_datetime:
+            candle["time"] = datetime.fromtimestamp(candle["time"], tz=timezone.utc)
+        candles.append(candle)
+    return candles
+
+
+def filter_since(candles: List[Any], since: Optional[int]) -> List[Any]:
+    """Keep only bars with time >= since (epoch seconds). The bar at ``since`` is kept because it may still be forming"""
+    if since is None:
+        return candles
+    return [c for c in candles if candle_epoch(_field(c, "time")) >= since]
+
+
+def candles_etag(symbol: str, timeframe: str, candles: List[Any], variant: str = "") -> str:
+    """
+    Weak ETag for a candle window.
+    Hashes every bar, so added/dropped bars, the forming bar and revised (backfilled or
+    corrected) bars anywhere in the window all change it.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update("|".join((symbol, timeframe, str(len(candles)), variant)).encode())
+    for candle in candles:
+        digest.update(("|" + ",".join(str(_field(candle, name)) for name in CANDLE_COLUMNS)).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 7232 weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.strip().removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """Pick the response media type from an Accept header (highest q, then listed order)"""
+    if not accept:
+        return JSON_MEDIA_TYPE
+    supported = {JSON_MEDIA_TYPE: True, MSGPACK_MEDIA_TYPE: _msgpack_available, ARROW_MEDIA_TYPE: _arrow_available}
+    ranked: List[Tuple[float, int, str]] = []
+    for index, part in enumerate(accept.split(",")):
+        pieces = [p.strip() for p in part.split(";")]
+        media = pieces[0].lower()
+        q = 1.0
+        for param in pieces[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if supported.get(media) and q > 0:
+            ranked.append((-q, index, media))
+    return min(ranked)[2] if ranked else JSON_MEDIA_TYPE
+
+
+def encode_payload(payload: Dict[str, Any], media_type: str) -> bytes:
+    """
+    Encode a candle payload for the negotiated media type.
+    Arrow encodes only payload['columns'] (other scalar fields go into schema metadata).
+    """
+    if media_type == MSGPACK_MEDIA_TYPE and _msgpack_available:
+        return msgpack.packb(payload, use_bin_type=True)
+    if media_type == ARROW_MEDIA_TYPE and _arrow_available:
+        columns = payload.get("columns") or candles_to_columns([])
+        metadata = {k: json.dumps(v) for k, v in payload.items() if k != "columns"}
+        table = pa.table({name: columns[name] for name in CANDLE_COLUMNS if name in columns})
+        table = table.replace_schema_metadata(metadata)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    return json.dumps(payload, default=str).encode()
+
+
+def decode_payload(body: bytes, content_type: Optional[str]) -> Dict[str, Any]:
+    """Decode a candle payload produced by encode_payload (for HTTP clients)"""
+    media_type = (content_type or JSON_MEDIA_TYPE).split(";")[0].strip().lower()
+    if media_type == MSGPACK_MEDIA_TYPE:
+        if not _msgpack_available:
+            raise RuntimeError("msgpack payload received but msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+    if media_type == ARROW_MEDIA_TYPE:
+        if not _arrow_available:
+            raise RuntimeError("Arrow payload received but pyarrow is not installed")
+        table = pa.ipc.open_stream(body).read_all()
+        payload = {k.decode(): json.loads(v) for k, v in (table.schema.metadata or {}).items()}
+        payload["columns"] = table.to_pydict()
+        return payload
+    return json.loads(body)
+
+
+def preferred_accept() -> str:
+    """Accept header for internal pollers: most compact available encoding first, JSON fallback"""
+    if _msgpack_available:
+        return f"{MSGPACK_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.5"
+    return JSON_MEDIA_TYPE
@@ -10,6 +10,10 @@ import pandas as pd
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 
+from infra.rolling_correlation_engine import (
+    RollingCorrelationEngine, get_rolling_correlation_engine, to_epoch_seconds
+)
+
 logger = logging.getLogger(__name__)
 
 # Expected correlation patterns for conflict detection
@@ -48,20 +52,29 @@ EXPECTED_CORRELATIONS = {
 
 
 class CorrelationContextCalculator:
-    """Calculate correlation context for symbols vs reference assets"""
+    """
+    Calculate correlation context for symbols vs reference assets
+    
+    Bars are ingested incrementally into a RollingCorrelationEngine (aligned return
+    buffers + running pair sums), so correlations and price changes are window lookups.
+    """
+    
+    # Reference assets tracked in the engine (series name -> MarketIndicesService getter)
+    REFERENCE_BAR_GETTERS = {
+        "dxy": "get_dxy_bars",
+        "sp500": "get_sp500_bars",
+        "us10y": "get_us10y_bars",
+        "nasdaq": "get_nasdaq_bars",
+    }
     
-    def __init__(self, mt5_service=None, market_indices_service=None):
+    # M5 bars re-requested from MT5 once a series is held (1 hour, overlaps the last held bar)
+    TAIL_BARS = 12
+    
+    def __init__(self, mt5_service=None, market_indices_service=None, engine: Optional[RollingCorrelationEngine] = None):
         self.mt5_service = mt5_service
         self.market_indices = market_indices_service
-        # Reuse existing correlation calculation (static method - no instantiation needed)
-        try:
-            from app.engine.historical_analysis_engine import HistoricalAnalysisEngine
-            # Note: calculate_correlation is @staticmethod - call directly, no instantiation needed
-            self._correlation_calc = HistoricalAnalysisEngine.calculate_correlation
-        except ImportError:
-            # Fallback to numpy correlation if numba not available
-            logger.warning("HistoricalAnalysisEngine not available, using numpy correlation")
-            self._correlation_calc = self._numpy_correlation
+        # Process-wide engine by default, so per-request calculators only ingest new bars
+        self.engine = engine or get_rolling_correlation_engine()
     
     async def calculate_correlation_context(
         self, 
@@ -113,58 +126,41 @@ class CorrelationContextCalculator:
                 logger.error(f"Symbol bars for {symbol_norm} missing 'close' column. Columns: {symbol_bars.columns if hasattr(symbol_bars, 'columns') else 'N/A'}")
                 return self._create_unavailable_response(window_minutes)
             
-            # Convert prices to returns
-            symbol_returns = self._prices_to_returns(symbol_bars['close'].values)
+            # Feed new bars into the rolling engine (only bars after the last held one)
+            self.engine.ingest_bars(symbol_norm, symbol_bars)
+            
+            # Returns over the window held by the engine (the fetch may only be the newest tail)
+            symbol_returns = self._prices_to_returns(self.engine.closes(symbol_norm, bars_needed + 1))
             if symbol_returns is None or len(symbol_returns) == 0:
                 logger.warning(f"Could not calculate returns for {symbol_norm}")
                 return self._create_unavailable_response(window_minutes)
             
-            # Get time values (handle both datetime and timestamp formats)
-            # IMPORTANT: Returns are one element shorter than prices (returns[i] = (price[i+1] - price[i]) / price[i])
-            # So we need to trim times to match: times[1:] corresponds to returns
-            try:
-                if hasattr(symbol_bars['time'].iloc[0], 'timestamp'):
-                    # Already datetime objects
-                    symbol_times = symbol_bars['time'].values[1:]  # Trim first element to match returns
-                else:
-                    # Convert to datetime if needed
-                    import pandas as pd
-                    symbol_times = pd.to_datetime(symbol_bars['time']).values[1:]  # Trim first element to match returns
-            except Exception as e:
-                logger.error(f"Error processing time column for {symbol_norm}: {e}")
-                return self._create_unavailable_response(window_minutes)
-            
-            # Validate that returns and times have matching lengths
-            if len(symbol_returns) != len(symbol_times):
-                logger.error(f"Symbol returns ({len(symbol_returns)}) and times ({len(symbol_times)}) length mismatch after trimming")
-                return self._create_unavailable_response(window_minutes)
-            
             # 2. Fetch reference asset data and calculate correlations
             correlations = {}
             conflict_flags = {}
             
             # DXY correlation
             corr_dxy, quality_dxy = await self._calculate_correlation(
-                symbol_returns, symbol_times, "dxy", bars_needed
+                symbol_norm, "dxy", bars_needed
             )
             correlations["corr_vs_dxy"] = corr_dxy
             
             # SP500 correlation
             corr_sp500, quality_sp500 = await self._calculate_correlation(
-                symbol_returns, symbol_times, "sp500", bars_needed
+                symbol_norm, "sp500", bars_needed
             )
             correlations["corr_vs_sp500"] = corr_sp500
             
             # US10Y correlation
             corr_us10y, quality_us10y = await self._calculate_correlation(
-                symbol_returns, symbol_times, "us10y", bars_needed
+                symbol_norm, "us10y", bars_needed
             )
             correlations["corr_vs_us10y"] = corr_us10y
             
             # BTC correlation (only for non-BTC symbols)
             if symbol_base != "BTCUSD":
                 corr_btc, quality_btc = await self._calculate_correlation(
-                    symbol_returns, symbol_bars['time'].values, "btc", bars_needed
+                    symbol_norm, "btc", bars_needed
                 )
                 correlations["corr_vs_btc"] = corr_btc
             else:
@@ -243,19 +239,45 @@ class CorrelationContextCalculator:
             logger.error(f"Error calculating correlation context for {symbol}: {e}", exc_info=True)
             return self._create_unavailable_response(window_minutes)
     
-    async def _fetch_symbol_bars(self, symbol: str, count: int) -> Optional[pd.DataFrame]:
-        """Fetch symbol historical bars from MT5"""
+    def _incremental_count(self, series: str, count: int) -> int:
+        """Bars to request: the full window until the engine holds it, then only the newest tail"""
+        if len(self.engine.closes(series)) < count:
+            return count
+        return min(count, self.TAIL_BARS)
+    
+    def _leaves_gap(self, series: str, bars) -> bool:
+        """True if a tail fetch does not overlap the last bar held for the series"""
+        last = self.engine.last_time(series)
+        if last is None or bars is None or not hasattr(bars, 'columns') or 'time' not in bars.columns or len(bars) == 0:
+            return False
+        return int(to_epoch_seconds(bars['time'].iloc[:1])[0]) > last
+    
+    async def _fetch_symbol_bars(self, symbol: str, count: int, series: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Fetch symbol historical bars from MT5 (M5).
+        Once the engine holds the window for `series` (default: symbol) only the newest
+        TAIL_BARS are requested; a tail that no longer overlaps the held bars is refetched in full.
+        """
         try:
             if not self.mt5_service:
                 logger.warning("MT5 service not available")
                 return None
             
+            series = series or symbol
+            request = self._incremental_count(series, count)
+            
             # Run MT5 call in thread to avoid blocking
             loop = asyncio.get_event_loop()
             bars = await loop.run_in_executor(
                 None,
-                lambda: self.mt5_service.get_bars(symbol, "M5", count)
+                lambda: self.mt5_service.get_bars(symbol, "M5", request)
             )
+            if request < count and self._leaves_gap(series, bars):
+                logger.debug(f"{symbol} M5 tail does not reach the held bars - refetching {count} bars")
+                bars = await loop.run_in_executor(
+                    None,
+                    lambda: self.mt5_service.get_bars(symbol, "M5", count)
+                )
             
             if bars is None:
                 logger.warning(f"get_bars returned None for {symbol}")
@@ -293,26 +315,18 @@ class CorrelationContextCalculator:
                 if not self.mt5_service:
                     logger.warning("MT5 service not available for BTC bars")
                     return None
-                loop = asyncio.get_event_loop()
-                bars = await loop.run_in_executor(
-                    None,
-                    lambda: self.mt5_service.get_bars("BTCUSDc", "M5", bars_needed)
-                )
+                bars = await self._fetch_symbol_bars("BTCUSDc", bars_needed, series="btc")
             else:
                 # For DXY, SP500, US10Y - need market_indices service
                 if not self.market_indices:
                     logger.warning("Market indices service not available")
                     return None
                 
-                if asset == "dxy":
-                    bars = await self.market_indices.get_dxy_bars(period=period, interval=interval)
-                elif asset == "sp500":
-                    bars = await self.market_indices.get_sp500_bars(period=period, interval=interval)
-                elif asset == "us10y":
-                    bars = await self.market_indices.get_us10y_bars(period=period, interval=interval)
-                else:
+                getter = self.REFERENCE_BAR_GETTERS.get(asset)
+                if getter is None:
                     logger.warning(f"Unknown reference asset: {asset}")
                     return None
+                bars = await getattr(self.market_indices, getter)(period=period, interval=interval)
             
             # Validate bars structure
             if bars is None:
@@ -362,78 +376,51 @@ class CorrelationContextCalculator:
             logger.error(f"Error converting prices to returns: {e}")
             return None
     
+    async def _sync_reference(self, asset: str, bars_needed: int) -> bool:
+        """Fetch reference bars (cached upstream) and ingest the new ones into the engine"""
+        ref_bars = await self._fetch_reference_bars(asset, bars_needed)
+        if ref_bars is None or len(ref_bars) == 0:
+            return False
+        self.engine.ingest_bars(asset, ref_bars)
+        return True
+    
+    async def _sync_symbol(self, symbol: str, count: int) -> bool:
+        """Fetch symbol bars from MT5 and ingest the new ones into the engine"""
+        bars = await self._fetch_symbol_bars(symbol, count)
+        if bars is None or len(bars) == 0:
+            return False
+        self.engine.ingest_bars(symbol, bars)
+        return True
+    
     async def _calculate_correlation(
         self,
-        symbol_returns: np.ndarray,
-        symbol_times: np.ndarray,
+        symbol: str,
         asset: str,
         bars_needed: int
     ) -> Tuple[Optional[float], str]:
         """
         Calculate correlation between symbol returns and reference asset returns
+        (symbol bars must already be ingested; the window is the last bars_needed M5 bars)
         
         Returns:
             Tuple of (correlation_value, data_quality)
         """
         try:
-            # Fetch reference asset bars
-            ref_bars = await self._fetch_reference_bars(asset, bars_needed)
-            if ref_bars is None or len(ref_bars) == 0:
-                return None, "unavailable"
-            
-            # Validate ref_bars structure before accessing columns
-            if not hasattr(ref_bars, 'columns') or 'time' not in ref_bars.columns or 'close' not in ref_bars.columns:
-                logger.error(f"ref_bars for {asset} missing required columns. Columns: {ref_bars.columns.tolist() if hasattr(ref_bars, 'columns') else 'N/A'}")
-                return None, "unavailable"
-            
-            # Convert reference prices to returns
-            ref_returns = self._prices_to_returns(ref_bars['close'].values)
-            if ref_returns is None or len(ref_returns) == 0:
-                return None, "unavailable"
-            
-            # Get time values (handle both datetime and timestamp formats)
-            # IMPORTANT: Returns are one element shorter than prices (returns[i] = (price[i+1] - price[i]) / price[i])
-            # So we need to trim times to match: times[1:] corresponds to returns
-            try:
-                if hasattr(ref_bars['time'].iloc[0], 'timestamp'):
-                    # Already datetime objects
-                    ref_times = ref_bars['time'].values[1:]  # Trim first element to match returns
-                else:
-                    # Convert to datetime if needed
-                    import pandas as pd
-                    ref_times = pd.to_datetime(ref_bars['time']).values[1:]  # Trim first element to match returns
-            except Exception as e:
-                logger.error(f"Error processing time column for reference asset {asset}: {e}")
-                return None, "unavailable"
-            
-            # Validate that returns and times have matching lengths
-            if len(ref_returns) != len(ref_times):
-                logger.error(f"Reference returns ({len(ref_returns)}) and times ({len(ref_times)}) length mismatch after trimming")
+            if not await self._sync_reference(asset, bars_needed):
                 return None, "unavailable"
             
-            # Align timestamps (pandas merge_asof or reindex)
-            aligned_symbol, aligned_ref = self._align_returns(
-                symbol_returns, symbol_times, ref_returns, ref_times
-            )
-            
-            if aligned_symbol is None or aligned_ref is None:
-                return None, "unavailable"
-            
-            if len(aligned_symbol) < 10 or len(aligned_ref) < 10:
+            stats = self.engine.pair_stats(symbol, asset, window_minutes=bars_needed * 5)
+            aligned = stats["n"]
+            if aligned < 10:
                 return None, "unavailable"
             
-            # Ensure equal length
-            min_len = min(len(aligned_symbol), len(aligned_ref))
-            aligned_symbol = aligned_symbol[:min_len]
-            aligned_ref = aligned_ref[:min_len]
-            
             # Calculate overlap percentage
-            overlap_pct = len(aligned_symbol) / bars_needed if bars_needed > 0 else 0
+            overlap_pct = aligned / bars_needed if bars_needed > 0 else 0
             
             # Determine data quality
-            if overlap_pct >= 0.8 and len(aligned_symbol) >= 192:  # 80% of 240 bars
+            if overlap_pct >= 0.8 and aligned >= 192:  # 80% of 240 bars
                 quality = "good"
-            elif overlap_pct >= 0.5 and len(aligned_symbol) >= 120:  # 50% of 240 bars
+            elif overlap_pct >= 0.5 and aligned >= 120:  # 50% of 240 bars
                 quality = "limited"
             else:
                 quality = "unavailable"
@@ -441,101 +428,19 @@ class CorrelationContextCalculator:
             if quality == "unavailable":
                 return None, quality
             
-            # Calculate correlation using static method
-            correlation = self._correlation_calc(
-                aligned_symbol.astype(np.float32),
-                aligned_ref.astype(np.float32)
-            )
-            
-            # Validate correlation (should be in [-1, 1])
-            if not np.isfinite(correlation):
+            correlation = stats["correlation"]
+            if correlation is None or not np.isfinite(correlation):
                 return None, quality
             
-            correlation = float(np.clip(correlation, -1.0, 1.0))
-            
-            return correlation, quality
+            return float(correlation), quality
             
         except Exception as e:
             logger.error(f"Error calculating correlation for {asset}: {e}")
             return None, "unavailable"
     
-    def _align_returns(
-        self,
-        symbol_returns: np.ndarray,
-        symbol_times: np.ndarray,
-        ref_returns: np.ndarray,
-        ref_times: np.ndarray
-    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
-        """Align symbol and reference returns by timestamp"""
-        try:
-            import pandas as pd
-            
-            # Validate input arrays have same length
-            if len(symbol_returns) != len(symbol_times):
-                logger.error(f"Symbol returns ({len(symbol_returns)}) and times ({len(symbol_times)}) length mismatch")
-                return None, None
-            if len(ref_returns) != len(ref_times):
-                logger.error(f"Reference returns ({len(ref_returns)}) and times ({len(ref_times)}) length mismatch")
-                return None, None
-            
-            # Create DataFrames with time as column (not index) for merge_asof
-            symbol_df = pd.DataFrame({
-                'time': pd.to_datetime(symbol_times),
-                'returns': symbol_returns
-            })
-            ref_df = pd.DataFrame({
-                'time': pd.to_datetime(ref_times),
-                'returns': ref_returns
-            })
-            
-            # Sort by time (required for merge_asof)
-            symbol_df = symbol_df.sort_values('time')
-            ref_df = ref_df.sort_values('time')
-            
-            # Align using merge_asof (forward fill for missing bars)
-            # merge_asof requires left_on/right_on when using columns (not index)
-            aligned = pd.merge_asof(
-                symbol_df,
-                ref_df,
-                on='time',
-                direction='forward',
-                tolerance=pd.Timedelta(minutes=10),  # Allow 10-minute tolerance
-                suffixes=('_symbol', '_ref')
-            )
-            
-            # Drop rows with NaN (no match found)
-            aligned = aligned.dropna(subset=['returns_symbol', 'returns_ref'])
-            
-            if len(aligned) == 0:
-                logger.warning("No aligned returns found after merge_asof")
-                return None, None
-            
-            # Validate aligned arrays have same length
-            symbol_aligned = aligned['returns_symbol'].values
-            ref_aligned = aligned['returns_ref'].values
-            
-            if len(symbol_aligned) != len(ref_aligned):
-                logger.error(f"Aligned arrays length mismatch: symbol={len(symbol_aligned)}, ref={len(ref_aligned)}")
-                return None, None
-            
-            return symbol_aligned, ref_aligned
-            
-        except Exception as e:
-            logger.error(f"Error aligning returns: {e}", exc_info=True)
-            return None, None
-    
-    def _numpy_correlation(self, series1: np.ndarray, series2: np.ndarray) -> float:
-        """Fallback correlation calculation using numpy"""
-        if len(series1) != len(series2) or len(series1) == 0:
-            return 0.0
-        
-        # Calculate correlation using numpy
-        correlation = np.corrcoef(series1, series2)[0, 1]
-        
-        if not np.isfinite(correlation):
-            return 0.0
-        
-        return float(correlation)
+    def correlation_matrix(self, series=None, window_minutes: Optional[int] = None) -> pd.DataFrame:
+        """Correlation matrix of everything ingested so far (lookup only, no fetch)"""
+        return self.engine.matrix(series, window_minutes)
     
     def _create_unavailable_response(self, window_minutes: int) -> Dict[str, Any]:
         """Create response dict for unavailable data"""
@@ -569,35 +474,7 @@ class CorrelationContextCalculator:
             if not self.market_indices:
                 logger.warning("Market indices service not available")
                 return None
-            
-            # Get DXY data (cached, 15 minute TTL)
-            dxy_data = self.market_indices.get_dxy()
-            if not dxy_data or 'price' not in dxy_data:
-                return None
-            
-            # Fetch historical DXY data for percentage change calculation
-            # Use market_indices_service to get historical prices
-            try:
-                import yfinance as yf
-                dxy = yf.Ticker("DX-Y.NYB")
-                # Get enough bars for the window (1 hour = 12 bars at 5min intervals)
-                bars_needed = max(12, window_minutes // 5)
-                hist = dxy.history(period="2d", interval="5m")
-                
-                if len(hist) < bars_needed:
-                    logger.warning(f"Insufficient DXY historical data: {len(hist)} < {bars_needed}")
-                    return None
-                
-                current_price = float(hist['Close'].iloc[-1])
-                past_price = float(hist['Close'].iloc[-bars_needed])
-                
-                # Calculate percentage change
-                change_pct = ((current_price - past_price) / past_price) * 100
-                return round(change_pct, 2)
-                
-            except Exception as e:
-                logger.error(f"Error calculating DXY percentage change: {e}")
-                return None
+            return await self._reference_change("dxy", window_minutes, pct=True, digits=2)
                 
         except Exception as e:
             logger.error(f"Error in calculate_dxy_change_pct: {e}", exc_info=True)
@@ -614,28 +491,7 @@ class CorrelationContextCalculator:
             Percentage change as float (e.g., 0.5 for +0.5%), or None if unavailable
         """
         try:
-            # Use yfinance directly (works even if market_indices is None)
-            try:
-                import yfinance as yf
-                spx = yf.Ticker("^GSPC")
-                # Get enough bars for the window (1 hour = 12 bars at 5min intervals)
-                bars_needed = max(12, window_minutes // 5)
-                hist = spx.history(period="2d", interval="5m")
-                
-                if len(hist) < bars_needed:
-                    logger.warning(f"Insufficient SPX historical data: {len(hist)} < {bars_needed}")
-                    return None
-                
-                current_price = float(hist['Close'].iloc[-1])
-                past_price = float(hist['Close'].iloc[-bars_needed])
-                
-                # Calculate percentage change
-                change_pct = ((current_price - past_price) / past_price) * 100
-                return round(change_pct, 2)
-                
-            except Exception as e:
-                logger.error(f"Error calculating SPX percentage change: {e}")
-                return None
+            return await self._reference_change("sp500", window_minutes, pct=True, digits=2)
                 
         except Exception as e:
             logger.error(f"Error in calculate_spx_change_pct: {e}", exc_info=True)
@@ -653,34 +509,32 @@ class CorrelationContextCalculator:
             Positive value = yield increase, negative value = yield drop
         """
         try:
-            # Use yfinance directly (works even if market_indices is None)
-            try:
-                import yfinance as yf
-                tnx = yf.Ticker("^TNX")
-                # Get enough bars for the window (1 hour = 12 bars at 5min intervals)
-                bars_needed = max(12, window_minutes // 5)
-                hist = tnx.history(period="2d", interval="5m")
-                
-                if len(hist) < bars_needed:
-                    logger.warning(f"Insufficient US10Y historical data: {len(hist)} < {bars_needed}")
-                    return None
-                
-                current_yield = float(hist['Close'].iloc[-1])
-                past_yield = float(hist['Close'].iloc[-bars_needed])
-                
-                # Calculate yield change (current - past)
-                # Negative = yield dropped, positive = yield increased
-                yield_change = current_yield - past_yield
-                return round(yield_change, 4)  # Round to 4 decimal places (basis points precision)
-                
-            except Exception as e:
-                logger.error(f"Error calculating US10Y yield change: {e}")
-                return None
+            # Yield change (current - past): negative = yield dropped, positive = yield increased
+            # Rounded to 4 decimal places (basis points precision)
+            return await self._reference_change("us10y", window_minutes, pct=False, digits=4)
                 
         except Exception as e:
             logger.error(f"Error in calculate_us10y_yield_change: {e}", exc_info=True)
             return None
     
+    async def _reference_change(self, asset: str, window_minutes: int, pct: bool, digits: int) -> Optional[float]:
+        """
+        Change of a reference asset over the last window (1 hour = 12 bars at 5min intervals),
+        looked up from the engine after ingesting any new bars.
+        """
+        if not self.market_indices:
+            # Works even if no service was injected (shared, cached instance)
+            from infra.market_indices_service import create_market_indices_service
+            self.market_indices = create_market_indices_service()
+        
+        bars_needed = max(12, window_minutes // 5)
+        await self._sync_reference(asset, bars_needed)
+        change = self.engine.change_pct(asset, bars_needed) if pct else self.engine.change(asset, bars_needed)
+        if change is None:
+            logger.warning(f"Insufficient {asset.upper()} historical data: {len(self.engine.closes(asset))} < {bars_needed}")
+            return None
+        return round(float(change), digits)
+    
     async def detect_dxy_divergence(
         self, 
         symbol: str, 
@@ -731,54 +585,29 @@ class CorrelationContextCalculator:
             divergence_detected = corr_dxy < divergence_threshold
             
             # Determine direction of movement for both DXY and symbol
-            # Fetch recent price movements to determine direction
-            try:
-                # Get symbol price change
-                if self.mt5_service:
-                    symbol_norm = symbol.upper().rstrip('Cc') + 'c'
-                    symbol_bars = self.mt5_service.get_bars(symbol_norm, "M5", window_minutes // 5 + 5)
-                    if symbol_bars and len(symbol_bars) >= 2:
-                        symbol_start = float(symbol_bars['close'].iloc[0])
-                        symbol_end = float(symbol_bars['close'].iloc[-1])
-                        symbol_change_pct = ((symbol_end - symbol_start) / symbol_start) * 100
-                        if symbol_change_pct > 0.1:
-                            symbol_direction = "up"
-                        elif symbol_change_pct < -0.1:
-                            symbol_direction = "down"
-                        else:
-                            symbol_direction = "neutral"
-                    else:
-                        symbol_direction = "unknown"
+            # (lookups on the bars already ingested by calculate_correlation_context)
+            symbol_norm = symbol.upper().rstrip('Cc') + 'c'
+            symbol_closes = self.engine.closes(symbol_norm, window_minutes // 5 + 5)
+            if len(symbol_closes) >= 2:
+                symbol_change_pct = ((symbol_closes[-1] - symbol_closes[0]) / symbol_closes[0]) * 100
+                if symbol_change_pct > 0.1:
+                    symbol_direction = "up"
+                elif symbol_change_pct < -0.1:
+                    symbol_direction = "down"
                 else:
-                    symbol_direction = "unknown"
-                
-                # Get DXY price change
-                try:
-                    import yfinance as yf
-                    dxy = yf.Ticker("DX-Y.NYB")
-                    bars_needed = max(12, window_minutes // 5)
-                    hist = dxy.history(period="2d", interval="5m")
-                    
-                    if len(hist) >= bars_needed:
-                        dxy_start = float(hist['Close'].iloc[-bars_needed])
-                        dxy_end = float(hist['Close'].iloc[-1])
-                        dxy_change_pct = ((dxy_end - dxy_start) / dxy_start) * 100
-                        if dxy_change_pct > 0.05:
-                            dxy_direction = "up"
-                        elif dxy_change_pct < -0.05:
-                            dxy_direction = "down"
-                        else:
-                            dxy_direction = "neutral"
-                    else:
-                        dxy_direction = "unknown"
-                except Exception as e:
-                    logger.debug(f"Could not determine DXY direction: {e}")
-                    dxy_direction = "unknown"
-                
-            except Exception as e:
-                logger.debug(f"Could not determine symbol direction: {e}")
+                    symbol_direction = "neutral"
+            else:
                 symbol_direction = "unknown"
+            
+            dxy_change_pct = self.engine.change_pct("dxy", max(12, window_minutes // 5))
+            if dxy_change_pct is None:
                 dxy_direction = "unknown"
+            elif dxy_change_pct > 0.05:
+                dxy_direction = "up"
+            elif dxy_change_pct < -0.05:
+                dxy_direction = "down"
+            else:
+                dxy_direction = "neutral"
             
             return {
                 "divergence_detected": divergence_detected,
@@ -813,18 +642,13 @@ class CorrelationContextCalculator:
                 return False
             
             try:
-                import yfinance as yf
-                import numpy as np
-                
-                dxy = yf.Ticker("DX-Y.NYB")
                 # Get enough bars for momentum calculation (need 10-20 periods)
-                hist = dxy.history(period="2d", interval="5m")
+                await self._sync_reference("dxy", 20)
+                closes = self.engine.closes("dxy", 20)
                 
-                if len(hist) < 20:
+                if len(closes) < 20:
                     return False
                 
-                closes = hist['Close'].tail(20).values
-                
                 # Calculate rate of change over rolling window
                 # Use last 10-20 periods for momentum calculation
                 window_size = min(20, len(closes))
@@ -907,40 +731,27 @@ class CorrelationContextCalculator:
                 logger.warning("MT5 service not available for ETH/BTC ratio")
                 return None
             
+            # Ingest new ETH/BTC bars into the engine (aligned by bar time)
+            await self._sync_symbol("ETHUSDc", 100)
+            await self._sync_symbol("BTCUSDc", 100)
+            eth_closes, btc_closes = self.engine.aligned_closes("ETHUSDc", "BTCUSDc", 100)
+            
             # Try to get ETH price from Binance API first (more reliable for crypto)
             try:
-                import requests
-                eth_response = requests.get("https://api.binance.com/api/v3/ticker/price?symbol=ETHUSDT", timeout=5)
-                btc_response = requests.get("https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT", timeout=5)
-                
-                if eth_response.status_code == 200 and btc_response.status_code == 200:
-                    eth_price = float(eth_response.json()['price'])
-                    btc_price = float(btc_response.json()['price'])
-                    current_ratio = eth_price / btc_price
-                else:
-                    raise Exception("Binance API failed")
+                from infra.macro_context_store import get_macro_context_store
+                current_ratio = get_macro_context_store().get(
+                    "binance_ethbtc", self._binance_ethbtc_ratio, ttl=30, persist=False
+                )
             except Exception:
                 # Fallback to MT5 if Binance unavailable
-                try:
-                    eth_bars = await self._fetch_symbol_bars("ETHUSDc", 100)
-                    btc_bars = await self._fetch_symbol_bars("BTCUSDc", 100)
-                    
-                    if eth_bars is None or btc_bars is None or len(eth_bars) == 0 or len(btc_bars) == 0:
-                        return None
-                    
-                    eth_price = float(eth_bars['close'].iloc[-1])
-                    btc_price = float(btc_bars['close'].iloc[-1])
-                    current_ratio = eth_price / btc_price
-                except Exception as e:
-                    logger.warning(f"Could not get ETH/BTC prices: {e}")
+                if len(eth_closes) == 0:
+                    logger.warning("Could not get ETH/BTC prices")
                     return None
+                current_ratio = float(eth_closes[-1] / btc_closes[-1])
             
             # Calculate historical ratio mean and std dev (last 100 periods)
             try:
-                eth_bars = await self._fetch_symbol_bars("ETHUSDc", 100)
-                btc_bars = await self._fetch_symbol_bars("BTCUSDc", 100)
-                
-                if eth_bars is None or btc_bars is None or len(eth_bars) < 20 or len(btc_bars) < 20:
+                if len(eth_closes) < 20:
                     # Use current ratio as mean if no history
                     return {
                         "ratio": current_ratio,
@@ -948,11 +759,6 @@ class CorrelationContextCalculator:
                         "direction": None
                     }
                 
-                # Align bars by time
-                min_len = min(len(eth_bars), len(btc_bars))
-                eth_closes = eth_bars['close'].tail(min_len).values
-                btc_closes = btc_bars['close'].tail(min_len).values
-                
                 # Calculate ratios
                 ratios = eth_closes / btc_closes
                 
@@ -987,6 +793,15 @@ class CorrelationContextCalculator:
             logger.error(f"Error in calculate_ethbtc_ratio_deviation: {e}", exc_info=True)
             return None
     
+    @staticmethod
+    def _binance_ethbtc_ratio() -> float:
+        import requests
+        eth_response = requests.get("https://api.binance.com/api/v3/ticker/price?symbol=ETHUSDT", timeout=5)
+        btc_response = requests.get("https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT", timeout=5)
+        if eth_response.status_code != 200 or btc_response.status_code != 200:
+            raise Exception("Binance API failed")
+        return float(eth_response.json()['price']) / float(btc_response.json()['price'])
+    
     async def get_nasdaq_15min_trend(self) -> Optional[Dict[str, Any]]:
         """
         Get NASDAQ 15-minute trend (bullish/bearish).
@@ -69,40 +69,48 @@ class DeltaDivergenceDetector:
             # Get aligned delta values
             aligned_delta = delta_history[-len(price_bars_df):]
             
-            # Calculate price trend (slope of closes)
             price_closes = price_bars_df['close'].values[-self.trend_period:].tolist()
-            price_slope = self._calculate_trend_slope(price_closes)
-            
-            # Calculate delta trend (slope of delta values)
-            delta_slope = self._calculate_trend_slope(aligned_delta[-self.trend_period:])
-            
-            # Detect divergence
-            # Bullish: Price falling (negative slope) but delta rising (positive slope)
-            if price_slope < -0.001 and delta_slope > 0.001:
-                strength = self._calculate_divergence_strength(price_slope, delta_slope)
-                return {
-                    'type': 'bullish',
-                    'strength': strength,
-                    'price_slope': price_slope,
-                    'delta_slope': delta_slope
-                }
-            
-            # Bearish: Price rising (positive slope) but delta falling (negative slope)
-            if price_slope > 0.001 and delta_slope < -0.001:
-                strength = self._calculate_divergence_strength(price_slope, delta_slope)
-                return {
-                    'type': 'bearish',
-                    'strength': strength,
-                    'price_slope': price_slope,
-                    'delta_slope': delta_slope
-                }
-            
-            return None
+            return self.detect_from_series(price_closes, aligned_delta[-self.trend_period:])
             
         except Exception as e:
             logger.debug(f"Error detecting delta divergence: {e}")
             return None
     
+    def detect_from_series(self, price_closes: List[float], deltas: List[float]) -> Optional[Dict]:
+        """
+        Detect divergence from the last ``trend_period`` closes and per-bar deltas.
+        
+        Used directly by OrderFlowBarEngine, whose bars carry price and delta together.
+        
+        Returns:
+            Dict with 'type' ('bullish'/'bearish'), 'strength' (0.0-1.0), or None
+        """
+        # Calculate price trend (slope of closes) and delta trend (slope of delta values)
+        price_slope = self._calculate_trend_slope(list(price_closes)[-self.trend_period:])
+        delta_slope = self._calculate_trend_slope(list(deltas)[-self.trend_period:])
+        
+        # Bullish: Price falling (negative slope) but delta rising (positive slope)
+        if price_slope < -0.001 and delta_slope > 0.001:
+            strength = self._calculate_divergence_strength(price_slope, delta_slope)
+            return {
+                'type': 'bullish',
+                'strength': strength,
+                'price_slope': price_slope,
+                'delta_slope': delta_slope
+            }
+        
+        # Bearish: Price rising (positive slope) but delta falling (negative slope)
+        if price_slope > 0.001 and delta_slope < -0.001:
+            strength = self._calculate_divergence_strength(price_slope, delta_slope)
+            return {
+                'type': 'bearish',
+                'strength': strength,
+                'price_slope': price_slope,
+                'delta_slope': delta_slope
+            }
+        
+        return None
+    
     def _calculate_trend_slope(self, values: List[float]) -> float:
         """
         Calculate trend slope using linear regression.
@@ -18,6 +18,23 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Bar length per timeframe (seconds), for detecting that the forming bar has closed
+_TIMEFRAME_SECONDS = {"M1": 60, "M5": 300, "M15": 900, "M30": 1800, "H1": 3600, "H4": 14400, "D1": 86400}
+
+
+def _forming_bar_end(bars: pd.DataFrame, timeframe: str) -> Optional[float]:
+    """Epoch seconds (terminal time, like tick.time) at which the last bar of ``bars`` closes"""
+    period = _TIMEFRAME_SECONDS.get(timeframe)
+    if period is None or "time" not in bars.columns:
+        return None
+    opened = bars["time"].iloc[-1]
+    try:
+        if pd.api.types.is_number(opened):
+            return float(opened) + period
+        return pd.Timestamp(opened).timestamp() + period
+    except (TypeError, ValueError):
+        return None
+
 
 class DetectionSystemManager:
     """Unified interface for all detection systems with caching"""
@@ -333,33 +350,77 @@ class DetectionSystemManager:
             self._log_degraded_state("fvg_detection", symbol, str(e))
         return None
     
-    def get_choch_bos(self, symbol: str, timeframe: str = "M15") -> Optional[Dict]:
-        """Get CHOCH/BOS detection result"""
-        cache_key = self._get_cache_key(symbol, timeframe, "choch_bos")
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
+    def _get_last_tick(self, symbol: str) -> Optional[Any]:
+        """Latest MT5 tick (time in epoch seconds, bid), None if the terminal has none"""
         try:
-            from domain.market_structure import label_structure
-            
+            from infra.mt5_gateway import mt5
+            tick = mt5.symbol_info_tick(symbol)
+            if tick is None or not getattr(tick, "bid", 0):
+                return None
+            return tick
+        except Exception as e:
+            logger.debug(f"No tick for {symbol}: {e}")
+            return None
+    
+    def _get_structure(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
+        """
+        Structure state from the shared per-(symbol, timeframe) StructureTracker.
+        
+        Bars are refetched when the forming bar has closed (the latest tick is past its
+        end) and the tracker only applies the newly closed bars; in between, each read moves
+        the forming bar's close to the latest tick. Without a live tick the bars are
+        refetched at most once per minute.
+        """
+        from domain.structure_tracker import get_structure_tracker
+        
+        tracker = get_structure_tracker(symbol, timeframe)
+        tick = self._get_last_tick(symbol)
+        if tick is None:
+            stale = int(tracker.updated_at / 60) != int(time.time() / 60)
+        else:
+            stale = tracker.forming_closes_at is None or float(tick.time) >= tracker.forming_closes_at
+        if stale or not tracker.warm:
             bars = self._get_bars(symbol, timeframe)
             if bars is None or len(bars) < 10:
                 return None
+            tracker.update_df(bars)
+            tracker.forming_closes_at = _forming_bar_end(bars, timeframe)
+            if not tracker.warm:
+                # Too few bars for the 3/3 swing window: label_structure narrows it to 1/1
+                from domain.market_structure import label_structure
+                return label_structure(bars, lookback=10)
+        if tick is not None:
+            tracker.update_price(float(tick.bid))
+        return tracker.state(lookback=10)
+    
+    def get_choch_bos(self, symbol: str, timeframe: str = "M15") -> Optional[Dict]:
+        """
+        Get CHOCH/BOS detection result (read from the incremental structure tracker).
+        
+        The choch/bos flags, break_level and bars_since_bos are reported only when
+        settings.CHOCH_BOS_LIVE_FLAGS is on. The previous detector never set these flags,
+        so the MSS, mitigation and breaker checks in auto_execution_system that read them
+        have never fired. By default they stay False (break_level 0.0, bars_since_bos -1),
+        as before.
+        """
+        try:
+            structure = self._get_structure(symbol, timeframe)
+            if structure is None:
+                return None
             
-            # Use market structure detection
-            structure = label_structure(bars, lookback=10)
+            from config import settings
+            if not getattr(settings, "CHOCH_BOS_LIVE_FLAGS", False):
+                structure = {"strength": structure.get("strength", 0.5)}
             
-            result = {
+            return {
                 "choch_bull": structure.get("choch_bull", False),
                 "choch_bear": structure.get("choch_bear", False),
                 "bos_bull": structure.get("bos_bull", False),
                 "bos_bear": structure.get("bos_bear", False),
+                "break_level": structure.get("break_level", 0.0),
+                "bars_since_bos": structure.get("bars_since_bos", -1),
                 "structure_strength": structure.get("strength", 0.5)
             }
-            
-            self._cache_result(cache_key, result)
-            return result
         except Exception as e:
             logger.warning(f"CHOCH/BOS detection failed for {symbol}: {e}")
             self._log_degraded_state("choch_bos_detection", symbol, str(e))
@@ -5,7 +5,6 @@ Monitors M5/M15/H1 candles from streamer and sends formatted alerts to Discord.
 Designed for copy-paste into ChatGPT for analysis and auto-execution plan creation.
 """
 
-import asyncio
 import hashlib
 import json
 import logging
@@ -14,6 +13,8 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from infra.notification_gateway import get_notification_gateway
+
 logger = logging.getLogger(__name__)
 
 
@@ -1801,30 +1802,17 @@ class DiscordAlertDispatcher:
                 if webhook_url:
                     # Send to channel-specific webhook
                     logger.error(f"   → Using channel webhook for '{channel}' (URL: {webhook_url[:50]}...)")
-                    send_success = await asyncio.to_thread(
-                        self._send_to_webhook,
-                        webhook_url,
-                        message,
-                        color,
-                        title
-                    )
+                    send_success = self._send_to_webhook(webhook_url, message, color, title)
                     if send_success:
-                        logger.info(f"   ✅ Webhook send successful")
+                        logger.info(f"   ✅ Webhook send queued")
                     else:
-                        logger.error(f"   ❌ Webhook send failed - check logs above for HTTP error details")
+                        logger.error(f"   ❌ Webhook send not queued - check logs above")
                 else:
-                    # Fallback to default notifier
+                    # Fallback to default notifier (also queues on the notification gateway)
                     logger.warning(f"   ⚠️ No channel webhook for '{channel}', using default notifier")
-                    await asyncio.to_thread(
-                        self.discord_notifier.send_message,
-                        message,
-                        "ALERT",
-                        color,
-                        "private",
-                        title
-                    )
+                    self.discord_notifier.send_message(message, "ALERT", color, "private", title)
                     send_success = True  # Assume success if no exception
-                    logger.info(f"   ✅ Default notifier send completed")
+                    logger.info(f"   ✅ Default notifier send queued")
             except Exception as e:
                 logger.error(f"   ❌ Exception sending alert to Discord: {e}", exc_info=True)
                 send_success = False
@@ -1973,13 +1961,12 @@ class DiscordAlertDispatcher:
     
     def _send_to_webhook(self, webhook_url: str, message: str, color: int, title: str) -> bool:
         """
-        Send message to a specific Discord webhook.
+        Queue a message for a specific Discord webhook on the notification gateway
+        (returns immediately; delivery is batched, rate-limited and retried there).
         
         Returns:
-            True if sent successfully, False otherwise
+            True if queued, False otherwise
         """
-        import requests
-        
         # Validate webhook URL format
         if not webhook_url or not isinstance(webhook_url, str):
             logger.warning(f"Invalid webhook URL: {webhook_url}")
@@ -1989,46 +1976,14 @@ class DiscordAlertDispatcher:
             logger.warning(f"Webhook URL does not match Discord format: {webhook_url[:50]}...")
             return False
         
-        data = {
-            "embeds": [{
-                "title": title,
-                "description": message,
-                "color": color
-            }]
+        embed = {
+            "title": title,
+            "description": message,
+            "color": color
         }
         
-        try:
-            logger.error(f"   → Sending POST request to webhook...")
-            response = requests.post(webhook_url, json=data, timeout=10)
-            logger.error(f"   → Webhook response: Status {response.status_code}")
-            
-            if response.status_code == 204:
-                logger.info(f"   ✅ Alert sent to custom webhook successfully (204 No Content)")
-                return True
-            else:
-                error_msg = response.text[:500] if response.text else 'No response body'
-                logger.error(
-                    f"   ❌ Webhook HTTP error {response.status_code}: {error_msg}"
-                )
-                logger.error(f"   ❌ Webhook URL (first 80 chars): {webhook_url[:80]}...")
-                logger.error(f"   ❌ Request payload size: {len(json.dumps(data))} bytes")
-                logger.error(f"   ❌ Common causes: Invalid webhook URL, webhook deleted, rate limit, or message too large")
-                return False
-        except requests.exceptions.Timeout:
-            logger.error(f"   ❌ Webhook request timed out after 10 seconds")
-            logger.error(f"   ❌ Webhook URL (first 80 chars): {webhook_url[:80]}...")
-            return False
-        except requests.exceptions.ConnectionError as e:
-            logger.error(f"   ❌ Webhook connection error: {e}")
-            logger.error(f"   ❌ Webhook URL (first 80 chars): {webhook_url[:80]}...")
-            logger.error(f"   ❌ Check internet connection and Discord service status")
-            return False
-        except requests.exceptions.RequestException as e:
-            logger.error(f"   ❌ Webhook request failed: {e}")
-            logger.error(f"   ❌ Webhook URL (first 80 chars): {webhook_url[:80]}...")
-            return False
-        except Exception as e:
-            logger.error(f"   ❌ Unexpected error sending to webhook: {e}", exc_info=True)
-            logger.error(f"   ❌ Webhook URL (first 80 chars): {webhook_url[:80]}...")
-            return False
+        queued = get_notification_gateway().submit_discord(webhook_url, [embed])
+        if not queued:
+            logger.error(f"   ❌ Notification queue full - alert dropped (URL: {webhook_url[:50]}...)")
+        return queued
 
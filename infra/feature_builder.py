@@ -13,7 +13,9 @@ import json
 
 from infra.mt5_service import MT5Service
 from infra.indicator_bridge import IndicatorBridge
+from infra.feature_store import get_feature_store, payload_to_dataframe
 from config import settings
+from domain.level_clusters import cluster_prices
 
 logger = logging.getLogger(__name__)
 
@@ -27,18 +29,21 @@ class FeatureBuilder:
         self.mt5svc = mt5svc
         self.bridge = bridge
         self.cache = {}  # Simple caching for performance
+        self.store = get_feature_store()
         
-    def build(self, symbol: str, timeframes: List[str] = None) -> Dict[str, Any]:
+    def build(self, symbol: str, timeframes: List[str] = None, multi: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Build comprehensive feature set for symbol across timeframes.
         Returns normalized, AI-ready features.
+        Pass ``multi`` to reuse multi-timeframe data the caller already fetched.
         """
         if timeframes is None:
             timeframes = ["M5", "M15", "M30", "H1", "H4"]
             
         try:
             # Get multi-timeframe data
-            multi = self.bridge.get_multi(symbol)
+            if multi is None:
+                multi = self.bridge.get_multi(symbol)
             if not multi:
                 return self._empty_features()
                 
@@ -71,52 +76,68 @@ class FeatureBuilder:
                 logger.debug(f"No data provided for {symbol} {timeframe}")
                 return self._empty_timeframe_features()
                 
-            # Check if data has the minimum required length
-            data_len = len(data.get("open", []))
-            if data_len < 50:  # Need minimum data
-                logger.debug(f"Insufficient data for {symbol} {timeframe}: {data_len} bars (need 50+)")
-                return self._empty_timeframe_features()
-                
-            # Convert to DataFrame for easier processing
-            df = self._data_to_dataframe(data)
+            # Shared DataFrame and indicators for this bar (converted once per payload)
+            frame = self.store.frame(symbol, timeframe, data) if self.store.enabled else None
+            df = frame.df if frame is not None else self._data_to_dataframe(data)
             if df is None or df.empty:
                 logger.warning(f"DataFrame conversion failed or empty for {symbol} {timeframe}")
                 return self._empty_timeframe_features()
-                
-            features = {}
-            
-            # Import submodules
-            from infra.feature_indicators import IndicatorFeatures
-            from infra.feature_patterns import PatternFeatures
-            from infra.feature_structure import StructureFeatures
-            from infra.feature_microstructure import MicrostructureFeatures
-            from infra.feature_session_news import SessionNewsFeatures
-            
-            # Build feature categories
-            indicator_features = IndicatorFeatures()
-            pattern_features = PatternFeatures()
-            structure_features = StructureFeatures()
-            microstructure_features = MicrostructureFeatures()
-            session_features = SessionNewsFeatures()
-            
-            # Compute all feature categories
-            features.update(indicator_features.compute(df, symbol, timeframe))
-            features.update(pattern_features.compute(df, symbol, timeframe))
-            features.update(structure_features.compute(df, symbol, timeframe))
-            features.update(microstructure_features.compute(df, symbol, timeframe))
-            features.update(session_features.compute(df, symbol, timeframe))
-            
-            # Add timeframe metadata
-            features["timeframe"] = timeframe
-            features["bars_count"] = len(df)
-            features["last_update"] = df.index[-1].isoformat() if not df.empty else None
             
-            return features
+            # Check if data has the minimum required length
+            if len(df) < 50:  # Need minimum data
+                logger.debug(f"Insufficient data for {symbol} {timeframe}: {len(df)} bars (need 50+)")
+                return self._empty_timeframe_features()
+                
+            if frame is not None:
+                # Bar-derived features are computed once per bar; later builds in the same
+                # bar read them. Session/news fields depend on the clock, not the bar, so
+                # they are recomputed on every build and merged into a copy
+                features = dict(frame.memo("feature_builder", lambda: self._compute_bar_features(df, symbol, timeframe, frame)))
+            else:
+                features = self._compute_bar_features(df, symbol, timeframe, None)
+            return self._add_session_features(features, df, symbol, timeframe)
             
         except Exception as e:
             logger.error(f"Timeframe feature building failed for {symbol} {timeframe}: {e}")
             return self._empty_timeframe_features()
     
+    def _compute_bar_features(self, df: pd.DataFrame, symbol: str, timeframe: str, frame) -> Dict[str, Any]:
+        """Bar-derived feature categories for one timeframe (``frame``: its feature-store frame, if any)."""
+        features = {}
+        
+        # Import submodules
+        from infra.feature_indicators import IndicatorFeatures
+        from infra.feature_patterns import PatternFeatures
+        from infra.feature_structure import StructureFeatures
+        from infra.feature_microstructure import MicrostructureFeatures
+        
+        # Build feature categories
+        indicator_features = IndicatorFeatures()
+        pattern_features = PatternFeatures()
+        structure_features = StructureFeatures()
+        microstructure_features = MicrostructureFeatures()
+        
+        # Compute all feature categories
+        features.update(indicator_features.compute(df, symbol, timeframe, frame=frame))
+        features.update(pattern_features.compute(df, symbol, timeframe))
+        features.update(structure_features.compute(df, symbol, timeframe))
+        features.update(microstructure_features.compute(df, symbol, timeframe))
+        
+        return features
+    
+    def _add_session_features(self, features: Dict[str, Any], df: pd.DataFrame, symbol: str, timeframe: str) -> Dict[str, Any]:
+        """Merge the current session/news/market-hours fields and timeframe metadata into ``features``."""
+        from infra.feature_session_news import SessionNewsFeatures
+        
+        features.update(SessionNewsFeatures().compute(df, symbol, timeframe))
+        
+        # Add timeframe metadata
+        features["timeframe"] = timeframe
+        features["bars_count"] = len(df)
+        features["last_update"] = df.index[-1].isoformat() if not df.empty else None
+        
+        return features
+    
     def _build_cross_timeframe_features(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Build cross-timeframe analysis and agreement features."""
         try:
@@ -302,55 +323,13 @@ class FeatureBuilder:
         if not levels:
             return []
             
-        levels = sorted(levels)
-        clusters = []
-        current_cluster = [levels[0]]
-        
-        for i in range(1, len(levels)):
-            if abs(levels[i] - levels[i-1]) / levels[i-1] <= tolerance:
-                current_cluster.append(levels[i])
-            else:
-                if len(current_cluster) > 1:
-                    clusters.append(current_cluster)
-                current_cluster = [levels[i]]
-                
-        if len(current_cluster) > 1:
-            clusters.append(current_cluster)
-            
-        return clusters
+        groups = cluster_prices(levels, tolerance, relative=True)
+        return [[levels[i] for i in group] for group in groups if len(group) > 1]
     
     def _data_to_dataframe(self, data: Dict) -> Optional[pd.DataFrame]:
         """Convert indicator bridge data to DataFrame."""
         try:
-            # Extract OHLCV data
-            ohlcv_data = []
-            for i in range(len(data.get("open", []))):
-                ohlcv_data.append({
-                    "open": data.get("open", [])[i],
-                    "high": data.get("high", [])[i],
-                    "low": data.get("low", [])[i],
-                    "close": data.get("close", [])[i],
-                    "volume": data.get("volume", [])[i] if "volume" in data else 0,
-                    "time": data.get("time", [])[i] if "time" in data else i
-                })
-                
-            if not ohlcv_data:
-                return None
-                
-            df = pd.DataFrame(ohlcv_data)
-            
-            # Convert time to datetime if available
-            if "time" in df.columns:
-                try:
-                    df["time"] = pd.to_datetime(df["time"], unit="s")
-                    df.set_index("time", inplace=True)
-                except:
-                    df.set_index(pd.RangeIndex(len(df)), inplace=True)
-            else:
-                df.set_index(pd.RangeIndex(len(df)), inplace=True)
-                
-            return df
-            
+            return payload_to_dataframe(data)
         except Exception as e:
             logger.error(f"DataFrame conversion failed: {e}")
             return None
@@ -406,13 +385,13 @@ class FeatureBuilder:
 
 
 def build_features(symbol: str, mt5svc: MT5Service, bridge: IndicatorBridge, 
-                  timeframes: List[str] = None) -> Dict[str, Any]:
+                  timeframes: List[str] = None, multi: Optional[Dict] = None) -> Dict[str, Any]:
     """
     Convenience function to build features for a symbol.
     """
     try:
         builder = FeatureBuilder(mt5svc, bridge)
-        return builder.build(symbol, timeframes)
+        return builder.build(symbol, timeframes, multi=multi)
     except Exception as e:
         logger.error(f"Feature building failed for {symbol}: {e}")
         return FeatureBuilder(mt5svc, bridge)._empty_features()
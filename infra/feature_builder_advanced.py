@@ -46,6 +46,8 @@ import MetaTrader5 as mt5
 from infra.mt5_service import MT5Service
 from infra.indicator_bridge import IndicatorBridge
 from infra.feature_patterns import PatternFeatures
+from infra.feature_store import FeatureFrame, get_feature_store, payload_to_dataframe
+from domain.volume_profile import bar_times, get_volume_profile, grid_step
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +56,7 @@ class FeatureBuilderAdvanced:
     """
     Advanced feature builder with institutional-grade technical indicators.
     Designed for fast computation (<5ms per timeframe) and compact output.
+    Shared indicators (ATR, RSI, EMAs, Bollinger, VWAP) are read from the feature store.
     """
     
     def __init__(self, mt5svc: MT5Service, bridge: IndicatorBridge):
@@ -61,8 +64,11 @@ class FeatureBuilderAdvanced:
         self.bridge = bridge
         self.cache = {}
         self.pattern_features = PatternFeatures()
+        self.store = get_feature_store()
+        # Feature-store frames of the build in progress, by id() of payload and DataFrame
+        self._frames: Dict[int, FeatureFrame] = {}
         
-    def build_features(self, symbol: str, timeframes: List[str] = None) -> Dict[str, Any]:
+    def build_features(self, symbol: str, timeframes: List[str] = None, multi: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Build comprehensive advanced features for symbol across timeframes.
         Returns compact, AI-ready features optimized for GPT consumption.
@@ -70,6 +76,7 @@ class FeatureBuilderAdvanced:
         Args:
             symbol: Trading symbol (e.g., "XAUUSDc")
             timeframes: List of timeframes (defaults to ["M5", "M15", "H1"])
+            multi: get_multi payload the caller already fetched (fetched here if None)
             
         Returns:
             Dict with compact feature representation
@@ -79,10 +86,14 @@ class FeatureBuilderAdvanced:
             
         try:
             # Get multi-timeframe data
-            multi = self.bridge.get_multi(symbol)
+            if multi is None:
+                multi = self.bridge.get_multi(symbol)
             if not multi:
                 logger.warning(f"No data available for {symbol}")
                 return self._empty_features()
+            
+            for tf, data in multi.items():
+                self._attach_frame(symbol, tf, data)
                 
             features = {}
             
@@ -131,13 +142,29 @@ class FeatureBuilderAdvanced:
             if primary_tf in multi:
                 df = self._data_to_dataframe(multi[primary_tf])
                 if df is not None and len(df) >= 100:
-                    features["vp"] = self._compute_volume_profile(df, df['close'].iloc[-1])
+                    features["vp"] = self._compute_volume_profile(df, df['close'].iloc[-1], symbol, primary_tf)
             
             return self._compact_format(features, symbol)
             
         except Exception as e:
             logger.error(f"Feature building failed for {symbol}: {e}", exc_info=True)
             return self._empty_features()
+        finally:
+            self._frames.clear()
+    
+    def _attach_frame(self, symbol: str, timeframe: str, data: Dict) -> None:
+        """Register the store frame of a payload (and its DataFrame) for this build"""
+        if not self.store.enabled or not isinstance(data, dict):
+            return
+        frame = self.store.frame(symbol, timeframe, data)
+        if frame is None or frame.df is None:
+            return
+        self._frames[id(data)] = frame
+        self._frames[id(frame.df)] = frame
+    
+    def _frame_of(self, df_or_data) -> Optional[FeatureFrame]:
+        """Store frame behind a payload or DataFrame of the current build (None otherwise)"""
+        return self._frames.get(id(df_or_data))
     
     # === ANCHOR: RMAG ===
     def _compute_rmag(self, df: pd.DataFrame, current_price: float) -> Dict[str, Any]:
@@ -151,12 +178,17 @@ class FeatureBuilderAdvanced:
             if atr == 0:
                 atr = df['close'].std() * 0.1  # Fallback
             
-            # Calculate EMA200
-            ema200 = df['close'].ewm(span=200, adjust=False).mean().iloc[-1]
-            
-            # Calculate VWAP (session VWAP - simplified)
-            typical_price = (df['high'] + df['low'] + df['close']) / 3
-            vwap = (typical_price * df['volume']).sum() / df['volume'].sum() if df['volume'].sum() > 0 else typical_price.mean()
+            frame = self._frame_of(df)
+            if frame is not None:
+                ema200 = frame.get("ema_200_rec").iloc[-1]
+                vwap = frame.get("vwap_window")
+            else:
+                # Calculate EMA200
+                ema200 = df['close'].ewm(span=200, adjust=False).mean().iloc[-1]
+                
+                # Calculate VWAP (session VWAP - simplified)
+                typical_price = (df['high'] + df['low'] + df['close']) / 3
+                vwap = (typical_price * df['volume']).sum() / df['volume'].sum() if df['volume'].sum() > 0 else typical_price.mean()
             
             # Normalize by ATR
             gap_ema200_atr = round((current_price - ema200) / atr, 2)
@@ -188,8 +220,12 @@ class FeatureBuilderAdvanced:
                 atr = 1.0
             
             # Calculate EMAs
-            ema50 = df['close'].ewm(span=50, adjust=False).mean()
-            ema200 = df['close'].ewm(span=200, adjust=False).mean()
+            frame = self._frame_of(df)
+            if frame is not None:
+                ema50, ema200 = frame.get("ema_50_rec"), frame.get("ema_200_rec")
+            else:
+                ema50 = df['close'].ewm(span=50, adjust=False).mean()
+                ema200 = df['close'].ewm(span=200, adjust=False).mean()
             
             # Calculate slopes
             slope_ema50 = (ema50.iloc[-1] - ema50.iloc[-lookback]) / (lookback * atr)
@@ -213,12 +249,17 @@ class FeatureBuilderAdvanced:
         """
         try:
             # Calculate Bollinger Bands
-            bb_period = 20
-            bb_std = 2
-            sma = df['close'].rolling(window=bb_period).mean()
-            std = df['close'].rolling(window=bb_period).std()
-            bb_upper = sma + (std * bb_std)
-            bb_lower = sma - (std * bb_std)
+            frame = self._frame_of(df)
+            if frame is not None:
+                bands = frame.get("bb_20")
+                bb_upper, bb_lower = bands["upper"], bands["lower"]
+            else:
+                bb_period = 20
+                bb_std = 2
+                sma = df['close'].rolling(window=bb_period).mean()
+                std = df['close'].rolling(window=bb_period).std()
+                bb_upper = sma + (std * bb_std)
+                bb_lower = sma - (std * bb_std)
             
             # Get current BB width
             atr = self._calculate_atr(df, 14)
@@ -517,8 +558,12 @@ class FeatureBuilderAdvanced:
         """
         try:
             # Calculate VWAP
-            typical_price = (df['high'] + df['low'] + df['close']) / 3
-            vwap = (typical_price * df['volume']).sum() / df['volume'].sum() if df['volume'].sum() > 0 else typical_price.mean()
+            frame = self._frame_of(df)
+            if frame is not None:
+                vwap = frame.get("vwap_window")
+            else:
+                typical_price = (df['high'] + df['low'] + df['close']) / 3
+                vwap = (typical_price * df['volume']).sum() / df['volume'].sum() if df['volume'].sum() > 0 else typical_price.mean()
             
             # Get ATR
             atr = self._calculate_atr(df, 14)
@@ -561,11 +606,17 @@ class FeatureBuilderAdvanced:
             else:
                 macd_slope = 0.0
             
-            # Calculate RSI slope
+            # Calculate RSI slope (RSI as of each of the 3 bars before the last)
+            frame = self._frame_of(df)
+            rsi_series = frame.get("rsi_14") if frame is not None else None
             rsi_values = []
             for i in range(-3, 0):
                 if abs(i) <= len(df):
-                    rsi = self._calculate_rsi(df.iloc[:len(df)+i], 14)
+                    if rsi_series is not None:
+                        rsi = rsi_series.iloc[len(df) + i - 1] if len(df) + i > 0 else np.nan
+                        rsi = 50.0 if pd.isna(rsi) else float(rsi)
+                    else:
+                        rsi = self._calculate_rsi(df.iloc[:len(df)+i], 14)
                     rsi_values.append(rsi)
             
             if len(rsi_values) >= 2:
@@ -610,9 +661,13 @@ class FeatureBuilderAdvanced:
                 current_close = closes[-1]
                 
                 # Check EMA200
-                df_temp = self._data_to_dataframe(data)
+                frame = self._frame_of(data)
+                df_temp = frame.df if frame is not None else self._data_to_dataframe(data)
                 if df_temp is not None and len(df_temp) >= 200:
-                    ema200 = df_temp['close'].ewm(span=200, adjust=False).mean().iloc[-1]
+                    if frame is not None:
+                        ema200 = frame.get("ema_200_rec").iloc[-1]
+                    else:
+                        ema200 = df_temp['close'].ewm(span=200, adjust=False).mean().iloc[-1]
                     if current_close > ema200:
                         score += 1
                 
@@ -647,10 +702,12 @@ class FeatureBuilderAdvanced:
             return {"m5": 0, "m15": 0, "h1": 0, "total": 0, "max": 3}
     
     # === ANCHOR: VOLUME_PROFILE ===
-    def _compute_volume_profile(self, df: pd.DataFrame, current_price: float) -> Dict[str, Any]:
+    def _compute_volume_profile(self, df: pd.DataFrame, current_price: float,
+                                symbol: Optional[str] = None, timeframe: Optional[str] = None) -> Dict[str, Any]:
         """
         Volume Profile HVN/LVN - magnet/vacuum zones.
-        Coarse histogram over recent N bars to find high/low volume nodes.
+        Coarse histogram (20 bins) of the shared volume profile over recent N bars
+        to find high/low volume nodes.
         """
         try:
             if len(df) < 100:
@@ -662,45 +719,27 @@ class FeatureBuilderAdvanced:
             
             # Use last 200 bars for volume profile
             recent = df.iloc[-200:]
-            
-            # Create price bins (20 bins)
-            price_min = recent['low'].min()
-            price_max = recent['high'].max()
-            num_bins = 20
-            bin_size = (price_max - price_min) / num_bins
-            
-            # Calculate volume per price level
-            bins = []
-            for i in range(num_bins):
-                bin_low = price_min + i * bin_size
-                bin_high = bin_low + bin_size
-                bin_mid = (bin_low + bin_high) / 2
-                
-                # Sum volume where price was in this bin
-                mask = (recent['low'] <= bin_high) & (recent['high'] >= bin_low)
-                bin_volume = recent.loc[mask, 'volume'].sum()
-                
-                bins.append({"price": bin_mid, "volume": bin_volume})
-            
-            # Sort by volume to find HVN and LVN
-            sorted_bins = sorted(bins, key=lambda x: x['volume'], reverse=True)
-            
-            # Top 2 HVNs (High Volume Nodes)
-            hvns = [sorted_bins[0]['price'], sorted_bins[1]['price']] if len(sorted_bins) >= 2 else [sorted_bins[0]['price']]
-            
-            # Bottom LVN (Low Volume Node)
-            lvn = sorted_bins[-1]['price'] if len(sorted_bins) > 0 else current_price
+            price_range = float(recent['high'].max() - recent['low'].min())
+            if bar_times(df) is None:
+                symbol = timeframe = None
+            profile = get_volume_profile(symbol, timeframe, 200, grid_step(price_range))
+            profile.update_df(df)
+            
+            # Top 2 HVNs (High Volume Nodes) and bottom LVN (Low Volume Node) over 20 bins
+            hvns, lvns = profile.nodes(top=2, bottom=1, bins=20)
+            if len(hvns) == 0:
+                return {"hvn_dist_atr": 0.0, "lvn_dist_atr": 0.0}
+            lvn = lvns[0] if len(lvns) else current_price
             
             # Find nearest HVN
-            hvn_dists = [abs(hvn - current_price) for hvn in hvns]
-            nearest_hvn_dist = min(hvn_dists) if hvn_dists else 0.0
+            nearest_hvn_dist = float(np.min(np.abs(hvns - current_price)))
             
             # LVN distance
             lvn_dist = abs(lvn - current_price)
             
             return {
                 "hvn_dist_atr": round(nearest_hvn_dist / atr, 2),
-                "lvn_dist_atr": round(lvn_dist / atr, 2)
+                "lvn_dist_atr": round(float(lvn_dist) / atr, 2)
             }
         except Exception as e:
             logger.debug(f"Volume profile calculation failed: {e}")
@@ -729,55 +768,21 @@ class FeatureBuilderAdvanced:
     # === Helper Methods ===
     
     def _data_to_dataframe(self, data: Dict) -> Optional[pd.DataFrame]:
-        """Convert indicator bridge data to DataFrame."""
+        """Convert indicator bridge data to DataFrame (the store's DataFrame during a build)."""
+        frame = self._frame_of(data)
+        if frame is not None:
+            return frame.df
         try:
-            if not data:
-                return None
-                
-            # Use the keys from indicator_bridge format
-            opens = data.get('opens', [])
-            highs = data.get('highs', [])
-            lows = data.get('lows', [])
-            closes = data.get('closes', [])
-            volumes = data.get('volumes', [])
-            times = data.get('times', [])
-            
-            if not closes:
-                return None
-            
-            df = pd.DataFrame({
-                'open': opens,
-                'high': highs,
-                'low': lows,
-                'close': closes,
-                'volume': volumes
-            })
-            
-            # Add time index if available
-            if times:
-                try:
-                    # Handle different time formats: Unix timestamps (int/float) or ISO strings
-                    if times and len(times) > 0:
-                        first_time = times[0]
-                        if isinstance(first_time, (int, float)):
-                            # Unix timestamp - check if seconds or milliseconds
-                            if first_time > 1e10:  # Likely milliseconds
-                                df.index = pd.to_datetime(times, unit='ms', errors='coerce')
-                            else:  # Likely seconds
-                                df.index = pd.to_datetime(times, unit='s', errors='coerce')
-                        else:
-                            # String or datetime - use errors='coerce' to suppress warnings and handle parsing errors
-                            df.index = pd.to_datetime(times, errors='coerce')
-                except:
-                    pass
-            
-            return df
+            return payload_to_dataframe(data)
         except Exception as e:
             logger.debug(f"DataFrame conversion failed: {e}")
             return None
     
     def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> float:
         """Calculate Average True Range."""
+        frame = self._frame_of(df)
+        if frame is not None and period in (14, 20, 100):
+            return frame.last(f"atr_{period}")
         try:
             high = df['high']
             low = df['low']
@@ -797,6 +802,9 @@ class FeatureBuilderAdvanced:
     
     def _calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> float:
         """Calculate Relative Strength Index."""
+        frame = self._frame_of(df)
+        if frame is not None and period == 14:
+            return frame.last("rsi_14", 50.0)
         try:
             delta = df['close'].diff()
             gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
@@ -832,7 +840,7 @@ class FeatureBuilderAdvanced:
 
 # === Module-level convenience function ===
 def build_features_advanced(symbol: str, mt5svc: MT5Service, bridge: IndicatorBridge,
-                     timeframes: List[str] = None) -> Dict[str, Any]:
+                     timeframes: List[str] = None, multi: Optional[Dict] = None) -> Dict[str, Any]:
     """
     Convenience function to build advanced features for a symbol.
 
@@ -842,7 +850,7 @@ def build_features_advanced(symbol: str, mt5svc: MT5Service, bridge: IndicatorBr
     """
     try:
         builder = FeatureBuilderAdvanced(mt5svc, bridge)
-        return builder.build_features(symbol, timeframes)
+        return builder.build_features(symbol, timeframes, multi=multi)
     except Exception as e:
         logger.error(f"Feature building failed for {symbol}: {e}", exc_info=True)
         return FeatureBuilderAdvanced(mt5svc, bridge)._empty_features()
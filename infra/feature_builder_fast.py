@@ -12,6 +12,7 @@ from datetime import datetime, timezone
 
 from infra.mt5_service import MT5Service
 from infra.indicator_bridge import IndicatorBridge
+from infra.feature_store import get_feature_store
 
 logger = logging.getLogger(__name__)
 
@@ -37,11 +38,19 @@ class FastFeatureBuilder:
         'volume', 'regime'
     }
     
+    # Essential indicators read from the shared feature store (the rest come from the payload)
+    STORE_SERIES = {
+        'ema_20': 'ema_20', 'ema_50': 'ema_50', 'ema_200': 'ema_200',
+        'atr_14': 'atr_14', 'rsi_14': 'rsi_14',
+    }
+    STORE_BANDS = {'bb_upper': 'upper', 'bb_middle': 'middle', 'bb_lower': 'lower', 'bb_width': 'width'}
+    
     def __init__(self, mt5svc: MT5Service, bridge: IndicatorBridge):
         self.mt5svc = mt5svc
         self.bridge = bridge
+        self.store = get_feature_store()
         
-    def build(self, symbol: str, timeframes: List[str] = None) -> Dict[str, Any]:
+    def build(self, symbol: str, timeframes: List[str] = None, multi: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Build FAST feature set for symbol.
         Only computes essential indicators, skips:
@@ -49,13 +58,15 @@ class FastFeatureBuilder:
         - Complex structure analysis (FVG, liquidity, etc.)
         - Microstructure features
         - Cross-timeframe correlations
+        Pass ``multi`` to reuse multi-timeframe data the caller already fetched.
         """
         if timeframes is None:
             timeframes = ["M5", "M15"]  # Only 2 timeframes for speed
             
         try:
             # Get multi-timeframe data
-            multi = self.bridge.get_multi(symbol)
+            if multi is None:
+                multi = self.bridge.get_multi(symbol)
             if not multi:
                 return self._empty_features()
                 
@@ -86,8 +97,27 @@ class FastFeatureBuilder:
             
             features = {}
             
-            # Extract essential indicators directly (no DataFrame overhead for simple extractions)
+            # Essential indicators from the shared feature store (computed once per bar)
+            frame = self.store.frame(symbol, timeframe, data) if self.store.enabled else None
+            df = frame.df if frame is not None else None
+            if df is not None and len(df) > 0:
+                last = df.iloc[-1]
+                for key in ('open', 'high', 'low', 'close', 'volume'):
+                    features[key] = float(last[key])
+                for key, name in self.STORE_SERIES.items():
+                    value = frame.get(name).iloc[-1]
+                    if not pd.isna(value):
+                        features[key] = float(value)
+                bands = frame.get('bb_20')
+                for key, band in self.STORE_BANDS.items():
+                    value = bands[band].iloc[-1]
+                    if not pd.isna(value):
+                        features[key] = float(value)
+            
+            # Remaining essentials straight from the payload (no DataFrame overhead)
             for key in self.ESSENTIAL_INDICATORS:
+                if key in features:
+                    continue
                 if key in data:
                     val = data[key]
                     # Normalize to simple types (no numpy/pandas objects)
@@ -16,8 +16,15 @@ class IndicatorFeatures:
     Focuses on trend, momentum, volatility, and volume indicators.
     """
     
-    def compute(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Dict[str, Any]:
-        """Compute all indicator features for the given DataFrame."""
+    # Feature-store frame of the DataFrame being computed (shared EMA/RSI/ATR/Bollinger series)
+    _frame = None
+    
+    def compute(self, df: pd.DataFrame, symbol: str, timeframe: str, frame=None) -> Dict[str, Any]:
+        """
+        Compute all indicator features for the given DataFrame.
+        ``frame`` is its infra.feature_store frame, if any; shared series are read from it.
+        """
+        self._frame = frame
         try:
             features = {}
             
@@ -38,6 +45,8 @@ class IndicatorFeatures:
         except Exception as e:
             logger.error(f"Indicator computation failed for {symbol} {timeframe}: {e}")
             return {}
+        finally:
+            self._frame = None
     
     def _compute_trend_indicators(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Compute trend indicators: EMA, Hull MA, SuperTrend."""
@@ -197,10 +206,14 @@ class IndicatorFeatures:
     
     def _ema(self, series: pd.Series, period: int) -> pd.Series:
         """Calculate Exponential Moving Average."""
+        if self._frame is not None and period in (20, 50, 200):
+            return self._frame.get(f"ema_{period}")
         return series.ewm(span=period).mean()
     
     def _rsi(self, series: pd.Series, period: int) -> pd.Series:
         """Calculate RSI."""
+        if self._frame is not None and period == 14:
+            return self._frame.get("rsi_14")
         delta = series.diff()
         gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
         loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
@@ -218,6 +231,8 @@ class IndicatorFeatures:
     
     def _atr(self, df: pd.DataFrame, period: int) -> pd.Series:
         """Calculate Average True Range."""
+        if self._frame is not None and period in (14, 20, 100):
+            return self._frame.get(f"atr_{period}")
         high_low = df["high"] - df["low"]
         high_close = np.abs(df["high"] - df["close"].shift())
         low_close = np.abs(df["low"] - df["close"].shift())
@@ -226,6 +241,8 @@ class IndicatorFeatures:
     
     def _bollinger_bands(self, series: pd.Series, period: int, std_dev: float) -> Dict[str, pd.Series]:
         """Calculate Bollinger Bands."""
+        if self._frame is not None and (period, std_dev) == (20, 2):
+            return self._frame.get("bb_20")
         middle = series.rolling(window=period).mean()
         std = series.rolling(window=period).std()
         upper = middle + (std * std_dev)
@@ -0,0 +1,304 @@
+"""
+Feature Store - shared, lazily computed indicator features per (symbol, timeframe, bar time).
+
+FeatureBuilder, FeatureBuilderAdvanced and FastFeatureBuilder read the same get_multi
+payloads; the store converts each payload to a DataFrame once and computes every shared
+feature (ATR, RSI, EMAs, Bollinger, VWAP, ...) once per bar instead of once per builder
+and per call site.
+
+- Features are registered once with their dependencies (register_feature); a frame computes
+  a feature on first request, resolving its dependencies first, and memoizes it
+- Builders also memoize their own per-timeframe blocks on the frame (FeatureFrame.memo), so
+  repeated builds within a bar are reads
+- Frames are keyed by (symbol, timeframe, last bar time) and live until the next bar; a
+  revised forming bar (same time, different OHLCV) gets a fresh frame
+- Payloads in the IndicatorBridge format (opens/highs/lows/closes/volumes/times) and the
+  singular form (open/high/low/close/volume/time) are both accepted
+- With the store disabled every request is computed from scratch (benchmark baseline)
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MAX_FRAMES = 256
+
+_COLUMNS = ("open", "high", "low", "close", "volume")
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    name: str
+    deps: Tuple[str, ...]
+    fn: Callable[..., Any]
+
+
+FEATURES: Dict[str, FeatureSpec] = {
+    # Root of every dependency chain: the get_multi payload, seeded by each frame
+    "payload": FeatureSpec("payload", (), None),
+}
+
+
+def register_feature(name: str, deps: Tuple[str, ...] = ("df",)):
+    """Register ``fn(*dep_values)`` as feature ``name`` (decorator)"""
+    def decorator(fn):
+        for dep in deps:
+            if dep not in FEATURES:
+                raise ValueError(f"Feature {name} depends on unregistered feature {dep}")
+        FEATURES[name] = FeatureSpec(name, tuple(deps), fn)
+        return fn
+    return decorator
+
+
+def _column(data: Dict, name: str):
+    """Payload column by bridge (plural) or singular key"""
+    values = data.get(name + "s")
+    if values is None or isinstance(values, (int, float)):
+        values = data.get(name)
+    return values if isinstance(values, (list, tuple, np.ndarray)) else None
+
+
+def payload_to_dataframe(data: Dict) -> Optional[pd.DataFrame]:
+    """OHLCV DataFrame (DatetimeIndex when times are available) from a get_multi payload"""
+    if not data:
+        return None
+    closes = _column(data, "close")
+    if closes is None or len(closes) == 0:
+        return None
+    n = len(closes)
+    frame = {}
+    for col in _COLUMNS:
+        values = _column(data, col)
+        frame[col] = values if values is not None and len(values) == n else np.zeros(n)
+    df = pd.DataFrame(frame)
+
+    times = _column(data, "time")
+    if times is not None and len(times) == n:
+        try:
+            first = times[0]
+            if isinstance(first, (int, float, np.integer, np.floating)):
+                # Unix timestamp - seconds or milliseconds
+                index = pd.to_datetime(times, unit="ms" if first > 1e10 else "s", errors="coerce")
+            else:
+                index = pd.to_datetime(times, errors="coerce")
+            if not pd.isna(index).any():
+                df.index = index
+        except Exception:
+            pass
+    return df
+
+
+def _last_time(data: Dict) -> Optional[Hashable]:
+    times = _column(data, "time")
+    if times is None or len(times) == 0:
+        return None
+    last = times[-1]
+    return last.item() if isinstance(last, np.generic) else last
+
+
+def _revision(data: Dict) -> Tuple:
+    """Length and last-bar OHLCV: changes when the forming bar is revised"""
+    return tuple(
+        (len(values), float(values[-1])) if values is not None and len(values) else None
+        for values in (_column(data, col) for col in _COLUMNS)
+    )
+
+
+class FeatureFrame:
+    """Features of one bar window; each feature is computed on first request"""
+
+    def __init__(self, data: Dict, memoize: bool = True):
+        self.data = data
+        self.memoize = memoize
+        self._values: Dict[str, Any] = {"payload": data}
+        self._memo: Dict[Hashable, Any] = {}
+        self._lock = threading.RLock()
+        self.computed = 0
+        self.hits = 0
+
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        return self.get("df")
+
+    def get(self, name: str) -> Any:
+        with self._lock:
+            if name in self._values:
+                if name != "payload":
+                    self.hits += 1
+                return self._values[name]
+            spec = FEATURES.get(name)
+            if spec is None:
+                raise KeyError(f"Unknown feature: {name}")
+            value = spec.fn(*(self.get(dep) for dep in spec.deps))
+            self.computed += 1
+            if self.memoize:
+                self._values[name] = value
+            return value
+
+    def memo(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Memoize a caller's own per-bar result (e.g. a builder's timeframe block) on this frame"""
+        with self._lock:
+            held = self._memo.get(key, _MISSING)
+            if held is not _MISSING:
+                self.hits += 1
+                return held
+            value = compute()
+            self.computed += 1
+            if self.memoize:
+                self._memo[key] = value
+            return value
+
+    def last(self, name: str, default: float = 0.0) -> float:
+        """Last value of a series feature (default if empty or NaN)"""
+        series = self.get(name)
+        if series is None or len(series) == 0:
+            return default
+        value = series.iloc[-1]
+        return default if pd.isna(value) else float(value)
+
+
+class FeatureStore:
+    """Frames per (symbol, timeframe, bar time), least recently used beyond max_frames dropped"""
+
+    def __init__(self, max_frames: int = MAX_FRAMES, enabled: bool = True):
+        self.max_frames = max_frames
+        self.enabled = enabled
+        self._frames: "OrderedDict[Tuple[str, str], Tuple[Tuple, FeatureFrame]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.frame_hits = 0
+        self.frame_misses = 0
+
+    def frame(self, symbol: Optional[str], timeframe: Optional[str], data: Optional[Dict]) -> Optional[FeatureFrame]:
+        """Frame for this payload; shared while (symbol, timeframe, last bar) is unchanged"""
+        if not data:
+            return None
+        if not self.enabled:
+            return FeatureFrame(data, memoize=False)
+        last_time = _last_time(data)
+        if symbol is None or timeframe is None or last_time is None:
+            return FeatureFrame(data)
+
+        key = (symbol, timeframe)
+        version = (last_time, _revision(data))
+        with self._lock:
+            held = self._frames.get(key)
+            if held is not None and held[0] == version:
+                self._frames.move_to_end(key)
+                self.frame_hits += 1
+                return held[1]
+            frame = FeatureFrame(data)
+            self._frames[key] = (version, frame)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+            self.frame_misses += 1
+            return frame
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self.frame_hits = self.frame_misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            frames = [frame for _, frame in self._frames.values()]
+            return {
+                "enabled": self.enabled,
+                "frames": len(frames),
+                "frame_hits": self.frame_hits,
+                "frame_misses": self.frame_misses,
+                "features_computed": sum(f.computed for f in frames),
+                "feature_hits": sum(f.hits for f in frames),
+            }
+
+
+# ------------------------------------------------------------
+# Registered features
+# ------------------------------------------------------------
+register_feature("df", ("payload",))(payload_to_dataframe)
+
+
+@register_feature("true_range")
+def _true_range(df):
+    high_low = df["high"] - df["low"]
+    high_close = np.abs(df["high"] - df["close"].shift())
+    low_close = np.abs(df["low"] - df["close"].shift())
+    return np.maximum(high_low, np.maximum(high_close, low_close))
+
+
+for _period in (14, 20, 100):
+    register_feature(f"atr_{_period}", ("true_range",))(
+        lambda tr, period=_period: tr.rolling(window=period).mean()
+    )
+
+
+@register_feature("rsi_14")
+def _rsi_14(df):
+    delta = df["close"].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+for _span in (20, 50, 200):
+    # ewm(span) as IndicatorFeatures/IndicatorBridge compute it; "_rec" is the recursive form
+    # (adjust=False) FeatureBuilderAdvanced uses
+    register_feature(f"ema_{_span}")(lambda df, span=_span: df["close"].ewm(span=span).mean())
+    register_feature(f"ema_{_span}_rec")(lambda df, span=_span: df["close"].ewm(span=span, adjust=False).mean())
+
+
+@register_feature("bb_20")
+def _bollinger_20(df):
+    middle = df["close"].rolling(window=20).mean()
+    std = df["close"].rolling(window=20).std()
+    upper = middle + (std * 2)
+    lower = middle - (std * 2)
+    return {
+        "upper": upper,
+        "middle": middle,
+        "lower": lower,
+        "width": (upper - lower) / middle,
+        "percent_b": (df["close"] - lower) / (upper - lower),
+    }
+
+
+@register_feature("typical_price")
+def _typical_price(df):
+    return (df["high"] + df["low"] + df["close"]) / 3
+
+
+@register_feature("vwap_window", ("df", "typical_price"))
+def _vwap_window(df, typical_price):
+    """VWAP over the whole window (typical-price mean without volume)"""
+    volume = df["volume"].sum()
+    return (typical_price * df["volume"]).sum() / volume if volume > 0 else typical_price.mean()
+
+
+_store: Optional[FeatureStore] = None
+_store_lock = threading.Lock()
+
+
+def get_feature_store() -> FeatureStore:
+    """Get the process-wide feature store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = FeatureStore()
+    return _store
+
+
+def set_feature_store(store: Optional[FeatureStore]) -> None:
+    """Replace the process-wide feature store (tests / benchmark)"""
+    global _store
+    with _store_lock:
+        _store = store
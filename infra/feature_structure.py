@@ -6,7 +6,7 @@ IMPROVED: Phase 4.1 - Integrated liquidity, BOS/CHOCH, FVG, and wick asymmetry d
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 # IMPROVED: Import Phase 4.1 detectors
@@ -14,7 +14,9 @@ from domain.liquidity import detect_equal_highs, detect_equal_lows, detect_sweep
 from domain.market_structure import detect_bos_choch
 from domain.fvg import detect_fvg
 from domain.candle_stats import calculate_wick_asymmetry
+from domain.level_clusters import cluster_prices
 from domain.volume_footprint import calculate_rolling_volume_footprint
+from domain.volume_profile import bar_times
 
 logger = logging.getLogger(__name__)
 
@@ -47,11 +49,13 @@ class StructureFeatures:
             # IMPROVED: Phase 4.1 - Enhanced structure detectors
             atr_14 = self._calculate_atr(df.tail(14)) if len(df) >= 14 else 0.0
             
+            # Phase 3.1 - Rolling Volume Footprint (also reported with the liquidity clusters)
+            footprint = self._compute_volume_footprint(df, symbol, timeframe)
+            
             # Equal Highs/Lows (liquidity clusters)
-            features.update(self._compute_liquidity_clusters(df, atr_14))
+            features.update(self._compute_liquidity_clusters(df, atr_14, footprint))
             
-            # Phase 3.1 - Rolling Volume Footprint
-            features.update(self._compute_volume_footprint(df))
+            features.update(footprint)
             
             # Sweeps (liquidity grabs)
             features.update(self._compute_sweeps(df, atr_14))
@@ -292,23 +296,9 @@ class StructureFeatures:
         if not levels:
             return []
         
-        levels = sorted(levels)
         clusters = []
-        current_cluster = [levels[0]]
-        
-        for i in range(1, len(levels)):
-            if abs(levels[i] - levels[i-1]) / levels[i-1] <= tolerance:
-                current_cluster.append(levels[i])
-            else:
-                if len(current_cluster) > 0:
-                    clusters.append({
-                        "price": np.mean(current_cluster),
-                        "touches": len(current_cluster),
-                        "levels": current_cluster
-                    })
-                current_cluster = [levels[i]]
-        
-        if len(current_cluster) > 0:
+        for group in cluster_prices(levels, tolerance, relative=True):
+            current_cluster = [levels[i] for i in group]
             clusters.append({
                 "price": np.mean(current_cluster),
                 "touches": len(current_cluster),
@@ -439,7 +429,8 @@ class StructureFeatures:
     
     # IMPROVED: Phase 4.1 - Market Structure Toolkit Integration
     
-    def _compute_liquidity_clusters(self, df: pd.DataFrame, atr: float) -> Dict[str, Any]:
+    def _compute_liquidity_clusters(self, df: pd.DataFrame, atr: float,
+                                    footprint: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Compute equal highs/lows (liquidity clusters) using Phase 4.1 detector.
         These identify resting liquidity zones where stops are likely parked.
@@ -508,7 +499,7 @@ class StructureFeatures:
             result.update(stop_clusters)
             
             # Phase 3.1 - Add volume footprint data to liquidity dict
-            footprint_data = self._compute_volume_footprint(df)
+            footprint_data = footprint if footprint is not None else self._compute_volume_footprint(df)
             if footprint_data.get("footprint_active", False):
                 result["footprint"] = {
                     "footprint_active": True,
@@ -542,7 +533,8 @@ class StructureFeatures:
                 "stop_cluster_below_dist_atr": 999.0
             }
     
-    def _compute_volume_footprint(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _compute_volume_footprint(self, df: pd.DataFrame, symbol: Optional[str] = None,
+                                  timeframe: Optional[str] = None) -> Dict[str, Any]:
         """
         Phase 3.1: Compute rolling volume footprint.
         
@@ -551,6 +543,8 @@ class StructureFeatures:
         - Value Area (70% volume range)
         - HVN/LVN zones (high/low volume nodes)
         - Current price volume rank
+        
+        Bars with real times share the (symbol, timeframe) volume profile across calls.
         """
         try:
             # Use window of 100 bars for footprint (configurable)
@@ -594,19 +588,18 @@ class StructureFeatures:
                         "current_price_volume_pct": 0.0,
                     }
             
-            # Ensure time index for DataFrame
-            if not hasattr(df.index, 'dtype') or 'datetime' not in str(df.index.dtype):
-                # Create a time index if missing
-                df = df.copy()
-                df['time'] = pd.date_range(start='2024-01-01', periods=len(df), freq='5min')
-                df = df.set_index('time')
+            # Without bar times the profile can't be synced incrementally - build a private one
+            if bar_times(df) is None:
+                symbol = timeframe = None
             
             # Calculate footprint
             footprint = calculate_rolling_volume_footprint(
                 df,
                 window_bars=window_bars,
                 price_precision=4,  # Adjust based on symbol (4 for most forex/crypto)
-                min_volume_threshold=0.01
+                min_volume_threshold=0.01,
+                symbol=symbol,
+                timeframe=timeframe
             )
             
             if not footprint.get("footprint_active", False):
@@ -202,6 +202,7 @@ class HDRHistogramManager:
     def __init__(self):
         self.stage_metrics: Dict[PipelineStage, StageMetrics] = {}
         self.queue_metrics: Dict[QueueType, QueueMetrics] = {}
+        self.span_histograms: Dict[str, HDRHistogram] = {}
         self.lock = threading.RLock()
         self.config = HistogramConfig()
         
@@ -289,6 +290,36 @@ class HDRHistogramManager:
                 self.queue_metrics[queue_type].underflow_count += 1
                 self.queue_metrics[queue_type].last_update = time.time()
     
+    def record_span_latency(self, span: str, latency_ms: float) -> None:
+        """Record latency for a named tracer span (created on first use)"""
+        histogram = self.span_histograms.get(span)
+        if histogram is None:
+            with self.lock:
+                histogram = self.span_histograms.setdefault(span, HDRHistogram(self.config))
+        histogram.record_value(latency_ms)
+    
+    def get_span_percentiles(self, span: str) -> PercentileStats:
+        """Get latency percentiles for a named tracer span"""
+        histogram = self.span_histograms.get(span)
+        return histogram.get_percentiles() if histogram else PercentileStats()
+    
+    def get_all_span_metrics(self) -> Dict[str, Any]:
+        """Get latency percentiles for every recorded span"""
+        with self.lock:
+            spans = list(self.span_histograms.items())
+        result = {}
+        for span, histogram in spans:
+            stats = histogram.get_percentiles()
+            result[span] = {
+                'p50': stats.p50,
+                'p95': stats.p95,
+                'p99': stats.p99,
+                'mean': stats.mean,
+                'max': stats.max_value,
+                'count': stats.count
+            }
+        return result
+    
     def get_stage_latency_percentiles(self, stage: PipelineStage) -> PercentileStats:
         """Get latency percentiles for a stage"""
         with self.lock:
@@ -438,6 +469,9 @@ class HDRHistogramManager:
                 metrics.processing_time_histogram.reset()
                 metrics.overflow_count = 0
                 metrics.underflow_count = 0
+            
+            for histogram in self.span_histograms.values():
+                histogram.reset()
 
 # Global histogram manager instance
 _histogram_manager: Optional[HDRHistogramManager] = None
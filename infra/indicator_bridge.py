@@ -3,7 +3,8 @@ Fixed Indicator Bridge - Direct MT5 calls instead of file-based system
 """
 import logging
 from typing import Dict, Any, Optional
-import MetaTrader5 as mt5
+import MetaTrader5  # noqa: F401
+from infra.mt5_gateway import mt5
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
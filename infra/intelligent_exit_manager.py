@@ -15,6 +15,7 @@ import json
 import os
 import sys
 import threading
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -294,6 +295,20 @@ class IntelligentExitManager:
         self.rules: Dict[int, ExitRule] = {}  # ticket -> ExitRule
         self.rules_lock = threading.Lock()  # NEW: Phase 9 - Protect rules dictionary from race conditions
         
+        # Rule persistence: storage_file is a snapshot, per-ticket changes are appended to a
+        # journal next to it and folded back into the snapshot once the journal grows
+        self._persisted_rules: Dict[int, Dict[str, Any]] = {}  # ticket -> last persisted rule dict
+        self._journal_entries = 0
+        self._journal_compact_min = 200  # compact after max(this, 10 x rules) journal entries
+        self._persist_lock = threading.Lock()  # Serializes journal appends and compaction
+        
+        # Per-cycle symbol context: while check_exits runs, bars/ATR/features/order flow
+        # fetched for a symbol are reused by every rule on that symbol (thread-local)
+        self._cycle = threading.local()
+        self._last_cycle_stats: Dict[str, Any] = {}
+        self._vix_cache: Optional[tuple] = None  # (fetched_at, price)
+        self._vix_cache_ttl = 300  # seconds
+        
         # Phase 12: Circuit breaker for ATR calculation failures
         self._atr_failure_count: Dict[str, int] = {}  # Track ATR failures per symbol
         self._atr_circuit_breaker_threshold = 5  # Open circuit after 5 failures
@@ -400,7 +415,7 @@ class IntelligentExitManager:
         # This prevents NameError when advanced_features is not available
         rule.advanced_gate = {}
 
-        self._save_rules()
+        self._save_rules([ticket])
         
         # Log rule addition to database
         if self.db_logger:
@@ -734,7 +749,7 @@ class IntelligentExitManager:
         # Phase 9: Thread-safe dictionary access
         with self.rules_lock:
             self.rules[ticket] = rule
-        self._save_rules()  # Save after releasing lock
+        self._save_rules([ticket])  # Save after releasing lock
         
         # Log Advanced-enhanced rule addition to database
         if self.db_logger:
@@ -872,7 +887,7 @@ class IntelligentExitManager:
             if ticket in self.rules:  # Double-check it still exists
                 del self.rules[ticket]
         
-        self._save_rules()  # Save after releasing lock
+        self._save_rules([ticket])  # Save after releasing lock
         logger.info(f"Removed exit rule for ticket {ticket}")
         return True
     
@@ -926,211 +941,272 @@ class IntelligentExitManager:
                 self.remove_rule(ticket)
             return actions
         
-        position_tickets = {pos.ticket for pos in positions}
+        # Index positions once per cycle
+        positions_by_ticket = {pos.ticket: pos for pos in positions}
         
-        # Phase 9: Thread-safe snapshot for iteration
+        # Phase 9: Thread-safe snapshot for iteration, grouped by symbol so every rule on a
+        # symbol is evaluated against one shared context (bars, ATR, features, order flow)
         with self.rules_lock:
-            tickets = list(self.rules.keys())
+            tickets = sorted(self.rules, key=lambda t: (self.rules[t].symbol, t))
+            symbol_of = {t: self.rules[t].symbol for t in tickets}
         
-        # Check each rule (iterate over snapshot)
-        for ticket in tickets:
-            # Phase 9: Thread-safe access
-            with self.rules_lock:
-                rule = self.rules.get(ticket)
-                if not rule:
-                    continue  # Rule removed, skip
-            
-            # Process rule (outside lock to avoid deadlock)
-            # If position is closed, remove rule
-            if ticket not in position_tickets:
-                # Log enhanced closure information and get closure details
-                closure_info = self._log_position_closure(ticket, rule)
-                if closure_info:
-                    # Add closure as an action for Telegram notification
-                    actions.append({
-                        "type": "position_closed",
-                        "ticket": ticket,
-                        **closure_info
-                    })
-                self.remove_rule(ticket)
-                continue
-            
-            # Get position and verify it still exists (race condition protection)
-            position = next((p for p in positions if p.ticket == ticket), None)
-            if not position:
-                # Position was closed between the check and now - skip it
-                logger.debug(f"Position {ticket} no longer found, skipping (likely closed)")
-                continue
-            
-            # Double-check position still exists in MT5 (prevents using stale position data)
-            current_position = mt5.positions_get(ticket=ticket)
-            if not current_position or len(current_position) == 0:
-                logger.debug(f"Position {ticket} verified as closed, removing rule")
-                closure_info = self._log_position_closure(ticket, rule)
-                if closure_info:
+        cycle_start = time.perf_counter()
+        symbol_ms: Dict[str, float] = {}
+        rules_per_symbol: Dict[str, int] = {}
+        self._cycle.contexts = {}
+        try:
+            for ticket in tickets:
+                symbol = symbol_of[ticket]
+                rule_start = time.perf_counter()
+                self._check_rule_exits(ticket, positions_by_ticket, vix_price, actions)
+                symbol_ms[symbol] = symbol_ms.get(symbol, 0.0) + (time.perf_counter() - rule_start) * 1000
+                rules_per_symbol[symbol] = rules_per_symbol.get(symbol, 0) + 1
+        finally:
+            self._cycle.contexts = None
+        
+        self._last_cycle_stats = {
+            "finished_at": datetime.now().isoformat(),
+            "duration_ms": round((time.perf_counter() - cycle_start) * 1000, 1),
+            "symbols": len(rules_per_symbol),
+            "rules": len(tickets),
+            "actions": len(actions),
+            "per_symbol": {
+                symbol: {"rules": rules_per_symbol[symbol], "ms": round(symbol_ms[symbol], 1)}
+                for symbol in rules_per_symbol
+            },
+        }
+        logger.debug(
+            f"Exit check cycle: {self._last_cycle_stats['rules']} rule(s) on "
+            f"{self._last_cycle_stats['symbols']} symbol(s) in {self._last_cycle_stats['duration_ms']}ms"
+        )
+        
+        # Journal every checked rule that changed this cycle - actions, trailing state and
+        # last_check (which marks a rule as monitored across restarts); unchanged rules cost nothing
+        self._save_rules(tickets)
+        
+        return actions
+    
+    def _check_rule_exits(
+        self,
+        ticket: int,
+        positions_by_ticket: Dict[int, Any],
+        vix_price: Optional[float],
+        actions: List[Dict[str, Any]]
+    ) -> None:
+        """Evaluate one rule within a check_exits cycle, appending any actions taken"""
+        # Phase 9: Thread-safe access
+        with self.rules_lock:
+            rule = self.rules.get(ticket)
+            if not rule:
+                return  # Rule removed, skip
+        
+        # Process rule (outside lock to avoid deadlock)
+        # If position is closed, remove rule
+        position = positions_by_ticket.get(ticket)
+        if position is None:
+            # Log enhanced closure information and get closure details
+            closure_info = self._log_position_closure(ticket, rule)
+            if closure_info:
+                # Add closure as an action for Telegram notification
+                actions.append({
+                    "type": "position_closed",
+                    "ticket": ticket,
+                    **closure_info
+                })
+            self.remove_rule(ticket)
+            return
+        
+        # Double-check position still exists in MT5 (prevents using stale position data)
+        current_position = mt5.positions_get(ticket=ticket)
+        if not current_position or len(current_position) == 0:
+            logger.debug(f"Position {ticket} verified as closed, removing rule")
+            closure_info = self._log_position_closure(ticket, rule)
+            if closure_info:
+                actions.append({
+                    "type": "position_closed",
+                    "ticket": ticket,
+                    **closure_info
+                })
+            self.remove_rule(ticket)
+            return
+        
+        # Use the current position data (not stale)
+        position = current_position[0]
+        
+        # Phase 3.1: Check order flow flip exit first (highest priority)
+        if self.order_flow_service and hasattr(self.order_flow_service, 'running') and self.order_flow_service.running:
+            try:
+                flip_exit = self._check_order_flow_flip(ticket, rule, position)
+                if flip_exit:
                     actions.append({
-                        "type": "position_closed",
                         "ticket": ticket,
-                        **closure_info
+                        "action": "close",
+                        "reason": "order_flow_flip",
+                        "details": flip_exit,
+                        "priority": "high"
                     })
-                self.remove_rule(ticket)
-                continue
-            
-            # Use the current position data (not stale)
-            position = current_position[0]
+                    logger.info(
+                        f"Phase 3.1: Order flow flip detected for {rule.symbol} ticket {ticket} "
+                        f"(entry_delta: {flip_exit.get('entry_delta', 'N/A')}, "
+                        f"current_delta: {flip_exit.get('current_delta', 'N/A')}, "
+                        f"flip: {flip_exit.get('flip_percentage', 0):.1f}%)"
+                    )
+                    return  # Skip other exit checks if flip detected
+            except Exception as e:
+                logger.debug(f"Error checking order flow flip for ticket {ticket}: {e}")
+        
+        # ⚠️ CRITICAL: Check ownership - allow Intelligent Exit Manager to manage until breakeven
+        try:
+            from infra.trade_registry import get_trade_state
+            import sqlite3
+            from pathlib import Path
             
-            # Phase 3.1: Check order flow flip exit first (highest priority)
-            if self.order_flow_service and hasattr(self.order_flow_service, 'running') and self.order_flow_service.running:
-                try:
-                    flip_exit = self._check_order_flow_flip(ticket, rule, position)
-                    if flip_exit:
-                        actions.append({
-                            "ticket": ticket,
-                            "action": "close",
-                            "reason": "order_flow_flip",
-                            "details": flip_exit,
-                            "priority": "high"
-                        })
-                        logger.info(
-                            f"Phase 3.1: Order flow flip detected for {rule.symbol} ticket {ticket} "
-                            f"(entry_delta: {flip_exit.get('entry_delta', 'N/A')}, "
-                            f"current_delta: {flip_exit.get('current_delta', 'N/A')}, "
-                            f"flip: {flip_exit.get('flip_percentage', 0):.1f}%)"
-                        )
-                        continue  # Skip other exit checks if flip detected
-                except Exception as e:
-                    logger.debug(f"Error checking order flow flip for ticket {ticket}: {e}")
+            # First check in-memory registry
+            trade_state = get_trade_state(ticket)
             
-            # ⚠️ CRITICAL: Check ownership - allow Intelligent Exit Manager to manage until breakeven
-            try:
-                from infra.trade_registry import get_trade_state
-                import sqlite3
-                from pathlib import Path
-                
-                # First check in-memory registry
-                trade_state = get_trade_state(ticket)
-                
-                # If not in memory, check database (for trades registered via API)
-                breakeven_triggered = False
-                if not trade_state:
-                    db_path = Path("data/universal_sl_tp_trades.db")
-                    if db_path.exists():
-                        try:
-                            with sqlite3.connect(str(db_path)) as conn:
-                                cursor = conn.execute("""
-                                    SELECT managed_by, breakeven_triggered FROM universal_trades 
-                                    WHERE ticket = ? AND managed_by = 'universal_sl_tp_manager'
-                                """, (ticket,))
-                                row = cursor.fetchone()
-                                if row:
-                                    breakeven_triggered = bool(row[1])
-                                    # If breakeven triggered, Universal Manager takes over - skip Intelligent Exit Manager
-                                    if breakeven_triggered:
-                                        logger.debug(
-                                            f"Skipping intelligent exit check for {ticket}: "
-                                            f"breakeven triggered - Universal Manager takes over"
-                                        )
-                                        continue
-                                    # If not breakeven yet, Intelligent Exit Manager can manage it
+            # If not in memory, check database (for trades registered via API)
+            breakeven_triggered = False
+            if not trade_state:
+                db_path = Path("data/universal_sl_tp_trades.db")
+                if db_path.exists():
+                    try:
+                        with sqlite3.connect(str(db_path)) as conn:
+                            cursor = conn.execute("""
+                                SELECT managed_by, breakeven_triggered FROM universal_trades 
+                                WHERE ticket = ? AND managed_by = 'universal_sl_tp_manager'
+                            """, (ticket,))
+                            row = cursor.fetchone()
+                            if row:
+                                breakeven_triggered = bool(row[1])
+                                # If breakeven triggered, Universal Manager takes over - skip Intelligent Exit Manager
+                                if breakeven_triggered:
                                     logger.debug(
-                                        f"Trade {ticket} registered with Universal Manager but breakeven not triggered - "
-                                        f"Intelligent Exit Manager will handle breakeven"
+                                        f"Skipping intelligent exit check for {ticket}: "
+                                        f"breakeven triggered - Universal Manager takes over"
                                     )
-                        except Exception as db_error:
-                            logger.debug(f"Error checking database for trade {ticket}: {db_error}")
-                
-                # Check in-memory registry result
-                if trade_state:
-                    if trade_state.managed_by == "universal_sl_tp_manager":
-                        # Check if breakeven already triggered
-                        if trade_state.breakeven_triggered:
-                            logger.debug(
-                                f"Skipping intelligent exit check for {ticket}: "
-                                f"breakeven triggered - Universal Manager takes over"
-                            )
-                            continue
-                        # If not breakeven yet, Intelligent Exit Manager can manage it
+                                    return
+                                # If not breakeven yet, Intelligent Exit Manager can manage it
+                                logger.debug(
+                                    f"Trade {ticket} registered with Universal Manager but breakeven not triggered - "
+                                    f"Intelligent Exit Manager will handle breakeven"
+                                )
+                    except Exception as db_error:
+                        logger.debug(f"Error checking database for trade {ticket}: {db_error}")
+            
+            # Check in-memory registry result
+            if trade_state:
+                if trade_state.managed_by == "universal_sl_tp_manager":
+                    # Check if breakeven already triggered
+                    if trade_state.breakeven_triggered:
                         logger.debug(
-                            f"Trade {ticket} registered with Universal Manager but breakeven not triggered - "
-                            f"Intelligent Exit Manager will handle breakeven"
+                            f"Skipping intelligent exit check for {ticket}: "
+                            f"breakeven triggered - Universal Manager takes over"
                         )
-                    # DTMS defensive actions take priority, but normal DTMS actions don't block intelligent exits
-                    # (Intelligent exits can still run alongside DTMS normal actions)
-            except ImportError:
-                # Trade registry not available - continue with normal logic
-                pass
-            except Exception as e:
-                logger.debug(f"Error checking trade ownership for {ticket}: {e}")
-                # Continue with normal logic on error
+                        return
+                    # If not breakeven yet, Intelligent Exit Manager can manage it
+                    logger.debug(
+                        f"Trade {ticket} registered with Universal Manager but breakeven not triggered - "
+                        f"Intelligent Exit Manager will handle breakeven"
+                    )
+                # DTMS defensive actions take priority, but normal DTMS actions don't block intelligent exits
+                # (Intelligent exits can still run alongside DTMS normal actions)
+        except ImportError:
+            # Trade registry not available - continue with normal logic
+            pass
+        except Exception as e:
+            logger.debug(f"Error checking trade ownership for {ticket}: {e}")
+            # Continue with normal logic on error
+        
+        # 🔴 CRITICAL: Skip range scalping trades (handled by RangeScalpingExitManager)
+        # Check if this ticket is managed by RangeScalpingExitManager
+        try:
+            # Try to get RangeScalpingExitManager from registry or check position comment
+            is_range_scalp = False
+            
+            # Check position comment for range scalp identifier
+            if position.comment:
+                comment_lower = position.comment.lower()
+                if "range_scalp" in comment_lower or "range scalping" in comment_lower:
+                    is_range_scalp = True
+            
+            # Also check if ticket is in RangeScalpingExitManager's active trades
+            # (if available via registry or global reference)
+            if not is_range_scalp:
+                try:
+                    # Attempt to check RangeScalpingExitManager (may not be initialized)
+                    from desktop_agent import registry
+                    if hasattr(registry, 'range_scalp_exit_manager') and registry.range_scalp_exit_manager:
+                        active_range_tickets = registry.range_scalp_exit_manager.get_active_ticket_list()
+                        if ticket in active_range_tickets:
+                            is_range_scalp = True
+                except (ImportError, AttributeError, Exception):
+                    # RangeScalpingExitManager not available or ticket not found - continue normally
+                    pass
             
-            # 🔴 CRITICAL: Skip range scalping trades (handled by RangeScalpingExitManager)
-            # Check if this ticket is managed by RangeScalpingExitManager
+            if is_range_scalp:
+                logger.debug(f"Skipping intelligent exit check for range scalping trade {ticket}")
+                return  # Skip this position - RangeScalpingExitManager handles it
+        except Exception as e:
+            logger.debug(f"Error checking if trade {ticket} is range scalp: {e}")
+            # Continue with normal processing if check fails
+        
+        try:
+            # Refresh Advanced gates from provider (if available)
             try:
-                # Try to get RangeScalpingExitManager from registry or check position comment
-                is_range_scalp = False
-                
-                # Check position comment for range scalp identifier
-                if position.comment:
-                    comment_lower = position.comment.lower()
-                    if "range_scalp" in comment_lower or "range scalping" in comment_lower:
-                        is_range_scalp = True
-                
-                # Also check if ticket is in RangeScalpingExitManager's active trades
-                # (if available via registry or global reference)
-                if not is_range_scalp:
-                    try:
-                        # Attempt to check RangeScalpingExitManager (may not be initialized)
-                        from desktop_agent import registry
-                        if hasattr(registry, 'range_scalp_exit_manager') and registry.range_scalp_exit_manager:
-                            active_range_tickets = registry.range_scalp_exit_manager.get_active_ticket_list()
-                            if ticket in active_range_tickets:
-                                is_range_scalp = True
-                    except (ImportError, AttributeError, Exception):
-                        # RangeScalpingExitManager not available or ticket not found - continue normally
-                        pass
-                
-                if is_range_scalp:
-                    logger.debug(f"Skipping intelligent exit check for range scalping trade {ticket}")
-                    continue  # Skip this position - RangeScalpingExitManager handles it
-            except Exception as e:
-                logger.debug(f"Error checking if trade {ticket} is range scalp: {e}")
-                # Continue with normal processing if check fails
+                self._update_advanced_gate(rule)
+            except Exception:
+                pass
             
+            # Phase 10: Optional Advanced triggers refresh (only if breakeven not triggered)
+            # Refresh every 5 minutes (300 seconds) to adapt to changing market conditions
             try:
-                # Refresh Advanced gates from provider (if available)
-                try:
-                    self._update_advanced_gate(rule)
-                except Exception:
-                    pass
-                
-                # Phase 10: Optional Advanced triggers refresh (only if breakeven not triggered)
-                # Refresh every 5 minutes (300 seconds) to adapt to changing market conditions
-                try:
-                    if not rule.breakeven_triggered:
-                        # Check if enough time has passed since last refresh (if tracked)
-                        # For now, refresh on every check_exits call (can be optimized later)
-                        refresh_result = self.refresh_advanced_triggers(ticket)
-                        if refresh_result:
-                            logger.debug(f"Advanced triggers refreshed for ticket {ticket}")
-                except Exception as e:
-                    logger.debug(f"Advanced triggers refresh failed for ticket {ticket}: {e}")
-                
-                # Check and execute exit actions
-                rule_actions = self._check_position_exits(rule, position, vix_price)
-                actions.extend(rule_actions)
-                
-                # Update last check time
-                rule.last_check = datetime.now().isoformat()
-                
+                if not rule.breakeven_triggered:
+                    # Check if enough time has passed since last refresh (if tracked)
+                    # For now, refresh on every check_exits call (can be optimized later)
+                    refresh_result = self.refresh_advanced_triggers(ticket)
+                    if refresh_result:
+                        logger.debug(f"Advanced triggers refreshed for ticket {ticket}")
             except Exception as e:
-                logger.error(f"Error checking exits for ticket {ticket}: {e}", exc_info=True)
-        
-        # Save updated rules
-        if actions:
-            self._save_rules()
-        
-        return actions
-
+                logger.debug(f"Advanced triggers refresh failed for ticket {ticket}: {e}")
+            
+            # Check and execute exit actions
+            rule_actions = self._check_position_exits(rule, position, vix_price)
+            actions.extend(rule_actions)
+            
+            # Update last check time
+            rule.last_check = datetime.now().isoformat()
+            
+        except Exception as e:
+            logger.error(f"Error checking exits for ticket {ticket}: {e}", exc_info=True)
+    
+    def _cycle_cached(self, symbol: str, key, compute):
+        """
+        Memoize compute() per symbol for the running check_exits cycle, so every rule on the
+        symbol shares one fetch. Outside a cycle compute() is called directly.
+        """
+        contexts = getattr(self._cycle, "contexts", None)
+        if contexts is None:
+            return compute()
+        context = contexts.setdefault(symbol, {})
+        if key not in context:
+            context[key] = compute()
+        return context[key]
+    
+    def _cycle_bars(self, symbol: str, timeframe: int, count: int = 50):
+        """mt5.copy_rates_from_pos(symbol, timeframe, 0, count), shared within a cycle"""
+        return self._cycle_cached(
+            symbol, ("bars", timeframe, count),
+            lambda: mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
+        )
+    
+    def _provider_features(self, ap, symbol: str, method: str):
+        """ap.get_advanced_features / ap.get_multi for symbol, shared within a cycle"""
+        return self._cycle_cached(symbol, ("advanced", method), lambda: getattr(ap, method)(symbol))
+    
+    def get_cycle_stats(self) -> Dict[str, Any]:
+        """Timing of the last check_exits cycle, broken down by symbol (rules, ms)"""
+        return dict(self._last_cycle_stats)
+    
     def _update_advanced_gate(self, rule: ExitRule) -> None:
         """Refresh rule.advanced_gate from an optional advanced provider.
         
@@ -1144,11 +1220,11 @@ class IntelligentExitManager:
         features = None
         try:
             if hasattr(ap, "get_advanced_features"):
-                out = ap.get_advanced_features(rule.symbol)
+                out = self._provider_features(ap, rule.symbol, "get_advanced_features")
                 if isinstance(out, dict):
                     features = out.get("features")
             if features is None and hasattr(ap, "get_multi"):
-                multi = ap.get_multi(rule.symbol)
+                multi = self._provider_features(ap, rule.symbol, "get_multi")
                 if isinstance(multi, dict):
                     features = {"M5": multi.get("M5", {}), "M15": multi.get("M15", {}), "H1": multi.get("H1", {})}
         except Exception:
@@ -1220,11 +1296,11 @@ class IntelligentExitManager:
             if ap:
                 try:
                     if hasattr(ap, "get_advanced_features"):
-                        features_output = ap.get_advanced_features(rule.symbol)
+                        features_output = self._provider_features(ap, rule.symbol, "get_advanced_features")
                         if isinstance(features_output, dict):
                             advanced_features = features_output.get("features") or features_output
                     elif hasattr(ap, "get_multi"):
-                        multi = ap.get_multi(rule.symbol)
+                        multi = self._provider_features(ap, rule.symbol, "get_multi")
                         if isinstance(multi, dict):
                             advanced_features = {
                                 "M5": multi.get("M5", {}),
@@ -1278,7 +1354,7 @@ class IntelligentExitManager:
             rule.partial_profit_pct = advanced_result["partial_pct"]
         
         # Save after releasing lock
-        self._save_rules()
+        self._save_rules([ticket])
         
         logger.info(
             f"🔄 Refreshed Advanced triggers for {rule.symbol} ticket {ticket}: "
@@ -1818,7 +1894,13 @@ class IntelligentExitManager:
         """
         Calculate ATR using existing streamer utility (preferred) with MT5 fallback.
         Phase 12: Includes circuit breaker for repeated failures.
+        Within a check_exits cycle each (symbol, timeframe, period) is computed once.
         """
+        return self._cycle_cached(
+            symbol, ("atr", timeframe, period), lambda: self._compute_atr(symbol, timeframe, period)
+        )
+    
+    def _compute_atr(self, symbol: str, timeframe: str, period: int) -> Optional[float]:
         import time
         
         # Phase 12: Check circuit breaker
@@ -1870,7 +1952,7 @@ class IntelligentExitManager:
             }
             tf_enum = tf_map.get(timeframe, mt5.TIMEFRAME_M15)
             
-            bars = mt5.copy_rates_from_pos(symbol, tf_enum, 0, 50)
+            bars = self._cycle_bars(symbol, tf_enum, 50)
             if bars is None or len(bars) < period + 1:
                 # Failure - increment count
                 self._atr_failure_count[symbol] = self._atr_failure_count.get(symbol, 0) + 1
@@ -2603,7 +2685,7 @@ class IntelligentExitManager:
                     logger.warning(f"MT5 initialization failed, cannot calculate ATR for {rule.symbol}")
                     return None
                 
-                bars = mt5.copy_rates_from_pos(rule.symbol, mt5.TIMEFRAME_M30, 0, 50)
+                bars = self._cycle_bars(rule.symbol, mt5.TIMEFRAME_M30, 50)
                 
                 if bars is None or len(bars) < 14:
                     logger.warning(f"Could not get bars for ATR calculation for {rule.symbol}")
@@ -2805,7 +2887,7 @@ class IntelligentExitManager:
                 # #endregion
                 return None
             
-            bars = mt5.copy_rates_from_pos(rule.symbol, mt5.TIMEFRAME_M30, 0, 50)
+            bars = self._cycle_bars(rule.symbol, mt5.TIMEFRAME_M30, 50)
             
             if bars is None or len(bars) < 14:
                 logger.debug(f"Could not get bars for trailing ATR calculation for {rule.symbol}")
@@ -3251,6 +3333,10 @@ class IntelligentExitManager:
                         "usage_pct": round((len(self.advanced_provider._cache) / getattr(self.advanced_provider, '_max_cache_size', 50)) * 100, 1)
                     }
         
+        # Last check_exits cycle timing (per symbol)
+        if self._last_cycle_stats:
+            status["last_cycle"] = self.get_cycle_stats()
+        
         # Check for errors (degraded takes priority over idle)
         if status["atr_circuit_breakers"]:
             status["status"] = "degraded"
@@ -3261,25 +3347,37 @@ class IntelligentExitManager:
         return status
     
     def _get_vix_price(self) -> Optional[float]:
-        """Fetch current VIX price from Yahoo Finance"""
+        """Fetch current VIX price from Yahoo Finance (cached for _vix_cache_ttl seconds)"""
+        if self._vix_cache and time.time() - self._vix_cache[0] < self._vix_cache_ttl:
+            return self._vix_cache[1]
         try:
             from infra.market_indices_service import create_market_indices_service
             indices = create_market_indices_service()
             vix_data = indices.get_vix()
-            return vix_data.get('price')
+            price = vix_data.get('price')
+            if price is not None:
+                self._vix_cache = (time.time(), price)
+            return price
         except Exception as e:
             logger.warning(f"Could not fetch VIX price: {e}")
             return None
     
+    @property
+    def journal_file(self) -> Path:
+        """Append-only change journal next to the rules snapshot"""
+        return exit_rule_journal_file(self.storage_file)
+    
     def _load_rules(self):
-        """Load rules from JSON file with validation and cleanup stale rules (Phase 12: JSON validation)"""
-        if not self.storage_file.exists():
+        """Load rules from the JSON snapshot plus its change journal, with validation, and cleanup stale rules (Phase 12: JSON validation)"""
+        if not self.storage_file.exists() and not self.journal_file.exists():
             logger.info("No existing exit rules file found, starting fresh")
             return
         
         try:
-            with open(self.storage_file, 'r') as f:
-                data = json.load(f)
+            data = {}
+            if self.storage_file.exists():
+                with open(self.storage_file, 'r') as f:
+                    data = json.load(f)
             
             # Phase 12: Validate structure
             if not isinstance(data, dict):
@@ -3293,6 +3391,11 @@ class IntelligentExitManager:
                     logger.error(f"Failed to backup corrupted file: {e}")
                 return
             
+            # Apply changes journaled since the snapshot was written
+            replayed = self._replay_journal(data)
+            if replayed:
+                logger.info(f"Replayed {replayed} exit rule change(s) from {self.journal_file}")
+            
             # Phase 9: Thread-safe loading with validation
             loaded_count = 0
             with self.rules_lock:
@@ -3317,6 +3420,9 @@ class IntelligentExitManager:
                         logger.warning(f"Error loading rule for ticket {ticket_str}: {e}, skipping")
                         continue
             
+            # Start from a fresh snapshot and an empty journal
+            self._compact_rules()
+            
             # Phase 9: Thread-safe access for logging
             with self.rules_lock:
                 rules_count = len(self.rules)
@@ -3348,21 +3454,79 @@ class IntelligentExitManager:
         except Exception as e:
             logger.error(f"Error loading exit rules: {e}", exc_info=True)
     
-    def _save_rules(self):
-        """Save rules to JSON file (thread-safe with atomic write) - Phase 9: Thread-safe snapshot"""
+    def _replay_journal(self, data: Dict[str, Any]) -> int:
+        """Apply journaled puts/deletes to snapshot data (keyed by ticket string); returns entries applied"""
+        return replay_exit_rule_journal(self.journal_file, data)
+    
+    def _save_rules(self, tickets=None):
+        """
+        Persist rule changes (thread-safe). Only rules that differ from what was last persisted
+        are appended to the journal, so saving one rule's trailing step costs the same however
+        many rules are managed. ``tickets`` limits the check to those rules (None = all).
+        """
         try:
-            # Phase 9: Create snapshot while holding lock
-            with self.rules_lock:
-                data = {str(ticket): rule.to_dict() for ticket, rule in self.rules.items()}
-            
-            # Write to file (outside lock to avoid blocking)
-            
-            # Use atomic write: write to temp file, then rename (prevents corruption)
-            temp_file = self.storage_file.with_suffix('.tmp')
+            with self._persist_lock:
+                # Phase 9: Create snapshot while holding lock
+                with self.rules_lock:
+                    if tickets is None:
+                        candidates = set(self.rules) | set(self._persisted_rules)
+                    else:
+                        candidates = {int(t) for t in tickets}
+                    current = {t: self.rules[t].to_dict() for t in candidates if t in self.rules}
+                    rules_count = len(self.rules)
+                
+                entries = []
+                for ticket in sorted(candidates):
+                    rule_data = current.get(ticket)
+                    if rule_data is None:
+                        if ticket in self._persisted_rules:
+                            entries.append({"op": "del", "ticket": ticket})
+                    elif self._persisted_rules.get(ticket) != rule_data:
+                        entries.append({"op": "put", "ticket": ticket, "rule": rule_data})
+                if not entries:
+                    return
+                
+                with open(self.journal_file, 'a') as f:
+                    f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+                    f.flush()
+                    try:
+                        os.fsync(f.fileno())  # Force write to disk
+                    except AttributeError:
+                        pass  # Windows may not have fsync
+                
+                for entry in entries:
+                    if entry["op"] == "put":
+                        self._persisted_rules[entry["ticket"]] = entry["rule"]
+                    else:
+                        self._persisted_rules.pop(entry["ticket"], None)
+                self._journal_entries += len(entries)
+                
+                logger.debug(f"Journaled {len(entries)} exit rule change(s) ({rules_count} rules)")
+                
+                if self._journal_entries > max(self._journal_compact_min, 10 * rules_count):
+                    self._compact_rules_locked()
             
-            # Write to temp file first
+        except Exception as e:
+            logger.error(f"Error saving exit rules: {e}", exc_info=True)
+    
+    def _compact_rules(self):
+        """Write a full snapshot of all rules and empty the journal"""
+        try:
+            with self._persist_lock:
+                self._compact_rules_locked()
+        except Exception as e:
+            logger.error(f"Error compacting exit rules: {e}", exc_info=True)
+    
+    def _compact_rules_locked(self):
+        # Phase 9: Create snapshot while holding lock
+        with self.rules_lock:
+            data = {ticket: rule.to_dict() for ticket, rule in self.rules.items()}
+        
+        # Use atomic write: write to temp file, then rename (prevents corruption)
+        temp_file = self.storage_file.with_suffix('.tmp')
+        try:
             with open(temp_file, 'w') as f:
-                json.dump(data, f, indent=2)
+                json.dump({str(ticket): rule_data for ticket, rule_data in data.items()}, f, indent=2)
                 f.flush()
                 try:
                     os.fsync(f.fileno())  # Force write to disk
@@ -3376,18 +3540,21 @@ class IntelligentExitManager:
                 # Fallback: copy on Windows if replace fails
                 import shutil
                 shutil.move(str(temp_file), str(self.storage_file))
-            
-            logger.debug(f"Saved {len(self.rules)} exit rules to storage")
-            
-        except Exception as e:
-            logger.error(f"Error saving exit rules: {e}", exc_info=True)
+        except Exception:
             # Try to clean up temp file if it exists
             try:
-                temp_file = self.storage_file.with_suffix('.tmp')
                 if temp_file.exists():
                     temp_file.unlink()
             except Exception:
                 pass
+            raise
+        
+        # Snapshot is durable - journaled changes are now redundant (replaying them is harmless)
+        with open(self.journal_file, 'w'):
+            pass
+        self._persisted_rules = data
+        self._journal_entries = 0
+        logger.debug(f"Compacted {len(data)} exit rules to {self.storage_file}")
     
     def _check_binance_momentum(self, rule: ExitRule, position, current_price: float) -> List[Dict[str, Any]]:
         """
@@ -3399,12 +3566,14 @@ class IntelligentExitManager:
         
         try:
             # Get recent price history (last 10 ticks = ~10 seconds)
-            history = self.binance_service.get_history(rule.symbol, count=10)
-            if len(history) < 10:
+            prices = self._cycle_cached(
+                rule.symbol, "binance_prices",
+                lambda: self.binance_service.get_history_arrays(rule.symbol, count=10, fields=("price",))["price"]
+            )
+            if len(prices) < 10:
                 return actions
-            
+
             # Calculate momentum
-            prices = [t['price'] for t in history]
             momentum = self._calculate_momentum(prices)
             
             # Check for momentum reversal
@@ -3483,9 +3652,12 @@ class IntelligentExitManager:
             binance_symbol = self._convert_to_binance_symbol(rule.symbol)
             
             # Get recent whale orders (last 60 seconds)
-            recent_whales = self.order_flow_service.get_recent_whales(
-                binance_symbol,
-                min_size="large"  # $500k+ orders
+            recent_whales = self._cycle_cached(
+                rule.symbol, "whales",
+                lambda: self.order_flow_service.get_recent_whales(
+                    binance_symbol,
+                    min_size="large"  # $500k+ orders
+                )
             )
             
             for whale in recent_whales:
@@ -3655,7 +3827,9 @@ class IntelligentExitManager:
             binance_symbol = self._convert_to_binance_symbol(rule.symbol)
             
             # Get liquidity voids
-            voids = self.order_flow_service.get_liquidity_voids(binance_symbol)
+            voids = self._cycle_cached(
+                rule.symbol, "voids", lambda: self.order_flow_service.get_liquidity_voids(binance_symbol)
+            )
             
             for void in voids:
                 # Calculate distance to void
@@ -4124,6 +4298,54 @@ class IntelligentExitManager:
         return None
 
 
+def exit_rule_journal_file(storage_file) -> Path:
+    """Change journal kept next to an exit rules snapshot (data/intelligent_exits.journal)"""
+    return Path(storage_file).with_suffix('.journal')
+
+
+def replay_exit_rule_journal(journal_file, data: Dict[str, Any]) -> int:
+    """Apply journaled puts/deletes to snapshot data (keyed by ticket string); returns entries applied"""
+    journal_file = Path(journal_file)
+    if not journal_file.exists():
+        return 0
+    applied = 0
+    with open(journal_file, 'r') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                key = str(int(entry["ticket"]))
+                if entry["op"] == "put":
+                    data[key] = entry["rule"]
+                elif entry["op"] == "del":
+                    data.pop(key, None)
+                else:
+                    continue
+                applied += 1
+            except (ValueError, KeyError, TypeError):
+                # Torn last line from a crash mid-append - everything before it is intact
+                logger.warning(f"Skipping unreadable exit rule journal entry: {line[:80]!r}")
+    return applied
+
+
+def load_exit_rules(storage_file: str = "data/intelligent_exits.json") -> Dict[str, Dict[str, Any]]:
+    """
+    Persisted exit rules as {ticket string: rule dict}, read without starting a manager.
+    
+    The JSON snapshot alone is out of date between compactions - rule changes since the last
+    compaction live in the journal next to it, which is replayed here. Use this (not the raw
+    JSON) from scripts and tools that inspect stored rules.
+    """
+    storage_file = Path(storage_file)
+    data: Dict[str, Any] = {}
+    if storage_file.exists():
+        with open(storage_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"Invalid exit rules file structure: expected dict, got {type(data)}")
+    replay_exit_rule_journal(exit_rule_journal_file(storage_file), data)
+    return data
+
+
 def create_exit_manager(
     mt5_service,
     binance_service=None,
@@ -1071,7 +1071,7 @@ class LiquiditySweepReversalEngine:
                 color = 0x3498DB  # Blue
                 title = f"📊 {event_type} - {symbol}"
             
-            # DiscordNotifier.send_message() is synchronous, not async
+            # DiscordNotifier.send_message() only queues on the notification gateway (returns immediately)
             self.discord_notifier.send_message(
                 message=message,
                 message_type=title,  # Use title as message_type
@@ -22,6 +22,8 @@ from contextvars import ContextVar
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 
+from domain.level_clusters import cluster_prices
+
 logger = logging.getLogger(__name__)
 
 # LogContext for per-symbol tracing
@@ -1611,22 +1613,13 @@ class M1MicrostructureAnalyzer:
             return 0.0
     
     def _find_equal_levels(self, levels: List[float], tolerance: float) -> Dict[float, int]:
-        """Find equal price levels within tolerance."""
-        clusters = {}
-        
-        for level in levels:
-            # Find existing cluster within tolerance
-            found_cluster = False
-            for cluster_level in clusters.keys():
-                if abs(level - cluster_level) <= tolerance:
-                    clusters[cluster_level] += 1
-                    found_cluster = True
-                    break
-            
-            if not found_cluster:
-                clusters[level] = 1
-        
-        return clusters
+        """
+        Find equal price levels within tolerance.
+        
+        Returns {earliest level of each cluster: touches}, in order of first touch.
+        """
+        groups = sorted(cluster_prices(levels, tolerance, link="anchor"), key=lambda g: g.min())
+        return {levels[int(group.min())]: len(group) for group in groups}
     
     def _trends_align(self, trend1: str, trend2: str) -> bool:
         """Check if two trends align."""
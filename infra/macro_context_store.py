@@ -0,0 +1,468 @@
+"""
+Macro Context Store
+Shared in-memory cache for macro/market-context series (DXY, VIX, US10Y, S&P 500, NASDAQ,
+crypto sentiment) used by MarketIndicesService, CorrelationContextCalculator and the
+macro_context tool.
+
+- Per-key TTL: each series is fetched at most once per refresh interval
+- Single-flight: concurrent sync/async requests for the same key share one fetch
+- Bar histories are kept in memory and extended incrementally (short re-fetch + merge)
+- Optional background refresh thread keeps registered series warm
+- Snapshot values are persisted to disk at most once per persist interval (warm restarts)
+- Pluggable data provider: yfinance by default, FixtureProvider for offline tests
+"""
+
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_PERIOD_RE = re.compile(r"^(\d+)(m|h|d|wk|mo|y)$")
+_UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400, "wk": 7 * 86400, "mo": 30 * 86400, "y": 365 * 86400}
+
+
+def parse_span(span: str) -> Optional[float]:
+    """yfinance period/interval string ("5m", "1h", "5d", "1mo", "1y") -> seconds; None for "max"/"ytd" """
+    match = _PERIOD_RE.match(str(span).strip().lower())
+    if not match:
+        return None
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+class MacroDataProvider(ABC):
+    """Source of raw OHLCV history (yfinance-shaped DataFrame with a DatetimeIndex)"""
+
+    name = "base"
+
+    @abstractmethod
+    def history(self, ticker: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        """OHLCV history for ticker over period at interval (None/empty if unavailable)"""
+
+
+class YFinanceProvider(MacroDataProvider):
+    """Yahoo Finance via yfinance (free, no API key)"""
+
+    name = "yfinance"
+
+    def history(self, ticker: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        import yfinance as yf
+        return yf.Ticker(ticker).history(period=period, interval=interval)
+
+
+class FixtureProvider(MacroDataProvider):
+    """
+    Offline provider serving preloaded frames (for tests and replays).
+
+    frames: {ticker: df} or {(ticker, interval): df}, DatetimeIndex + Open/High/Low/Close/Volume
+    fixture_dir: optional directory of CSV files named <ticker>.csv or <ticker>_<interval>.csv
+                 (non-alphanumeric characters in the ticker replaced by "_")
+    now: callable returning the simulated current time; rows after it are hidden so
+         tests can "advance" the market and exercise incremental refreshes
+    """
+
+    name = "fixture"
+
+    def __init__(self, frames: Optional[Dict[Any, pd.DataFrame]] = None,
+                 fixture_dir: Optional[str] = None,
+                 now: Optional[Callable[[], pd.Timestamp]] = None):
+        self.frames: Dict[Any, pd.DataFrame] = dict(frames or {})
+        self.fixture_dir = Path(fixture_dir) if fixture_dir else None
+        self.now = now
+        self.calls: List[Tuple[str, str, str]] = []
+
+    def _frame(self, ticker: str, interval: str) -> Optional[pd.DataFrame]:
+        for key in ((ticker, interval), ticker):
+            if key in self.frames:
+                return self.frames[key]
+        if self.fixture_dir is None:
+            return None
+        stem = re.sub(r"[^A-Za-z0-9]", "_", ticker)
+        for name in (f"{stem}_{interval}.csv", f"{stem}.csv"):
+            path = self.fixture_dir / name
+            if path.exists():
+                df = pd.read_csv(path, index_col=0, parse_dates=True)
+                self.frames[(ticker, interval)] = df
+                return df
+        return None
+
+    def history(self, ticker: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        self.calls.append((ticker, period, interval))
+        df = self._frame(ticker, interval)
+        if df is None or len(df) == 0:
+            return pd.DataFrame()
+        end = self.now() if self.now else df.index[-1]
+        df = df[df.index <= end]
+        span = parse_span(period)
+        if span is not None:
+            df = df[df.index > end - pd.Timedelta(seconds=span)]
+        return df.copy()
+
+
+class MacroContextStore:
+    """
+    TTL cache with single-flight refresh for macro series.
+
+    get()/aget() take a key and a zero-argument loader. A fresh value is returned from
+    memory; otherwise exactly one loader call runs for the key while other callers
+    (threads or coroutines) wait on the same future. Failed refreshes fall back to the
+    stale value when there is one.
+    """
+
+    # Incremental bar refresh window per interval (re-fetch a short tail and merge)
+    INCREMENTAL_PERIOD_INTRADAY = "1d"
+    INCREMENTAL_PERIOD_DAILY = "1mo"
+
+    def __init__(self, provider: Optional[MacroDataProvider] = None,
+                 default_ttl_s: float = 900.0,
+                 persist_path: Optional[str] = None,
+                 persist_interval_s: float = 300.0,
+                 max_workers: int = 4,
+                 clock: Callable[[], float] = time.time):
+        self.provider = provider or YFinanceProvider()
+        self.default_ttl_s = default_ttl_s
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.persist_interval_s = persist_interval_s
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._ttls: Dict[str, float] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="macro-ctx")
+
+        # Bar histories: (ticker, interval) -> normalized DataFrame, plus retained span (seconds)
+        self._bars: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._bar_spans: Dict[Tuple[str, str], Optional[float]] = {}
+
+        # Background refresh
+        self._registered: Dict[str, Tuple[Callable[[], Any], Optional[float], Optional[Callable[[Any], bool]]]] = {}
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Persistence
+        self._persist_keys: set = set()
+        self._last_persist = 0.0
+        self._dirty = False
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.deduped = 0
+        self.refreshes = 0
+        self.errors = 0
+
+        self._load_snapshot()
+
+    # ------------------------------------------------------------------ values
+
+    def _is_fresh(self, key: str, ttl: Optional[float]) -> bool:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        ttl = self.default_ttl_s if ttl is None else ttl
+        return self.clock() - entry[1] < ttl
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Cached value (fresh or stale) without triggering a refresh"""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def age(self, key: str) -> Optional[float]:
+        entry = self._entries.get(key)
+        return self.clock() - entry[1] if entry else None
+
+    def put(self, key: str, value: Any, persist: bool = False):
+        with self._lock:
+            self._entries[key] = (value, self.clock())
+            if persist:
+                self._persist_keys.add(key)
+                self._dirty = True
+        if persist:
+            self._maybe_persist()
+
+    def invalidate(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _load(self, key: str, loader: Callable[[], Any],
+              cache_if: Optional[Callable[[Any], bool]], persist: bool) -> Any:
+        """Run the loader (single flight owner), store the value, release waiters"""
+        try:
+            value = loader()
+            self.refreshes += 1
+            if cache_if is None or cache_if(value):
+                self.put(key, value, persist=persist)
+            elif key in self._entries:
+                logger.warning(f"Macro refresh for {key} returned no data; serving stale value")
+                value = self._entries[key][0]
+            return value
+        except Exception as e:
+            self.errors += 1
+            if key in self._entries:
+                logger.warning(f"Macro refresh for {key} failed ({e}); serving stale value")
+                return self._entries[key][0]
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _claim(self, key: str) -> Tuple[Future, bool]:
+        """Return (future, owner); owner=True means the caller must run the loader"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.deduped += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def get(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None,
+            cache_if: Optional[Callable[[Any], bool]] = None, persist: bool = True) -> Any:
+        """Cached value for key, refreshing through loader (single flight) when expired"""
+        if self._is_fresh(key, ttl):
+            self.hits += 1
+            return self._entries[key][0]
+        self.misses += 1
+        if ttl is not None:
+            self._ttls[key] = ttl
+
+        future, owner = self._claim(key)
+        if owner:
+            try:
+                future.set_result(self._load(key, loader, cache_if, persist))
+            except BaseException as e:
+                future.set_exception(e)
+        return future.result()
+
+    async def aget(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None,
+                   cache_if: Optional[Callable[[Any], bool]] = None, persist: bool = True) -> Any:
+        """Async get(): blocking loaders run in the store's thread pool"""
+        if self._is_fresh(key, ttl):
+            self.hits += 1
+            return self._entries[key][0]
+        self.misses += 1
+        if ttl is not None:
+            self._ttls[key] = ttl
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.deduped += 1
+            else:
+                future = self._executor.submit(self._load, key, loader, cache_if, persist)
+                self._inflight[key] = future
+        return await asyncio.wrap_future(future)
+
+    # -------------------------------------------------------------------- bars
+
+    def _fetch_bars(self, ticker: str, period: str, interval: str,
+                    normalize: Optional[Callable[[pd.DataFrame], Optional[pd.DataFrame]]]) -> Optional[pd.DataFrame]:
+        key = (ticker, interval)
+        span = parse_span(period)
+        held = self._bars.get(key)
+        held_span = self._bar_spans.get(key, 0.0)
+        full = held is None or len(held) == 0 or span is None or held_span is None or span > held_span
+
+        interval_s = parse_span(interval) or 86400
+        fetch_period = period if full else (
+            self.INCREMENTAL_PERIOD_INTRADAY if interval_s < 86400 else self.INCREMENTAL_PERIOD_DAILY
+        )
+        raw = self.provider.history(ticker, fetch_period, interval)
+        if raw is None or len(raw) == 0:
+            return held
+        fresh = normalize(raw) if normalize else raw
+        if fresh is None or len(fresh) == 0:
+            return held
+
+        if not full and fresh["time"].min() > held["time"].iloc[-1]:
+            # The tail does not overlap the held bars (e.g. the process was down for longer
+            # than the tail window) - appending would leave a silent hole, so refetch in full
+            logger.info(f"Gap after last held {ticker} {interval} bar - refetching {period}")
+            del self._bars[key]
+            refetched = self._fetch_bars(ticker, period, interval, normalize)
+            if refetched is None:
+                self._bars[key] = held
+                return held
+            return refetched
+
+        if full:
+            merged = fresh
+            self._bar_spans[key] = span
+        else:
+            merged = (
+                pd.concat([held, fresh], ignore_index=True)
+                .drop_duplicates(subset="time", keep="last")
+                .sort_values("time")
+            )
+            keep = self._bar_spans.get(key)
+            if keep is not None:
+                merged = merged[merged["time"] > merged["time"].iloc[-1] - pd.Timedelta(seconds=keep)]
+        merged = merged.reset_index(drop=True)
+        self._bars[key] = merged
+        return merged
+
+    def _bar_request(self, ticker: str, period: str, interval: str, normalize):
+        key = f"bars:{ticker}:{interval}"
+        span = parse_span(period)
+        held_span = self._bar_spans.get((ticker, interval), 0.0)
+        if (ticker, interval) in self._bars and (span is None or held_span is None or span > held_span):
+            self.invalidate(key)  # longer history requested than held
+        ttl = max(60.0, float(parse_span(interval) or 86400))
+        loader = lambda: self._fetch_bars(ticker, period, interval, normalize)
+        cache_if = lambda df: df is not None and len(df) > 0
+        return key, loader, ttl, cache_if, span
+
+    @staticmethod
+    def _trim(df: Optional[pd.DataFrame], span: Optional[float]) -> Optional[pd.DataFrame]:
+        if df is None or len(df) == 0:
+            return None
+        if span is not None:
+            df = df[df["time"] > df["time"].iloc[-1] - pd.Timedelta(seconds=span)]
+        return df.reset_index(drop=True).copy()
+
+    def get_bars(self, ticker: str, period: str = "5d", interval: str = "5m",
+                 normalize: Optional[Callable[[pd.DataFrame], Optional[pd.DataFrame]]] = None) -> Optional[pd.DataFrame]:
+        """Bar history for ticker (refreshed at most once per bar interval, extended incrementally)"""
+        key, loader, ttl, cache_if, span = self._bar_request(ticker, period, interval, normalize)
+        return self._trim(self.get(key, loader, ttl=ttl, cache_if=cache_if, persist=False), span)
+
+    async def aget_bars(self, ticker: str, period: str = "5d", interval: str = "5m",
+                        normalize: Optional[Callable[[pd.DataFrame], Optional[pd.DataFrame]]] = None) -> Optional[pd.DataFrame]:
+        key, loader, ttl, cache_if, span = self._bar_request(ticker, period, interval, normalize)
+        return self._trim(await self.aget(key, loader, ttl=ttl, cache_if=cache_if, persist=False), span)
+
+    # ------------------------------------------------------- background refresh
+
+    def register(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None,
+                 cache_if: Optional[Callable[[Any], bool]] = None):
+        """Keep key warm from the background refresh thread"""
+        self._registered[key] = (loader, ttl, cache_if)
+
+    def register_bars(self, ticker: str, period: str = "5d", interval: str = "5m",
+                      normalize: Optional[Callable[[pd.DataFrame], Optional[pd.DataFrame]]] = None):
+        key, loader, ttl, cache_if, _ = self._bar_request(ticker, period, interval, normalize)
+        self._registered[key] = (loader, ttl, cache_if)
+
+    def refresh_due(self) -> int:
+        """Refresh every registered key whose TTL has expired; returns the number refreshed"""
+        refreshed = 0
+        for key, (loader, ttl, cache_if) in list(self._registered.items()):
+            if self._is_fresh(key, ttl):
+                continue
+            try:
+                self.get(key, loader, ttl=ttl, cache_if=cache_if, persist=not key.startswith("bars:"))
+                refreshed += 1
+            except Exception as e:
+                logger.warning(f"Background macro refresh failed for {key}: {e}")
+        return refreshed
+
+    def start(self, poll_interval_s: float = 5.0):
+        """Start the background refresh thread (idempotent)"""
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.is_set():
+                self.refresh_due()
+                self._stop_event.wait(poll_interval_s)
+
+        self._refresh_thread = threading.Thread(target=run, name="macro-context-refresh", daemon=True)
+        self._refresh_thread.start()
+        logger.info(f"Macro context refresh started ({len(self._registered)} series)")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+        self._maybe_persist(force=True)
+
+    # ------------------------------------------------------------- persistence
+
+    def _load_snapshot(self):
+        """Warm start from the snapshot file ({key: {'data': ..., 'timestamp': iso}})"""
+        if not self.persist_path or not self.persist_path.exists():
+            return
+        try:
+            with open(self.persist_path, "r") as f:
+                snapshot = json.load(f)
+            for key, entry in snapshot.items():
+                fetched_at = datetime.fromisoformat(entry["timestamp"]).timestamp()
+                self._entries[key] = (entry["data"], fetched_at)
+                self._persist_keys.add(key)
+        except Exception as e:
+            logger.warning(f"Failed to load macro context snapshot: {e}")
+
+    def _maybe_persist(self, force: bool = False):
+        if not self.persist_path or not self._dirty:
+            return
+        now = self.clock()
+        if not force and now - self._last_persist < self.persist_interval_s:
+            return
+        with self._lock:
+            snapshot = {
+                key: {"data": self._entries[key][0],
+                      "timestamp": datetime.fromtimestamp(self._entries[key][1]).isoformat()}
+                for key in self._persist_keys if key in self._entries
+            }
+            self._dirty = False
+            self._last_persist = now
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.persist_path.with_suffix(self.persist_path.suffix + ".tmp")
+            with open(tmp, "w") as f:
+                json.dump(snapshot, f)
+            tmp.replace(self.persist_path)
+        except Exception as e:
+            logger.warning(f"Failed to save macro context snapshot: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider.name,
+            "entries": len(self._entries),
+            "bar_series": len(self._bars),
+            "registered": len(self._registered),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "deduped": self.deduped,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "background_refresh": bool(self._refresh_thread and self._refresh_thread.is_alive()),
+        }
+
+
+_store: Optional[MacroContextStore] = None
+_store_lock = threading.Lock()
+
+
+def get_macro_context_store() -> MacroContextStore:
+    """Process-wide store (persisted to data/market_indices_cache.json)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MacroContextStore(persist_path="data/market_indices_cache.json")
+        return _store
+
+
+def set_macro_context_store(store: Optional[MacroContextStore]):
+    """Replace the process-wide store (e.g. with a FixtureProvider-backed store in tests)"""
+    global _store
+    with _store_lock:
+        _store = store
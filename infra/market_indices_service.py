@@ -8,11 +8,16 @@ import asyncio
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from pathlib import Path
-import json
+
+from infra.macro_context_store import MacroContextStore, get_macro_context_store
 
 logger = logging.getLogger(__name__)
 
 
+def _has_price(result: Dict[str, Any]) -> bool:
+    return result.get('price') is not None
+
+
 class MarketIndicesService:
     """
     Fetches market indices from Yahoo Finance (free, no API key needed)
@@ -23,49 +28,31 @@ class MarketIndicesService:
     - US10Y (10-Year Treasury Yield) - Bond yields ~3.5-4.5%
     
     All data is FREE and matches TradingView!
+    
+    Values and bar histories live in the shared MacroContextStore (in-memory TTL cache,
+    single-flight refresh), so every instance shares one fetch per series per interval.
     """
     
     CACHE_FILE = Path("data/market_indices_cache.json")
     CACHE_DURATION_MINUTES = 15  # Cache for 15 minutes
     
-    def __init__(self):
+    def __init__(self, store: Optional[MacroContextStore] = None):
         self.dxy_symbol = "DX-Y.NYB"  # Real DXY on Yahoo Finance
         self.vix_symbol = "^VIX"      # VIX on Yahoo Finance
         self.us10y_symbol = "^TNX"    # 10-Year Treasury Yield on Yahoo Finance
         self.sp500_symbol = "^GSPC"   # S&P 500 Index on Yahoo Finance
         self.nasdaq_symbol = "^IXIC"  # NASDAQ Composite Index
-        self.cache = self._load_cache()
+        self.store = store or get_macro_context_store()
         self.logger = logging.getLogger(__name__)
         self.logger.info("MarketIndicesService initialized (using Yahoo Finance - free)")
     
-    def _load_cache(self) -> Dict:
-        """Load cache from disk"""
-        if self.CACHE_FILE.exists():
-            try:
-                with open(self.CACHE_FILE, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                self.logger.warning(f"Failed to load cache: {e}")
-        return {}
+    @property
+    def cache_ttl_seconds(self) -> float:
+        return self.CACHE_DURATION_MINUTES * 60
     
-    def _save_cache(self):
-        """Save cache to disk"""
-        try:
-            self.CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.CACHE_FILE, 'w') as f:
-                json.dump(self.cache, f)
-        except Exception as e:
-            self.logger.warning(f"Failed to save cache: {e}")
-    
-    def _is_cache_valid(self, key: str) -> bool:
-        """Check if cached data is still valid"""
-        if key not in self.cache or 'timestamp' not in self.cache[key]:
-            return False
-        
-        cached_time = datetime.fromisoformat(self.cache[key]['timestamp'])
-        age_minutes = (datetime.now() - cached_time).total_seconds() / 60
-        
-        return age_minutes < self.CACHE_DURATION_MINUTES
+    def _history(self, ticker: str, period: str, interval: str):
+        """Raw OHLCV history from the store's data provider"""
+        return self.store.provider.history(ticker, period, interval)
     
     def get_dxy(self) -> Dict[str, Any]:
         """
@@ -80,17 +67,13 @@ class MarketIndicesService:
                 'source': 'Yahoo Finance'
             }
         """
-        # Check cache first
-        if self._is_cache_valid('dxy'):
-            self.logger.info("Using cached DXY data")
-            return self.cache['dxy']['data']
-        
+        return self.store.get('dxy', self._fetch_dxy, ttl=self.cache_ttl_seconds, cache_if=_has_price)
+    
+    def _fetch_dxy(self) -> Dict[str, Any]:
+        """Fetch and interpret DXY (called by the store at most once per refresh interval)"""
         try:
-            import yfinance as yf
-            
             # Fetch DXY data
-            dxy = yf.Ticker(self.dxy_symbol)
-            hist = dxy.history(period="5d", interval="1h")
+            hist = self._history(self.dxy_symbol, "5d", "1h")
             
             if len(hist) < 20:
                 raise Exception("Insufficient DXY data")
@@ -123,13 +106,6 @@ class MarketIndicesService:
                 'source': 'Yahoo Finance (DX-Y.NYB)'
             }
             
-            # Cache result
-            self.cache['dxy'] = {
-                'data': result,
-                'timestamp': datetime.now().isoformat()
-            }
-            self._save_cache()
-            
             self.logger.info(f"DXY: {current_price:.3f} ({trend})")
             return result
             
@@ -157,17 +133,13 @@ class MarketIndicesService:
                 'source': 'Yahoo Finance'
             }
         """
-        # Check cache first
-        if self._is_cache_valid('vix'):
-            self.logger.info("Using cached VIX data")
-            return self.cache['vix']['data']
-        
+        return self.store.get('vix', self._fetch_vix, ttl=self.cache_ttl_seconds, cache_if=_has_price)
+    
+    def _fetch_vix(self) -> Dict[str, Any]:
+        """Fetch and interpret VIX (called by the store at most once per refresh interval)"""
         try:
-            import yfinance as yf
-            
             # Fetch VIX data
-            vix = yf.Ticker(self.vix_symbol)
-            hist = vix.history(period="5d", interval="1h")
+            hist = self._history(self.vix_symbol, "5d", "1h")
             
             if len(hist) == 0:
                 raise Exception("No VIX data available")
@@ -201,13 +173,6 @@ class MarketIndicesService:
                 'source': 'Yahoo Finance (^VIX)'
             }
             
-            # Cache result
-            self.cache['vix'] = {
-                'data': result,
-                'timestamp': datetime.now().isoformat()
-            }
-            self._save_cache()
-            
             self.logger.info(f"VIX: {current_price:.2f} ({level})")
             return result
             
@@ -237,17 +202,13 @@ class MarketIndicesService:
                 'source': 'Yahoo Finance'
             }
         """
-        # Check cache first
-        if self._is_cache_valid('us10y'):
-            self.logger.info("Using cached US10Y data")
-            return self.cache['us10y']['data']
-        
+        return self.store.get('us10y', self._fetch_us10y, ttl=self.cache_ttl_seconds, cache_if=_has_price)
+    
+    def _fetch_us10y(self) -> Dict[str, Any]:
+        """Fetch and interpret US10Y (called by the store at most once per refresh interval)"""
         try:
-            import yfinance as yf
-            
             # Fetch US10Y data
-            us10y = yf.Ticker(self.us10y_symbol)
-            hist = us10y.history(period="5d", interval="1h")
+            hist = self._history(self.us10y_symbol, "5d", "1h")
             
             if len(hist) < 20:
                 raise Exception("Insufficient US10Y data")
@@ -295,13 +256,6 @@ class MarketIndicesService:
                 'source': 'Yahoo Finance (^TNX)'
             }
             
-            # Cache result
-            self.cache['us10y'] = {
-                'data': result,
-                'timestamp': datetime.now().isoformat()
-            }
-            self._save_cache()
-            
             self.logger.info(f"US10Y: {current_yield:.3f}% ({trend}, {gold_correlation} for gold)")
             return result
             
@@ -405,17 +359,13 @@ class MarketIndicesService:
                 'source': 'Yahoo Finance'
             }
         """
-        # Check cache first
-        if self._is_cache_valid('nasdaq'):
-            self.logger.info("Using cached NASDAQ data")
-            return self.cache['nasdaq']['data']
-        
+        return self.store.get('nasdaq', self._fetch_nasdaq, ttl=self.cache_ttl_seconds, cache_if=_has_price)
+    
+    def _fetch_nasdaq(self) -> Dict[str, Any]:
+        """Fetch and interpret NASDAQ (called by the store at most once per refresh interval)"""
         try:
-            import yfinance as yf
-            
             # Fetch NASDAQ data
-            nasdaq = yf.Ticker(self.nasdaq_symbol)
-            hist = nasdaq.history(period="5d", interval="1h")
+            hist = self._history(self.nasdaq_symbol, "5d", "1h")
             
             if len(hist) < 20:
                 raise Exception("Insufficient NASDAQ data")
@@ -448,13 +398,6 @@ class MarketIndicesService:
                 'source': 'Yahoo Finance (^IXIC)'
             }
             
-            # Cache result
-            self.cache['nasdaq'] = {
-                'data': result,
-                'timestamp': datetime.now().isoformat()
-            }
-            self._save_cache()
-            
             self.logger.info(f"NASDAQ: {current_price:.2f} ({trend})")
             return result
             
@@ -486,21 +429,19 @@ class MarketIndicesService:
                 'timestamp': '2025-10-09T20:00:00'
             }
         """
-        cache_key = f"nasdaq_corr_{symbol}"
-        
-        # Check cache first (cache for 1 hour)
-        if self._is_cache_valid(cache_key):
-            self.logger.debug(f"Using cached NASDAQ correlation for {symbol}")
-            return self.cache[cache_key]['data']
-        
+        return self.store.get(
+            f"nasdaq_corr_{symbol}",
+            lambda: self._fetch_nasdaq_correlation(symbol, window_days),
+            ttl=self.cache_ttl_seconds,
+            cache_if=lambda result: result.get('correlation') is not None,
+        )
+    
+    def _fetch_nasdaq_correlation(self, symbol: str, window_days: int) -> Dict[str, Any]:
         try:
-            import yfinance as yf
-            import pandas as pd
             import numpy as np
             
             # Get NASDAQ data
-            nasdaq = yf.Ticker(self.nasdaq_symbol)
-            nasdaq_hist = nasdaq.history(period=f"{window_days + 10}d", interval="1d")
+            nasdaq_hist = self._history(self.nasdaq_symbol, f"{window_days + 10}d", "1d")
             
             # Get crypto data (normalize symbol)
             crypto_symbol = symbol.upper().replace('C', '') if symbol.endswith('c') else symbol.upper()
@@ -514,8 +455,7 @@ class MarketIndicesService:
             
             binance_symbol = binance_symbol_map.get(crypto_symbol, f"{crypto_symbol.replace('USD', '')}-USD")
             
-            crypto = yf.Ticker(binance_symbol)
-            crypto_hist = crypto.history(period=f"{window_days + 10}d", interval="1d")
+            crypto_hist = self._history(binance_symbol, f"{window_days + 10}d", "1d")
             
             if len(nasdaq_hist) < window_days or len(crypto_hist) < window_days:
                 raise Exception(f"Insufficient data for correlation (need {window_days} days)")
@@ -562,13 +502,6 @@ class MarketIndicesService:
                 'timestamp': datetime.now().isoformat()
             }
             
-            # Cache result
-            self.cache[cache_key] = {
-                'data': result,
-                'timestamp': datetime.now().isoformat()
-            }
-            self._save_cache()
-            
             self.logger.info(f"NASDAQ correlation for {symbol}: {correlation:.3f} ({strength})")
             return result
             
@@ -595,18 +528,13 @@ class MarketIndicesService:
                 'source': 'Yahoo Finance'
             }
         """
-        # Check cache first
-        if self._is_cache_valid('sp500'):
-            self.logger.info("Using cached SP500 data")
-            return self.cache['sp500']['data']
-        
+        # Fetch runs in the store's thread pool (non-blocking)
+        return await self.store.aget('sp500', self._fetch_sp500, ttl=self.cache_ttl_seconds, cache_if=_has_price)
+    
+    def _fetch_sp500(self) -> Dict[str, Any]:
+        """Fetch and interpret SP500 (called by the store at most once per refresh interval)"""
         try:
-            import yfinance as yf
-            
-            # Fetch SP500 data (run in thread to avoid blocking)
-            loop = asyncio.get_event_loop()
-            sp500 = await loop.run_in_executor(None, lambda: yf.Ticker(self.sp500_symbol))
-            hist = await loop.run_in_executor(None, lambda: sp500.history(period="5d", interval="1h"))
+            hist = self._history(self.sp500_symbol, "5d", "1h")
             
             if len(hist) < 20:
                 raise Exception("Insufficient SP500 data")
@@ -639,13 +567,6 @@ class MarketIndicesService:
                 'source': 'Yahoo Finance (^GSPC)'
             }
             
-            # Cache result
-            self.cache['sp500'] = {
-                'data': result,
-                'timestamp': datetime.now().isoformat()
-            }
-            self._save_cache()
-            
             self.logger.info(f"SP500: {current_price:.2f} ({trend})")
             return result
             
@@ -671,96 +592,7 @@ class MarketIndicesService:
             pandas.DataFrame with columns: ['time', 'open', 'high', 'low', 'close', 'volume']
             or None if failed
         """
-        try:
-            import yfinance as yf
-            import pandas as pd
-            
-            # Fetch historical data (run in thread to avoid blocking)
-            loop = asyncio.get_event_loop()
-            dxy = await loop.run_in_executor(None, lambda: yf.Ticker(self.dxy_symbol))
-            hist = await loop.run_in_executor(None, lambda: dxy.history(period=period, interval=interval))
-            
-            if hist is None or len(hist) == 0:
-                self.logger.warning("No DXY historical data returned")
-                return None
-            
-            # Convert to DataFrame with standardized columns
-            # yfinance returns DataFrame with DatetimeIndex
-            df = hist.copy() if isinstance(hist, pd.DataFrame) else pd.DataFrame(hist)
-            
-            # Reset index to convert DatetimeIndex to column
-            df.reset_index(inplace=True)
-            
-            # Find the datetime column (could be 'Date', index name, or first column if index was unnamed)
-            time_col_name = None
-            for col in df.columns:
-                col_lower = str(col).lower()
-                # Check if column is datetime type or has datetime-like name
-                if (pd.api.types.is_datetime64_any_dtype(df[col]) or 
-                    col_lower in ['date', 'datetime', 'time', 'timestamp'] or
-                    (isinstance(df[col].iloc[0] if len(df) > 0 else None, (pd.Timestamp, datetime)))):
-                    time_col_name = col
-                    break
-            
-            # If no datetime column found, check if first column after reset_index is datetime
-            if time_col_name is None and len(df.columns) > 0:
-                first_col = df.columns[0]
-                if pd.api.types.is_datetime64_any_dtype(df[first_col]):
-                    time_col_name = first_col
-            
-            # Rename time column if found
-            if time_col_name and time_col_name != 'time':
-                df.rename(columns={time_col_name: 'time'}, inplace=True)
-            elif time_col_name is None:
-                # Last resort: try to use the index if it was datetime
-                if isinstance(hist.index, pd.DatetimeIndex):
-                    df['time'] = hist.index.values
-                else:
-                    self.logger.error(f"DXY bars: No time column found. Columns: {df.columns.tolist()}")
-                    return None
-            
-            # Rename OHLCV columns (handle case variations)
-            rename_map = {}
-            for col in df.columns:
-                if col == 'time':
-                    continue
-                col_lower = str(col).lower()
-                if col_lower == 'open' and col != 'open':
-                    rename_map[col] = 'open'
-                elif col_lower == 'high' and col != 'high':
-                    rename_map[col] = 'high'
-                elif col_lower == 'low' and col != 'low':
-                    rename_map[col] = 'low'
-                elif col_lower == 'close' and col != 'close':
-                    rename_map[col] = 'close'
-                elif col_lower == 'volume' and col != 'volume':
-                    rename_map[col] = 'volume'
-            
-            if rename_map:
-                df.rename(columns=rename_map, inplace=True)
-            
-            # Ensure time column is datetime
-            if 'time' in df.columns:
-                if not pd.api.types.is_datetime64_any_dtype(df['time']):
-                    df['time'] = pd.to_datetime(df['time'])
-            else:
-                self.logger.error(f"DXY bars: 'time' column missing after processing. Columns: {df.columns.tolist()}")
-                return None
-            
-            # Select only required columns and validate
-            required_cols = ['time', 'open', 'high', 'low', 'close', 'volume']
-            missing_cols = [col for col in required_cols if col not in df.columns]
-            if missing_cols:
-                self.logger.error(f"DXY bars: Missing required columns: {missing_cols}. Available: {df.columns.tolist()}")
-                return None
-            
-            df = df[required_cols]
-            
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Failed to fetch DXY bars: {e}", exc_info=True)
-            return None
+        return await self._get_bars(self.dxy_symbol, "DXY", period, interval)
     
     async def get_sp500_bars(self, period: str = "5d", interval: str = "5m") -> Optional[Any]:
         """
@@ -774,96 +606,7 @@ class MarketIndicesService:
             pandas.DataFrame with columns: ['time', 'open', 'high', 'low', 'close', 'volume']
             or None if failed
         """
-        try:
-            import yfinance as yf
-            import pandas as pd
-            
-            # Fetch historical data (run in thread to avoid blocking)
-            loop = asyncio.get_event_loop()
-            sp500 = await loop.run_in_executor(None, lambda: yf.Ticker(self.sp500_symbol))
-            hist = await loop.run_in_executor(None, lambda: sp500.history(period=period, interval=interval))
-            
-            if hist is None or len(hist) == 0:
-                self.logger.warning("No SP500 historical data returned")
-                return None
-            
-            # Convert to DataFrame with standardized columns
-            # yfinance returns DataFrame with DatetimeIndex
-            df = hist.copy() if isinstance(hist, pd.DataFrame) else pd.DataFrame(hist)
-            
-            # Reset index to convert DatetimeIndex to column
-            df.reset_index(inplace=True)
-            
-            # Find the datetime column (could be 'Date', index name, or first column if index was unnamed)
-            time_col_name = None
-            for col in df.columns:
-                col_lower = str(col).lower()
-                # Check if column is datetime type or has datetime-like name
-                if (pd.api.types.is_datetime64_any_dtype(df[col]) or 
-                    col_lower in ['date', 'datetime', 'time', 'timestamp'] or
-                    (isinstance(df[col].iloc[0] if len(df) > 0 else None, (pd.Timestamp, datetime)))):
-                    time_col_name = col
-                    break
-            
-            # If no datetime column found, check if first column after reset_index is datetime
-            if time_col_name is None and len(df.columns) > 0:
-                first_col = df.columns[0]
-                if pd.api.types.is_datetime64_any_dtype(df[first_col]):
-                    time_col_name = first_col
-            
-            # Rename time column if found
-            if time_col_name and time_col_name != 'time':
-                df.rename(columns={time_col_name: 'time'}, inplace=True)
-            elif time_col_name is None:
-                # Last resort: try to use the index if it was datetime
-                if isinstance(hist.index, pd.DatetimeIndex):
-                    df['time'] = hist.index.values
-                else:
-                    self.logger.error(f"SP500 bars: No time column found. Columns: {df.columns.tolist()}")
-                    return None
-            
-            # Rename OHLCV columns (handle case variations)
-            rename_map = {}
-            for col in df.columns:
-                if col == 'time':
-                    continue
-                col_lower = str(col).lower()
-                if col_lower == 'open' and col != 'open':
-                    rename_map[col] = 'open'
-                elif col_lower == 'high' and col != 'high':
-                    rename_map[col] = 'high'
-                elif col_lower == 'low' and col != 'low':
-                    rename_map[col] = 'low'
-                elif col_lower == 'close' and col != 'close':
-                    rename_map[col] = 'close'
-                elif col_lower == 'volume' and col != 'volume':
-                    rename_map[col] = 'volume'
-            
-            if rename_map:
-                df.rename(columns=rename_map, inplace=True)
-            
-            # Ensure time column is datetime
-            if 'time' in df.columns:
-                if not pd.api.types.is_datetime64_any_dtype(df['time']):
-                    df['time'] = pd.to_datetime(df['time'])
-            else:
-                self.logger.error(f"SP500 bars: 'time' column missing after processing. Columns: {df.columns.tolist()}")
-                return None
-            
-            # Select only required columns and validate
-            required_cols = ['time', 'open', 'high', 'low', 'close', 'volume']
-            missing_cols = [col for col in required_cols if col not in df.columns]
-            if missing_cols:
-                self.logger.error(f"SP500 bars: Missing required columns: {missing_cols}. Available: {df.columns.tolist()}")
-                return None
-            
-            df = df[required_cols]
-            
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Failed to fetch SP500 bars: {e}", exc_info=True)
-            return None
+        return await self._get_bars(self.sp500_symbol, "SP500", period, interval)
     
     async def get_us10y_bars(self, period: str = "5d", interval: str = "5m") -> Optional[Any]:
         """
@@ -877,100 +620,147 @@ class MarketIndicesService:
             pandas.DataFrame with columns: ['time', 'open', 'high', 'low', 'close', 'volume']
             or None if failed
         """
+        return await self._get_bars(self.us10y_symbol, "US10Y", period, interval)
+
+    async def get_nasdaq_bars(self, period: str = "5d", interval: str = "5m") -> Optional[Any]:
+        """
+        Get NASDAQ historical bars for correlation calculation.
+
+        Args:
+            period: Period string (e.g., "5d" for 5 days)
+            interval: Interval string (e.g., "5m" for 5 minutes)
+
+        Returns:
+            pandas.DataFrame with columns: ['time', 'open', 'high', 'low', 'close', 'volume']
+            or None if failed
+        """
+        return await self._get_bars(self.nasdaq_symbol, "NASDAQ", period, interval)
+
+    async def _get_bars(self, ticker: str, label: str, period: str, interval: str) -> Optional[Any]:
+        """
+        Bars from the shared store: downloaded once per bar interval, kept in memory and
+        extended incrementally (short re-fetch merged into the held history).
+        """
         try:
-            import yfinance as yf
-            import pandas as pd
-            
-            # Fetch historical data (run in thread to avoid blocking)
-            loop = asyncio.get_event_loop()
-            us10y = await loop.run_in_executor(None, lambda: yf.Ticker(self.us10y_symbol))
-            hist = await loop.run_in_executor(None, lambda: us10y.history(period=period, interval=interval))
-            
+            return await self.store.aget_bars(
+                ticker, period, interval, normalize=lambda hist: self._normalize_bars(hist, label)
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to fetch {label} bars: {e}", exc_info=True)
+            return None
+    
+    def register_background_refresh(self, bar_period: str = "5d", bar_interval: str = "5m"):
+        """Keep the macro snapshot values and correlation bar series warm in the background"""
+        ttl = self.cache_ttl_seconds
+        for key, fetch in (('dxy', self._fetch_dxy), ('vix', self._fetch_vix), ('us10y', self._fetch_us10y),
+                           ('nasdaq', self._fetch_nasdaq), ('sp500', self._fetch_sp500)):
+            self.store.register(key, fetch, ttl=ttl, cache_if=_has_price)
+        for ticker, label in ((self.dxy_symbol, "DXY"), (self.sp500_symbol, "SP500"), (self.us10y_symbol, "US10Y"),
+                              (self.nasdaq_symbol, "NASDAQ")):
+            self.store.register_bars(
+                ticker, bar_period, bar_interval, normalize=lambda hist, label=label: self._normalize_bars(hist, label)
+            )
+        self.store.start()
+    
+    def _closes_loader(self, ticker: str, period: str, interval: str):
+        def fetch() -> List[float]:
+            hist = self._history(ticker, period, interval)
             if hist is None or len(hist) == 0:
-                self.logger.warning("No US10Y historical data returned")
-                return None
-            
-            # Convert to DataFrame with standardized columns
-            # yfinance returns DataFrame with DatetimeIndex
-            df = hist.copy() if isinstance(hist, pd.DataFrame) else pd.DataFrame(hist)
-            
-            # Reset index to convert DatetimeIndex to column
-            df.reset_index(inplace=True)
-            
-            # Find the datetime column (could be 'Date', index name, or first column if index was unnamed)
-            time_col_name = None
-            for col in df.columns:
-                col_lower = str(col).lower()
-                # Check if column is datetime type or has datetime-like name
-                if (pd.api.types.is_datetime64_any_dtype(df[col]) or 
-                    col_lower in ['date', 'datetime', 'time', 'timestamp'] or
-                    (isinstance(df[col].iloc[0] if len(df) > 0 else None, (pd.Timestamp, datetime)))):
-                    time_col_name = col
-                    break
-            
-            # If no datetime column found, check if first column after reset_index is datetime
-            if time_col_name is None and len(df.columns) > 0:
-                first_col = df.columns[0]
-                if pd.api.types.is_datetime64_any_dtype(df[first_col]):
-                    time_col_name = first_col
-            
-            # Rename time column if found
-            if time_col_name and time_col_name != 'time':
-                df.rename(columns={time_col_name: 'time'}, inplace=True)
-            elif time_col_name is None:
-                # Last resort: try to use the index if it was datetime
-                if isinstance(hist.index, pd.DatetimeIndex):
-                    df['time'] = hist.index.values
-                else:
-                    self.logger.error(f"US10Y bars: No time column found. Columns: {df.columns.tolist()}")
-                    return None
-            
-            # Rename OHLCV columns (handle case variations)
-            rename_map = {}
-            for col in df.columns:
-                if col == 'time':
-                    continue
-                col_lower = str(col).lower()
-                if col_lower == 'open' and col != 'open':
-                    rename_map[col] = 'open'
-                elif col_lower == 'high' and col != 'high':
-                    rename_map[col] = 'high'
-                elif col_lower == 'low' and col != 'low':
-                    rename_map[col] = 'low'
-                elif col_lower == 'close' and col != 'close':
-                    rename_map[col] = 'close'
-                elif col_lower == 'volume' and col != 'volume':
-                    rename_map[col] = 'volume'
-            
-            if rename_map:
-                df.rename(columns=rename_map, inplace=True)
-            
-            # Ensure time column is datetime
-            if 'time' in df.columns:
-                if not pd.api.types.is_datetime64_any_dtype(df['time']):
-                    df['time'] = pd.to_datetime(df['time'])
+                return []
+            return [float(v) for v in hist['Close'].dropna().values]
+        return f"closes:{ticker}:{period}:{interval}", fetch
+    
+    def get_recent_closes(self, ticker: str, period: str = "5d", interval: str = "1d") -> List[float]:
+        """Recent closes for any Yahoo ticker (cached in the shared store)"""
+        key, fetch = self._closes_loader(ticker, period, interval)
+        return self.store.get(key, fetch, ttl=self.cache_ttl_seconds, cache_if=bool)
+    
+    async def aget_recent_closes(self, ticker: str, period: str = "5d", interval: str = "1d") -> List[float]:
+        """Async get_recent_closes (fetch runs in the store's thread pool)"""
+        key, fetch = self._closes_loader(ticker, period, interval)
+        return await self.store.aget(key, fetch, ttl=self.cache_ttl_seconds, cache_if=bool)
+    
+    def _normalize_bars(self, hist, label: str):
+        """yfinance history -> DataFrame with ['time', 'open', 'high', 'low', 'close', 'volume']"""
+        import pandas as pd
+        
+        if hist is None or len(hist) == 0:
+            self.logger.warning(f"No {label} historical data returned")
+            return None
+        
+        # Convert to DataFrame with standardized columns
+        # yfinance returns DataFrame with DatetimeIndex
+        df = hist.copy() if isinstance(hist, pd.DataFrame) else pd.DataFrame(hist)
+        
+        # Reset index to convert DatetimeIndex to column
+        df.reset_index(inplace=True)
+        
+        # Find the datetime column (could be 'Date', index name, or first column if index was unnamed)
+        time_col_name = None
+        for col in df.columns:
+            col_lower = str(col).lower()
+            # Check if column is datetime type or has datetime-like name
+            if (pd.api.types.is_datetime64_any_dtype(df[col]) or 
+                col_lower in ['date', 'datetime', 'time', 'timestamp'] or
+                (isinstance(df[col].iloc[0] if len(df) > 0 else None, (pd.Timestamp, datetime)))):
+                time_col_name = col
+                break
+        
+        # If no datetime column found, check if first column after reset_index is datetime
+        if time_col_name is None and len(df.columns) > 0:
+            first_col = df.columns[0]
+            if pd.api.types.is_datetime64_any_dtype(df[first_col]):
+                time_col_name = first_col
+        
+        # Rename time column if found
+        if time_col_name and time_col_name != 'time':
+            df.rename(columns={time_col_name: 'time'}, inplace=True)
+        elif time_col_name is None:
+            # Last resort: try to use the index if it was datetime
+            if isinstance(hist.index, pd.DatetimeIndex):
+                df['time'] = hist.index.values
             else:
-                self.logger.error(f"US10Y bars: 'time' column missing after processing. Columns: {df.columns.tolist()}")
-                return None
-            
-            # Select only required columns and validate
-            required_cols = ['time', 'open', 'high', 'low', 'close', 'volume']
-            missing_cols = [col for col in required_cols if col not in df.columns]
-            if missing_cols:
-                self.logger.error(f"US10Y bars: Missing required columns: {missing_cols}. Available: {df.columns.tolist()}")
+                self.logger.error(f"{label} bars: No time column found. Columns: {df.columns.tolist()}")
                 return None
-            
-            df = df[required_cols]
-            
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Failed to fetch US10Y bars: {e}", exc_info=True)
+        
+        # Rename OHLCV columns (handle case variations)
+        rename_map = {}
+        for col in df.columns:
+            if col == 'time':
+                continue
+            col_lower = str(col).lower()
+            if col_lower in ('open', 'high', 'low', 'close', 'volume') and col != col_lower:
+                rename_map[col] = col_lower
+        
+        if rename_map:
+            df.rename(columns=rename_map, inplace=True)
+        
+        # Ensure time column is datetime
+        if 'time' in df.columns:
+            if not pd.api.types.is_datetime64_any_dtype(df['time']):
+                df['time'] = pd.to_datetime(df['time'])
+        else:
+            self.logger.error(f"{label} bars: 'time' column missing after processing. Columns: {df.columns.tolist()}")
+            return None
+        
+        # Select only required columns and validate
+        required_cols = ['time', 'open', 'high', 'low', 'close', 'volume']
+        missing_cols = [col for col in required_cols if col not in df.columns]
+        if missing_cols:
+            self.logger.error(f"{label} bars: Missing required columns: {missing_cols}. Available: {df.columns.tolist()}")
             return None
+        
+        return df[required_cols]
 
 
 # Factory function
+_service: Optional[MarketIndicesService] = None
+
+
 def create_market_indices_service() -> MarketIndicesService:
-    """Create MarketIndicesService instance (no API key needed)"""
-    return MarketIndicesService()
+    """Shared MarketIndicesService instance (no API key needed)"""
+    global _service
+    if _service is None or _service.store is not get_macro_context_store():
+        _service = MarketIndicesService()
+    return _service
 
@@ -3,7 +3,7 @@ Micro-Scalp Engine (Orchestrator)
 
 Main orchestrator for micro-scalp strategy:
 - Fetches data (M1 candles, VWAP, spread, volatility, BTC order flow)
-- Builds snapshot
+- Builds snapshot (shared per symbol, M1 bar and tick bucket by all callers)
 - Checks conditions (4-layer validation)
 - Executes trades
 - Integrates with auto-execution system
@@ -13,6 +13,9 @@ from __future__ import annotations
 
 import logging
 import json
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
@@ -25,6 +28,7 @@ from infra.micro_order_block_detector import MicroOrderBlockDetector
 from infra.spread_tracker import SpreadTracker
 from infra.m1_data_fetcher import M1DataFetcher
 from infra.mt5_service import MT5Service
+from infra.micro_scalp_features import candle_features
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +93,19 @@ class MicroScalpEngine:
         self.sweep_detector = MicroLiquiditySweepDetector(lookback=10)
         self.ob_detector = MicroOrderBlockDetector(lookback=3)
         
+        # Snapshot cache: the monitor and auto-execution threads check the same symbols every
+        # few seconds, so one snapshot (and its regime) is shared per M1 bar and tick bucket
+        cache_config = self.config.get('snapshot_cache', {})
+        self.snapshot_cache_enabled = cache_config.get('enabled', True)
+        self.tick_bucket_seconds = float(cache_config.get('tick_bucket_seconds', 1.0))
+        self.snapshot_cache_size = int(cache_config.get('max_entries', 32))
+        self.latency_budget_ms = float(self.config.get('latency_budget_ms', 250))
+        self._snapshot_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._snapshot_cache_lock = threading.Lock()
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+        self._checker_lock = threading.Lock()
+        self._snapshot_stats = {'builds': 0, 'hits': 0, 'regime_hits': 0, 'over_budget': 0}
+        
         # Initialize conditions checker (kept for backward compatibility)
         self.conditions_checker = MicroScalpConditionsChecker(
             config=self.config,
@@ -172,10 +189,34 @@ class MicroScalpEngine:
             - strategy: str (selected strategy name)
             - regime: str (detected regime)
             - plan_id: Optional[str] (plan ID if provided)
+            - latency_ms: Dict (snapshot/regime/checker/total stage timings)
+            - latency_budget_ms: float, over_budget: bool
         """
+        started = time.perf_counter()
+        latency: Dict[str, float] = {}
+        response = self._check_micro_conditions(symbol, plan_id, latency)
+        latency['total'] = round((time.perf_counter() - started) * 1000, 3)
+        
+        over_budget = latency['total'] > self.latency_budget_ms
+        if over_budget:
+            self._snapshot_stats['over_budget'] += 1
+            logger.warning(
+                f"[{symbol}] Micro-scalp check took {latency['total']:.1f}ms "
+                f"(budget {self.latency_budget_ms:.0f}ms): {latency}"
+            )
+        response['latency_ms'] = latency
+        response['latency_budget_ms'] = self.latency_budget_ms
+        response['over_budget'] = over_budget
+        return response
+    
+    def _check_micro_conditions(self, symbol: str, plan_id: Optional[str],
+                                latency: Dict[str, float]) -> Dict[str, Any]:
+        """check_micro_conditions() body; records stage timings (ms) into ``latency``"""
         try:
             # Build snapshot
+            stage = time.perf_counter()
             snapshot = self._build_snapshot(symbol)
+            latency['snapshot'] = round((time.perf_counter() - stage) * 1000, 3)
             
             if not snapshot:
                 return {
@@ -198,7 +239,9 @@ class MicroScalpEngine:
                     strategy_name = 'edge_based'
                     regime_result = {'regime': 'UNKNOWN', 'detected': False, 'confidence': 0, 'reason': 'regime_detector_not_initialized'}
                 else:
-                    regime_result = self.regime_detector.detect_regime(snapshot)
+                    stage = time.perf_counter()
+                    regime_result = self._detect_regime(snapshot)
+                    latency['regime'] = round((time.perf_counter() - stage) * 1000, 3)
                     snapshot['regime_result'] = regime_result
                     
                     # Log regime detection result for debugging
@@ -278,7 +321,9 @@ class MicroScalpEngine:
                 checker = self._get_strategy_checker('edge_based')
             
             # Check conditions using strategy-specific checker
+            stage = time.perf_counter()
             result = checker.validate(snapshot)
+            latency['checker'] = round((time.perf_counter() - stage) * 1000, 3)
             
             if not result.passed:
                 return {
@@ -348,6 +393,81 @@ class MicroScalpEngine:
     
     def _build_snapshot(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
+        Build data snapshot for condition checking, shared per (symbol, latest M1 bar, tick bucket).
+        
+        Concurrent callers for the same symbol wait for one build; later callers inside the
+        same bar and tick bucket get a shallow copy of it (same candle list, so the regime
+        detector and strategy checkers also share the candle features computed from it).
+        The spread tracker is only fed once per bucket.
+        """
+        # Normalize symbol (case-insensitive check for 'c' suffix)
+        symbol_norm = symbol.upper().rstrip('Cc') + 'c'
+        if not self.snapshot_cache_enabled:
+            return self._assemble_snapshot(symbol_norm)
+        
+        with self._snapshot_cache_lock:
+            symbol_lock = self._symbol_locks.setdefault(symbol_norm, threading.Lock())
+        
+        with symbol_lock:
+            if not self.m1_fetcher:
+                logger.error("M1DataFetcher not available")
+                return None
+            try:
+                candles = self.m1_fetcher.fetch_m1_data(symbol_norm, count=30, use_cache=True)
+            except Exception as e:
+                logger.error(f"Error building snapshot for {symbol}: {e}", exc_info=True)
+                return None
+            if not candles or len(candles) < 10:
+                logger.warning(f"Insufficient M1 candles for {symbol_norm}: {len(candles) if candles else 0}")
+                return None
+            
+            key = (symbol_norm, candles[-1].get('time'), int(time.time() // self.tick_bucket_seconds))
+            with self._snapshot_cache_lock:
+                entry = self._snapshot_cache.get(key)
+                if entry is not None:
+                    self._snapshot_cache.move_to_end(key)
+                    self._snapshot_stats['hits'] += 1
+                    return dict(entry['snapshot'])
+            
+            snapshot = self._assemble_snapshot(symbol_norm, candles)
+            if not snapshot:
+                return None
+            snapshot['snapshot_key'] = key
+            with self._snapshot_cache_lock:
+                self._snapshot_stats['builds'] += 1
+                self._snapshot_cache[key] = {'snapshot': snapshot, 'regime_result': None}
+                while len(self._snapshot_cache) > self.snapshot_cache_size:
+                    self._snapshot_cache.popitem(last=False)
+            return dict(snapshot)
+    
+    def _detect_regime(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Regime for this snapshot, detected once per cached snapshot"""
+        key = snapshot.get('snapshot_key')
+        with self._snapshot_cache_lock:
+            entry = self._snapshot_cache.get(key) if key is not None else None
+            if entry is not None and entry['regime_result'] is not None:
+                self._snapshot_stats['regime_hits'] += 1
+                return entry['regime_result']
+        
+        regime_result = self.regime_detector.detect_regime(snapshot)
+        if entry is not None:
+            with self._snapshot_cache_lock:
+                entry['regime_result'] = regime_result
+        return regime_result
+    
+    def get_snapshot_cache_stats(self) -> Dict[str, Any]:
+        """Snapshot cache counters (builds, hits, regime_hits, over_budget, entries)"""
+        with self._snapshot_cache_lock:
+            return dict(self._snapshot_stats, entries=len(self._snapshot_cache))
+    
+    def clear_snapshot_cache(self) -> None:
+        """Drop cached snapshots (tests)"""
+        with self._snapshot_cache_lock:
+            self._snapshot_cache.clear()
+    
+    def _assemble_snapshot(self, symbol_norm: str,
+                           candles: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """
         Build data snapshot for condition checking.
         
         Fetches:
@@ -363,16 +483,12 @@ class MicroScalpEngine:
         - BTC order flow (if BTCUSD)
         """
         try:
-            # Normalize symbol (case-insensitive check for 'c' suffix)
-            symbol_norm = symbol.upper().rstrip('Cc')  # Remove any existing 'c' or 'C'
-            symbol_norm = symbol_norm + 'c'  # Always add lowercase 'c'
-            
-            # Fetch M1 candles
-            if not self.m1_fetcher:
-                logger.error("M1DataFetcher not available")
-                return None
-            
-            candles = self.m1_fetcher.fetch_m1_data(symbol_norm, count=30, use_cache=True)
+            # Fetch M1 candles (unless the caller already has them)
+            if candles is None:
+                if not self.m1_fetcher:
+                    logger.error("M1DataFetcher not available")
+                    return None
+                candles = self.m1_fetcher.fetch_m1_data(symbol_norm, count=30, use_cache=True)
             if not candles or len(candles) < 10:
                 logger.warning(f"Insufficient M1 candles for {symbol_norm}: {len(candles) if candles else 0}")
                 return None
@@ -418,31 +534,8 @@ class MicroScalpEngine:
             # Calculate VWAP from M1 candles
             vwap = self._calculate_vwap_from_candles(candles)
             
-            # NEW: Calculate VWAP std (standard deviation)
-            vwap_std = 0.0
-            try:
-                # Use helper method from BaseStrategyChecker (will be available after integration)
-                # For now, calculate directly
-                import statistics
-                typical_prices = []
-                volumes = []
-                for candle in candles[-20:]:
-                    high = candle.get('high', 0)
-                    low = candle.get('low', 0)
-                    close = candle.get('close', 0)
-                    volume = candle.get('volume', 0)
-                    if volume > 0:
-                        typical_price = (high + low + close) / 3
-                        typical_prices.append(typical_price)
-                        volumes.append(volume)
-                if typical_prices and volumes:
-                    total_volume = sum(volumes)
-                    if total_volume > 0:
-                        weighted_mean = sum(tp * vol for tp, vol in zip(typical_prices, volumes)) / total_volume
-                        weighted_variance = sum(vol * (tp - weighted_mean) ** 2 for tp, vol in zip(typical_prices, volumes)) / total_volume
-                        vwap_std = weighted_variance ** 0.5
-            except Exception as e:
-                logger.debug(f"Error getting VWAP std: {e}")
+            # NEW: Calculate VWAP std (standard deviation) - shared with the regime detector
+            vwap_std = candle_features(candles).vwap_std
             
             # Calculate ATR(1)
             atr1 = self.volatility_filter.calculate_atr1(candles)
@@ -478,7 +571,7 @@ class MicroScalpEngine:
             return snapshot
             
         except Exception as e:
-            logger.error(f"Error building snapshot for {symbol}: {e}", exc_info=True)
+            logger.error(f"Error building snapshot for {symbol_norm}: {e}", exc_info=True)
             return None
     
     def _candle_to_dict(self, candle) -> Dict[str, Any]:
@@ -554,6 +647,14 @@ class MicroScalpEngine:
         if strategy_name in self.strategy_checkers:
             return self.strategy_checkers[strategy_name]
         
+        with self._checker_lock:
+            # Checkers are shared across calling threads; build each one once
+            if strategy_name in self.strategy_checkers:
+                return self.strategy_checkers[strategy_name]
+            return self._create_strategy_checker(strategy_name)
+    
+    def _create_strategy_checker(self, strategy_name: str):
+        """Create and cache a strategy checker (caller holds _checker_lock)"""
         try:
             # Import strategy checkers
             if strategy_name == 'vwap_reversion':
@@ -621,13 +722,13 @@ class MicroScalpEngine:
             logger.error(f"Failed to import strategy checker for {strategy_name}: {e}")
             # Fallback to edge-based
             if strategy_name != 'edge_based':
-                return self._get_strategy_checker('edge_based')
+                return self.strategy_checkers.get('edge_based') or self._create_strategy_checker('edge_based')
             raise
         except Exception as e:
             logger.error(f"Error creating strategy checker for {strategy_name}: {e}", exc_info=True)
             # Fallback to edge-based
             if strategy_name != 'edge_based':
-                return self._get_strategy_checker('edge_based')
+                return self.strategy_checkers.get('edge_based') or self._create_strategy_checker('edge_based')
             raise
     
     def _generate_trade_idea(self, symbol: str, snapshot: Dict[str, Any],
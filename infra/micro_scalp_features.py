@@ -0,0 +1,200 @@
+"""
+Micro-Scalp Candle Features - one NumPy pass over a snapshot's M1 candle list.
+
+MicroScalpRegimeDetector and the strategy checkers (BaseStrategyChecker helpers) derive the
+same values from the same snapshot candles: VWAP std, volume spike (multiplier and z-score),
+Bollinger compression and choppy liquidity. CandleFeatures reads the OHLCV columns once and
+computes each value on first request.
+
+- Features are memoized per candle list (by identity); MicroScalpEngine reuses one candle
+  list per (symbol, M1 bar, tick bucket) snapshot, so the detector and every checker share them
+- Features hold raw values; config thresholds are applied by volume_spike()/bb_compression()
+  so detector and checkers with different configs still share one computation
+- Results match the per-helper list/pandas calculations (sample std for z-score and BB width)
+- Thread-safe: the monitor and auto-execution threads may read the same features
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAX_FEATURE_SETS = 32
+BB_PERIOD = 20
+BB_STD_DEV = 2.0
+
+_MISSING = object()
+
+
+class CandleFeatures:
+    """Shared features of one M1 candle list, each computed on first request"""
+
+    def __init__(self, candles: List[Dict[str, Any]]):
+        self.candles = candles
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self.computed = 0
+        self.hits = 0
+        try:
+            rows = np.array(
+                [(c.get('open', 0), c.get('high', 0), c.get('low', 0), c.get('close', 0), c.get('volume', 0))
+                 for c in candles],
+                dtype=float
+            ).reshape(-1, 5)
+        except (TypeError, ValueError, AttributeError) as e:
+            logger.debug(f"Could not read candle columns: {e}")
+            rows = np.zeros((0, 5))
+        self.open, self.high, self.low, self.close, self.volume = rows.T
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def _memo(self, name: str, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            value = self._values.get(name, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            value = compute()
+            self.computed += 1
+            self._values[name] = value
+            return value
+
+    @property
+    def vwap_std(self) -> float:
+        """Volume-weighted std of typical price over the last 20 candles with volume"""
+        def compute():
+            volume = self.volume[-20:]
+            mask = volume > 0
+            if not mask.any():
+                return 0.0
+            typical = ((self.high + self.low + self.close) / 3)[-20:][mask]
+            weights = volume[mask]
+            total = weights.sum()
+            mean = (typical * weights).sum() / total
+            return float(np.sqrt((weights * (typical - mean) ** 2).sum() / total))
+        return self._memo('vwap_std', compute)
+
+    @property
+    def volume_ratio(self) -> Optional[float]:
+        """Last volume / previous 10-bar average (None when there is no usable volume)"""
+        def compute():
+            if len(self) < 11 or self.volume[-1] == 0:
+                return None
+            avg_volume = self.volume[-11:-1].mean()
+            if avg_volume == 0:
+                return None
+            return float(self.volume[-1] / avg_volume)
+        return self._memo('volume_ratio', compute)
+
+    @property
+    def volume_zscore(self) -> Optional[float]:
+        """Last volume z-score vs the previous 30 bars (sample std); None -> use the multiplier"""
+        def compute():
+            if len(self) < 31 or self.volume[-1] == 0:
+                return None
+            recent = self.volume[-31:-1]
+            std_volume = recent.std(ddof=1)
+            if std_volume == 0:
+                return None
+            return float((self.volume[-1] - recent.mean()) / std_volume)
+        return self._memo('volume_zscore', compute)
+
+    @property
+    def bb_width_pct(self) -> np.ndarray:
+        """BB(20, 2) width / SMA per candle (NaN for the first 19)"""
+        def compute():
+            n = len(self)
+            widths = np.full(n, np.nan)
+            if n >= BB_PERIOD:
+                windows = np.lib.stride_tricks.sliding_window_view(self.close, BB_PERIOD)
+                sma = windows.mean(axis=1)
+                std = windows.std(axis=1, ddof=1)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    widths[BB_PERIOD - 1:] = (std * BB_STD_DEV * 2) / sma
+            return widths
+        return self._memo('bb_width_pct', compute)
+
+    @property
+    def bb_compression_ratio(self) -> Optional[float]:
+        """Mean BB width of the last 5 candles / mean of the last 20 (None if undefined)"""
+        def compute():
+            widths = self.bb_width_pct[-20:]
+            if np.isnan(widths).all():
+                return None
+            avg_width = np.nanmean(widths)
+            if not avg_width > 0:
+                return None
+            return float(np.nanmean(widths[-5:]) / avg_width)
+        return self._memo('bb_compression_ratio', compute)
+
+    @property
+    def choppy_liquidity(self) -> bool:
+        """Wicks over 50% of range on 3+ of the last 5 candles, fewer than 2 strong bodies"""
+        def compute():
+            if len(self) < 10:
+                return False
+            o, h, l, c = self.open[-5:], self.high[-5:], self.low[-5:], self.close[-5:]
+            total_range = h - l
+            valid = total_range > 0
+            body = np.abs(c - o)[valid]
+            wicks = (h - np.maximum(o, c) + np.minimum(o, c) - l)[valid]
+            total_range = total_range[valid]
+            wick_count = int(np.count_nonzero(wicks / total_range > 0.5))
+            displacement_count = int(np.count_nonzero(body / total_range > 0.7))
+            return wick_count >= 3 and displacement_count < 2
+        return self._memo('choppy_liquidity', compute)
+
+
+def volume_spike(features: CandleFeatures, config: Dict[str, Any]) -> bool:
+    """Volume spike using the configured normalization ('multiplier' or 'z_score')"""
+    rules = config.get('regime_detection', {}).get('vwap_reversion', {})
+    if rules.get('volume_normalization', 'multiplier') == 'z_score':
+        z_score = features.volume_zscore
+        if z_score is not None:
+            return z_score >= rules.get('volume_z_score_threshold', 1.5)
+    ratio = features.volume_ratio
+    return ratio is not None and ratio >= rules.get('volume_spike_multiplier', 1.3)
+
+
+def bb_compression(features: CandleFeatures, config: Dict[str, Any]) -> bool:
+    """BB width < 2% of price, or recent width < bb_compression_threshold x the 20-bar average"""
+    if len(features) < BB_PERIOD:
+        return False
+    if features.bb_width_pct[-1] < 0.02:
+        return True
+    ratio = features.bb_compression_ratio
+    threshold = config.get('regime_detection', {}).get('balanced_zone', {}).get('bb_compression_threshold', 0.9)
+    return ratio is not None and ratio < threshold
+
+
+_feature_sets: "OrderedDict[int, CandleFeatures]" = OrderedDict()
+_feature_sets_lock = threading.Lock()
+
+
+def candle_features(candles: List[Dict[str, Any]]) -> CandleFeatures:
+    """Features for this candle list, shared by every caller holding the same list"""
+    key = id(candles)
+    with _feature_sets_lock:
+        features = _feature_sets.get(key)
+        # The held features keep their list alive, so a matching id is the same list
+        if features is not None and features.candles is candles and len(features) == len(candles):
+            _feature_sets.move_to_end(key)
+            return features
+        features = CandleFeatures(candles)
+        _feature_sets[key] = features
+        while len(_feature_sets) > MAX_FEATURE_SETS:
+            _feature_sets.popitem(last=False)
+        return features
+
+
+def clear_candle_features() -> None:
+    """Drop memoized feature sets (tests)"""
+    with _feature_sets_lock:
+        _feature_sets.clear()
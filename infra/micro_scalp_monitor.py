@@ -117,6 +117,8 @@ class MicroScalpMonitor:
             "http://localhost:8000"
         )
         self.streamer_api_timeout = 1.0  # 1 second timeout
+        # Last columnar candle response per (symbol, timeframe, limit) for If-None-Match polling
+        self._api_candle_cache: Dict[Tuple[str, str, int], Tuple[str, List[Dict]]] = {}
         
         # Get spread tracker from execution manager if available
         self.spread_tracker = None
@@ -934,15 +936,33 @@ class MicroScalpMonitor:
         """
         try:
             import httpx
+            from infra.candle_encoding import columns_to_candles, decode_payload, preferred_accept
             
             url = f"{self.streamer_api_url}/streamer/candles/{symbol}/{timeframe}"
-            params = {"limit": limit}
+            params = {"limit": limit, "format": "columnar"}
+            headers = {"Accept": preferred_accept()}
+            cache_key = (symbol, timeframe, limit)
+            cached = self._api_candle_cache.get(cache_key)
+            if cached:
+                headers["If-None-Match"] = cached[0]
             
             with httpx.Client(timeout=self.streamer_api_timeout) as client:
-                response = client.get(url, params=params)
+                response = client.get(url, params=params, headers=headers)
+                if response.status_code == 304 and cached:
+                    # Unchanged since the last poll - reuse the decoded candles
+                    logger.debug(f"[{symbol}] ✅ {timeframe} candles unchanged (304)")
+                    return [dict(candle) for candle in cached[1]]
                 if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success") and data.get("candles"):
+                    data = decode_payload(response.content, response.headers.get("content-type"))
+                    if data.get("success") and data.get("columns", {}).get("time"):
+                        candles = columns_to_candles(data["columns"])
+                        etag = response.headers.get("etag")
+                        if etag:
+                            self._api_candle_cache[cache_key] = (etag, candles)
+                        logger.debug(f"[{symbol}] ✅ Got {len(candles)} {timeframe} candles from API")
+                        return [dict(candle) for candle in candles]
+                    elif data.get("success") and data.get("candles"):
+                        # Server without columnar support - per-bar dicts
                         candles = data["candles"]
                         # Convert time from timestamp to datetime if needed
                         for candle in candles:
@@ -12,6 +12,7 @@ from typing import Dict, Any, List, Optional
 from collections import deque
 from datetime import datetime, timedelta
 
+from infra.micro_scalp_features import bb_compression, candle_features
 from infra.range_boundary_detector import RangeBoundaryDetector, RangeStructure
 
 logger = logging.getLogger(__name__)
@@ -448,39 +449,7 @@ class MicroScalpRegimeDetector:
         """Calculate VWAP standard deviation"""
         if len(candles) < 10 or vwap == 0:
             return 0.0
-        
-        try:
-            import statistics
-            
-            typical_prices = []
-            volumes = []
-            
-            for candle in candles[-20:]:
-                high = candle.get('high', 0)
-                low = candle.get('low', 0)
-                close = candle.get('close', 0)
-                volume = candle.get('volume', 0)
-                
-                if volume > 0:
-                    typical_price = (high + low + close) / 3
-                    typical_prices.append(typical_price)
-                    volumes.append(volume)
-            
-            if not typical_prices:
-                return 0.0
-            
-            total_volume = sum(volumes)
-            if total_volume == 0:
-                return 0.0
-            
-            weighted_mean = sum(tp * vol for tp, vol in zip(typical_prices, volumes)) / total_volume
-            weighted_variance = sum(vol * (tp - weighted_mean) ** 2 for tp, vol in zip(typical_prices, volumes)) / total_volume
-            std = weighted_variance ** 0.5
-            
-            return std
-        except Exception as e:
-            logger.debug(f"Error calculating VWAP std: {e}")
-            return 0.0
+        return candle_features(candles).vwap_std
     
     def _calculate_vwap_slope(self, candles: List[Dict[str, Any]], vwap: float) -> float:
         """Calculate VWAP slope over last N candles"""
@@ -536,94 +505,24 @@ class MicroScalpRegimeDetector:
     
     def _check_volume_spike_multiplier(self, candles: List[Dict]) -> bool:
         """Check if volume ≥ multiplier × 10-bar average"""
-        if len(candles) < 11:
-            return False
-        
-        last_volume = candles[-1].get('volume', 0)
-        if last_volume == 0:
+        ratio = candle_features(candles).volume_ratio
+        if ratio is None:
             return False
-        
-        recent_volumes = [c.get('volume', 0) for c in candles[-11:-1]]
-        avg_volume = sum(recent_volumes) / len(recent_volumes) if recent_volumes else 0
-        
-        if avg_volume == 0:
-            return False
-        
         volume_multiplier = self.config.get('regime_detection', {}).get('vwap_reversion', {}).get('volume_spike_multiplier', 1.3)
-        return last_volume >= avg_volume * volume_multiplier
+        return ratio >= volume_multiplier
     
     def _check_volume_spike_zscore(self, candles: List[Dict]) -> bool:
         """Check volume spike using Z-score normalization"""
-        if len(candles) < 31:
-            return self._check_volume_spike_multiplier(candles)
-        
-        last_volume = candles[-1].get('volume', 0)
-        if last_volume == 0:
-            return False
-        
-        recent_volumes = [c.get('volume', 0) for c in candles[-31:-1]]
-        
-        if not recent_volumes or all(v == 0 for v in recent_volumes):
-            return False
-        
-        import statistics
-        mean_volume = statistics.mean(recent_volumes)
-        std_volume = statistics.stdev(recent_volumes) if len(recent_volumes) > 1 else 0
-        
-        if std_volume == 0:
+        z_score = candle_features(candles).volume_zscore
+        if z_score is None:
+            # Too little data or flat volume: fall back to the multiplier
             return self._check_volume_spike_multiplier(candles)
-        
-        z_score = (last_volume - mean_volume) / std_volume
         z_score_threshold = self.config.get('regime_detection', {}).get('vwap_reversion', {}).get('volume_z_score_threshold', 1.5)
-        
         return z_score >= z_score_threshold
     
     def _check_bb_compression(self, candles: List[Dict]) -> bool:
         """Check if Bollinger Band width is contracting"""
-        if len(candles) < 20:
-            return False
-        
-        try:
-            import pandas as pd
-            import numpy as np
-            
-            df = self._candles_to_df(candles)
-            if df is None or len(df) < 20:
-                return False
-            
-            period = 20
-            std_dev = 2.0
-            
-            close = df['close']
-            sma = close.rolling(window=period).mean()
-            std = close.rolling(window=period).std()
-            
-            bb_upper = sma + (std * std_dev)
-            bb_lower = sma - (std * std_dev)
-            bb_width_pct = (bb_upper - bb_lower) / sma
-            
-            if len(bb_width_pct) < 5:
-                return False
-            
-            # Check absolute threshold (BB width < 0.02 = 2%)
-            recent_width_pct = bb_width_pct.iloc[-1]
-            if recent_width_pct < 0.02:
-                return True
-            
-            # Fallback: relative compression
-            if len(bb_width_pct) >= 10:
-                recent_avg = bb_width_pct.iloc[-5:].mean()
-                avg_width = bb_width_pct.iloc[-20:].mean()
-                
-                if avg_width > 0:
-                    compression_threshold = self.config.get('regime_detection', {}).get('balanced_zone', {}).get('bb_compression_threshold', 0.9)
-                    compression_ratio = recent_avg / avg_width
-                    return compression_ratio < compression_threshold
-            
-            return False
-        except Exception as e:
-            logger.debug(f"Error checking BB compression: {e}")
-            return False
+        return bb_compression(candle_features(candles), self.config)
     
     def _check_compression_block(self, candles: List[Dict], atr1: Optional[float] = None) -> bool:
         """Check for inside bars / tight structure"""
@@ -790,33 +689,7 @@ class MicroScalpRegimeDetector:
     
     def _check_choppy_liquidity(self, candles: List[Dict]) -> bool:
         """Check for wicks but no displacement (choppy liquidity)"""
-        if len(candles) < 10:
-            return False
-        
-        wick_count = 0
-        displacement_count = 0
-        
-        for candle in candles[-5:]:
-            high = candle.get('high', 0)
-            low = candle.get('low', 0)
-            open_price = candle.get('open', 0)
-            close = candle.get('close', 0)
-            
-            body = abs(close - open_price)
-            upper_wick = high - max(open_price, close)
-            lower_wick = min(open_price, close) - low
-            total_range = high - low
-            
-            if total_range > 0:
-                wick_ratio = (upper_wick + lower_wick) / total_range
-                if wick_ratio > 0.5:
-                    wick_count += 1
-                
-                body_ratio = body / total_range
-                if body_ratio > 0.7:
-                    displacement_count += 1
-        
-        return wick_count >= 3 and displacement_count < 2
+        return candle_features(candles).choppy_liquidity
     
     def _calculate_ema(self, candles: List[Dict], period: int = 20) -> Optional[float]:
         """Calculate EMA(period) from candles"""
@@ -8,10 +8,11 @@ All strategy checkers inherit from this class to access helper methods.
 from __future__ import annotations
 
 import logging
+import threading
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
-import statistics
 
+from infra.micro_scalp_features import bb_compression, candle_features
 from infra.micro_scalp_conditions import MicroScalpConditionsChecker, ConditionCheckResult
 
 logger = logging.getLogger(__name__)
@@ -40,8 +41,20 @@ class BaseStrategyChecker(MicroScalpConditionsChecker, ABC):
                         m1_analyzer, session_manager)
         self.news_service = news_service  # For news checks in Layer 1
         self.strategy_name = strategy_name  # For confluence weight lookup
+        # Checkers are shared by the engine's callers (monitor + auto-execution threads), so the
+        # snapshot being validated is kept per thread
+        self._snapshot_local = threading.local()
         self._current_snapshot = None  # Temporary snapshot storage for helper method access
     
+    @property
+    def _current_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Snapshot being validated on this thread (None outside validate())"""
+        return getattr(self._snapshot_local, 'snapshot', None)
+    
+    @_current_snapshot.setter
+    def _current_snapshot(self, snapshot: Optional[Dict[str, Any]]):
+        self._snapshot_local.snapshot = snapshot
+    
     def validate(self, snapshot: Dict[str, Any]) -> ConditionCheckResult:
         """
         Base implementation that calls strategy-specific overrides.
@@ -204,44 +217,7 @@ class BaseStrategyChecker(MicroScalpConditionsChecker, ABC):
         """Calculate VWAP standard deviation (shared helper method)"""
         if len(candles) < 10 or vwap == 0:
             return 0.0
-        
-        try:
-            # Calculate typical prices
-            typical_prices = []
-            volumes = []
-            
-            for candle in candles[-20:]:  # Use last 20 candles
-                high = candle.get('high', 0)
-                low = candle.get('low', 0)
-                close = candle.get('close', 0)
-                volume = candle.get('volume', 0)
-                
-                if volume > 0:
-                    typical_price = (high + low + close) / 3
-                    typical_prices.append(typical_price)
-                    volumes.append(volume)
-            
-            if not typical_prices:
-                return 0.0
-            
-            # Calculate weighted standard deviation
-            total_volume = sum(volumes)
-            if total_volume == 0:
-                return 0.0
-            
-            # Weighted mean
-            weighted_mean = sum(tp * vol for tp, vol in zip(typical_prices, volumes)) / total_volume
-            
-            # Weighted variance
-            weighted_variance = sum(vol * (tp - weighted_mean) ** 2 for tp, vol in zip(typical_prices, volumes)) / total_volume
-            
-            # Standard deviation
-            std = weighted_variance ** 0.5
-            
-            return std
-        except Exception as e:
-            logger.debug(f"Error calculating VWAP std: {e}")
-            return 0.0
+        return candle_features(candles).vwap_std
     
     def _calculate_vwap_slope(self, candles: List[Dict[str, Any]], vwap: float) -> float:
         """Calculate VWAP slope over last N candles (shared helper method)"""
@@ -302,47 +278,19 @@ class BaseStrategyChecker(MicroScalpConditionsChecker, ABC):
     
     def _check_volume_spike_multiplier(self, candles: List[Dict]) -> bool:
         """Check if volume ≥ multiplier × 10-bar average"""
-        if len(candles) < 11:
+        ratio = candle_features(candles).volume_ratio
+        if ratio is None:
             return False
-        
-        last_volume = candles[-1].get('volume', 0)
-        if last_volume == 0:
-            return False
-        
-        recent_volumes = [c.get('volume', 0) for c in candles[-11:-1]]
-        avg_volume = sum(recent_volumes) / len(recent_volumes) if recent_volumes else 0
-        
-        if avg_volume == 0:
-            return False
-        
         volume_multiplier = self.config.get('regime_detection', {}).get('vwap_reversion', {}).get('volume_spike_multiplier', 1.3)
-        return last_volume >= avg_volume * volume_multiplier
+        return ratio >= volume_multiplier
     
     def _check_volume_spike_zscore(self, candles: List[Dict]) -> bool:
         """Check volume spike using Z-score normalization (exchange-agnostic)"""
-        if len(candles) < 31:
-            # Fallback to multiplier if not enough data
-            return self._check_volume_spike_multiplier(candles)
-        
-        last_volume = candles[-1].get('volume', 0)
-        if last_volume == 0:
-            return False
-        
-        recent_volumes = [c.get('volume', 0) for c in candles[-31:-1]]
-        
-        if not recent_volumes or all(v == 0 for v in recent_volumes):
-            return False
-        
-        mean_volume = statistics.mean(recent_volumes)
-        std_volume = statistics.stdev(recent_volumes) if len(recent_volumes) > 1 else 0
-        
-        if std_volume == 0:
-            # Fallback to multiplier
+        z_score = candle_features(candles).volume_zscore
+        if z_score is None:
+            # Too little data or flat volume: fall back to the multiplier
             return self._check_volume_spike_multiplier(candles)
-        
-        z_score = (last_volume - mean_volume) / std_volume
         z_score_threshold = self.config.get('regime_detection', {}).get('vwap_reversion', {}).get('volume_z_score_threshold', 1.5)
-        
         return z_score >= z_score_threshold
     
     def _check_bb_compression(self, candles: List[Dict]) -> bool:
@@ -355,52 +303,7 @@ class BaseStrategyChecker(MicroScalpConditionsChecker, ABC):
         - Recent BB width < 2% of price (absolute threshold)
         - OR Recent BB width < threshold × average (relative compression fallback)
         """
-        if len(candles) < 20:
-            return False
-        
-        try:
-            import pandas as pd
-            import numpy as np
-            
-            # Convert to DataFrame
-            df = self._candles_to_df(candles)
-            if df is None or len(df) < 20:
-                return False
-            
-            # Calculate Bollinger Bands
-            period = 20
-            std_dev = 2.0
-            
-            close = df['close']
-            sma = close.rolling(window=period).mean()
-            std = close.rolling(window=period).std()
-            
-            bb_upper = sma + (std * std_dev)
-            bb_lower = sma - (std * std_dev)
-            bb_width_pct = (bb_upper - bb_lower) / sma  # As decimal (0.02 = 2%)
-            
-            if len(bb_width_pct) < 5:
-                return False
-            
-            # RECOMMENDED: Check absolute threshold first (BB width < 0.02 = 2%)
-            recent_width_pct = bb_width_pct.iloc[-1]  # Most recent BB width
-            if recent_width_pct < 0.02:  # 2% of price
-                return True
-            
-            # Fallback: Check relative compression (recent < average)
-            if len(bb_width_pct) >= 10:
-                recent_avg = bb_width_pct.iloc[-5:].mean()
-                avg_width = bb_width_pct.iloc[-20:].mean()
-                
-                if avg_width > 0:
-                    compression_threshold = self.config.get('regime_detection', {}).get('balanced_zone', {}).get('bb_compression_threshold', 0.9)
-                    compression_ratio = recent_avg / avg_width
-                    return compression_ratio < compression_threshold
-            
-            return False
-        except Exception as e:
-            logger.debug(f"Error checking BB compression: {e}")
-            return False
+        return bb_compression(candle_features(candles), self.config)
     
     def _check_compression_block(self, candles: List[Dict], atr1: Optional[float] = None) -> bool:
         """Check for inside bars / tight structure (shared helper method)"""
@@ -511,37 +414,7 @@ class BaseStrategyChecker(MicroScalpConditionsChecker, ABC):
     
     def _check_choppy_liquidity(self, candles: List[Dict]) -> bool:
         """Check for wicks but no displacement (choppy liquidity) (shared helper method)"""
-        if len(candles) < 10:
-            return False
-        
-        # Check last 5 candles for wicks without strong displacement
-        wick_count = 0
-        displacement_count = 0
-        
-        for candle in candles[-5:]:
-            high = candle.get('high', 0)
-            low = candle.get('low', 0)
-            open_price = candle.get('open', 0)
-            close = candle.get('close', 0)
-            
-            body = abs(close - open_price)
-            upper_wick = high - max(open_price, close)
-            lower_wick = min(open_price, close) - low
-            total_range = high - low
-            
-            if total_range > 0:
-                # Significant wick (wick > body)
-                wick_ratio = (upper_wick + lower_wick) / total_range
-                if wick_ratio > 0.5:  # More than 50% wick
-                    wick_count += 1
-                
-                # Check for displacement (strong move)
-                body_ratio = body / total_range
-                if body_ratio > 0.7:  # Strong body (>70% of range)
-                    displacement_count += 1
-        
-        # Choppy: wicks present but no strong displacement
-        return wick_count >= 3 and displacement_count < 2
+        return candle_features(candles).choppy_liquidity
     
     def _candles_to_df(self, candles: List[Dict[str, Any]]) -> Optional[Any]:
         """Convert candle list to DataFrame with datetime index (shared helper method)"""
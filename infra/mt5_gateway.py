@@ -0,0 +1,318 @@
+"""
+MT5 Gateway
+Serializes all MetaTrader5 terminal IPC on a single dedicated worker thread.
+
+The terminal IPC is effectively single-threaded, so calls from many threads and
+asyncio tasks only contend with each other. The gateway:
+- runs every call on one worker thread (sync facade: ``call``, async facade: ``acall``)
+- coalesces identical in-flight reads (same quote, same bars range) into one IPC call
+- caches read results with short per-call-type TTLs
+- invalidates cached reads after state-changing calls (``order_send``, ``symbol_select``)
+
+``mt5`` is a drop-in stand-in for the ``MetaTrader5`` module that routes function
+calls through the default gateway, so modules can switch with a one-line import
+change. The backend defaults to the installed ``MetaTrader5`` module (resolved on
+every call, so ``sys.modules`` swaps and ``mock.patch('MetaTrader5.x')`` keep
+working) and can be replaced with any object exposing the same API (e.g. a fake
+backend for tests and benchmarks on Linux).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import importlib
+import logging
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Per-call-type cache TTLs (seconds). Calls listed here are coalesced while in flight;
+# a TTL of 0 means coalesce only, no caching. Failed reads (None/False) are never cached.
+# symbol_info carries live bid/ask/spread/visible, so it is cached at tick scale too.
+# Tick copies are coalesce-only: the ingestion cursor polls every 100 ms and must see
+# ticks that arrived since its last poll, not a cached batch.
+DEFAULT_CACHE_TTLS: Dict[str, float] = {
+    "symbol_info_tick": 0.2,
+    "symbol_info": 0.2,
+    "terminal_info": 1.0,
+    "account_info": 1.0,
+    "copy_rates_from_pos": 1.0,
+    "copy_rates_from": 1.0,
+    "copy_rates_range": 1.0,
+    "copy_ticks_from": 0.0,
+    "copy_ticks_range": 0.0,
+    "positions_get": 0.25,
+    "positions_total": 0.25,
+    "orders_get": 0.25,
+    "orders_total": 0.25,
+    "history_deals_get": 1.0,
+    "history_orders_get": 1.0,
+}
+
+# Calls that change terminal/account state - cached reads are dropped once they complete
+INVALIDATING_CALLS = frozenset({"order_send", "login", "shutdown"})
+
+# Calls that change one symbol's state - cached reads of that symbol are dropped
+SYMBOL_INVALIDATING_CALLS: Dict[str, Tuple[str, ...]] = {
+    "symbol_select": ("symbol_info", "symbol_info_tick"),
+}
+
+MAX_CACHE_ENTRIES = 2048
+
+
+class MT5Gateway:
+    """Single-worker MT5 IPC gateway with request coalescing and short TTL caches"""
+
+    def __init__(self, backend: Any = None, cache_ttls: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            backend: Object exposing the MetaTrader5 API (defaults to the MetaTrader5 module)
+            cache_ttls: Overrides for DEFAULT_CACHE_TTLS
+        """
+        self._backend = backend
+        self._cache_ttls = dict(DEFAULT_CACHE_TTLS)
+        if cache_ttls:
+            self._cache_ttls.update(cache_ttls)
+
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+        self._state_lock = threading.Lock()
+        self._inflight: Dict[tuple, Future] = {}
+        self._cache: Dict[tuple, Tuple[float, Any, Any]] = {}  # key -> (expires_at, result, last_error)
+        self._local = threading.local()
+
+        self._stats = {
+            "calls": 0,
+            "ipc_calls": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "ipc_time_total": 0.0,
+        }
+
+        self.mt5 = MT5Proxy(self)
+
+    # ---------- backend ----------
+    @property
+    def backend(self) -> Any:
+        if self._backend is not None:
+            return self._backend
+        module = sys.modules.get("MetaTrader5")
+        if module is None:
+            module = importlib.import_module("MetaTrader5")
+        return module
+
+    def set_backend(self, backend: Any) -> None:
+        """Replace the backend (None = MetaTrader5 module) and drop cached results"""
+        self._backend = backend
+        self.clear_cache()
+
+    # ---------- worker ----------
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._worker_loop, name="MT5GatewayWorker", daemon=True
+                )
+                self._worker.start()
+
+    def _worker_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._run(*item)
+
+    def _run(self, name: str, fn: Any, args: tuple, kwargs: dict, future: Future) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+            last_error = None
+            if result is None or result is False:
+                # Capture the error for this call before another caller's call overwrites it
+                try:
+                    last_error = self.backend.last_error()
+                except Exception:
+                    pass
+            future.set_result((result, last_error))
+        except BaseException as e:
+            self._stats["errors"] += 1
+            future.set_exception(e)
+        finally:
+            self._stats["ipc_calls"] += 1
+            self._stats["ipc_time_total"] += time.perf_counter() - start
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker thread (it restarts on the next call)"""
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            self._queue.put(None)
+            worker.join(timeout=timeout)
+
+    # ---------- submission ----------
+    def submit(self, name: str, *args, **kwargs) -> Future:
+        """
+        Submit an MT5 call to the worker.
+
+        Returns:
+            Future resolving to (result, last_error)
+        """
+        self._stats["calls"] += 1
+        fn = getattr(self.backend, name)
+
+        key = None
+        ttl = self._cache_ttls.get(name)
+        if ttl is not None:
+            # Include the function object so a patched backend function never sees stale results
+            key = (name, fn, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+
+        if key is not None:
+            now = time.monotonic()
+            with self._state_lock:
+                cached = self._cache.get(key)
+                if cached is not None and cached[0] > now:
+                    self._stats["cache_hits"] += 1
+                    done: Future = Future()
+                    done.set_result((cached[1], cached[2]))
+                    return done
+                inflight = self._inflight.get(key)
+                if inflight is not None:
+                    self._stats["coalesced"] += 1
+                    return inflight
+                future: Future = Future()
+                self._inflight[key] = future
+            future.add_done_callback(functools.partial(self._on_read_done, key, ttl))
+        else:
+            future = Future()
+            if name in INVALIDATING_CALLS:
+                future.add_done_callback(lambda _f: self.clear_cache())
+            elif name in SYMBOL_INVALIDATING_CALLS and args:
+                names = SYMBOL_INVALIDATING_CALLS[name]
+                future.add_done_callback(lambda _f: self.invalidate(args[0], names))
+
+        if threading.current_thread() is self._worker:
+            # Re-entrant call from the worker itself - run inline to avoid deadlock
+            self._run(name, fn, args, kwargs, future)
+        else:
+            self._ensure_worker()
+            self._queue.put((name, fn, args, kwargs, future))
+        return future
+
+    def _on_read_done(self, key: tuple, ttl: float, future: Future) -> None:
+        with self._state_lock:
+            if self._inflight.get(key) is not future:
+                # Detached by invalidate() - the result may predate the state change
+                return
+            del self._inflight[key]
+            if ttl <= 0 or future.cancelled() or future.exception() is not None:
+                return
+            result, last_error = future.result()
+            if result is None or result is False:
+                # Don't replay a transient failure for the whole TTL
+                return
+            if len(self._cache) >= MAX_CACHE_ENTRIES:
+                now = time.monotonic()
+                for k in [k for k, v in self._cache.items() if v[0] <= now]:
+                    del self._cache[k]
+                if len(self._cache) >= MAX_CACHE_ENTRIES:
+                    self._cache.clear()
+            self._cache[key] = (time.monotonic() + ttl, result, last_error)
+
+    def call(self, name: str, *args, **kwargs) -> Any:
+        """Sync facade: run an MT5 call on the gateway worker and wait for the result"""
+        result, last_error = self.submit(name, *args, **kwargs).result()
+        self._local.last_error = last_error
+        return result
+
+    async def acall(self, name: str, *args, **kwargs) -> Any:
+        """Async facade: await an MT5 call without blocking the event loop"""
+        result, last_error = await asyncio.wrap_future(self.submit(name, *args, **kwargs))
+        self._local.last_error = last_error
+        return result
+
+    def last_error(self) -> Any:
+        """Error of the calling thread's last failed call (falls back to the terminal's last_error)"""
+        last_error = getattr(self._local, "last_error", None)
+        if last_error is not None:
+            return last_error
+        return self.submit("last_error").result()[0]
+
+    # ---------- cache / stats ----------
+    def clear_cache(self) -> None:
+        with self._state_lock:
+            self._cache.clear()
+
+    def invalidate(self, symbol: str, names: Tuple[str, ...]) -> None:
+        """Drop cached (and detach in-flight) reads of `names` for one symbol"""
+        with self._state_lock:
+            for store in (self._cache, self._inflight):
+                for key in [k for k in store if k[0] in names and k[2][:1] == (symbol,)]:
+                    del store[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        ipc_calls = stats["ipc_calls"]
+        stats["avg_ipc_ms"] = (stats.pop("ipc_time_total") / ipc_calls * 1000) if ipc_calls else 0.0
+        stats["saved_calls"] = stats["cache_hits"] + stats["coalesced"]
+        stats["queue_depth"] = self._queue.qsize()
+        stats["cache_entries"] = len(self._cache)
+        return stats
+
+
+class MT5Proxy:
+    """
+    Drop-in stand-in for the MetaTrader5 module.
+    Functions are routed through an MT5Gateway; constants are read from the backend.
+    """
+
+    def __init__(self, gateway: Optional[MT5Gateway] = None):
+        self._gateway = gateway
+
+    @property
+    def gateway(self) -> MT5Gateway:
+        return self._gateway if self._gateway is not None else get_mt5_gateway()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        gateway = self.gateway
+        if name == "last_error":
+            return gateway.last_error
+        attr = getattr(gateway.backend, name)
+        if callable(attr) and name[:1].islower():
+            return functools.partial(gateway.call, name)
+        return attr
+
+
+_default_gateway: Optional[MT5Gateway] = None
+_default_gateway_lock = threading.Lock()
+
+
+def get_mt5_gateway() -> MT5Gateway:
+    """Get the process-wide MT5 gateway"""
+    global _default_gateway
+    if _default_gateway is None:
+        with _default_gateway_lock:
+            if _default_gateway is None:
+                _default_gateway = MT5Gateway()
+    return _default_gateway
+
+
+# Module-level MetaTrader5 stand-in bound to the process-wide gateway
+mt5 = MT5Proxy()
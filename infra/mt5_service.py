@@ -8,9 +8,11 @@ import time
 from dataclasses import dataclass
 from typing import Optional, Tuple, List, Dict, Any
 
-import MetaTrader5 as mt5
+import MetaTrader5  # noqa: F401 - fail at import where the terminal package is unavailable
 
 from config import settings
+# All terminal IPC goes through the single-worker gateway (coalescing + short TTL caches)
+from infra.mt5_gateway import mt5, get_mt5_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -105,22 +107,35 @@ class MT5Service:
             if not symbol:
                 raise ValueError("Symbol cannot be empty")
             
-            t = mt5.symbol_info_tick(symbol)
-            if t is None:
-                raise RuntimeError(f"No tick for {symbol}")
-            
-            try:
-                bid = float(t.bid)
-                ask = float(t.ask)
-            except (ValueError, TypeError, AttributeError) as e:
-                raise RuntimeError(f"Invalid tick data for {symbol}: {e}")
-            
-            return Quote(bid, ask)
+            return self._quote_from_tick(symbol, mt5.symbol_info_tick(symbol))
         except RuntimeError:
             raise  # Re-raise RuntimeError as-is
         except Exception as e:
             raise RuntimeError(f"Error getting quote for {symbol}: {e}") from e
 
+    async def aget_quote(self, symbol: str) -> Quote:
+        """Async get_quote: awaits the gateway instead of blocking the event loop"""
+        try:
+            if not symbol:
+                raise ValueError("Symbol cannot be empty")
+            t = await get_mt5_gateway().acall("symbol_info_tick", symbol)
+            return self._quote_from_tick(symbol, t)
+        except RuntimeError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Error getting quote for {symbol}: {e}") from e
+
+    @staticmethod
+    def _quote_from_tick(symbol: str, t: Any) -> Quote:
+        if t is None:
+            raise RuntimeError(f"No tick for {symbol}")
+        try:
+            bid = float(t.bid)
+            ask = float(t.ask)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise RuntimeError(f"Invalid tick data for {symbol}: {e}")
+        return Quote(bid, ask)
+
     def account_bal_eq(self) -> Tuple[Optional[float], Optional[float]]:
         ai = mt5.account_info()
         if ai is None:
@@ -129,7 +144,14 @@ class MT5Service:
 
     # ---------- symbol meta / maths ----------
     def symbol_meta(self, symbol: str) -> Dict[str, float]:
-        info = mt5.symbol_info(symbol)
+        return self._meta_from_info(symbol, mt5.symbol_info(symbol))
+
+    async def asymbol_meta(self, symbol: str) -> Dict[str, float]:
+        """Async symbol_meta via the gateway"""
+        return self._meta_from_info(symbol, await get_mt5_gateway().acall("symbol_info", symbol))
+
+    @staticmethod
+    def _meta_from_info(symbol: str, info: Any) -> Dict[str, float]:
         if info is None:
             raise RuntimeError(f"symbol_meta: no info for {symbol}")
         meta = {
@@ -965,6 +987,19 @@ class MT5Service:
             cur = mt5.positions_get(symbol=symbol)
         else:
             cur = mt5.positions_get()
+        return self._positions_to_dicts(cur)
+
+    async def alist_positions(self, symbol: Optional[str] = None) -> List[Dict]:
+        """Async list_positions via the gateway"""
+        gateway = get_mt5_gateway()
+        if symbol:
+            cur = await gateway.acall("positions_get", symbol=symbol)
+        else:
+            cur = await gateway.acall("positions_get")
+        return self._positions_to_dicts(cur)
+
+    @staticmethod
+    def _positions_to_dicts(cur: Any) -> List[Dict]:
         out: List[Dict] = []
         if not cur:
             return out
@@ -1032,6 +1067,8 @@ class MT5Service:
             "comment": getattr(res, "comment", ""),
         }
 
+    _BARS_TIMEFRAMES = ("M1", "M5", "M15", "M30", "H1", "H4", "D1", "W1", "MN1")
+
     def get_bars(self, symbol: str, timeframe: str, count: int) -> Optional[Any]:
         """
         Get historical bars for a symbol.
@@ -1045,55 +1082,59 @@ class MT5Service:
             pandas.DataFrame with OHLCV data or None if failed
         """
         try:
-            import pandas as pd
-            
-            # Map timeframe string to MT5 constant
-            tf_map = {
-                'M1': mt5.TIMEFRAME_M1,
-                'M5': mt5.TIMEFRAME_M5,
-                'M15': mt5.TIMEFRAME_M15,
-                'M30': mt5.TIMEFRAME_M30,
-                'H1': mt5.TIMEFRAME_H1,
-                'H4': mt5.TIMEFRAME_H4,
-                'D1': mt5.TIMEFRAME_D1,
-                'W1': mt5.TIMEFRAME_W1,
-                'MN1': mt5.TIMEFRAME_MN1
-            }
-            
-            if timeframe not in tf_map:
+            if timeframe not in self._BARS_TIMEFRAMES:
                 logger.error(f"Unsupported timeframe: {timeframe}")
                 return None
             
             # Ensure symbol is available
             self.ensure_symbol(symbol)
             
-            # Get bars from MT5
-            bars = mt5.copy_rates_from_pos(symbol, tf_map[timeframe], 0, count)
+            # Get bars from MT5 (identical concurrent requests are coalesced by the gateway)
+            bars = mt5.copy_rates_from_pos(symbol, getattr(mt5, f"TIMEFRAME_{timeframe}"), 0, count)
+            return self._bars_to_dataframe(symbol, timeframe, bars)
             
-            if bars is None or len(bars) == 0:
-                logger.warning(f"No bars returned for {symbol} {timeframe}")
+        except Exception as e:
+            logger.error(f"Error getting bars for {symbol} {timeframe}: {e}")
+            return None
+
+    async def aget_bars(self, symbol: str, timeframe: str, count: int) -> Optional[Any]:
+        """Async get_bars via the gateway (symbol must already be selected in MT5)"""
+        try:
+            if timeframe not in self._BARS_TIMEFRAMES:
+                logger.error(f"Unsupported timeframe: {timeframe}")
                 return None
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(bars)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            
-            # Rename columns to match expected format
-            # MT5 returns 'tick_volume' but we need to ensure it exists
-            if 'tick_volume' in df.columns:
-                df = df.rename(columns={'tick_volume': 'volume'})
-            elif 'real_volume' in df.columns:
-                df = df.rename(columns={'real_volume': 'volume'})
-            else:
-                # If no volume column exists, create one with default value
-                df['volume'] = 0
-            
-            return df
-            
+            bars = await get_mt5_gateway().acall(
+                "copy_rates_from_pos", symbol, getattr(mt5, f"TIMEFRAME_{timeframe}"), 0, count
+            )
+            return self._bars_to_dataframe(symbol, timeframe, bars)
         except Exception as e:
             logger.error(f"Error getting bars for {symbol} {timeframe}: {e}")
             return None
 
+    @staticmethod
+    def _bars_to_dataframe(symbol: str, timeframe: str, bars: Any) -> Optional[Any]:
+        import pandas as pd
+        
+        if bars is None or len(bars) == 0:
+            logger.warning(f"No bars returned for {symbol} {timeframe}")
+            return None
+        
+        # Convert to DataFrame
+        df = pd.DataFrame(bars)
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        
+        # Rename columns to match expected format
+        # MT5 returns 'tick_volume' but we need to ensure it exists
+        if 'tick_volume' in df.columns:
+            df = df.rename(columns={'tick_volume': 'volume'})
+        elif 'real_volume' in df.columns:
+            df = df.rename(columns={'real_volume': 'volume'})
+        else:
+            # If no volume column exists, create one with default value
+            df['volume'] = 0
+        
+        return df
+
     def close_position_partial(
         self, 
         ticket: int, 
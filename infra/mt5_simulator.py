@@ -0,0 +1,833 @@
+"""
+MT5 Simulator
+Deterministic drop-in replacement for the ``MetaTrader5`` module (Linux / CI).
+
+Driven by recorded tick data (or rates) and a simulated clock:
+- ``copy_rates_from_pos`` / ``copy_rates_from`` / ``copy_rates_range`` (bars built from ticks,
+  including the currently forming bar) and recorded rates
+- ``copy_ticks_range`` / ``copy_ticks_from`` / ``symbol_info_tick``
+- ``positions_get`` / ``orders_get`` / ``order_send`` / ``history_deals_get``
+- configurable per-call latency and fill model (slippage, rejects) with a seeded RNG
+
+Only data with ``time <= clock`` is visible; ``advance()`` moves the clock forward and
+fills pending orders / SL / TP against the ticks crossed. Results use the same numpy
+dtypes and field names as the real terminal.
+
+Usage:
+    from infra.mt5_simulator import MT5Simulator, install
+    sim = MT5Simulator(seed=7)
+    sim.generate_ticks("XAUUSDc", start=1_700_000_000, seconds=3600, start_price=2000.0)
+    install(sim)            # ``import MetaTrader5`` now resolves to the simulator
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import random
+import sys
+import threading
+import time
+from collections import namedtuple
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# ---------- terminal structures (same field names as MetaTrader5) ----------
+TICK_DTYPE = np.dtype([
+    ("time", "<i8"), ("bid", "<f8"), ("ask", "<f8"), ("last", "<f8"),
+    ("volume", "<u8"), ("time_msc", "<i8"), ("flags", "<u4"), ("volume_real", "<f8"),
+])
+RATES_DTYPE = np.dtype([
+    ("time", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"),
+    ("tick_volume", "<u8"), ("spread", "<i4"), ("real_volume", "<u8"),
+])
+
+Tick = namedtuple("Tick", ["time", "bid", "ask", "last", "volume", "time_msc", "flags", "volume_real"])
+SymbolInfo = namedtuple("SymbolInfo", [
+    "name", "description", "visible", "select", "digits", "point", "spread", "bid", "ask",
+    "trade_stops_level", "trade_freeze_level", "volume_min", "volume_max", "volume_step",
+    "trade_contract_size", "trade_tick_size", "trade_tick_value", "trade_mode", "filling_mode",
+])
+AccountInfo = namedtuple("AccountInfo", [
+    "login", "balance", "equity", "profit", "margin", "margin_free", "leverage", "currency", "server",
+])
+TerminalInfo = namedtuple("TerminalInfo", ["connected", "trade_allowed", "build", "name", "company"])
+TradePosition = namedtuple("TradePosition", [
+    "ticket", "time", "time_msc", "type", "magic", "identifier", "volume", "price_open",
+    "sl", "tp", "price_current", "swap", "profit", "symbol", "comment",
+])
+TradeOrder = namedtuple("TradeOrder", [
+    "ticket", "time_setup", "type", "magic", "volume_initial", "volume_current", "price_open",
+    "sl", "tp", "price_current", "price_stoplimit", "symbol", "comment", "type_time", "time_expiration",
+])
+TradeDeal = namedtuple("TradeDeal", [
+    "ticket", "order", "time", "time_msc", "type", "entry", "magic", "position_id", "volume",
+    "price", "commission", "swap", "profit", "fee", "symbol", "comment",
+])
+OrderSendResult = namedtuple("OrderSendResult", [
+    "retcode", "deal", "order", "volume", "price", "bid", "ask", "comment", "request_id", "request",
+    "position",
+])
+
+
+@dataclass
+class FillModel:
+    """Fill behaviour for market and triggered orders"""
+    slippage_points: float = 0.0  # Adverse slippage applied to every fill
+    random_slippage_points: float = 0.0  # Extra adverse slippage drawn uniformly from [0, n]
+    reject_rate: float = 0.0  # Probability an order_send is rejected (TRADE_RETCODE_REJECT)
+
+
+@dataclass
+class _SymbolData:
+    spec: Dict[str, Any]
+    ticks: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=TICK_DTYPE))
+    rates: Dict[int, np.ndarray] = field(default_factory=dict)  # recorded rates per timeframe
+    bar_cache: Dict[int, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)  # tf -> (starts, bars)
+    selected: bool = True
+
+
+def _to_epoch_seconds(value: Union[datetime, int, float]) -> float:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+class MT5Simulator:
+    """Deterministic in-process stand-in for the MetaTrader5 terminal API"""
+
+    # ---------- constants ----------
+    TIMEFRAME_M1, TIMEFRAME_M2, TIMEFRAME_M3, TIMEFRAME_M4, TIMEFRAME_M5 = 1, 2, 3, 4, 5
+    TIMEFRAME_M6, TIMEFRAME_M10, TIMEFRAME_M12, TIMEFRAME_M15, TIMEFRAME_M20, TIMEFRAME_M30 = 6, 10, 12, 15, 20, 30
+    TIMEFRAME_H1, TIMEFRAME_H2, TIMEFRAME_H3, TIMEFRAME_H4 = 16385, 16386, 16387, 16388
+    TIMEFRAME_H6, TIMEFRAME_H8, TIMEFRAME_H12 = 16390, 16392, 16396
+    TIMEFRAME_D1, TIMEFRAME_W1, TIMEFRAME_MN1 = 16408, 32769, 49153
+
+    ORDER_TYPE_BUY, ORDER_TYPE_SELL = 0, 1
+    ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT = 2, 3
+    ORDER_TYPE_BUY_STOP, ORDER_TYPE_SELL_STOP = 4, 5
+    ORDER_TYPE_BUY_STOP_LIMIT, ORDER_TYPE_SELL_STOP_LIMIT, ORDER_TYPE_CLOSE_BY = 6, 7, 8
+
+    TRADE_ACTION_DEAL, TRADE_ACTION_PENDING, TRADE_ACTION_SLTP = 1, 5, 6
+    TRADE_ACTION_MODIFY, TRADE_ACTION_REMOVE, TRADE_ACTION_CLOSE_BY = 7, 8, 10
+
+    ORDER_FILLING_FOK, ORDER_FILLING_IOC, ORDER_FILLING_RETURN = 0, 1, 2
+    ORDER_TIME_GTC, ORDER_TIME_DAY, ORDER_TIME_SPECIFIED, ORDER_TIME_SPECIFIED_DAY = 0, 1, 2, 3
+
+    POSITION_TYPE_BUY, POSITION_TYPE_SELL = 0, 1
+    DEAL_TYPE_BUY, DEAL_TYPE_SELL = 0, 1
+    DEAL_ENTRY_IN, DEAL_ENTRY_OUT = 0, 1
+
+    COPY_TICKS_ALL, COPY_TICKS_INFO, COPY_TICKS_TRADE = -1, 1, 2
+    TICK_FLAG_BID, TICK_FLAG_ASK, TICK_FLAG_LAST, TICK_FLAG_VOLUME = 2, 4, 8, 16
+    SYMBOL_TRADE_MODE_FULL = 4
+
+    TRADE_RETCODE_REQUOTE = 10004
+    TRADE_RETCODE_REJECT = 10006
+    TRADE_RETCODE_PLACED = 10008
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_ERROR = 10011
+    TRADE_RETCODE_INVALID = 10013
+    TRADE_RETCODE_INVALID_VOLUME = 10014
+    TRADE_RETCODE_INVALID_PRICE = 10015
+    TRADE_RETCODE_INVALID_STOPS = 10016
+    TRADE_RETCODE_MARKET_CLOSED = 10018
+    TRADE_RETCODE_POSITION_CLOSED = 10036
+
+    RES_S_OK, RES_E_FAIL, RES_E_INVALID_PARAMS, RES_E_NOT_FOUND = 1, -1, -2, -4
+
+    _TIMEFRAME_SECONDS = {
+        1: 60, 2: 120, 3: 180, 4: 240, 5: 300, 6: 360, 10: 600, 12: 720, 15: 900, 20: 1200, 30: 1800,
+        16385: 3600, 16386: 7200, 16387: 10800, 16388: 14400, 16390: 21600, 16392: 28800,
+        16396: 43200, 16408: 86400, 32769: 604800, 49153: 2592000,
+    }
+
+    def __init__(
+        self,
+        seed: int = 0,
+        latency_ms: Union[float, Dict[str, float]] = 0.0,
+        fill_model: Optional[FillModel] = None,
+        balance: float = 10000.0,
+    ):
+        """
+        Args:
+            seed: RNG seed for synthetic data, random slippage and rejects
+            latency_ms: Simulated IPC latency per call (scalar or {function_name: ms})
+            fill_model: Slippage / reject configuration
+            balance: Starting account balance
+        """
+        self._rng = random.Random(seed)
+        self._np_rng = np.random.default_rng(seed)
+        self.latency_ms = latency_ms
+        self.fill_model = fill_model or FillModel()
+        self._lock = threading.RLock()
+        self._symbols: Dict[str, _SymbolData] = {}
+        self._initialized = False
+        self._last_error: Tuple[int, str] = (self.RES_S_OK, "Success")
+        self._clock: Optional[float] = None  # None = end of loaded data
+
+        self._balance = float(balance)
+        self._positions: Dict[int, Dict[str, Any]] = {}
+        self._orders: Dict[int, Dict[str, Any]] = {}
+        self._deals: List[TradeDeal] = []
+        self._next_ticket = 100000
+        self.call_counts: Dict[str, int] = {}
+
+    # =====================================================================
+    # Data loading
+    # =====================================================================
+    @staticmethod
+    def default_spec(symbol: str) -> Dict[str, Any]:
+        """Symbol specification defaults inferred from the symbol name"""
+        upper = symbol.upper()
+        if "XAU" in upper or "GOLD" in upper:
+            digits, contract = 3, 100.0
+        elif "BTC" in upper or "ETH" in upper:
+            digits, contract = 2, 1.0
+        elif "JPY" in upper:
+            digits, contract = 3, 100000.0
+        elif any(k in upper for k in ("US30", "NAS", "SPX", "US500", "DXY")):
+            digits, contract = 2, 1.0
+        else:
+            digits, contract = 5, 100000.0
+        point = 10 ** -digits
+        return {
+            "digits": digits, "point": point, "trade_stops_level": 0, "trade_freeze_level": 0,
+            "volume_min": 0.01, "volume_max": 100.0, "volume_step": 0.01,
+            "trade_contract_size": contract, "trade_tick_size": point, "trade_tick_value": point * contract,
+        }
+
+    def add_symbol(self, symbol: str, **spec_overrides) -> None:
+        """Register a symbol (spec defaults from default_spec, overridable)"""
+        with self._lock:
+            data = self._symbols.get(symbol)
+            if data is None:
+                spec = self.default_spec(symbol)
+                spec.update(spec_overrides)
+                self._symbols[symbol] = _SymbolData(spec=spec)
+            else:
+                data.spec.update(spec_overrides)
+
+    def load_ticks(self, symbol: str, ticks: Any) -> int:
+        """
+        Load recorded ticks for a symbol.
+
+        Args:
+            ticks: numpy array (TICK_DTYPE or with time_msc/bid/ask fields), pandas DataFrame
+                or list of dicts with time_msc (or time) / bid / ask [/ last / volume]
+
+        Returns:
+            Number of ticks loaded
+        """
+        arr = self._coerce_ticks(ticks)
+        with self._lock:
+            self.add_symbol(symbol)
+            data = self._symbols[symbol]
+            merged = np.concatenate([data.ticks, arr]) if len(data.ticks) else arr
+            order = np.argsort(merged["time_msc"], kind="stable")
+            data.ticks = merged[order]
+            data.bar_cache.clear()
+        return len(arr)
+
+    def load_ticks_csv(self, symbol: str, path: str) -> int:
+        """Load ticks from a CSV with time_msc (or time) / bid / ask [/ last / volume] columns"""
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        return self.load_ticks(symbol, rows)
+
+    def load_rates(self, symbol: str, timeframe: int, rates: Any) -> int:
+        """Load recorded bars for a symbol/timeframe (used instead of tick-built bars)"""
+        if isinstance(rates, np.ndarray) and rates.dtype == RATES_DTYPE:
+            arr = rates.copy()
+        else:
+            if hasattr(rates, "to_dict"):
+                rates = rates.to_dict("records")
+            arr = np.zeros(len(rates), dtype=RATES_DTYPE)
+            for i, r in enumerate(rates):
+                t = r["time"]
+                arr[i] = (
+                    int(t.timestamp()) if hasattr(t, "timestamp") else int(t),
+                    float(r["open"]), float(r["high"]), float(r["low"]), float(r["close"]),
+                    int(r.get("tick_volume", r.get("volume", 0)) or 0), int(r.get("spread", 0) or 0),
+                    int(r.get("real_volume", 0) or 0),
+                )
+        arr.sort(order="time")
+        with self._lock:
+            self.add_symbol(symbol)
+            self._symbols[symbol].rates[timeframe] = arr
+        return len(arr)
+
+    def generate_ticks(
+        self,
+        symbol: str,
+        start: Union[datetime, float],
+        seconds: int,
+        start_price: float,
+        ticks_per_second: float = 2.0,
+        volatility: float = 0.0002,
+        spread_points: int = 20,
+    ) -> int:
+        """Generate a deterministic (seeded) random-walk tick stream for a symbol"""
+        self.add_symbol(symbol)
+        spec = self._symbols[symbol].spec
+        n = max(1, int(seconds * ticks_per_second))
+        start_ms = int(_to_epoch_seconds(start) * 1000)
+        gaps = self._np_rng.exponential(1000.0 / ticks_per_second, n).astype(np.int64) + 1
+        time_msc = start_ms + np.cumsum(gaps) - gaps[0]
+        returns = self._np_rng.normal(0.0, volatility, n)
+        bid = np.round(start_price * np.exp(np.cumsum(returns)), spec["digits"])
+        arr = np.zeros(n, dtype=TICK_DTYPE)
+        arr["time_msc"] = time_msc
+        arr["time"] = time_msc // 1000
+        arr["bid"] = bid
+        arr["ask"] = np.round(bid + spread_points * spec["point"], spec["digits"])
+        arr["last"] = bid
+        arr["volume"] = self._np_rng.integers(1, 10, n)
+        arr["volume_real"] = arr["volume"]
+        arr["flags"] = self.TICK_FLAG_BID | self.TICK_FLAG_ASK
+        return self.load_ticks(symbol, arr)
+
+    def _coerce_ticks(self, ticks: Any) -> np.ndarray:
+        if isinstance(ticks, np.ndarray) and ticks.dtype == TICK_DTYPE:
+            return ticks.copy()
+        if hasattr(ticks, "to_dict"):
+            ticks = ticks.to_dict("records")
+        if isinstance(ticks, np.ndarray):
+            names = ticks.dtype.names or ()
+            ticks = [{name: row[name] for name in names} for row in ticks]
+        arr = np.zeros(len(ticks), dtype=TICK_DTYPE)
+        for i, t in enumerate(ticks):
+            if t.get("time_msc") not in (None, ""):
+                time_msc = int(float(t["time_msc"]))
+            else:
+                raw = t["time"]
+                time_msc = int(raw.timestamp() * 1000) if hasattr(raw, "timestamp") else int(float(raw) * 1000)
+            bid = float(t.get("bid") or t.get("last") or 0.0)
+            ask = float(t.get("ask") or bid)
+            last = float(t.get("last") or 0.0)
+            volume = float(t.get("volume") or t.get("volume_real") or 0.0)
+            arr[i] = (time_msc // 1000, bid, ask, last, int(volume), time_msc,
+                      int(t.get("flags") or (self.TICK_FLAG_BID | self.TICK_FLAG_ASK)), volume)
+        return arr
+
+    # =====================================================================
+    # Clock
+    # =====================================================================
+    def now(self) -> float:
+        """Current simulated time (epoch seconds)"""
+        if self._clock is not None:
+            return self._clock
+        latest = [d.ticks["time_msc"][-1] / 1000.0 for d in self._symbols.values() if len(d.ticks)]
+        latest += [float(r["time"][-1]) for d in self._symbols.values() for r in d.rates.values() if len(r)]
+        return max(latest) if latest else time.time()
+
+    def set_time(self, when: Union[datetime, float]) -> None:
+        """Set the simulated clock (does not process fills)"""
+        with self._lock:
+            self._clock = _to_epoch_seconds(when)
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward and fill pending orders / SL / TP crossed in the interval"""
+        with self._lock:
+            start = self.now()
+            self._clock = start + float(seconds)
+            self._process_fills(start, self._clock)
+
+    # =====================================================================
+    # Connection / account
+    # =====================================================================
+    def _enter(self, name: str) -> None:
+        self.call_counts[name] = self.call_counts.get(name, 0) + 1
+        latency = self.latency_ms.get(name, 0.0) if isinstance(self.latency_ms, dict) else self.latency_ms
+        if latency:
+            time.sleep(latency / 1000.0)
+
+    def _fail(self, code: int, message: str):
+        self._last_error = (code, message)
+        return None
+
+    def initialize(self, *args, **kwargs) -> bool:
+        self._enter("initialize")
+        self._initialized = True
+        self._last_error = (self.RES_S_OK, "Success")
+        return True
+
+    def login(self, *args, **kwargs) -> bool:
+        self._enter("login")
+        return True
+
+    def shutdown(self) -> None:
+        self._enter("shutdown")
+        self._initialized = False
+
+    def last_error(self) -> Tuple[int, str]:
+        return self._last_error
+
+    def version(self) -> Tuple[int, int, str]:
+        return (500, 4000, "simulator")
+
+    def terminal_info(self) -> Optional[TerminalInfo]:
+        self._enter("terminal_info")
+        if not self._initialized:
+            return self._fail(self.RES_E_FAIL, "Terminal not initialized")
+        return TerminalInfo(connected=True, trade_allowed=True, build=4000,
+                            name="MT5 Simulator", company="simulator")
+
+    def account_info(self) -> AccountInfo:
+        self._enter("account_info")
+        with self._lock:
+            profit = sum(self._position_profit(p) for p in self._positions.values())
+            equity = self._balance + profit
+            return AccountInfo(login=1, balance=self._balance, equity=equity, profit=profit, margin=0.0,
+                               margin_free=equity, leverage=100, currency="USD", server="Simulator")
+
+    # =====================================================================
+    # Symbols / ticks
+    # =====================================================================
+    def symbols_get(self, group: Optional[str] = None) -> Tuple[SymbolInfo, ...]:
+        self._enter("symbols_get")
+        return tuple(self._symbol_info(s) for s in self._symbols)
+
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        self._enter("symbol_select")
+        data = self._symbols.get(symbol)
+        if data is None:
+            self._fail(self.RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+            return False
+        data.selected = bool(enable)
+        return True
+
+    def symbol_info(self, symbol: str) -> Optional[SymbolInfo]:
+        self._enter("symbol_info")
+        if symbol not in self._symbols:
+            return self._fail(self.RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+        return self._symbol_info(symbol)
+
+    def _symbol_info(self, symbol: str) -> SymbolInfo:
+        data = self._symbols[symbol]
+        spec = data.spec
+        tick = self._last_tick(symbol)
+        bid = float(tick["bid"]) if tick is not None else 0.0
+        ask = float(tick["ask"]) if tick is not None else 0.0
+        return SymbolInfo(
+            name=symbol, description=symbol, visible=data.selected, select=data.selected,
+            digits=spec["digits"], point=spec["point"],
+            spread=int(round((ask - bid) / spec["point"])) if tick is not None else 0,
+            bid=bid, ask=ask, trade_stops_level=spec["trade_stops_level"],
+            trade_freeze_level=spec["trade_freeze_level"], volume_min=spec["volume_min"],
+            volume_max=spec["volume_max"], volume_step=spec["volume_step"],
+            trade_contract_size=spec["trade_contract_size"], trade_tick_size=spec["trade_tick_size"],
+            trade_tick_value=spec["trade_tick_value"], trade_mode=self.SYMBOL_TRADE_MODE_FULL,
+            filling_mode=3,
+        )
+
+    def _visible_ticks(self, symbol: str) -> np.ndarray:
+        ticks = self._symbols[symbol].ticks
+        end = np.searchsorted(ticks["time_msc"], int(self.now() * 1000), side="right")
+        return ticks[:end]
+
+    def _last_tick(self, symbol: str) -> Optional[np.void]:
+        visible = self._visible_ticks(symbol)
+        return visible[-1] if len(visible) else None
+
+    def symbol_info_tick(self, symbol: str) -> Optional[Tick]:
+        self._enter("symbol_info_tick")
+        if symbol not in self._symbols:
+            return self._fail(self.RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+        tick = self._last_tick(symbol)
+        if tick is None:
+            return self._fail(self.RES_E_NOT_FOUND, f"No ticks for {symbol}")
+        return Tick(*(tick[name].item() for name in TICK_DTYPE.names))
+
+    def copy_ticks_range(self, symbol: str, date_from: Any, date_to: Any, flags: int = -1) -> Optional[np.ndarray]:
+        self._enter("copy_ticks_range")
+        if symbol not in self._symbols:
+            return self._fail(self.RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+        visible = self._visible_ticks(symbol)
+        lo = np.searchsorted(visible["time_msc"], int(_to_epoch_seconds(date_from) * 1000), side="left")
+        hi = np.searchsorted(visible["time_msc"], int(_to_epoch_seconds(date_to) * 1000), side="right")
+        return visible[lo:hi].copy()
+
+    def copy_ticks_from(self, symbol: str, date_from: Any, count: int, flags: int = -1) -> Optional[np.ndarray]:
+        self._enter("copy_ticks_from")
+        if symbol not in self._symbols:
+            return self._fail(self.RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+        visible = self._visible_ticks(symbol)
+        lo = np.searchsorted(visible["time_msc"], int(_to_epoch_seconds(date_from) * 1000), side="left")
+        return visible[lo:lo + int(count)].copy()
+
+    # =====================================================================
+    # Rates
+    # =====================================================================
+    def _all_bars(self, symbol: str, timeframe: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Bars built from all loaded ticks: (tick start index per bar, bars)"""
+        data = self._symbols[symbol]
+        cached = data.bar_cache.get(timeframe)
+        if cached is not None:
+            return cached
+        ticks = data.ticks
+        seconds = self._TIMEFRAME_SECONDS[timeframe]
+        if len(ticks) == 0:
+            result = (np.empty(0, dtype=np.int64), np.empty(0, dtype=RATES_DTYPE))
+        else:
+            bucket = ticks["time"] // seconds * seconds
+            starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+            ends = np.r_[starts[1:], len(ticks)]
+            bars = np.zeros(len(starts), dtype=RATES_DTYPE)
+            bid = ticks["bid"]
+            bars["time"] = bucket[starts]
+            bars["open"] = bid[starts]
+            bars["high"] = np.maximum.reduceat(bid, starts)
+            bars["low"] = np.minimum.reduceat(bid, starts)
+            bars["close"] = bid[ends - 1]
+            bars["tick_volume"] = ends - starts
+            bars["spread"] = np.round((ticks["ask"][ends - 1] - bid[ends - 1]) / data.spec["point"])
+            bars["real_volume"] = np.add.reduceat(ticks["volume"], starts)
+            result = (starts, bars)
+        data.bar_cache[timeframe] = result
+        return result
+
+    def _visible_bars(self, symbol: str, timeframe: int) -> np.ndarray:
+        data = self._symbols[symbol]
+        if timeframe in data.rates:
+            rates = data.rates[timeframe]
+            return rates[:np.searchsorted(rates["time"], self.now(), side="right")]
+        starts, bars = self._all_bars(symbol, timeframe)
+        ticks = data.ticks
+        n_ticks = np.searchsorted(ticks["time_msc"], int(self.now() * 1000), side="right")
+        n_bars = np.searchsorted(starts, n_ticks, side="left")
+        visible = bars[:n_bars].copy()
+        if n_bars:
+            # The last visible bar may still be forming: rebuild it from visible ticks only
+            start = starts[n_bars - 1]
+            end = starts[n_bars] if n_bars < len(starts) else len(ticks)
+            if n_ticks < end:
+                bid = ticks["bid"][start:n_ticks]
+                last = visible[-1]
+                last["high"] = bid.max()
+                last["low"] = bid.min()
+                last["close"] = bid[-1]
+                last["tick_volume"] = n_ticks - start
+                last["real_volume"] = ticks["volume"][start:n_ticks].sum()
+        return visible
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start_pos: int, count: int) -> Optional[np.ndarray]:
+        self._enter("copy_rates_from_pos")
+        if symbol not in self._symbols:
+            return self._fail(self.RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+        if timeframe not in self._TIMEFRAME_SECONDS:
+            return self._fail(self.RES_E_INVALID_PARAMS, f"Invalid timeframe {timeframe}")
+        bars = self._visible_bars(symbol, timeframe)
+        end = len(bars) - int(start_pos)
+        if end <= 0:
+            return self._fail(self.RES_E_NOT_FOUND, "No data")
+        return bars[max(0, end - int(count)):end]
+
+    def copy_rates_from(self, symbol: str, timeframe: int, date_from: Any, count: int) -> Optional[np.ndarray]:
+        self._enter("copy_rates_from")
+        if symbol not in self._symbols:
+            return self._fail(self.RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+        bars = self._visible_bars(symbol, timeframe)
+        end = np.searchsorted(bars["time"], _to_epoch_seconds(date_from), side="right")
+        return bars[max(0, end - int(count)):end]
+
+    def copy_rates_range(self, symbol: str, timeframe: int, date_from: Any, date_to: Any) -> Optional[np.ndarray]:
+        self._enter("copy_rates_range")
+        if symbol not in self._symbols:
+            return self._fail(self.RES_E_NOT_FOUND, f"Symbol {symbol} not found")
+        bars = self._visible_bars(symbol, timeframe)
+        lo = np.searchsorted(bars["time"], _to_epoch_seconds(date_from), side="left")
+        hi = np.searchsorted(bars["time"], _to_epoch_seconds(date_to), side="right")
+        return bars[lo:hi]
+
+    # =====================================================================
+    # Trading
+    # =====================================================================
+    def _new_ticket(self) -> int:
+        self._next_ticket += 1
+        return self._next_ticket
+
+    def _slippage(self, symbol: str) -> float:
+        point = self._symbols[symbol].spec["point"]
+        extra = self._rng.uniform(0.0, self.fill_model.random_slippage_points) if self.fill_model.random_slippage_points else 0.0
+        return (self.fill_model.slippage_points + extra) * point
+
+    def _position_profit(self, pos: Dict[str, Any], price: Optional[float] = None) -> float:
+        tick = self._last_tick(pos["symbol"])
+        if price is None:
+            if tick is None:
+                return 0.0
+            price = float(tick["bid"]) if pos["type"] == self.POSITION_TYPE_BUY else float(tick["ask"])
+        direction = 1.0 if pos["type"] == self.POSITION_TYPE_BUY else -1.0
+        contract = self._symbols[pos["symbol"]].spec["trade_contract_size"]
+        return round((price - pos["price_open"]) * direction * pos["volume"] * contract, 2)
+
+    def _result(self, retcode: int, request: Dict[str, Any], comment: str, **kwargs) -> OrderSendResult:
+        values = dict(deal=0, order=0, volume=0.0, price=0.0, bid=0.0, ask=0.0, position=0)
+        values.update(kwargs)
+        return OrderSendResult(retcode=retcode, comment=comment, request_id=0, request=request, **values)
+
+    def _record_deal(self, symbol: str, order: int, deal_type: int, entry: int, position_id: int,
+                     volume: float, price: float, profit: float, magic: int, comment: str) -> int:
+        ticket = self._new_ticket()
+        now = self.now()
+        self._deals.append(TradeDeal(
+            ticket=ticket, order=order, time=int(now), time_msc=int(now * 1000), type=deal_type, entry=entry,
+            magic=magic, position_id=position_id, volume=volume, price=price, commission=0.0, swap=0.0,
+            profit=profit, fee=0.0, symbol=symbol, comment=comment,
+        ))
+        return ticket
+
+    def _open_position(self, symbol: str, order_type: int, volume: float, price: float,
+                       sl: float, tp: float, magic: int, comment: str, order: int) -> Tuple[int, int]:
+        ticket = order or self._new_ticket()
+        now = self.now()
+        self._positions[ticket] = {
+            "ticket": ticket, "symbol": symbol, "type": order_type, "volume": volume, "price_open": price,
+            "sl": sl, "tp": tp, "magic": magic, "comment": comment, "time": int(now),
+        }
+        deal = self._record_deal(symbol, ticket, order_type, self.DEAL_ENTRY_IN, ticket, volume, price, 0.0,
+                                 magic, comment)
+        return ticket, deal
+
+    def _close_position(self, ticket: int, volume: float, price: float, comment: str = "") -> int:
+        pos = self._positions[ticket]
+        volume = min(volume, pos["volume"])
+        closing = dict(pos, volume=volume)
+        profit = self._position_profit(closing, price)
+        self._balance += profit
+        deal_type = self.DEAL_TYPE_SELL if pos["type"] == self.POSITION_TYPE_BUY else self.DEAL_TYPE_BUY
+        deal = self._record_deal(pos["symbol"], ticket, deal_type, self.DEAL_ENTRY_OUT, ticket, volume, price,
+                                 profit, pos["magic"], comment)
+        pos["volume"] = round(pos["volume"] - volume, 8)
+        if pos["volume"] <= 0:
+            del self._positions[ticket]
+        return deal
+
+    def order_send(self, request: Dict[str, Any]) -> Optional[OrderSendResult]:
+        self._enter("order_send")
+        with self._lock:
+            if not isinstance(request, dict):
+                return self._fail(self.RES_E_INVALID_PARAMS, "Invalid request")
+            action = request.get("action")
+            symbol = request.get("symbol")
+            if self.fill_model.reject_rate and self._rng.random() < self.fill_model.reject_rate:
+                return self._result(self.TRADE_RETCODE_REJECT, request, "Request rejected")
+
+            if action == self.TRADE_ACTION_SLTP:
+                pos = self._positions.get(int(request.get("position", 0)))
+                if pos is None:
+                    return self._result(self.TRADE_RETCODE_POSITION_CLOSED, request, "Position doesn't exist")
+                if "sl" in request:
+                    pos["sl"] = float(request["sl"] or 0.0)
+                if "tp" in request:
+                    pos["tp"] = float(request["tp"] or 0.0)
+                return self._result(self.TRADE_RETCODE_DONE, request, "Request executed",
+                                    position=pos["ticket"])
+
+            if action == self.TRADE_ACTION_REMOVE:
+                if self._orders.pop(int(request.get("order", 0)), None) is None:
+                    return self._result(self.TRADE_RETCODE_INVALID, request, "Order doesn't exist")
+                return self._result(self.TRADE_RETCODE_DONE, request, "Request executed",
+                                    order=int(request["order"]))
+
+            if symbol not in self._symbols:
+                return self._result(self.TRADE_RETCODE_INVALID, request, "Unknown symbol")
+            tick = self._last_tick(symbol)
+            if tick is None:
+                return self._result(self.TRADE_RETCODE_MARKET_CLOSED, request, "Market closed")
+            bid, ask = float(tick["bid"]), float(tick["ask"])
+            volume = float(request.get("volume", 0.0) or 0.0)
+            spec = self._symbols[symbol].spec
+            if volume < spec["volume_min"] or volume > spec["volume_max"]:
+                return self._result(self.TRADE_RETCODE_INVALID_VOLUME, request, "Invalid volume")
+            order_type = int(request.get("type", 0))
+            magic = int(request.get("magic", 0) or 0)
+            comment = str(request.get("comment", "") or "")
+
+            if action == self.TRADE_ACTION_PENDING:
+                ticket = self._new_ticket()
+                self._orders[ticket] = {
+                    "ticket": ticket, "symbol": symbol, "type": order_type, "volume": volume,
+                    "price": float(request.get("price", 0.0)), "stoplimit": float(request.get("stoplimit", 0.0) or 0.0),
+                    "sl": float(request.get("sl", 0.0) or 0.0), "tp": float(request.get("tp", 0.0) or 0.0),
+                    "magic": magic, "comment": comment, "time_setup": int(self.now()),
+                    "type_time": int(request.get("type_time", 0) or 0),
+                    "expiration": int(request.get("expiration", 0) or 0),
+                }
+                return self._result(self.TRADE_RETCODE_PLACED, request, "Request executed", order=ticket,
+                                    volume=volume, price=self._orders[ticket]["price"], bid=bid, ask=ask)
+
+            if action != self.TRADE_ACTION_DEAL or order_type not in (self.ORDER_TYPE_BUY, self.ORDER_TYPE_SELL):
+                return self._result(self.TRADE_RETCODE_INVALID, request, "Unsupported request")
+
+            slip = self._slippage(symbol)
+            price = round(ask + slip if order_type == self.ORDER_TYPE_BUY else bid - slip, spec["digits"])
+            position_ticket = request.get("position")
+            if position_ticket:
+                if int(position_ticket) not in self._positions:
+                    return self._result(self.TRADE_RETCODE_POSITION_CLOSED, request, "Position doesn't exist")
+                deal = self._close_position(int(position_ticket), volume, price, comment)
+                return self._result(self.TRADE_RETCODE_DONE, request, "Request executed", deal=deal,
+                                    order=int(position_ticket), volume=volume, price=price, bid=bid, ask=ask,
+                                    position=int(position_ticket))
+
+            ticket, deal = self._open_position(symbol, order_type, volume, price,
+                                               float(request.get("sl", 0.0) or 0.0),
+                                               float(request.get("tp", 0.0) or 0.0), magic, comment, 0)
+            return self._result(self.TRADE_RETCODE_DONE, request, "Request executed", deal=deal, order=ticket,
+                                volume=volume, price=price, bid=bid, ask=ask, position=ticket)
+
+    def _process_fills(self, start: float, end: float) -> None:
+        """Fill pending orders and SL/TP hits against ticks in (start, end]"""
+        for symbol, data in self._symbols.items():
+            ticks = data.ticks
+            lo = np.searchsorted(ticks["time_msc"], int(start * 1000), side="right")
+            hi = np.searchsorted(ticks["time_msc"], int(end * 1000), side="right")
+            if hi <= lo:
+                continue
+            window = ticks[lo:hi]
+            min_bid, max_bid = float(window["bid"].min()), float(window["bid"].max())
+            min_ask, max_ask = float(window["ask"].min()), float(window["ask"].max())
+
+            for ticket, order in list(self._orders.items()):
+                if order["symbol"] != symbol:
+                    continue
+                t, price = order["type"], order["price"]
+                triggered = (
+                    (t == self.ORDER_TYPE_BUY_LIMIT and min_ask <= price)
+                    or (t == self.ORDER_TYPE_SELL_LIMIT and max_bid >= price)
+                    or (t == self.ORDER_TYPE_BUY_STOP and max_ask >= price)
+                    or (t == self.ORDER_TYPE_SELL_STOP and min_bid <= price)
+                )
+                if not triggered:
+                    continue
+                del self._orders[ticket]
+                is_buy = t in (self.ORDER_TYPE_BUY_LIMIT, self.ORDER_TYPE_BUY_STOP)
+                slip = self._slippage(symbol) if t in (self.ORDER_TYPE_BUY_STOP, self.ORDER_TYPE_SELL_STOP) else 0.0
+                fill = price + slip if is_buy else price - slip
+                self._open_position(symbol, self.ORDER_TYPE_BUY if is_buy else self.ORDER_TYPE_SELL,
+                                    order["volume"], fill, order["sl"], order["tp"], order["magic"],
+                                    order["comment"], ticket)
+
+            for ticket, pos in list(self._positions.items()):
+                if pos["symbol"] != symbol:
+                    continue
+                sl, tp = pos["sl"], pos["tp"]
+                if pos["type"] == self.POSITION_TYPE_BUY:
+                    if sl and min_bid <= sl:
+                        self._close_position(ticket, pos["volume"], sl - self._slippage(symbol), "[sl]")
+                    elif tp and max_bid >= tp:
+                        self._close_position(ticket, pos["volume"], tp, "[tp]")
+                else:
+                    if sl and max_ask >= sl:
+                        self._close_position(ticket, pos["volume"], sl + self._slippage(symbol), "[sl]")
+                    elif tp and min_ask <= tp:
+                        self._close_position(ticket, pos["volume"], tp, "[tp]")
+
+    # =====================================================================
+    # Positions / orders / history
+    # =====================================================================
+    def _position_tuple(self, pos: Dict[str, Any]) -> TradePosition:
+        tick = self._last_tick(pos["symbol"])
+        price_current = 0.0
+        if tick is not None:
+            price_current = float(tick["bid"]) if pos["type"] == self.POSITION_TYPE_BUY else float(tick["ask"])
+        return TradePosition(
+            ticket=pos["ticket"], time=pos["time"], time_msc=pos["time"] * 1000, type=pos["type"],
+            magic=pos["magic"], identifier=pos["ticket"], volume=pos["volume"], price_open=pos["price_open"],
+            sl=pos["sl"], tp=pos["tp"], price_current=price_current, swap=0.0,
+            profit=self._position_profit(pos), symbol=pos["symbol"], comment=pos["comment"],
+        )
+
+    def positions_get(self, symbol: Optional[str] = None, group: Optional[str] = None,
+                      ticket: Optional[int] = None) -> Tuple[TradePosition, ...]:
+        self._enter("positions_get")
+        with self._lock:
+            positions = self._positions.values()
+            if ticket is not None:
+                positions = [p for p in positions if p["ticket"] == int(ticket)]
+            if symbol is not None:
+                positions = [p for p in positions if p["symbol"] == symbol]
+            return tuple(self._position_tuple(p) for p in positions)
+
+    def positions_total(self) -> int:
+        self._enter("positions_total")
+        return len(self._positions)
+
+    def orders_get(self, symbol: Optional[str] = None, group: Optional[str] = None,
+                   ticket: Optional[int] = None) -> Tuple[TradeOrder, ...]:
+        self._enter("orders_get")
+        with self._lock:
+            orders = self._orders.values()
+            if ticket is not None:
+                orders = [o for o in orders if o["ticket"] == int(ticket)]
+            if symbol is not None:
+                orders = [o for o in orders if o["symbol"] == symbol]
+            out = []
+            for o in orders:
+                tick = self._last_tick(o["symbol"])
+                out.append(TradeOrder(
+                    ticket=o["ticket"], time_setup=o["time_setup"], type=o["type"], magic=o["magic"],
+                    volume_initial=o["volume"], volume_current=o["volume"], price_open=o["price"], sl=o["sl"],
+                    tp=o["tp"], price_current=float(tick["bid"]) if tick is not None else 0.0,
+                    price_stoplimit=o["stoplimit"], symbol=o["symbol"], comment=o["comment"],
+                    type_time=o["type_time"], time_expiration=o["expiration"],
+                ))
+            return tuple(out)
+
+    def orders_total(self) -> int:
+        self._enter("orders_total")
+        return len(self._orders)
+
+    def history_deals_get(self, date_from: Any = None, date_to: Any = None, group: Optional[str] = None,
+                          ticket: Optional[int] = None, position: Optional[int] = None) -> Tuple[TradeDeal, ...]:
+        self._enter("history_deals_get")
+        with self._lock:
+            deals = self._deals
+            if position is not None:
+                deals = [d for d in deals if d.position_id == int(position)]
+            elif ticket is not None:
+                deals = [d for d in deals if d.order == int(ticket)]
+            else:
+                lo = _to_epoch_seconds(date_from) if date_from is not None else float("-inf")
+                hi = _to_epoch_seconds(date_to) if date_to is not None else float("inf")
+                deals = [d for d in deals if lo <= d.time <= hi]
+            return tuple(deals)
+
+
+_previous_module: Optional[Any] = None
+
+
+def install(simulator: Optional[MT5Simulator] = None) -> MT5Simulator:
+    """
+    Make ``import MetaTrader5`` resolve to a simulator instance.
+    Install before importing modules that bind ``MetaTrader5`` at import time.
+    """
+    global _previous_module
+    simulator = simulator or MT5Simulator()
+    current = sys.modules.get("MetaTrader5")
+    if not isinstance(current, MT5Simulator):
+        _previous_module = current
+    sys.modules["MetaTrader5"] = simulator
+    try:
+        from infra.mt5_gateway import get_mt5_gateway
+        get_mt5_gateway().clear_cache()
+    except Exception:
+        pass
+    return simulator
+
+
+def uninstall() -> None:
+    """Restore whatever ``MetaTrader5`` resolved to before install()"""
+    if _previous_module is not None:
+        sys.modules["MetaTrader5"] = _previous_module
+    else:
+        sys.modules.pop("MetaTrader5", None)
@@ -0,0 +1,454 @@
+"""
+Notification Gateway
+One non-blocking outbound path for Discord webhooks and Telegram-style text senders.
+
+- Callers enqueue and return immediately (bounded queue, overflow is dropped and counted)
+- Deliveries run on a dedicated asyncio loop with a pooled httpx.AsyncClient
+- Bursts to the same channel are coalesced: embeds identical except for their description
+  are merged and embeds are packed into as few webhook posts as Discord allows
+  (10 embeds / 6000 chars)
+- Per-channel rate limits (token bucket), retries with backoff, honours 429 retry_after
+- Queue lag (submit -> delivery) and depth are reported via get_stats() and the
+  ALERT_QUEUE histograms in infra.hdr_histograms
+
+Usage:
+    gateway = get_notification_gateway()
+    gateway.submit_discord(webhook_url, [{"title": "...", "description": "...", "color": 0x00ff00}])
+    gateway.submit_text("dtms-telegram", telegram_service.send_message, "Position closed")
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from infra.hdr_histograms import QueueType, get_histogram_manager
+
+logger = logging.getLogger(__name__)
+
+MAX_EMBED_DESCRIPTION = 4096
+MAX_EMBEDS_PER_POST = 10
+MAX_EMBED_CHARS_PER_POST = 6000
+MAX_TEXT_LENGTH = 4096  # Telegram message limit
+
+# kind -> (requests, per seconds): Discord webhooks allow 5 / 2s, Telegram ~1 message/s per chat
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "discord": (5, 2.0),
+    "text": (1, 1.0),
+}
+
+
+@dataclass
+class _Outgoing:
+    kind: str                      # "discord" | "text"
+    channel: str                   # rate-limit / coalescing key
+    enqueued: float
+    embeds: List[Dict[str, Any]] = field(default_factory=list)
+    username: Optional[str] = None
+    text: str = ""
+    sender: Optional[Callable] = None
+
+
+class _RateLimiter:
+    """Token bucket: ``rate`` requests per ``per`` seconds"""
+
+    def __init__(self, rate: int, per: float, clock: Callable[[], float]):
+        self.rate = rate
+        self.per = per
+        self.clock = clock
+        self.tokens = float(rate)
+        self.updated = clock()
+        self.blocked_until = 0.0
+
+    def delay(self) -> float:
+        """Seconds to wait before the next request (0 if it may go now, consumes a token)"""
+        now = self.clock()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) * self.per / self.rate
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+
+
+def coalesce_embeds(embeds: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Merge consecutive embeds that differ only in their description (while it fits) and
+    pack the result into webhook posts within Discord's per-message limits. Embeds with
+    any other differing key (footer, timestamp, fields, ...) are kept whole and only packed.
+    """
+    def rest(embed: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in embed.items() if k != "description"}
+
+    merged: List[Dict[str, Any]] = []
+    for embed in embeds:
+        prev = merged[-1] if merged else None
+        desc = embed.get("description") or ""
+        if (
+            prev is not None
+            and rest(prev) == rest(embed)
+            and len(prev.get("description") or "") + 2 + len(desc) <= MAX_EMBED_DESCRIPTION
+        ):
+            prev["description"] = f"{prev.get('description') or ''}\n\n{desc}"
+        else:
+            merged.append(dict(embed))
+
+    def size(embed: Dict[str, Any]) -> int:
+        footer = embed.get("footer") or {}
+        author = embed.get("author") or {}
+        fields = embed.get("fields") or []
+        return (
+            len(embed.get("title") or "") + len(embed.get("description") or "")
+            + len(footer.get("text") or "") + len(author.get("name") or "")
+            + sum(len(f.get("name") or "") + len(f.get("value") or "") for f in fields)
+        )
+
+    posts: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    chars = 0
+    for embed in merged:
+        n = size(embed)
+        if current and (len(current) >= MAX_EMBEDS_PER_POST or chars + n > MAX_EMBED_CHARS_PER_POST):
+            posts.append(current)
+            current, chars = [], 0
+        current.append(embed)
+        chars += n
+    if current:
+        posts.append(current)
+    return posts
+
+
+def coalesce_texts(texts: List[str]) -> List[str]:
+    """Join consecutive texts into messages of at most MAX_TEXT_LENGTH characters"""
+    messages: List[str] = []
+    for text in texts:
+        if messages and len(messages[-1]) + 2 + len(text) <= MAX_TEXT_LENGTH:
+            messages[-1] = f"{messages[-1]}\n\n{text}"
+        else:
+            messages.append(text)
+    return messages
+
+
+class NotificationGateway:
+    """Bounded, batched, rate-limited notification delivery off the caller's thread"""
+
+    def __init__(self, max_queue: int = 1000, coalesce_window_s: float = 0.5,
+                 max_retries: int = 3, backoff_s: float = 1.0, timeout_s: float = 10.0,
+                 rate_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+                 client_factory: Optional[Callable[[], Any]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_queue: Pending notifications kept before new ones are dropped
+            coalesce_window_s: How long a burst is collected before delivery
+            max_retries: Retries per post after the first attempt
+            rate_limits: Per-kind (requests, per seconds) overriding DEFAULT_RATE_LIMITS
+            client_factory: Returns an httpx.AsyncClient-like object (default: pooled httpx client)
+        """
+        self.max_queue = max_queue
+        self.coalesce_window_s = coalesce_window_s
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.timeout_s = timeout_s
+        self.rate_limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.client_factory = client_factory
+        self.clock = clock
+
+        self._queue: Deque[_Outgoing] = deque()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._start_lock = threading.Lock()
+        self._pending = 0  # queued + in flight
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._limiters: Dict[str, _RateLimiter] = {}
+        self._channel_locks: Dict[str, asyncio.Lock] = {}
+        self._lag_ms_total = 0.0
+        self._stats = {
+            "submitted": 0,
+            "delivered": 0,
+            "failed": 0,
+            "dropped": 0,
+            "posts": 0,
+            "coalesced": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "last_lag_ms": 0.0,
+            "max_lag_ms": 0.0,
+        }
+
+    # --------------------------------------------------------------- lifecycle
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            ready = threading.Event()
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._thread_main, args=(ready,), daemon=True, name="notification-gateway"
+            )
+            self._thread.start()
+            ready.wait(5)
+
+    def _thread_main(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        ready.set()
+        try:
+            loop.run_until_complete(self._run())
+        finally:
+            loop.close()
+            self._loop = None
+
+    def stop(self, timeout: float = 5.0):
+        """Deliver what is queued, then stop the delivery loop"""
+        self.flush(timeout)
+        with self._lock:
+            self._stopping = True
+            loop, thread = self._loop, self._thread
+        if loop is not None:
+            loop.call_soon_threadsafe(self._wakeup.set)
+        if thread is not None:
+            thread.join(timeout)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until every queued notification has been delivered or failed"""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    # ----------------------------------------------------------------- submit
+
+    def _enqueue(self, item: _Outgoing) -> bool:
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                self._stats["dropped"] += 1
+                dropped = True
+            else:
+                self._queue.append(item)
+                self._pending += 1
+                self._stats["submitted"] += 1
+                depth = len(self._queue)
+                dropped = False
+        manager = get_histogram_manager()
+        if dropped:
+            manager.record_queue_overflow(QueueType.ALERT_QUEUE)
+            logger.warning(f"Notification queue full ({self.max_queue}) - dropped {item.kind} notification for {item.channel}")
+            return False
+        manager.record_queue_depth(QueueType.ALERT_QUEUE, depth)
+        self._ensure_started()
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._wakeup.set)
+        return True
+
+    def submit_discord(self, webhook_url: str, embeds: List[Dict[str, Any]],
+                       username: Optional[str] = None) -> bool:
+        """Queue embeds for a Discord webhook. Returns False if the queue is full."""
+        if not webhook_url or not embeds:
+            return False
+        return self._enqueue(_Outgoing(
+            kind="discord", channel=webhook_url, enqueued=self.clock(),
+            embeds=[dict(e) for e in embeds], username=username,
+        ))
+
+    def submit_text(self, channel: str, sender: Callable[[str], Any], text: str) -> bool:
+        """
+        Queue a text message for ``sender`` (e.g. a Telegram send_message; plain or
+        coroutine function). Messages for the same channel are joined when coalesced.
+        """
+        if not text:
+            return False
+        return self._enqueue(_Outgoing(kind="text", channel=channel, enqueued=self.clock(),
+                                       text=text, sender=sender))
+
+    # --------------------------------------------------------------- delivery
+
+    async def _run(self):
+        client = self.client_factory() if self.client_factory else self._default_client()
+        tasks: set = set()
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                if self.coalesce_window_s > 0 and not self._stopping:
+                    await asyncio.sleep(self.coalesce_window_s)  # let the burst accumulate
+                with self._lock:
+                    batch = list(self._queue)
+                    self._queue.clear()
+                    stopping = self._stopping
+                groups: Dict[Tuple[str, str, Optional[str]], List[_Outgoing]] = {}
+                for item in batch:
+                    groups.setdefault((item.kind, item.channel, item.username), []).append(item)
+                for items in groups.values():
+                    task = asyncio.ensure_future(self._deliver_group(client, items))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                if stopping:
+                    if tasks:
+                        await asyncio.gather(*tasks, return_exceptions=True)
+                    return
+        finally:
+            close = getattr(client, "aclose", None)
+            if close is not None:
+                try:
+                    await close()
+                except Exception:
+                    pass
+
+    def _default_client(self):
+        import httpx
+        return httpx.AsyncClient(
+            timeout=self.timeout_s,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+        )
+
+    def _limiter(self, item: _Outgoing) -> _RateLimiter:
+        limiter = self._limiters.get(item.channel)
+        if limiter is None:
+            rate, per = self.rate_limits.get(item.kind, (1, 1.0))
+            limiter = self._limiters[item.channel] = _RateLimiter(rate, per, self.clock)
+        return limiter
+
+    async def _deliver_group(self, client, items: List[_Outgoing]):
+        lock = self._channel_locks.setdefault(items[0].channel, asyncio.Lock())
+        async with lock:  # one channel delivers in order, channels run concurrently
+            if items[0].kind == "discord":
+                extra = {"username": items[0].username} if items[0].username else {}
+                posts: List[Any] = [
+                    {**extra, "embeds": embeds}
+                    for embeds in coalesce_embeds([e for item in items for e in item.embeds])
+                ]
+            else:
+                posts = coalesce_texts([item.text for item in items])
+            self._stats["coalesced"] += len(items) - len(posts)
+
+            ok = True
+            for payload in posts:
+                ok = await self._send_with_retries(client, items[0], payload) and ok
+
+        now = self.clock()
+        manager = get_histogram_manager()
+        with self._idle:
+            for item in items:
+                lag_ms = (now - item.enqueued) * 1000
+                self._stats["last_lag_ms"] = lag_ms
+                self._stats["max_lag_ms"] = max(self._stats["max_lag_ms"], lag_ms)
+                self._lag_ms_total += lag_ms
+                self._stats["delivered" if ok else "failed"] += 1
+                manager.record_queue_processing_time(QueueType.ALERT_QUEUE, lag_ms)
+            self._pending -= len(items)
+            self._idle.notify_all()
+
+    async def _send_with_retries(self, client, item: _Outgoing, payload) -> bool:
+        limiter = self._limiter(item)
+        for attempt in range(self.max_retries + 1):
+            wait = limiter.delay()
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = limiter.delay()
+            if attempt:
+                self._stats["retries"] += 1
+            retry_after = None
+            try:
+                if item.kind == "discord":
+                    response = await client.post(item.channel, json=payload)
+                    status = response.status_code
+                    if status in (200, 204):
+                        self._stats["posts"] += 1
+                        return True
+                    if status == 429:
+                        self._stats["rate_limited"] += 1
+                        retry_after = self._retry_after(response)
+                        limiter.block(retry_after)
+                    elif status < 500:
+                        logger.error(f"Discord webhook rejected notification: HTTP {status} {response.text[:200]}")
+                        return False
+                    else:
+                        logger.warning(f"Discord webhook error HTTP {status} (attempt {attempt + 1})")
+                else:
+                    if inspect.iscoroutinefunction(item.sender):
+                        await item.sender(payload)
+                    else:
+                        result = await asyncio.to_thread(item.sender, payload)  # blocking senders off the loop
+                        if inspect.isawaitable(result):
+                            await result
+                    self._stats["posts"] += 1
+                    return True
+            except Exception as e:
+                logger.warning(f"Notification delivery to {item.kind} failed (attempt {attempt + 1}): {e}")
+            if attempt < self.max_retries:
+                await asyncio.sleep(retry_after if retry_after is not None else self.backoff_s * (2 ** attempt))
+        logger.error(f"Notification delivery gave up after {self.max_retries + 1} attempts ({item.kind})")
+        return False
+
+    @staticmethod
+    def _retry_after(response) -> float:
+        try:
+            return float(response.json().get("retry_after", 1.0))
+        except Exception:
+            try:
+                return float(response.headers.get("Retry-After", 1.0))
+            except Exception:
+                return 1.0
+
+    # ------------------------------------------------------------------ stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            depth = len(self._queue)
+            oldest = self._queue[0].enqueued if self._queue else None
+            pending = self._pending
+        done = stats["delivered"] + stats["failed"]
+        stats["queue_depth"] = depth
+        stats["in_flight"] = pending - depth
+        stats["oldest_pending_s"] = round(self.clock() - oldest, 3) if oldest is not None else 0.0
+        stats["avg_lag_ms"] = round(self._lag_ms_total / done, 2) if done else 0.0
+        stats["last_lag_ms"] = round(stats["last_lag_ms"], 2)
+        stats["max_lag_ms"] = round(stats["max_lag_ms"], 2)
+        lag = get_histogram_manager().get_queue_processing_time_percentiles(QueueType.ALERT_QUEUE)
+        stats["lag_p50_ms"] = lag.p50
+        stats["lag_p95_ms"] = lag.p95
+        stats["lag_p99_ms"] = lag.p99
+        return stats
+
+
+_gateway: Optional[NotificationGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_notification_gateway() -> NotificationGateway:
+    """Process-wide notification gateway"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = NotificationGateway()
+        return _gateway
+
+
+def set_notification_gateway(gateway: Optional[NotificationGateway]):
+    global _gateway
+    with _gateway_lock:
+        _gateway = gateway
@@ -0,0 +1,427 @@
+"""
+Order Flow Bar Engine - folds Binance aggTrades into NumPy bars as they arrive.
+
+BTCOrderFlowMetrics used to rebuild CVD, divergence and buy/sell pressure from the trade
+history on every get_metrics() call. The engine keeps that state online instead, so reads
+cost the same at 5 trades/s and at peak BTC rates:
+
+- Time bars (default 1 minute): OHLC, buy/sell volume and value, trade count, CVD at close
+- Volume bars of a fixed traded size (delta bars): a trade that fills a bar is split into
+  the next one, so every closed bar holds exactly ``volume_bar_size``
+- Sub-second pressure buckets (default 0.5s) for rolling buy/sell pressure windows
+- Session CVD, CVD slope over the last N time bars, and price/CVD swing divergence plus
+  price/delta divergence updated once per closed bar
+
+Bars live in fixed-size NumPy ring buffers (RingBuffer); reads return copies of the tail.
+Trades are folded and read under one lock (stream thread writes, monitor threads read).
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from infra.delta_divergence_detector import DeltaDivergenceDetector
+    DELTA_DIVERGENCE_DETECTOR_AVAILABLE = True
+except ImportError:
+    DELTA_DIVERGENCE_DETECTOR_AVAILABLE = False
+    logger.debug("DeltaDivergenceDetector not available (delta divergence disabled)")
+
+# Time bar columns
+T_START, T_OPEN, T_HIGH, T_LOW, T_CLOSE, T_BUY, T_SELL, T_BUY_VALUE, T_SELL_VALUE, T_TRADES, T_CVD = range(11)
+TIME_BAR_COLUMNS = 11
+
+# Volume bar columns
+V_START, V_END, V_OPEN, V_HIGH, V_LOW, V_CLOSE, V_BUY, V_SELL, V_CVD = range(9)
+VOLUME_BAR_COLUMNS = 9
+
+DIVERGENCE_BARS = 20  # Bars inspected for price/CVD swings (as _detect_divergence_from_bars)
+NO_DIVERGENCE = {"type": None, "strength": 0.0}
+
+
+class RingBuffer:
+    """Fixed-size float64 ring buffer (one value or one row per entry), oldest first"""
+
+    def __init__(self, maxlen: int, columns: Optional[int] = None):
+        self.maxlen = maxlen
+        self.columns = columns
+        shape = (maxlen,) if columns is None else (maxlen, columns)
+        self._data = np.zeros(shape, dtype=float)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        return iter(self.tail(self._size).tolist())
+
+    def append(self, value) -> None:
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.maxlen
+        if self._size < self.maxlen:
+            self._size += 1
+
+    def tail(self, count: Optional[int] = None) -> np.ndarray:
+        """Last ``count`` entries (all by default), oldest first, as a copy"""
+        count = self._size if count is None else max(0, min(count, self._size))
+        if count == 0:
+            return self._data[:0].copy()
+        start = (self._next - count) % self.maxlen
+        if start + count <= self.maxlen:
+            return self._data[start:start + count].copy()
+        return np.concatenate((self._data[start:], self._data[:self._next]))
+
+    def last(self, default: float = 0.0):
+        if self._size == 0:
+            return default
+        return self._data[(self._next - 1) % self.maxlen]
+
+    def clear(self) -> None:
+        self._next = 0
+        self._size = 0
+
+
+def divergence_strength(price_points: Sequence[Tuple[int, float]], cvd_points: Sequence[Tuple[int, float]]) -> float:
+    """Strength (0-1) of a divergence between the last two price and CVD swing points"""
+    if len(price_points) < 2 or len(cvd_points) < 2:
+        return 0.0
+    price_change = abs(price_points[-1][1] - price_points[-2][1])
+    cvd_change = abs(cvd_points[-1][1] - cvd_points[-2][1])
+    if price_change == 0:
+        return 0.0
+    return min(1.0, (price_change + cvd_change) / (price_change * 2))
+
+
+def _regression_weights(n: int) -> np.ndarray:
+    """Weights w such that w @ y is the least-squares slope of y over x = 0..n-1"""
+    x = np.arange(n, dtype=float)
+    centered = x - x.mean()
+    return centered / (centered ** 2).sum()
+
+
+class OrderFlowBarEngine:
+    """Incremental time bars, volume bars, CVD and divergence for one aggTrade stream"""
+
+    def __init__(
+        self,
+        symbol: str = "BTCUSDT",
+        bar_interval_seconds: int = 60,
+        volume_bar_size: float = 10.0,
+        max_bars: int = 500,
+        pressure_bucket_seconds: float = 0.5,
+        pressure_horizon_seconds: int = 900,
+        stale_after_seconds: float = 60.0,
+        delta_trend_period: int = 10
+    ):
+        """
+        Args:
+            symbol: Stream symbol (e.g. "BTCUSDT")
+            bar_interval_seconds: Time bar length (default: 1 minute)
+            volume_bar_size: Traded quantity per volume bar (default: 10 BTC)
+            max_bars: Closed bars kept per series
+            pressure_bucket_seconds: Resolution of the rolling pressure windows
+            pressure_horizon_seconds: Longest pressure window that can be read
+            stale_after_seconds: Engine counts as live while trades are newer than this
+            delta_trend_period: Bars used for the price/delta divergence slopes
+        """
+        self.symbol = symbol
+        self.bar_interval_seconds = bar_interval_seconds
+        self.volume_bar_size = volume_bar_size
+        self.stale_after_seconds = stale_after_seconds
+        self.delta_trend_period = delta_trend_period
+        self._lock = threading.Lock()
+
+        self.time_bars = RingBuffer(max_bars, TIME_BAR_COLUMNS)
+        self.volume_bars = RingBuffer(max_bars, VOLUME_BAR_COLUMNS)
+        self._bar: Optional[List[float]] = None  # Forming time bar
+        self._volume_bar: Optional[List[float]] = None  # Forming volume bar
+        self._volume_bar_filled = 0.0
+
+        self.pressure_bucket_seconds = pressure_bucket_seconds
+        slots = int(np.ceil(pressure_horizon_seconds / pressure_bucket_seconds)) + 1
+        self._bucket_ids = np.full(slots, -1, dtype=np.int64)
+        # buy volume, sell volume, buy value, sell value
+        self._buckets = np.zeros((slots, 4), dtype=float)
+
+        self.cvd = 0.0
+        self.buy_volume = 0.0
+        self.sell_volume = 0.0
+        self.trade_count = 0
+        self.last_trade_time = 0.0
+        self.last_price = 0.0
+
+        self._closed_bars = 0
+        self._swings = {name: deque() for name in ("price_high", "price_low", "cvd_high", "cvd_low")}
+        self._divergence = dict(NO_DIVERGENCE)
+        self._delta_divergence: Optional[Dict] = None
+        self._delta_detector = (
+            DeltaDivergenceDetector(min_bars=DIVERGENCE_BARS, trend_period=delta_trend_period)
+            if DELTA_DIVERGENCE_DETECTOR_AVAILABLE else None
+        )
+        self._slope_weights: Dict[int, np.ndarray] = {}
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def process_aggtrade(self, trade: Dict) -> bool:
+        """Fold one aggTrade ({'side', 'quantity', 'price', 'timestamp', 'usd_value'}) into the bars"""
+        quantity = trade.get("quantity", 0.0)
+        side = trade.get("side")
+        if not quantity or quantity <= 0 or side not in ("BUY", "SELL"):
+            return False
+        price = trade.get("price", 0.0)
+        timestamp = trade.get("timestamp") or time.time()
+        value = trade.get("usd_value") or price * quantity
+        is_buy = side == "BUY"
+        delta = quantity if is_buy else -quantity
+
+        with self._lock:
+            self.cvd += delta
+            if is_buy:
+                self.buy_volume += quantity
+            else:
+                self.sell_volume += quantity
+            self.trade_count += 1
+            self.last_trade_time = timestamp
+            self.last_price = price
+
+            self._fold_time_bar(timestamp, price, quantity, value, is_buy)
+            self._fold_volume_bar(timestamp, price, quantity, is_buy)
+            self._fold_pressure(timestamp, quantity, value, is_buy)
+        return True
+
+    def _fold_time_bar(self, timestamp: float, price: float, quantity: float, value: float, is_buy: bool) -> None:
+        start = (timestamp // self.bar_interval_seconds) * self.bar_interval_seconds
+        bar = self._bar
+        if bar is None or start != bar[T_START]:
+            if bar is not None:
+                self._close_time_bar(bar)
+            bar = self._bar = [start, price, price, price, price, 0.0, 0.0, 0.0, 0.0, 0, 0.0]
+        if is_buy:
+            bar[T_BUY] += quantity
+            bar[T_BUY_VALUE] += value
+        else:
+            bar[T_SELL] += quantity
+            bar[T_SELL_VALUE] += value
+        bar[T_TRADES] += 1
+        if price > bar[T_HIGH]:
+            bar[T_HIGH] = price
+        if price < bar[T_LOW]:
+            bar[T_LOW] = price
+        bar[T_CLOSE] = price
+        bar[T_CVD] = self.cvd
+
+    def _fold_volume_bar(self, timestamp: float, price: float, quantity: float, is_buy: bool) -> None:
+        remaining = quantity
+        cvd_before = self.cvd - (quantity if is_buy else -quantity)
+        while remaining > 0:
+            bar = self._volume_bar
+            if bar is None:
+                bar = self._volume_bar = [timestamp, timestamp, price, price, price, price, 0.0, 0.0, cvd_before]
+                self._volume_bar_filled = 0.0
+            portion = min(remaining, self.volume_bar_size - self._volume_bar_filled)
+            if is_buy:
+                bar[V_BUY] += portion
+                cvd_before += portion
+            else:
+                bar[V_SELL] += portion
+                cvd_before -= portion
+            bar[V_END] = timestamp
+            if price > bar[V_HIGH]:
+                bar[V_HIGH] = price
+            if price < bar[V_LOW]:
+                bar[V_LOW] = price
+            bar[V_CLOSE] = price
+            bar[V_CVD] = cvd_before
+            self._volume_bar_filled += portion
+            remaining -= portion
+            if self._volume_bar_filled >= self.volume_bar_size - 1e-12:
+                self.volume_bars.append(bar)
+                self._volume_bar = None
+
+    def _fold_pressure(self, timestamp: float, quantity: float, value: float, is_buy: bool) -> None:
+        bucket = int(timestamp // self.pressure_bucket_seconds)
+        slot = bucket % len(self._bucket_ids)
+        if self._bucket_ids[slot] != bucket:
+            self._bucket_ids[slot] = bucket
+            self._buckets[slot] = 0.0
+        row = self._buckets[slot]
+        if is_buy:
+            row[0] += quantity
+            row[2] += value
+        else:
+            row[1] += quantity
+            row[3] += value
+
+    def _close_time_bar(self, bar: List[float]) -> None:
+        self.time_bars.append(bar)
+        self._closed_bars += 1
+        self._update_divergence()
+        self._update_delta_divergence()
+
+    def _update_divergence(self) -> None:
+        """Track price/CVD swing points over the last DIVERGENCE_BARS closed bars"""
+        k = self._closed_bars - 1
+        if k >= 2:
+            prev, mid, last = self.time_bars.tail(3)
+            m = k - 1
+            if mid[T_HIGH] > prev[T_HIGH] and mid[T_HIGH] > last[T_HIGH]:
+                self._swings["price_high"].append((m, float(mid[T_HIGH])))
+            if mid[T_LOW] < prev[T_LOW] and mid[T_LOW] < last[T_LOW]:
+                self._swings["price_low"].append((m, float(mid[T_LOW])))
+            if mid[T_CVD] > prev[T_CVD] and mid[T_CVD] > last[T_CVD]:
+                self._swings["cvd_high"].append((m, float(mid[T_CVD])))
+            if mid[T_CVD] < prev[T_CVD] and mid[T_CVD] < last[T_CVD]:
+                self._swings["cvd_low"].append((m, float(mid[T_CVD])))
+        # Swings need both neighbours inside the window: indices k-18 .. k-1
+        oldest = k - (DIVERGENCE_BARS - 2)
+        for points in self._swings.values():
+            while points and points[0][0] < oldest:
+                points.popleft()
+
+        if self._closed_bars < DIVERGENCE_BARS:
+            self._divergence = dict(NO_DIVERGENCE)
+            return
+        price_highs, cvd_highs = self._swings["price_high"], self._swings["cvd_high"]
+        price_lows, cvd_lows = self._swings["price_low"], self._swings["cvd_low"]
+        # Bearish: price higher high, CVD lower high
+        if len(price_highs) >= 2 and len(cvd_highs) >= 2:
+            if price_highs[-1][1] > price_highs[-2][1] and cvd_highs[-1][1] < cvd_highs[-2][1]:
+                self._divergence = {"type": "bearish", "strength": divergence_strength(price_highs, cvd_highs)}
+                return
+        # Bullish: price lower low, CVD higher low
+        if len(price_lows) >= 2 and len(cvd_lows) >= 2:
+            if price_lows[-1][1] < price_lows[-2][1] and cvd_lows[-1][1] > cvd_lows[-2][1]:
+                self._divergence = {"type": "bullish", "strength": divergence_strength(price_lows, cvd_lows)}
+                return
+        self._divergence = dict(NO_DIVERGENCE)
+
+    def _update_delta_divergence(self) -> None:
+        if self._delta_detector is None or self._closed_bars < DIVERGENCE_BARS:
+            self._delta_divergence = None
+            return
+        bars = self.time_bars.tail(self.delta_trend_period)
+        self._delta_divergence = self._delta_detector.detect_from_series(
+            bars[:, T_CLOSE].tolist(), (bars[:, T_BUY] - bars[:, T_SELL]).tolist()
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def is_live(self, now: Optional[float] = None) -> bool:
+        """Whether trades are still arriving (last trade within stale_after_seconds)"""
+        now = time.time() if now is None else now
+        return self.trade_count > 0 and now - self.last_trade_time <= self.stale_after_seconds
+
+    def bars(self, count: Optional[int] = None, include_forming: bool = True) -> np.ndarray:
+        """Last ``count`` time bars (rows by T_* column), oldest first"""
+        with self._lock:
+            return self._bars(count, include_forming)
+
+    def _bars(self, count: Optional[int], include_forming: bool) -> np.ndarray:
+        forming = include_forming and self._bar is not None
+        if count is None:
+            closed = self.time_bars.tail()
+        else:
+            closed = self.time_bars.tail(count - 1 if forming else count)
+        if forming:
+            return np.vstack((closed, np.asarray(self._bar, dtype=float)))
+        return closed
+
+    def volume_bar_deltas(self, count: int = 20) -> np.ndarray:
+        """Delta (buy - sell) of the last ``count`` closed volume bars, oldest first"""
+        with self._lock:
+            bars = self.volume_bars.tail(count)
+        return bars[:, V_BUY] - bars[:, V_SELL]
+
+    def bar_count(self) -> int:
+        with self._lock:
+            return len(self.time_bars) + (1 if self._bar is not None else 0)
+
+    def cvd_state(self, slope_period: int = 10) -> Dict[str, float]:
+        """Session CVD and its slope over the last ``slope_period`` time bars (forming bar included)"""
+        with self._lock:
+            bars = self._bars(slope_period, include_forming=True)
+            cvd = self.cvd
+        values = bars[:, T_CVD]
+        slope = 0.0
+        if len(values) >= slope_period and slope_period >= 2:
+            weights = self._slope_weights.get(slope_period)
+            if weights is None:
+                weights = self._slope_weights[slope_period] = _regression_weights(slope_period)
+            slope = float(weights @ values)
+        elif len(values) >= 2:
+            slope = float(values[-1] - values[0]) / len(values)
+        return {"cvd": cvd, "slope": slope, "bar_count": len(values)}
+
+    def divergence(self) -> Dict:
+        """Price/CVD swing divergence as of the last closed bar ({'type', 'strength'})"""
+        with self._lock:
+            return dict(self._divergence)
+
+    def delta_divergence(self) -> Optional[Dict]:
+        """Price/delta trend divergence as of the last closed bar (None when none)"""
+        with self._lock:
+            return dict(self._delta_divergence) if self._delta_divergence else None
+
+    def pressure(self, window_seconds: float = 30, now: Optional[float] = None) -> Optional[Dict]:
+        """Buy/sell pressure over the last ``window_seconds`` (WhaleDetector.get_pressure shape)"""
+        now = time.time() if now is None else now
+        lowest = int((now - window_seconds) // self.pressure_bucket_seconds)
+        highest = int(now // self.pressure_bucket_seconds)
+        with self._lock:
+            mask = (self._bucket_ids >= lowest) & (self._bucket_ids <= highest)
+            buy_volume, sell_volume, buy_value, sell_value = self._buckets[mask].sum(axis=0).tolist()
+
+        total_volume = buy_volume + sell_volume
+        if total_volume == 0:
+            return None
+        pressure = buy_volume / sell_volume if sell_volume > 0 else (999 if buy_volume > 0 else 1)
+        return {
+            "buy_volume": buy_volume,
+            "sell_volume": sell_volume,
+            "buy_value": buy_value,
+            "sell_value": sell_value,
+            "total_volume": total_volume,
+            "pressure": pressure,
+            "net_volume": buy_volume - sell_volume,
+            "window_seconds": window_seconds,
+            "dominant_side": "BUY" if pressure > 1.2 else "SELL" if pressure < 0.8 else "NEUTRAL"
+        }
+
+    def price_range(self, bar_count: int) -> Optional[float]:
+        """High - low over the last ``bar_count`` time bars (None with fewer than 2 bars)"""
+        with self._lock:
+            bars = self._bars(bar_count, include_forming=True)
+        if len(bars) < 2:
+            return None
+        return float(bars[:, T_HIGH].max() - bars[:, T_LOW].min())
+
+    def average_range(self, bar_count: int = 14) -> Optional[float]:
+        """Mean high - low of the last ``bar_count`` time bars (None if not enough bars)"""
+        with self._lock:
+            bars = self._bars(bar_count, include_forming=True)
+        if len(bars) < bar_count:
+            return None
+        return float((bars[:, T_HIGH] - bars[:, T_LOW]).mean())
+
+    def get_statistics(self) -> Dict:
+        with self._lock:
+            return {
+                "symbol": self.symbol,
+                "trade_count": self.trade_count,
+                "cvd": self.cvd,
+                "time_bars": len(self.time_bars) + (1 if self._bar is not None else 0),
+                "volume_bars": len(self.volume_bars),
+                "last_trade_time": self.last_trade_time,
+                "divergence": dict(self._divergence),
+            }
@@ -7,7 +7,7 @@ Integrates depth streams, aggtrades, and order flow analysis.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from infra.binance_depth_stream import BinanceDepthStream, OrderBookAnalyzer
 from infra.binance_aggtrades_stream import BinanceAggTradesStream, WhaleDetector
 from infra.order_flow_analyzer import OrderFlowAnalyzer
@@ -39,6 +39,9 @@ class OrderFlowService:
         self.running = False
         self.symbols = []
         
+        # Per-trade listeners (e.g. BTCOrderFlowMetrics bar engine): listener(symbol, trade)
+        self.trade_listeners: List[Callable[[str, Dict], None]] = []
+        
         logger.info("📊 OrderFlowService initialized")
     
     async def _on_depth_update(self, symbol: str, depth: Dict):
@@ -48,6 +51,21 @@ class OrderFlowService:
     async def _on_trade_update(self, symbol: str, trade: Dict):
         """Callback for trade updates"""
         self.analyzer.update_trade(symbol, trade)
+        for listener in self.trade_listeners:
+            try:
+                listener(symbol, trade)
+            except Exception as e:
+                logger.debug(f"Trade listener error for {symbol}: {e}")
+    
+    def add_trade_listener(self, listener: Callable[[str, Dict], None]):
+        """Call ``listener(symbol, trade)`` for every aggTrade received"""
+        if listener not in self.trade_listeners:
+            self.trade_listeners.append(listener)
+    
+    def remove_trade_listener(self, listener: Callable[[str, Dict], None]):
+        """Stop calling a listener added with add_trade_listener()"""
+        if listener in self.trade_listeners:
+            self.trade_listeners.remove(listener)
     
     async def start(self, symbols: List[str], background: bool = True):
         """
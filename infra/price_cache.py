@@ -3,9 +3,11 @@ Price Cache - In-Memory Tick Storage
 Stores real-time price data from Binance for indicator computation.
 
 Features:
-- Rolling window (keeps last N ticks)
-- Thread-safe access
-- Fast retrieval for V8 indicators
+- Rolling window (keeps last N ticks) in fixed-capacity NumPy ring buffers per symbol
+- Zero-copy array views of the latest N ticks (price, OHLC, volume, timestamp)
+- Incrementally updated rolling stats (mean/std/high/low of the last N prices)
+- Single writer (the asyncio feed), lock-free readers
+- Fixed, measured memory per symbol
 - Optional Redis backup (Phase 2)
 
 Usage:
@@ -13,16 +15,20 @@ Usage:
     cache.update("BTCUSDT", tick_data)
     latest = cache.get_latest("BTCUSDT")
     history = cache.get_history("BTCUSDT", count=200)
+    arrays = cache.get_arrays("BTCUSDT", count=200)   # read-only views, no copy
 """
 
 import time
 import logging
+import math
 from collections import deque
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from threading import Lock
 import sys
 import codecs
 
+import numpy as np
+
 # Fix Windows console encoding
 if sys.platform == 'win32':
     try:
@@ -33,24 +39,143 @@ if sys.platform == 'win32':
 
 logger = logging.getLogger(__name__)
 
+# Numeric tick fields kept in the ring buffers (open/high/low/close default to price)
+COLUMNS = ("price", "open", "high", "low", "close", "volume", "timestamp")
+_COL = {name: i for i, name in enumerate(COLUMNS)}
+
+
+class _TickRing:
+    """
+    Fixed-capacity tick ring for one symbol.
+
+    Every value is written twice (slot and slot + capacity), so the latest N ticks are
+    always one contiguous slice and can be handed out as views. A window of N ticks stays
+    valid for (capacity - N) further ticks. The writer publishes ``total`` last, so readers
+    need no lock.
+    """
+
+    __slots__ = ("capacity", "data", "ticks", "total", "start", "stats_window",
+                 "_ref", "_sum", "_sumsq", "_highs", "_lows", "rolling")
+
+    def __init__(self, capacity: int, stats_window: int):
+        self.capacity = capacity
+        self.data = np.zeros((len(COLUMNS), 2 * capacity), dtype=np.float64)
+        self.ticks = np.empty(capacity, dtype=object)  # original tick dicts
+        self.total = 0  # ticks ever written (monotonic tick id)
+        self.start = 0  # total at the last clear()
+        self.stats_window = stats_window
+        self._reset_rolling()
+
+    def _reset_rolling(self):
+        self._ref: Optional[float] = None
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._highs: deque = deque()  # (tick index, price), decreasing prices
+        self._lows: deque = deque()   # (tick index, price), increasing prices
+        self.rolling: Tuple[int, float, float, float, float] = (0, 0.0, 0.0, 0.0, 0.0)
+
+    @property
+    def size(self) -> int:
+        return min(self.total - self.start, self.capacity)
+
+    def append(self, tick: dict):
+        n = self.total
+        price = float(tick.get("price", 0.0))
+        window = self.stats_window
+        leaving = None
+        if n - self.start >= window:
+            leaving = self.data[0, (n - window) % self.capacity]  # read before the slot is reused
+
+        slot = n % self.capacity
+        row = (
+            price,
+            tick.get("open", price), tick.get("high", price), tick.get("low", price), tick.get("close", price),
+            tick.get("volume", 0.0), tick.get("timestamp", 0.0),
+        )
+        self.data[:, slot] = row
+        self.data[:, slot + self.capacity] = row
+        self.ticks[slot] = tick
+        self._roll(n, price, leaving)
+        self.total = n + 1  # publish
+
+    def _roll(self, n: int, price: float, leaving: Optional[float]):
+        """O(1) update of the rolling stats over the last stats_window prices"""
+        window = self.stats_window
+        if self._ref is None:
+            self._ref = price  # shift values to keep sum / sum of squares well conditioned
+        x = price - self._ref
+        self._sum += x
+        self._sumsq += x * x
+        if leaving is not None:
+            y = leaving - self._ref
+            self._sum -= y
+            self._sumsq -= y * y
+
+        while self._highs and self._highs[-1][1] <= price:
+            self._highs.pop()
+        self._highs.append((n, price))
+        while self._lows and self._lows[-1][1] >= price:
+            self._lows.pop()
+        self._lows.append((n, price))
+        oldest = n - window
+        while self._highs[0][0] <= oldest:
+            self._highs.popleft()
+        while self._lows[0][0] <= oldest:
+            self._lows.popleft()
+
+        count = min(n + 1 - self.start, window)
+        if (n + 1) % self.capacity == 0:
+            # Periodic exact recompute bounds floating-point drift of the running sums
+            end = (n % self.capacity) + 1 + self.capacity
+            values = self.data[0, end - count:end] - self._ref
+            self._sum = float(values.sum())
+            self._sumsq = float((values * values).sum())
+
+        mean = self._sum / count
+        var = max(self._sumsq / count - mean * mean, 0.0)
+        self.rolling = (count, self._ref + mean, math.sqrt(var), self._highs[0][1], self._lows[0][1])
+
+    def window(self, count: int) -> Tuple[int, int, int]:
+        """(first, last + 1, tick id) of the latest ``count`` ticks in the mirrored buffer"""
+        total = self.total  # read once: later writes land outside the window
+        size = max(0, min(total - self.start, self.capacity, count))
+        end = (total - 1) % self.capacity + 1 + self.capacity if total else 0
+        return end - size, end, total
+
+    def clear(self):
+        self.start = self.total
+        self.ticks[:] = None
+        self._reset_rolling()
+
+    def memory_bytes(self) -> int:
+        """Buffers plus the tick dicts currently held"""
+        size = self.size
+        latest = self.ticks[(self.total - 1) % self.capacity] if size else None
+        dict_bytes = sys.getsizeof(latest) if latest is not None else 0
+        return int(self.data.nbytes + self.ticks.nbytes + size * dict_bytes)
+
 
 class PriceCache:
     """
     In-memory cache for streaming tick data.
     Stores last N ticks per symbol for indicator computation.
     
-    Thread-safe for concurrent access from multiple streams.
+    Ticks are written by one producer (the Binance feed); reads are lock-free and
+    return views into fixed-capacity NumPy ring buffers.
     """
     
-    def __init__(self, max_ticks: int = 1000):
+    def __init__(self, max_ticks: int = 1000, stats_window: int = 30):
         """
         Args:
             max_ticks: Maximum number of ticks to store per symbol
+            stats_window: Number of latest prices covered by the rolling stats
         """
-        self.cache: Dict[str, deque] = {}
+        self.rings: Dict[str, _TickRing] = {}
         self.max_ticks = max_ticks
+        self.stats_window = max(1, min(stats_window, max_ticks))
         self.locks: Dict[str, Lock] = {}
         self.stats: Dict[str, dict] = {}
+        self._new_symbol_lock = Lock()
         
         logger.info(f"📦 PriceCache initialized (max_ticks={max_ticks})")
         
@@ -66,21 +191,24 @@ class PriceCache:
         symbol = symbol.upper()
         
         # Initialize if new symbol
-        if symbol not in self.cache:
-            self.cache[symbol] = deque(maxlen=self.max_ticks)
-            self.locks[symbol] = Lock()
-            self.stats[symbol] = {
-                "first_tick": time.time(),
-                "last_tick": time.time(),
-                "total_ticks": 0
-            }
-            logger.info(f"📊 Added new symbol to cache: {symbol}")
+        if symbol not in self.rings:
+            with self._new_symbol_lock:
+                if symbol not in self.rings:
+                    self.locks[symbol] = Lock()
+                    self.stats[symbol] = {
+                        "first_tick": time.time(),
+                        "last_tick": time.time(),
+                        "total_ticks": 0
+                    }
+                    self.rings[symbol] = _TickRing(self.max_ticks, self.stats_window)
+                    logger.info(f"📊 Added new symbol to cache: {symbol}")
             
-        # Thread-safe update
+        # Writers are serialized per symbol; readers never take this lock
         with self.locks[symbol]:
-            self.cache[symbol].append(tick)
+            ring = self.rings[symbol]
+            ring.append(tick)
             self.stats[symbol]["last_tick"] = time.time()
-            self.stats[symbol]["total_ticks"] += 1
+            self.stats[symbol]["total_ticks"] = ring.total
             
     def get_latest(self, symbol: str) -> Optional[dict]:
         """
@@ -89,13 +217,14 @@ class PriceCache:
         Returns:
             Latest tick dict or None if symbol not found
         """
-        symbol = symbol.upper()
-        
-        if symbol not in self.cache or len(self.cache[symbol]) == 0:
+        ring = self.rings.get(symbol.upper())
+        if ring is None:
             return None
-            
-        with self.locks[symbol]:
-            return dict(self.cache[symbol][-1])
+        total = ring.total
+        if total - ring.start <= 0:
+            return None
+        tick = ring.ticks[(total - 1) % ring.capacity]
+        return dict(tick) if tick is not None else None
             
     def get_history(self, symbol: str, count: int = 200) -> List[dict]:
         """
@@ -108,56 +237,132 @@ class PriceCache:
         Returns:
             List of tick dicts (oldest to newest)
         """
-        symbol = symbol.upper()
-        
-        if symbol not in self.cache:
+        key = symbol.upper()
+        ring = self.rings.get(key)
+        if ring is None:
             return []
+        cap = ring.capacity
+        while True:
+            first, end, tick_id = ring.window(count)
+            if end - first >= cap:
+                # A full-ring window includes the slot the writer fills next: read it under the writer lock
+                with self.locks[key]:
+                    first, end, _ = ring.window(count)
+                    return [t for t in (ring.ticks[i % cap] for i in range(first, end)) if t is not None]
+            history = [t for t in (ring.ticks[i % cap] for i in range(first, end)) if t is not None]
+            # Checked like a seqlock: retry if the writer lapped the window meanwhile
+            if ring.total - tick_id < cap - (end - first):
+                return history
             
-        with self.locks[symbol]:
-            history = list(self.cache[symbol])
-            return history[-count:] if len(history) > count else history
+    def get_last_tick_id(self, symbol: str) -> Optional[int]:
+        """
+        Monotonic id of the latest tick (total ticks received for the symbol).
+        Changes whenever a new tick arrives - usable as a cache key for derived data.
+        """
+        ring = self.rings.get(symbol.upper())
+        return ring.total if ring is not None else None
+            
+    def get_arrays(self, symbol: str, count: int = 200,
+                   fields: Sequence[str] = ("price", "volume", "timestamp"),
+                   copy: bool = False) -> Dict[str, Any]:
+        """
+        Recent history as float64 NumPy arrays (oldest to newest), one consistent snapshot.
+        
+        Arrays are read-only views into the ring buffer (no copy); a view of N ticks stays
+        valid for (max_ticks - N) further ticks; copy=True returns a verified copy instead.
+        A window of the whole ring (count >= max_ticks once full) is always returned as a
+        copy taken under the writer lock, since a view of it is overwritten by the next tick.
+        Missing open/high/low/close fall back to the tick price, other missing fields to 0.
+        
+        Returns:
+            {field: np.ndarray, ..., "tick_id": int | None}
+        """
+        key = symbol.upper()
+        ring = self.rings.get(key)
+        if ring is None:
+            out: Dict[str, Any] = {f: np.empty(0) for f in fields}
+            out["tick_id"] = None
+            return out
+        return self._read_arrays(key, ring, count, fields, copy)
+    
+    def _read_arrays(self, key: str, ring: _TickRing, count: int, fields: Sequence[str],
+                     copy: bool, locked: bool = False) -> Dict[str, Any]:
+        cap = ring.capacity
+        while True:
+            first, end, tick_id = ring.window(count)
+            if end - first >= cap and not locked:
+                # A full-ring window includes the slot the writer fills next, so it is neither a
+                # valid view nor a checkable copy: copy it while holding the writer lock
+                with self.locks[key]:
+                    return self._read_arrays(key, ring, count, fields, copy=True, locked=True)
+            out = {}
+            for f in fields:
+                if f in _COL:
+                    out[f] = ring.data[_COL[f], first:end].copy() if copy else ring.data[_COL[f], first:end].view()
+                else:
+                    out[f] = np.asarray(
+                        [(ring.ticks[i % cap] or {}).get(f, 0.0) for i in range(first, end)], dtype=np.float64
+                    )
+            # Copies are checked like a seqlock: retry if the writer lapped the window meanwhile
+            copied = copy or any(f not in _COL for f in fields)
+            if locked or not copied or ring.total - tick_id < cap - (end - first):
+                break
+            
+        if not copy:
+            for f in fields:
+                if f in _COL:
+                    out[f].flags.writeable = False
+        out["tick_id"] = tick_id
+        return out
             
-    def get_ohlcv_arrays(self, symbol: str, count: int = 200) -> Dict[str, List[float]]:
+    def get_ohlcv_arrays(self, symbol: str, count: int = 200) -> Dict[str, np.ndarray]:
         """
         Get OHLCV data as separate arrays (for indicator computation).
         
         Returns:
             {
-                "open": [o1, o2, ...],
-                "high": [h1, h2, ...],
-                "low": [l1, l2, ...],
-                "close": [c1, c2, ...],
-                "volume": [v1, v2, ...],
-                "timestamp": [t1, t2, ...]
+                "open": ndarray,
+                "high": ndarray,
+                "low": ndarray,
+                "close": ndarray,
+                "volume": ndarray,
+                "timestamp": ndarray
             }
+            (read-only views, see get_arrays)
         """
-        history = self.get_history(symbol, count)
+        arrays = self.get_arrays(symbol, count, ("open", "high", "low", "close", "volume", "timestamp"))
+        arrays.pop("tick_id")
+        return arrays
         
-        if not history:
-            return {
-                "open": [],
-                "high": [],
-                "low": [],
-                "close": [],
-                "volume": [],
-                "timestamp": []
-            }
-            
-        return {
-            "open": [t["open"] for t in history],
-            "high": [t["high"] for t in history],
-            "low": [t["low"] for t in history],
-            "close": [t["close"] for t in history],
-            "volume": [t["volume"] for t in history],
-            "timestamp": [t["timestamp"] for t in history]
-        }
+    def get_rolling_stats(self, symbol: str) -> Optional[dict]:
+        """
+        Mean / std / high / low of the last ``stats_window`` prices (updated per tick, O(1)).
+        
+        Returns:
+            {"count", "mean", "std", "high", "low", "window"} or None if symbol not found
+        """
+        ring = self.rings.get(symbol.upper())
+        if ring is None or ring.size == 0:
+            return None
+        count, mean, std, high, low = ring.rolling
+        return {"count": count, "mean": mean, "std": std, "high": high, "low": low, "window": ring.stats_window}
+        
+    def get_memory_bytes(self, symbol: Optional[str] = None) -> int:
+        """
+        Memory held by one symbol (or all symbols). Fixed by max_ticks: the buffers are
+        allocated once per symbol and never grow.
+        """
+        if symbol is not None:
+            ring = self.rings.get(symbol.upper())
+            return ring.memory_bytes() if ring is not None else 0
+        return sum(ring.memory_bytes() for ring in list(self.rings.values()))
         
     def get_tick_count(self, symbol: str) -> int:
         """
         Get number of ticks stored for a symbol.
         """
-        symbol = symbol.upper()
-        return len(self.cache.get(symbol, []))
+        ring = self.rings.get(symbol.upper())
+        return ring.size if ring is not None else 0
         
     def get_age_seconds(self, symbol: str) -> Optional[float]:
         """
@@ -196,7 +401,8 @@ class PriceCache:
                 "age_seconds": float,
                 "is_stale": bool,
                 "total_ticks": int,
-                "uptime_seconds": float
+                "uptime_seconds": float,
+                "memory_bytes": int
             }
         """
         symbol = symbol.upper()
@@ -214,14 +420,15 @@ class PriceCache:
             "is_stale": self.is_stale(symbol),
             "total_ticks": self.stats[symbol]["total_ticks"],
             "uptime_seconds": uptime,
-            "ticks_per_second": self.stats[symbol]["total_ticks"] / uptime if uptime > 0 else 0
+            "ticks_per_second": self.stats[symbol]["total_ticks"] / uptime if uptime > 0 else 0,
+            "memory_bytes": self.get_memory_bytes(symbol)
         }
         
     def get_all_symbols(self) -> List[str]:
         """
         Get list of all symbols in cache.
         """
-        return list(self.cache.keys())
+        return list(self.rings.keys())
         
     def clear(self, symbol: str = None):
         """
@@ -232,14 +439,14 @@ class PriceCache:
         """
         if symbol:
             symbol = symbol.upper()
-            if symbol in self.cache:
+            if symbol in self.rings:
                 with self.locks[symbol]:
-                    self.cache[symbol].clear()
+                    self.rings[symbol].clear()
                 logger.info(f"🗑️ Cleared cache for {symbol}")
         else:
-            for sym in list(self.cache.keys()):
+            for sym in list(self.rings.keys()):
                 with self.locks[sym]:
-                    self.cache[sym].clear()
+                    self.rings[sym].clear()
             logger.info("🗑️ Cleared all cache")
             
     def print_summary(self):
@@ -257,7 +464,8 @@ class PriceCache:
                 print(f"{status} {symbol:12s} | "
                       f"Ticks: {stats['tick_count']:4d} | "
                       f"Age: {stats['age_seconds']:5.1f}s | "
-                      f"Rate: {stats['ticks_per_second']:.2f}/s")
+                      f"Rate: {stats['ticks_per_second']:.2f}/s | "
+                      f"Mem: {stats['memory_bytes'] / 1024:.0f}KB")
                       
         print("="*60 + "\n")
 
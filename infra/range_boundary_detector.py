@@ -745,6 +745,21 @@ class RangeBoundaryDetector:
         
         return nested if nested else None
     
+    @staticmethod
+    def labeled_swing_dicts(candles_df: pd.DataFrame, left: int = 3, right: int = 3) -> List[Dict[str, Any]]:
+        """
+        Labeled swing points of a DataFrame as dicts (price, kind, idx) for detect_bos_choch.
+        
+        Returns an empty list when fewer than 2 pivots are found.
+        """
+        pivots = find_swings(candles_df, left=left, right=right)
+        if len(pivots) < 2:
+            return []
+        return [
+            {"price": sp.price, "kind": sp.kind, "idx": sp.idx}
+            for sp in label_swings(pivots)
+        ]
+    
     def check_range_invalidation(
         self,
         range_data: RangeStructure,
@@ -753,7 +768,8 @@ class RangeBoundaryDetector:
         vwap_slope_pct_atr: Optional[float] = None,
         bb_width_expansion: Optional[float] = None,
         candles_df_m15: Optional[pd.DataFrame] = None,
-        atr_m15: Optional[float] = None
+        atr_m15: Optional[float] = None,
+        m15_swings: Optional[List[Dict[str, Any]]] = None
     ) -> Tuple[bool, List[str]]:
         """
         Check if range is invalidated (breaking down).
@@ -772,6 +788,7 @@ class RangeBoundaryDetector:
             bb_width_expansion: BB width expansion ratio (e.g., 0.5 = 50% expansion)
             candles_df_m15: Optional M15 DataFrame for BOS detection
             atr_m15: Optional M15 ATR for BOS detection
+            m15_swings: Optional pre-computed labeled_swing_dicts(candles_df_m15)
             
         Returns:
             (is_invalidated, list_of_triggered_signals)
@@ -801,42 +818,35 @@ class RangeBoundaryDetector:
         # Check 4: M15 BOS confirmed (integrated detection)
         if candles_df_m15 is not None and atr_m15 is not None and len(candles_df_m15) >= 10:
             try:
-                # Get swings for M15
-                m15_pivots = find_swings(candles_df_m15, left=3, right=3)
+                # Get labeled swings for M15
+                m15_swing_dicts = m15_swings
+                if m15_swing_dicts is None:
+                    m15_swing_dicts = self.labeled_swing_dicts(candles_df_m15)
                 
-                if len(m15_pivots) >= 2:
-                    # Convert to labeled swings
-                    m15_labeled = label_swings(m15_pivots)
-                    if m15_labeled:
-                        # Convert to dict format
-                        m15_swing_dicts = [
-                            {"price": sp.price, "kind": sp.kind, "idx": sp.idx}
-                            for sp in m15_labeled
-                        ]
-                        
-                        m15_close = float(candles_df_m15["close"].iloc[-1])
-                        
-                        # Detect BOS
-                        bos_result = detect_bos_choch(
-                            m15_swing_dicts,
-                            m15_close,
-                            atr_m15,
-                            bos_threshold=0.2,
-                            sustained_bars=1
-                        )
+                if m15_swing_dicts:
+                    m15_close = float(candles_df_m15["close"].iloc[-1])
+                    
+                    # Detect BOS
+                    bos_result = detect_bos_choch(
+                        m15_swing_dicts,
+                        m15_close,
+                        atr_m15,
+                        bos_threshold=0.2,
+                        sustained_bars=1
+                    )
+                    
+                    # If BOS detected, check if it invalidates the range
+                    if bos_result["bos_bull"] or bos_result["bos_bear"]:
+                        break_level = bos_result.get("break_level", 0.0)
                         
-                        # If BOS detected, check if it invalidates the range
-                        if bos_result["bos_bull"] or bos_result["bos_bear"]:
-                            break_level = bos_result.get("break_level", 0.0)
+                        # BOS invalidates range if:
+                        # - Break occurred outside range (price broke out), OR
+                        # - Break occurred inside range (structure changed)
+                        if (break_level > range_data.range_high or 
+                            break_level < range_data.range_low or
+                            (range_data.range_low <= break_level <= range_data.range_high)):
+                            invalidation_signals.append("m15_bos_confirmed")
                             
-                            # BOS invalidates range if:
-                            # - Break occurred outside range (price broke out), OR
-                            # - Break occurred inside range (structure changed)
-                            if (break_level > range_data.range_high or 
-                                break_level < range_data.range_low or
-                                (range_data.range_low <= break_level <= range_data.range_high)):
-                                invalidation_signals.append("m15_bos_confirmed")
-                                
             except Exception as e:
                 logger.warning(f"Error detecting M15 BOS for range invalidation: {e}")
         
@@ -1,9 +1,17 @@
 """
 Range Scalping Analysis Tool
 Main analysis function for range scalping opportunities.
+
+- The M15 series the risk filters share (VWAP history, BB width expansion, volume, candle
+  CVD, labeled swings) are computed once per (symbol, timeframe, bar) in a RangeContext
+- Risk filters run as a pipeline, cheapest first, stopping at the first hard reject
+  (early_exit); per-filter and per-step timings are reported in the response
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Optional, Any, List, Tuple
 from datetime import datetime
 import pandas as pd
@@ -18,6 +26,212 @@ from config.range_scalping_config_loader import load_range_scalping_config, load
 
 logger = logging.getLogger(__name__)
 
+MAX_RANGE_CONTEXTS = 64
+_VOLUME_COLUMNS = ('volume', 'tick_volume', 'volumes')
+_MISSING = object()
+
+
+class RangeContext:
+    """
+    Shared M15 series for one (symbol, timeframe, bar), each computed on first request.
+    
+    Reads columns from the DataFrame once as arrays; the list-of-candle-dict fallbacks stay
+    in the _calculate_* helpers.
+    """
+    
+    def __init__(self, candles_df: Optional[pd.DataFrame]):
+        self.candles_df = candles_df if candles_df is not None and not candles_df.empty else None
+        self._values: Dict[Any, Any] = {}
+        self._lock = threading.RLock()
+        self.computed = 0
+        self.hits = 0
+    
+    def _memo(self, key: Any, compute) -> Any:
+        with self._lock:
+            value = self._values.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            value = compute()
+            self.computed += 1
+            self._values[key] = value
+            return value
+    
+    def _column(self, name: str) -> Optional[np.ndarray]:
+        df = self.candles_df
+        if df is None or name not in df.columns:
+            return None
+        return self._memo(("column", name), lambda: df[name].to_numpy(dtype=float))
+    
+    def _volumes(self) -> Optional[np.ndarray]:
+        """Volume column (NaN as 0), or None if the DataFrame has none"""
+        def compute():
+            for col in _VOLUME_COLUMNS:
+                values = self._column(col)
+                if values is not None:
+                    return np.nan_to_num(values, nan=0.0)
+            return None
+        return self._memo("volumes", compute)
+    
+    def vwap_history(self, periods: int = 5, window: int = 20) -> List[float]:
+        """VWAP over the ``window`` candles ending at each of the last ``periods`` bars (oldest first)"""
+        def compute():
+            high, low, close = self._column('high'), self._column('low'), self._column('close')
+            if high is None or low is None or close is None:
+                return []
+            n = len(close)
+            tail = min(n, periods - 1 + window)
+            typical = ((high + low + close) / 3)[-tail:]
+            volumes = self._volumes()
+            volumes = volumes[-tail:] if volumes is not None else np.ones(tail)
+            # Prefix sums over the tail: every window sum is two lookups
+            cum_pv = np.concatenate(([0.0], np.cumsum(np.nan_to_num(typical * volumes))))
+            cum_v = np.concatenate(([0.0], np.cumsum(volumes)))
+            cum_tp = np.concatenate(([0.0], np.cumsum(np.nan_to_num(typical))))
+            ends = tail - np.arange(min(periods, n))[::-1]
+            starts = np.maximum(0, ends - window)
+            sum_v = cum_v[ends] - cum_v[starts]
+            sum_pv = cum_pv[ends] - cum_pv[starts]
+            mean_tp = (cum_tp[ends] - cum_tp[starts]) / (ends - starts)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                vwaps = np.where(sum_v > 0, sum_pv / sum_v, mean_tp)
+            return [float(v) for v in vwaps]
+        return list(self._memo(("vwap_history", periods, window), compute))
+    
+    def bb_width_expansion(self, period: int = 20, lookback: int = 40) -> Optional[float]:
+        """Current BB width (4 std / SMA, %) vs the average over the prior ``lookback`` bars, in %"""
+        def compute():
+            closes = self._column('close')
+            if closes is None:
+                return None
+            n = len(closes)
+            current = closes[-period:]
+            current_sma = current.mean()
+            current_width = (current.std() * 4) / current_sma * 100 if current_sma > 0 else 0
+            
+            first = max(period, n - lookback)
+            if n - period <= first:
+                return None
+            # Windows closes[i - period:i] for i in [first, n - period)
+            windows = np.lib.stride_tricks.sliding_window_view(closes[first - period:n - period - 1], period)
+            smas = windows.mean(axis=1)
+            stds = windows.std(axis=1)
+            positive = smas > 0
+            if not positive.any():
+                return None
+            avg_width = float(np.mean(stds[positive] * 4 / smas[positive] * 100))
+            if avg_width <= 0:
+                return None
+            return float((current_width - avg_width) / avg_width * 100)
+        return self._memo(("bb_width_expansion", period, lookback), compute)
+    
+    def volume_stats(self) -> Tuple[float, float]:
+        """(last candle volume, mean of the last 12 candles)"""
+        def compute():
+            volumes = self._volumes()
+            if volumes is None or len(volumes) == 0:
+                return 0.0, 0.0
+            return float(volumes[-1]), float(np.mean(volumes[-12:]))
+        return self._memo("volume_stats", compute)
+    
+    def candle_cvd(self) -> Dict[str, Any]:
+        """CVD, slope and simple price/CVD divergence from signed candle volume"""
+        def compute():
+            opens, closes, volumes = self._column('open'), self._column('close'), self._volumes()
+            if opens is None or closes is None or volumes is None:
+                return {}
+            price_changes = closes - opens
+            volume_delta = np.where(price_changes > 0, volumes,
+                                    np.where(price_changes < 0, -volumes, 0))
+            cvd = np.cumsum(volume_delta)
+            
+            divergence_strength = 0.0
+            divergence_type = None
+            if len(cvd) >= 10:
+                cvd_slope = float((cvd[-1] - cvd[-10]) / 10)
+                cvd_trend = cvd[-1] - cvd[-10]
+                price_trend = closes[-1] - closes[-10]
+                # Divergence: price and CVD moving in opposite directions
+                if (price_trend > 0 and cvd_trend < 0) or (price_trend < 0 and cvd_trend > 0):
+                    divergence_strength = min(1.0, abs(cvd_trend) / max(abs(price_trend), 1) * 10)
+                    divergence_type = "bearish" if price_trend > 0 else "bullish"
+            else:
+                cvd_slope = float((cvd[-1] - cvd[0]) / len(cvd)) if len(cvd) > 1 else 0.0
+            
+            return {
+                'cvd': float(cvd[-1]),
+                'cvd_slope': cvd_slope,
+                'divergence_strength': divergence_strength,
+                'divergence_type': divergence_type
+            }
+        return dict(self._memo("candle_cvd", compute))
+    
+    def m15_swings(self) -> Optional[List[Dict[str, Any]]]:
+        """Labeled swing dicts for BOS detection (None if they could not be computed)"""
+        def compute():
+            if self.candles_df is None:
+                return None
+            try:
+                return RangeBoundaryDetector.labeled_swing_dicts(self.candles_df)
+            except Exception as e:
+                logger.debug(f"Could not compute swings for range context: {e}")
+                return None
+        return self._memo("m15_swings", compute)
+
+
+def _context_version(candles_df: pd.DataFrame) -> Tuple:
+    """Length, last bar time and last-bar OHLCV: changes on a new or revised bar"""
+    last = candles_df.iloc[-1]
+    return (
+        len(candles_df),
+        candles_df.index[-1],
+        tuple(float(last[col]) if col in candles_df.columns else None
+              for col in ('open', 'high', 'low', 'close') + _VOLUME_COLUMNS)
+    )
+
+
+_range_contexts: "OrderedDict[Tuple[str, str], Tuple[Tuple, RangeContext]]" = OrderedDict()
+_range_contexts_lock = threading.Lock()
+_range_context_stats = {"hits": 0, "misses": 0}
+
+
+def get_range_context(symbol: Optional[str], timeframe: Optional[str],
+                      candles_df: Optional[pd.DataFrame]) -> RangeContext:
+    """RangeContext for this DataFrame; shared while (symbol, timeframe, last bar) is unchanged"""
+    if symbol is None or timeframe is None or candles_df is None or candles_df.empty:
+        return RangeContext(candles_df)
+    try:
+        version = _context_version(candles_df)
+    except Exception:
+        return RangeContext(candles_df)
+    
+    key = (symbol, timeframe)
+    with _range_contexts_lock:
+        held = _range_contexts.get(key)
+        if held is not None and held[0] == version:
+            _range_contexts.move_to_end(key)
+            _range_context_stats["hits"] += 1
+            return held[1]
+        context = RangeContext(candles_df)
+        _range_contexts[key] = (version, context)
+        _range_contexts.move_to_end(key)
+        while len(_range_contexts) > MAX_RANGE_CONTEXTS:
+            _range_contexts.popitem(last=False)
+        _range_context_stats["misses"] += 1
+        return context
+
+
+def clear_range_contexts() -> None:
+    """Drop cached range contexts (tests)"""
+    with _range_contexts_lock:
+        _range_contexts.clear()
+        _range_context_stats.update(hits=0, misses=0)
+
+
+def get_range_context_stats() -> Dict[str, Any]:
+    with _range_contexts_lock:
+        return {"contexts": len(_range_contexts), **_range_context_stats}
+
 
 def _detect_rejection_wick(
     recent_candles: List[Dict[str, Any]],
@@ -84,7 +298,8 @@ def _detect_rejection_wick(
     return False
 
 
-def _calculate_vwap_history(candles_df: Optional[pd.DataFrame], recent_candles: List[Dict[str, Any]], periods: int = 5) -> List[float]:
+def _calculate_vwap_history(candles_df: Optional[pd.DataFrame], recent_candles: List[Dict[str, Any]], periods: int = 5,
+                            context: Optional[RangeContext] = None) -> List[float]:
     """
     Calculate VWAP history from candles for momentum detection.
     
@@ -92,6 +307,7 @@ def _calculate_vwap_history(candles_df: Optional[pd.DataFrame], recent_candles:
         candles_df: DataFrame with OHLCV columns (preferred)
         recent_candles: List of candle dicts (fallback)
         periods: Number of periods to calculate VWAP for
+        context: Prepared RangeContext for candles_df (shared series)
     
     Returns:
         List of VWAP values (most recent first), or empty list if insufficient data
@@ -100,41 +316,8 @@ def _calculate_vwap_history(candles_df: Optional[pd.DataFrame], recent_candles:
     
     try:
         if candles_df is not None and not candles_df.empty and len(candles_df) >= periods:
-            # Use DataFrame (preferred)
-            if 'high' in candles_df.columns and 'low' in candles_df.columns and 'close' in candles_df.columns:
-                # Calculate typical price
-                typical_price = (candles_df['high'] + candles_df['low'] + candles_df['close']) / 3
-                
-                # Get volume (try different column names)
-                volume_col = None
-                for col in ['volume', 'tick_volume', 'volumes']:
-                    if col in candles_df.columns:
-                        volume_col = col
-                        break
-                
-                if volume_col:
-                    volumes = candles_df[volume_col].fillna(0)
-                else:
-                    # No volume data - use simple average
-                    volumes = pd.Series([1.0] * len(candles_df), index=candles_df.index)
-                
-                # Calculate rolling VWAP for last N periods
-                for i in range(min(periods, len(candles_df))):
-                    end_idx = len(candles_df) - i
-                    start_idx = max(0, end_idx - 20)  # Use last 20 candles for each VWAP
-                    
-                    window_tp = typical_price.iloc[start_idx:end_idx]
-                    window_vol = volumes.iloc[start_idx:end_idx]
-                    
-                    if window_vol.sum() > 0:
-                        vwap = (window_tp * window_vol).sum() / window_vol.sum()
-                        vwap_history.append(vwap)
-                    else:
-                        # Fallback to simple average
-                        vwap_history.append(window_tp.mean())
-                
-                # Reverse to get most recent first
-                vwap_history = vwap_history[::-1] if vwap_history else []
+            # Use DataFrame (preferred) - rolling 20-candle VWAP per period
+            vwap_history = (context or RangeContext(candles_df)).vwap_history(periods)
         
         elif recent_candles and len(recent_candles) >= periods * 4:  # Need enough candles
             # Use list of dicts (fallback)
@@ -182,7 +365,8 @@ def _calculate_vwap_history(candles_df: Optional[pd.DataFrame], recent_candles:
 
 
 def _calculate_bb_width_expansion(candles_df: Optional[pd.DataFrame], recent_candles: List[Dict[str, Any]], 
-                                   period: int = 20, lookback: int = 40) -> Optional[float]:
+                                   period: int = 20, lookback: int = 40,
+                                   context: Optional[RangeContext] = None) -> Optional[float]:
     """
     Calculate Bollinger Bands width expansion percentage.
     
@@ -191,6 +375,7 @@ def _calculate_bb_width_expansion(candles_df: Optional[pd.DataFrame], recent_can
         recent_candles: List of candle dicts (fallback)
         period: BB period (default: 20)
         lookback: Historical lookback for comparison (default: 40)
+        context: Prepared RangeContext for candles_df (shared series)
     
     Returns:
         BB width expansion percentage (positive = expanding, negative = contracting), or None if insufficient data
@@ -198,30 +383,7 @@ def _calculate_bb_width_expansion(candles_df: Optional[pd.DataFrame], recent_can
     try:
         if candles_df is not None and not candles_df.empty and len(candles_df) >= period + lookback:
             # Use DataFrame
-            closes = candles_df['close'].values
-            
-            # Calculate current BB width
-            current_window = closes[-period:]
-            current_sma = np.mean(current_window)
-            current_std = np.std(current_window)
-            current_bb_width = (current_std * 4) / current_sma * 100 if current_sma > 0 else 0  # As percentage
-            
-            # Calculate historical BB widths
-            historical_widths = []
-            for i in range(max(period, len(candles_df) - lookback), len(candles_df) - period):
-                if i >= period:
-                    hist_window = closes[i - period:i]
-                    hist_sma = np.mean(hist_window)
-                    hist_std = np.std(hist_window)
-                    if hist_sma > 0:
-                        hist_width = (hist_std * 4) / hist_sma * 100
-                        historical_widths.append(hist_width)
-            
-            if historical_widths:
-                avg_historical_width = np.mean(historical_widths)
-                if avg_historical_width > 0:
-                    expansion_pct = ((current_bb_width - avg_historical_width) / avg_historical_width) * 100
-                    return expansion_pct
+            return (context or RangeContext(candles_df)).bb_width_expansion(period, lookback)
         
         elif recent_candles and len(recent_candles) >= period + lookback:
             # Use list of dicts
@@ -262,36 +424,23 @@ def _calculate_bb_width_expansion(candles_df: Optional[pd.DataFrame], recent_can
     return None
 
 
-def _calculate_volume_from_candles(candles_df: Optional[pd.DataFrame], recent_candles: List[Dict[str, Any]]) -> Tuple[float, float]:
+def _calculate_volume_from_candles(candles_df: Optional[pd.DataFrame], recent_candles: List[Dict[str, Any]],
+                                   context: Optional[RangeContext] = None) -> Tuple[float, float]:
     """
     Calculate current volume and 1-hour average volume from candles.
     
     Args:
         candles_df: DataFrame with OHLCV columns (preferred)
         recent_candles: List of candle dicts (fallback)
+        context: Prepared RangeContext for candles_df (shared series)
     
     Returns:
         (volume_current, volume_1h_avg) tuple
     """
     try:
         if candles_df is not None and not candles_df.empty:
-            # Use DataFrame
-            volume_col = None
-            for col in ['volume', 'tick_volume', 'volumes']:
-                if col in candles_df.columns:
-                    volume_col = col
-                    break
-            
-            if volume_col:
-                volumes = candles_df[volume_col].fillna(0).values
-                
-                # Current volume (last candle)
-                volume_current = float(volumes[-1]) if len(volumes) > 0 else 0.0
-                
-                # 1-hour average (last 12 M5 candles = 1 hour)
-                volume_1h_avg = float(np.mean(volumes[-12:])) if len(volumes) >= 12 else float(np.mean(volumes)) if len(volumes) > 0 else 0.0
-                
-                return volume_current, volume_1h_avg
+            # Use DataFrame - last candle and 1-hour average (last 12 M5 candles)
+            return (context or RangeContext(candles_df)).volume_stats()
         
         elif recent_candles and len(recent_candles) > 0:
             # Use list of dicts
@@ -312,7 +461,8 @@ def _calculate_volume_from_candles(candles_df: Optional[pd.DataFrame], recent_ca
 
 
 def _calculate_cvd_data(candles_df: Optional[pd.DataFrame], recent_candles: List[Dict[str, Any]], 
-                        order_flow: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                        order_flow: Optional[Dict[str, Any]] = None,
+                        context: Optional[RangeContext] = None) -> Dict[str, Any]:
     """
     Calculate CVD (Cumulative Volume Delta) data for false range detection.
     
@@ -320,6 +470,7 @@ def _calculate_cvd_data(candles_df: Optional[pd.DataFrame], recent_candles: List
         candles_df: DataFrame with OHLCV columns (preferred)
         recent_candles: List of candle dicts (fallback)
         order_flow: Optional order flow data with CVD
+        context: Prepared RangeContext for candles_df (shared series)
     
     Returns:
         Dict with CVD data including divergence_strength, or empty dict if unavailable
@@ -347,57 +498,7 @@ def _calculate_cvd_data(candles_df: Optional[pd.DataFrame], recent_candles: List
         # Fallback: Calculate CVD from candles
         if candles_df is not None and not candles_df.empty and len(candles_df) >= 10:
             # Use DataFrame
-            if 'open' in candles_df.columns and 'close' in candles_df.columns:
-                price_changes = candles_df['close'].values - candles_df['open'].values
-                
-                volume_col = None
-                for col in ['volume', 'tick_volume', 'volumes']:
-                    if col in candles_df.columns:
-                        volume_col = col
-                        break
-                
-                if volume_col:
-                    volumes = candles_df[volume_col].fillna(0).values
-                    
-                    # Calculate volume delta (positive if close > open, negative if close < open)
-                    volume_delta = np.where(price_changes > 0, volumes, 
-                                          np.where(price_changes < 0, -volumes, 0))
-                    
-                    # Calculate cumulative volume delta (CVD)
-                    cvd = np.cumsum(volume_delta)
-                    current_cvd = float(cvd[-1])
-                    
-                    # Calculate CVD slope (rate of change)
-                    if len(cvd) >= 10:
-                        cvd_slope = float((cvd[-1] - cvd[-10]) / 10)
-                    else:
-                        cvd_slope = float((cvd[-1] - cvd[0]) / len(cvd)) if len(cvd) > 1 else 0.0
-                    
-                    # Simple divergence detection (compare recent CVD trend with price trend)
-                    if len(cvd) >= 10:
-                        recent_cvd = cvd[-10:]
-                        cvd_trend = recent_cvd[-1] - recent_cvd[0]
-                        
-                        recent_prices = candles_df['close'].values[-10:]
-                        price_trend = recent_prices[-1] - recent_prices[0]
-                        
-                        # Divergence: price and CVD moving in opposite directions
-                        if (price_trend > 0 and cvd_trend < 0) or (price_trend < 0 and cvd_trend > 0):
-                            divergence_strength = min(1.0, abs(cvd_trend) / max(abs(price_trend), 1) * 10)
-                            divergence_type = "bearish" if price_trend > 0 else "bullish"
-                        else:
-                            divergence_strength = 0.0
-                            divergence_type = None
-                    else:
-                        divergence_strength = 0.0
-                        divergence_type = None
-                    
-                    cvd_data = {
-                        'cvd': current_cvd,
-                        'cvd_slope': cvd_slope,
-                        'divergence_strength': divergence_strength,
-                        'divergence_type': divergence_type
-                    }
+            cvd_data = (context or RangeContext(candles_df)).candle_cvd()
         
         elif recent_candles and len(recent_candles) >= 10:
             # Use list of dicts
@@ -475,7 +576,8 @@ async def analyse_range_scalp_opportunity(
     strategy_filter: Optional[str] = None,
     check_risk_filters: bool = True,
     market_data: Optional[Dict] = None,
-    indicators: Optional[Dict] = None
+    indicators: Optional[Dict] = None,
+    early_exit: bool = True
 ) -> Dict[str, Any]:
     """
     Analyse range scalping opportunities for a symbol.
@@ -483,7 +585,7 @@ async def analyse_range_scalp_opportunity(
     Follows the execution flow pipeline:
     1. Range Detection Layer
     2. Data Quality Validation
-    3. Risk Filtering Layer
+    3. Risk Filtering Layer (confluence -> session -> trade activity -> false range -> range validity)
     4. Strategy Scoring Layer
     5. Return analysis results
     
@@ -493,10 +595,20 @@ async def analyse_range_scalp_opportunity(
         check_risk_filters: Whether to apply risk mitigation (default: true)
         market_data: Pre-fetched market data (optional)
         indicators: Pre-calculated indicators (optional)
+        early_exit: Stop the risk filters at the first hard reject (default: true); skipped
+            filters are listed in risk_checks["skipped_filters"] and their results are None
     
     Returns:
-        Analysis results with range structure, risk checks, top strategy, warnings
+        Analysis results with range structure, risk checks, top strategy, warnings, timings_ms
     """
+    started = time.perf_counter()
+    timings_ms: Dict[str, float] = {}
+    
+    def _lap(step: str, since: float) -> float:
+        now = time.perf_counter()
+        timings_ms[step] = round((now - since) * 1000, 3)
+        return now
+    
     try:
         # Load configurations
         config = load_range_scalping_config()
@@ -623,6 +735,7 @@ async def analyse_range_scalp_opportunity(
         
         # ========== STEP 1: RANGE DETECTION ==========
         logger.info(f"🔍 Detecting range for {symbol_normalized}...")
+        step_started = time.perf_counter()
         
         range_data = None
         range_detected = False
@@ -721,6 +834,8 @@ async def analyse_range_scalp_opportunity(
                 "warnings": ["Unable to detect range structure - market may be trending or data insufficient"]
             }
         
+        step_started = _lap("range_detection", step_started)
+        
         # ========== STEP 2: DATA QUALITY VALIDATION ==========
         data_quality_warnings = []
         if check_risk_filters:
@@ -739,11 +854,15 @@ async def analyse_range_scalp_opportunity(
             
             # Note: Don't block analysis if data quality fails - just warn
             # The risk filters will handle blocking trades
+            step_started = _lap("data_quality", step_started)
         
         # ========== STEP 3: RISK FILTERING LAYER ==========
         if check_risk_filters:
             logger.info(f"🔍 Applying risk filters for {symbol_normalized}...")
             
+            # Shared M15 series, computed once per bar across filters and calls
+            context = get_range_context(symbol_normalized, "M15", candles_df)
+            
             current_price = market_data.get("current_price", 0) if market_data else 0
             if current_price <= 0:
                 logger.warning(f"Invalid current_price: {current_price} for {symbol_normalized}")
@@ -755,45 +874,12 @@ async def analyse_range_scalp_opportunity(
                 price_mid=range_data.range_mid
             )
             
-            # 3-Confluence Rule
             range_width = range_data.range_high - range_data.range_low
             price_position = (current_price - range_data.range_low) / range_width if range_width > 0 else 0.5
-            
-            # Get RSI and check for extremes
-            rsi = indicators.get("rsi", 50) if indicators else 50
-            rsi_extreme = (rsi < 30) or (rsi > 70)
-            
-            # Check order flow signal
-            order_flow_signal = market_data.get("order_flow", {}).get("signal", "NEUTRAL") if market_data else "NEUTRAL"
-            tape_pressure = order_flow_signal in ["BULLISH", "BEARISH"]
-            
-            # Detect rejection wick from recent candles
             recent_candles = market_data.get("recent_candles", []) if market_data else []
-            rejection_wick = _detect_rejection_wick(
-                recent_candles=recent_candles,
-                range_high=range_data.range_high,
-                range_low=range_data.range_low,
-                atr=effective_atr
-            )
-            
-            signals = {
-                "rsi": rsi,
-                "rsi_extreme": rsi_extreme,
-                "rejection_wick": rejection_wick,  # Now calculated from candle analysis
-                "tape_pressure": tape_pressure,
-                "at_pdh": abs(current_price - range_data.range_high) < (effective_atr * 0.1) if effective_atr > 0 else False,
-                "at_pdl": abs(current_price - range_data.range_low) < (effective_atr * 0.1) if effective_atr > 0 else False
-            }
             
-            confluence_score, component_scores, missing_components = risk_filters.check_3_confluence_rule_weighted(
-                range_data=range_data,
-                price_position=price_position,
-                signals=signals,
-                atr=effective_atr
-            )
-            
-            # Calculate VWAP momentum for false range detection
-            vwap_history = _calculate_vwap_history(candles_df, recent_candles, periods=5)
+            # VWAP momentum (shared by false range and range validity)
+            vwap_history = _calculate_vwap_history(candles_df, recent_candles, periods=5, context=context)
             if vwap_history and len(vwap_history) >= 2:
                 vwap_slope_pct_atr = risk_filters.calculate_vwap_momentum(
                     vwap_values=vwap_history,
@@ -809,88 +895,146 @@ async def analyse_range_scalp_opportunity(
                     price_mid=range_data.range_mid
                 )
             
-            # Calculate CVD data for false range detection
-            order_flow = market_data.get("order_flow", {}) if market_data else {}
-            cvd_data = _calculate_cvd_data(candles_df, recent_candles, order_flow)
+            def _confluence():
+                # 3-Confluence Rule
+                # Get RSI and check for extremes
+                rsi = indicators.get("rsi", 50) if indicators else 50
+                rsi_extreme = (rsi < 30) or (rsi > 70)
+                
+                # Check order flow signal
+                order_flow_signal = market_data.get("order_flow", {}).get("signal", "NEUTRAL") if market_data else "NEUTRAL"
+                tape_pressure = order_flow_signal in ["BULLISH", "BEARISH"]
+                
+                # Detect rejection wick from recent candles
+                rejection_wick = _detect_rejection_wick(
+                    recent_candles=recent_candles,
+                    range_high=range_data.range_high,
+                    range_low=range_data.range_low,
+                    atr=effective_atr
+                )
+                
+                signals = {
+                    "rsi": rsi,
+                    "rsi_extreme": rsi_extreme,
+                    "rejection_wick": rejection_wick,  # Now calculated from candle analysis
+                    "tape_pressure": tape_pressure,
+                    "at_pdh": abs(current_price - range_data.range_high) < (effective_atr * 0.1) if effective_atr > 0 else False,
+                    "at_pdl": abs(current_price - range_data.range_low) < (effective_atr * 0.1) if effective_atr > 0 else False
+                }
+                
+                result = risk_filters.check_3_confluence_rule_weighted(
+                    range_data=range_data,
+                    price_position=price_position,
+                    signals=signals,
+                    atr=effective_atr
+                )
+                return result[0] >= 80, result
             
-            # Check false range
-            is_false_range, false_range_flags = risk_filters.detect_false_range(
-                range_data=range_data,
-                volume_trend=market_data.get("volume_trend", {}) if market_data else {},
-                candles_df=candles_df,  # Pass DataFrame if available
-                vwap_slope_pct_atr=vwap_slope_pct_atr,
-                cvd_data=cvd_data if cvd_data else None
-            )
+            def _session():
+                result = risk_filters.check_session_filters(
+                    current_time=None,  # Uses current time by default
+                    broker_timezone_offset_hours=config.get("broker_timezone", {}).get("offset_hours", 0)
+                )
+                return result[0], result
             
-            # Reuse VWAP momentum for range validity check (already calculated above)
+            def _trade_activity():
+                # Calculate price deviation (absolute distance from VWAP/range_mid)
+                price_deviation = abs(current_price - range_data.range_mid)
+                
+                # Get volume data - calculate from candles if not provided
+                volume_current = market_data.get("volume_current", 0) if market_data else 0
+                volume_1h_avg = market_data.get("volume_1h_avg", 0) if market_data else 0
+                
+                # If no volume data available, calculate from candles
+                if volume_current == 0 and volume_1h_avg == 0:
+                    calc_volume_current, calc_volume_1h_avg = _calculate_volume_from_candles(
+                        candles_df, recent_candles, context=context
+                    )
+                    if calc_volume_current > 0 and calc_volume_1h_avg > 0:
+                        volume_current = calc_volume_current
+                        volume_1h_avg = calc_volume_1h_avg
+                        logger.debug(f"Calculated volume from candles: current={volume_current:.2f}, 1h_avg={volume_1h_avg:.2f}")
+                    else:
+                        # Still no volume data - set to default to skip volume ratio check
+                        volume_current = 100
+                        volume_1h_avg = 100  # Ratio = 1.0, will pass volume check
+                        logger.debug(f"No volume data available for {symbol_normalized}, using fallback")
+                
+                # For cooldown: if no previous trades, set to large value to skip check
+                # (In production, this would query trade history)
+                minutes_since_last_trade = 999  # Skip cooldown if no trade tracking available
+                
+                # Get upcoming news events from news service
+                upcoming_news = []
+                if risk_filters.news_service:
+                    try:
+                        if hasattr(risk_filters.news_service, 'get_upcoming_events'):
+                            upcoming_news = risk_filters.news_service.get_upcoming_events(hours_ahead=24)
+                            if upcoming_news:
+                                logger.debug(f"Found {len(upcoming_news)} upcoming news events")
+                    except Exception as e:
+                        logger.debug(f"Error getting upcoming news: {e}")
+                
+                result = risk_filters.check_trade_activity_criteria(
+                    symbol=symbol_normalized,
+                    volume_current=volume_current,
+                    volume_1h_avg=volume_1h_avg,
+                    price_deviation_from_vwap=price_deviation,
+                    atr=effective_atr,
+                    minutes_since_last_trade=minutes_since_last_trade,
+                    upcoming_news=upcoming_news
+                )
+                return result[0], result
             
-            # Calculate BB width expansion from historical candles
-            bb_width_expansion = _calculate_bb_width_expansion(candles_df, recent_candles)
+            def _false_range():
+                # Calculate CVD data for false range detection
+                order_flow = market_data.get("order_flow", {}) if market_data else {}
+                cvd_data = _calculate_cvd_data(candles_df, recent_candles, order_flow, context=context)
+                
+                result = risk_filters.detect_false_range(
+                    range_data=range_data,
+                    volume_trend=market_data.get("volume_trend", {}) if market_data else {},
+                    candles_df=candles_df,  # Pass DataFrame if available
+                    vwap_slope_pct_atr=vwap_slope_pct_atr,
+                    cvd_data=cvd_data if cvd_data else None
+                )
+                return not result[0], result
             
-            # Check range validity
-            range_valid, invalidation_signals = risk_filters.check_range_validity(
-                range_data=range_data,
-                current_price=current_price,
-                recent_candles=market_data.get("recent_candles", []) if market_data else [],
-                vwap_slope_pct_atr=vwap_slope_pct_atr,
-                bb_width_expansion=bb_width_expansion,
-                candles_df_m15=candles_df,
-                atr_m15=effective_atr
-            )
+            def _range_validity():
+                # Calculate BB width expansion from historical candles
+                bb_width_expansion = _calculate_bb_width_expansion(candles_df, recent_candles, context=context)
+                
+                result = risk_filters.check_range_validity(
+                    range_data=range_data,
+                    current_price=current_price,
+                    recent_candles=recent_candles,
+                    vwap_slope_pct_atr=vwap_slope_pct_atr,
+                    bb_width_expansion=bb_width_expansion,
+                    candles_df_m15=candles_df,
+                    atr_m15=effective_atr,
+                    m15_swings=context.m15_swings()
+                )
+                return result[0], result
             
-            # Session filters
-            session_allows, session_reason = risk_filters.check_session_filters(
-                current_time=None,  # Uses current time by default
-                broker_timezone_offset_hours=config.get("broker_timezone", {}).get("offset_hours", 0)
+            # Cheapest filters first; the confluence score always runs (auto-execution reads it)
+            risk_passed, filter_results, filter_timings, skipped_filters = risk_filters.run_filter_pipeline(
+                [
+                    ("confluence", _confluence),
+                    ("session", _session),
+                    ("trade_activity", _trade_activity),
+                    ("false_range", _false_range),
+                    ("range_validity", _range_validity),
+                ],
+                early_exit=early_exit
             )
             
-            # Trade activity criteria
-            # Calculate price deviation (absolute distance from VWAP/range_mid)
-            price_deviation = abs(current_price - range_data.range_mid)
-            
-            # Get volume data - calculate from candles if not provided
-            volume_current = market_data.get("volume_current", 0) if market_data else 0
-            volume_1h_avg = market_data.get("volume_1h_avg", 0) if market_data else 0
-            
-            # If no volume data available, calculate from candles
-            if volume_current == 0 and volume_1h_avg == 0:
-                calc_volume_current, calc_volume_1h_avg = _calculate_volume_from_candles(candles_df, recent_candles)
-                if calc_volume_current > 0 and calc_volume_1h_avg > 0:
-                    volume_current = calc_volume_current
-                    volume_1h_avg = calc_volume_1h_avg
-                    logger.debug(f"Calculated volume from candles: current={volume_current:.2f}, 1h_avg={volume_1h_avg:.2f}")
-                else:
-                    # Still no volume data - set to default to skip volume ratio check
-                    volume_current = 100
-                    volume_1h_avg = 100  # Ratio = 1.0, will pass volume check
-                    logger.debug(f"No volume data available for {symbol_normalized}, using fallback")
-            
-            # For cooldown: if no previous trades, set to large value to skip check
-            # (In production, this would query trade history)
-            minutes_since_last_trade = 999  # Skip cooldown if no trade tracking available
-            
-            # Get upcoming news events from news service
-            upcoming_news = []
-            if risk_filters.news_service:
-                try:
-                    if hasattr(risk_filters.news_service, 'get_upcoming_events'):
-                        upcoming_news = risk_filters.news_service.get_upcoming_events(hours_ahead=24)
-                        if upcoming_news:
-                            logger.debug(f"Found {len(upcoming_news)} upcoming news events")
-                except Exception as e:
-                    logger.debug(f"Error getting upcoming news: {e}")
-            
-            trade_activity_sufficient, activity_failures = risk_filters.check_trade_activity_criteria(
-                symbol=symbol_normalized,
-                volume_current=volume_current,
-                volume_1h_avg=volume_1h_avg,
-                price_deviation_from_vwap=price_deviation,
-                atr=effective_atr,
-                minutes_since_last_trade=minutes_since_last_trade,
-                upcoming_news=upcoming_news
-            )
+            confluence_score, component_scores, missing_components = filter_results["confluence"]
+            session_allows, session_reason = filter_results.get("session", (None, None))
+            trade_activity_sufficient, activity_failures = filter_results.get("trade_activity", (None, []))
+            is_false_range, false_range_flags = filter_results.get("false_range", (None, []))
+            range_valid, invalidation_signals = filter_results.get("range_validity", (None, []))
             
-            # Nested range alignment check
+            # Nested range alignment check (informational - not a hard reject)
             # Try to detect nested ranges from market_data if available
             h1_range = None
             m5_range = None
@@ -910,15 +1054,6 @@ async def analyse_range_scalp_opportunity(
                 trade_direction="BUY" if price_position > 0.5 else "SELL"  # Simplified direction
             )
             
-            # Check if all risk filters pass
-            risk_passed = (
-                confluence_score >= 80 and
-                not is_false_range and
-                range_valid and
-                session_allows and
-                trade_activity_sufficient
-            )
-            
             risk_checks = {
                 "3_confluence_passed": confluence_score >= 80,
                 "confluence_score": confluence_score,
@@ -933,7 +1068,9 @@ async def analyse_range_scalp_opportunity(
                 "trade_activity_sufficient": trade_activity_sufficient,
                 "activity_failures": activity_failures,
                 "nested_ranges_aligned": nested_aligned,
-                "risk_passed": risk_passed
+                "risk_passed": risk_passed,
+                "skipped_filters": skipped_filters,
+                "filter_timings_ms": filter_timings
             }
             
             # NOTE: Even if risk filters fail, we still score strategies
@@ -945,15 +1082,17 @@ async def analyse_range_scalp_opportunity(
                     warnings_list.append(f"3-confluence score too low: {confluence_score}/100 (required: 80+)")
                 if is_false_range:
                     warnings_list.append(f"False range detected: {', '.join(false_range_flags)}")
-                if not range_valid:
+                if range_valid is False:
                     warnings_list.append(f"Range invalidated: {', '.join(invalidation_signals)}")
-                if not session_allows:
+                if session_allows is False:
                     warnings_list.append(f"Session filter blocked: {session_reason}")
-                if not trade_activity_sufficient:
+                if trade_activity_sufficient is False:
                     warnings_list.append(f"Trade activity insufficient: {', '.join(activity_failures)}")
                 
                 # Store warnings but continue to strategy scoring
                 data_quality_warnings.extend(warnings_list)
+            
+            step_started = _lap("risk_filters", step_started)
         
         else:
             risk_checks = {
@@ -989,6 +1128,7 @@ async def analyse_range_scalp_opportunity(
             session_info=session_info,
             adx_h1=adx_h1
         )
+        _lap("scoring", step_started)
         
         # Filter by strategy_filter if provided
         if strategy_filter and scored_strategies:
@@ -1051,8 +1191,10 @@ async def analyse_range_scalp_opportunity(
             "session_context": f"{session_info.get('name', 'Unknown')} session",
             "warnings": all_warnings if all_warnings else []
         }
+        _lap("total", started)
+        response["timings_ms"] = timings_ms
         
-        logger.info(f"✅ Range scalping analysis complete for {symbol_normalized}")
+        logger.info(f"✅ Range scalping analysis complete for {symbol_normalized} ({timings_ms['total']:.1f} ms)")
         
         return response
         
@@ -11,10 +11,14 @@ Implements:
 - Trade activity criteria
 - Nested range alignment
 - Adaptive anchor refresh
+- Filter pipeline runner (ordered hard rejects with early exit and per-filter timings)
+- Fresh candle checks reused until the candle would go stale
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass
 from pathlib import Path
@@ -27,6 +31,16 @@ from infra.session_analyzer import SessionAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# (symbol, timeframe) -> (fresh_until_ts, candle_ts, details) of the last fresh candle check
+_fresh_candles: Dict[Tuple[str, int], Tuple[float, float, Dict[str, Any]]] = {}
+_fresh_candles_lock = threading.Lock()
+
+
+def clear_candle_freshness_cache() -> None:
+    """Drop remembered fresh candle checks (tests)"""
+    with _fresh_candles_lock:
+        _fresh_candles.clear()
+
 
 class RangeScalpingRiskFilters:
     """
@@ -133,11 +147,8 @@ class RangeScalpingRiskFilters:
                 # Check M5 candles (primary timeframe for range scalping)
                 # Note: max_age_minutes is overridden by timeframe-specific thresholds in _check_candle_freshness
                 # M5 candles: Allow up to 5.5 min (5 min candle period + 0.5 min buffer for processing delay)
-                is_fresh, age_minutes, details = self._check_candle_freshness(
-                    symbol, 
-                    max_age_minutes=30,  # Fallback (not used for M5 due to timeframe-specific threshold)
-                    timeframe=mt5.TIMEFRAME_M5,
-                    force_fresh=False  # Don't shutdown - use existing MT5Service connection
+                is_fresh, age_minutes, details = self._check_candle_freshness_cached(
+                    symbol, timeframe=mt5.TIMEFRAME_M5
                 )
                 if not is_fresh:
                     all_available = False
@@ -184,6 +195,45 @@ class RangeScalpingRiskFilters:
         
         return all_available, quality_report, warnings
     
+    def _check_candle_freshness_cached(
+        self,
+        symbol: str,
+        timeframe: int = mt5.TIMEFRAME_M5
+    ) -> Tuple[bool, float, Dict[str, Any]]:
+        """
+        _check_candle_freshness, reusing the last fresh result until it would go stale.
+
+        A candle that passed the check stays fresh until candle_time + threshold_used
+        (a newer candle only makes it fresher), so repeated analyses in that window skip
+        the candle database / MT5 queries. Stale results are never reused.
+        """
+        key = (symbol, timeframe)
+        now = time.time()
+        with _fresh_candles_lock:
+            held = _fresh_candles.get(key)
+        if held is not None and now < held[0]:
+            return True, (now - held[1]) / 60, dict(held[2], cached=True)
+
+        is_fresh, age_minutes, details = self._check_candle_freshness(
+            symbol,
+            max_age_minutes=30,  # Fallback (not used for M5 due to timeframe-specific threshold)
+            timeframe=timeframe,
+            force_fresh=False  # Don't shutdown - use existing MT5Service connection
+        )
+        if is_fresh and details.get("candle_time") and details.get("threshold_used"):
+            try:
+                candle_time = datetime.fromisoformat(details["candle_time"])
+                if candle_time.tzinfo is None:
+                    candle_time = candle_time.replace(tzinfo=timezone.utc)
+                candle_ts = candle_time.timestamp()
+                fresh_until = candle_ts + float(details["threshold_used"]) * 60
+                if fresh_until > now:
+                    with _fresh_candles_lock:
+                        _fresh_candles[key] = (fresh_until, candle_ts, details)
+            except (TypeError, ValueError) as e:
+                logger.debug(f"Not caching candle freshness for {symbol}: {e}")
+        return is_fresh, age_minutes, details
+
     def _check_candle_freshness(
         self,
         symbol: str,
@@ -1416,7 +1466,8 @@ class RangeScalpingRiskFilters:
         vwap_slope_pct_atr: Optional[float] = None,
         bb_width_expansion: Optional[float] = None,
         candles_df_m15: Optional[pd.DataFrame] = None,
-        atr_m15: Optional[float] = None
+        atr_m15: Optional[float] = None,
+        m15_swings: Optional[List[Dict[str, Any]]] = None
     ) -> Tuple[bool, List[str]]:
         """
         Check if range is still valid for trading.
@@ -1440,7 +1491,8 @@ class RangeScalpingRiskFilters:
             vwap_slope_pct_atr=vwap_slope_pct_atr,
             bb_width_expansion=bb_width_expansion,
             candles_df_m15=candles_df_m15,
-            atr_m15=atr_m15
+            atr_m15=atr_m15,
+            m15_swings=m15_swings
         )
         
         # Return inverted (is_valid = not is_invalidated)
@@ -1589,6 +1641,40 @@ class RangeScalpingRiskFilters:
         sufficient = len(failures) == 0
         return sufficient, failures
     
+    def run_filter_pipeline(
+        self,
+        filters: List[Tuple[str, Callable[[], Tuple[bool, Any]]]],
+        early_exit: bool = True
+    ) -> Tuple[bool, Dict[str, Any], Dict[str, float], List[str]]:
+        """
+        Run hard-reject filters in order (cheapest first), timing each one.
+
+        Each filter is a (name, fn) pair; fn() returns (passed, result). With early_exit,
+        the filters after the first rejection are not run and are reported as skipped.
+
+        Returns:
+            (all_passed, results_by_name, timings_ms, skipped_names)
+        """
+        results: Dict[str, Any] = {}
+        timings_ms: Dict[str, float] = {}
+        skipped: List[str] = []
+        all_passed = True
+        
+        for name, fn in filters:
+            if early_exit and not all_passed:
+                skipped.append(name)
+                continue
+            started = time.perf_counter()
+            passed, result = fn()
+            timings_ms[name] = round((time.perf_counter() - started) * 1000, 3)
+            results[name] = result
+            if not passed:
+                all_passed = False
+                if early_exit:
+                    logger.debug(f"Range filter '{name}' rejected - skipping remaining filters")
+        
+        return all_passed, results, timings_ms, skipped
+    
     def check_nested_range_alignment(
         self,
         h1_range: Optional[RangeStructure],
@@ -0,0 +1,306 @@
+"""
+Rolling Correlation Engine
+Incremental cross-asset return statistics for tracked symbols and reference assets
+(DXY, SP500, US10Y, NASDAQ, BTC, ETH ...).
+
+- Each series keeps its recent closes and per-bar returns on a common bar grid
+- Every pair of series keeps prefix sums of aligned returns (x, y, x², y², xy),
+  updated in O(1) when a bar arrives for the second series of the pair
+- Pearson correlation / beta / covariance for any window are served from the prefix
+  sums (window lookup is a binary search), no re-alignment or re-computation
+- The last bar may be revised (forming bar) without breaking the running sums
+"""
+
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def to_epoch_seconds(times: Any) -> np.ndarray:
+    """Bar times (datetime-like, tz-aware or naive UTC, or epoch seconds) as int64 epoch seconds"""
+    series = pd.Series(times)
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=np.int64)
+    stamps = pd.to_datetime(series, utc=True)
+    return ((stamps - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+
+
+class _SeriesBuffer:
+    """Recent closes and returns of one series, keyed by bar bucket"""
+
+    __slots__ = ("buckets", "closes", "returns", "prev_close", "capacity")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.buckets: deque = deque(maxlen=capacity)
+        self.closes: deque = deque(maxlen=capacity)
+        self.returns: "OrderedDict[int, float]" = OrderedDict()
+        self.prev_close: Optional[float] = None  # close before the last bar (for revisions)
+
+    @property
+    def last_bucket(self) -> Optional[int]:
+        return self.buckets[-1] if self.buckets else None
+
+    def set_return(self, bucket: int, ret: float):
+        self.returns[bucket] = ret
+        self.returns.move_to_end(bucket)
+        while len(self.returns) > self.capacity:
+            self.returns.popitem(last=False)
+
+
+class _PairStats:
+    """Prefix sums of aligned (x, y) returns for one ordered pair"""
+
+    __slots__ = ("buckets", "cum", "size", "max_window")
+
+    def __init__(self, max_window: int):
+        self.max_window = max_window
+        capacity = 2 * max_window
+        self.buckets = np.zeros(capacity, dtype=np.int64)
+        self.cum = np.zeros((capacity + 1, 5))  # cum[i] = sums over the first i entries
+        self.size = 0
+
+    @staticmethod
+    def _terms(x: float, y: float) -> np.ndarray:
+        return np.array([x, y, x * x, y * y, x * y])
+
+    def push(self, bucket: int, x: float, y: float):
+        if self.size == len(self.buckets):
+            self._rebase()
+        self.buckets[self.size] = bucket
+        self.cum[self.size + 1] = self.cum[self.size] + self._terms(x, y)
+        self.size += 1
+
+    def revise_last(self, bucket: int, x: float, y: float) -> bool:
+        if self.size == 0 or self.buckets[self.size - 1] != bucket:
+            return False
+        self.cum[self.size] = self.cum[self.size - 1] + self._terms(x, y)
+        return True
+
+    def _rebase(self):
+        """Keep the newest max_window entries (amortized O(1) per push)"""
+        drop = self.size - self.max_window
+        self.buckets[: self.max_window] = self.buckets[drop: self.size]
+        self.cum[: self.max_window + 1] = self.cum[drop: self.size + 1] - self.cum[drop]
+        self.size = self.max_window
+
+    def window_sums(self, start_exclusive: int, end_inclusive: int) -> Tuple[int, np.ndarray]:
+        buckets = self.buckets[: self.size]
+        i0 = int(np.searchsorted(buckets, start_exclusive, side="right"))
+        i1 = int(np.searchsorted(buckets, end_inclusive, side="right"))
+        if i1 <= i0:
+            return 0, np.zeros(5)
+        return i1 - i0, self.cum[i1] - self.cum[i0]
+
+
+class RollingCorrelationEngine:
+    """
+    Aligned return buffers and O(1)-update pair statistics for all tracked series.
+
+    Bars are bucketed on a fixed grid (default M5). Updates must be in time order per
+    series; a bar in the same bucket as the last one revises it (forming bar), older
+    bars are ignored.
+    """
+
+    def __init__(self, bar_seconds: int = 300, max_window_bars: int = 2016):
+        self.bar_seconds = bar_seconds
+        self.max_window_bars = max_window_bars
+        self._series: Dict[str, _SeriesBuffer] = {}
+        self._pairs: Dict[Tuple[str, str], _PairStats] = {}
+        self._lock = threading.RLock()
+        self.late_bars = 0
+
+    # ----------------------------------------------------------------- ingest
+
+    def _bucket(self, epoch_seconds: int) -> int:
+        return int(epoch_seconds) - int(epoch_seconds) % self.bar_seconds
+
+    @staticmethod
+    def _pair_key(a: str, b: str) -> Tuple[str, str]:
+        return (a, b) if a <= b else (b, a)
+
+    def update(self, series: str, epoch_seconds: int, close: float):
+        """Add (or revise) one bar close"""
+        if close is None or not np.isfinite(close) or close <= 0:
+            return
+        bucket = self._bucket(epoch_seconds)
+        with self._lock:
+            buf = self._series.get(series)
+            if buf is None:
+                buf = self._series[series] = _SeriesBuffer(self.max_window_bars + 1)
+
+            last = buf.last_bucket
+            if last is not None and bucket < last:
+                self.late_bars += 1
+                return
+
+            if last is not None and bucket == last:
+                buf.closes[-1] = close
+                if buf.prev_close is None:
+                    return
+                ret = close / buf.prev_close - 1.0
+                buf.set_return(bucket, ret)
+                self._on_return(series, bucket, ret, revise=True)
+                return
+
+            prev = buf.closes[-1] if buf.closes else None
+            buf.prev_close = prev
+            buf.buckets.append(bucket)
+            buf.closes.append(close)
+            if prev is None:
+                return
+            ret = close / prev - 1.0
+            buf.set_return(bucket, ret)
+            self._on_return(series, bucket, ret, revise=False)
+
+    def _on_return(self, series: str, bucket: int, ret: float, revise: bool):
+        for other, other_buf in self._series.items():
+            if other == series:
+                continue
+            other_ret = other_buf.returns.get(bucket)
+            if other_ret is None:
+                continue
+            key = self._pair_key(series, other)
+            pair = self._pairs.get(key)
+            if pair is None:
+                pair = self._pairs[key] = _PairStats(self.max_window_bars)
+            x, y = (ret, other_ret) if key[0] == series else (other_ret, ret)
+            if not (revise and pair.revise_last(bucket, x, y)):
+                pair.push(bucket, x, y)
+
+    def ingest(self, series: str, times: Iterable[Any], closes: Iterable[float]) -> int:
+        """Add the bars newer than (or revising) the last held bar; returns bars applied"""
+        epochs = to_epoch_seconds(list(times) if not isinstance(times, (pd.Series, np.ndarray)) else times)
+        closes = np.asarray(closes, dtype=float)
+        last = self.last_time(series)
+        start = 0 if last is None else int(np.searchsorted(epochs, last, side="left"))
+        with self._lock:
+            for i in range(start, len(epochs)):
+                self.update(series, int(epochs[i]), float(closes[i]))
+        return len(epochs) - start
+
+    def ingest_bars(self, series: str, bars: Optional[pd.DataFrame]) -> int:
+        if bars is None or len(bars) == 0 or "time" not in bars or "close" not in bars:
+            return 0
+        return self.ingest(series, bars["time"], bars["close"])
+
+    # ----------------------------------------------------------------- lookups
+
+    def has(self, series: str) -> bool:
+        return series in self._series
+
+    def last_time(self, series: str) -> Optional[int]:
+        buf = self._series.get(series)
+        return buf.last_bucket if buf else None
+
+    def closes(self, series: str, count: Optional[int] = None) -> np.ndarray:
+        buf = self._series.get(series)
+        if buf is None:
+            return np.array([])
+        values = np.fromiter(buf.closes, dtype=float, count=len(buf.closes))
+        return values if count is None else values[-count:]
+
+    def change_pct(self, series: str, bars: int) -> Optional[float]:
+        """Percent change from the close ``bars`` bars back (inclusive) to the latest close"""
+        closes = self.closes(series)
+        if len(closes) < bars or bars < 1:
+            return None
+        return (closes[-1] - closes[-bars]) / closes[-bars] * 100
+
+    def change(self, series: str, bars: int) -> Optional[float]:
+        """Absolute change over the last ``bars`` bars (e.g. yields)"""
+        closes = self.closes(series)
+        if len(closes) < bars or bars < 1:
+            return None
+        return float(closes[-1] - closes[-bars])
+
+    def aligned_closes(self, a: str, b: str, count: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Closes of a and b on their common buckets (oldest first)"""
+        buf_a, buf_b = self._series.get(a), self._series.get(b)
+        if buf_a is None or buf_b is None:
+            return np.array([]), np.array([])
+        b_by_bucket = dict(zip(buf_b.buckets, buf_b.closes))
+        pairs = [(c, b_by_bucket[t]) for t, c in zip(buf_a.buckets, buf_a.closes) if t in b_by_bucket]
+        if count is not None:
+            pairs = pairs[-count:]
+        if not pairs:
+            return np.array([]), np.array([])
+        xs, ys = zip(*pairs)
+        return np.array(xs), np.array(ys)
+
+    def pair_stats(self, a: str, b: str, window_minutes: Optional[int] = None,
+                   anchor: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Correlation/beta of a's returns vs b's over the window ending at ``anchor``
+        (default: a's latest bar). beta is a's sensitivity to b (cov / var(b)).
+        """
+        with self._lock:
+            key = self._pair_key(a, b)
+            pair = self._pairs.get(key)
+            if anchor is None:
+                anchor = self.last_time(a)
+            if pair is None or anchor is None:
+                return {"n": 0, "correlation": None, "beta": None, "covariance": None}
+            start = anchor - window_minutes * 60 if window_minutes else -1
+            n, sums = pair.window_sums(start, anchor)
+
+        if key[0] != a:
+            sums = sums[[1, 0, 3, 2, 4]]
+        sx, sy, sxx, syy, sxy = sums
+        result = {"n": n, "correlation": None, "beta": None, "covariance": None}
+        if n < 2:
+            return result
+        cov = (sxy - sx * sy / n) / (n - 1)
+        var_x = max(0.0, (sxx - sx * sx / n) / (n - 1))
+        var_y = max(0.0, (syy - sy * sy / n) / (n - 1))
+        result["covariance"] = float(cov)
+        if var_y > 0:
+            result["beta"] = float(cov / var_y)
+        if var_x > 0 and var_y > 0:
+            result["correlation"] = float(np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0))
+        return result
+
+    def correlation(self, a: str, b: str, window_minutes: Optional[int] = None) -> Optional[float]:
+        return self.pair_stats(a, b, window_minutes)["correlation"]
+
+    def matrix(self, series: Optional[List[str]] = None, window_minutes: Optional[int] = None) -> pd.DataFrame:
+        """Correlation matrix for the given series (default: all tracked)"""
+        names = list(series or self._series)
+        out = pd.DataFrame(np.nan, index=names, columns=names)
+        for i, a in enumerate(names):
+            out.iloc[i, i] = 1.0
+            for j in range(i + 1, len(names)):
+                corr = self.correlation(a, names[j], window_minutes)
+                if corr is not None:
+                    out.iloc[i, j] = out.iloc[j, i] = corr
+        return out
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "series": len(self._series),
+            "pairs": len(self._pairs),
+            "late_bars": self.late_bars,
+            "bar_seconds": self.bar_seconds,
+            "max_window_bars": self.max_window_bars,
+        }
+
+
+# Global engine instance (shared by every CorrelationContextCalculator in the process)
+_engine: Optional[RollingCorrelationEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_rolling_correlation_engine() -> RollingCorrelationEngine:
+    """Get global rolling correlation engine instance"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = RollingCorrelationEngine()
+    return _engine
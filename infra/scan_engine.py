@@ -0,0 +1,302 @@
+"""
+Scan Engine
+One market scan per process behind that process's signal consumers (the Discord
+scanner in chatgpt_bot, the Telegram SignalScanner job in trade_bot). The bots run as
+separate processes, so each has its own engine, snapshot cache and enrichment; there is
+no cross-process sharing.
+
+- Runs once per bar close: the first caller in a bar scans, later callers in the same
+  bar get the same candidates (no re-fetch, no re-publish)
+- Market data is fetched once per symbol per bar (shared snapshot, also served to
+  other readers via ``get_multi``), enriched concurrently in a thread pool and decided
+  in one batched ``decide_trades()`` call
+- Decision inputs are the bridge payloads, or whatever the process's input builder
+  derives from the snapshot (the Telegram bot decides on feature-builder output)
+- New candidates are published to every subscribed consumer
+- Exposes per-symbol scan latency and fetch / duplicate-fetch counts
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from decision_engine import decide_trades, frames_from_payloads
+
+logger = logging.getLogger(__name__)
+
+DECISION_TIMEFRAMES = ("M5", "M15", "M30", "H1")
+
+
+@dataclass
+class ScanCandidate:
+    """Decision for one symbol at one bar close"""
+    symbol: str
+    bar_time: int
+    rec: Dict[str, Any]
+    timeframes: Dict[str, Dict[str, Any]]  # enriched decision payloads (M5..H1)
+    multi: Dict[str, Dict[str, Any]] = field(repr=False, default_factory=dict)  # raw snapshot
+    tech: Dict[str, Any] = field(repr=False, default_factory=dict)  # input builder output (if any)
+    latency_ms: float = 0.0
+
+    @property
+    def direction(self) -> str:
+        return self.rec.get("direction", "HOLD")
+
+    @property
+    def confidence(self) -> int:
+        return self.rec.get("confidence", 0)
+
+
+@dataclass
+class _SymbolLatency:
+    scans: int = 0
+    last_ms: float = 0.0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def record(self, ms: float):
+        self.scans += 1
+        self.last_ms = ms
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "scans": self.scans,
+            "last_ms": round(self.last_ms, 2),
+            "avg_ms": round(self.total_ms / self.scans, 2) if self.scans else 0.0,
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class ScanEngine:
+    """Bar-close market scan shared by the signal consumers of one process"""
+
+    def __init__(self, bridge=None, enrichment=None, bar_seconds: int = 300,
+                 close_delay_s: float = 5.0, max_workers: int = 4,
+                 clock: Callable[[], float] = time.time,
+                 input_builder: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None):
+        """
+        Args:
+            bridge: IndicatorBridge-like object with get_multi(symbol) (created lazily)
+            enrichment: Optional BinanceEnrichment-like object with enrich_timeframe()
+            input_builder: Optional (symbol, snapshot) -> dict whose M5..H1 entries are the
+                decision inputs (default: the snapshot's own timeframe payloads)
+            bar_seconds: Scan bar (one scan per symbol per bar)
+            close_delay_s: Grace period after the bar closes before it counts as closed
+        """
+        self._bridge = bridge
+        self.enrichment = enrichment
+        self.input_builder = input_builder
+        self.bar_seconds = bar_seconds
+        self.close_delay_s = close_delay_s
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan-engine")
+
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+        self._snapshots: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._fetched_bars: Dict[str, int] = {}
+        self._candidates: Dict[str, ScanCandidate] = {}
+        self._subscribers: Dict[str, Tuple[Callable, Optional[asyncio.AbstractEventLoop]]] = {}
+        self._latency: Dict[str, _SymbolLatency] = {}
+        self._stats = {
+            "scans": 0,
+            "symbols_scanned": 0,
+            "fetch_requests": 0,
+            "fetches": 0,
+            "shared_hits": 0,
+            "duplicate_fetches": 0,
+            "published": 0,
+            "errors": 0,
+            "last_scan_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------- config
+
+    @property
+    def bridge(self):
+        if self._bridge is None:
+            from infra.indicator_bridge import IndicatorBridge
+            self._bridge = IndicatorBridge()
+        return self._bridge
+
+    def set_enrichment(self, enrichment):
+        self.enrichment = enrichment
+
+    def set_input_builder(self, input_builder: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]]):
+        self.input_builder = input_builder
+
+    def current_bar(self) -> int:
+        """Open time of the last bar considered closed"""
+        closed = self.clock() - self.close_delay_s
+        return int(closed // self.bar_seconds) * self.bar_seconds - self.bar_seconds
+
+    def seconds_to_next_scan(self) -> float:
+        """Seconds until the next bar counts as closed (for scheduling scans)"""
+        now = self.clock()
+        next_close = (int(now // self.bar_seconds) + 1) * self.bar_seconds + self.close_delay_s
+        if next_close - now > self.bar_seconds:
+            next_close -= self.bar_seconds
+        return max(0.0, next_close - now)
+
+    # -------------------------------------------------------------- consumers
+
+    def subscribe(self, name: str, callback: Callable[[List[ScanCandidate]], Any],
+                  loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Register a consumer for new candidates (replaces a consumer with the same name).
+        Coroutine callbacks are scheduled on ``loop``; plain callbacks run in the scanning thread.
+        """
+        if inspect.iscoroutinefunction(callback) and loop is None:
+            raise ValueError(f"Scan consumer {name} is a coroutine function but no loop was given")
+        with self._lock:
+            self._subscribers[name] = (callback, loop)
+
+    def unsubscribe(self, name: str):
+        with self._lock:
+            self._subscribers.pop(name, None)
+
+    def _publish(self, candidates: List[ScanCandidate]):
+        if not candidates:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for name, (callback, loop) in subscribers:
+            try:
+                if loop is not None and inspect.iscoroutinefunction(callback):
+                    asyncio.run_coroutine_threadsafe(callback(candidates), loop)
+                else:
+                    callback(candidates)
+                self._stats["published"] += len(candidates)
+            except Exception as e:
+                logger.error(f"Scan consumer {name} failed: {e}", exc_info=True)
+
+    # ------------------------------------------------------------ market data
+
+    def get_multi(self, symbol: str, bar: Optional[int] = None) -> Dict[str, Any]:
+        """Multi-timeframe snapshot for the bar, fetched at most once per symbol per bar"""
+        bar = self.current_bar() if bar is None else bar
+        with self._lock:
+            self._stats["fetch_requests"] += 1
+            lock = self._symbol_locks.setdefault(symbol, threading.Lock())
+        with lock:
+            snapshot = self._snapshots.get(symbol)
+            if snapshot is not None and snapshot[0] == bar:
+                self._stats["shared_hits"] += 1
+                return snapshot[1]
+            if self._fetched_bars.get(symbol) == bar:
+                self._stats["duplicate_fetches"] += 1  # retry after an empty fetch
+            multi = self.bridge.get_multi(symbol) or {}
+            self._stats["fetches"] += 1
+            self._fetched_bars[symbol] = bar
+            if multi:
+                self._snapshots[symbol] = (bar, multi)
+            return multi
+
+    def _prepare(self, symbol: str, bar: int) -> Tuple[Optional[tuple], Dict[str, Any], Dict[str, Any], float]:
+        """Fetch, build decision inputs and enrich one symbol (runs in the engine's thread pool)"""
+        start = time.perf_counter()
+        multi = self.get_multi(symbol, bar)
+        if not multi or "M5" not in multi:
+            return None, multi, {}, (time.perf_counter() - start) * 1000
+        tech = self.input_builder(symbol, multi) if self.input_builder is not None else None
+        source = multi if tech is None else tech
+        if self.enrichment is not None:
+            payloads = tuple(
+                self.enrichment.enrich_timeframe(symbol, source.get(tf) or {}, tf) for tf in DECISION_TIMEFRAMES
+            )
+        else:
+            payloads = tuple(dict(source.get(tf) or {}) for tf in DECISION_TIMEFRAMES)
+        return payloads, multi, tech or {}, (time.perf_counter() - start) * 1000
+
+    # ------------------------------------------------------------------- scan
+
+    def scan(self, symbols: Sequence[str], force: bool = False) -> List[ScanCandidate]:
+        """
+        Candidates for the last closed bar. Symbols already scanned in this bar are
+        served from the previous result unless ``force`` is set.
+        """
+        bar = self.current_bar()
+        with self._scan_lock:
+            todo = [
+                s for s in symbols
+                if force or s not in self._candidates or self._candidates[s].bar_time != bar
+            ]
+            fresh = self._scan(todo, bar) if todo else []
+        self._publish(fresh)
+        return [self._candidates[s] for s in symbols if s in self._candidates and self._candidates[s].bar_time == bar]
+
+    async def ascan(self, symbols: Sequence[str], force: bool = False) -> List[ScanCandidate]:
+        """Async scan() (runs off the event loop)"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.scan, list(symbols), force)
+
+    def _scan(self, symbols: List[str], bar: int) -> List[ScanCandidate]:
+        start = time.perf_counter()
+        prepared = []
+        futures = {s: self._executor.submit(self._prepare, s, bar) for s in symbols}
+        for symbol, future in futures.items():
+            try:
+                payloads, multi, tech, ms = future.result()
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error(f"Scan failed for {symbol}: {e}")
+                continue
+            if payloads is not None:
+                prepared.append((symbol, payloads, multi, tech, ms))
+
+        candidates = []
+        if prepared:
+            decide_start = time.perf_counter()
+            recs = decide_trades(frames_from_payloads([p[1] for p in prepared]), [p[0] for p in prepared])
+            decide_ms = (time.perf_counter() - decide_start) * 1000 / len(prepared)
+            for (symbol, payloads, multi, tech, ms), rec in zip(prepared, recs):
+                latency = ms + decide_ms
+                candidate = ScanCandidate(
+                    symbol=symbol, bar_time=bar, rec=rec,
+                    timeframes=dict(zip(DECISION_TIMEFRAMES, payloads)), multi=multi, tech=tech,
+                    latency_ms=latency,
+                )
+                self._candidates[symbol] = candidate
+                self._latency.setdefault(symbol, _SymbolLatency()).record(latency)
+                candidates.append(candidate)
+
+        self._stats["scans"] += 1
+        self._stats["symbols_scanned"] += len(candidates)
+        self._stats["last_scan_ms"] = (time.perf_counter() - start) * 1000
+        logger.debug(
+            f"Scan engine: {len(candidates)}/{len(symbols)} symbols in {self._stats['last_scan_ms']:.0f}ms"
+        )
+        return candidates
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["last_scan_ms"] = round(stats["last_scan_ms"], 2)
+        stats["latency_ms"] = {s: lat.as_dict() for s, lat in self._latency.items()}
+        stats["subscribers"] = sorted(self._subscribers)
+        return stats
+
+
+_engine: Optional[ScanEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_scan_engine() -> ScanEngine:
+    """Scan engine of this process (each bot process - Telegram, Discord - has its own)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ScanEngine()
+        return _engine
+
+
+def set_scan_engine(engine: Optional[ScanEngine]):
+    global _engine
+    with _engine_lock:
+        _engine = engine
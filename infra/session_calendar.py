@@ -0,0 +1,224 @@
+"""
+Session Calendar - precomputed session, kill-zone, weekend and market-hours boundaries.
+
+SessionHelpers, detect_session, the DTMS regime classifier, WeekendProfileManager and the
+auto-execution weekend checks all answer "which window is this time in" from UTC clock
+rules; the calendar evaluates those rules once per day for the next N days and answers
+lookups with a binary search over the boundaries.
+
+- Layers: session (ASIAN/LONDON/OVERLAP/NY/POST_NY), kill_zone, weekend (BTC weekend
+  profile, Fri 23:00 -> Mon 03:00), weekend_subsession, market_open (per symbol: crypto
+  trades 24/7, everything else is closed Fri 21:00 -> Sun 22:00)
+- span(layer, when) returns the window containing ``when`` and when it ends; next_start()
+  gives the next time a window begins (used for scheduler wake-ups)
+- Calendars are cached per market and day and rebuilt when the UTC day rolls over;
+  historical lookups (e.g. plan creation times) build a calendar around that day
+- All boundaries are on the hour; naive datetimes are treated as UTC
+"""
+
+import bisect
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DAYS = 7
+MAX_CALENDARS = 32
+
+# Session definitions (UTC hours, end exclusive)
+SESSION_HOURS: Tuple[Tuple[str, int, int], ...] = (
+    ("ASIAN", 0, 8),
+    ("LONDON", 8, 13),
+    ("OVERLAP", 13, 16),  # London-NY overlap
+    ("NY", 16, 21),
+    ("POST_NY", 21, 24),
+)
+KILL_ZONE_SESSIONS = frozenset({"LONDON", "OVERLAP", "NY"})
+CRYPTO_PREFIXES = ("BTC", "ETH")
+
+
+def _session(weekday: int, hour: int) -> str:
+    for name, start, end in SESSION_HOURS:
+        if start <= hour < end:
+            return name
+    return "ASIAN"
+
+
+def _weekend(weekday: int, hour: int) -> bool:
+    """Weekend trading profile: Friday 23:00 UTC -> Monday 03:00 UTC"""
+    return (weekday == 4 and hour >= 23) or weekday in (5, 6) or (weekday == 0 and hour < 3)
+
+
+def _weekend_subsession(weekday: int, hour: int) -> Optional[str]:
+    if not _weekend(weekday, hour):
+        return None
+    if weekday == 4:
+        return "ASIAN_RETAIL_BURST"
+    if weekday == 5:
+        if hour < 6:
+            return "ASIAN_RETAIL_BURST"
+        return "LOW_LIQUIDITY_RANGE" if hour < 18 else "DEAD_ZONE"
+    if weekday == 6:
+        if hour < 12:
+            return "DEAD_ZONE"
+        return "CME_ANTICIPATION" if hour < 22 else "CME_GAP_REVERSION"
+    return "CME_GAP_REVERSION"
+
+
+def _fx_open(weekday: int, hour: int) -> bool:
+    """Broker hours for non-crypto symbols: closed Friday 21:00 UTC -> Sunday 22:00 UTC"""
+    return not ((weekday == 4 and hour >= 21) or weekday == 5 or (weekday == 6 and hour < 22))
+
+
+LAYERS: Dict[str, Callable[[int, int], Any]] = {
+    "session": _session,
+    "kill_zone": lambda weekday, hour: _session(weekday, hour) in KILL_ZONE_SESSIONS,
+    "weekend": _weekend,
+    "weekend_subsession": _weekend_subsession,
+}
+
+
+def market_of(symbol: Optional[str]) -> str:
+    """Market-hours class of a symbol ("crypto" or "fx")"""
+    if symbol and symbol.upper().startswith(CRYPTO_PREFIXES):
+        return "crypto"
+    return "fx"
+
+
+def _market_layer(market: str) -> Callable[[int, int], bool]:
+    return (lambda weekday, hour: True) if market == "crypto" else _fx_open
+
+
+def _utc(when: Optional[datetime]) -> datetime:
+    if when is None:
+        return datetime.now(timezone.utc)
+    if when.tzinfo is None:
+        return when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc)
+
+
+def _day_start(when: datetime) -> datetime:
+    return when.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+@dataclass(frozen=True)
+class CalendarSpan:
+    label: Any
+    start: datetime
+    end: datetime
+
+    def seconds_left(self, when: Optional[datetime] = None) -> float:
+        return max(0.0, (self.end - _utc(when)).total_seconds())
+
+
+class SessionCalendar:
+    """Boundaries of every layer from the day before ``start_day`` to ``days`` days after"""
+
+    def __init__(self, market: str = "fx", start_day: Optional[datetime] = None, days: int = DEFAULT_DAYS):
+        self.market = market
+        self.day = _day_start(_utc(start_day))
+        first_day = self.day - timedelta(days=1)
+        self.start = first_day
+        self.end = first_day + timedelta(days=days + 1)
+
+        rules = dict(LAYERS, market_open=_market_layer(market))
+        self._starts: Dict[str, List[float]] = {name: [] for name in rules}
+        self._labels: Dict[str, List[Any]] = {name: [] for name in rules}
+        hour = first_day
+        while hour < self.end:
+            weekday = hour.weekday()
+            ts = hour.timestamp()
+            for name, rule in rules.items():
+                label = rule(weekday, hour.hour)
+                labels = self._labels[name]
+                if not labels or labels[-1] != label:
+                    labels.append(label)
+                    self._starts[name].append(ts)
+            hour += timedelta(hours=1)
+        self._end_ts = self.end.timestamp()
+
+    def covers(self, when: datetime) -> bool:
+        return self.start <= _utc(when) < self.end
+
+    def _index(self, layer: str, ts: float) -> int:
+        starts = self._starts[layer]
+        return max(0, bisect.bisect_right(starts, ts) - 1)
+
+    def span(self, layer: str, when: Optional[datetime] = None) -> CalendarSpan:
+        """Window of ``layer`` containing ``when`` (end clipped to the calendar horizon)"""
+        starts, labels = self._starts[layer], self._labels[layer]
+        i = self._index(layer, _utc(when).timestamp())
+        end = starts[i + 1] if i + 1 < len(starts) else self._end_ts
+        return CalendarSpan(
+            labels[i],
+            datetime.fromtimestamp(starts[i], timezone.utc),
+            datetime.fromtimestamp(end, timezone.utc),
+        )
+
+    def label(self, layer: str, when: Optional[datetime] = None) -> Any:
+        return self._labels[layer][self._index(layer, _utc(when).timestamp())]
+
+    def next_start(self, layer: str, label: Any, when: Optional[datetime] = None) -> Optional[datetime]:
+        """Next time (strictly after ``when``) a ``label`` window begins within the horizon"""
+        starts, labels = self._starts[layer], self._labels[layer]
+        for i in range(self._index(layer, _utc(when).timestamp()) + 1, len(starts)):
+            if labels[i] == label:
+                return datetime.fromtimestamp(starts[i], timezone.utc)
+        return None
+
+    def boundaries(self, layer: str) -> int:
+        return len(self._starts[layer])
+
+
+_calendars: "OrderedDict[Tuple[str, datetime], SessionCalendar]" = OrderedDict()
+_current: Dict[str, SessionCalendar] = {}
+_calendars_lock = threading.Lock()
+
+
+def get_session_calendar(symbol: Optional[str] = None, when: Optional[datetime] = None) -> SessionCalendar:
+    """Calendar covering ``when`` (default now) for the symbol's market; rebuilt daily"""
+    market = market_of(symbol)
+    moment = _utc(when)
+    day = _day_start(moment)
+    current = _current.get(market)
+    # Today's calendar answers "now" and any historical lookup inside its horizon
+    if current is not None and current.covers(moment) and (when is not None or current.day == day):
+        return current
+    today = day if when is None else _day_start(datetime.now(timezone.utc))
+    with _calendars_lock:
+        key = (market, day)
+        if key not in _calendars and when is not None and day != today:
+            # Any cached calendar whose horizon reaches this moment will do
+            key = next((k for k, c in _calendars.items() if k[0] == market and c.covers(moment)), key)
+        calendar = _calendars.get(key)
+        if calendar is None:
+            calendar = SessionCalendar(market, day)
+            _calendars[key] = calendar
+            while len(_calendars) > MAX_CALENDARS:
+                _calendars.popitem(last=False)
+        else:
+            _calendars.move_to_end(key)
+        if day == today:
+            _current[market] = calendar
+        return calendar
+
+
+def clear_session_calendars() -> None:
+    """Drop cached calendars (tests)"""
+    with _calendars_lock:
+        _calendars.clear()
+        _current.clear()
+
+
+def session_at(when: Optional[datetime] = None) -> str:
+    """Trading session name at ``when`` ("ASIAN" | "LONDON" | "OVERLAP" | "NY" | "POST_NY")"""
+    return get_session_calendar(None, when).label("session", when)
+
+
+def is_weekend(when: Optional[datetime] = None) -> bool:
+    """Whether ``when`` falls in the weekend trading profile window"""
+    return get_session_calendar(None, when).label("weekend", when)
@@ -6,18 +6,14 @@ Provides utilities for session-based time condition management
 from datetime import datetime, time, timedelta, timezone
 from typing import Dict, Optional, Tuple
 
+from infra.session_calendar import SESSION_HOURS, session_at
+
 
 class SessionHelpers:
     """Helper functions for session-based time management"""
     
-    # Session definitions (UTC-based)
-    SESSION_TIMES = {
-        "ASIAN": (0, 8),      # 00:00-08:00 UTC
-        "LONDON": (8, 13),    # 08:00-13:00 UTC
-        "OVERLAP": (13, 16),  # 13:00-16:00 UTC (London-NY overlap)
-        "NY": (16, 21),       # 16:00-21:00 UTC
-        "POST_NY": (21, 24),  # 21:00-24:00 UTC
-    }
+    # Session definitions (UTC-based, shared with infra.session_calendar)
+    SESSION_TIMES = {name: (start, end) for name, start, end in SESSION_HOURS}
     
     @staticmethod
     def get_current_session(current_time: Optional[datetime] = None) -> str:
@@ -30,24 +26,8 @@ class SessionHelpers:
         Returns:
             Session name: "ASIAN" | "LONDON" | "NY" | "OVERLAP" | "POST_NY"
         """
-        if current_time is None:
-            current_time = datetime.now(timezone.utc)
-        
-        utc_hour = current_time.hour
-        
-        # Check overlap first (highest priority)
-        if 13 <= utc_hour < 16:
-            return "OVERLAP"
-        elif 0 <= utc_hour < 8:
-            return "ASIAN"
-        elif 8 <= utc_hour < 13:
-            return "LONDON"
-        elif 16 <= utc_hour < 21:
-            return "NY"
-        elif 21 <= utc_hour < 24:
-            return "POST_NY"
-        else:
-            return "ASIAN"  # Default fallback
+        # Precomputed session boundaries (binary search instead of per-call hour checks)
+        return session_at(current_time)
     
     @staticmethod
     def get_session_time_range(session: str, date: Optional[datetime] = None) -> Tuple[datetime, datetime]:
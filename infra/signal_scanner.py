@@ -14,7 +14,7 @@ from infra.mt5_service import MT5Service
 from infra.indicator_bridge import IndicatorBridge
 from infra.openai_service import OpenAIService
 from infra.strategy_selector import select_strategy
-from decision_engine import decide_trade
+from infra.scan_engine import ScanCandidate, ScanEngine, get_scan_engine
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -23,12 +23,18 @@ class SignalScanner:
     """
     IMPROVED: Automatic signal detection system that scans for high-probability trades.
     Only sends notifications for strong signals with high confidence.
+    
+    Market data and decisions come from this process's ScanEngine (one scan per bar close),
+    fed with this scanner's feature-builder technical context (see decision_inputs);
+    this class is the Telegram consumer: signal strength, R:R, cooldown and rate limits.
     """
     
-    def __init__(self, mt5svc: MT5Service, bridge: IndicatorBridge, oai: OpenAIService):
+    def __init__(self, mt5svc: MT5Service, bridge: Optional[IndicatorBridge], oai: OpenAIService,
+                 engine: Optional[ScanEngine] = None):
         self.mt5svc = mt5svc
         self.bridge = bridge
         self.oai = oai
+        self.engine = engine or get_scan_engine()
         self.last_scan_time = {}
         self.signal_history = {}  # Track recent signals to avoid spam
         
@@ -44,48 +50,50 @@ class SignalScanner:
         Returns signal data if strong signal found, None otherwise.
         """
         try:
+            candidates = await self.engine.ascan([symbol])
+            if not candidates:
+                return None
+            return self.evaluate(candidates[0])
+            
+        except Exception as e:
+            logger.debug(f"Signal scan failed for {symbol}: {e}")
+            return None
+    
+    def evaluate(self, candidate: ScanCandidate) -> Optional[Dict]:
+        """
+        Apply this consumer's filters to a scan candidate.
+        Returns signal data if strong signal found, None otherwise.
+        """
+        symbol = candidate.symbol
+        try:
+            gate_rec = candidate.rec
+            if not gate_rec:
+                return None
+            
+            # Check if direction is actionable
+            direction = gate_rec.get("direction", "HOLD")
+            if direction not in ("BUY", "SELL"):
+                return None
+            
+            # Check risk:reward ratio
+            rr_ratio = gate_rec.get("rr", 0.0)
+            if rr_ratio < self.min_rr_ratio:
+                return None
+            
             # Check cooldown
             now = time.time()
             if symbol in self.last_scan_time:
                 if now - self.last_scan_time[symbol] < (self.cooldown_minutes * 60):
                     return None
             
-            # Get market data
-            self.mt5svc.ensure_symbol(symbol)
-            multi = self.bridge.get_multi(symbol)
+            # Technical context the decision was made on (built from the engine's snapshot, no re-fetch)
+            tech = candidate.tech or self._build_tech_context(candidate.multi, symbol)[0]
             
-            if not multi:
-                return None
-                
-            # Build technical context
-            tech, _, _ = self._build_tech_context(multi, symbol)
-            
-            # Extract timeframe data for decision engine
-            m5 = tech.get("M5", {})
-            m15 = tech.get("M15", {})
-            m30 = tech.get("M30", {})
-            h1 = tech.get("H1", {})
-            
-            # Run decision engine with required timeframe arguments
-            gate_rec = decide_trade(symbol, m5, m15, m30, h1)
-            if not gate_rec:
-                return None
-                
             # Check if signal is strong enough
             confidence = self._calculate_signal_strength(gate_rec, tech)
             if confidence < self.min_confidence_threshold:
                 return None
                 
-            # Check risk:reward ratio
-            rr_ratio = gate_rec.get("rr", 0.0)
-            if rr_ratio < self.min_rr_ratio:
-                return None
-                
-            # Check if direction is actionable
-            direction = gate_rec.get("direction", "HOLD")
-            if direction not in ("BUY", "SELL"):
-                return None
-                
             # Rate limiting check
             if not self._check_rate_limits(symbol):
                 return None
@@ -109,15 +117,19 @@ class SignalScanner:
             }
             
         except Exception as e:
-            logger.debug(f"Signal scan failed for {symbol}: {e}")
+            logger.debug(f"Signal evaluation failed for {symbol}: {e}")
             return None
     
+    def decision_inputs(self, symbol: str, multi: Dict) -> Dict:
+        """ScanEngine input builder: the decision engine runs on the feature-builder tech dict"""
+        return self._build_tech_context(multi, symbol)[0]
+    
     def _build_tech_context(self, multi: Dict, symbol: str) -> Tuple[Dict, Dict, Dict]:
         """Build technical context using Feature Builder for enhanced analysis."""
         try:
             # IMPROVED: Use Feature Builder for comprehensive analysis
             from infra.feature_builder import build_features
-            feature_data = build_features(symbol, self.mt5svc, self.bridge)
+            feature_data = build_features(symbol, self.mt5svc, self.bridge, multi=multi)
             
             if feature_data and feature_data.get("symbol") == symbol:
                 # Use feature builder data
@@ -333,8 +345,9 @@ class SignalScanner:
 
 async def signal_scanner_job(context):
     """
-    IMPROVED: Main signal scanning job.
-    Scans configured symbols for high-probability trade opportunities.
+    IMPROVED: Main signal scanning job (runs on bar close).
+    Triggers the shared scan engine; candidates reach this bot through the
+    Telegram consumer subscribed on first run.
     """
     try:
         # Get services from bot data
@@ -343,10 +356,22 @@ async def signal_scanner_job(context):
             logger.warning("MT5Service not available for signal scanning")
             return
             
-        # Initialize services
-        bridge = IndicatorBridge(settings.MT5_FILES_DIR)
-        oai = OpenAIService(settings.OPENAI_API_KEY, settings.OPENAI_MODEL)
-        scanner = SignalScanner(mt5svc, bridge, oai)
+        engine = get_scan_engine()
+        scanner = context.application.bot_data.get("signal_scanner")
+        if scanner is None:
+            # One scanner per bot so cooldowns and rate limits persist between scans
+            oai = OpenAIService(settings.OPENAI_API_KEY, settings.OPENAI_MODEL)
+            scanner = SignalScanner(mt5svc, None, oai, engine=engine)
+            context.application.bot_data["signal_scanner"] = scanner
+            engine.set_input_builder(scanner.decision_inputs)
+            
+            async def publish(candidates: List[ScanCandidate]):
+                for candidate in candidates:
+                    signal = await asyncio.to_thread(scanner.evaluate, candidate)
+                    if signal:
+                        await _send_signal_notification(context, signal)
+            
+            engine.subscribe("telegram", publish, loop=asyncio.get_running_loop())
         
         # Check if market is active
         if not scanner.is_market_hours():
@@ -356,22 +381,36 @@ async def signal_scanner_job(context):
         # Get symbols to scan
         symbols_to_scan = getattr(settings, "SIGNAL_SCANNER_SYMBOLS", ["XAUUSDc", "BTCUSDc", "EURUSDc"])
         
-        logger.info(f"Signal scanner: Scanning {len(symbols_to_scan)} symbols")
+        if engine.enrichment is None and getattr(settings, "SIGNAL_SCANNER_BINANCE_ENRICHMENT", True):
+            await _attach_binance_enrichment(engine, mt5svc, symbols_to_scan)
         
-        # Scan each symbol
-        for symbol in symbols_to_scan:
-            try:
-                signal = await scanner.scan_symbol(symbol)
-                if signal:
-                    await _send_signal_notification(context, signal)
-                    
-            except Exception as e:
-                logger.debug(f"Signal scan failed for {symbol}: {e}")
+        logger.info(f"Signal scanner: Scanning {len(symbols_to_scan)} symbols")
+        await engine.ascan(symbols_to_scan)
                 
     except Exception as e:
         logger.debug(f"Signal scanner job failed: {e}")
 
 
+async def _attach_binance_enrichment(engine: ScanEngine, mt5svc, symbols: List[str]):
+    """
+    Give this process's scan engine Binance enrichment. The Telegram bot runs in its own
+    process (the Discord bot's Binance stream is not reachable from here), so it streams
+    the crypto symbols it scans itself. Non-crypto symbols pass through unenriched.
+    """
+    try:
+        from infra.binance_service import BinanceService
+        from infra.binance_enrichment import BinanceEnrichment
+        
+        binance_service = BinanceService(interval="1m")
+        binance_service.set_mt5_service(mt5svc)
+        streams = [s.lower().rstrip("c") for s in symbols]
+        await binance_service.start([s + "t" if s.endswith("usd") else s for s in streams], background=True)
+        engine.set_enrichment(BinanceEnrichment(binance_service=binance_service, mt5_service=mt5svc))
+        logger.info(f"Signal scanner: Binance enrichment attached ({', '.join(binance_service.symbols) or 'no crypto symbols'})")
+    except Exception as e:
+        logger.warning(f"Signal scanner: Binance enrichment unavailable: {e}")
+
+
 async def _send_signal_notification(context, signal: Dict):
     """
     IMPROVED: Send high-probability signal notification to user.
@@ -427,12 +466,12 @@ def register_signal_scanner(app, mt5svc):
         # Store MT5 service in bot data
         app.bot_data["mt5svc"] = mt5svc
         
-        # Schedule signal scanner job
+        # Schedule signal scanner job on bar close
         scan_interval = getattr(settings, "SIGNAL_SCANNER_INTERVAL", 300)  # 5 minutes
         app.job_queue.run_repeating(
             signal_scanner_job,
             interval=scan_interval,
-            first=60,  # Start after 1 minute
+            first=get_scan_engine().seconds_to_next_scan(),
             name="_signal_scanner"
         )
         
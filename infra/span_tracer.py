@@ -0,0 +1,385 @@
+"""
+Hierarchical Span Tracer and Sampling Profiler
+
+Low-overhead timing hooks for the auto-execution condition pipeline. Spans nest
+per thread (plan -> condition family -> external call), so every measurement is
+keyed by its full path, e.g. ``check_conditions/m1_validation/mt5.copy_rates``.
+
+Key Features:
+- ``with tracer.span("name", plan_id=...)`` context manager and ``@traced`` decorator
+- Total and self time per span path, fed into HDRHistogramManager for p50/p95/p99
+- Recent root traces kept as trees for drill-down (slowest plans, trigger latency)
+- Folded-stack export (Brendan Gregg format) for flame graphs
+- On-demand sampling profiler over sys._current_frames() for code that has no spans
+- Disabled tracer costs one attribute check per span
+"""
+
+import sys
+import threading
+import time
+import logging
+from collections import Counter, deque
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PATH_SEPARATOR = "/"
+
+
+class _SpanStats:
+    """Aggregated totals for one span path"""
+
+    __slots__ = ("count", "total_ns", "self_ns", "max_ns", "errors")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.self_ns = 0
+        self.max_ns = 0
+        self.errors = 0
+
+
+class _NullSpan:
+    """Shared no-op span returned while tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_tag(self, key: str, value: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One timed section; entered via SpanTracer.span()"""
+
+    __slots__ = ("tracer", "name", "tags", "path", "start_ns", "duration_ns", "child_ns", "children", "error")
+
+    def __init__(self, tracer: "SpanTracer", name: str, tags: Optional[Dict[str, Any]]):
+        self.tracer = tracer
+        self.name = name
+        self.tags = tags
+        self.path: Tuple[str, ...] = ()
+        self.start_ns = 0
+        self.duration_ns = 0
+        self.child_ns = 0
+        self.children: Optional[List["Span"]] = None
+        self.error = False
+
+    def set_tag(self, key: str, value: Any) -> None:
+        """Attach a tag after the span started (e.g. the outcome of a check)"""
+        if self.tags is None:
+            self.tags = {}
+        self.tags[key] = value
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+        parent = stack[-1] if stack else None
+        self.path = parent.path + (self.name,) if parent else (self.name,)
+        stack.append(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        self.error = exc_type is not None
+        stack = self.tracer._stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        parent = stack[-1] if stack else None
+        if parent is not None:
+            parent.child_ns += self.duration_ns
+            if parent.children is None:
+                parent.children = []
+            parent.children.append(self)
+        self.tracer._finish(self, parent is None)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Span tree as plain data (milliseconds)"""
+        node = {
+            "name": self.name,
+            "duration_ms": self.duration_ns / 1e6,
+            "self_ms": (self.duration_ns - self.child_ns) / 1e6,
+        }
+        if self.tags:
+            node["tags"] = dict(self.tags)
+        if self.error:
+            node["error"] = True
+        if self.children:
+            node["children"] = [child.to_dict() for child in self.children]
+        return node
+
+
+class SpanTracer:
+    """Thread-aware hierarchical span tracer"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        histogram_manager=None,
+        max_traces: int = 200,
+        max_children: int = 256,
+    ):
+        self.enabled = enabled
+        self.max_children = max_children
+        self._histograms = histogram_manager
+        self._local = threading.local()
+        self._stats: Dict[Tuple[str, ...], _SpanStats] = {}
+        self._stats_lock = threading.Lock()
+        self._traces: Deque[Dict[str, Any]] = deque(maxlen=max_traces)
+        self._started_at = time.time()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def span(self, name: str, **tags):
+        """Context manager timing a (possibly nested) section"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, tags or None)
+
+    def traced(self, name: Optional[str] = None, tags: Optional[Callable[..., Dict[str, Any]]] = None) -> Callable:
+        """Decorator wrapping a function call in a span (see module-level traced())"""
+        return lambda func: _wrap(func, name or func.__name__, tags, lambda: self)
+
+    def current_span(self) -> Optional[Span]:
+        """Innermost active span on this thread"""
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, span: Span, is_root: bool) -> None:
+        duration_ns = span.duration_ns
+        with self._stats_lock:
+            stats = self._stats.get(span.path)
+            if stats is None:
+                stats = self._stats[span.path] = _SpanStats()
+            stats.count += 1
+            stats.total_ns += duration_ns
+            stats.self_ns += duration_ns - span.child_ns
+            if duration_ns > stats.max_ns:
+                stats.max_ns = duration_ns
+            if span.error:
+                stats.errors += 1
+
+        histograms = self._get_histograms()
+        if histograms is not None:
+            try:
+                histograms.record_span_latency(PATH_SEPARATOR.join(span.path), duration_ns / 1e6)
+            except Exception as e:
+                logger.debug(f"Span histogram record failed: {e}")
+
+        if is_root:
+            # Cap very wide trees (e.g. hundreds of identical calls) before keeping them
+            if span.children and len(span.children) > self.max_children:
+                span.children = span.children[:self.max_children]
+            trace = span.to_dict()
+            trace["thread"] = threading.current_thread().name
+            trace["ended_at"] = time.time()
+            self._traces.append(trace)
+
+    def _get_histograms(self):
+        if self._histograms is None:
+            try:
+                from infra.hdr_histograms import get_histogram_manager
+                self._histograms = get_histogram_manager()
+            except Exception:
+                self._histograms = False
+        return self._histograms or None
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def get_span_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregated count / total / self / max per span path (milliseconds)"""
+        with self._stats_lock:
+            items = [(path, s.count, s.total_ns, s.self_ns, s.max_ns, s.errors) for path, s in self._stats.items()]
+        result = {}
+        for path, count, total_ns, self_ns, max_ns, errors in items:
+            result[PATH_SEPARATOR.join(path)] = {
+                "count": count,
+                "total_ms": total_ns / 1e6,
+                "self_ms": self_ns / 1e6,
+                "avg_ms": total_ns / 1e6 / count if count else 0.0,
+                "max_ms": max_ns / 1e6,
+                "errors": errors,
+            }
+        return result
+
+    def get_perf_report(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """Per-span stats with histogram percentiles, slowest total time first"""
+        spans = self.get_span_stats()
+        histograms = self._get_histograms()
+        for path, entry in spans.items():
+            if histograms is not None:
+                pct = histograms.get_span_percentiles(path)
+                entry.update(p50_ms=pct.p50, p95_ms=pct.p95, p99_ms=pct.p99)
+        ordered = sorted(spans.items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+        if top:
+            ordered = ordered[:top]
+        return {
+            "enabled": self.enabled,
+            "since": self._started_at,
+            "span_count": len(spans),
+            "spans": dict(ordered),
+        }
+
+    def get_recent_traces(self, limit: int = 20, slowest: bool = False) -> List[Dict[str, Any]]:
+        """Recent root span trees, newest first (or slowest first)"""
+        traces = list(self._traces)
+        if slowest:
+            traces.sort(key=lambda t: t["duration_ms"], reverse=True)
+        else:
+            traces.reverse()
+        return traces[:limit]
+
+    def export_folded(self) -> str:
+        """Folded stacks ('a;b;c <self_us>') for flamegraph.pl / speedscope"""
+        with self._stats_lock:
+            items = [(path, s.self_ns) for path, s in self._stats.items()]
+        lines = [f"{';'.join(path)} {self_ns // 1000}" for path, self_ns in sorted(items) if self_ns >= 1000]
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Drop aggregated stats and kept traces"""
+        with self._stats_lock:
+            self._stats.clear()
+        self._traces.clear()
+        self._started_at = time.time()
+
+
+class SamplingProfiler:
+    """On-demand stack sampler: snapshots every thread's frames at a fixed interval"""
+
+    def __init__(self, max_depth: int = 64):
+        self.max_depth = max_depth
+        self._busy = threading.Lock()
+
+    def profile(
+        self,
+        seconds: float = 5.0,
+        interval_s: float = 0.005,
+        thread_filter: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Sample all threads (except the caller) for `seconds` and return folded stacks.
+        `thread_filter` keeps only threads whose name contains the given text.
+        Raises RuntimeError if a profile is already running.
+        """
+        if not self._busy.acquire(blocking=False):
+            raise RuntimeError("A profiling session is already running")
+        try:
+            own_ident = threading.get_ident()
+            stacks: Counter = Counter()
+            samples = 0
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_ident:
+                        continue
+                    thread_name = names.get(ident, str(ident))
+                    if thread_filter and thread_filter not in thread_name:
+                        continue
+                    stacks[self._fold(thread_name, frame)] += 1
+                samples += 1
+                time.sleep(interval_s)
+        finally:
+            self._busy.release()
+
+        return {
+            "seconds": seconds,
+            "interval_ms": interval_s * 1000,
+            "samples": samples,
+            "stacks": len(stacks),
+            "folded": "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()),
+        }
+
+    def _fold(self, thread_name: str, frame) -> str:
+        frames = []
+        while frame is not None and len(frames) < self.max_depth:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+            frames.append(f"{module}:{code.co_name}")
+            frame = frame.f_back
+        frames.append(thread_name)
+        return ";".join(reversed(frames))
+
+
+# Global tracer / profiler instances
+_tracer: Optional[SpanTracer] = None
+_profiler: Optional[SamplingProfiler] = None
+_lock = threading.Lock()
+
+
+def get_span_tracer() -> SpanTracer:
+    """Get global span tracer instance"""
+    global _tracer
+    if _tracer is None:
+        with _lock:
+            if _tracer is None:
+                _tracer = SpanTracer()
+    return _tracer
+
+
+def set_span_tracer(tracer: Optional[SpanTracer]) -> None:
+    """Replace the global span tracer (tests, or to disable tracing)"""
+    global _tracer
+    with _lock:
+        _tracer = tracer
+
+
+def get_sampling_profiler() -> SamplingProfiler:
+    """Get global sampling profiler instance"""
+    global _profiler
+    if _profiler is None:
+        with _lock:
+            if _profiler is None:
+                _profiler = SamplingProfiler()
+    return _profiler
+
+
+def span(name: str, **tags):
+    """Span on the global tracer"""
+    return get_span_tracer().span(name, **tags)
+
+
+def traced(name: Optional[str] = None, tags: Optional[Callable[..., Dict[str, Any]]] = None) -> Callable:
+    """
+    Decorator timing a function on the global tracer (resolved per call).
+    `tags` receives the call arguments and returns span tags; it only runs while tracing is on.
+    """
+    return lambda func: _wrap(func, name or func.__name__, tags, get_span_tracer)
+
+
+def _wrap(func: Callable, span_name: str, tags: Optional[Callable], get_tracer: Callable[[], SpanTracer]) -> Callable:
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return func(*args, **kwargs)
+        span_tags = None
+        if tags is not None:
+            try:
+                span_tags = tags(*args, **kwargs)
+            except Exception:
+                span_tags = None
+        with Span(tracer, span_name, span_tags):
+            return func(*args, **kwargs)
+    return wrapper
@@ -7,6 +7,9 @@ Processes each aggTrade to calculate delta and CVD incrementally.
 Note: Binance aggTrades are aggregated trades, not individual ticks.
 Each aggTrade represents multiple trades combined, but provides
 buy/sell side information sufficient for delta calculation.
+
+Delta/CVD histories are NumPy ring buffers (infra.order_flow_bar_engine.RingBuffer);
+bar-level CVD, slope and divergence live in OrderFlowBarEngine.
 """
 
 import logging
@@ -15,6 +18,8 @@ from typing import Dict, Optional, List, Deque
 from collections import deque
 from dataclasses import dataclass
 
+from infra.order_flow_bar_engine import RingBuffer
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,8 +58,8 @@ class TickByTickDeltaEngine:
         
         # Real-time buffers (bounded deques for memory efficiency)
         self.tick_buffer: Deque[Dict] = deque(maxlen=1000)  # Last 1000 aggTrades
-        self.delta_history: Deque[float] = deque(maxlen=max_history)  # Last N delta values
-        self.cvd_history: Deque[float] = deque(maxlen=max_history * 2)  # Last 2N CVD values
+        self.delta_history = RingBuffer(max_history)  # Last N delta values
+        self.cvd_history = RingBuffer(max_history * 2)  # Last 2N CVD values
         
         # Current state
         self.current_delta = 0.0
@@ -162,7 +167,7 @@ class TickByTickDeltaEngine:
             return {'trend': 'flat', 'slope': 0.0}
         
         # Get last N CVD values
-        recent_cvd = list(self.cvd_history)[-period:]
+        recent_cvd = self.cvd_history.tail(period).tolist()
         
         # Calculate slope (simple linear regression)
         if len(recent_cvd) < 2:
@@ -200,7 +205,7 @@ class TickByTickDeltaEngine:
         if len(self.delta_history) == 0:
             return []
         
-        return list(self.delta_history)[-count:]
+        return self.delta_history.tail(count).tolist()
     
     def get_cvd_history(self, count: int = 20) -> List[float]:
         """
@@ -215,7 +220,7 @@ class TickByTickDeltaEngine:
         if len(self.cvd_history) == 0:
             return []
         
-        return list(self.cvd_history)[-count:]
+        return self.cvd_history.tail(count).tolist()
     
     def get_statistics(self) -> Dict[str, any]:
         """Get engine statistics"""
@@ -5,11 +5,22 @@ Fetches raw tick data from MT5 using copy_ticks_range().
 Handles chunking for large requests and validates tick structure.
 """
 import logging
-import MetaTrader5 as mt5
+import MetaTrader5  # noqa: F401
+from infra.mt5_gateway import mt5
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 import time
 
+try:
+    from app.io.mt5_ingestion_manager import get_ingestion_manager
+    _tick_ring_available = True
+except ImportError:
+    get_ingestion_manager = None
+    _tick_ring_available = False
+
+# A window ending "now" is served from the ring only if its newest tick is this fresh
+RING_FRESHNESS_MS = 5000
+
 logger = logging.getLogger(__name__)
 
 # MT5 tick limit per request (conservative estimate)
@@ -62,6 +73,11 @@ class TickDataFetcher:
         Returns:
             List of tick dictionaries or None if failed
         """
+        # Serve from the shared ingestion tick ring when it covers the window (no MT5 re-read)
+        ring_ticks = self._ticks_from_ring(symbol, start_time, end_time)
+        if ring_ticks is not None:
+            return self._validate_tick_data(ring_ticks)
+        
         if not self._ensure_mt5_connection():
             logger.warning(f"MT5 not connected, cannot fetch ticks for {symbol}")
             return None
@@ -94,6 +110,46 @@ class TickDataFetcher:
             logger.error(f"Error fetching ticks for {symbol}: {e}", exc_info=True)
             return None
     
+    def _ticks_from_ring(
+        self,
+        symbol: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Ticks for the window from the ingestion tick ring, or None if the ring does not
+        cover it. The ring is only trusted while the symbol is still being ingested and
+        its newest tick reaches the end of the window (or is fresh, for windows ending
+        now), so a stale ring never yields a silently truncated window.
+        """
+        if not _tick_ring_available:
+            return None
+        manager = get_ingestion_manager()
+        if manager is None or not manager.is_ingesting(symbol):
+            return None
+        ring = manager.tick_ring
+        start_ms = int(start_time.timestamp() * 1000)
+        end_ms = int(end_time.timestamp() * 1000)
+        if not ring.covers(symbol, start_ms):
+            return None
+        latest = ring.latest(symbol)
+        required_ms = min(end_ms, int(time.time() * 1000) - RING_FRESHNESS_MS)
+        if latest is None or latest.timestamp_ms < required_ms:
+            return None
+        return [
+            {
+                'time': tick.time,
+                'time_msc': tick.timestamp_ms,
+                'bid': tick.bid,
+                'ask': tick.ask,
+                'last': tick.last if tick.last is not None else tick.bid,
+                'volume': tick.volume,
+                'volume_real': tick.volume_real,
+                'flags': tick.flags
+            }
+            for tick in ring.range(symbol, start_ms, end_ms)
+        ]
+    
     def fetch_previous_hour_ticks(self, symbol: str) -> Optional[List[Dict[str, Any]]]:
         """
         Fetch ticks from the last 60 minutes (rolling window).
@@ -20,6 +20,8 @@ import sqlite3
 import os
 import threading
 
+from infra.session_calendar import session_at
+
 logger = logging.getLogger(__name__)
 
 # Enum Definitions
@@ -138,6 +140,16 @@ class TradeState:
     last_trailing_sl: Optional[float] = None
 
 
+# Session calendar names -> Session
+_CALENDAR_SESSIONS = {
+    "ASIAN": Session.ASIA,
+    "LONDON": Session.LONDON,
+    "OVERLAP": Session.LONDON_NY_OVERLAP,
+    "NY": Session.NY,
+    "POST_NY": Session.LATE_NY,
+}
+
+
 def detect_session(symbol: str, timestamp: datetime) -> Session:
     """
     Detect market session based on UTC time.
@@ -159,25 +171,9 @@ def detect_session(symbol: str, timestamp: datetime) -> Session:
         
         BTC trades 24/7 but sessions still matter for volatility.
         Other symbols (XAU, EURUSD, US30) use same session times.
+        Boundaries come from the precomputed session calendar (infra.session_calendar).
     """
-    utc_hour = timestamp.hour
-    
-    # Session boundaries (UTC)
-    # Check overlap first (highest priority)
-    if 13 <= utc_hour < 16:
-        return Session.LONDON_NY_OVERLAP
-    elif 8 <= utc_hour < 13:
-        return Session.LONDON
-    elif 16 <= utc_hour < 21:
-        return Session.NY
-    elif 21 <= utc_hour or utc_hour < 8:
-        if utc_hour >= 21:
-            return Session.LATE_NY
-        else:
-            return Session.ASIA
-    
-    # Default fallback
-    return Session.ASIA
+    return _CALENDAR_SESSIONS[session_at(timestamp)]
 
 
 class UniversalDynamicSLTPManager:
@@ -511,7 +507,7 @@ class UniversalDynamicSLTPManager:
                 error_details.append(f"Streamer calculation failed: {e}")
             
             # Fallback to direct MT5 calculation
-            import MetaTrader5 as mt5
+            from infra.mt5_gateway import mt5
             
             # Check MT5 initialization
             if not mt5.initialize():
@@ -727,7 +723,7 @@ class UniversalDynamicSLTPManager:
         Returns:
             TradeState if registered, None if registration failed or skipped
         """
-        import MetaTrader5 as mt5
+        from infra.mt5_gateway import mt5
         from infra.trade_registry import get_trade_state, set_trade_state
         
         # If strategy_type is None, use DEFAULT_STANDARD (generic/universal trailing)
@@ -1046,7 +1042,7 @@ class UniversalDynamicSLTPManager:
             Minimum stop distance in points/pips, or 0.0 if cannot determine
         """
         try:
-            import MetaTrader5 as mt5
+            from infra.mt5_gateway import mt5
             symbol_info = mt5.symbol_info(symbol)
             if symbol_info and hasattr(symbol_info, 'trade_stops_level') and hasattr(symbol_info, 'point'):
                 try:
@@ -1152,7 +1148,7 @@ class UniversalDynamicSLTPManager:
         
         # Fallback to direct MT5 call
         try:
-            import MetaTrader5 as mt5
+            from infra.mt5_gateway import mt5
             request = {
                 "action": mt5.TRADE_ACTION_SLTP,
                 "position": ticket,
@@ -1224,7 +1220,7 @@ class UniversalDynamicSLTPManager:
         partial_close_pct = rules.get("partial_close_pct", 50)
         
         try:
-            import MetaTrader5 as mt5
+            from infra.mt5_gateway import mt5
             positions = mt5.positions_get(ticket=ticket)
             if not positions:
                 return
@@ -1562,7 +1558,7 @@ class UniversalDynamicSLTPManager:
             Fallback trailing SL, or None if calculation fails
         """
         try:
-            import MetaTrader5 as mt5
+            from infra.mt5_gateway import mt5
             tick = mt5.symbol_info_tick(trade_state.symbol)
             if not tick:
                 return None
@@ -1721,7 +1717,7 @@ class UniversalDynamicSLTPManager:
         
         # Get current price
         try:
-            import MetaTrader5 as mt5
+            from infra.mt5_gateway import mt5
             tick = mt5.symbol_info_tick(trade_state.symbol)
             if not tick:
                 return None
@@ -2177,7 +2173,7 @@ class UniversalDynamicSLTPManager:
         try:
             # 2. Get current position data
             try:
-                import MetaTrader5 as mt5
+                from infra.mt5_gateway import mt5
                 positions = mt5.positions_get(ticket=ticket)
                 if not positions or len(positions) == 0:
                     logger.info(f"Position {ticket} no longer exists - unregistering")
@@ -2420,7 +2416,7 @@ class UniversalDynamicSLTPManager:
         """Monitor all active trades (called by scheduler)."""
         # Check MT5 connection first
         try:
-            import MetaTrader5 as mt5
+            from infra.mt5_gateway import mt5
             if not mt5.initialize():
                 logger.error("MT5 not initialized - skipping trade monitoring")
                 return
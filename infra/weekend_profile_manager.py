@@ -7,12 +7,15 @@ Active Window: Friday 23:00 UTC → Monday 03:00 UTC
 NOTE: Existing code uses different weekend definition (Friday 21:00 UTC → Sunday 22:00 UTC)
 in m1_refresh_manager.py and discord_alert_dispatcher.py. This manager uses
 the weekend trading profile definition (Fri 23:00 → Mon 03:00) for BTC weekend trading.
+Windows are read from the precomputed session calendar (infra.session_calendar).
 """
 
 import logging
 from typing import Optional
 from datetime import datetime, timezone
 
+from infra.session_calendar import get_session_calendar, is_weekend
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,29 +44,7 @@ class WeekendProfileManager:
         Returns:
             True if weekend profile is active, False otherwise
         """
-        if check_time is None:
-            check_time = datetime.now(timezone.utc)
-        
-        weekday = check_time.weekday()
-        hour = check_time.hour
-        
-        # Friday 23:00 UTC onwards
-        if weekday == self.WEEKEND_START_DAY and hour >= self.WEEKEND_START_HOUR:
-            return True
-        
-        # Saturday (all day)
-        if weekday == 5:
-            return True
-        
-        # Sunday (all day)
-        if weekday == 6:
-            return True
-        
-        # Monday before 03:00 UTC
-        if weekday == self.WEEKEND_END_DAY and hour < self.WEEKEND_END_HOUR:
-            return True
-        
-        return False
+        return is_weekend(check_time)
     
     def is_weekend_active_at_time(self, check_time: datetime) -> bool:
         """
@@ -87,35 +68,7 @@ class WeekendProfileManager:
         Returns:
             Sub-session name or None if not weekend
         """
-        if check_time is None:
-            check_time = datetime.now(timezone.utc)
-        
-        if not self.is_weekend_active(check_time):
-            return None
-        
-        weekday = check_time.weekday()
-        hour = check_time.hour
-        
-        if weekday == 4 and hour >= 23:  # Fri 23:00+
-            return "ASIAN_RETAIL_BURST"
-        elif weekday == 5:
-            if hour < 6:  # Sat 00:00-06:00
-                return "ASIAN_RETAIL_BURST"
-            elif hour < 18:  # Sat 06:00-18:00
-                return "LOW_LIQUIDITY_RANGE"
-            else:  # Sat 18:00-24:00
-                return "DEAD_ZONE"
-        elif weekday == 6:
-            if hour < 12:  # Sun 00:00-12:00
-                return "DEAD_ZONE"
-            elif hour < 22:  # Sun 12:00-22:00
-                return "CME_ANTICIPATION"
-            else:  # Sun 22:00-24:00
-                return "CME_GAP_REVERSION"
-        elif weekday == 0 and hour < 3:  # Mon 00:00-03:00
-            return "CME_GAP_REVERSION"
-        
-        return None
+        return get_session_calendar(None, check_time).label("weekend_subsession", check_time)
     
     def get_time_until_weekend_ends(self) -> Optional[str]:
         """
@@ -124,31 +77,10 @@ class WeekendProfileManager:
         Returns:
             Human-readable time string or None if not weekend
         """
-        if not self.is_weekend_active():
+        span = get_session_calendar().span("weekend")
+        if not span.label:
             return None
-        
-        now = datetime.now(timezone.utc)
-        weekday = now.weekday()
-        hour = now.hour
-        
-        # Calculate time until Monday 03:00 UTC
-        if weekday == 4:  # Friday
-            hours_until = (24 - hour) + 48 + 3  # Remaining Friday + Saturday + Sunday + Monday until 03:00
-        elif weekday == 5:  # Saturday
-            hours_until = (24 - hour) + 24 + 3  # Remaining Saturday + Sunday + Monday until 03:00
-        elif weekday == 6:  # Sunday
-            hours_until = (24 - hour) + 3  # Remaining Sunday + Monday until 03:00
-        else:  # Monday before 03:00
-            hours_until = 3 - hour
-        
-        if hours_until < 1:
-            return f"{int(hours_until * 60)} minutes"
-        elif hours_until < 24:
-            return f"{int(hours_until)} hours"
-        else:
-            days = hours_until // 24
-            hours = hours_until % 24
-            return f"{int(days)} days, {int(hours)} hours"
+        return _format_hours(span.seconds_left() / 3600)
     
     def get_time_until_weekend_starts(self) -> Optional[str]:
         """
@@ -157,31 +89,18 @@ class WeekendProfileManager:
         Returns:
             Human-readable time string or None if weekend is active
         """
-        if self.is_weekend_active():
+        span = get_session_calendar().span("weekend")
+        if span.label:
             return None
-        
-        now = datetime.now(timezone.utc)
-        weekday = now.weekday()
-        hour = now.hour
-        
-        # Calculate time until Friday 23:00 UTC
-        if weekday == 0:  # Monday
-            hours_until = (24 - hour) + (24 * 3) + 23  # Remaining Monday + Tue/Wed/Thu + Friday until 23:00
-        elif weekday == 1:  # Tuesday
-            hours_until = (24 - hour) + (24 * 2) + 23  # Remaining Tuesday + Wed/Thu + Friday until 23:00
-        elif weekday == 2:  # Wednesday
-            hours_until = (24 - hour) + 24 + 23  # Remaining Wednesday + Thursday + Friday until 23:00
-        elif weekday == 3:  # Thursday
-            hours_until = (24 - hour) + 23  # Remaining Thursday + Friday until 23:00
-        else:  # Friday before 23:00
-            hours_until = 23 - hour
-        
-        if hours_until < 1:
-            return f"{int(hours_until * 60)} minutes"
-        elif hours_until < 24:
-            return f"{int(hours_until)} hours"
-        else:
-            days = hours_until // 24
-            hours = hours_until % 24
-            return f"{int(days)} days, {int(hours)} hours"
+        return _format_hours(span.seconds_left() / 3600)
+
 
+def _format_hours(hours_until: float) -> str:
+    if hours_until < 1:
+        return f"{int(hours_until * 60)} minutes"
+    elif hours_until < 24:
+        return f"{int(hours_until)} hours"
+    else:
+        days = hours_until // 24
+        hours = hours_until % 24
+        return f"{int(days)} days, {int(hours)} hours"
@@ -45,9 +45,16 @@ def check_trade_status():
 def monitor_intelligent_exits():
     """Monitor Intelligent Exits activity"""
     try:
+        # Stored rules: the snapshot alone misses changes still in its journal
+        storage_file = "data/intelligent_exits.json"
+        if os.path.exists(storage_file) or os.path.exists("data/intelligent_exits.journal"):
+            from infra.intelligent_exit_manager import load_exit_rules
+            data = load_exit_rules(storage_file)
+            print(f"📊 Intelligent Exits Status: {data}")
+            return True
+        
         # Check for intelligent exits log file
         log_files = [
-            "data/intelligent_exits.json",
             "logs/intelligent_exits.log",
             "data/logs/intelligent_exits.json"
         ]
@@ -0,0 +1,79 @@
+"""
+Tests for tools/auto_exec_benchmark.py - auto-execution monitor benchmark harness
+"""
+
+import csv
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from auto_exec_benchmark import (
+    _required_conditions, compare, ground_truth_trigger, percentiles, ticks_from_rates_csv,
+)
+from infra.condition_type_registry import CONDITION_REGISTRY
+from infra.mt5_simulator import MT5Simulator, TICK_DTYPE
+
+
+@pytest.mark.parametrize("strategy_type", list(CONDITION_REGISTRY))
+@pytest.mark.parametrize("direction", ["BUY", "SELL"])
+def test_generated_conditions_follow_direction(strategy_type, direction):
+    conditions = _required_conditions(strategy_type, direction)
+    assert conditions
+    required = CONDITION_REGISTRY[strategy_type]["required"]
+    alternatives = {k for k in required if k.endswith(("_bull", "_bear")) or k.startswith("price_in_")}
+    # Every mandatory key is present and exactly one bull/bear (premium/discount) alternative is chosen
+    assert set(required) - alternatives <= set(conditions)
+    assert len(set(conditions) & alternatives) == (1 if alternatives else 0)
+    opposite = "_bear" if direction == "BUY" else "_bull"
+    assert not any(key.endswith(opposite) for key in conditions)
+
+
+def test_ticks_from_rates_csv(tmp_path):
+    path = tmp_path / "rates.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["time_utc", "time_epoch", "open", "high", "low", "close", "tick_volume", "spread", "real_volume"])
+        writer.writerow(["", 1735689600, 100, 110, 95, 105, 10, 0, 0])
+        writer.writerow(["", 1735690500, 105, 106, 90, 92, 10, 0, 0])
+
+    ticks = ticks_from_rates_csv(str(path))
+    assert len(ticks) == 8
+    # Up bar visits the low before the high, down bar the high before the low
+    assert list(ticks["bid"][:4]) == [100, 95, 110, 105]
+    assert list(ticks["bid"][4:]) == [105, 106, 90, 92]
+    assert np.all(np.diff(ticks["time_msc"]) > 0)
+
+
+def test_ground_truth_trigger():
+    sim = MT5Simulator()
+    ticks = np.zeros(5, dtype=TICK_DTYPE)
+    ticks["time_msc"] = (1_000 + np.arange(5)) * 1000
+    ticks["bid"] = [10.0, 11.0, 12.0, 13.0, 14.0]
+    ticks["ask"] = ticks["bid"]
+    sim.load_ticks("XAUUSDc", ticks)
+
+    plan = SimpleNamespace(symbol="XAUUSDc", conditions={"price_near": 13.0, "tolerance": 0.5})
+    assert ground_truth_trigger(sim, plan, 1_000) == 1_003.0
+    plan.conditions["price_near"] = 20.0
+    assert ground_truth_trigger(sim, plan, 1_000) is None
+
+
+def test_percentiles_and_compare():
+    stats = percentiles([1.0, 2.0, 3.0, 4.0])
+    assert stats["count"] == 4
+    assert stats["p50"] == 2.5
+    assert percentiles([])["p99"] is None
+
+    baseline = {"results": [{"plans": 50, "cycle_latency_ms": {"p50": 10.0, "p99": 20.0},
+                             "time_to_trigger_s": {"p50": None, "p99": None}}]}
+    current = {"results": [{"plans": 50, "cycle_latency_ms": {"p50": 5.0, "p99": 20.0},
+                            "time_to_trigger_s": {"p50": 1.0, "p99": 2.0}}]}
+    lines = compare(current, baseline)
+    assert len(lines) == 3
+    assert "-50.0%" in lines[1]
@@ -0,0 +1,226 @@
+"""
+Tests for the vectorized Binance tick features - every enrich_timeframe field must match
+the per-feature BinanceEnrichment helpers, and results are cached per (symbol, tick id)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.binance_enrichment import BinanceEnrichment
+from infra.binance_tick_features import compute_tick_features
+from infra.price_cache import PriceCache
+
+
+class FakeBinanceService:
+    """BinanceService surface used by enrich_timeframe, backed by a real PriceCache"""
+
+    running = True
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.history_calls = 0
+
+    def _convert_to_binance_symbol(self, symbol):
+        return "BTCUSDT"
+
+    def get_latest_tick(self, symbol):
+        return self.cache.get_latest("BTCUSDT")
+
+    def get_feed_health(self, symbol):
+        return {"overall_status": "healthy"}
+
+    def get_history(self, symbol, count=200):
+        self.history_calls += 1
+        return self.cache.get_history("BTCUSDT", count)
+
+    def get_history_arrays(self, symbol, count=200, fields=("price", "volume", "timestamp")):
+        return self.cache.get_arrays("BTCUSDT", count, fields)
+
+
+def _ticks(n, seed, flat=False, ohlc=True):
+    rng = np.random.default_rng(seed)
+    if flat:
+        prices = np.full(n, 65000.0)
+    else:
+        prices = 65000 * np.exp(np.cumsum(rng.normal(0, 0.0015, n)))
+        prices = np.round(prices, int(rng.integers(0, 3)))  # repeated prices / ties
+    volumes = rng.exponential(2.0, n)
+    volumes[rng.random(n) < 0.2] = 0.0
+    ticks = []
+    for i, p in enumerate(prices):
+        tick = {"price": float(p), "volume": float(volumes[i]), "timestamp": 1_700_000_000_000 + i * int(rng.integers(200, 1500))}
+        if ohlc:
+            tick.update(open=float(p * (1 + rng.normal(0, 0.001))), high=float(p * 1.002),
+                        low=float(p * 0.998), close=float(p))
+        ticks.append(tick)
+    return ticks
+
+
+def _legacy(enricher, history):
+    """The per-feature computation of the original enrich_timeframe"""
+    out = {}
+    prices = [t['price'] for t in history]
+    volumes = [t['volume'] for t in history]
+    p5 = prices[-5:]
+    out['price_velocity'] = (p5[-1] - p5[0]) / len(p5) if len(p5) >= 2 else 0.0
+    out['micro_momentum'] = enricher._calculate_micro_momentum(prices[-10:]) if len(prices) >= 10 else 0.0
+    out['volume_acceleration'] = enricher._calculate_volume_accel(volumes[-20:]) if len(volumes) >= 20 else 0.0
+    if len(history) < 30:
+        return out
+
+    out['price_trend_10s'] = enricher._get_price_trend(prices[-10:])
+    out['price_volatility'] = enricher._calculate_volatility(prices)
+    out['volume_surge'] = enricher._detect_volume_surge(volumes)
+    out['momentum_acceleration'] = enricher._calculate_momentum_acceleration(prices)
+    last = history[-2]
+    o, c = last.get('open', last['price']), last.get('close', last['price'])
+    h, lo = last.get('high', last['price']), last.get('low', last['price'])
+    out['last_candle_color'] = "GREEN" if c > o else "RED"
+    rng = h - lo
+    if rng > 0:
+        body_pct = abs(c - o) / rng * 100
+        out['last_candle_size'] = "LARGE" if body_pct > 60 else "MEDIUM" if body_pct > 30 else "SMALL"
+        out['wicks'] = {'upper_wick_ratio': (h - max(o, c)) / rng, 'lower_wick_ratio': (min(o, c) - lo) / rng}
+    else:
+        out['last_candle_size'] = "DOJI"
+        out['wicks'] = {'upper_wick_ratio': 0, 'lower_wick_ratio': 0}
+
+    s = enricher._detect_price_structure(prices)
+    out.update(price_structure=s['structure'], structure_strength=s['strength'], consecutive_structures=s['consecutive_count'])
+    v = enricher._detect_volatility_state(prices)
+    out.update(volatility_state=v['state'], volatility_change_pct=v['change_pct'], squeeze_duration=v.get('squeeze_duration', 0))
+    m = enricher._calculate_momentum_consistency(prices)
+    out.update(momentum_consistency=m['consistency_score'], consecutive_moves=m['consecutive_moves'], momentum_quality=m['quality_label'])
+    sp = enricher._analyze_spread_proxy(prices)
+    out.update(spread_trend=sp['trend'], price_choppiness=sp['choppiness'])
+    a = enricher._calculate_micro_alignment(prices)
+    out.update(micro_alignment=a['alignment'], micro_alignment_score=a['score'], alignment_strength=a['strength'])
+    key_level = enricher._detect_key_level(prices)
+    if key_level:
+        out['key_level'] = key_level
+    d = enricher._detect_momentum_divergence(prices, volumes)
+    out.update(momentum_divergence=d['type'], divergence_strength=d['strength'])
+    out['binance_atr'] = enricher._calculate_realtime_atr(prices)['atr']
+    bb = enricher._calculate_bollinger_bands(prices)
+    out.update(bb_position=bb['position'], bb_width_pct=bb['width_pct'], bb_squeeze=bb['squeeze'])
+    sp = enricher._calculate_move_speed(prices)
+    out.update(move_speed=sp['speed'], speed_percentile=sp['percentile'], speed_warning=sp['warning'])
+    mv = enricher._calculate_momentum_volume_alignment(prices, volumes)
+    out.update(momentum_volume_alignment=mv['score'], mv_alignment_quality=mv['quality'], volume_confirmation=mv['confirmed'])
+    tf = enricher._calculate_tick_frequency(history)
+    out.update(tick_frequency=tf['ticks_per_sec'], tick_activity=tf['activity_level'], tick_percentile=tf['percentile'])
+    z = enricher._calculate_price_zscore(prices)
+    out.update(price_zscore=z['zscore'], zscore_extremity=z['extremity'], mean_reversion_signal=z['signal'])
+    pivots = enricher._calculate_pivot_points(prices)
+    out.update(pivot_data=pivots, price_vs_pivot=pivots['position'])
+    tape = enricher._analyze_tape_reading(prices, volumes)
+    out.update(aggressor_side=tape['aggressor'], aggressor_strength=tape['strength'], tape_dominance=tape['dominance'])
+    liq = enricher._calculate_liquidity_score(prices, volumes)
+    out.update(liquidity_score=liq['score'], liquidity_quality=liq['quality'], execution_confidence=liq['exec_confidence'])
+    pat = enricher._detect_candle_pattern(prices, volumes)
+    out.update(candle_pattern=pat['pattern'], pattern_confidence=pat['confidence'], pattern_direction=pat['direction'])
+    return out
+
+
+def _assert_same(got, want):
+    assert set(got) == set(want)
+    for key, value in want.items():
+        if isinstance(value, dict):
+            _assert_same(got[key], value)
+        elif isinstance(value, (bool, str, np.bool_)) or value is None:
+            assert got[key] == value, key
+        else:
+            assert got[key] == pytest.approx(value, rel=1e-9, abs=1e-12), key
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_features_match_reference_helpers(seed):
+    enricher = BinanceEnrichment()
+    n = [30, 30, 45, 2, 7, 12, 25][seed % 7]
+    history = _ticks(n, seed, flat=(seed % 13 == 0), ohlc=(seed % 3 != 0))
+    arrays = {f: np.array([t.get(f, t['price'] if f in ('open', 'high', 'low', 'close') else 0) for t in history])
+              for f in ("price", "volume", "timestamp", "open", "high", "low", "close")}
+    got = compute_tick_features(arrays['price'], arrays['volume'], arrays['timestamp'],
+                                arrays['open'], arrays['high'], arrays['low'], arrays['close'])
+    _assert_same(got, _legacy(enricher, history[-30:]))
+
+
+def test_enrich_timeframe_uses_one_cached_snapshot_per_tick():
+    cache = PriceCache(max_ticks=100)
+    for tick in _ticks(40, 3):
+        cache.update("BTCUSDT", tick)
+    service = FakeBinanceService(cache)
+    enricher = BinanceEnrichment(binance_service=service)
+    mt5_data = {"close": 65010.0, "atr_14": 40.0}
+
+    m5 = enricher.enrich_timeframe("BTCUSDc", mt5_data, "M5")
+    want = _legacy(enricher, cache.get_history("BTCUSDT", 30))
+    _assert_same({k: m5[k] for k in want}, want)
+    assert m5["close"] == 65010.0 and m5["atr_state"] in ("HIGHER", "LOWER", "ALIGNED")
+    assert "session" in m5 and m5["binance_price"] == cache.get_latest("BTCUSDT")["price"]
+
+    # Same tick: the other timeframes reuse the cached pass (nested dicts are not shared)
+    m15 = enricher.enrich_timeframe("BTCUSDc", mt5_data, "M15")
+    assert enricher._feature_cache["BTCUSDc"][1] is enricher._get_tick_features("BTCUSDc")
+    assert m15["pivot_data"] == m5["pivot_data"] and m15["pivot_data"] is not m5["pivot_data"]
+    m15["pivot_data"]["pivot"] = -1.0
+    if "key_level" in m15:
+        m15["key_level"]["price"] = -1.0
+    cached = enricher._get_tick_features("BTCUSDc")
+    assert cached["pivot_data"] == m5["pivot_data"]
+    assert cached.get("key_level", {}).get("price") != -1.0
+    assert service.history_calls == 0
+
+    cache.update("BTCUSDT", {"price": 70000.0, "volume": 1.0, "timestamp": 1_800_000_000_000})
+    fresh = enricher.enrich_timeframe("BTCUSDc", mt5_data, "M5")
+    assert fresh["binance_price"] == 70000.0
+    assert fresh["price_zscore"] == _legacy(enricher, cache.get_history("BTCUSDT", 30))["price_zscore"]
+
+
+def test_service_without_history_arrays_gets_no_tick_features():
+    class ListOnlyService(FakeBinanceService):
+        def get_history_arrays(self, symbol, count=200, fields=("price", "volume", "timestamp")):
+            return None
+
+    cache = PriceCache(max_ticks=100)
+    for tick in _ticks(40, 4):
+        cache.update("BTCUSDT", tick)
+    service = ListOnlyService(cache)
+    enricher = BinanceEnrichment(binance_service=service)
+
+    m5 = enricher.enrich_timeframe("BTCUSDc", {"close": 65010.0}, "M5")
+    assert "price_velocity" not in m5 and m5["binance_price"] == cache.get_latest("BTCUSDT")["price"]
+    assert service.history_calls == 0
+
+
+def test_summary_and_confirmation_read_the_cached_features():
+    cache = PriceCache(max_ticks=100)
+    for tick in _ticks(40, 5):
+        cache.update("BTCUSDT", tick)
+    service = FakeBinanceService(cache)
+    service.cache.get_age_seconds = lambda symbol: 0.0
+    enricher = BinanceEnrichment(binance_service=service)
+    features = enricher._get_tick_features("BTCUSDc")
+    momentum = features["micro_momentum"]
+
+    summary = enricher.get_enrichment_summary("BTCUSDc")
+    assert f"Micro Momentum: {momentum:+.2f}%" in summary
+    assert f"Trend (10s): {features['price_trend_10s']}" in summary
+    assert f"Volatility: {features['price_volatility']:.3f}%" in summary
+
+    confirmed, reason = enricher.get_binance_confirmation("BTCUSDc", "BUY", threshold=abs(momentum) + 1)
+    assert confirmed and reason == f"Binance neutral (momentum: {momentum:.2f}%)"
+    assert momentum == pytest.approx(
+        enricher._calculate_micro_momentum([t["price"] for t in cache.get_history("BTCUSDT", 10)]))
+    assert service.history_calls == 0
+
+    short = FakeBinanceService(PriceCache(max_ticks=100))
+    for tick in _ticks(5, 6):
+        short.cache.update("BTCUSDT", tick)
+    assert BinanceEnrichment(binance_service=short).get_binance_confirmation("BTCUSDc", "SELL") == \
+        (True, "Insufficient Binance data")
@@ -0,0 +1,103 @@
+"""
+Tests for infra/candle_encoding.py - columnar/binary candle payloads and conditional fetch
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.candle_encoding import (
+    ARROW_MEDIA_TYPE, JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, candles_etag, candles_to_columns,
+    columns_to_candles, decode_payload, encode_payload, etag_matches, filter_since, negotiate_media_type,
+)
+from infra.multi_timeframe_streamer import Candle
+
+
+def _candles(n=3, start=1_767_225_600):
+    # Newest first, like MultiTimeframeStreamer.get_candles
+    return [
+        Candle(symbol="BTCUSDc", timeframe="M1",
+               time=datetime.fromtimestamp(start + 60 * i, tz=timezone.utc),
+               open=100.0 + i, high=101.0 + i, low=99.0 + i, close=100.5 + i, volume=10 + i, spread=2.0)
+        for i in reversed(range(n))
+    ]
+
+
+def test_columns_round_trip_preserves_order_and_values():
+    candles = _candles()
+    columns = candles_to_columns(candles)
+    assert columns["time"] == [1_767_225_720, 1_767_225_660, 1_767_225_600]
+    assert columns["close"] == [102.5, 101.5, 100.5]
+    assert columns["volume"] == [12, 11, 10]
+
+    rows = columns_to_candles(columns)
+    assert rows[0]["time"] == candles[0].time
+    assert rows[2]["open"] == 100.0
+    # Dicts (ISO or epoch time) convert the same way as Candle objects
+    assert candles_to_columns([c.to_dict() for c in candles]) == columns
+
+
+def test_filter_since_keeps_forming_bar():
+    candles = _candles()
+    assert len(filter_since(candles, 1_767_225_660)) == 2
+    assert filter_since(candles, None) is candles
+    assert filter_since(candles, 1_767_226_000) == []
+
+
+def test_etag_changes_with_forming_bar_and_variant():
+    candles = _candles()
+    etag = candles_etag("BTCUSDc", "M1", candles)
+    assert etag.startswith('W/"')
+    assert etag == candles_etag("BTCUSDc", "M1", _candles())
+    assert etag != candles_etag("BTCUSDc", "M1", candles, variant="columnar")
+
+    candles[0].close = 999.0
+    assert candles_etag("BTCUSDc", "M1", candles) != etag
+
+    # A revised bar in the middle of the window (backfill / correction) also changes it
+    revised = _candles(5)
+    base = candles_etag("BTCUSDc", "M1", revised)
+    revised[2].low = 50.0
+    assert candles_etag("BTCUSDc", "M1", revised) != base
+
+
+def test_etag_matches():
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"abc", W/"def"', 'W/"def"')
+    assert etag_matches("*", 'W/"x"')
+    assert not etag_matches(None, 'W/"abc"')
+    assert not etag_matches('W/"abd"', 'W/"abc"')
+
+
+def test_negotiate_media_type():
+    assert negotiate_media_type(None) == JSON_MEDIA_TYPE
+    assert negotiate_media_type("*/*") == JSON_MEDIA_TYPE
+    assert negotiate_media_type("text/html") == JSON_MEDIA_TYPE
+
+
+def test_json_payload_round_trip():
+    payload = {"success": True, "columns": candles_to_columns(_candles())}
+    assert decode_payload(encode_payload(payload, JSON_MEDIA_TYPE), "application/json") == payload
+
+
+def test_msgpack_payload_round_trip():
+    pytest.importorskip("msgpack")
+    assert negotiate_media_type(f"{MSGPACK_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.5") == MSGPACK_MEDIA_TYPE
+    payload = {"success": True, "symbol": "BTCUSDc", "columns": candles_to_columns(_candles(50))}
+    body = encode_payload(payload, MSGPACK_MEDIA_TYPE)
+    assert decode_payload(body, MSGPACK_MEDIA_TYPE) == payload
+    assert len(body) < len(encode_payload(payload, JSON_MEDIA_TYPE))
+
+
+def test_arrow_payload_round_trip():
+    pytest.importorskip("pyarrow")
+    assert negotiate_media_type(f"{JSON_MEDIA_TYPE};q=0.1, {ARROW_MEDIA_TYPE}") == ARROW_MEDIA_TYPE
+    payload = {"success": True, "symbol": "BTCUSDc", "count": 3, "columns": candles_to_columns(_candles())}
+    decoded = decode_payload(encode_payload(payload, ARROW_MEDIA_TYPE), ARROW_MEDIA_TYPE)
+    assert decoded["symbol"] == "BTCUSDc"
+    assert decoded["count"] == 3
+    assert decoded["columns"] == payload["columns"]
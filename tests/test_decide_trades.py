@@ -0,0 +1,128 @@
+"""
+Tests for decision_engine.decide_trades - batched decisions must match decide_trade row by row
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import decision_engine as de
+from decision_engine import decide_trade, decide_trades, frames_from_payloads, history_frames
+
+COMPARE_KEYS = (
+    "direction", "regime", "strategy", "confidence", "mtf_label", "near_edge",
+    "guards", "triggers", "reasoning", "pattern_m5", "rsi5", "rsi15", "rsi30",
+)
+
+
+def _tf_payload(rng, price, trendy):
+    slope = rng.choice([-1, 1]) * rng.uniform(0, 0.003 if trendy else 0.0005)
+    return {
+        "close": price * (1 + rng.uniform(-0.003, 0.003)),
+        "ema_200": price * (1 + rng.uniform(-0.01, 0.01)),
+        "ema_200_slope": slope,
+        "adx_14": rng.uniform(28, 45) if trendy else rng.uniform(5, 30),
+        "rsi_14": rng.uniform(20, 80),
+        "atr_14": price * rng.uniform(0.001, 0.004),
+        "bb_width": rng.uniform(0.005, 0.03),
+    }
+
+
+def _random_payloads(count, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        price = rng.uniform(1.0, 3000.0)
+        trendy = rng.random() < 0.5
+        m5, m15, m30, h1 = (_tf_payload(rng, price, trendy) for _ in range(4))
+        m5["close"] = price
+        m5["micro_roc5"] = rng.uniform(-0.003, 0.003)
+        m5["bb_width_change"] = rng.uniform(-0.002, 0.002)
+        if rng.random() < 0.6:
+            m5["range_high_m5"] = price * (1 + rng.uniform(-0.004, 0.004))
+            m5["range_low_m5"] = price * (1 - rng.uniform(0.0, 0.008))
+        if rng.random() < 0.15:
+            m5["in_range"] = True
+        if rng.random() < 0.1:
+            m5["squeeze"] = True
+        if rng.random() < 0.1:
+            del m5["ema_200"]  # falls back to H1 ema
+        rows.append((m5, m15, m30, h1))
+    return rows
+
+
+def test_batch_matches_scalar_decisions():
+    rows = _random_payloads(400)
+    symbols = [f"SYM{i}c" for i in range(len(rows))]
+    batch = decide_trades(frames_from_payloads(rows), symbols)
+
+    outcomes = set()
+    for sym, payload, got in zip(symbols, rows, batch):
+        want = decide_trade(sym, *payload)
+        for key in COMPARE_KEYS:
+            assert got[key] == want[key], (key, got[key], want[key])
+        for key in ("entry", "sl", "tp", "rr", "mtf_score"):
+            assert got[key] == pytest.approx(want[key], rel=1e-12, abs=1e-12), key
+        outcomes.add(want["strategy"] + ":" + want["direction"])
+    # The random grid should exercise trend, breakout and hold branches
+    assert {"trend_pullback:BUY", "breakout:BUY", "idle:HOLD"} <= outcomes
+
+
+def test_columnar_mode_and_single_symbol():
+    rows = _random_payloads(50, seed=3)
+    frames = frames_from_payloads(rows)
+    cols = decide_trades(frames, "XAUUSDc", as_records=False)
+    records = decide_trades(frames, "XAUUSDc")
+
+    assert len(cols["direction"]) == 50
+    assert list(cols["direction"]) == [r["direction"] for r in records]
+    assert np.allclose(cols["sl"], [r["sl"] for r in records])
+    assert list(cols["confidence"]) == [r["confidence"] for r in records]
+
+
+def test_oco_rows_fall_back_to_scalar(monkeypatch):
+    monkeypatch.setattr(de.settings, "USE_OCO_BRACKETS", True, raising=False)
+    rows = _random_payloads(60, seed=11)
+    batch = decide_trades(frames_from_payloads(rows), "EURUSDc")
+    for payload, got in zip(rows, batch):
+        want = decide_trade("EURUSDc", *payload)
+        assert got["direction"] == want["direction"]
+        assert got["strategy"] == want["strategy"]
+
+
+def test_rsi_series_matches_prefix_rsi():
+    close = 100 + np.cumsum(np.random.default_rng(5).normal(0, 0.5, 80))
+    series = de._rsi_series(close)
+    df = pd.DataFrame({"close": close})
+    assert np.isnan(series[:14]).all()
+    for i in range(14, 80):
+        assert series[i] == pytest.approx(de._calc_rsi(df.iloc[: i + 1]), rel=1e-9)
+
+
+def test_history_frames_align_closed_higher_timeframes():
+    rng = np.random.default_rng(9)
+    n = 600
+    time = pd.date_range("2025-01-06", periods=n, freq="5min", tz="UTC")
+    close = 2000 + np.cumsum(rng.normal(0, 1.0, n))
+    m5 = pd.DataFrame({
+        "time": time, "open": close + rng.normal(0, 0.2, n), "close": close,
+        "high": close + np.abs(rng.normal(0, 0.8, n)), "low": close - np.abs(rng.normal(0, 0.8, n)),
+    })
+    frames = history_frames({"M5": m5})
+
+    assert set(frames) == {"M5", "M15", "M30", "H1"}
+    assert all(len(col) == n for tf in frames.values() for col in tf.values())
+    # The first H1 bar closes with the 12th M5 bar; earlier rows have no H1 data
+    assert np.isnan(frames["H1"]["close"][:11]).all()
+    assert frames["H1"]["close"][11] == close[11]
+    assert frames["M15"]["close"][2] == close[2] and frames["M15"]["close"][3] == close[2]
+
+    recs = decide_trades(frames, "XAUUSDc", as_records=False)
+    assert len(recs["direction"]) == n
+    assert set(recs["direction"]) <= {"BUY", "SELL", "HOLD"}
@@ -0,0 +1,127 @@
+"""
+Tests for IntelligentExitManager rule persistence - per-ticket changes go to an append-only
+journal, reloads replay it over the snapshot, and the journal is compacted into the snapshot
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import infra.intelligent_exit_manager as iem
+
+
+class _OfflineMT5:
+    def connect(self):
+        return False  # skips stale-rule cleanup on load
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(iem, "exit_logger_available", False)
+    return tmp_path / "intelligent_exits.json"
+
+
+def _manager(storage):
+    return iem.IntelligentExitManager(_OfflineMT5(), storage_file=str(storage))
+
+
+def _add(manager, ticket):
+    return manager.add_rule(ticket, "XAUUSDc", 2500.0, "buy", 2490.0, 2520.0)
+
+
+def _journal(manager):
+    return [json.loads(line) for line in manager.journal_file.read_text().splitlines()]
+
+
+def test_trailing_step_appends_one_entry_and_survives_reload(storage):
+    manager = _manager(storage)
+    for ticket in (1, 2, 3):
+        _add(manager, ticket)
+    assert [e["ticket"] for e in _journal(manager)] == [1, 2, 3]
+    assert not storage.exists()  # no full rewrite per change
+
+    rule = manager.get_rule(2)
+    rule.trailing_active = True
+    rule.last_trailing_sl = 2505.5
+    manager._save_rules([2])
+    manager._save_rules()  # nothing else changed
+    entries = _journal(manager)
+    assert len(entries) == 4 and entries[-1]["op"] == "put" and entries[-1]["ticket"] == 2
+
+    manager.remove_rule(3)
+    assert _journal(manager)[-1] == {"op": "del", "ticket": 3}
+
+    reloaded = _manager(storage)
+    assert sorted(reloaded.rules) == [1, 2]
+    assert reloaded.get_rule(2).to_dict() == rule.to_dict()
+    # Loading folds the journal into a fresh snapshot
+    assert reloaded.journal_file.read_text() == ""
+    assert sorted(json.loads(storage.read_text())) == ["1", "2"]
+
+
+def test_journal_compacts_into_snapshot(storage):
+    manager = _manager(storage)
+    manager._journal_compact_min = 5
+    rule = _add(manager, 7)
+    for step in range(15):
+        rule.last_trailing_sl = 2500.0 + step
+        manager._save_rules([7])
+
+    # Compacted once the journal passed max(5, 10 x rules) entries
+    assert len(_journal(manager)) == 5
+    snapshot = json.loads(storage.read_text())
+    replayed = dict(snapshot)
+    manager._replay_journal(replayed)
+    assert replayed["7"] == rule.to_dict()
+
+
+def test_torn_journal_line_is_skipped(storage):
+    manager = _manager(storage)
+    _add(manager, 11)
+    with open(manager.journal_file, "a") as f:
+        f.write('{"op": "put", "ticket": 12, "rule": {"tick')
+
+    reloaded = _manager(storage)
+    assert sorted(reloaded.rules) == [11]
+
+
+def test_load_exit_rules_replays_the_journal(storage):
+    manager = _manager(storage)
+    for ticket in (21, 22):
+        _add(manager, ticket)
+    manager._compact_rules()
+    rule = manager.get_rule(21)
+    rule.breakeven_triggered = True
+    manager._save_rules([21])
+    manager.remove_rule(22)
+
+    # The snapshot alone is stale; readers outside the manager see the journaled changes
+    assert json.loads(storage.read_text())["21"]["breakeven_triggered"] is False
+    rules = iem.load_exit_rules(storage)
+    assert sorted(rules) == ["21"] and rules["21"] == rule.to_dict()
+    assert iem.load_exit_rules(storage.with_name("missing.json")) == {}
+
+
+def test_check_exits_journals_rules_checked_without_actions(storage, monkeypatch):
+    class _Position:
+        ticket = 31
+
+    class _OnlineMT5:
+        def connect(self):
+            return True
+
+    manager = _manager(storage)
+    _add(manager, 31)
+    manager.mt5 = _OnlineMT5()
+    monkeypatch.setattr(iem.mt5, "positions_get", lambda *args, **kwargs: (_Position(),), raising=False)
+    monkeypatch.setattr(manager, "refresh_advanced_triggers", lambda ticket: None)
+    monkeypatch.setattr(manager, "_check_position_exits", lambda rule, position, vix: [])
+
+    assert manager.check_exits(vix_price=15.0) == []
+    last_check = manager.get_rule(31).last_check
+    assert last_check is not None
+    assert iem.load_exit_rules(storage)["31"]["last_check"] == last_check
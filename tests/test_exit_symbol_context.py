@@ -0,0 +1,77 @@
+"""
+Tests for IntelligentExitManager per-symbol cycle context - rules on one symbol share
+fetched data within a check_exits cycle, and the VIX quote is cached between cycles
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import infra.intelligent_exit_manager as iem
+
+
+class _OfflineMT5:
+    def connect(self):
+        return False
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(iem, "exit_logger_available", False)
+    return iem.IntelligentExitManager(_OfflineMT5(), storage_file=str(tmp_path / "exits.json"))
+
+
+def test_cycle_context_is_shared_per_symbol_only_inside_a_cycle(manager):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    # Outside a cycle: no memoization
+    assert manager._cycle_cached("XAUUSDc", "whales", fetch) == 1
+    assert manager._cycle_cached("XAUUSDc", "whales", fetch) == 2
+
+    manager._cycle.contexts = {}
+    try:
+        first = manager._cycle_cached("XAUUSDc", "whales", fetch)
+        assert manager._cycle_cached("XAUUSDc", "whales", fetch) == first
+        assert manager._cycle_cached("BTCUSDc", "whales", fetch) != first
+        assert set(manager._cycle.contexts) == {"XAUUSDc", "BTCUSDc"}
+    finally:
+        manager._cycle.contexts = None
+    assert len(calls) == 4
+
+
+def test_atr_computed_once_per_symbol_timeframe_in_cycle(manager, monkeypatch):
+    computed = []
+    monkeypatch.setattr(manager, "_compute_atr", lambda s, tf, p: computed.append((s, tf, p)) or 1.5)
+
+    manager._cycle.contexts = {}
+    try:
+        for _ in range(3):
+            assert manager._calculate_atr("XAUUSDc", "M15") == 1.5
+        manager._calculate_atr("XAUUSDc", "M30")
+    finally:
+        manager._cycle.contexts = None
+    assert computed == [("XAUUSDc", "M15", 14), ("XAUUSDc", "M30", 14)]
+
+
+def test_vix_price_cached_for_ttl(manager, monkeypatch):
+    import infra.market_indices_service as mis
+
+    quotes = iter([18.5, 22.0])
+
+    class _Indices:
+        def get_vix(self):
+            return {"price": next(quotes)}
+
+    monkeypatch.setattr(mis, "create_market_indices_service", lambda: _Indices())
+    assert manager._get_vix_price() == 18.5
+    assert manager._get_vix_price() == 18.5
+
+    manager._vix_cache = (manager._vix_cache[0] - manager._vix_cache_ttl - 1, 18.5)
+    assert manager._get_vix_price() == 22.0
@@ -0,0 +1,153 @@
+"""
+Tests for infra/feature_store.py - shared per-bar features are computed once, and the three
+feature builders give the same results reading from the store as computing on their own
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.feature_store import FeatureFrame, FeatureStore, payload_to_dataframe, set_feature_store
+from infra.feature_builder import FeatureBuilder
+from infra.feature_builder_advanced import FeatureBuilderAdvanced
+from infra.feature_builder_fast import FastFeatureBuilder
+
+
+def _payload(n=400, seed=3, start=1_767_225_600, step=300):
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 1.5, n))
+    opens = np.r_[2000.0, close[:-1]]
+    return {
+        "opens": list(opens),
+        "highs": list(np.maximum(opens, close) + rng.uniform(0, 1, n)),
+        "lows": list(np.minimum(opens, close) - rng.uniform(0, 1, n)),
+        "closes": list(close),
+        "volumes": list(rng.integers(50, 2000, n).astype(float)),
+        "times": [start + step * i for i in range(n)],
+        "current_price": float(close[-1]),
+        "current_high": 0.0, "current_low": 0.0, "current_open": 0.0,
+        # Bridge indicator scalars (values irrelevant here)
+        "ema20": 0.0, "ema50": 0.0, "ema200": 0.0, "rsi": 50.0, "adx": 24.0, "atr14": 1.0,
+        "macd": 0.0, "macd_signal": 0.0, "macd_histogram": 0.0, "stoch_k": 50.0, "stoch_d": 50.0,
+        "regime": "TREND",
+    }
+
+
+@pytest.fixture
+def store():
+    store = FeatureStore()
+    set_feature_store(store)
+    yield store
+    set_feature_store(None)
+
+
+def _without_timestamps(value):
+    if isinstance(value, dict):
+        return {k: _without_timestamps(v) for k, v in value.items() if k != "timestamp"}
+    return value
+
+
+def test_payload_to_dataframe_accepts_plural_and_singular_keys():
+    data = _payload(50)
+    plural = payload_to_dataframe(data)
+    singular = payload_to_dataframe({k.rstrip("s"): v for k, v in data.items() if k.endswith("s")})
+    pd.testing.assert_frame_equal(plural, singular)
+    assert isinstance(plural.index, pd.DatetimeIndex)
+    assert plural.index[0] == pd.Timestamp(1_767_225_600, unit="s")
+
+    in_ms = payload_to_dataframe(dict(data, times=[t * 1000 for t in data["times"]]))
+    assert (in_ms.index == plural.index).all()
+    assert payload_to_dataframe({}) is None and payload_to_dataframe({"closes": []}) is None
+
+
+def test_features_resolve_dependencies_once_per_frame():
+    frame = FeatureFrame(_payload(100))
+    atr = frame.get("atr_14")
+    assert frame.get("atr_14") is atr
+    frame.get("atr_20")  # shares df and true_range with atr_14
+    assert frame.computed == 4 and frame.hits == 2
+
+    tr = frame.get("true_range")
+    assert frame.last("atr_14") == pytest.approx(tr.iloc[-14:].mean())
+    calls = []
+    assert frame.memo("block", lambda: calls.append(1) or "x") == "x"
+    assert frame.memo("block", lambda: calls.append(1) or "y") == "x" and calls == [1]
+
+    fresh = FeatureFrame(_payload(100), memoize=False)
+    assert fresh.get("rsi_14") is not fresh.get("rsi_14")
+
+
+def test_store_shares_frames_until_bar_changes(store):
+    data = _payload(100)
+    frame = store.frame("XAUUSDc", "M5", data)
+    assert store.frame("XAUUSDc", "M5", dict(data)) is frame
+    assert store.frame("XAUUSDc", "M15", data) is not frame
+
+    # Forming bar revised (same time, new close) and next bar each get a fresh frame
+    revised = dict(data, closes=data["closes"][:-1] + [data["closes"][-1] + 1.0])
+    assert store.frame("XAUUSDc", "M5", revised) is not frame
+    nxt = _payload(101)
+    assert store.frame("XAUUSDc", "M5", nxt) is store.frame("XAUUSDc", "M5", _payload(101))
+    assert store.get_stats()["frame_hits"] == 2
+
+    disabled = FeatureStore(enabled=False)
+    assert disabled.frame("XAUUSDc", "M5", data) is not disabled.frame("XAUUSDc", "M5", data)
+
+
+def test_advanced_builder_matches_with_and_without_store(store):
+    multi = {"M5": _payload(400, 1), "M15": _payload(400, 2, step=900), "H1": _payload(400, 3, step=3600)}
+    with_store = FeatureBuilderAdvanced(None, None).build_features("XAUUSDc", multi=multi)
+    assert store.get_stats()["features_computed"] > 0
+
+    set_feature_store(FeatureStore(enabled=False))
+    without = FeatureBuilderAdvanced(None, None).build_features("XAUUSDc", multi=multi)
+    assert set(with_store["features"]) >= {"M5", "M15", "H1"}
+    assert _without_timestamps(with_store) == _without_timestamps(without)
+
+
+def test_builders_read_shared_indicators(store):
+    multi = {"M5": _payload(400, 1), "M15": _payload(400, 2, step=900)}
+    fast = FastFeatureBuilder(None, None).build("XAUUSDc", multi=multi)
+    df = payload_to_dataframe(multi["M5"])
+    assert fast["M5"]["close"] == pytest.approx(df["close"].iloc[-1])
+    assert fast["M5"]["ema_50"] == pytest.approx(df["close"].ewm(span=50).mean().iloc[-1])
+    assert fast["M5"]["adx"] == 24.0
+
+    builder = FeatureBuilder(None, None)
+    first = builder.build("XAUUSDc", timeframes=["M5", "M15"], multi=multi)
+    assert first["M5"]["bars_count"] == 400
+    stats = store.get_stats()
+    again = builder.build("XAUUSDc", timeframes=["M5", "M15"], multi=multi)
+    assert {k: v for k, v in again["M5"].items() if k != "current_time"} == \
+        {k: v for k, v in first["M5"].items() if k != "current_time"}
+    assert store.get_stats()["features_computed"] == stats["features_computed"]
+
+
+def test_session_fields_are_current_when_bar_features_are_cached(store, monkeypatch):
+    import infra.feature_session_news as session_news
+
+    clock = {"now": datetime(2026, 1, 6, 3, 0, tzinfo=timezone.utc)}  # Tuesday, Asia
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock["now"]
+
+    monkeypatch.setattr(session_news, "datetime", FakeDatetime)
+    multi = {"M5": _payload(400, 1)}
+    builder = FeatureBuilder(None, None)
+    asia = builder.build("XAUUSDc", timeframes=["M5"], multi=multi)["M5"]
+    computed = store.get_stats()["features_computed"]
+
+    clock["now"] = datetime(2026, 1, 6, 14, 0, tzinfo=timezone.utc)  # Same bar, NY session
+    ny = builder.build("XAUUSDc", timeframes=["M5"], multi=multi)["M5"]
+    assert store.get_stats()["features_computed"] == computed  # Bar features came from the memo
+    assert asia["current_time"] != ny["current_time"] and asia["session"] != ny["session"]
+    assert ny["current_time"] == clock["now"].isoformat()
+    assert ny["ema_50"] == asia["ema_50"] and ny["bars_count"] == 400
@@ -0,0 +1,150 @@
+"""
+Tests for domain/level_clusters.py - the sort-and-sweep clustering reproduces every call
+site's previous (quadratic or per-step) clustering
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from domain import levels, liquidity, support_resistance, zones
+from domain.level_clusters import LevelClusterer, cluster_prices, densest_window
+from infra.feature_builder import FeatureBuilder
+from infra.feature_structure import StructureFeatures
+from infra.m1_microstructure_analyzer import M1MicrostructureAnalyzer
+
+
+def _levels(n, seed):
+    rng = np.random.default_rng(seed)
+    return list(np.round(2000 + rng.normal(0, 3, n), 2))
+
+
+def _separated(seed, groups=8, tol=0.5):
+    """Swing prices in groups narrower than tol, groups further than 2*tol apart, time-shuffled"""
+    rng = np.random.default_rng(seed)
+    centres = 2000 + np.arange(groups) * 5 * tol
+    prices = [c + rng.uniform(0, tol * 0.9) for c in centres for _ in range(rng.integers(1, 5))]
+    rng.shuffle(prices)
+    return [float(p) for p in prices]
+
+
+# Previous implementations, kept as references
+
+def _old_find_price_clusters(swings, tolerance, min_touches):
+    clusters, used = [], set()
+    for i, (_, price_i) in enumerate(swings):
+        if i in used:
+            continue
+        members, member_prices = [i], [price_i]
+        for j, (_, price_j) in enumerate(swings):
+            if j != i and j not in used and abs(price_j - price_i) <= tolerance:
+                members.append(j)
+                member_prices.append(price_j)
+                used.add(j)
+        if len(members) >= min_touches:
+            clusters.append({"price": np.mean(member_prices), "count": len(members), "bars_ago": max(members)})
+            used.add(i)
+    return clusters
+
+
+def _old_find_wick_clusters(wick_prices, tolerance, min_wicks):
+    if len(wick_prices) < min_wicks:
+        return None
+    xs = np.sort(wick_prices)
+    best, best_count = None, 0
+    for c in xs:
+        inside = xs[(xs >= c - tolerance) & (xs <= c + tolerance)]
+        if len(inside) >= min_wicks and len(inside) > best_count:
+            best = {"price": float(np.mean(inside)), "count": len(inside), "center": float(c), "tolerance": tolerance}
+            best_count = len(inside)
+    return best
+
+
+def _old_zone_clusters(pivots, tol_bps):
+    piv_sorted = sorted(pivots, key=lambda p: p.price)
+    clusters, current = [], [piv_sorted[0]]
+    for pv in piv_sorted[1:]:
+        ref = np.median([x.price for x in current])
+        if abs(pv.price - ref) <= abs((pv.price + ref) / 2.0) * (tol_bps / 10_000.0):
+            current.append(pv)
+        else:
+            clusters.append(current)
+            current = [pv]
+    clusters.append(current)
+    return clusters
+
+
+def _old_chain(levels_, tol, relative=False):
+    xs = sorted(levels_)
+    clusters = [[xs[0]]]
+    for prev, x in zip(xs, xs[1:]):
+        gap = abs(x - prev) / prev if relative else abs(x - prev)
+        if gap <= tol:
+            clusters[-1].append(x)
+        else:
+            clusters.append([x])
+    return clusters
+
+
+def _old_equal_levels(levels_, tolerance):
+    clusters = {}
+    for level in levels_:
+        for key in clusters:
+            if abs(level - key) <= tolerance:
+                clusters[key] += 1
+                break
+        else:
+            clusters[level] = 1
+    return clusters
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_equal_highs_and_m1_equal_levels_match_previous(seed):
+    prices = _separated(seed)
+    swings = list(enumerate(prices))
+    new, old = liquidity._find_price_clusters(swings, 0.5, 2), _old_find_price_clusters(swings, 0.5, 2)
+    assert [(c["count"], c["bars_ago"]) for c in new] == [(c["count"], c["bars_ago"]) for c in old]
+    assert [c["price"] for c in new] == pytest.approx([c["price"] for c in old])
+    assert M1MicrostructureAnalyzer._find_equal_levels(None, prices, 0.5) == _old_equal_levels(prices, 0.5)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_chain_and_window_sites_match_previous(seed):
+    xs = _levels(300, seed)
+    assert liquidity._find_wick_clusters(np.array(xs), 0.4, 3) == _old_find_wick_clusters(np.array(xs), 0.4, 3)
+
+    old = _old_chain(xs, 0.3)
+    assert [list(b) for b in levels._cluster_levels(np.array(xs), 0.3)] == old
+    assert support_resistance._cluster_levels(np.array(xs), 0.3) == old
+
+    old_rel = _old_chain(xs, 0.0002, relative=True)
+    assert [c["levels"] for c in StructureFeatures()._cluster_levels(xs, 0.0002)] == old_rel
+    assert FeatureBuilder._find_level_clusters(None, xs, 0.0002) == [c for c in old_rel if len(c) > 1]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_zone_clusters_match_previous(seed):
+    pivots = [zones.Pivot(idx=i, ts=i, price=p, kind="H") for i, p in enumerate(_levels(200, seed))]
+    assert zones.cluster_levels(pivots, price_tol_bps=2) == _old_zone_clusters(pivots, 2)
+
+
+def test_anchor_clusters_never_exceed_tolerance_and_atr_units():
+    xs = _levels(500, 9)
+    for group in cluster_prices(xs, 0.5, link="anchor", atr=2.0):
+        members = np.array(xs)[group]
+        assert members.max() - members.min() <= 1.0
+    members, centre = densest_window([1.0, 1.1, 1.2, 5.0], 0.1)
+    assert list(members) == [1.0, 1.1, 1.2] and centre == 1.1
+
+
+def test_incremental_clusterer_matches_batch():
+    xs = _levels(200, 4)
+    clusterer = LevelClusterer(0.3, link="median")
+    for i, x in enumerate(xs):
+        clusterer.add(x, item=i)
+    assert clusterer.clusters() == [list(g) for g in cluster_prices(xs, 0.3, link="median")]
+    assert len(clusterer) == 200
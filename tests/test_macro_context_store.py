@@ -0,0 +1,180 @@
+"""
+Tests for infra/macro_context_store.py - TTL cache, single-flight refresh, incremental bars
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.macro_context_store import FixtureProvider, MacroContextStore, MacroDataProvider, parse_span
+from infra.market_indices_service import MarketIndicesService
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _ohlcv(start, periods, freq="5min", base=100.0):
+    index = pd.date_range(start, periods=periods, freq=freq, tz="UTC")
+    close = base + np.sin(np.arange(periods) / 10.0)
+    return pd.DataFrame({"Open": close, "High": close + 0.1, "Low": close - 0.1,
+                         "Close": close, "Volume": 0}, index=index)
+
+
+def test_parse_span():
+    assert parse_span("5m") == 300
+    assert parse_span("1h") == 3600
+    assert parse_span("5d") == 5 * 86400
+    assert parse_span("max") is None
+
+
+def test_provider_interface_is_abstract():
+    with pytest.raises(TypeError):
+        MacroDataProvider()
+    assert isinstance(FixtureProvider(), MacroDataProvider)
+
+
+def test_single_flight_across_threads():
+    store = MacroContextStore(provider=FixtureProvider(), clock=FakeClock())
+    calls = []
+    gate = threading.Event()
+
+    def loader():
+        calls.append(1)
+        gate.wait(2)
+        return {"price": 1.0}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get("dxy", loader))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"price": 1.0}] * 8
+    assert store.get_stats()["deduped"] == 7
+
+
+def test_async_single_flight_and_ttl():
+    clock = FakeClock()
+    store = MacroContextStore(provider=FixtureProvider(), default_ttl_s=60, clock=clock)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        return await asyncio.gather(*(store.aget("vix", loader) for _ in range(5)))
+
+    assert asyncio.run(run()) == [1] * 5
+    assert store.get("vix", loader) == 1  # fresh: served from memory
+    clock.now += 61
+    assert store.get("vix", loader) == 2
+    assert len(calls) == 2
+
+
+def test_failed_refresh_serves_stale_value():
+    clock = FakeClock()
+    store = MacroContextStore(provider=FixtureProvider(), default_ttl_s=10, clock=clock)
+    store.get("us10y", lambda: {"price": 4.2})
+    clock.now += 11
+
+    def boom():
+        raise RuntimeError("network down")
+
+    assert store.get("us10y", boom) == {"price": 4.2}
+    assert store.get("us10y", lambda: {"price": None}, cache_if=lambda r: r["price"] is not None) == {"price": 4.2}
+    with pytest.raises(RuntimeError):
+        store.get("missing", boom)
+
+
+def test_bars_extend_incrementally():
+    frame = _ohlcv("2025-01-01", 3000)
+    now = {"t": frame.index[2000]}
+    provider = FixtureProvider({"DX-Y.NYB": frame}, now=lambda: now["t"])
+    clock = FakeClock()
+    service = MarketIndicesService(store=MacroContextStore(provider=provider, clock=clock))
+
+    first = asyncio.run(service.get_dxy_bars(period="5d", interval="5m"))
+    assert list(first.columns) == ["time", "open", "high", "low", "close", "volume"]
+    assert provider.calls[-1] == ("DX-Y.NYB", "5d", "5m")
+
+    asyncio.run(service.get_dxy_bars(period="5d", interval="5m"))
+    assert len(provider.calls) == 1  # within one bar interval: no download
+
+    now["t"] = frame.index[2012]
+    clock.now += 300
+    second = asyncio.run(service.get_dxy_bars(period="5d", interval="5m"))
+    assert provider.calls[-1] == ("DX-Y.NYB", "1d", "5m")  # short tail re-fetch
+
+    full = service._normalize_bars(provider.history("DX-Y.NYB", "5d", "5m"), "DXY")
+    assert second["time"].tolist() == full["time"].tolist()
+    assert second["close"].tolist() == full["close"].tolist()
+    assert second["time"].is_unique and len(second) > len(first) - 1
+
+
+def test_bars_refetch_in_full_after_gap():
+    frame = _ohlcv("2025-01-01", 3000)
+    now = {"t": frame.index[1500]}
+    provider = FixtureProvider({"DX-Y.NYB": frame}, now=lambda: now["t"])
+    clock = FakeClock()
+    service = MarketIndicesService(store=MacroContextStore(provider=provider, clock=clock))
+    asyncio.run(service.get_dxy_bars(period="5d", interval="5m"))
+
+    # Down for two days: the 1d tail no longer overlaps the held bars
+    now["t"] = frame.index[1500 + 576]
+    clock.now += 2 * 86400
+    bars = asyncio.run(service.get_dxy_bars(period="5d", interval="5m"))
+    assert provider.calls[-2:] == [("DX-Y.NYB", "1d", "5m"), ("DX-Y.NYB", "5d", "5m")]
+
+    full = service._normalize_bars(provider.history("DX-Y.NYB", "5d", "5m"), "DXY")
+    assert bars["time"].tolist() == full["time"].tolist()
+    assert bars["time"].diff().dropna().max() == pd.Timedelta(minutes=5)  # no hole
+
+
+def test_indices_service_offline_snapshot():
+    provider = FixtureProvider({"DX-Y.NYB": _ohlcv("2025-01-01", 200, freq="1h", base=104.0),
+                                "^VIX": _ohlcv("2025-01-01", 200, freq="1h", base=16.0)})
+    service = MarketIndicesService(store=MacroContextStore(provider=provider, clock=FakeClock()))
+
+    dxy = service.get_dxy()
+    assert dxy["price"] is not None and dxy["trend"] in {"up", "down", "neutral"}
+    assert service.get_dxy() is dxy
+    assert service.get_vix()["level"] == "normal"
+    assert len(provider.calls) == 2
+    assert service.get_recent_closes("^VIX", period="5d", interval="1h")
+
+
+def test_snapshot_persisted_at_most_once_per_interval(tmp_path):
+    path = tmp_path / "macro.json"
+    clock = FakeClock()
+    store = MacroContextStore(provider=FixtureProvider(), persist_path=str(path),
+                              persist_interval_s=300, clock=clock)
+    store.get("dxy", lambda: {"price": 1.0})
+    store.get("vix", lambda: {"price": 2.0})
+    assert set(json.loads(path.read_text())) == {"dxy"}
+
+    clock.now += 301
+    store.get("us10y", lambda: {"price": 3.0})
+    assert set(json.loads(path.read_text())) == {"dxy", "vix", "us10y"}
+
+    warm = MacroContextStore(provider=FixtureProvider(), persist_path=str(path))
+    assert warm.peek("vix") == {"price": 2.0}
@@ -0,0 +1,170 @@
+"""
+Tests for the shared micro-scalp snapshot - candle features match the per-helper calculations,
+snapshots and regimes are shared per (symbol, M1 bar, tick bucket), strategy checkers keep the
+snapshot they validate per thread, and every check reports its latency budget
+"""
+
+import statistics
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra import micro_scalp_features
+from infra.micro_scalp_engine import MicroScalpEngine
+from infra.micro_scalp_features import CandleFeatures, candle_features
+from infra.micro_scalp_regime_detector import MicroScalpRegimeDetector
+from infra.micro_scalp_strategies.range_scalp_checker import RangeScalpChecker
+
+CONFIG = {
+    'regime_detection': {
+        'vwap_reversion': {'volume_spike_multiplier': 1.3, 'volume_z_score_threshold': 1.5},
+        'balanced_zone': {'bb_compression_threshold': 0.9},
+    }
+}
+
+
+def _candles(n=40, seed=7, start=1_767_225_600, spike=False, flat=False):
+    rng = np.random.default_rng(seed)
+    close = 2500 + (np.zeros(n) if flat else np.cumsum(rng.normal(0, 0.8, n)))
+    opens = np.r_[2500.0, close[:-1]]
+    volume = rng.integers(0 if not spike else 100, 900, n).astype(float)
+    if spike:
+        volume[-1] = 5000.0
+    return [
+        {'time': start + 60 * i, 'open': float(opens[i]),
+         'high': float(max(opens[i], close[i]) + rng.uniform(0, 0.6)),
+         'low': float(min(opens[i], close[i]) - rng.uniform(0, 0.6)),
+         'close': float(close[i]), 'volume': float(volume[i])}
+        for i in range(n)
+    ]
+
+
+def _old_vwap_std(candles):
+    rows = [((c['high'] + c['low'] + c['close']) / 3, c['volume']) for c in candles[-20:] if c['volume'] > 0]
+    total = sum(v for _, v in rows)
+    mean = sum(tp * v for tp, v in rows) / total
+    return (sum(v * (tp - mean) ** 2 for tp, v in rows) / total) ** 0.5
+
+
+def _old_zscore(candles):
+    recent = [c['volume'] for c in candles[-31:-1]]
+    return (candles[-1]['volume'] - statistics.mean(recent)) / statistics.stdev(recent)
+
+
+def _old_bb_compression(candles, threshold=0.9):
+    close = pd.Series([c['close'] for c in candles])
+    sma, std = close.rolling(20).mean(), close.rolling(20).std()
+    width = (std * 4) / sma
+    if width.iloc[-1] < 0.02:
+        return True
+    return width.iloc[-5:].mean() / width.iloc[-20:].mean() < threshold
+
+
+@pytest.fixture(autouse=True)
+def fresh_features():
+    micro_scalp_features.clear_candle_features()
+    yield
+    micro_scalp_features.clear_candle_features()
+
+
+def test_features_match_previous_helper_calculations():
+    detector = MicroScalpRegimeDetector(CONFIG, range_detector=None)
+    for seed in range(6):
+        candles = _candles(seed=seed, spike=seed % 2 == 0)
+        features = candle_features(candles)
+        assert features.vwap_std == pytest.approx(_old_vwap_std(candles))
+        assert features.volume_zscore == pytest.approx(_old_zscore(candles))
+        widths = (pd.Series([c['close'] for c in candles]).rolling(20).std() * 4
+                  / pd.Series([c['close'] for c in candles]).rolling(20).mean())
+        assert np.allclose(features.bb_width_pct, widths.to_numpy(), equal_nan=True)
+        assert detector._check_bb_compression(candles) == _old_bb_compression(candles)
+        assert detector._calculate_vwap_std(candles, 2500.0) == pytest.approx(_old_vwap_std(candles))
+
+    spike = _candles(spike=True)
+    assert detector._check_volume_spike_multiplier(spike) and detector._check_volume_spike_zscore(spike)
+    # Short or flat inputs keep the old guards
+    assert detector._check_bb_compression(_candles(15)) is False
+    assert detector._check_bb_compression(_candles(flat=True)) is True
+    assert detector._calculate_vwap_std(_candles(8), 2500.0) == 0.0
+    assert candle_features([{'close': None}]).vwap_std == 0.0
+
+
+def test_detector_and_checkers_share_one_feature_set():
+    candles = _candles()
+    checker = RangeScalpChecker(CONFIG, None, None, None, None, None, strategy_name='range_scalp')
+    detector = MicroScalpRegimeDetector(CONFIG, range_detector=None)
+    detector._check_bb_compression(candles)
+    features = candle_features(candles)
+    computed = features.computed
+    assert checker._check_bb_compression(candles) == detector._check_bb_compression(candles)
+    assert checker._check_choppy_liquidity(candles) == detector._check_choppy_liquidity(candles)
+    assert features.computed == computed + 1 and features.hits >= 3
+    # A new list (next fetch) gets its own features
+    assert candle_features(list(candles)) is not features
+    assert isinstance(features, CandleFeatures)
+
+
+def test_checker_snapshot_is_per_thread():
+    checker = RangeScalpChecker(CONFIG, None, None, None, None, None, strategy_name='range_scalp')
+    checker._current_snapshot = {'symbol': 'main'}
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(checker._current_snapshot))
+    worker.start()
+    worker.join()
+    assert seen == [None] and checker._current_snapshot == {'symbol': 'main'}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    config = tmp_path / "micro.json"
+    config.write_text('{"snapshot_cache": {"tick_bucket_seconds": 60}, "latency_budget_ms": 250}')
+    candles = _candles()
+    fetcher = Mock()
+    fetcher.fetch_m1_data.side_effect = lambda *args, **kwargs: [dict(c) for c in candles]
+    mt5 = Mock()
+    mt5.get_quote.return_value = SimpleNamespace(bid=2500.0, ask=2500.2)
+    engine = MicroScalpEngine(config_path=str(config), mt5_service=mt5, m1_fetcher=fetcher)
+    engine.candles = candles
+    return engine
+
+
+def test_snapshots_are_shared_per_bar_and_bucket(engine):
+    with patch('infra.micro_scalp_engine.time.time', return_value=1_000_000.0):
+        first = engine._build_snapshot('XAUUSD')
+        second = engine._build_snapshot('xauusdc')
+        assert second is not first and second['candles'] is first['candles']
+        assert engine.mt5_service.get_quote.call_count == 1
+        second['plan_id'] = 'p1'
+        assert 'plan_id' not in engine._build_snapshot('XAUUSDc')
+
+        # Next M1 bar -> rebuilt
+        engine.candles.append(dict(engine.candles[-1], time=engine.candles[-1]['time'] + 60))
+        assert engine._build_snapshot('XAUUSDc')['candles'] is not first['candles']
+
+    with patch('infra.micro_scalp_engine.time.time', return_value=1_000_120.0):
+        engine._build_snapshot('XAUUSDc')
+    stats = engine.get_snapshot_cache_stats()
+    assert stats['builds'] == 3 and stats['hits'] == 2
+
+
+def test_regime_detected_once_per_snapshot_and_latency_reported(engine):
+    with patch.object(engine.regime_detector, 'detect_regime', wraps=engine.regime_detector.detect_regime) as detect, \
+            patch('infra.micro_scalp_engine.time.time', return_value=1_000_000.0):
+        first = engine.check_micro_conditions('XAUUSDc', plan_id='a')
+        second = engine.check_micro_conditions('XAUUSDc', plan_id='b')
+    assert detect.call_count == 1
+    assert first['regime'] == second['regime'] and second['plan_id'] == 'b'
+    assert {'snapshot', 'regime', 'checker', 'total'} <= set(first['latency_ms'])
+    assert first['latency_budget_ms'] == 250 and first['over_budget'] is False
+
+    engine.latency_budget_ms = 0
+    assert engine.check_micro_conditions('XAUUSDc')['over_budget'] is True
+    assert engine.get_snapshot_cache_stats()['over_budget'] == 1
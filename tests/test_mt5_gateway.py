@@ -0,0 +1,192 @@
+"""
+Tests for infra/mt5_gateway.py - single-worker MT5 IPC gateway
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.mt5_gateway import MT5Gateway, MT5Proxy
+
+Tick = namedtuple("Tick", ["bid", "ask", "time_msc"])
+
+
+class FakeBackend:
+    """Minimal MetaTrader5-like backend that records which threads serve calls"""
+
+    TIMEFRAME_M1 = 1
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = []
+        self.threads = set()
+        self._lock = threading.Lock()
+        self._error = (1, "Success")
+        self.selected = set()
+
+    def _record(self, name):
+        with self._lock:
+            self.calls.append(name)
+            self.threads.add(threading.current_thread().name)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def symbol_info_tick(self, symbol):
+        self._record("symbol_info_tick")
+        if symbol == "MISSING":
+            self._error = (-1, "symbol not found")
+            return None
+        return Tick(bid=100.0, ask=100.5, time_msc=1)
+
+    def copy_rates_from_pos(self, symbol, timeframe, start, count):
+        self._record("copy_rates_from_pos")
+        return [(i, 1.0, 2.0, 0.5, 1.5) for i in range(count)]
+
+    def positions_get(self, symbol=None, ticket=None):
+        self._record("positions_get")
+        return ()
+
+    def symbol_info(self, symbol):
+        self._record("symbol_info")
+        return {"name": symbol, "visible": symbol in self.selected}
+
+    def symbol_select(self, symbol, enable=True):
+        self._record("symbol_select")
+        self.selected.add(symbol)
+        return True
+
+    def order_send(self, request):
+        self._record("order_send")
+        return {"retcode": 10009}
+
+    def last_error(self):
+        return self._error
+
+
+def test_calls_run_on_single_worker_thread():
+    backend = FakeBackend()
+    gateway = MT5Gateway(backend=backend, cache_ttls={"symbol_info_tick": 0})
+
+    threads = [threading.Thread(target=gateway.call, args=("symbol_info_tick", f"SYM{i}")) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert backend.threads == {"MT5GatewayWorker"}
+    gateway.stop()
+
+
+def test_identical_inflight_requests_are_coalesced():
+    backend = FakeBackend(latency=0.05)
+    gateway = MT5Gateway(backend=backend, cache_ttls={"copy_rates_from_pos": 0})
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(gateway.call("copy_rates_from_pos", "XAUUSDc", 1, 0, 10)))
+        for _ in range(10)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 10
+    assert backend.calls.count("copy_rates_from_pos") < 10
+    assert gateway.get_stats()["coalesced"] > 0
+    gateway.stop()
+
+
+def test_results_cached_within_ttl_and_invalidated_by_order_send():
+    backend = FakeBackend()
+    gateway = MT5Gateway(backend=backend, cache_ttls={"positions_get": 60.0})
+
+    gateway.call("positions_get", symbol="BTCUSDc")
+    gateway.call("positions_get", symbol="BTCUSDc")
+    assert backend.calls.count("positions_get") == 1
+    assert gateway.get_stats()["cache_hits"] == 1
+
+    gateway.call("order_send", {"action": 1})
+    gateway.call("positions_get", symbol="BTCUSDc")
+    assert backend.calls.count("positions_get") == 2
+    gateway.stop()
+
+
+def test_cache_expires_after_ttl():
+    backend = FakeBackend()
+    gateway = MT5Gateway(backend=backend, cache_ttls={"symbol_info_tick": 0.05})
+
+    gateway.call("symbol_info_tick", "XAUUSDc")
+    time.sleep(0.1)
+    gateway.call("symbol_info_tick", "XAUUSDc")
+    assert backend.calls.count("symbol_info_tick") == 2
+    gateway.stop()
+
+
+def test_symbol_select_invalidates_that_symbol_and_failures_are_not_cached():
+    backend = FakeBackend()
+    gateway = MT5Gateway(backend=backend, cache_ttls={"symbol_info": 60.0, "symbol_info_tick": 60.0})
+
+    assert gateway.call("symbol_info", "XAUUSDc")["visible"] is False
+    gateway.call("symbol_info", "BTCUSDc")
+    assert gateway.call("symbol_select", "XAUUSDc", True)
+    assert gateway.call("symbol_info", "XAUUSDc")["visible"] is True
+    gateway.call("symbol_info", "BTCUSDc")  # other symbols stay cached
+    assert backend.calls.count("symbol_info") == 3
+
+    assert gateway.call("symbol_info_tick", "MISSING") is None
+    assert gateway.call("symbol_info_tick", "MISSING") is None
+    assert backend.calls.count("symbol_info_tick") == 2
+    gateway.stop()
+
+
+def test_last_error_is_captured_per_call():
+    backend = FakeBackend()
+    gateway = MT5Gateway(backend=backend)
+
+    assert gateway.call("symbol_info_tick", "MISSING") is None
+    assert gateway.last_error() == (-1, "symbol not found")
+    gateway.stop()
+
+
+def test_async_facade():
+    backend = FakeBackend()
+    gateway = MT5Gateway(backend=backend)
+
+    async def run():
+        return await asyncio.gather(*[gateway.acall("symbol_info_tick", "XAUUSDc") for _ in range(5)])
+
+    ticks = asyncio.run(run())
+    assert all(t.bid == 100.0 for t in ticks)
+    assert backend.calls.count("symbol_info_tick") == 1
+    gateway.stop()
+
+
+def test_proxy_routes_functions_and_exposes_constants():
+    backend = FakeBackend()
+    gateway = MT5Gateway(backend=backend)
+    proxy = MT5Proxy(gateway)
+
+    assert proxy.TIMEFRAME_M1 == 1
+    assert proxy.symbol_info_tick("XAUUSDc").ask == 100.5
+    assert "MT5GatewayWorker" in backend.threads
+    gateway.stop()
+
+
+def test_backend_exceptions_propagate():
+    class Broken(FakeBackend):
+        def symbol_info_tick(self, symbol):
+            raise ValueError("terminal gone")
+
+    gateway = MT5Gateway(backend=Broken())
+    with pytest.raises(ValueError):
+        gateway.call("symbol_info_tick", "XAUUSDc")
+    assert gateway.get_stats()["errors"] == 1
+    gateway.stop()
@@ -0,0 +1,184 @@
+"""
+Tests for app/io/mt5_ingestion_manager.py - cursor-based tick ingestion and the shared tick ring
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.io.mt5_ingestion_manager import (
+    IngestionConfig, MT5IngestionManager, MT5IngestionThread, TickData, TickRing
+)
+from infra.mt5_gateway import MT5Gateway
+from infra.mt5_simulator import MT5Simulator, TICK_DTYPE
+
+START = 1_700_000_040
+
+
+def _sim(times_ms, symbol="XAUUSDc"):
+    arr = np.zeros(len(times_ms), dtype=TICK_DTYPE)
+    arr["time_msc"] = times_ms
+    arr["time"] = arr["time_msc"] // 1000
+    arr["bid"] = 2000.0 + np.arange(len(times_ms)) * 0.01
+    arr["ask"] = arr["bid"] + 0.2
+    arr["last"] = arr["bid"]
+    arr["volume_real"] = 1.0
+    sim = MT5Simulator(seed=1)
+    sim.initialize()
+    sim.load_ticks(symbol, arr)
+    return sim
+
+
+def _thread(sim, ring=None, **config):
+    thread = MT5IngestionThread("XAUUSDc", IngestionConfig(**config), tick_ring=ring)
+    thread.mt5_connection = sim
+    return thread
+
+
+def test_cursor_pulls_each_tick_once_with_boundary_dedup():
+    base = START * 1000
+    # Several ticks share the same millisecond at the batch boundaries
+    times = [base, base + 100, base + 100, base + 100, base + 400, base + 1500, base + 1500, base + 2100]
+    sim = _sim(times)
+    sim.set_time(START)
+    thread = _thread(sim, tick_batch_size=1000)
+
+    first = thread._poll_tick_data()
+    assert [t.timestamp_ms for t in first] == [base]
+
+    sim.set_time(START + 1)  # reveals ticks up to base + 1000 ms
+    second = thread._poll_tick_data()
+    assert [t.timestamp_ms for t in second] == [base + 100] * 3 + [base + 400]
+    assert thread._poll_tick_data() is None  # nothing new: all re-read ticks deduplicated
+
+    sim.set_time(START + 3)
+    third = thread._poll_tick_data()
+    assert [t.timestamp_ms for t in third] == [base + 1500, base + 1500, base + 2100]
+    assert thread.stats.duplicate_ticks > 0
+
+
+def test_polls_through_the_gateway_see_new_ticks_immediately():
+    base = START * 1000
+    sim = _sim([base, base + 300])
+    sim.set_time(START)
+    gateway = MT5Gateway(backend=sim)
+    thread = _thread(gateway.mt5)
+    try:
+        assert [t.timestamp_ms for t in thread._poll_tick_data()] == [base]
+        # A tick arriving right after the previous poll (same copy_ticks_from request)
+        sim.set_time(START + 1)
+        assert [t.timestamp_ms for t in thread._poll_tick_data()] == [base + 300]
+        assert gateway.get_stats()["cache_hits"] == 0
+    finally:
+        gateway.stop()
+
+
+def test_small_batches_drain_backlog_without_losing_ticks():
+    base = START * 1000
+    times = [base + i * 10 for i in range(250)]  # 250 ticks within 2.5 seconds
+    sim = _sim(times)
+    sim.set_time(START + 10)
+    thread = _thread(sim, tick_batch_size=40, initial_lookback_ms=10_000)
+
+    seen = []
+    for _ in range(50):
+        ticks = thread._poll_tick_data()
+        if ticks:
+            seen.extend(t.timestamp_ms for t in ticks)
+        elif not thread.stats.backlog:
+            break
+    assert seen == times
+
+
+def test_gap_and_rate_stats():
+    base = START * 1000
+    sim = _sim([base, base + 100, base + 9100, base + 9200])
+    sim.set_time(START + 20)
+    thread = _thread(sim, initial_lookback_ms=30_000, gap_threshold_ms=5000)
+
+    ticks = thread._poll_tick_data()
+    assert len(ticks) == 4
+    stats = thread.get_ingestion_stats()
+    assert stats["gap_count"] == 1
+    assert stats["max_gap_ms"] == 9000
+    assert stats["ticks_per_sec"] > 0
+
+
+def test_tick_ring_read_since_and_overrun():
+    ring = TickRing(capacity_per_symbol=5)
+    ticks = [TickData("BTCUSDc", 1000 + i, 1.0, 1.1) for i in range(8)]
+
+    ring.publish("BTCUSDc", ticks[:3])
+    got, seq = ring.read_since("BTCUSDc", 0)
+    assert [t.timestamp_ms for t in got] == [1000, 1001, 1002] and seq == 3
+    assert ring.read_since("BTCUSDc", seq) == ([], 3)
+
+    ring.publish("BTCUSDc", ticks[3:])
+    got, seq = ring.read_since("BTCUSDc", 1)  # fell behind: oldest retained is seq 4
+    assert [t.timestamp_ms for t in got] == [1003, 1004, 1005, 1006, 1007] and seq == 8
+    assert ring.overruns == 1
+    assert ring.covers("BTCUSDc", 1003) and not ring.covers("BTCUSDc", 1002)
+    assert [t.timestamp_ms for t in ring.range("BTCUSDc", 1004, 1005)] == [1004, 1005]
+
+
+def test_manager_health_reports_ingestion_stats():
+    manager = MT5IngestionManager({"tick_ring_capacity": 100})
+    manager.add_symbol("XAUUSDc")
+    thread = manager.ingestion_threads["XAUUSDc"]
+    assert thread.tick_ring is manager.tick_ring
+
+    health = manager.get_health_status()
+    assert set(health["ingestion"]["XAUUSDc"]) >= {"backlog", "ticks_per_sec", "gap_count", "cursor_msc"}
+    assert health["backlogged_symbols"] == []
+    assert "tick_ring" in health
+
+
+def test_startup_helper_starts_one_shared_manager(monkeypatch):
+    from app.io import mt5_ingestion_manager as module
+
+    def fake_start(thread):
+        thread.state = module.IngestionState.RUNNING
+
+    monkeypatch.setattr(MT5IngestionThread, "start", fake_start)
+    monkeypatch.setattr(MT5IngestionThread, "stop", lambda thread: None)
+    try:
+        manager = module.start_ingestion_manager(["XAUUSDc", "BTCUSDc"])
+        assert module.get_ingestion_manager() is manager and module.get_tick_ring() is manager.tick_ring
+        assert manager.running and manager.is_ingesting("XAUUSDc") and manager.is_ingesting("BTCUSDc")
+        # A second start reuses the manager and only adds new symbols
+        assert module.start_ingestion_manager(["XAUUSDc", "EURUSDc"]) is manager
+        assert sorted(manager.ingestion_threads) == ["BTCUSDc", "EURUSDc", "XAUUSDc"]
+    finally:
+        module.shutdown_ingestion_manager()
+    assert module.get_tick_ring() is None
+
+
+def test_tick_fetcher_uses_ring_only_while_live_and_complete(monkeypatch):
+    from datetime import datetime, timezone
+    from infra.tick_metrics import tick_data_fetcher
+
+    class FakeManager:
+        def __init__(self):
+            self.tick_ring = TickRing()
+            self.ingesting = True
+
+        def is_ingesting(self, symbol):
+            return self.ingesting
+
+    manager = FakeManager()
+    manager.tick_ring.publish("XAUUSDc", [TickData("XAUUSDc", START * 1000 + i * 1000, 1.0, 1.1) for i in range(60)])
+    monkeypatch.setattr(tick_data_fetcher, "get_ingestion_manager", lambda: manager)
+    fetcher = tick_data_fetcher.TickDataFetcher.__new__(tick_data_fetcher.TickDataFetcher)
+    at = lambda seconds: datetime.fromtimestamp(START + seconds, tz=timezone.utc)
+
+    assert len(fetcher._ticks_from_ring("XAUUSDc", at(10), at(30))) == 21
+    # Ring stops before the end of the window (ingestion stalled): fall back to MT5
+    assert fetcher._ticks_from_ring("XAUUSDc", at(10), at(120)) is None
+    # Ring does not reach back to the start
+    assert fetcher._ticks_from_ring("XAUUSDc", at(-10), at(30)) is None
+    # Symbol no longer ingested: the retained ticks may be stale
+    manager.ingesting = False
+    assert fetcher._ticks_from_ring("XAUUSDc", at(10), at(30)) is None
@@ -0,0 +1,152 @@
+"""
+Tests for infra/mt5_simulator.py - deterministic MetaTrader5 simulator
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.mt5_simulator import MT5Simulator, FillModel, TICK_DTYPE, install, uninstall
+
+START = 1_700_000_040  # aligned to a minute boundary
+
+
+def _ticks(prices, start=START, step_ms=1000, spread=0.2):
+    arr = np.zeros(len(prices), dtype=TICK_DTYPE)
+    arr["time_msc"] = start * 1000 + np.arange(len(prices)) * step_ms
+    arr["time"] = arr["time_msc"] // 1000
+    arr["bid"] = prices
+    arr["ask"] = np.asarray(prices) + spread
+    return arr
+
+
+@pytest.fixture
+def sim():
+    s = MT5Simulator(seed=1)
+    s.initialize()
+    s.load_ticks("XAUUSDc", _ticks([2000.0 + i * 0.1 for i in range(180)]))
+    return s
+
+
+def test_clock_limits_visible_ticks(sim):
+    sim.set_time(START + 10)
+    assert sim.symbol_info_tick("XAUUSDc").bid == pytest.approx(2001.0)
+    ticks = sim.copy_ticks_range("XAUUSDc", START, START + 100)
+    assert len(ticks) == 11
+    assert ticks.dtype == TICK_DTYPE
+
+    sim.advance(20)
+    assert sim.symbol_info_tick("XAUUSDc").bid == pytest.approx(2003.0)
+    assert len(sim.copy_ticks_from("XAUUSDc", START + 5, 3)) == 3
+
+
+def test_bars_built_from_ticks_with_forming_bar(sim):
+    sim.set_time(START + 89)  # 1.5 M1 bars visible
+    bars = sim.copy_rates_from_pos("XAUUSDc", sim.TIMEFRAME_M1, 0, 10)
+    assert len(bars) == 2
+    assert bars[0]["open"] == pytest.approx(2000.0)
+    assert bars[0]["close"] == pytest.approx(2005.9)
+    assert bars[0]["tick_volume"] == 60
+    # Forming bar only reflects ticks up to the clock
+    assert bars[1]["close"] == pytest.approx(2008.9)
+    assert bars[1]["tick_volume"] == 30
+
+    assert len(sim.copy_rates_from_pos("XAUUSDc", sim.TIMEFRAME_M1, 1, 10)) == 1
+    assert len(sim.copy_rates_range("XAUUSDc", sim.TIMEFRAME_M1, START, START + 60)) == 2
+
+
+def test_recorded_rates_take_precedence(sim):
+    sim.load_rates("XAUUSDc", sim.TIMEFRAME_H1, [
+        {"time": START - 3600, "open": 1, "high": 2, "low": 0.5, "close": 1.5, "tick_volume": 10},
+        {"time": START + 3600, "open": 2, "high": 3, "low": 1.5, "close": 2.5, "tick_volume": 10},
+    ])
+    sim.set_time(START)
+    bars = sim.copy_rates_from_pos("XAUUSDc", sim.TIMEFRAME_H1, 0, 10)
+    assert len(bars) == 1
+    assert bars[0]["close"] == 1.5
+
+
+def test_market_order_open_and_close(sim):
+    sim.set_time(START)
+    res = sim.order_send({"action": sim.TRADE_ACTION_DEAL, "symbol": "XAUUSDc", "volume": 0.1,
+                          "type": sim.ORDER_TYPE_BUY, "sl": 1990.0, "tp": 2010.0})
+    assert res.retcode == sim.TRADE_RETCODE_DONE
+    assert res.price == pytest.approx(2000.2)  # filled at ask
+    assert len(sim.positions_get(ticket=res.order)) == 1
+
+    sim.advance(30)
+    pos = sim.positions_get(symbol="XAUUSDc")[0]
+    assert pos.profit == pytest.approx((2003.0 - 2000.2) * 0.1 * 100, abs=0.01)
+
+    close = sim.order_send({"action": sim.TRADE_ACTION_DEAL, "symbol": "XAUUSDc", "volume": 0.1,
+                            "type": sim.ORDER_TYPE_SELL, "position": res.order})
+    assert close.retcode == sim.TRADE_RETCODE_DONE
+    assert sim.positions_total() == 0
+    assert len(sim.history_deals_get(position=res.order)) == 2
+    assert sim.account_info().balance == pytest.approx(10000.0 + pos.profit)
+
+
+def test_take_profit_and_pending_orders_fill_on_advance(sim):
+    sim.set_time(START)
+    buy = sim.order_send({"action": sim.TRADE_ACTION_DEAL, "symbol": "XAUUSDc", "volume": 0.01,
+                          "type": sim.ORDER_TYPE_BUY, "sl": 1990.0, "tp": 2002.0})
+    stop = sim.order_send({"action": sim.TRADE_ACTION_PENDING, "symbol": "XAUUSDc", "volume": 0.01,
+                           "type": sim.ORDER_TYPE_BUY_STOP, "price": 2005.0})
+    assert stop.retcode == sim.TRADE_RETCODE_PLACED
+    assert len(sim.orders_get()) == 1
+
+    sim.advance(60)
+    assert not sim.positions_get(ticket=buy.order)
+    tp_deal = sim.history_deals_get(position=buy.order)[-1]
+    assert tp_deal.price == 2002.0 and tp_deal.comment == "[tp]"
+    assert sim.orders_total() == 0
+    assert sim.positions_get(ticket=stop.order)[0].price_open == 2005.0
+
+
+def test_fill_model_is_deterministic():
+    def run():
+        s = MT5Simulator(seed=42, fill_model=FillModel(random_slippage_points=50, reject_rate=0.3))
+        s.generate_ticks("BTCUSDc", start=START, seconds=60, start_price=50000.0)
+        results = []
+        for _ in range(20):
+            r = s.order_send({"action": s.TRADE_ACTION_DEAL, "symbol": "BTCUSDc", "volume": 0.01,
+                              "type": s.ORDER_TYPE_BUY})
+            results.append((r.retcode, r.price))
+        return results
+
+    first = run()
+    assert first == run()
+    assert {code for code, _ in first} == {MT5Simulator.TRADE_RETCODE_DONE, MT5Simulator.TRADE_RETCODE_REJECT}
+
+
+def test_unknown_symbol_sets_last_error(sim):
+    assert sim.symbol_info_tick("NOPE") is None
+    assert sim.last_error()[0] == sim.RES_E_NOT_FOUND
+
+
+def test_install_drives_mt5_service_through_gateway(sim):
+    install(sim)
+    try:
+        from infra.mt5_service import MT5Service
+        from infra.mt5_gateway import get_mt5_gateway
+
+        get_mt5_gateway().clear_cache()
+        sim.set_time(START + 119)
+        svc = MT5Service()
+        assert svc.connect()
+        quote = svc.get_quote("XAUUSDc")
+        assert quote.bid == pytest.approx(2011.9)
+
+        bars = svc.get_bars("XAUUSDc", "M1", 5)
+        assert len(bars) == 2
+        assert float(bars["close"].iloc[-1]) == pytest.approx(2011.9)
+
+        result = svc.market_order("XAUUSDc", "buy", lot=0.01, sl=2000.0, tp=2030.0, skip_filters=True)
+        assert result["ok"], result
+        assert sim.positions_total() == 1
+    finally:
+        uninstall()
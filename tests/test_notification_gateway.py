@@ -0,0 +1,151 @@
+"""
+Tests for infra/notification_gateway.py - callers return immediately, bursts are coalesced,
+deliveries are rate-limited and retried, and queue lag is reported
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.notification_gateway import NotificationGateway, coalesce_embeds, coalesce_texts
+
+URL = "https://discord.com/api/webhooks/1/abc"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self._body = body or {}
+        self.text = str(self._body)
+        self.headers = {}
+
+    def json(self):
+        return self._body
+
+
+class FakeClient:
+    """httpx.AsyncClient stand-in: records posts, replies from a script of status codes"""
+
+    def __init__(self, statuses=(), delay=0.0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.posts = []
+        self.closed = False
+
+    async def post(self, url, json=None):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.posts.append((url, json))
+        status = self.statuses.pop(0) if self.statuses else 204
+        return FakeResponse(status, {"retry_after": 0.01} if status == 429 else {})
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _gateway(client, **kwargs):
+    kwargs.setdefault("coalesce_window_s", 0.05)
+    kwargs.setdefault("backoff_s", 0.01)
+    return NotificationGateway(client_factory=lambda: client, **kwargs)
+
+
+def test_burst_is_coalesced_and_callers_do_not_block():
+    client = FakeClient(delay=0.3)
+    gateway = _gateway(client)
+    start = time.perf_counter()
+    for i in range(12):
+        assert gateway.submit_discord(URL, [{"title": "Alert", "description": f"msg {i}", "color": 1}], username="Bot")
+    assert time.perf_counter() - start < 0.2  # slow webhook does not stall the caller
+    assert gateway.flush(5)
+
+    assert len(client.posts) == 1
+    url, payload = client.posts[0]
+    assert url == URL and payload["username"] == "Bot"
+    assert payload["embeds"][0]["description"] == "\n\n".join(f"msg {i}" for i in range(12))
+    stats = gateway.get_stats()
+    assert stats["delivered"] == 12 and stats["coalesced"] == 11 and stats["posts"] == 1
+    assert stats["max_lag_ms"] >= 300 and stats["queue_depth"] == 0
+    gateway.stop()
+    assert client.closed
+
+
+def test_embed_packing_respects_discord_limits():
+    embeds = [{"title": f"T{i}", "description": "x" * 100, "color": 1} for i in range(23)]
+    posts = coalesce_embeds(embeds)
+    assert [len(p) for p in posts] == [10, 10, 3]
+    big = [{"title": "A", "description": "y" * 3000, "color": 1}, {"title": "A", "description": "z" * 3000, "color": 1}]
+    posts = coalesce_embeds(big)
+    assert [len(p) for p in posts] == [1, 1]  # cannot merge (4096) nor share a post (6000)
+    assert coalesce_texts(["a", "b", "c" * 4095]) == ["a\n\nb", "c" * 4095]
+
+
+def test_embeds_with_different_metadata_are_not_merged():
+    base = {"title": "Alert", "color": 1, "footer": {"text": "XAUUSDc"}}
+    embeds = [
+        {**base, "description": "a", "timestamp": "2026-01-08T10:00:00Z"},
+        {**base, "description": "b", "timestamp": "2026-01-08T10:00:05Z"},
+        {**base, "description": "c", "footer": {"text": "BTCUSDc"}, "timestamp": "2026-01-08T10:00:05Z"},
+        {**base, "description": "d", "footer": {"text": "BTCUSDc"}, "timestamp": "2026-01-08T10:00:05Z"},
+    ]
+    posts = coalesce_embeds(embeds)
+    assert len(posts) == 1
+    sent = posts[0]
+    assert [e["description"] for e in sent] == ["a", "b", "c\n\nd"]
+    assert [e["timestamp"] for e in sent] == ["2026-01-08T10:00:00Z", "2026-01-08T10:00:05Z", "2026-01-08T10:00:05Z"]
+    assert [e["footer"]["text"] for e in sent] == ["XAUUSDc", "XAUUSDc", "BTCUSDc"]
+
+    # Field text counts towards the 6000-character post limit
+    wide = [{"title": "F", "fields": [{"name": "n", "value": "v" * 1000}] * 4, "timestamp": str(i)} for i in range(2)]
+    assert [len(p) for p in coalesce_embeds(wide)] == [1, 1]
+
+
+def test_retries_on_server_errors_and_429():
+    client = FakeClient(statuses=[500, 429, 204])
+    gateway = _gateway(client)
+    gateway.submit_discord(URL, [{"title": "A", "description": "d"}])
+    assert gateway.flush(5)
+    stats = gateway.get_stats()
+    assert len(client.posts) == 3
+    assert stats["delivered"] == 1 and stats["retries"] == 2 and stats["rate_limited"] == 1
+
+    client.statuses = [400]
+    gateway.submit_discord(URL, [{"title": "B", "description": "d"}])
+    assert gateway.flush(5)
+    assert len(client.posts) == 4  # client errors are not retried
+    assert gateway.get_stats()["failed"] == 1
+    gateway.stop()
+
+
+def test_bounded_queue_drops_overflow():
+    gateway = _gateway(FakeClient(), max_queue=2, coalesce_window_s=0.2)
+    results = [gateway.submit_discord(URL, [{"title": "A", "description": str(i)}]) for i in range(5)]
+    assert results == [True, True, False, False, False]
+    assert gateway.get_stats()["dropped"] == 3
+    assert gateway.flush(5)
+    gateway.stop()
+
+
+def test_text_senders_are_rate_limited_per_channel():
+    sent = []
+    sent_at = []
+
+    def telegram_send(text):
+        sent.append(text)
+        sent_at.append(time.monotonic())
+
+    async def async_send(text):
+        sent.append(("async", text))
+
+    gateway = _gateway(FakeClient(), rate_limits={"text": (1, 0.2)})
+    for i in range(3):
+        gateway.submit_text("dtms", telegram_send, "x" * 3000 + str(i))  # too long to join
+    gateway.submit_text("other", async_send, "hello")
+    gateway.submit_text("other", async_send, "world")
+    assert gateway.flush(5)
+
+    assert [s for s in sent if isinstance(s, tuple)] == [("async", "hello\n\nworld")]
+    assert len(sent_at) == 3 and sent_at[-1] - sent_at[0] >= 0.35
+    gateway.stop()
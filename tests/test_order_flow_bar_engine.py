@@ -0,0 +1,174 @@
+"""
+Tests for infra/order_flow_bar_engine.py - incrementally folded bars, CVD, divergence and
+pressure match the per-request recomputation in BTCOrderFlowMetrics/WhaleDetector, and the
+order flow service's trade stream feeds the engine that get_metrics() reads
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.binance_aggtrades_stream import WhaleDetector
+from infra.btc_order_flow_metrics import BTCOrderFlowMetrics
+from infra.order_flow_bar_engine import (
+    T_CLOSE, T_CVD, T_HIGH, T_LOW, V_BUY, V_CVD, V_SELL, OrderFlowBarEngine, RingBuffer,
+)
+from infra.order_flow_service import OrderFlowService
+from infra.tick_by_tick_delta_engine import TickByTickDeltaEngine
+
+START = 1_767_225_600  # Minute-aligned
+
+
+def _trades(minutes=40, per_minute=25, seed=3, start=START):
+    rng = np.random.default_rng(seed)
+    price = 90_000.0
+    trades = []
+    for i in range(minutes * per_minute):
+        price += rng.normal(0, 15)
+        quantity = float(rng.uniform(0.01, 2.0))
+        trades.append({
+            "timestamp": start + i * 60.0 / per_minute + rng.uniform(0, 0.5),
+            "price": price,
+            "quantity": quantity,
+            "usd_value": price * quantity,
+            "side": "BUY" if rng.random() < 0.5 else "SELL",
+        })
+    return trades
+
+
+def _feed(engine, trades):
+    for trade in trades:
+        engine.process_aggtrade(trade)
+
+
+def test_ring_buffer_keeps_the_newest_rows():
+    buffer = RingBuffer(3)
+    for value in range(5):
+        buffer.append(value)
+    assert len(buffer) == 3 and buffer.tail().tolist() == [2, 3, 4]
+    assert buffer.tail(2).tolist() == [3, 4] and buffer.last() == 4
+
+    rows = RingBuffer(2, columns=3)
+    rows.append([1, 2, 3])
+    rows.append([4, 5, 6])
+    rows.append([7, 8, 9])
+    assert rows.tail().tolist() == [[4, 5, 6], [7, 8, 9]]
+    rows.clear()
+    assert len(rows) == 0 and rows.tail().shape == (0, 3)
+
+
+def test_bars_and_cvd_match_trade_history_aggregation():
+    trades = _trades(minutes=15)
+    engine = OrderFlowBarEngine("BTCUSDT")
+    _feed(engine, trades)
+
+    metrics = BTCOrderFlowMetrics()
+    reference = metrics._aggregate_trades_to_bars(trades)
+    bars = engine.bars()
+    assert len(bars) == len(reference) == engine.bar_count()
+    for row, bar in zip(bars, reference):
+        assert row[T_HIGH] == bar["high"] and row[T_LOW] == bar["low"] and row[T_CLOSE] == bar["close"]
+
+    cvd_values = np.cumsum([bar["buy_volume"] - bar["sell_volume"] for bar in reference])
+    assert bars[:, T_CVD] == pytest.approx(cvd_values)
+    state = engine.cvd_state(10)
+    assert state["cvd"] == pytest.approx(cvd_values[-1])
+    assert state["slope"] == pytest.approx(np.polyfit(np.arange(10), cvd_values[-10:], 1)[0])
+
+    # Fewer bars than the slope period use the simple difference
+    short = OrderFlowBarEngine("BTCUSDT")
+    _feed(short, _trades(minutes=4))
+    values = short.bars()[:, T_CVD]
+    assert short.cvd_state(10)["slope"] == pytest.approx((values[-1] - values[0]) / len(values))
+
+
+def test_divergence_matches_bar_detection_at_every_close():
+    metrics = BTCOrderFlowMetrics()
+    found = set()
+    for seed in range(4):
+        engine = OrderFlowBarEngine("BTCUSDT", max_bars=60)
+        closed = 0
+        for trade in _trades(minutes=60, per_minute=6, seed=seed):
+            engine.process_aggtrade(trade)
+            if len(engine.time_bars) == closed:
+                continue
+            closed = len(engine.time_bars)
+            bars = engine.bars(include_forming=False)
+            df = pd.DataFrame({"high": bars[:, T_HIGH], "low": bars[:, T_LOW], "close": bars[:, T_CLOSE]})
+            expected = metrics._detect_divergence_from_bars(df, bars[:, T_CVD].tolist())
+            assert engine.divergence() == pytest.approx(expected)
+            found.add(expected["type"])
+    assert {"bearish", "bullish"} & found
+
+
+def test_volume_bars_hold_a_fixed_size():
+    engine = OrderFlowBarEngine("BTCUSDT", volume_bar_size=1.0)
+    engine.process_aggtrade({"timestamp": START, "price": 100.0, "quantity": 0.6, "side": "BUY"})
+    engine.process_aggtrade({"timestamp": START + 1, "price": 101.0, "quantity": 1.9, "side": "SELL"})
+    deltas = engine.volume_bar_deltas()
+    # 0.6 buy + 0.4 sell, then 1.0 sell; 0.5 sell still forming
+    assert deltas == pytest.approx([0.2, -1.0])
+    bars = engine.volume_bars.tail()
+    assert bars[:, V_BUY] + bars[:, V_SELL] == pytest.approx([1.0, 1.0])
+    assert bars[:, V_CVD] == pytest.approx([0.2, -0.8])
+    assert engine.cvd == pytest.approx(-1.3)
+
+
+def test_pressure_matches_whale_detector():
+    now = time.time()
+    rng = np.random.default_rng(11)
+    detector = WhaleDetector()
+    engine = OrderFlowBarEngine("BTCUSDT")
+    for offset in range(55, 0, -1):
+        quantity = float(rng.uniform(0.1, 3.0))
+        trade = {"timestamp": now - offset, "price": 90_000.0, "quantity": quantity,
+                 "usd_value": 90_000.0 * quantity, "side": "BUY" if offset % 3 else "SELL"}
+        detector.update("BTCUSDT", trade)
+        engine.process_aggtrade(trade)
+
+    with patch("infra.binance_aggtrades_stream.time.time", return_value=now):
+        expected = detector.get_pressure("BTCUSDT", window=30)
+    assert engine.pressure(30, now=now) == pytest.approx(expected)
+    assert engine.pressure(30, now=now + 120) is None
+    assert engine.is_live(now) and not engine.is_live(now + 120)
+
+
+def test_tick_engine_histories_keep_their_api():
+    engine = TickByTickDeltaEngine("BTCUSDT", max_history=5)
+    for i in range(8):
+        engine.process_aggtrade({"side": "BUY" if i % 2 else "SELL", "quantity": 1.0 + i,
+                                 "price": 90_000.0, "timestamp": START + i})
+    assert engine.delta_history.maxlen == 5 and len(engine.get_delta_history()) == 5
+    assert engine.get_cvd_history(3) == engine.get_cvd_history()[-3:]
+    assert engine.get_cvd_trend(period=3)["trend"] in ("rising", "falling", "flat")
+
+
+def test_service_trade_stream_feeds_get_metrics():
+    service = OrderFlowService()
+    metrics = BTCOrderFlowMetrics(order_flow_service=service)
+    assert service.trade_listeners == [metrics.process_aggtrade]
+    metrics.initialize_tick_engine("BTCUSDT")
+    assert len(service.trade_listeners) == 1
+
+    now = time.time()
+    for trade in _trades(minutes=3, per_minute=20, start=now - 170):
+        asyncio.run(service._on_trade_update("BTCUSDT", trade))
+    engine = metrics.bar_engines["BTCUSDT"]
+    assert engine.trade_count == 60
+
+    service.running = True
+    with patch.object(metrics, "_detect_absorption_zones", return_value=[]), \
+            patch.object(service, "get_buy_sell_pressure") as rescan:
+        result = metrics.get_metrics("BTCUSDT", window_seconds=300)
+    rescan.assert_not_called()
+    pressure = engine.pressure(300)
+    assert result.delta_volume == pytest.approx(pressure["net_volume"])
+    assert result.cvd == pytest.approx(engine.cvd) and result.bar_count == engine.bar_count()
@@ -0,0 +1,213 @@
+"""
+Test plan-load fast path: updated_seq change tracking and incremental plan reloads
+"""
+
+import unittest
+import sys
+import sqlite3
+import os
+import json
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from auto_execution_system import AutoExecutionSystem, TradePlan
+
+
+def _insert_plan(db_path, plan_id, status="pending", entry_price=2000.0):
+    """Insert a plan row directly (simulates another process writing to the DB)"""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            INSERT INTO trade_plans
+            (plan_id, symbol, direction, entry_price, stop_loss, take_profit,
+             volume, conditions, created_at, created_by, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            plan_id, "XAUUSDc", "BUY", entry_price, entry_price - 10, entry_price + 10,
+            0.01, json.dumps({"price_near": entry_price}), "2026-01-08T00:00:00Z", "test", status
+        ))
+        conn.commit()
+
+
+class TestIncrementalPlanReload(unittest.TestCase):
+    """Test updated_seq column, triggers and incremental reload"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+
+        try:
+            self.auto_exec = AutoExecutionSystem(
+                db_path=self.temp_db.name,
+                mt5_service=None
+            )
+        except Exception as e:
+            self.skipTest(f"Could not initialize AutoExecutionSystem: {e}")
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        if hasattr(self, 'auto_exec'):
+            try:
+                self.auto_exec.stop()
+                if self.auto_exec.db_write_queue:
+                    self.auto_exec.db_write_queue.stop(timeout=5.0)
+                time.sleep(0.2)
+            except Exception:
+                pass
+        if os.path.exists(self.temp_db.name):
+            try:
+                os.unlink(self.temp_db.name)
+            except Exception:
+                pass
+
+    def _seq(self, plan_id):
+        with sqlite3.connect(self.temp_db.name) as conn:
+            return conn.execute(
+                "SELECT updated_seq FROM trade_plans WHERE plan_id = ?", (plan_id,)
+            ).fetchone()[0]
+
+    def test_updated_seq_index_exists(self):
+        """updated_seq column is indexed"""
+        with sqlite3.connect(self.temp_db.name) as conn:
+            indexes = [row[1] for row in conn.execute("PRAGMA index_list(trade_plans)")]
+        self.assertIn("idx_trade_plans_updated_seq", indexes)
+
+    def test_updated_seq_increases_on_insert_and_update(self):
+        """Every insert and update bumps updated_seq monotonically"""
+        _insert_plan(self.temp_db.name, "p1")
+        _insert_plan(self.temp_db.name, "p2")
+        seq1, seq2 = self._seq("p1"), self._seq("p2")
+        self.assertGreater(seq1, 0)
+        self.assertGreater(seq2, seq1)
+
+        with sqlite3.connect(self.temp_db.name) as conn:
+            conn.execute("UPDATE trade_plans SET notes = 'x' WHERE plan_id = 'p1'")
+            conn.commit()
+        self.assertGreater(self._seq("p1"), seq2)
+
+    def test_incremental_reload_adds_new_plans(self):
+        """Plans written by another process are picked up from changed rows only"""
+        self.assertEqual(self.auto_exec._reload_plans_incremental(), 0)
+
+        _insert_plan(self.temp_db.name, "p_new")
+        applied = self.auto_exec._reload_plans_incremental()
+
+        self.assertEqual(applied, 1)
+        self.assertIn("p_new", self.auto_exec.plans)
+        self.assertEqual(self.auto_exec.plans["p_new"].conditions, {"price_near": 2000.0})
+        # Nothing changed since - no rows fetched
+        self.assertEqual(self.auto_exec._reload_plans_incremental(), 0)
+
+    def test_incremental_reload_removes_cancelled_plans(self):
+        """Plans cancelled elsewhere are removed from memory"""
+        _insert_plan(self.temp_db.name, "p_cancel")
+        self.auto_exec._reload_plans_incremental()
+        self.assertIn("p_cancel", self.auto_exec.plans)
+
+        with sqlite3.connect(self.temp_db.name) as conn:
+            conn.execute("UPDATE trade_plans SET status = 'cancelled' WHERE plan_id = 'p_cancel'")
+            conn.commit()
+        self.auto_exec._reload_plans_incremental()
+        self.assertNotIn("p_cancel", self.auto_exec.plans)
+
+    def test_incremental_reload_applies_edits_to_loaded_plans(self):
+        """Edits made in the database to a plan already in memory replace it"""
+        _insert_plan(self.temp_db.name, "p_edit")
+        self.auto_exec._reload_plans_incremental()
+        loaded = self.auto_exec.plans["p_edit"]
+
+        with sqlite3.connect(self.temp_db.name) as conn:
+            conn.execute(
+                "UPDATE trade_plans SET entry_price = 2005.0, conditions = ? WHERE plan_id = 'p_edit'",
+                (json.dumps({"price_near": 2005.0}),)
+            )
+            conn.commit()
+        self.auto_exec._reload_plans_incremental()
+        plan = self.auto_exec.plans["p_edit"]
+        self.assertEqual(plan.entry_price, 2005.0)
+        self.assertEqual(plan.conditions, {"price_near": 2005.0})
+        self.assertEqual(self.auto_exec._plan_versions["p_edit"], self._seq("p_edit"))
+
+        # Rows that only carry the monitor's own tracking writes keep the in-memory plan
+        plan.zone_entry_tracked = True
+        with sqlite3.connect(self.temp_db.name) as conn:
+            conn.execute("UPDATE trade_plans SET zone_entry_tracked = 1 WHERE plan_id = 'p_edit'")
+            conn.commit()
+        self.auto_exec._reload_plans_incremental()
+        self.assertIs(self.auto_exec.plans["p_edit"], plan)
+        self.assertIsNot(plan, loaded)
+
+    def test_incremental_reload_does_not_resurrect_dropped_plans(self):
+        """A plan dropped in-process is not re-added from a stale pending row"""
+        _insert_plan(self.temp_db.name, "p_exec")
+        self.auto_exec._reload_plans_incremental()
+        with self.auto_exec.plans_lock:
+            del self.auto_exec.plans["p_exec"]
+
+        with sqlite3.connect(self.temp_db.name) as conn:
+            conn.execute("UPDATE trade_plans SET notes = 'zone' WHERE plan_id = 'p_exec'")
+            conn.commit()
+        self.auto_exec._reload_plans_incremental()
+        self.assertNotIn("p_exec", self.auto_exec.plans)
+
+    def test_reconcile_removes_deleted_plans(self):
+        """Full reconcile drops pending plans deleted from the database"""
+        _insert_plan(self.temp_db.name, "p_del")
+        self.auto_exec._reload_plans_incremental()
+        with sqlite3.connect(self.temp_db.name) as conn:
+            conn.execute("DELETE FROM trade_plans WHERE plan_id = 'p_del'")
+            conn.commit()
+
+        self.auto_exec._reconcile_plans()
+        self.assertNotIn("p_del", self.auto_exec.plans)
+
+    def test_notify_plans_changed_sets_reload_event(self):
+        """In-process notification wakes the monitor for an immediate reload"""
+        self.assertFalse(self.auto_exec._plan_reload_event.is_set())
+        self.auto_exec.notify_plans_changed()
+        self.assertTrue(self.auto_exec._plan_reload_event.is_set())
+
+    def test_notify_wakes_monitor_without_touching_stop_event(self):
+        """A plan notification cuts the loop's sleep short but can never swallow a stop()"""
+        self.auto_exec.notify_plans_changed()
+        self.assertFalse(self.auto_exec._stop_event.is_set())
+        start = time.monotonic()
+        self.auto_exec._wait_for_wake(5.0)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertFalse(self.auto_exec._wake_event.is_set())
+
+        self.auto_exec._stop_event.set()
+        self.auto_exec.notify_plans_changed()
+        self.auto_exec._wait_for_wake(5.0)
+        self.assertTrue(self.auto_exec._stop_event.is_set())
+
+    def test_load_plans_parses_by_column_name(self):
+        """_load_plans maps columns by name regardless of migration column order"""
+        plan = TradePlan(
+            plan_id="p_named",
+            symbol="XAUUSDc",
+            direction="BUY",
+            entry_price=2000.0,
+            stop_loss=1990.0,
+            take_profit=2010.0,
+            volume=0.01,
+            conditions={"strategy_type": "test"},
+            created_at="2026-01-08T00:00:00Z",
+            created_by="test",
+            status="pending_order_placed",
+            pending_order_ticket=12345
+        )
+        self.auto_exec.add_plan(plan)
+
+        plans = self.auto_exec._load_plans()
+        self.assertEqual(plans["p_named"].pending_order_ticket, 12345)
+        self.assertEqual(plans["p_named"].conditions, {"strategy_type": "test"})
+
+
+if __name__ == '__main__':
+    unittest.main()
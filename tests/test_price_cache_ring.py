@@ -0,0 +1,152 @@
+"""
+Tests for the ring-buffer PriceCache - views match the tick history across wrap-around,
+rolling stats match a full recomputation, and memory stays fixed per symbol
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.price_cache import PriceCache
+
+
+def _tick(i, price, with_ohlc=True):
+    tick = {"symbol": "BTCUSDT", "price": price, "volume": float(i % 7), "timestamp": 1_700_000_000 + i}
+    if with_ohlc:
+        tick.update(open=price - 1, high=price + 2, low=price - 3, close=price)
+    return tick
+
+
+def test_views_match_history_across_wraparound():
+    cache = PriceCache(max_ticks=50)
+    rng = np.random.default_rng(1)
+    ticks = [_tick(i, float(p), with_ohlc=i % 3 != 0) for i, p in enumerate(60000 + rng.normal(0, 50, 173))]
+    for tick in ticks:
+        cache.update("btcusdt", tick)
+
+    assert cache.get_tick_count("BTCUSDT") == 50
+    assert cache.get_history("BTCUSDT", 20) == ticks[-20:]
+    assert cache.get_history("BTCUSDT", 500) == ticks[-50:]
+    assert cache.get_latest("BTCUSDT") == ticks[-1]
+
+    arrays = cache.get_arrays("BTCUSDT", 30, fields=("price", "open", "volume", "timestamp"))
+    assert arrays["tick_id"] == 173 == cache.get_last_tick_id("BTCUSDT")
+    assert np.array_equal(arrays["price"], [t["price"] for t in ticks[-30:]])
+    assert np.array_equal(arrays["open"], [t.get("open", t["price"]) for t in ticks[-30:]])
+    assert np.array_equal(arrays["timestamp"], [t["timestamp"] for t in ticks[-30:]])
+
+    # Zero-copy and read-only; stable while fewer than (capacity - N) ticks arrive
+    assert not arrays["price"].flags.owndata and not arrays["price"].flags.writeable
+    with pytest.raises(ValueError):
+        arrays["price"][0] = 1.0
+    snapshot = arrays["price"].copy()
+    for i in range(20):
+        cache.update("BTCUSDT", _tick(200 + i, 1.0))
+    assert np.array_equal(arrays["price"], snapshot)
+
+    ohlcv = cache.get_ohlcv_arrays("BTCUSDT", 10)
+    assert set(ohlcv) == {"open", "high", "low", "close", "volume", "timestamp"}
+    assert np.array_equal(ohlcv["close"], np.ones(10))
+
+
+def test_rolling_stats_match_recomputation():
+    cache = PriceCache(max_ticks=64, stats_window=20)
+    rng = np.random.default_rng(2)
+    prices = 65000 + np.cumsum(rng.normal(0, 5, 500))
+    for i, p in enumerate(prices):
+        cache.update("BTCUSDT", _tick(i, float(p)))
+        window = prices[max(0, i - 19):i + 1]
+        stats = cache.get_rolling_stats("BTCUSDT")
+        assert stats["count"] == len(window)
+        assert stats["mean"] == pytest.approx(window.mean(), rel=1e-12)
+        assert stats["std"] == pytest.approx(window.std(), rel=1e-6, abs=1e-6)
+        assert stats["high"] == window.max() and stats["low"] == window.min()
+
+
+def test_clear_and_memory_bounded():
+    cache = PriceCache(max_ticks=100)
+    cache.update("ETHUSDT", _tick(0, 3000.0))
+    first = cache.get_memory_bytes("ETHUSDT")
+    for i in range(1, 1000):
+        cache.update("ETHUSDT", _tick(i, 3000.0 + i))
+    full = cache.get_memory_bytes("ETHUSDT")
+    assert full == cache.get_stats("ETHUSDT")["memory_bytes"]
+    # Buffers are preallocated: only the held tick dicts grow, up to max_ticks of them
+    assert full - first == 99 * sys.getsizeof(cache.get_latest("ETHUSDT"))
+
+    cache.clear("ETHUSDT")
+    assert cache.get_history("ETHUSDT") == [] and cache.get_latest("ETHUSDT") is None
+    assert cache.get_rolling_stats("ETHUSDT") is None
+    cache.update("ETHUSDT", _tick(1000, 1.0))
+    assert cache.get_history("ETHUSDT") == [_tick(1000, 1.0)]
+    assert cache.get_last_tick_id("ETHUSDT") == 1001
+
+
+def test_lock_free_readers_get_consistent_copies():
+    cache = PriceCache(max_ticks=256)
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        while not stop.is_set():
+            arrays = cache.get_arrays("BTCUSDT", 32, fields=("price", "timestamp"), copy=True)
+            p, ts = arrays["price"], arrays["timestamp"]
+            # price == tick index, timestamp == index + 1_700_000_000: consecutive, aligned
+            if len(p) and (np.any(np.diff(p) != 1) or np.any(ts - p != 1_700_000_000)):
+                errors.append((p.copy(), ts.copy()))
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for i in range(20000):
+        cache.update("BTCUSDT", _tick(i, float(i), with_ohlc=False))
+    stop.set()
+    for t in threads:
+        t.join()
+    assert not errors
+
+
+def test_full_ring_window_is_a_copy():
+    cache = PriceCache(max_ticks=16)
+    for i in range(40):
+        cache.update("BTCUSDT", _tick(i, float(i), with_ohlc=False))
+
+    # The whole ring includes the slot the next tick lands in: never handed out as a view
+    arrays = cache.get_arrays("BTCUSDT", 100, fields=("price",))
+    assert arrays["tick_id"] == 40 and np.array_equal(arrays["price"], np.arange(24, 40))
+    assert arrays["price"].flags.owndata
+    history = cache.get_history("BTCUSDT", 16)
+    cache.update("BTCUSDT", _tick(40, 40.0, with_ohlc=False))
+    assert np.array_equal(arrays["price"], np.arange(24, 40))
+    assert [t["price"] for t in history] == list(range(24, 40))
+
+    # One tick short of the ring is still a view
+    assert not cache.get_arrays("BTCUSDT", 15, fields=("price",))["price"].flags.owndata
+
+
+def test_lock_free_full_window_readers_stay_ordered():
+    cache = PriceCache(max_ticks=64)
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        while not stop.is_set():
+            p = cache.get_arrays("BTCUSDT", 64, fields=("price",))["price"]
+            h = [t["price"] for t in cache.get_history("BTCUSDT", 64)]
+            if (len(p) and np.any(np.diff(p) != 1)) or (len(h) > 1 and np.any(np.diff(h) != 1)):
+                errors.append((p.copy(), h))
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for i in range(20000):
+        cache.update("BTCUSDT", _tick(i, float(i), with_ohlc=False))
+    stop.set()
+    for t in threads:
+        t.join()
+    assert not errors
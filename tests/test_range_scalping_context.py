@@ -0,0 +1,205 @@
+"""
+Tests for the prepared range context in infra/range_scalping_analysis.py - shared M15 series
+match the per-helper calculations, the risk filters stop at the first hard reject, and fresh
+candle checks are reused until the candle would go stale
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra import range_scalping_analysis as analysis
+from infra import range_scalping_risk_filters as risk_filters_module
+from infra.range_scalping_analysis import (
+    RangeContext,
+    analyse_range_scalp_opportunity,
+    clear_range_contexts,
+    get_range_context,
+    get_range_context_stats,
+)
+from infra.range_scalping_risk_filters import RangeScalpingRiskFilters
+
+
+def _m15_df(n=120, seed=5, start="2026-10-12"):
+    rng = np.random.default_rng(seed)
+    close = 2500 + np.cumsum(rng.normal(0, 1.2, n))
+    opens = np.r_[2500.0, close[:-1]]
+    return pd.DataFrame({
+        "open": opens,
+        "high": np.maximum(opens, close) + rng.uniform(0, 1, n),
+        "low": np.minimum(opens, close) - rng.uniform(0, 1, n),
+        "close": close,
+        "tick_volume": rng.integers(50, 2000, n).astype(float),
+    }, index=pd.date_range(start, periods=n, freq="15min"))
+
+
+def _old_vwap_history(df, periods=5):
+    typical = (df["high"] + df["low"] + df["close"]) / 3
+    volumes = df["tick_volume"].fillna(0)
+    history = []
+    for i in range(min(periods, len(df))):
+        end = len(df) - i
+        start = max(0, end - 20)
+        tp, vol = typical.iloc[start:end], volumes.iloc[start:end]
+        history.append((tp * vol).sum() / vol.sum() if vol.sum() > 0 else tp.mean())
+    return history[::-1]
+
+
+def _old_bb_width_expansion(df, period=20, lookback=40):
+    closes = df["close"].values
+    current = closes[-period:]
+    current_width = np.std(current) * 4 / np.mean(current) * 100
+    widths = [
+        np.std(closes[i - period:i]) * 4 / np.mean(closes[i - period:i]) * 100
+        for i in range(max(period, len(df) - lookback), len(df) - period)
+    ]
+    return (current_width - np.mean(widths)) / np.mean(widths) * 100
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    clear_range_contexts()
+    risk_filters_module.clear_candle_freshness_cache()
+    yield
+    clear_range_contexts()
+    risk_filters_module.clear_candle_freshness_cache()
+
+
+def test_context_series_match_previous_calculations():
+    df = _m15_df()
+    context = RangeContext(df)
+    assert context.vwap_history(5) == pytest.approx(_old_vwap_history(df))
+    assert context.bb_width_expansion() == pytest.approx(_old_bb_width_expansion(df))
+    assert context.volume_stats() == pytest.approx((df["tick_volume"].iloc[-1], df["tick_volume"].iloc[-12:].mean()))
+
+    cvd = np.cumsum(np.sign(df["close"] - df["open"]) * df["tick_volume"]).to_numpy()
+    candle_cvd = context.candle_cvd()
+    assert candle_cvd["cvd"] == pytest.approx(cvd[-1])
+    assert candle_cvd["cvd_slope"] == pytest.approx((cvd[-1] - cvd[-10]) / 10)
+
+    # Short frames fall back exactly like the old per-helper windows
+    short = df.iloc[:12]
+    assert RangeContext(short).vwap_history(5) == pytest.approx(_old_vwap_history(short))
+    assert analysis._calculate_bb_width_expansion(short, []) is None
+
+    # Helpers read the context they are given; order flow CVD still takes precedence
+    assert analysis._calculate_vwap_history(df, [], 5, context=context) == context.vwap_history(5)
+    assert analysis._calculate_cvd_data(df, [], {"cvd": 12.0})["cvd"] == 12.0
+    assert analysis._calculate_cvd_data(df, [], {}, context=context) == candle_cvd
+    computed = context.computed
+    context.vwap_history(5), context.bb_width_expansion(), context.candle_cvd()
+    assert context.computed == computed and context.hits >= 3
+
+
+def test_contexts_are_shared_until_the_bar_changes():
+    df = _m15_df()
+    context = get_range_context("XAUUSDc", "M15", df)
+    assert get_range_context("XAUUSDc", "M15", df.copy()) is context
+    assert get_range_context("XAUUSDc", "M5", df) is not context
+    assert get_range_context(None, "M15", df) is not context
+
+    revised = df.copy()
+    revised.iloc[-1, revised.columns.get_loc("close")] += 1.0
+    assert get_range_context("XAUUSDc", "M15", revised) is not context
+    assert get_range_context("XAUUSDc", "M15", _m15_df(121)) is not context
+    assert get_range_context_stats()["hits"] == 1
+
+    swings = context.m15_swings()
+    assert swings and swings == analysis.RangeBoundaryDetector.labeled_swing_dicts(df)
+    assert context.m15_swings() is swings
+
+
+def test_filter_pipeline_stops_at_first_reject():
+    filters = RangeScalpingRiskFilters({})
+    calls = []
+
+    def step(name, passed):
+        return name, lambda: (calls.append(name) or passed, name.upper())
+
+    passed, results, timings, skipped = filters.run_filter_pipeline(
+        [step("a", True), step("b", False), step("c", True)]
+    )
+    assert passed is False and calls == ["a", "b"] and skipped == ["c"]
+    assert results == {"a": "A", "b": "B"} and set(timings) == {"a", "b"}
+
+    calls.clear()
+    passed, results, _, skipped = filters.run_filter_pipeline(
+        [step("a", True), step("b", False), step("c", True)], early_exit=False
+    )
+    assert passed is False and calls == ["a", "b", "c"] and skipped == []
+
+
+def test_fresh_candle_checks_are_reused_until_stale():
+    filters = RangeScalpingRiskFilters({})
+    now = datetime.now(timezone.utc)
+    fresh = (True, 1.0, {"candle_time": (now - timedelta(minutes=1)).isoformat(), "threshold_used": 5.5})
+    with patch.object(filters, "_check_candle_freshness", return_value=fresh) as check:
+        assert filters.check_data_quality("XAUUSDc", ["mt5_candles"])[0] is True
+        available, report, _ = filters.check_data_quality("XAUUSDc", ["mt5_candles"])
+        assert available is True and check.call_count == 1
+        assert report["mt5_candles"]["details"]["cached"] is True
+        assert 1.0 <= report["mt5_candles"]["age_minutes"] < 2.0
+
+    stale = (False, 9.0, {"candle_time": (now - timedelta(minutes=9)).isoformat(), "threshold_used": 5.5})
+    with patch.object(filters, "_check_candle_freshness", return_value=stale) as check:
+        filters.check_data_quality("EURUSDc", ["mt5_candles"])
+        filters.check_data_quality("EURUSDc", ["mt5_candles"])
+        assert check.call_count == 2
+
+    # Expired entries are checked again
+    key = ("XAUUSDc", next(iter(risk_filters_module._fresh_candles))[1])
+    risk_filters_module._fresh_candles[key] = (time.time() - 1, time.time() - 400, {})
+    with patch.object(filters, "_check_candle_freshness", return_value=fresh) as check:
+        filters.check_data_quality("XAUUSDc", ["mt5_candles"])
+        assert check.call_count == 1
+
+
+def _analyse(df, early_exit):
+    last = df.iloc[-1]
+    market_data = {
+        "current_price": float(last["close"]),
+        "pdh": float(df["high"].max()),
+        "pdl": float(df["low"].min()),
+        "vwap": float(df["close"].mean()),
+        "atr": 2.0,
+        "atr_5m": 2.0,
+        "m15_df": df,
+        "recent_candles": df.tail(20).reset_index(drop=True).to_dict("records"),
+    }
+    with patch.object(analysis, "IndicatorBridge"), \
+            patch.object(RangeScalpingRiskFilters, "check_data_quality", return_value=(True, {}, [])), \
+            patch.object(RangeScalpingRiskFilters, "check_session_filters", return_value=(True, "Session allowed")):
+        return asyncio.run(analyse_range_scalp_opportunity(
+            "XAUUSDc", market_data=market_data, indicators={"rsi": 50}, early_exit=early_exit
+        ))
+
+
+def test_analysis_reports_skipped_filters_and_timings():
+    df = _m15_df()
+    quick = _analyse(df, early_exit=True)
+    full = _analyse(df, early_exit=False)
+    assert quick["range_detected"] and full["range_detected"]
+
+    checks, full_checks = quick["risk_checks"], full["risk_checks"]
+    assert checks["confluence_score"] == full_checks["confluence_score"]
+    assert checks["risk_passed"] == full_checks["risk_passed"]
+    assert full_checks["skipped_filters"] == []
+    assert set(full_checks["filter_timings_ms"]) == {
+        "confluence", "session", "trade_activity", "false_range", "range_validity"
+    }
+    if not checks["risk_passed"]:
+        ran = list(checks["filter_timings_ms"])
+        assert ran + checks["skipped_filters"] == list(full_checks["filter_timings_ms"])
+        assert all(checks[key] is None for key, name in (
+            ("false_range_detected", "false_range"), ("range_valid", "range_validity")
+        ) if name in checks["skipped_filters"])
+    assert {"range_detection", "risk_filters", "scoring", "total"} <= set(quick["timings_ms"])
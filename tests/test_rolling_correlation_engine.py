@@ -0,0 +1,163 @@
+"""
+Tests for infra/rolling_correlation_engine.py - incremental pair statistics must match a
+full pandas recomputation, and the correlation calculator serves its conditions as lookups
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.correlation_context_calculator import CorrelationContextCalculator
+from infra.rolling_correlation_engine import RollingCorrelationEngine
+
+START = pd.Timestamp("2025-01-06 00:00", tz="UTC")
+
+
+def _bars(n, seed, drop=(), start=START):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    df = pd.DataFrame({"time": pd.date_range(start, periods=n, freq="5min"), "close": close})
+    return df.drop(index=list(drop)).reset_index(drop=True)
+
+
+def _pandas_stats(a, b, window_minutes, anchor):
+    ra = a.set_index("time")["close"].pct_change().dropna()
+    rb = b.set_index("time")["close"].pct_change().dropna()
+    joined = pd.concat([ra, rb], axis=1, join="inner").dropna()
+    joined = joined[(joined.index > anchor - pd.Timedelta(minutes=window_minutes)) & (joined.index <= anchor)]
+    x, y = joined.iloc[:, 0], joined.iloc[:, 1]
+    return len(joined), x.corr(y), x.cov(y) / y.var()
+
+
+def test_pair_stats_match_pandas_with_gaps():
+    a = _bars(400, 1, drop=range(50, 60))
+    b = _bars(400, 2, drop=(10, 200, 201, 399))
+    b["close"] = b["close"] * 0.3 + a.set_index("time")["close"].reindex(b["time"]).ffill().bfill().values * 0.7
+
+    engine = RollingCorrelationEngine()
+    engine.ingest_bars("XAUUSDc", a)
+    engine.ingest_bars("dxy", b)
+
+    anchor = a["time"].iloc[-1]
+    for window in (60, 600, 1200, 5000):
+        stats = engine.pair_stats("XAUUSDc", "dxy", window_minutes=window)
+        n, corr, beta = _pandas_stats(a, b, window, anchor)
+        assert stats["n"] == n
+        assert stats["correlation"] == pytest.approx(corr, abs=1e-9)
+        assert stats["beta"] == pytest.approx(beta, rel=1e-9)
+    # Symmetric correlation, beta depends on the direction
+    rev = engine.pair_stats("dxy", "XAUUSDc", window_minutes=5000)
+    assert rev["correlation"] == pytest.approx(engine.correlation("XAUUSDc", "dxy", 5000), abs=1e-12)
+
+
+def test_forming_bar_revision_and_incremental_ingest():
+    a, b = _bars(100, 3), _bars(100, 4)
+    engine = RollingCorrelationEngine()
+    engine.ingest_bars("a", a.iloc[:99])
+    engine.ingest_bars("b", b.iloc[:99])
+
+    # Last bar revised twice (forming), then re-ingesting the full frame applies only the tail
+    last_epoch = int(a["time"].iloc[98].timestamp())
+    engine.update("a", last_epoch + 60, 999.0)
+    engine.update("a", last_epoch + 120, a["close"].iloc[98])
+    assert engine.ingest_bars("a", a) == 2
+    assert engine.ingest_bars("b", b) == 2
+
+    fresh = RollingCorrelationEngine()
+    fresh.ingest_bars("a", a)
+    fresh.ingest_bars("b", b)
+    assert engine.correlation("a", "b") == pytest.approx(fresh.correlation("a", "b"), abs=1e-12)
+    assert engine.change_pct("a", 12) == pytest.approx(
+        (a["close"].iloc[-1] - a["close"].iloc[-12]) / a["close"].iloc[-12] * 100
+    )
+
+    engine.update("a", last_epoch - 600, 1.0)  # older than the last bar: ignored
+    assert engine.late_bars == 1
+
+
+def test_rebase_keeps_recent_window():
+    a, b = _bars(500, 5), _bars(500, 6)
+    engine = RollingCorrelationEngine(max_window_bars=100)
+    for i in range(500):
+        t = int(a["time"].iloc[i].timestamp())
+        engine.update("a", t, a["close"].iloc[i])
+        engine.update("b", t, b["close"].iloc[i])
+
+    stats = engine.pair_stats("a", "b", window_minutes=100 * 5)
+    n, corr, _ = _pandas_stats(a, b, 100 * 5, a["time"].iloc[-1])
+    assert stats["n"] == n == 100
+    assert stats["correlation"] == pytest.approx(corr, abs=1e-9)
+    assert len(engine.closes("a")) == 101
+
+
+def test_calculator_conditions_are_engine_lookups():
+    sym, dxy = _bars(300, 7), _bars(300, 8)
+    mt5 = Mock()
+    mt5.get_bars.return_value = sym
+    indices = Mock()
+
+    calls = []
+
+    async def dxy_bars(period="5d", interval="5m"):
+        calls.append((period, interval))
+        return dxy
+
+    indices.get_dxy_bars = dxy_bars
+    calc = CorrelationContextCalculator(mt5_service=mt5, market_indices_service=indices,
+                                        engine=RollingCorrelationEngine())
+
+    change = asyncio.run(calc.calculate_dxy_change_pct(60))
+    closes = dxy["close"].values
+    assert change == round((closes[-1] - closes[-12]) / closes[-12] * 100, 2)
+
+    # Bars already held: re-sync applies nothing new, stall check is a lookup on the same series
+    asyncio.run(calc.detect_dxy_stall(60))
+    assert calc.engine.get_stats()["series"] == 1
+    assert len(calls) == 2
+
+    calc.engine.ingest_bars("XAUUSDc", sym)
+    corr, _ = asyncio.run(calc._calculate_correlation("XAUUSDc", "dxy", 240))
+    n, want, _ = _pandas_stats(sym, dxy, 240 * 5, sym["time"].iloc[-1])
+    assert corr == pytest.approx(want, abs=1e-9)
+    assert calc.correlation_matrix(window_minutes=240 * 5).loc["XAUUSDc", "dxy"] == pytest.approx(want, abs=1e-9)
+
+
+def test_calculators_share_engine_and_fetch_only_new_bars():
+    sym = _bars(300, 9)
+    requests = []
+
+    def get_bars(symbol, timeframe, count):
+        if symbol != "XAUUSDc":
+            return None
+        requests.append(count)
+        return held.tail(count).reset_index(drop=True)
+
+    mt5 = Mock()
+    mt5.get_bars.side_effect = get_bars
+    engine = RollingCorrelationEngine()
+
+    held = sym.iloc[:250]
+    first = CorrelationContextCalculator(mt5_service=mt5, engine=engine)
+    asyncio.run(first.calculate_correlation_context("XAUUSDc", 240))
+    assert requests == [48]
+
+    # A new calculator on the same engine only asks for the tail
+    held = sym.iloc[:253]
+    second = CorrelationContextCalculator(mt5_service=mt5, engine=engine)
+    asyncio.run(second.calculate_correlation_context("XAUUSDc", 240))
+    assert requests[1] == CorrelationContextCalculator.TAIL_BARS
+    assert engine.closes("XAUUSDc")[-1] == sym["close"].iloc[252]
+
+    # A tail that no longer reaches the held bars is refetched in full
+    held = sym
+    result = asyncio.run(second.calculate_correlation_context("XAUUSDc", 240))
+    assert requests[2:] == [CorrelationContextCalculator.TAIL_BARS, 48]
+    np.testing.assert_allclose(engine.closes("XAUUSDc", 49), sym["close"].values[-49:])
+    assert result["sample_size"] == 48
@@ -0,0 +1,157 @@
+"""
+Tests for infra/scan_engine.py - one fetch per symbol per bar, batched decisions that
+match decide_trade, and candidates published once to every consumer
+"""
+
+import asyncio
+import random
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from decision_engine import decide_trade
+from infra.scan_engine import DECISION_TIMEFRAMES, ScanEngine
+
+SYMBOLS = ["XAUUSDc", "BTCUSDc", "EURUSDc", "USDJPYc"]
+
+
+class FakeBridge:
+    def __init__(self, seed=1):
+        self.rng = random.Random(seed)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _tf(self, price):
+        rng = self.rng
+        return {
+            "close": price, "ema_200": price * (1 + rng.uniform(-0.01, 0.01)),
+            "ema_200_slope": rng.uniform(-0.003, 0.003), "adx_14": rng.uniform(10, 45),
+            "rsi_14": rng.uniform(20, 80), "atr_14": price * 0.002, "bb_width": rng.uniform(0.005, 0.03),
+        }
+
+    def get_multi(self, symbol):
+        with self._lock:
+            self.calls.append(symbol)
+            price = self.rng.uniform(1, 3000)
+            return {tf: self._tf(price) for tf in DECISION_TIMEFRAMES + ("H4",)}
+
+
+class FakeEnrichment:
+    def __init__(self):
+        self.calls = 0
+
+    def enrich_timeframe(self, symbol, data, timeframe):
+        self.calls += 1
+        return {**data, "enriched_tf": timeframe}
+
+
+class Clock:
+    def __init__(self, t):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def test_one_fetch_per_symbol_per_bar_shared_by_consumers():
+    bridge, clock = FakeBridge(), Clock(1_700_000_000 + 10)
+    engine = ScanEngine(bridge=bridge, clock=clock)
+    published = []
+    engine.subscribe("discord", lambda c: published.append(("discord", [x.symbol for x in c])))
+    engine.subscribe("telegram", lambda c: published.append(("telegram", [x.symbol for x in c])))
+
+    first = engine.scan(SYMBOLS)
+    second = engine.scan(SYMBOLS[:2])  # other consumer, same bar: served from the first scan
+    assert len(bridge.calls) == len(SYMBOLS)
+    assert [c.symbol for c in second] == SYMBOLS[:2]
+    assert second[0] is first[0]
+    assert published == [("discord", SYMBOLS), ("telegram", SYMBOLS)]
+
+    # Readers of the snapshot in the same bar do not re-fetch
+    assert engine.get_multi("XAUUSDc") is first[0].multi
+    stats = engine.get_stats()
+    assert stats["fetches"] == 4 and stats["shared_hits"] == 1 and stats["duplicate_fetches"] == 0
+    assert set(stats["latency_ms"]) == set(SYMBOLS)
+
+    clock.t += 300  # next bar closed
+    engine.scan(SYMBOLS)
+    assert len(bridge.calls) == 8
+    assert engine.get_stats()["scans"] == 2
+
+
+def test_decisions_match_decide_trade_on_enriched_payloads():
+    enrichment = FakeEnrichment()
+    engine = ScanEngine(bridge=FakeBridge(seed=5), enrichment=enrichment, clock=Clock(1_700_000_000))
+    symbols = [f"SYM{i}c" for i in range(20)]
+    candidates = engine.scan(symbols)
+
+    assert enrichment.calls == 20 * len(DECISION_TIMEFRAMES)
+    for candidate in candidates:
+        payloads = [candidate.timeframes[tf] for tf in DECISION_TIMEFRAMES]
+        assert payloads[0]["enriched_tf"] == "M5"
+        want = decide_trade(candidate.symbol, *payloads)
+        for key in ("direction", "strategy", "confidence", "regime"):
+            assert candidate.rec[key] == want[key]
+
+
+def test_input_builder_feeds_enriched_decisions():
+    """A process's consumer (Telegram: feature-builder tech) chooses the decision inputs"""
+    def feature_tech(symbol, multi):
+        tech = {tf: {**multi[tf], "ema_200_slope": 0.0} for tf in DECISION_TIMEFRAMES}
+        tech["symbol"] = symbol
+        return tech
+
+    enrichment = FakeEnrichment()
+    engine = ScanEngine(bridge=FakeBridge(seed=9), enrichment=enrichment, clock=Clock(1_700_000_000),
+                        input_builder=feature_tech)
+    candidates = engine.scan(SYMBOLS)
+
+    assert enrichment.calls == len(SYMBOLS) * len(DECISION_TIMEFRAMES)
+    for candidate in candidates:
+        assert candidate.tech["symbol"] == candidate.symbol
+        payloads = [candidate.timeframes[tf] for tf in DECISION_TIMEFRAMES]
+        assert payloads[1] == {**candidate.tech["M15"], "enriched_tf": "M15"}
+        want = decide_trade(candidate.symbol, *payloads)
+        for key in ("direction", "strategy", "confidence", "regime"):
+            assert candidate.rec[key] == want[key]
+
+
+def test_empty_fetch_is_retried_and_counted():
+    class FlakyBridge(FakeBridge):
+        def get_multi(self, symbol):
+            result = super().get_multi(symbol)
+            return {} if len(self.calls) == 1 else result
+
+    bridge = FlakyBridge()
+    engine = ScanEngine(bridge=bridge, clock=Clock(1_700_000_000))
+    assert engine.scan(["XAUUSDc"]) == []
+    assert len(engine.scan(["XAUUSDc"])) == 1
+    assert engine.get_stats()["duplicate_fetches"] == 1
+
+
+def test_async_consumer_runs_on_its_loop():
+    engine = ScanEngine(bridge=FakeBridge(), clock=Clock(1_700_000_000))
+
+    async def main():
+        got = asyncio.Event()
+        seen = []
+
+        async def consumer(candidates):
+            seen.extend(c.symbol for c in candidates)
+            got.set()
+
+        engine.subscribe("telegram", consumer, loop=asyncio.get_running_loop())
+        await engine.ascan(SYMBOLS)
+        await asyncio.wait_for(got.wait(), 5)
+        return seen
+
+    assert asyncio.run(main()) == SYMBOLS
+
+
+def test_seconds_to_next_scan():
+    engine = ScanEngine(bridge=FakeBridge(), clock=Clock(1_700_000_100), close_delay_s=5)
+    assert engine.seconds_to_next_scan() == 1_700_000_105 - 1_700_000_100
+    engine.clock = Clock(1_700_000_102)
+    assert engine.seconds_to_next_scan() == 3
@@ -0,0 +1,141 @@
+"""
+Tests for infra/session_calendar.py - the precomputed calendar answers exactly what the
+per-call session/weekend rules did, and time-gated plans wake at their boundary
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra import session_calendar
+from infra.session_calendar import SessionCalendar, get_session_calendar, is_weekend, session_at
+from infra.universal_sl_tp_manager import Session, detect_session
+from infra.weekend_profile_manager import WeekendProfileManager
+
+START = datetime(2026, 10, 12, tzinfo=timezone.utc)  # Monday
+
+
+def _old_session(hour):
+    if 13 <= hour < 16:
+        return "OVERLAP"
+    if hour < 8:
+        return "ASIAN"
+    if hour < 13:
+        return "LONDON"
+    return "NY" if hour < 21 else "POST_NY"
+
+
+def _old_weekend(weekday, hour):
+    return (weekday == 4 and hour >= 23) or weekday in (5, 6) or (weekday == 0 and hour < 3)
+
+
+@pytest.fixture(autouse=True)
+def fresh_calendars():
+    session_calendar.clear_session_calendars()
+    yield
+    session_calendar.clear_session_calendars()
+
+
+def test_lookups_match_previous_rules_over_three_weeks():
+    sessions = {s.value: s for s in Session}
+    for minutes in range(0, 60 * 24 * 21, 13):
+        when = START + timedelta(minutes=minutes)
+        assert session_at(when) == _old_session(when.hour)
+        assert is_weekend(when) == _old_weekend(when.weekday(), when.hour)
+    assert detect_session("XAUUSDc", START + timedelta(hours=14)) == Session.LONDON_NY_OVERLAP
+    assert detect_session("BTCUSDc", START + timedelta(hours=22)) == sessions["LATE_NY"]
+    # Naive datetimes are read as UTC
+    assert session_at(datetime(2026, 10, 13, 9, 30)) == "LONDON"
+
+
+def test_spans_and_next_boundaries():
+    calendar = SessionCalendar("fx", START)
+    span = calendar.span("session", START + timedelta(hours=14, minutes=30))
+    assert (span.label, span.start.hour, span.end.hour) == ("OVERLAP", 13, 16)
+    assert span.seconds_left(START + timedelta(hours=15)) == 3600
+    assert calendar.next_start("session", "LONDON", START + timedelta(hours=9)) == START + timedelta(days=1, hours=8)
+    assert calendar.label("kill_zone", START + timedelta(hours=3)) is False
+    assert calendar.label("kill_zone", START + timedelta(hours=10)) is True
+    # 5 sessions a day over the 8-day horizon
+    assert calendar.boundaries("session") == 40
+
+    friday_late = START + timedelta(days=4, hours=21, minutes=30)
+    assert calendar.label("market_open", friday_late) is False
+    assert calendar.span("market_open", friday_late).end == START + timedelta(days=6, hours=22)
+    assert SessionCalendar("crypto", START).label("market_open", friday_late) is True
+    assert calendar.label("weekend_subsession", START + timedelta(days=6, hours=13)) == "CME_ANTICIPATION"
+
+
+def test_calendars_are_shared_per_market_and_day():
+    today = get_session_calendar("XAUUSDc")
+    assert get_session_calendar("EURUSDc") is today
+    assert get_session_calendar("BTCUSDc") is not today
+    assert today.day == datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    old = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+    historical = get_session_calendar(None, old)
+    assert historical.covers(old) and historical is not today
+    assert get_session_calendar(None, old + timedelta(days=2)) is historical
+    assert get_session_calendar("XAUUSDc") is today
+
+
+def test_weekend_manager_reads_the_calendar():
+    manager = WeekendProfileManager()
+    saturday = START + timedelta(days=5, hours=7)
+    assert manager.is_weekend_active(saturday) is True
+    assert manager.get_weekend_subsession(saturday) == "LOW_LIQUIDITY_RANGE"
+    assert manager.get_weekend_subsession(START + timedelta(hours=12)) is None
+    ends, starts = manager.get_time_until_weekend_ends(), manager.get_time_until_weekend_starts()
+    assert (ends is None) != (starts is None)
+
+
+@pytest.fixture
+def auto_exec(tmp_path):
+    from auto_execution_system import AutoExecutionSystem
+    with patch('infra.database_write_queue.DatabaseWriteQueue'):
+        with patch.object(AutoExecutionSystem, '_load_plans', return_value={}):
+            system = AutoExecutionSystem(db_path=str(tmp_path / "plans.db"), mt5_service=Mock())
+            system.db_write_queue = None
+    return system
+
+
+def _plan(**conditions):
+    from auto_execution_system import TradePlan
+    return TradePlan(
+        plan_id="gate_test", symbol="XAUUSDc", direction="BUY", entry_price=2500.0,
+        stop_loss=2490.0, take_profit=2520.0, volume=0.01, conditions=conditions,
+        created_at=(START + timedelta(hours=12)).isoformat(), created_by="test", status="pending",
+    )
+
+
+def test_time_gated_plans_are_skipped_until_their_boundary(auto_exec):
+    plan = _plan(time_after="2099-01-01T00:00:00+00:00")
+    auto_exec._gate_plan_until(plan, datetime.now(timezone.utc) + timedelta(seconds=5))
+    assert auto_exec._should_skip_plan(plan) is True
+    assert 0 < auto_exec._next_time_gate_delay() <= 5
+
+    # Edited conditions invalidate the gate
+    plan.conditions = dict(plan.conditions)
+    assert auto_exec._is_time_gated(plan) is False
+    assert auto_exec._next_time_gate_delay() is None
+
+    auto_exec._gate_until_session(plan, "London")
+    until, _ = auto_exec._time_gates[plan.plan_id]
+    start = datetime.fromtimestamp(until, timezone.utc)
+    assert (start.hour, start.minute) == (8, 0) and until > time.time()
+    auto_exec._gate_until_session(_plan(), "NY_close")  # not a calendar session - no gate
+    auto_exec._cleanup_plan_resources(plan.plan_id, plan.symbol)
+    assert auto_exec._time_gates == {}
+
+
+def test_plan_created_during_weekend_uses_calendar(auto_exec):
+    plan = _plan()
+    assert auto_exec._is_plan_created_during_weekend(plan) is False
+    plan.created_at = (START + timedelta(days=6, hours=4)).isoformat().replace("+00:00", "Z")
+    assert auto_exec._is_plan_created_during_weekend(plan) is True
@@ -0,0 +1,141 @@
+"""
+Tests for infra/span_tracer.py - nested spans aggregate by path with correct self time,
+feed the HDR span histograms, export folded stacks, and the sampling profiler sees threads
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infra.hdr_histograms import HDRHistogramManager
+from infra.span_tracer import SamplingProfiler, SpanTracer
+
+
+def _tracer(**kwargs):
+    return SpanTracer(histogram_manager=HDRHistogramManager(), **kwargs)
+
+
+def test_nested_spans_aggregate_by_path_with_self_time():
+    tracer = _tracer()
+    for plan_id in ("p1", "p2"):
+        with tracer.span("check_conditions", plan_id=plan_id) as root:
+            with tracer.span("m1_validation"):
+                with tracer.span("mt5.copy_rates"):
+                    time.sleep(0.02)
+            with tracer.span("mt5.get_quote"):
+                time.sleep(0.01)
+            root.set_tag("met", False)
+
+    stats = tracer.get_span_stats()
+    assert set(stats) == {"check_conditions", "check_conditions/m1_validation",
+                          "check_conditions/m1_validation/mt5.copy_rates", "check_conditions/mt5.get_quote"}
+    root = stats["check_conditions"]
+    assert root["count"] == 2 and root["total_ms"] >= 60
+    # Self time excludes children
+    assert root["self_ms"] < 5
+    assert stats["check_conditions/m1_validation"]["self_ms"] < 5
+    assert stats["check_conditions/m1_validation/mt5.copy_rates"]["total_ms"] >= 40
+
+    report = tracer.get_perf_report()
+    assert list(report["spans"])[0] == "check_conditions"  # slowest total first
+    leaf = report["spans"]["check_conditions/m1_validation/mt5.copy_rates"]
+    assert 20 <= leaf["p50_ms"] <= leaf["p99_ms"]
+
+    traces = tracer.get_recent_traces()
+    assert [t["tags"]["plan_id"] for t in traces] == ["p2", "p1"]
+    assert traces[0]["tags"]["met"] is False
+    assert [c["name"] for c in traces[0]["children"]] == ["m1_validation", "mt5.get_quote"]
+
+    folded = dict(line.rsplit(" ", 1) for line in tracer.export_folded().splitlines())
+    assert int(folded["check_conditions;m1_validation;mt5.copy_rates"]) >= 40000
+
+
+def test_traced_decorator_tags_errors_and_threads():
+    tracer = _tracer()
+
+    class Checker:
+        @tracer.traced("check_conditions", tags=lambda self, plan: {"plan_id": plan})
+        def check(self, plan):
+            return self.confluence(plan)
+
+        @tracer.traced("confluence")
+        def confluence(self, plan):
+            if plan == "bad":
+                raise ValueError("boom")
+            return 80
+
+    checker = Checker()
+    threads = [threading.Thread(target=checker.check, args=(f"p{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with pytest.raises(ValueError):
+        checker.check("bad")
+
+    stats = tracer.get_span_stats()
+    assert stats["check_conditions"]["count"] == 5
+    assert stats["check_conditions/confluence"]["count"] == 5  # never attributed to another thread's span
+    assert stats["check_conditions/confluence"]["errors"] == 1
+    assert {t["tags"]["plan_id"] for t in tracer.get_recent_traces()} == {"p0", "p1", "p2", "p3", "bad"}
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = _tracer(enabled=False)
+
+    @tracer.traced("noop")
+    def work():
+        return 1
+
+    with tracer.span("outer") as span:
+        span.set_tag("x", 1)
+        assert work() == 1
+    assert tracer.get_span_stats() == {} and tracer.get_recent_traces() == []
+
+
+
+def test_db_connection_spans_exclude_the_callers_work():
+    from types import SimpleNamespace
+    from unittest.mock import patch
+
+    from auto_execution_system import AutoExecutionSystem
+
+    tracer = _tracer()
+    owner = SimpleNamespace(_db_manager=None, db_path=":memory:")
+    with patch("auto_execution_system.get_span_tracer", return_value=tracer):
+        with tracer.span("check_conditions"):
+            with AutoExecutionSystem._get_db_connection(owner) as conn:
+                conn.execute("SELECT 1")
+                time.sleep(0.03)
+
+    stats = tracer.get_span_stats()
+    assert set(stats) == {"check_conditions", "check_conditions/sqlite.connect", "check_conditions/sqlite.close"}
+    assert stats["check_conditions"]["self_ms"] >= 30
+    assert stats["check_conditions/sqlite.connect"]["total_ms"] < 30
+    assert stats["check_conditions/sqlite.close"]["total_ms"] < 30
+
+def test_sampling_profiler_folds_thread_stacks():
+    stop = threading.Event()
+
+    def busy_condition_check():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_condition_check, name="ProfilerTestWorker")
+    worker.start()
+    profiler = SamplingProfiler()
+    try:
+        result = profiler.profile(seconds=0.2, interval_s=0.005, thread_filter="ProfilerTestWorker")
+    finally:
+        stop.set()
+        worker.join()
+
+    assert result["samples"] > 5
+    stacks = result["folded"].splitlines()
+    assert stacks and all(line.startswith("ProfilerTestWorker;") for line in stacks)
+    assert any("busy_condition_check" in line for line in stacks)
@@ -0,0 +1,177 @@
+"""
+Tests for app/database/streaming_bar_builder.py and its MTFDatabaseManager wiring
+"""
+
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.streaming_bar_builder import StreamingBarBuilder
+
+BASE_MS = 1_700_000_000_000 - 1_700_000_000_000 % 14_400_000  # aligned to an H4 boundary
+
+
+def _feed(builder, symbol, ticks):
+    finished = []
+    for ts, bid, ask, volume in ticks:
+        finished.extend(builder.add_tick(symbol, ts, bid, ask, volume))
+    return finished
+
+
+def _reference_m1(ticks):
+    """Group ticks by minute the way the old GROUP BY path did"""
+    groups = {}
+    for ts, bid, ask, volume in ticks:
+        groups.setdefault(ts - ts % 60_000, []).append(((bid + ask) / 2, volume, ask - bid))
+    bars = {}
+    for start, items in groups.items():
+        prices = [p for p, _, _ in items]
+        bars[start] = (prices[0], max(prices), min(prices), prices[-1],
+                       sum(v for _, v, _ in items), len(items), sum(s for _, _, s in items) / len(items))
+    return bars
+
+
+def _ticks(minutes, per_minute=6):
+    ticks = []
+    for m in range(minutes):
+        for k in range(per_minute):
+            ts = BASE_MS + m * 60_000 + k * 10_000
+            bid = 100.0 + ((m * 7 + k * 3) % 11) * 0.5
+            ticks.append((ts, bid, bid + 0.2, 1.0 + k))
+    return ticks
+
+
+def test_m1_bars_match_grouped_reference():
+    ticks = _ticks(12)
+    builder = StreamingBarBuilder(('M1',))
+    finished = _feed(builder, "XAUUSDc", ticks)
+
+    reference = _reference_m1(ticks)
+    assert len(finished) == 11  # last minute still forming
+    for row in finished:
+        o, h, l, c, v, n, spread = reference[row[2]]
+        assert row[3:9] == pytest.approx((o, h, l, c, v, n))
+        assert row[9] == pytest.approx(spread)
+
+    forming = builder.forming_bars("XAUUSDc")
+    assert len(forming) == 1
+    assert forming[0][2] == BASE_MS + 11 * 60_000
+
+
+def test_rollups_match_m1_aggregation():
+    ticks = _ticks(31)
+    builder = StreamingBarBuilder(('M1', 'M5', 'M15'))
+    finished = _feed(builder, "EURUSDc", ticks)
+
+    m1 = [r for r in finished if r[1] == 'M1']
+    m5 = [r for r in finished if r[1] == 'M5']
+    m15 = [r for r in finished if r[1] == 'M15']
+    # M5 bars close once the next M5 bucket receives a finished M1 bar
+    assert [r[2] for r in m5] == [BASE_MS + i * 300_000 for i in range(5)]
+    assert [r[2] for r in m15] == [BASE_MS]
+
+    for bar in m5 + m15:
+        period = 300_000 if bar[1] == 'M5' else 900_000
+        parts = [r for r in m1 if bar[2] <= r[2] < bar[2] + period]
+        assert bar[3] == parts[0][3]
+        assert bar[4] == max(r[4] for r in parts)
+        assert bar[5] == min(r[5] for r in parts)
+        assert bar[6] == parts[-1][6]
+        assert bar[7] == pytest.approx(sum(r[7] for r in parts))
+        assert bar[8] == sum(r[8] for r in parts)
+
+
+def test_forming_rollup_includes_open_m1_bar():
+    builder = StreamingBarBuilder(('M1', 'H1'))
+    _feed(builder, "BTCUSDc", [
+        (BASE_MS, 100.0, 101.0, 1.0),
+        (BASE_MS + 60_000, 110.0, 111.0, 1.0),
+        (BASE_MS + 61_000, 90.0, 91.0, 1.0),
+    ])
+    h1 = [r for r in builder.forming_bars() if r[1] == 'H1'][0]
+    assert h1[3:9] == (100.5, 110.5, 90.5, 90.5, 3.0, 3)
+
+
+def test_late_ticks_are_ignored_and_counted():
+    builder = StreamingBarBuilder()
+    _feed(builder, "XAUUSDc", [(BASE_MS + 120_000, 1.0, 1.0, 0), (BASE_MS, 2.0, 2.0, 0)])
+    assert builder.get_stats()['late_ticks'] == 1
+    assert builder.forming_bars()[0][3] == 1.0
+
+
+def test_unsupported_timeframe_rejected():
+    with pytest.raises(ValueError):
+        StreamingBarBuilder(('M1', 'M7'))
+
+
+def test_manager_writes_bars_in_batches_and_resumes_after_restart(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from app.database.mtf_database_manager import MTFDatabaseManager, DatabaseConfig
+
+    ticks = _ticks(7)
+    config = lambda name: DatabaseConfig(db_path=str(tmp_path / name), bar_timeframes=('M1', 'M5'))
+    batch = lambda part: [{'type': 'insert_tick', 'symbol': 'XAUUSDc', 'timestamp_ms': ts, 'bid': bid,
+                           'ask': ask, 'volume': volume, 'source': 'mt5'} for ts, bid, ask, volume in part]
+
+    async def run():
+        manager = MTFDatabaseManager(config("continuous.db"))
+        await manager._flush_batch(batch(ticks))
+        live = {tf: await manager.get_bars('XAUUSDc', tf, limit=100) for tf in ('M1', 'M5')}
+
+        # Restart mid-minute (and mid-M5): a fresh builder must extend the stored bars
+        split = 6 * 6 + 3
+        first = MTFDatabaseManager(config("restarted.db"))
+        await first._flush_batch(batch(ticks[:split]))
+        second = MTFDatabaseManager(config("restarted.db"))
+        await second._flush_batch(batch(ticks[split:]))
+        resumed = {tf: await second.get_bars('XAUUSDc', tf, limit=100) for tf in ('M1', 'M5')}
+        return manager, live, resumed
+
+    manager, live, resumed = asyncio.run(run())
+
+    assert len(live['M1']) == 7  # six finished bars + forming snapshot
+    assert manager.get_performance_stats()['bar_builder']['ticks_processed'] == len(ticks)
+    assert [r['timestamp_open_ms'] for r in live['M5']] == [BASE_MS + 300_000, BASE_MS]
+    key = lambda rows: [(r['timestamp_open_ms'], r['open'], r['high'], r['low'], r['close'], r['volume'],
+                         r['tick_volume'], round(r['spread'], 9)) for r in rows]
+    assert key(resumed['M1']) == key(live['M1'])
+    assert key(resumed['M5']) == key(live['M5'])
+
+
+def test_backfill_fills_only_missing_bars(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from app.database.mtf_database_manager import MTFDatabaseManager, DatabaseConfig
+
+    db_path = str(tmp_path / "mtf.db")
+    ticks = _ticks(7)
+    batch = [{'type': 'insert_tick', 'symbol': 'XAUUSDc', 'timestamp_ms': ts, 'bid': bid,
+              'ask': ask, 'volume': volume, 'source': 'mt5'} for ts, bid, ask, volume in ticks]
+    key = lambda rows: [(r['timestamp_open_ms'], r['open'], r['high'], r['low'], r['close'], r['tick_volume'])
+                        for r in rows]
+
+    async def run():
+        manager = MTFDatabaseManager(DatabaseConfig(db_path=db_path, bar_timeframes=('M1', 'M5')))
+        await manager._flush_batch(batch)
+        live = await manager.get_bars('XAUUSDc', 'M1', limit=100)
+
+        with sqlite3.connect(db_path) as conn:
+            # Retention pruned the first half of minute 0; minutes 3-4 have no stored bar
+            conn.execute("DELETE FROM raw_ticks WHERE timestamp_ms < ?", (BASE_MS + 30_000,))
+            conn.execute("DELETE FROM ohlcv_bars WHERE timeframe = 'M1' AND timestamp_open_ms IN (?, ?)",
+                         (BASE_MS + 180_000, BASE_MS + 240_000))
+
+        fresh = MTFDatabaseManager(DatabaseConfig(db_path=db_path, bar_timeframes=('M1', 'M5')))
+        written = await fresh.backfill_bars('XAUUSDc')
+        return live, written, await fresh.get_bars('XAUUSDc', 'M1', limit=100), fresh
+
+    live, written, rebuilt, fresh = asyncio.run(run())
+
+    assert written == 2
+    # Missing bars are rebuilt; the complete minute-0 bar is not replaced by its partial rebuild
+    assert key(rebuilt) == key(live)
+    assert fresh.bar_builder.needs_seed('XAUUSDc')
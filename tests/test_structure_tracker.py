@@ -0,0 +1,131 @@
+"""
+Tests for domain/structure_tracker.py - the incremental tracker reproduces label_structure
+and label_swings bar by bar, records BOS/CHOCH events, and DetectionSystemManager reads it
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from domain.market_structure import _symmetric_swings, label_structure, label_swings
+from domain.structure_tracker import StructureTracker, clear_structure_trackers, get_structure_tracker
+from config import settings
+from infra.detection_systems import DetectionSystemManager
+
+
+def _bars(n, seed, start="2026-01-05"):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.3, n))
+    return pd.DataFrame({
+        "time": pd.date_range(start, periods=n, freq="15min", tz="UTC"),
+        "high": (close + rng.uniform(0, 0.3, n)).round(1),
+        "low": (close - rng.uniform(0, 0.3, n)).round(1),
+        "close": close.round(1),
+    })
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rolling_updates_match_label_structure(seed):
+    df = _bars(400, seed)
+    tracker = StructureTracker()
+    for end in range(20, len(df), 3):
+        window = df.iloc[max(0, end - 100):end]
+        tracker.update_df(window)
+        state = tracker.state(lookback=10)
+        expected = label_structure(window, lookback=10)
+        assert {k: state[k] for k in expected} == expected
+    assert tracker.rebuilds == 1
+
+    # Labels of the confirmed swings match a batch pass over the closed bars
+    batch = [(p.idx, p.price, p.kind) for p in label_swings(_symmetric_swings(df.iloc[:tracker.closed]))]
+    assert [(s["idx"], s["price"], s["kind"]) for s in tracker.labels] == batch[-len(tracker.labels):]
+
+
+def test_break_events_and_bars_since_bos():
+    tracker = StructureTracker()
+    df = _bars(300, 7)
+    tracker.update_df(df)
+    assert tracker.events
+    last = tracker.events[-1]
+    assert last["direction"] in ("bull", "bear")
+    state = tracker.state()
+    assert state["bars_since_bos"] == tracker.closed - 1 - last["idx"]
+
+    # Same bars again: nothing applied; a gap rebuilds
+    assert tracker.update_df(df) == 0
+    tracker.update_df(_bars(50, 8, start="2026-03-01"))
+    assert tracker.rebuilds == 2 and tracker.closed == 49
+
+
+def test_detection_manager_reads_shared_tracker(monkeypatch):
+    clear_structure_trackers()
+    df = _bars(120, 3)
+    fetches = []
+
+    def get_bars(self, symbol, timeframe):
+        fetches.append(symbol)
+        return df
+
+    monkeypatch.setattr(DetectionSystemManager, "_get_bars", get_bars)
+    monkeypatch.setattr(DetectionSystemManager, "_get_last_tick", lambda self, symbol: None)
+    monkeypatch.setattr(settings, "CHOCH_BOS_LIVE_FLAGS", True)
+    first = DetectionSystemManager().get_choch_bos("XAUUSDc", "M15")
+    # A fresh manager (as the auto-execution checks create) reuses the tracker
+    second = DetectionSystemManager().get_choch_bos("XAUUSDc", "M15")
+    assert first == second and len(fetches) == 1
+    state = get_structure_tracker("XAUUSDc", "M15").state(lookback=10)
+    assert first["bos_bull"] == state["bos_bull"] and first["break_level"] == state["break_level"]
+
+
+def test_choch_bos_flags_stay_off_by_default(monkeypatch):
+    clear_structure_trackers()
+    df = _bars(300, 7)
+    monkeypatch.setattr(DetectionSystemManager, "_get_bars", lambda self, symbol, timeframe: df)
+    monkeypatch.setattr(DetectionSystemManager, "_get_last_tick", lambda self, symbol: None)
+    assert settings.CHOCH_BOS_LIVE_FLAGS is False
+
+    result = DetectionSystemManager().get_choch_bos("XAUUSDc", "M15")
+    assert not any(result[k] for k in ("choch_bull", "choch_bear", "bos_bull", "bos_bear"))
+    assert result["break_level"] == 0.0 and result["bars_since_bos"] == -1
+    assert get_structure_tracker("XAUUSDc", "M15").events  # The tracker itself still tracks breaks
+
+
+def test_structure_follows_ticks_and_refetches_on_bar_close(monkeypatch):
+    clear_structure_trackers()
+    df = _bars(120, 3)
+    fetches = []
+    tick = SimpleNamespace(time=0.0, bid=0.0)
+
+    def get_bars(self, symbol, timeframe):
+        fetches.append(symbol)
+        return df
+
+    monkeypatch.setattr(DetectionSystemManager, "_get_bars", get_bars)
+    monkeypatch.setattr(DetectionSystemManager, "_get_last_tick", lambda self, symbol: tick)
+    manager = DetectionSystemManager()
+    forming_open = df["time"].iloc[-1].timestamp()
+
+    tick.time, tick.bid = forming_open + 10, float(df["close"].iloc[-1])
+    manager._get_structure("XAUUSDc", "M15")
+    tracker = get_structure_tracker("XAUUSDc", "M15")
+    assert len(fetches) == 1 and tracker.forming_closes_at == forming_open + 900
+
+    # New tick inside the same bar: no refetch, the forming close follows the tick
+    tick.time, tick.bid = forming_open + 20, float(df["high"].max()) + 5.0
+    state = manager._get_structure("XAUUSDc", "M15")
+    assert len(fetches) == 1
+    expected = df.copy()
+    expected.loc[expected.index[-1], ["high", "close"]] = tick.bid
+    assert {k: state[k] for k in ("trend", "break")} == \
+        {k: v for k, v in label_structure(expected, lookback=10).items() if k in ("trend", "break")}
+
+    # Tick past the bar's end: the bar closed, bars are refetched
+    tick.time = forming_open + 900
+    manager._get_structure("XAUUSDc", "M15")
+    assert len(fetches) == 2
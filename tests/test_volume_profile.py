@@ -0,0 +1,134 @@
+"""
+Tests for domain/volume_profile.py - incremental updates match a fresh build, the
+footprint matches a per-level reference, and callers share one profile per key
+"""
+
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from domain.levels import _vap_histogram
+from domain.volume_footprint import calculate_rolling_volume_footprint
+from domain.volume_profile import VolumeProfile, clear_volume_profiles, get_volume_profile
+
+
+def _bars(n, seed=1, start="2026-01-05"):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.05, n))
+    high = close + rng.uniform(0, 0.08, n)
+    low = close - rng.uniform(0, 0.08, n)
+    return pd.DataFrame({
+        "time": pd.date_range(start, periods=n, freq="5min", tz="UTC"),
+        "open": close,
+        "high": high.round(2),
+        "low": low.round(2),
+        "close": close.round(2),
+        "volume": rng.integers(1, 500, n).astype(float),
+    })
+
+
+def _assert_same(a: VolumeProfile, b: VolumeProfile):
+    pa, va = a.levels()
+    pb, vb = b.levels()
+    np.testing.assert_allclose(pa, pb)
+    np.testing.assert_allclose(va, vb, rtol=1e-9, atol=1e-9)
+    assert a.poc == b.poc
+    assert a.value_area() == b.value_area()
+
+
+def test_incremental_updates_match_fresh_build():
+    df = _bars(400)
+    live = VolumeProfile(window=100, bin_size=0.01)
+    live.update_df(df.iloc[:150])
+    for end in range(151, 400, 7):
+        window = df.iloc[:end].copy()
+        # Forming bar revised between polls
+        window.loc[window.index[-1], "volume"] += 3.0
+        window.loc[window.index[-1], "high"] += 0.02
+        live.update_df(window)
+
+        fresh = VolumeProfile(window=100, bin_size=0.01)
+        fresh.update_df(window)
+        _assert_same(live, fresh)
+    assert live.rebuilds == 1
+
+    # Same bars again: nothing applied
+    assert live.update_df(window) == 0
+
+
+
+def test_bars_without_prices_are_skipped():
+    df = _bars(120)
+    gappy = df.copy()
+    gappy.loc[[10, 50], ["low", "high"]] = np.nan
+    gappy.loc[80, ["low", "high"]] = [np.inf, np.nan]
+    gappy.loc[81, "high"] = np.nan  # One side missing: the other side's level is used
+
+    live = VolumeProfile(window=100, bin_size=0.01)
+    live.update_df(gappy.iloc[:60])
+    live.update_df(gappy)
+    ref = VolumeProfile(window=100, bin_size=0.01)
+    clean = df.drop(index=[10, 50, 80]).copy()
+    clean.loc[81, "high"] = clean.loc[81, "low"]
+    ref.update_df(clean.iloc[-98:])  # Bars 20..119 less the two without prices
+    _assert_same(live, ref)
+    assert live.bars == 100 and len(live.hist) < 10_000
+
+    # A forming bar with no prices yet, and a window with no prices at all
+    forming = gappy.copy()
+    forming.loc[119, ["low", "high"]] = np.nan
+    live.update_df(forming)
+    assert live.bars == 100
+    empty = VolumeProfile(window=10, bin_size=0.01)
+    nan = np.full(5, np.nan)
+    assert empty.update(None, nan, nan, np.ones(5)) == 5
+    assert empty.poc is None and empty.total_volume == 0.0
+
+def test_footprint_matches_per_level_reference():
+    df = _bars(120)
+    result = calculate_rolling_volume_footprint(df, window_bars=100, price_precision=2)
+    assert result["footprint_active"]
+
+    recent = df.iloc[-100:]
+    levels = defaultdict(float)
+    for low, high, volume in zip(recent["low"], recent["high"], recent["volume"]):
+        lo, hi = int(round(low * 100)), int(round(high * 100))
+        for level in range(lo, hi + 1):
+            levels[level] += volume / (hi - lo + 1)
+    prices = sorted(levels)
+
+    assert [p["price"] for p in result["price_levels"]] == [p / 100 for p in prices]
+    np.testing.assert_allclose([p["volume"] for p in result["price_levels"]], [levels[p] for p in prices])
+    best = max(prices, key=lambda p: (levels[p], -p))
+    assert result["poc"] == best / 100
+    assert result["value_area_low"] <= result["poc"] <= result["value_area_high"]
+
+
+def test_callers_share_profile_per_key():
+    clear_volume_profiles()
+    df = _bars(200, seed=3)
+    calculate_rolling_volume_footprint(df.iloc[:-1], window_bars=100, price_precision=2,
+                                       symbol="XAUUSDc", timeframe="M5")
+    profile = get_volume_profile("XAUUSDc", "M5", 100, 0.01)
+    assert profile.bars == 100 and profile.rebuilds == 1
+
+    calculate_rolling_volume_footprint(df, window_bars=100, price_precision=2,
+                                       symbol="XAUUSDc", timeframe="M5")
+    assert profile.rebuilds == 1
+    assert profile.bars == 100 and profile._times[-1] == df["time"].astype("int64").iloc[-1]
+
+    # No symbol: private profile
+    assert get_volume_profile(None, "M5", 100, 0.01) is not profile
+
+
+def test_vap_histogram_keeps_total_volume():
+    df = _bars(300, seed=5).rename(columns={"volume": "tick_volume"})
+    centers, hist = _vap_histogram(df, bins=120, symbol="EURUSDc")
+    assert len(centers) == len(hist) == 120
+    assert np.isclose(hist.sum(), df["tick_volume"].sum())
+    assert centers[0] > df["low"].min() and centers[-1] < df["high"].max()
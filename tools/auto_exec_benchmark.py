@@ -0,0 +1,451 @@
+
+# =====================================
+# tools/auto_exec_benchmark.py
+# =====================================
+# Reproducible benchmark for the auto-execution monitor cycle at scale.
+#
+# Runs the regular-plan path of AutoExecutionSystem._monitor_loop (batch price fetch via
+# _get_current_prices_batch -> pre-filter/priority -> _check_conditions_parallel) against
+# generated plan populations (condition types from infra/condition_type_registry.py) on top
+# of the deterministic MT5 simulator, replaying recorded or seeded market data.
+#
+# Usage (works on Linux, no terminal needed):
+#   python tools/auto_exec_benchmark.py --plans 50 500 5000 --cycles 20 --output bench.json
+#   python tools/auto_exec_benchmark.py --rates BTCUSDc=data/mt5_history/BTCUSDc_M15_2025.csv
+#   python tools/auto_exec_benchmark.py --ticks XAUUSDc=ticks.csv --compare baseline.json
+#
+# Output: JSON with cycle/stage latency percentiles, time-to-trigger, CPU and memory per scale.
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from infra.mt5_simulator import MT5Simulator, TICK_DTYPE, install
+from infra.condition_type_registry import CONDITION_REGISTRY
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - psutil is in requirements.txt
+    psutil = None
+
+logger = logging.getLogger("auto_exec_benchmark")
+
+BENCH_START = 1_767_225_600  # 2026-01-01 00:00 UTC
+
+# Symbol -> starting price for synthetic data (suffix 'c' matches the broker symbols)
+DEFAULT_SYMBOLS: Dict[str, float] = {
+    "XAUUSDc": 2650.0,
+    "BTCUSDc": 95000.0,
+    "ETHUSDc": 3400.0,
+    "EURUSDc": 1.0850,
+    "GBPUSDc": 1.2700,
+    "USDJPYc": 150.00,
+    "AUDUSDc": 0.6600,
+    "USDCHFc": 0.8800,
+    "NZDUSDc": 0.6000,
+    "US30c": 42000.0,
+}
+
+PRICE_ONLY = "price_only"
+
+
+# ---------- market data ----------
+def ticks_from_rates_csv(path: str) -> np.ndarray:
+    """
+    Expand recorded bars (data/mt5_history format: time_epoch/open/high/low/close/spread)
+    into four ticks per bar: open -> high/low (in bar direction) -> close.
+    """
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    ticks = np.zeros(len(rows) * 4, dtype=TICK_DTYPE)
+    for i, r in enumerate(rows):
+        t = int(float(r.get("time_epoch") or r["time"]))
+        o, h, l, c = (float(r[k]) for k in ("open", "high", "low", "close"))
+        seconds = 60 if i + 1 >= len(rows) else max(4, int(float(rows[i + 1].get("time_epoch") or rows[i + 1]["time"])) - t)
+        path_prices = (o, l, h, c) if c >= o else (o, h, l, c)
+        for j, price in enumerate(path_prices):
+            ticks[i * 4 + j]["time_msc"] = (t + j * seconds // 4) * 1000
+            ticks[i * 4 + j]["bid"] = price
+    ticks["time"] = ticks["time_msc"] // 1000
+    ticks["ask"] = ticks["bid"]
+    ticks["flags"] = MT5Simulator.TICK_FLAG_BID | MT5Simulator.TICK_FLAG_ASK
+    return ticks
+
+
+def build_simulator(args) -> Tuple[MT5Simulator, Dict[str, Tuple[int, int]]]:
+    """Create the simulator and load market data. Returns (simulator, {symbol: (start, end)})"""
+    sim = MT5Simulator(seed=args.seed)
+    windows: Dict[str, Tuple[int, int]] = {}
+
+    for spec in args.ticks or []:
+        symbol, path = spec.split("=", 1)
+        sim.load_ticks_csv(symbol, path)
+    for spec in args.rates or []:
+        symbol, path = spec.split("=", 1)
+        sim.load_ticks(symbol, ticks_from_rates_csv(path))
+
+    recorded = list(sim._symbols)
+    if not recorded:
+        symbols = list(DEFAULT_SYMBOLS)[: args.symbols]
+        duration = args.cycles * args.interval + 60
+        for symbol in symbols:
+            sim.generate_ticks(symbol, start=BENCH_START, seconds=duration,
+                               start_price=DEFAULT_SYMBOLS[symbol], volatility=args.volatility)
+
+    for symbol, data in sim._symbols.items():
+        ticks = data.ticks
+        windows[symbol] = (int(ticks["time"][0]), int(ticks["time"][-1]))
+    return sim, windows
+
+
+# ---------- plan population ----------
+def _condition_value(key: str) -> Any:
+    if key == "timeframe":
+        return "M5"
+    return True
+
+
+def _required_conditions(strategy_type: str, direction: str) -> Dict[str, Any]:
+    """Required conditions for a registry strategy; bull/bear (premium/discount) alternatives follow direction"""
+    conditions: Dict[str, Any] = {}
+    bullish = direction == "BUY"
+    for key in CONDITION_REGISTRY[strategy_type].get("required", []):
+        if key.endswith("_bull") or key.endswith("_bear"):
+            if key.endswith("_bull") != bullish:
+                continue
+        if key == "price_in_premium" and bullish or key == "price_in_discount" and not bullish:
+            continue
+        conditions[key] = _condition_value(key)
+    return conditions
+
+
+def generate_plans(sim: MT5Simulator, windows: Dict[str, Tuple[int, int]], count: int, start: int,
+                   horizon: int, seed: int, price_only_share: float = 0.3) -> List[Any]:
+    """
+    Generate a deterministic plan population across symbols.
+
+    Entry prices are sampled from the data inside the replay horizon so a realistic share
+    of plans triggers; a price_only_share of plans carry only price_near/tolerance and
+    therefore have a ground-truth trigger time.
+    """
+    from auto_execution_system import TradePlan
+
+    rng = random.Random(seed)
+    strategies = list(CONDITION_REGISTRY)
+    symbols = sorted(windows)
+    plans = []
+    for i in range(count):
+        symbol = symbols[i % len(symbols)]
+        ticks = sim._symbols[symbol].ticks
+        lo = np.searchsorted(ticks["time"], start, side="left")
+        hi = max(lo + 1, np.searchsorted(ticks["time"], start + horizon, side="right"))
+        sample = ticks[rng.randrange(lo, min(hi, len(ticks)))]
+        entry = round(float(sample["bid"] + sample["ask"]) / 2, sim._symbols[symbol].spec["digits"])
+        direction = rng.choice(("BUY", "SELL"))
+        risk = entry * 0.003
+        tolerance = entry * 0.0005
+        strategy = PRICE_ONLY if rng.random() < price_only_share else rng.choice(strategies)
+
+        conditions: Dict[str, Any] = {"price_near": entry, "tolerance": tolerance}
+        if strategy != PRICE_ONLY:
+            conditions.update(_required_conditions(strategy, direction))
+            conditions["strategy_type"] = strategy
+
+        plans.append(TradePlan(
+            plan_id=f"bench_{i:05d}",
+            symbol=symbol,
+            direction=direction,
+            entry_price=entry,
+            stop_loss=entry - risk if direction == "BUY" else entry + risk,
+            take_profit=entry + 2 * risk if direction == "BUY" else entry - 2 * risk,
+            volume=0.01,
+            conditions=conditions,
+            created_at=datetime.fromtimestamp(start, timezone.utc).isoformat(),
+            created_by="benchmark",
+            status="pending",
+        ))
+    return plans
+
+
+def ground_truth_trigger(sim: MT5Simulator, plan, start: int) -> Optional[float]:
+    """First tick time (epoch seconds) at/after start where mid price is within the plan tolerance"""
+    ticks = sim._symbols[plan.symbol].ticks
+    lo = np.searchsorted(ticks["time_msc"], start * 1000, side="left")
+    mid = (ticks["bid"][lo:] + ticks["ask"][lo:]) / 2
+    hits = np.flatnonzero(np.abs(mid - plan.conditions["price_near"]) <= plan.conditions["tolerance"])
+    return float(ticks["time_msc"][lo + hits[0]]) / 1000.0 if len(hits) else None
+
+
+# ---------- measurement ----------
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"count": 0, "mean": None, "p50": None, "p90": None, "p95": None, "p99": None, "max": None}
+    arr = np.asarray(values, dtype=float)
+    return {
+        "count": int(len(arr)),
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p90": round(float(np.percentile(arr, 90)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "p99": round(float(np.percentile(arr, 99)), 3),
+        "max": round(float(arr.max()), 3),
+    }
+
+
+def _cpu_seconds() -> float:
+    if psutil is not None:
+        t = psutil.Process().cpu_times()
+        return t.user + t.system
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _rss_mb() -> Optional[float]:
+    if psutil is None:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_scale(sim: MT5Simulator, windows: Dict[str, Tuple[int, int]], plan_count: int, args) -> Dict[str, Any]:
+    """Run the monitor cycle for one plan population and collect metrics"""
+    from auto_execution_system import AutoExecutionSystem
+    from infra.mt5_gateway import get_mt5_gateway
+
+    start = max(w[0] for w in windows.values()) + args.warmup
+    sim.set_time(start)
+    gateway = get_mt5_gateway()
+    gateway.clear_cache()
+
+    db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+    db_file.close()
+    system = AutoExecutionSystem(db_path=db_file.name)
+    cpu_count = os.cpu_count() or 1
+    system._condition_check_executor = ThreadPoolExecutor(
+        max_workers=min(4, cpu_count + 4), thread_name_prefix="ConditionCheck"
+    )
+
+    plans = generate_plans(sim, windows, plan_count, start, args.cycles * args.interval, args.seed)
+    truth = {p.plan_id: ground_truth_trigger(sim, p, start)
+             for p in plans if "strategy_type" not in p.conditions}
+    with system.plans_lock:
+        system.plans = {p.plan_id: p for p in plans}
+
+    cycle_ms: List[float] = []
+    stage_ms: Dict[str, List[float]] = {"prices": [], "prefilter": [], "conditions": []}
+    checked_per_cycle: List[int] = []
+    trigger_delay_s: List[float] = []
+    triggered: Dict[str, float] = {}
+
+    rss_before = _rss_mb()
+    cpu_before = _cpu_seconds()
+    wall_before = time.perf_counter()
+    try:
+        for _ in range(args.cycles):
+            # Simulated time moves faster than wall time - drop wall-clock TTL caches and
+            # age last-check timestamps by the simulated interval for the adaptive skip logic
+            with system._price_cache_lock:
+                system._price_cache.clear()
+            gateway.clear_cache()
+            with system.plans_lock:
+                for plan_id, last_check in system._plan_last_check.items():
+                    system._plan_last_check[plan_id] = last_check - timedelta(seconds=args.interval)
+            now_utc = datetime.now(timezone.utc)
+
+            t0 = time.perf_counter()
+            symbol_prices = system._get_current_prices_batch()
+            t1 = time.perf_counter()
+
+            with system.plans_lock:
+                pending = [p for p in system.plans.values() if p.status == "pending"]
+            candidates = []
+            for plan in pending:
+                price = symbol_prices.get(plan.symbol.upper().rstrip('Cc') + 'c')
+                if system._should_skip_plan(plan, price):
+                    continue
+                candidates.append((system._get_plan_priority(plan, price), plan))
+            candidates.sort(key=lambda item: item[0])
+            to_check = [plan for _, plan in candidates]
+            t2 = time.perf_counter()
+
+            results = system._check_conditions_parallel(to_check, symbol_prices) if to_check else {}
+            t3 = time.perf_counter()
+
+            detected_at = sim.now() + (t3 - t0)
+            for plan in to_check:
+                with system.plans_lock:
+                    system._plan_last_check[plan.plan_id] = now_utc
+                if results.get(plan.plan_id):
+                    # Stand-in for _execute_trade: record the trigger and drop the plan
+                    triggered[plan.plan_id] = detected_at
+                    with system.plans_lock:
+                        system.plans.pop(plan.plan_id, None)
+
+            cycle_ms.append((t3 - t0) * 1000)
+            stage_ms["prices"].append((t1 - t0) * 1000)
+            stage_ms["prefilter"].append((t2 - t1) * 1000)
+            stage_ms["conditions"].append((t3 - t2) * 1000)
+            checked_per_cycle.append(len(to_check))
+            sim.advance(args.interval)
+    finally:
+        wall = time.perf_counter() - wall_before
+        cpu = _cpu_seconds() - cpu_before
+        rss_after = _rss_mb()
+        try:
+            system._condition_check_executor.shutdown(wait=True)
+            system._condition_check_executor = None
+            system.stop()
+            if system.db_write_queue:
+                system.db_write_queue.stop(timeout=5.0)
+        except Exception as e:
+            logger.debug(f"Error stopping auto execution system: {e}")
+        try:
+            os.unlink(db_file.name)
+        except OSError:
+            pass
+
+    reachable = 0
+    missed = 0
+    for plan_id, true_time in truth.items():
+        if true_time is None or true_time > sim.now():
+            continue
+        reachable += 1
+        if plan_id in triggered:
+            trigger_delay_s.append(max(0.0, triggered[plan_id] - true_time))
+        else:
+            missed += 1
+
+    return {
+        "plans": plan_count,
+        "symbols": len(windows),
+        "cycles": args.cycles,
+        "interval_s": args.interval,
+        "cycle_latency_ms": percentiles(cycle_ms),
+        "stage_latency_ms": {name: percentiles(values) for name, values in stage_ms.items()},
+        "plans_checked_per_cycle": percentiles(checked_per_cycle),
+        "triggered": len(triggered),
+        "time_to_trigger_s": dict(percentiles(trigger_delay_s), reachable=reachable, missed=missed),
+        "cpu_seconds": round(cpu, 3),
+        "cpu_percent": round(cpu / wall * 100, 1) if wall else None,
+        "wall_seconds": round(wall, 3),
+        "rss_mb": round(rss_after, 1) if rss_after is not None else None,
+        "rss_delta_mb": round(rss_after - rss_before, 1) if rss_after is not None else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "gateway": gateway.get_stats(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10,
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Format p50/p99 cycle latency and time-to-trigger deltas against a previous results file"""
+    base_by_plans = {r["plans"]: r for r in baseline.get("results", [])}
+    lines = [f"{'plans':>6} {'metric':<22} {'baseline':>10} {'current':>10} {'delta':>8}"]
+    for r in results["results"]:
+        base = base_by_plans.get(r["plans"])
+        if not base:
+            continue
+        for section, key in (("cycle_latency_ms", "p50"), ("cycle_latency_ms", "p99"),
+                             ("time_to_trigger_s", "p50"), ("time_to_trigger_s", "p99")):
+            old, new = base[section].get(key), r[section].get(key)
+            if old is None or new is None:
+                continue
+            delta = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            lines.append(f"{r['plans']:>6} {section + '.' + key:<22} {old:>10.3f} {new:>10.3f} {delta:>8}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    ap = argparse.ArgumentParser(description="Benchmark the auto-execution monitor cycle at scale")
+    ap.add_argument("--plans", type=int, nargs="+", default=[50, 500, 5000], help="Plan population sizes")
+    ap.add_argument("--cycles", type=int, default=20, help="Monitor cycles per population")
+    ap.add_argument("--interval", type=int, default=15, help="Simulated seconds between cycles")
+    ap.add_argument("--warmup", type=int, default=60, help="Simulated seconds of data before the first cycle")
+    ap.add_argument("--symbols", type=int, default=len(DEFAULT_SYMBOLS), help="Synthetic symbols (no recorded data)")
+    ap.add_argument("--volatility", type=float, default=0.0002, help="Per-tick log-return stdev (synthetic data)")
+    ap.add_argument("--ticks", nargs="*", metavar="SYMBOL=CSV", help="Recorded ticks (time_msc/bid/ask columns)")
+    ap.add_argument("--rates", nargs="*", metavar="SYMBOL=CSV", help="Recorded bars (data/mt5_history format)")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--output", help="Write JSON results to this path")
+    ap.add_argument("--compare", help="Previous JSON results to compare against")
+    ap.add_argument("--log-level", default="ERROR")
+    args = ap.parse_args(argv)
+
+    level = getattr(logging, args.log_level.upper(), logging.ERROR)
+    logging.basicConfig(level=level)
+    # Several modules raise their own logger levels - silence everything below the requested level
+    logging.disable(level - 1)
+
+    sim, windows = build_simulator(args)
+    install(sim)
+    sim.initialize()
+
+    results = {
+        "meta": {
+            "benchmark": "auto_exec_monitor_cycle",
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "data": {"ticks": args.ticks or [], "rates": args.rates or [], "symbols": sorted(windows)},
+        },
+        "results": [],
+    }
+    for count in args.plans:
+        print(f"Running {count} plans x {args.cycles} cycles...", file=sys.stderr)
+        result = run_scale(sim, windows, count, args)
+        results["results"].append(result)
+        c = result["cycle_latency_ms"]
+        print(
+            f"{count} plans: cycle p50={c['p50']}ms p99={c['p99']}ms, triggered={result['triggered']}, "
+            f"cpu={result['cpu_percent']}%, rss={result['rss_mb']}MB",
+            file=sys.stderr,
+        )
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print("\n".join(compare(results, baseline)))
+    return results
+
+
+if __name__ == "__main__":
+    main()
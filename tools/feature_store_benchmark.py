@@ -0,0 +1,148 @@
+# =====================================
+# tools/feature_store_benchmark.py
+# =====================================
+# Benchmark for the shared feature store (infra/feature_store.py) on the feature stage of
+# desktop_agent.tool_analyse_symbol_full: get_multi, then build_features_advanced for
+# M5/M15/H1, followed by the other builders (FeatureBuilder, FastFeatureBuilder) that
+# analysis tools run for the same symbol within the same bar.
+#
+# Two modes over the same simulated bars (MT5 simulator, no terminal needed):
+#   legacy - store disabled, the advanced builder fetches get_multi again (previous behaviour)
+#   store  - one get_multi reused by every builder, shared features memoized per bar
+#
+# Usage:
+#   python tools/feature_store_benchmark.py --symbols XAUUSDc BTCUSDc --repeats 5 --output fs.json
+#
+# Output: JSON with per-mode latency (first analysis in a bar / repeats within the bar),
+# copy_rates_from_pos calls and feature store counters, plus the speedup.
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from infra.mt5_simulator import MT5Simulator, RATES_DTYPE, install
+
+logger = logging.getLogger("feature_store_benchmark")
+
+BENCH_END = 1_767_225_600  # 2026-01-01 00:00 UTC
+BARS = 500                 # IndicatorBridge fetches 500 bars per timeframe
+
+DEFAULT_SYMBOLS: Dict[str, float] = {"XAUUSDc": 2650.0, "BTCUSDc": 95000.0, "EURUSDc": 1.0850}
+
+TIMEFRAMES = {
+    "TIMEFRAME_M5": 300,
+    "TIMEFRAME_M15": 900,
+    "TIMEFRAME_M30": 1800,
+    "TIMEFRAME_H1": 3600,
+    "TIMEFRAME_H4": 14400,
+}
+
+
+def synthetic_rates(start_price: float, seconds: int, seed: int, bars: int = BARS) -> np.ndarray:
+    """Random-walk bars ending at BENCH_END"""
+    rng = np.random.default_rng(seed)
+    step = start_price * 0.0008 * np.sqrt(seconds / 300)
+    close = start_price + np.cumsum(rng.normal(0, step, bars))
+    rates = np.zeros(bars, dtype=RATES_DTYPE)
+    rates["time"] = BENCH_END - seconds * np.arange(bars, 0, -1)
+    rates["open"] = np.r_[start_price, close[:-1]]
+    rates["close"] = close
+    rates["high"] = np.maximum(rates["open"], close) + rng.uniform(0, step, bars)
+    rates["low"] = np.minimum(rates["open"], close) - rng.uniform(0, step, bars)
+    rates["tick_volume"] = rng.integers(50, 2000, bars)
+    return rates
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    arr = np.asarray(samples) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(arr, 50)), 2),
+        "p95_ms": round(float(np.percentile(arr, 95)), 2),
+        "mean_ms": round(float(arr.mean()), 2),
+    }
+
+
+def analysis_stage(bridge, symbol: str, shared: bool) -> None:
+    """Feature work of one tool_analyse_symbol_full call plus the follow-up builders"""
+    from infra.feature_builder import FeatureBuilder
+    from infra.feature_builder_advanced import build_features_advanced
+    from infra.feature_builder_fast import FastFeatureBuilder
+
+    multi = bridge.get_multi(symbol)
+    build_features_advanced(symbol, None, bridge, ["M5", "M15", "H1"], multi=multi if shared else None)
+    FeatureBuilder(None, bridge).build(symbol, multi=multi if shared else None)
+    FastFeatureBuilder(None, bridge).build(symbol, multi=multi if shared else None)
+
+
+def run_mode(sim: MT5Simulator, bridge, symbols: List[str], repeats: int, shared: bool) -> Dict[str, Any]:
+    from infra.feature_store import FeatureStore, set_feature_store
+
+    store = FeatureStore(enabled=shared)
+    set_feature_store(store)
+    first: List[float] = []
+    repeat: List[float] = []
+    calls_before = sim.call_counts.get("copy_rates_from_pos", 0)
+    for symbol in symbols:
+        for i in range(repeats):
+            start = time.perf_counter()
+            analysis_stage(bridge, symbol, shared)
+            (first if i == 0 else repeat).append(time.perf_counter() - start)
+    return {
+        "first": percentiles(first),
+        "repeat": percentiles(repeat),
+        "total_s": round(sum(first) + sum(repeat), 3),
+        "copy_rates_calls": sim.call_counts.get("copy_rates_from_pos", 0) - calls_before,
+        "store": store.get_stats(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    ap = argparse.ArgumentParser(description="Benchmark the shared feature store on tool_analyse_symbol_full's feature stage")
+    ap.add_argument("--symbols", nargs="+", default=list(DEFAULT_SYMBOLS))
+    ap.add_argument("--repeats", type=int, default=5, help="Analyses per symbol within one bar")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--output", help="Write JSON results here")
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    sim = MT5Simulator(seed=args.seed)
+    for n, symbol in enumerate(args.symbols):
+        price = DEFAULT_SYMBOLS.get(symbol, 100.0)
+        for k, (name, seconds) in enumerate(TIMEFRAMES.items()):
+            sim.load_rates(symbol, getattr(sim, name), synthetic_rates(price, seconds, args.seed + 31 * n + k))
+    sim.set_time(BENCH_END)
+    install(sim)
+
+    from infra.indicator_bridge import IndicatorBridge
+    bridge = IndicatorBridge()
+
+    results: Dict[str, Any] = {"symbols": args.symbols, "repeats": args.repeats}
+    for mode, shared in (("legacy", False), ("store", True)):
+        print(f"Running {mode}...", file=sys.stderr)
+        results[mode] = run_mode(sim, bridge, args.symbols, args.repeats, shared)
+    legacy, store = results["legacy"]["total_s"], results["store"]["total_s"]
+    results["speedup"] = round(legacy / store, 2) if store > 0 else None
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,13 @@ from typing import Dict, List, Optional, Callable, Any
 from dataclasses import dataclass
 import MetaTrader5 as mt5
 
+try:
+    from app.io.mt5_ingestion_manager import get_ingestion_manager
+    _ingestion_available = True
+except ImportError:
+    get_ingestion_manager = None
+    _ingestion_available = False
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -183,19 +190,39 @@ class MT5LocalBridge:
         """Disconnect from MT5 (alias for stop)"""
         await self.stop()
     
+    def _shared_tick_ring(self, symbol: str):
+        """Tick ring of the cursor-based ingestion service, if it is ingesting this symbol"""
+        if not _ingestion_available:
+            return None
+        manager = get_ingestion_manager()
+        if manager is None or not manager.is_ingesting(symbol):
+            return None
+        return manager.tick_ring
+    
     async def _monitor_symbol_ticks(self, symbol: str):
         """Monitor ticks for a specific symbol"""
         last_tick_time = None
+        ring_seq = None
         
         while self.is_running:
             try:
-                # Get current tick
-                tick = mt5.symbol_info_tick(symbol)
-                
-                if tick and tick.time > (last_tick_time or 0):
-                    # Process new tick
-                    await self._process_tick_data(symbol, tick)
-                    last_tick_time = tick.time
+                ring = self._shared_tick_ring(symbol)
+                if ring is not None:
+                    # Read every new tick once from the shared ingestion ring (no extra MT5 polling)
+                    if ring_seq is None:
+                        ring_seq = ring.last_seq(symbol)
+                    ticks, ring_seq = ring.read_since(symbol, ring_seq)
+                    for tick in ticks:
+                        await self._process_tick_data(symbol, tick)
+                else:
+                    ring_seq = None
+                    # Get current tick
+                    tick = mt5.symbol_info_tick(symbol)
+                    
+                    if tick and tick.time > (last_tick_time or 0):
+                        # Process new tick
+                        await self._process_tick_data(symbol, tick)
+                        last_tick_time = tick.time
                 
                 # Wait for next update
                 await asyncio.sleep(self.config.update_interval / 1000)